@@ -113,6 +113,10 @@ from draftgeoutils.circle_inversion import (pointInversion,
 from draftgeoutils.sort_edges import (sortEdges,
                                       sortEdgesOld)
 
+from draftgeoutils.edge_joining import (snapPoints,
+                                        findChains,
+                                        joinEdges)
+
 from draftgeoutils.intersections import (findIntersection,
                                          wiresIntersect,
                                          connect,
@@ -108,6 +108,15 @@ from drafttests.test_dwg import DraftDWG as DraftTest06
 # from drafttests.test_oca import DraftOCA as DraftTest07
 # from drafttests.test_airfoildat import DraftAirfoilDAT as DraftTest08
 
+# Geometry utilities tests
+from drafttests.test_draftgeomutils import DraftGeomUtilsTest as DraftTest09
+
+# Array placement tests
+from drafttests.test_array import DraftArrayPlacements as DraftTest10
+
+# Snap cache tests
+from drafttests.test_snapcache import DraftSnapCache as DraftTest11
+
 # Use the modules so that code checkers don't complain (flake8)
 True if DraftTest01 else False
 True if DraftTest02 else False
@@ -117,3 +126,6 @@ True if DraftTest05 else False
 True if DraftTest06 else False
 # True if DraftTest07 else False
 # True if DraftTest08 else False
+True if DraftTest09 else False
+True if DraftTest10 else False
+True if DraftTest11 else False
@@ -0,0 +1,255 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Provides functions to join large lists of edges into wires."""
+## @package edge_joining
+# \ingroup draftgeoutils
+# \brief Provides functions to join large lists of edges into wires.
+
+import math
+import lazy_loader.lazy_loader as lz
+
+from draftgeoutils.general import precision
+
+# Delay import of module until first use because it is heavy
+Part = lz.LazyLoader("Part", globals(), "Part")
+
+## \addtogroup draftgeoutils
+# @{
+
+# offsets of a cell and of its neighbours in the spatial hash,
+# the cell itself comes first because most points coincide exactly
+NEIGHBOUR_CELLS = [(0, 0, 0)] + [(i, j, k)
+                                 for i in (-1, 0, 1)
+                                 for j in (-1, 0, 1)
+                                 for k in (-1, 0, 1)
+                                 if (i, j, k) != (0, 0, 0)]
+
+
+def defaultTolerance():
+    """Return the tolerance used to join edges, from the Draft precision."""
+    return 10 ** (-precision())
+
+
+def snapPoints(points, tol=None):
+    """Merge points closer than the tolerance into nodes.
+
+    The points are sorted into a spatial hash, a dictionary of cubic
+    cells of the size of the tolerance, so every point is only compared
+    with the nodes in its own and in the neighbouring cells.
+
+    Parameters
+    ----------
+    points : list of Base::Vector3
+        The points to merge.
+
+    tol : float, optional
+        It defaults to `None`, in which case the Draft precision is used.
+        Points closer than `tol` to an existing node become that node.
+
+    Returns
+    -------
+    tuple
+        A tuple `(index, nodes)`, where `index` is a list
+        with the node number of each point, and `nodes` is the list
+        of the node positions, which are the first points of the nodes.
+    """
+    if tol is None:
+        tol = defaultTolerance()
+    tol2 = tol * tol
+    cells = {}
+    nodes = []
+    index = []
+    for p in points:
+        x, y, z = p.x, p.y, p.z
+        i = int(math.floor(x / tol))
+        j = int(math.floor(y / tol))
+        k = int(math.floor(z / tol))
+        found = None
+        for di, dj, dk in NEIGHBOUR_CELLS:
+            cell = cells.get((i + di, j + dj, k + dk))
+            if cell:
+                for n in cell:
+                    q = nodes[n]
+                    dx, dy, dz = q.x - x, q.y - y, q.z - z
+                    if dx * dx + dy * dy + dz * dz <= tol2:
+                        found = n
+                        break
+                if found is not None:
+                    break
+        if found is None:
+            found = len(nodes)
+            nodes.append(p)
+            cells.setdefault((i, j, k), []).append(found)
+        index.append(found)
+    return index, nodes
+
+
+def midpoint(edge):
+    """Return the point at the middle of the parameter range of an edge."""
+    return edge.valueAt(0.5 * (edge.FirstParameter + edge.LastParameter))
+
+
+def findChains(edges, tol=None):
+    """Sort edges into chains of connected edges.
+
+    The end points of the edges are snapped into nodes with `snapPoints`,
+    then the chains are traced through the nodes, starting at the open ends.
+    Each edge is visited once, so the time grows linearly
+    with the number of edges, unlike the pairwise comparisons
+    of `Part.sortEdges`.
+
+    Parameters
+    ----------
+    edges : list of Part::TopoShape ('Edge')
+        The edges to join.
+
+    tol : float, optional
+        It defaults to `None`, in which case the Draft precision is used.
+        End points closer than `tol` are considered connected.
+
+    Returns
+    -------
+    tuple
+        A tuple `(chains, openEnds, duplicates)`.
+
+        `chains` is a list of lists of edges, the edges of each list
+        are ordered so that each one is connected to the previous one.
+
+        `openEnds` is a list of the points, as `Base::Vector3`,
+        where only one edge ends.
+
+        `duplicates` is a list of the edges which are not part of
+        any chain, because they have the same end points and midpoint
+        as an earlier edge, or because they have no length.
+    """
+    if tol is None:
+        tol = defaultTolerance()
+
+    # snap the end points of all edges
+    valid = []
+    points = []
+    for e in edges:
+        verts = e.Vertexes
+        if not verts:
+            continue
+        valid.append(e)
+        points.append(verts[0].Point)
+        points.append(verts[-1].Point)
+    index, nodes = snapPoints(points, tol)
+
+    # find duplicate and degenerate edges
+    duplicates = []
+    kept = []
+    ends = []
+    pairs = {}
+    for n, e in enumerate(valid):
+        a, b = index[2 * n], index[2 * n + 1]
+        if a == b and e.Length <= tol:
+            duplicates.append(e)
+            continue
+        key = (a, b) if a < b else (b, a)
+        if key in pairs:
+            mid = midpoint(e)
+            if any(midpoint(other).sub(mid).Length <= tol
+                   for other in pairs[key]):
+                duplicates.append(e)
+                continue
+            pairs[key].append(e)
+        else:
+            pairs[key] = [e]
+        kept.append(e)
+        ends.append((a, b))
+
+    # edges ending at each node, as (edge number, end)
+    incident = [[] for n in nodes]
+    for n, (a, b) in enumerate(ends):
+        incident[a].append((n, 0))
+        incident[b].append((n, 1))
+    openEnds = [nodes[n] for n, inc in enumerate(incident) if len(inc) == 1]
+
+    used = [False] * len(kept)
+
+    def trace(node):
+        chain = []
+        while True:
+            adjacent = incident[node]
+            step = None
+            while adjacent:
+                n, end = adjacent.pop()
+                if not used[n]:
+                    step = (n, end)
+                    break
+            if step is None:
+                return chain
+            n, end = step
+            used[n] = True
+            chain.append(kept[n])
+            node = ends[n][1 - end]
+
+    chains = []
+    # start at the nodes with an odd number of edges, so the open
+    # chains are not split, then trace the remaining closed ones
+    starts = [n for n, inc in enumerate(incident) if len(inc) % 2]
+    starts.extend(a for a, b in ends)
+    for node in starts:
+        chain = trace(node)
+        if chain:
+            chains.append(chain)
+    return chains, openEnds, duplicates
+
+
+def joinEdges(edges, tol=None):
+    """Join edges into wires, using `findChains`.
+
+    Chains which can't be made into a single wire, usually because
+    their gaps are larger than the tolerance of the shapes, are joined
+    with `Part.Compound.connectEdgesToWires` instead.
+
+    Parameters
+    ----------
+    edges : list of Part::TopoShape ('Edge')
+        The edges to join.
+
+    tol : float, optional
+        It defaults to `None`, in which case the Draft precision is used.
+
+    Returns
+    -------
+    tuple
+        A tuple `(wires, openEnds, duplicates)`, where `wires` is a list
+        of `Part::TopoShape ('Wire')`, and `openEnds` and `duplicates`
+        are the diagnostics returned by `findChains`.
+    """
+    if tol is None:
+        tol = defaultTolerance()
+    chains, openEnds, duplicates = findChains(edges, tol)
+    wires = []
+    for chain in chains:
+        try:
+            wires.append(Part.Wire(chain))
+        except Part.OCCError:
+            comp = Part.Compound(chain)
+            wires.extend(comp.connectEdgesToWires(False, tol).Wires)
+    return wires, openEnds, duplicates
+
+## @}
@@ -0,0 +1,157 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Provides the cache of the snap candidates of the objects.
+
+The Snapper looks for intersections between the edge under the cursor
+and the edges of the previously snapped object. For large objects,
+like imported DXF floor plans, checking every edge on every mouse move
+is too slow, so the bounding boxes of the edges are kept in an array
+and only the edges near the edge under the cursor are checked.
+"""
+## @package gui_snapcache
+# \ingroup draftguitools
+# \brief Provides the cache of the snap candidates of the objects.
+
+## \addtogroup draftguitools
+# @{
+import collections as coll
+import numpy as np
+
+import FreeCAD as App
+
+# number of objects kept in the cache
+CACHE_SIZE = 8
+
+
+class EdgeIndex:
+    """The edges of a shape, indexed by their bounding boxes.
+
+    Parameters
+    ----------
+    shape: Part::TopoShape
+        The shape whose edges are indexed.
+    """
+
+    def __init__(self, shape):
+        self.edges = shape.Edges
+        self.boxes = np.empty((len(self.edges), 6))
+        for i, e in enumerate(self.edges):
+            bb = e.BoundBox
+            self.boxes[i] = (bb.XMin, bb.YMin, bb.ZMin,
+                             bb.XMax, bb.YMax, bb.ZMax)
+
+    def edges_near(self, bound_box, tolerance=0, planar=False):
+        """Return the edges whose bounding boxes touch the given box.
+
+        Parameters
+        ----------
+        bound_box: Base::BoundBox
+            The box to look in, usually the one of the edge
+            under the cursor.
+
+        tolerance: float, optional
+            The box is enlarged by this distance in all directions.
+
+        planar: bool, optional
+            If it is `True` the Z coordinates are ignored, to find
+            the edges which only intersect in a projection on the XY plane.
+        """
+        lo = np.array([bound_box.XMin, bound_box.YMin, bound_box.ZMin])
+        hi = np.array([bound_box.XMax, bound_box.YMax, bound_box.ZMax])
+        axes = 2 if planar else 3
+        near = np.all((self.boxes[:, :axes] <= hi[:axes] + tolerance)
+                      & (self.boxes[:, 3:3 + axes] >= lo[:axes] - tolerance),
+                      axis=1)
+        return [self.edges[i] for i in np.flatnonzero(near)]
+
+
+class SnapCache:
+    """The edge indices of the last snapped objects.
+
+    The cache observes the documents once it is used. The index of an
+    object is removed when its shape changes, when it is recomputed,
+    for example after an undo or an aborted transaction, and when it
+    or its document is deleted. Each entry also keeps the indexed shape,
+    so another shape can't reuse its memory and compare as the same.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.entries = coll.OrderedDict()
+        self.observing = False
+
+    def get(self, obj):
+        """Return the `EdgeIndex` of the shape of an object.
+
+        Parameters
+        ----------
+        obj: App::DocumentObject
+            An object with a `Shape` property.
+
+        Returns
+        -------
+        EdgeIndex
+            It returns `None` if the object has no shape.
+        """
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            return None
+        if not self.observing:
+            App.addDocumentObserver(self)
+            self.observing = True
+        key = (obj.Document.Name, obj.Name)
+        entry = self.entries.pop(key, None)
+        if entry is None or not entry[0].isSame(shape):
+            entry = (shape, EdgeIndex(shape))
+        self.entries[key] = entry
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return entry[1]
+
+    def discard(self, obj):
+        """Remove the index of an object, if there is one."""
+        self.entries.pop((obj.Document.Name, obj.Name), None)
+
+    def clear(self):
+        """Remove all indices."""
+        self.entries.clear()
+
+    def slotChangedObject(self, obj, prop):
+        """Remove the index of an object whose shape changed."""
+        if prop == "Shape":
+            self.discard(obj)
+
+    def slotRecomputedObject(self, obj):
+        """Remove the index of a recomputed object."""
+        self.discard(obj)
+
+    def slotDeletedObject(self, obj):
+        """Remove the index of a deleted object."""
+        self.discard(obj)
+
+    def slotDeletedDocument(self, doc):
+        """Remove the indices of the objects of a closed document."""
+        for key in [k for k in self.entries if k[0] == doc.Name]:
+            del self.entries[key]
+
+## @}
@@ -49,6 +49,7 @@ import Draft
 import DraftVecUtils
 import DraftGeomUtils
 import draftguitools.gui_trackers as trackers
+import draftguitools.gui_snapcache as snapcache
 
 from draftutils.init_tools import get_draft_snap_commands
 from draftutils.messages import _msg, _wrn
@@ -123,6 +124,8 @@ class Snapper:
         self.callbackClick = None
         self.callbackMove = None
         self.snapObjectIndex = 0
+        # edges of the last snapped objects, indexed by their bounding boxes
+        self.snapCache = snapcache.SnapCache()
 
         # snap keys, it's important that they are in this order for
         # saving in preferences and for properly restoring the toolbar
@@ -1009,9 +1012,9 @@ class Snapper:
                 obj = App.ActiveDocument.getObject(self.lastObj[0])
                 if obj:
                     if obj.isDerivedFrom("Part::Feature") or (Draft.getType(obj) == "Axis"):
-                        if (not self.maxEdges) or (len(obj.Shape.Edges) <= self.maxEdges):
-                            import Part
-                            for e in obj.Shape.Edges:
+                        index = self.snapCache.get(obj)
+                        if index:
+                            for e in self.getIntersectionCandidates(index, shape):
                                 # get the intersection points
                                 try:
                                     if self.isEnabled("WorkingPlane") and hasattr(e,"Curve") and isinstance(e.Curve,(Part.Line,Part.LineSegment)) and hasattr(shape,"Curve") and isinstance(shape.Curve,(Part.Line,Part.LineSegment)):
@@ -1033,6 +1036,28 @@ class Snapper:
         return snaps
 
 
+    def getIntersectionCandidates(self, index, shape):
+        """Return the edges of an EdgeIndex which can intersect the shape.
+
+        Only the edges whose bounding boxes touch the one of the shape
+        are returned. Apparent intersections on the working plane only
+        need the boxes to touch in the plane, which is only possible
+        to check if the working plane is parallel to XY.
+        If there are more candidates than the maximum number of edges,
+        an empty list is returned.
+        """
+        if not self.isEnabled("WorkingPlane"):
+            edges = index.edges_near(shape.BoundBox, Draft.tolerance())
+        elif DraftVecUtils.isNull(App.DraftWorkingPlane.axis.cross(App.Vector(0, 0, 1))):
+            edges = index.edges_near(shape.BoundBox, Draft.tolerance(),
+                                     planar=True)
+        else:
+            edges = index.edges
+        if self.maxEdges and (len(edges) > self.maxEdges):
+            return []
+        return edges
+
+
     def snapToPolygon(self, obj):
         """Return a list of polygon center snap locations."""
         snaps = []
@@ -34,6 +34,7 @@ split in separate classes so that they are easier to manage.
 ## \addtogroup draftobjects
 # @{
 import math
+import numpy as np
 from PySide.QtCore import QT_TRANSLATE_NOOP
 
 import FreeCAD as App
@@ -426,81 +427,123 @@ class Array(DraftLink):
 _Array = Array
 
 
+def placement_matrix(placement):
+    """Return the 4x4 matrix of a placement as a NumPy array."""
+    return np.array(placement.toMatrix().A, dtype=float).reshape(4, 4)
+
+
+def rotation_matrices(axis, angles):
+    """Return the rotation matrices around an axis, as an (N, 3, 3) array.
+
+    Parameters
+    ----------
+    axis: Base::Vector3
+        The axis of the rotations, it doesn't need to be normalized.
+
+    angles: array_like
+        The angles of the rotations, in degrees.
+    """
+    angles = np.radians(np.asarray(angles, dtype=float))
+    k = np.array([axis.x, axis.y, axis.z], dtype=float)
+    length = np.linalg.norm(k)
+    if length == 0:
+        return np.tile(np.eye(3), (len(angles), 1, 1))
+    k /= length
+    cross = np.array([[0, -k[2], k[1]],
+                      [k[2], 0, -k[0]],
+                      [-k[1], k[0], 0]])
+    cos = np.cos(angles)[:, None, None]
+    sin = np.sin(angles)[:, None, None]
+    return cos * np.eye(3) + sin * cross + (1 - cos) * np.outer(k, k)
+
+
+def placements_from_matrices(matrices):
+    """Return a list of placements from an (N, 4, 4) array of matrices."""
+    return [App.Placement(App.Matrix(*m))
+            for m in matrices.reshape(-1, 16).tolist()]
+
+
+def rect_matrices(base_placement,
+                  xvector, yvector, zvector,
+                  xnum, ynum, znum):
+    """Return the matrices of the rectangular copies, as an (N, 4, 4) array.
+
+    The copies are ordered by their X, Y, Z indices,
+    the first one is at the base placement.
+    If a number is zero, there are no copies along the following
+    directions either.
+    """
+    nx = max(xnum, 1)
+    ny = max(ynum, 1) if xnum > 0 else 1
+    nz = max(znum, 1) if xnum > 0 and ynum > 0 else 1
+    counts = np.indices((nx, ny, nz)).reshape(3, -1).T
+    vectors = np.array([[v.x, v.y, v.z] for v in (xvector, yvector, zvector)],
+                       dtype=float)
+    matrices = np.tile(placement_matrix(base_placement), (len(counts), 1, 1))
+    matrices[:, :3, 3] += counts.dot(vectors)
+    return matrices
+
+
 def rect_placements(base_placement,
                     xvector, yvector, zvector,
                     xnum, ynum, znum):
     """Determine the placements where the rectangular copies will be."""
-    pl = base_placement
-    placements = [pl.copy()]
-
-    for xcount in range(xnum):
-        currentxvector = App.Vector(xvector).multiply(xcount)
-        if xcount != 0:
-            npl = pl.copy()
-            npl.translate(currentxvector)
-            placements.append(npl)
-
-        for ycount in range(ynum):
-            currentyvector = App.Vector(currentxvector)
-            _y_shift = App.Vector(yvector).multiply(ycount)
-            currentyvector = currentyvector.add(_y_shift)
-            if ycount != 0:
-                npl = pl.copy()
-                npl.translate(currentyvector)
-                placements.append(npl)
-
-            for zcount in range(znum):
-                currentzvector = App.Vector(currentyvector)
-                _z_shift = App.Vector(zvector).multiply(zcount)
-                currentzvector = currentzvector.add(_z_shift)
-                if zcount != 0:
-                    npl = pl.copy()
-                    npl.translate(currentzvector)
-                    placements.append(npl)
-
-    return placements
+    return placements_from_matrices(rect_matrices(base_placement,
+                                                  xvector, yvector, zvector,
+                                                  xnum, ynum, znum))
 
 
-def polar_placements(base_placement,
-                     center, angle,
-                     number, axis, axisvector):
-    """Determine the placements where the polar copies will be."""
-    # print("angle ",angle," num ",num)
-    placements = [base_placement.copy()]
-
-    if number == 0:
-        return placements
+def polar_matrices(base_placement,
+                   center, angle,
+                   number, axis, axisvector):
+    """Return the matrices of the polar copies, as an (N, 4, 4) array.
 
-    spin = App.Placement(App.Vector(), base_placement.Rotation)
-    pl = App.Placement(base_placement.Base, App.Rotation())
-    center = center.sub(base_placement.Base)
+    The first copy is at the base placement, the others are rotated
+    around the axis through the center, and moved by a multiple
+    of the axis vector, if given.
+    """
+    base = placement_matrix(base_placement)
+    if number < 2:
+        return base[None]
 
     if angle == 360:
         fraction = float(angle)/number
     else:
         fraction = float(angle)/(number - 1)
 
-    center_tuple = DraftVecUtils.tup(center)
-    axis_tuple = DraftVecUtils.tup(axis)
+    steps = np.arange(1, number)
+    rotations = rotation_matrices(axis, fraction * steps)
+    c = np.array([center.x, center.y, center.z], dtype=float)
+    offset = c - base[:3, 3]
+
+    matrices = np.tile(np.eye(4), (number, 1, 1))
+    matrices[0] = base
+    matrices[1:, :3, :3] = np.matmul(rotations, base[:3, :3])
+    matrices[1:, :3, 3] = c - np.matmul(rotations, offset)
+    if axisvector and not DraftVecUtils.isNull(axisvector):
+        av = np.array([axisvector.x, axisvector.y, axisvector.z], dtype=float)
+        matrices[1:, :3, 3] += steps[:, None] * av
+    return matrices
 
-    for i in range(number - 1):
-        currangle = fraction + (i*fraction)
-        npl = pl.copy()
-        npl.rotate(center_tuple, axis_tuple, currangle)
-        npl = npl.multiply(spin)
-        if axisvector:
-            if not DraftVecUtils.isNull(axisvector):
-                npl.translate(App.Vector(axisvector).multiply(i+1))
-        placements.append(npl)
 
-    return placements
+def polar_placements(base_placement,
+                     center, angle,
+                     number, axis, axisvector):
+    """Determine the placements where the polar copies will be."""
+    return placements_from_matrices(polar_matrices(base_placement,
+                                                   center, angle,
+                                                   number, axis, axisvector))
+
 
+def circ_matrices(base_placement,
+                  r_distance, tan_distance,
+                  axis, center,
+                  circle_number, symmetry):
+    """Return the matrices of the circular copies, as an (N, 4, 4) array.
 
-def circ_placements(base_placement,
-                    r_distance, tan_distance,
-                    axis, center,
-                    circle_number, symmetry):
-    """Determine the placements where the circular copies will be."""
+    The first copy is at the base placement, the others are placed
+    on concentric circles, ring by ring.
+    """
     symmetry = max(1, symmetry)
     lead = (0, 1, 0)
 
@@ -508,26 +551,39 @@ def circ_placements(base_placement,
         lead = (1, 0, 0)
 
     direction = axis.cross(App.Vector(lead)).normalize()
-    placements = [base_placement.copy()]
+    direction = np.array([direction.x, direction.y, direction.z], dtype=float)
+    base = placement_matrix(base_placement)
+    rot = base[:3, :3]
+    c = np.array([center.x, center.y, center.z], dtype=float)
+    rings = [base[None]]
 
     for xcount in range(1, circle_number):
         rc = xcount * r_distance
-        c = 2 * rc * math.pi
-        n = math.floor(c / tan_distance)
+        n = math.floor(2 * rc * math.pi / tan_distance)
         n = int(math.floor(n / symmetry) * symmetry)
         if n == 0:
             continue
 
-        angle = 360.0/n
-        for ycount in range(0, n):
-            npl = base_placement.copy()
-            trans = App.Vector(direction).multiply(rc)
-            npl.translate(trans)
-            npl.rotate(npl.Rotation.inverted().multVec(center-trans),
-                       axis,
-                       ycount * angle)
-            placements.append(npl)
-
-    return placements
+        trans = direction * rc
+        local_center = rot.T.dot(c - trans)
+        rotations = np.matmul(rot, rotation_matrices(axis,
+                                                     np.arange(n) * 360.0 / n))
+        ring = np.tile(np.eye(4), (n, 1, 1))
+        ring[:, :3, :3] = rotations
+        ring[:, :3, 3] = base[:3, 3] + c - np.matmul(rotations, local_center)
+        rings.append(ring)
+
+    return np.concatenate(rings)
+
+
+def circ_placements(base_placement,
+                    r_distance, tan_distance,
+                    axis, center,
+                    circle_number, symmetry):
+    """Determine the placements where the circular copies will be."""
+    return placements_from_matrices(circ_matrices(base_placement,
+                                                  r_distance, tan_distance,
+                                                  axis, center,
+                                                  circle_number, symmetry))
 
 ## @}
@@ -187,14 +187,17 @@ class DraftLink(DraftObject):
             else:
                 shape = shape.copy()
                 shape.Placement = App.Placement()
+                # read the list once, every access returns a new copy
+                vis = getattr(obj, 'VisibilityList', [])
                 base = []
                 for i, pla in enumerate(pls):
-                    vis = getattr(obj, 'VisibilityList', [])
                     if len(vis) > i and not vis[i]:
                         continue
 
                     # 'I' is a prefix for disambiguation
-                    # when mapping element names
+                    # when mapping element names.
+                    # The copies only get a new location, so they share
+                    # the geometry of the base shape.
                     base.append(shape.transformed(pla.toMatrix(),
                                                   op='I{}'.format(i)))
 
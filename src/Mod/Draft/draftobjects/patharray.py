@@ -63,6 +63,8 @@ a single property of type `App::PropertyLinkSub`.
 # \ingroup draftobjects
 # \brief Provides the object code for the PathArray object.
 
+import bisect
+
 import FreeCAD as App
 import DraftVecUtils
 import lazy_loader.lazy_loader as lz
@@ -468,12 +470,7 @@ def placements_on_path(shapeRotation, pathwire, count, xlate, align,
     for i in range(1, stop):
         # which edge in path should contain this shape?
         # avoids problems with float math travel > ends[-1]
-        iend = len(ends) - 1
-
-        for j in range(0, len(ends)):
-            if travel <= ends[j]:
-                iend = j
-                break
+        iend = min(bisect.bisect_left(ends, travel), len(ends) - 1)
 
         # place shape at proper spot on proper edge
         remains = ends[iend] - travel
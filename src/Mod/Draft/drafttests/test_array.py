@@ -0,0 +1,131 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Unit tests for the Draft Workbench, array placement tests."""
+## @package test_array
+# \ingroup drafttests
+# \brief Unit tests for the Draft Workbench, array placement tests.
+
+## \addtogroup drafttests
+# @{
+import math
+import unittest
+
+import draftobjects.array as array
+import drafttests.auxiliary as aux
+
+from FreeCAD import Placement, Rotation, Vector
+from draftutils.messages import _msg
+
+
+class DraftArrayPlacements(unittest.TestCase):
+    """Test the placements of the copies of Draft arrays."""
+
+    def setUp(self):
+        """Draw the header of the test."""
+        aux.draw_header()
+
+    def assert_placements(self, placements, expected, operation):
+        """Compare the matrices of the placements with the expected ones."""
+        self.assertEqual(len(placements), len(expected),
+                         "'{}' failed".format(operation))
+        for pl, ex in zip(placements, expected):
+            for a, b in zip(pl.toMatrix().A, ex.toMatrix().A):
+                self.assertAlmostEqual(a, b, 6,
+                                       "'{}' failed".format(operation))
+
+    def test_rect_placements(self):
+        """Place orthogonal copies, also with zero counts."""
+        operation = "array.rect_placements"
+        _msg("  Test '{}'".format(operation))
+        rot = Rotation(Vector(0, 0, 1), 30)
+        base = Placement(Vector(1, 2, 3), rot)
+        x, y, z = Vector(10, 0, 0), Vector(0, 5, 0), Vector(0, 0, 2)
+
+        expected = [Placement(Vector(1, 2, 3), rot),
+                    Placement(Vector(1, 7, 3), rot),
+                    Placement(Vector(11, 2, 3), rot),
+                    Placement(Vector(11, 7, 3), rot)]
+        self.assert_placements(array.rect_placements(base, x, y, z, 2, 2, 1),
+                               expected, operation)
+        # without copies along Z the copies along X and Y remain
+        self.assert_placements(array.rect_placements(base, x, y, z, 2, 2, 0),
+                               expected, operation)
+        # without copies along Y there are no copies along Z either
+        self.assert_placements(array.rect_placements(base, x, y, z, 2, 0, 3),
+                               expected[::2], operation)
+        # without copies along X only the base remains
+        self.assert_placements(array.rect_placements(base, x, y, z, 0, 3, 3),
+                               expected[:1], operation)
+
+    def test_polar_placements(self):
+        """Place polar copies moved along the axis."""
+        operation = "array.polar_placements"
+        _msg("  Test '{}'".format(operation))
+        base = Placement(Vector(10, 0, 0), Rotation())
+        axis = Vector(0, 0, 1)
+
+        expected = [Placement(Vector(10, 0, 0), Rotation()),
+                    Placement(Vector(0, 10, 5), Rotation(axis, 90)),
+                    Placement(Vector(-10, 0, 10), Rotation(axis, 180)),
+                    Placement(Vector(0, -10, 15), Rotation(axis, 270))]
+        placements = array.polar_placements(base, Vector(0, 0, 0), 360,
+                                            4, axis, Vector(0, 0, 5))
+        self.assert_placements(placements, expected, operation)
+
+        # with an angle below 360 degrees the last copy is at the angle
+        placements = array.polar_placements(base, Vector(0, 0, 0), 180,
+                                            3, axis, None)
+        expected = [Placement(Vector(10, 0, 0), Rotation()),
+                    Placement(Vector(0, 10, 0), Rotation(axis, 90)),
+                    Placement(Vector(-10, 0, 0), Rotation(axis, 180))]
+        self.assert_placements(placements, expected, operation)
+
+    def test_circ_placements(self):
+        """Place circular copies of a rotated base."""
+        operation = "array.circ_placements"
+        _msg("  Test '{}'".format(operation))
+        rot = Rotation(Vector(1, 0, 0), 90)
+        base = Placement(Vector(0, 0, 0), rot)
+        axis = Vector(0, 0, 1)
+
+        # the copies are rotated around the axis in the frame of the base,
+        # which the rotation of the base turns into -Y
+        s = 10 * math.sin(math.radians(120))
+        expected = [Placement(Vector(0, 0, 0), rot),
+                    Placement(Vector(-10, 0, 0), rot),
+                    Placement(Vector(5, 0, -s),
+                              rot.multiply(Rotation(axis, 120))),
+                    Placement(Vector(5, 0, s),
+                              rot.multiply(Rotation(axis, 240)))]
+        placements = array.circ_placements(base, 10, 20, axis,
+                                           Vector(0, 0, 0), 2, 1)
+        self.assert_placements(placements, expected, operation)
+
+        # the number of copies on a circle is a multiple of the symmetry
+        placements = array.circ_placements(base, 10, 20, axis,
+                                           Vector(0, 0, 0), 2, 2)
+        half = Placement(Vector(10, 0, 0), rot.multiply(Rotation(axis, 180)))
+        expected = expected[:2] + [half]
+        self.assert_placements(placements, expected, operation)
+
+## @}
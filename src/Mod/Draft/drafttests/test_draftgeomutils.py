@@ -0,0 +1,85 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Unit tests for the Draft Workbench, DraftGeomUtils tests."""
+## @package test_draftgeomutils
+# \ingroup drafttests
+# \brief Unit tests for the Draft Workbench, DraftGeomUtils tests.
+
+## \addtogroup drafttests
+# @{
+import unittest
+
+import DraftGeomUtils
+import drafttests.auxiliary as aux
+import Part
+
+from FreeCAD import Vector
+from draftutils.messages import _msg
+
+
+class DraftGeomUtilsTest(unittest.TestCase):
+    """Test DraftGeomUtils functions which don't need a document."""
+
+    def setUp(self):
+        """Draw the header of the test."""
+        aux.draw_header()
+
+    def test_join_edges(self):
+        """Join unordered edges of a closed and of an open polyline."""
+        operation = "DraftGeomUtils.joinEdges"
+        _msg("  Test '{}'".format(operation))
+        square = [Part.LineSegment(Vector(0, 0, 0), Vector(10, 0, 0)),
+                  Part.LineSegment(Vector(10, 10, 0), Vector(0, 10, 0)),
+                  Part.LineSegment(Vector(10, 0, 0), Vector(10, 10, 0)),
+                  Part.LineSegment(Vector(0, 10, 0), Vector(0, 0, 0))]
+        polyline = [Part.LineSegment(Vector(20, 0, 0), Vector(30, 0, 0)),
+                    Part.LineSegment(Vector(40, 0, 0), Vector(30, 0, 0))]
+        edges = [s.toShape() for s in square + polyline]
+        edges = edges[::2] + edges[1::2]
+
+        wires, openEnds, duplicates = DraftGeomUtils.joinEdges(edges)
+        self.assertEqual(len(wires), 2, "'{}' failed".format(operation))
+        closed = [w for w in wires if w.isClosed()]
+        self.assertEqual(len(closed), 1, "'{}' failed".format(operation))
+        self.assertEqual(len(closed[0].Edges), 4)
+        self.assertEqual(len(openEnds), 2)
+        self.assertEqual(sorted(p.x for p in openEnds), [20, 40])
+        self.assertEqual(duplicates, [])
+
+    def test_join_edges_duplicates(self):
+        """Report duplicate and zero-length edges and snap small gaps."""
+        operation = "DraftGeomUtils.findChains"
+        _msg("  Test '{}'".format(operation))
+        edges = [Part.makeLine(Vector(0, 0, 0), Vector(10, 0, 0)),
+                 Part.makeLine(Vector(10, 0, 0), Vector(0, 0, 0)),
+                 Part.makeLine(Vector(10, 1e-8, 0), Vector(10, 10, 0)),
+                 Part.makeCircle(5, Vector(5, 0, 0), Vector(0, 0, 1), 0, 180)]
+
+        chains, openEnds, duplicates = DraftGeomUtils.findChains(edges, 1e-6)
+        self.assertEqual(len(chains), 1, "'{}' failed".format(operation))
+        self.assertEqual(len(chains[0]), 3)
+        self.assertEqual(len(duplicates), 1)
+        self.assertEqual(len(openEnds), 1)
+        self.assertTrue(openEnds[0].isEqual(Vector(10, 10, 0), 1e-6))
+
+## @}
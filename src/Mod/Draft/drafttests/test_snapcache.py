@@ -0,0 +1,88 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Unit tests for the Draft Workbench, snap cache tests."""
+## @package test_snapcache
+# \ingroup drafttests
+# \brief Unit tests for the Draft Workbench, snap cache tests.
+
+## \addtogroup drafttests
+# @{
+import unittest
+
+import draftguitools.gui_snapcache as snapcache
+import drafttests.auxiliary as aux
+import Part
+
+from FreeCAD import Vector
+from draftutils.messages import _msg
+
+
+class DraftSnapCache(unittest.TestCase):
+    """Test the edge index of the snap cache."""
+
+    def setUp(self):
+        """Draw the header of the test."""
+        aux.draw_header()
+        self.edges = [Part.makeLine(Vector(0, 0, 0), Vector(10, 0, 0)),
+                      Part.makeLine(Vector(20, 0, 5), Vector(30, 0, 5)),
+                      Part.makeCircle(5, Vector(50, 50, 0))]
+        self.index = snapcache.EdgeIndex(Part.Compound(self.edges))
+
+    def assert_edges(self, found, expected, operation):
+        """Compare the found edges with the expected ones."""
+        self.assertEqual(len(found), len(expected),
+                         "'{}' failed".format(operation))
+        for e in expected:
+            self.assertTrue(any(f.isSame(e) for f in found),
+                            "'{}' failed".format(operation))
+
+    def test_edges_near(self):
+        """Find the edges whose boxes touch a box."""
+        operation = "EdgeIndex.edges_near"
+        _msg("  Test '{}'".format(operation))
+        box = Part.makeLine(Vector(5, -1, 0), Vector(5, 1, 0)).BoundBox
+        self.assert_edges(self.index.edges_near(box),
+                          self.edges[:1], operation)
+
+        box = Part.makeLine(Vector(45, 45, 0), Vector(46, 46, 0)).BoundBox
+        self.assert_edges(self.index.edges_near(box),
+                          self.edges[2:], operation)
+
+        box = Part.makeLine(Vector(15, -1, 0), Vector(15, 1, 0)).BoundBox
+        self.assert_edges(self.index.edges_near(box), [], operation)
+
+    def test_edges_near_tolerance(self):
+        """Find the edges near a box with a tolerance and in projection."""
+        operation = "EdgeIndex.edges_near"
+        _msg("  Test '{}'".format(operation))
+        box = Part.makeLine(Vector(15, -1, 0), Vector(15, 1, 0)).BoundBox
+        self.assert_edges(self.index.edges_near(box, 5.5),
+                          self.edges[:2], operation)
+
+        # above the edges they are only found in the projection on XY
+        box = Part.makeLine(Vector(25, -1, 100), Vector(25, 1, 100)).BoundBox
+        self.assert_edges(self.index.edges_near(box), [], operation)
+        self.assert_edges(self.index.edges_near(box, planar=True),
+                          self.edges[1:2], operation)
+
+## @}
@@ -82,6 +82,9 @@ dxfReader = None
 dxfColorMap = None
 dxfLibrary = None
 
+# objects waiting to be added to their layers, see addToLayer()
+layerObjects = None
+
 # Save the native open function to avoid collisions
 # with the function declared here
 if open.__module__ in ['__builtin__', 'io']:
@@ -336,10 +339,11 @@ def locateLayer(wantedLayer, color=None, drawstyle=None):
     """
     # layers is a global variable.
     # It should probably be passed as an argument.
+    # layerIndex maps the decoded names to the layers of the list,
+    # so looking up a layer doesn't depend on the number of layers.
     wantedLayerName = decodeName(wantedLayer)
-    for l in layers:
-        if wantedLayerName == l.Label:
-            return l
+    if wantedLayerName in layerIndex:
+        return layerIndex[wantedLayerName]
     if dxfUseDraftVisGroups:
         newLayer = Draft.makeLayer(name=wantedLayer,
                                    linecolor=color,
@@ -348,9 +352,97 @@ def locateLayer(wantedLayer, color=None, drawstyle=None):
         newLayer = doc.addObject("App::DocumentObjectGroup", wantedLayer)
     newLayer.Label = wantedLayerName
     layers.append(newLayer)
+    layerIndex[wantedLayerName] = newLayer
     return newLayer
 
 
+def addToLayer(layer, obj):
+    """Add an object to a layer or group returned by `locateLayer`.
+
+    While `processdxf` runs, the objects are collected in the global
+    dictionary `layerObjects` and added to their layers at once
+    by `flushLayers`, because adding objects one by one to a large group
+    takes time proportional to the size of the group.
+    Otherwise the object is added immediately.
+
+    Parameters
+    ----------
+    layer : App::FeaturePython or App::DocumentObjectGroup
+        The `Draft Layer` or simple group to which `obj` is added.
+
+    obj : App::DocumentObject
+        The object to add.
+    """
+    if layerObjects is not None:
+        if layer.Name not in layerObjects:
+            layerObjects[layer.Name] = (layer, [])
+        layerObjects[layer.Name][1].append(obj)
+    # For old style layers, which are just groups
+    elif hasattr(layer, "addObject"):
+        layer.addObject(obj)
+    # For new Draft Layers
+    elif hasattr(layer, "Proxy") and hasattr(layer.Proxy, "addObject"):
+        layer.Proxy.addObject(layer, obj)
+
+
+def flushLayers():
+    """Add the objects collected by `addToLayer` to their layers.
+
+    Each layer gets its new objects with a single assignment
+    of its `Group` property. Afterwards objects are added immediately
+    by `addToLayer` again.
+    """
+    global layerObjects
+    collected = layerObjects
+    layerObjects = None
+    if collected:
+        for layer, objs in collected.values():
+            layer.Group = layer.Group + objs
+
+
+def bucketEntities(entities):
+    """Return the entities of a DXF section grouped by their type.
+
+    The entities are classified in one pass, instead of one pass
+    for each type as `entities.get_type()` does.
+
+    Parameters
+    ----------
+    entities : drawing.entities
+        The entities section of a DXF drawing.
+
+    Returns
+    -------
+    dict
+        A dictionary `{type: [entities]}`, the entities of each type
+        are in the order of the file.
+    """
+    buckets = {}
+    for entity in entities.data:
+        kind = getattr(entity, "type", None)
+        if kind in buckets:
+            buckets[kind].append(entity)
+        else:
+            buckets[kind] = [entity]
+    return buckets
+
+
+def recomputeObject(obj):
+    """Recompute a single object created by one of the draw functions.
+
+    Draft objects need their shape before they can be turned
+    into sketches. Recomputing just the object is enough for that,
+    recomputing the whole document gets slower with every imported object.
+
+    Parameters
+    ----------
+    obj : App::DocumentObject or Part.Shape
+        Nothing is done for shapes.
+    """
+    if not isinstance(obj, Part.Shape) and hasattr(obj, "recompute"):
+        obj.recompute()
+
+
 def getdimheight(style):
     """Return the dimension text height from the given dimstyle.
 
@@ -1693,48 +1785,49 @@ def drawBlock(blockref, num=None, createObject=False):
     # print("creating block ", blockref.name,
     #       " containing ", len(blockref.entities.data), " entities")
     shapes = []
-    for line in blockref.entities.get_type('line'):
+    entities = bucketEntities(blockref.entities)
+    for line in entities.get('line', []):
         s = drawLine(line, forceShape=True)
         if s:
             shapes.append(s)
-    for polyline in blockref.entities.get_type('polyline'):
+    for polyline in entities.get('polyline', []):
         if hasattr(polyline, "flags") and polyline.flags in [16, 64]:
             s = drawMesh(polyline, forceShape=True)
         else:
             s = drawPolyline(polyline, forceShape=True)
         if s:
             shapes.append(s)
-    for polyline in blockref.entities.get_type('lwpolyline'):
+    for polyline in entities.get('lwpolyline', []):
         s = drawPolyline(polyline, forceShape=True)
         if s:
             shapes.append(s)
-    for arc in blockref.entities.get_type('arc'):
+    for arc in entities.get('arc', []):
         s = drawArc(arc, forceShape=True)
         if s:
             shapes.append(s)
-    for circle in blockref.entities.get_type('circle'):
+    for circle in entities.get('circle', []):
         s = drawCircle(circle, forceShape=True)
         if s:
             shapes.append(s)
-    for insert in blockref.entities.get_type('insert'):
+    for insert in entities.get('insert', []):
         # print("insert ",insert," in block ",insert.block[0])
         if dxfStarBlocks or insert.block[0] != '*':
             s = drawInsert(insert)
             if s:
                 shapes.append(s)
-    for solid in blockref.entities.get_type('solid'):
+    for solid in entities.get('solid', []):
         s = drawSolid(solid)
         if s:
             shapes.append(s)
-    for spline in blockref.entities.get_type('spline'):
+    for spline in entities.get('spline', []):
         s = drawSpline(spline, forceShape=True)
         if s:
             shapes.append(s)
-    for text in blockref.entities.get_type('text'):
+    for text in entities.get('text', []):
         if dxfImportTexts:
             if dxfImportLayouts or (not rawValue(text, 67)):
                 addText(text)
-    for text in blockref.entities.get_type('mtext'):
+    for text in entities.get('mtext', []):
         if dxfImportTexts:
             if dxfImportLayouts or (not rawValue(text, 67)):
                 print("adding block text", text.value, " from ", blockref)
@@ -1975,13 +2068,7 @@ def addObject(shape, name="Shape", layer=None):
     else:
         newob = shape
     if layer:
-        lay = locateLayer(layer)
-        # For old style layers, which are just groups
-        if hasattr(lay, "addObject"):
-            lay.addObject(newob)
-        # For new Draft Layers
-        elif hasattr(lay, "Proxy") and hasattr(lay.Proxy, "addObject"):
-            lay.Proxy.addObject(lay, newob)
+        addToLayer(locateLayer(layer), newob)
     formatObject(newob)
     return newob
 
@@ -2051,10 +2138,7 @@ def addText(text, attrib=False):
         #    except Exception:
         #        pass
         newob = Draft.makeText(val.split("\n"))
-        if hasattr(lay, "addObject"):
-            lay.addObject(newob)
-        elif hasattr(lay, "Proxy") and hasattr(lay.Proxy, "addObject"):
-            lay.Proxy.addObject(lay, newob)
+        addToLayer(lay, newob)
         rx = rawValue(text, 11)
         ry = rawValue(text, 21)
         rz = rawValue(text, 31)
@@ -2181,6 +2265,22 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     -----
     Use local variables, not global variables.
     """
+    global layerObjects
+    layerObjects = {}
+    try:
+        return drawDXF(document, filename, getShapes, reComputeFlag)
+    finally:
+        # the objects are added to their layers even if the import fails,
+        # and afterwards addToLayer adds objects immediately again
+        flushLayers()
+
+
+def drawDXF(document, filename, getShapes=False, reComputeFlag=True):
+    """Read the DXF file and create its objects, see `processdxf`.
+
+    The objects are collected by `addToLayer` and added to their layers
+    by `flushLayers`, before the document is recomputed.
+    """
     # for debugging the drawing variable is global so it is still accessible
     # after running the script
     global drawing
@@ -2191,6 +2291,8 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     drawing = dxfReader.readDXF(filename)
     global layers
     layers = []
+    global layerIndex
+    layerIndex = {}
     global doc
     doc = document
     global blockshapes
@@ -2203,6 +2305,14 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     layerBlocks = {}
     sketch = None
     shapes = []
+    # With dxfShapesPerLayer the entities are imported as plain shapes
+    # and gathered in one compound per layer, like with dxfMakeBlocks
+    createSketch = dxfCreateSketch and not dxfShapesPerLayer
+    makeBlocks = dxfMakeBlocks or dxfShapesPerLayer
+    forceShape = dxfShapesPerLayer
+
+    # Sort the entities by type in a single pass
+    entities = bucketEntities(drawing.entities)
 
     # Create layers
     if hasattr(drawing, "tables"):
@@ -2223,16 +2333,16 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         locateLayer("0", (0.0, 0.0, 0.0), "Solid")
 
      # Draw lines
-    lines = drawing.entities.get_type("line")
+    lines = entities.get("line", [])
     if lines:
         FCC.PrintMessage("drawing " + str(len(lines)) + " lines...\n")
     for line in lines:
         if dxfImportLayouts or (not rawValue(line, 67)):
-            shape = drawLine(line)
+            shape = drawLine(line, forceShape)
             if shape:
-                if dxfCreateSketch:
-                    FreeCAD.ActiveDocument.recompute()
-                    if dxfMakeBlocks or dxfJoin:
+                if createSketch:
+                    recomputeObject(shape)
+                    if makeBlocks or dxfJoin:
                         if sketch:
                             shape = Draft.makeSketch(shape,
                                                      autoconstraints=True,
@@ -2249,7 +2359,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         shapes.append(shape)
                     else:
                         shapes.append(shape.Shape)
-                elif dxfMakeBlocks:
+                elif makeBlocks:
                     addToBlock(shape, line.layer)
                 else:
                     newob = addObject(shape, "Line", line.layer)
@@ -2257,8 +2367,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         formatObject(newob, line)
 
     # Draw polylines
-    pls = drawing.entities.get_type("lwpolyline")
-    pls.extend(drawing.entities.get_type("polyline"))
+    pls = entities.get("lwpolyline", []) + entities.get("polyline", [])
     polylines = []
     meshes = []
     for p in pls:
@@ -2274,16 +2383,16 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     num = 0
     for polyline in polylines:
         if dxfImportLayouts or (not rawValue(polyline, 67)):
-            shape = drawPolyline(polyline, num)
+            shape = drawPolyline(polyline, num or forceShape)
             if shape:
-                if dxfCreateSketch:
+                if createSketch:
                     if isinstance(shape, Part.Shape):
                         t = FreeCAD.ActiveDocument.addObject("Part::Feature",
                                                              "Shape")
                         t.Shape = shape
                         shape = t
-                    FreeCAD.ActiveDocument.recompute()
-                    if dxfMakeBlocks or dxfJoin:
+                    recomputeObject(shape)
+                    if makeBlocks or dxfJoin:
                         if sketch:
                             shape = Draft.makeSketch(shape,
                                                      autoconstraints=True,
@@ -2300,7 +2409,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         shapes.append(shape)
                     else:
                         shapes.append(shape.Shape)
-                elif dxfMakeBlocks:
+                elif makeBlocks:
                     addToBlock(shape, polyline.layer)
                 else:
                     newob = addObject(shape, "Polyline", polyline.layer)
@@ -2309,16 +2418,16 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
             num += 1
 
     # Draw arcs
-    arcs = drawing.entities.get_type("arc")
+    arcs = entities.get("arc", [])
     if arcs:
         FCC.PrintMessage("drawing " + str(len(arcs)) + " arcs...\n")
     for arc in arcs:
         if dxfImportLayouts or (not rawValue(arc, 67)):
-            shape = drawArc(arc)
+            shape = drawArc(arc, forceShape)
             if shape:
-                if dxfCreateSketch:
-                    FreeCAD.ActiveDocument.recompute()
-                    if dxfMakeBlocks or dxfJoin:
+                if createSketch:
+                    recomputeObject(shape)
+                    if makeBlocks or dxfJoin:
                         if sketch:
                             shape = Draft.makeSketch(shape,
                                                      autoconstraints=True,
@@ -2335,7 +2444,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         shapes.append(shape)
                     else:
                         shapes.append(shape.Shape)
-                elif dxfMakeBlocks:
+                elif makeBlocks:
                     addToBlock(shape, arc.layer)
                 else:
                     newob = addObject(shape, "Arc", arc.layer)
@@ -2348,38 +2457,28 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         edges = []
         for s in shapes:
             edges.extend(s.Edges)
-        if len(edges) > (100):
-            FCC.PrintMessage(str(len(edges)) + " edges to join\n")
-            if FreeCAD.GuiUp:
-                d = QtGui.QMessageBox()
-                d.setText("Warning: High number of entities to join (>100)")
-                d.setInformativeText("This might take a long time "
-                                     "or even freeze your computer. "
-                                     "Are you sure? You can also disable "
-                                     "the 'join geometry' setting in DXF "
-                                     "import preferences")
-                d.setStandardButtons(QtGui.QMessageBox.Ok
-                                     | QtGui.QMessageBox.Cancel)
-                d.setDefaultButton(QtGui.QMessageBox.Cancel)
-                res = d.exec_()
-                if res == QtGui.QMessageBox.Cancel:
-                    FCC.PrintMessage("Aborted\n")
-                    return
-        shapes = DraftGeomUtils.findWires(edges)
+        FCC.PrintMessage(str(len(edges)) + " edges to join\n")
+        shapes, openEnds, duplicates = DraftGeomUtils.joinEdges(edges)
+        FCC.PrintMessage(str(len(shapes)) + " wires, "
+                         + str(len(openEnds)) + " open ends\n")
+        if duplicates:
+            FCC.PrintWarning("dxf: " + str(len(duplicates))
+                             + " duplicate or zero-length edges"
+                             " were not imported\n")
         for s in shapes:
             newob = addObject(s)
 
     # Draw circles
-    circles = drawing.entities.get_type("circle")
+    circles = entities.get("circle", [])
     if circles:
         FCC.PrintMessage("drawing " + str(len(circles))+" circles...\n")
     for circle in circles:
         if dxfImportLayouts or (not rawValue(circle, 67)):
-            shape = drawCircle(circle)
+            shape = drawCircle(circle, forceShape)
             if shape:
-                if dxfCreateSketch:
-                    FreeCAD.ActiveDocument.recompute()
-                    if dxfMakeBlocks or dxfJoin:
+                if createSketch:
+                    recomputeObject(shape)
+                    if makeBlocks or dxfJoin:
                         if sketch:
                             shape = Draft.makeSketch(shape,
                                                      autoconstraints=True,
@@ -2391,7 +2490,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                     else:
                         shape = Draft.makeSketch(shape,
                                                  autoconstraints=True)
-                elif dxfMakeBlocks:
+                elif makeBlocks:
                     addToBlock(shape, circle.layer)
                 elif getShapes:
                     if isinstance(shape, Part.Shape):
@@ -2404,7 +2503,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         formatObject(newob, circle)
 
     # Draw solids
-    solids = drawing.entities.get_type("solid")
+    solids = entities.get("solid", [])
     if solids:
         FCC.PrintMessage("drawing " + str(len(solids)) + " solids...\n")
     for solid in solids:
@@ -2412,7 +2511,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         if dxfImportLayouts or (not rawValue(solid, 67)):
             shape = drawSolid(solid)
             if shape:
-                if dxfMakeBlocks:
+                if makeBlocks:
                     addToBlock(shape, lay)
                 elif getShapes:
                     if isinstance(shape, Part.Shape):
@@ -2425,15 +2524,15 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         formatObject(newob, solid)
 
     # Draw splines
-    splines = drawing.entities.get_type("spline")
+    splines = entities.get("spline", [])
     if splines:
         FCC.PrintMessage("drawing " + str(len(splines)) + " splines...\n")
     for spline in splines:
         lay = rawValue(spline, 8)
         if dxfImportLayouts or (not rawValue(spline, 67)):
-            shape = drawSpline(spline)
+            shape = drawSpline(spline, forceShape)
             if shape:
-                if dxfMakeBlocks:
+                if makeBlocks:
                     addToBlock(shape, lay)
                 elif getShapes:
                     if isinstance(shape, Part.Shape):
@@ -2446,15 +2545,15 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         formatObject(newob, spline)
 
     # Draw ellipses
-    ellipses = drawing.entities.get_type("ellipse")
+    ellipses = entities.get("ellipse", [])
     if ellipses:
         FCC.PrintMessage("drawing " + str(len(ellipses)) + " ellipses...\n")
     for ellipse in ellipses:
         lay = rawValue(ellipse, 8)
         if dxfImportLayouts or (not rawValue(ellipse, 67)):
-            shape = drawEllipse(ellipse)
+            shape = drawEllipse(ellipse, forceShape)
             if shape:
-                if dxfMakeBlocks:
+                if makeBlocks:
                     addToBlock(shape, lay)
                 elif getShapes:
                     if isinstance(shape, Part.Shape):
@@ -2468,8 +2567,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
 
     # Draw texts
     if dxfImportTexts:
-        texts = drawing.entities.get_type("mtext")
-        texts.extend(drawing.entities.get_type("text"))
+        texts = entities.get("mtext", []) + entities.get("text", [])
         if texts:
             FCC.PrintMessage("drawing " + str(len(texts)) + " texts...\n")
         for text in texts:
@@ -2479,7 +2577,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         FCC.PrintMessage("skipping texts...\n")
 
     # Draw 3D objects
-    faces3d = drawing.entities.get_type("3dface")
+    faces3d = entities.get("3dface", [])
     if faces3d:
         FCC.PrintMessage("drawing " + str(len(faces3d)) + " 3dfaces...\n")
     for face3d in faces3d:
@@ -2490,6 +2588,8 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                     shapes.append(shape)
                 else:
                     shapes.append(shape.Shape)
+            elif dxfShapesPerLayer:
+                addToBlock(shape, face3d.layer)
             else:
                 newob = addObject(shape, "Face", face3d.layer)
                 if gui:
@@ -2500,19 +2600,19 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         me = drawMesh(mesh)
         if me:
             newob = doc.addObject("Mesh::Feature", "Mesh")
-            lay = locateLayer(rawValue(mesh, 8))
-            lay.addObject(newob)
+            addToLayer(locateLayer(rawValue(mesh, 8)), newob)
             newob.Mesh = me
             if gui:
                 formatObject(newob, mesh)
 
     # End of shape-based objects, return if we are just getting shapes
     if getShapes and shapes:
+        flushLayers()
         return shapes
 
     # Draw dimensions
     if dxfImportTexts:
-        dims = drawing.entities.get_type("dimension")
+        dims = entities.get("dimension", [])
         FCC.PrintMessage("drawing " + str(len(dims)) + " dimensions...\n")
         for dim in dims:
             if dxfImportLayouts or (not rawValue(dim, 67)):
@@ -2571,7 +2671,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         elif angle in [90, 270]:
                             p2 = vec([x2, y3, z2])
                     newob = doc.addObject("App::FeaturePython", "Dimension")
-                    lay.addObject(newob)
+                    addToLayer(lay, newob)
                     _Dimension(newob)
                     if FreeCAD.GuiUp:
                         from Draft import _ViewProviderDimension
@@ -2594,7 +2694,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
 
     # Draw points
     if dxfImportPoints:
-        points = drawing.entities.get_type("point")
+        points = entities.get("point", [])
         if points:
             FCC.PrintMessage("drawing " + str(len(points)) + " points...\n")
         for point in points:
@@ -2603,13 +2703,12 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
             z = vec(rawValue(point, 30))
             lay = rawValue(point, 8)
             if dxfImportLayouts or (not rawValue(point, 67)):
-                if dxfMakeBlocks:
+                if makeBlocks:
                     shape = Part.Vertex(x, y, z)
                     addToBlock(shape, lay)
                 else:
                     newob = Draft.makePoint(x, y, z)
-                    lay = locateLayer(lay)
-                    lay.addObject(newob)
+                    addToLayer(locateLayer(lay), newob)
                     if gui:
                         formatObject(newob, point)
     else:
@@ -2617,15 +2716,14 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
 
     # Draw leaders
     if dxfImportTexts:
-        leaders = drawing.entities.get_type("leader")
+        leaders = entities.get("leader", [])
         if leaders:
             FCC.PrintMessage("drawing " + str(len(leaders)) + " leaders...\n")
         for leader in leaders:
             if dxfImportLayouts or (not rawValue(leader, 67)):
                 points = getMultiplePoints(leader)
                 newob = Draft.makeWire(points)
-                lay = locateLayer(rawValue(leader, 8))
-                lay.addObject(newob)
+                addToLayer(locateLayer(rawValue(leader, 8)), newob)
                 if gui:
                     newob.ViewObject.EndArrow = True
                     formatObject(newob, leader)
@@ -2634,7 +2732,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
 
     # Draw hatches
     if dxfImportHatches:
-        hatches = drawing.entities.get_type("hatch")
+        hatches = entities.get("hatch", [])
         if hatches:
             FCC.PrintMessage("drawing " + str(len(hatches)) + " hatches...\n")
         for hatch in hatches:
@@ -2644,10 +2742,10 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                     lay = rawValue(hatch, 8)
                     points = points[:-1]
                     newob = None
-                    if dxfCreatePart or dxfMakeBlocks:
+                    if dxfCreatePart or makeBlocks:
                         points.append(points[0])
                         s = Part.makePolygon(points)
-                        if dxfMakeBlocks:
+                        if makeBlocks:
                             addToBlock(s, lay)
                         else:
                             newob = addObject(s, "Hatch", lay)
@@ -2655,14 +2753,14 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                                 formatObject(newob, hatch)
                     else:
                         newob = Draft.makeWire(points)
-                        locateLayer(lay).addObject(newob)
+                        addToLayer(locateLayer(lay), newob)
                         if gui:
                             formatObject(newob, hatch)
     else:
         FCC.PrintMessage("skipping hatches...\n")
 
     # Draw blocks
-    inserts = drawing.entities.get_type("insert")
+    inserts = entities.get("insert", [])
     if not dxfStarBlocks:
         FCC.PrintMessage("skipping *blocks...\n")
         newinserts = []
@@ -2675,18 +2773,18 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
         FCC.PrintMessage("drawing " + str(len(inserts)) + " blocks...\n")
         blockrefs = drawing.blocks.data
         for ref in blockrefs:
-            if dxfCreateDraft or dxfCreateSketch:
+            if (dxfCreateDraft or dxfCreateSketch) and not forceShape:
                 drawBlock(ref, createObject=True)
             else:
                 drawBlock(ref, createObject=False)
         num = 0
         for insert in inserts:
-            if (dxfCreateDraft or dxfCreateSketch) and not dxfMakeBlocks:
+            if (dxfCreateDraft or dxfCreateSketch) and not makeBlocks:
                 shape = drawInsert(insert, num, clone=True)
             else:
                 shape = drawInsert(insert, num)
             if shape:
-                if dxfMakeBlocks:
+                if makeBlocks:
                     addToBlock(shape, insert.layer)
                 else:
                     newob = addObject(shape, "Block." + insert.block,
@@ -2696,12 +2794,15 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
             num += 1
 
     # Make blocks, if any
-    if dxfMakeBlocks:
+    if makeBlocks:
         print("creating layerblocks...")
         for k, l in layerBlocks.items():
             shape = drawLayerBlock(l)
             if shape:
-                newob = addObject(shape, k)
+                if dxfShapesPerLayer:
+                    newob = addObject(shape, k, k)
+                else:
+                    newob = addObject(shape, k)
     del layerBlocks
 
     # Hide block objects, if any
@@ -2710,6 +2811,9 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
             o.ViewObject.hide()
     del blockobjects
 
+    # Add the new objects to their layers
+    flushLayers()
+
     # Finishing
     print("done processing")
 
@@ -4222,7 +4326,8 @@ def readPreferences():
     `dxfImportPoints`, `dxfImportHatches`, `dxfUseStandardSize`,
     `dxfGetColors`, `dxfUseDraftVisGroups`, `dxfFillMode`,
     `dxfBrightBackground`, `dxfDefaultColor`, `dxfUseLegacyImporter`,
-    `dxfExportBlocks`, `dxfScaling`, `dxfUseLegacyExporter`
+    `dxfExportBlocks`, `dxfScaling`, `dxfUseLegacyExporter`,
+    `dxfShapesPerLayer`
 
     The parameter path is ``User parameter:BaseApp/Preferences/Mod/Draft``
 
@@ -4246,7 +4351,7 @@ def readPreferences():
     global dxfGetColors, dxfUseDraftVisGroups
     global dxfFillMode, dxfBrightBackground, dxfDefaultColor
     global dxfUseLegacyImporter, dxfExportBlocks, dxfScaling
-    global dxfUseLegacyExporter
+    global dxfUseLegacyExporter, dxfShapesPerLayer
     dxfCreatePart = p.GetBool("dxfCreatePart", True)
     dxfCreateDraft = p.GetBool("dxfCreateDraft", False)
     dxfCreateSketch = p.GetBool("dxfCreateSketch", False)
@@ -4254,6 +4359,7 @@ def readPreferences():
     dxfStarBlocks = p.GetBool("dxfstarblocks", False)
     dxfMakeBlocks = p.GetBool("groupLayers", False)
     dxfJoin = p.GetBool("joingeometry", False)
+    dxfShapesPerLayer = p.GetBool("dxfShapesPerLayer", False)
     dxfRenderPolylineWidth = p.GetBool("renderPolylineWidth", False)
     dxfImportTexts = p.GetBool("dxftext", False)
     dxfImportLayouts = p.GetBool("dxflayouts", False)
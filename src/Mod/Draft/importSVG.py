@@ -229,6 +229,22 @@ svgcolors = {
 svgcolorslower = \
     dict((key.lower(), value) for (key, value) in list(svgcolors.items()))
 
+# regular expressions of path data and transforms, compiled once
+_op = '([mMlLhHvVaAcCqQsStTzZ])'
+_op2 = '([^mMlLhHvVaAcCqQsStTzZ]*)'
+_command = '\s*?' + _op + '\s*?' + _op2 + '\s*?'
+pathcommandsre = re.compile(_command, re.DOTALL)
+
+_num = '[-+]?[0-9]*\.?[0-9]+'
+_exp = '([eE][-+]?[0-9]+)?'
+_point = '(' + _num + _exp + ')'
+pointsre = re.compile(_point, re.DOTALL)
+
+_op = '(matrix|translate|scale|rotate|skewX|skewY)'
+_val = '\((.*?)\)'
+_transf = _op + '\s*?' + _val
+transformre = re.compile(_transf, re.DOTALL)
+
 
 def getcolor(color):
     """Check if the given string is an RGB value, or if it is a named color.
@@ -425,7 +441,8 @@ def getsize(length, mode='discard', base=1):
 def makewire(path, checkclosed=False, donttry=False):
     '''Try to make a wire out of the list of edges.
 
-    If the wire functions fail or the wire is not closed,
+    The edges are joined with `DraftGeomUtils.joinEdges`.
+    If that doesn't give a single wire, or the wire is not closed,
     if required the TopoShapeCompoundPy::connectEdgesToWires()
     function is used.
 
@@ -449,10 +466,14 @@ def makewire(path, checkclosed=False, donttry=False):
     if not donttry:
         try:
             import Part
-            sh = Part.Wire(Part.__sortEdges__(path))
-            # sh = Part.Wire(path)
-            isok = (not checkclosed) or sh.isClosed()
-            if len(sh.Edges) != len(path):
+            import DraftGeomUtils
+            wires = DraftGeomUtils.joinEdges(path)[0]
+            if len(wires) == 1:
+                sh = wires[0]
+                isok = (not checkclosed) or sh.isClosed()
+                if len(sh.Edges) != len(path):
+                    isok = False
+            else:
                 isok = False
         # BRep_API: command not done
         except Part.OCCError:
@@ -650,9 +671,14 @@ class svgHandler(xml.sax.ContentHandler):
         self.style = params.GetInt("svgstyle")
         self.disableUnitScaling = params.GetBool("svgDisableUnitScaling",
                                                  False)
+        self.compoundPerLayer = params.GetBool("svgCompoundPerLayer", False)
         self.count = 0
         self.transform = None
         self.grouptransform = []
+        self.groupmatrix = []
+        self.groupdepth = 0
+        self.layer = None
+        self.layershapes = {}
         self.lastdim = None
         self.viewbox = None
         self.symbols = {}
@@ -832,7 +858,7 @@ class svgHandler(xml.sax.ContentHandler):
                 elif len(self.grouptransform) == 0:
                     # fallback to current dpi
                     m.scale(Vector(25.4/self.svgdpi, 25.4/self.svgdpi, 1))
-            self.grouptransform.append(m)
+            self.pushGroupTransform(m)
         if 'fill' in data:
             if data['fill'][0] != 'none':
                 self.fill = getcolor(data['fill'])
@@ -846,12 +872,12 @@ class svgHandler(xml.sax.ContentHandler):
         if 'transform' in data:
             m = self.getMatrix(attrs.getValue('transform'))
             if name == "g":
-                self.grouptransform.append(m)
+                self.pushGroupTransform(m)
             else:
                 self.transform = m
         else:
             if name == "g":
-                self.grouptransform.append(FreeCAD.Matrix())
+                self.pushGroupTransform(FreeCAD.Matrix())
 
         if self.style == 1:
             self.color = self.col
@@ -862,6 +888,14 @@ class svgHandler(xml.sax.ContentHandler):
             pathname = data['id'][0]
             _msg('name: {}'.format(pathname))
 
+        # Top level groups are the layers of the compound mode
+        if name == "g":
+            self.groupdepth += 1
+            if self.groupdepth == 1:
+                self.layer = (attrs.get('inkscape:label')
+                              or pathname
+                              or 'Layer')
+
         # Process paths
         if name == "path":
             _msg('data: {}'.format(data))
@@ -890,15 +924,6 @@ class svgHandler(xml.sax.ContentHandler):
                 self.lastdim = obj
                 data['d'] = []
 
-            _op = '([mMlLhHvVaAcCqQsStTzZ])'
-            _op2 = '([^mMlLhHvVaAcCqQsStTzZ]*)'
-            _command = '\s*?' + _op + '\s*?' + _op2 + '\s*?'
-            pathcommandsre = re.compile(_command, re.DOTALL)
-
-            _num = '[-+]?[0-9]*\.?[0-9]+'
-            _exp = '([eE][-+]?[0-9]+)?'
-            _point = '(' + _num + _exp + ')'
-            pointsre = re.compile(_point, re.DOTALL)
             _commands = pathcommandsre.findall(' '.join(data['d']))
             for d, pointsstr in _commands:
                 relative = d.islower()
@@ -913,12 +938,7 @@ class svgHandler(xml.sax.ContentHandler):
                         sh = makewire(path)
                         if self.fill and sh.isClosed():
                             sh = Part.Face(sh)
-                        sh = self.applyTrans(sh)
-                        obj = self.doc.addObject("Part::Feature", pathname)
-                        obj.Shape = sh
-                        self.format(obj)
-                        if self.currentsymbol:
-                            self.symbols[self.currentsymbol].append(obj)
+                        self.addShape(pathname, sh)
                         path = []
                         # if firstvec:
                         #    Move relative to last move command
@@ -1192,29 +1212,19 @@ class svgHandler(xml.sax.ContentHandler):
                                 and len(sh.Wires) == 1 \
                                 and sh.Wires[0].isClosed():
                             sh = Part.Face(sh)
-                        sh = self.applyTrans(sh)
-                        obj = self.doc.addObject("Part::Feature", pathname)
-                        obj.Shape = sh
-                        self.format(obj)
+                        self.addShape(pathname, sh)
                         path = []
                         if firstvec:
                             # Move relative to recent draw command
                             lastvec = firstvec
                         point = []
                         # command = None
-                        if self.currentsymbol:
-                            self.symbols[self.currentsymbol].append(obj)
             if path:
                 sh = makewire(path, checkclosed=False)
                 # sh = Part.Wire(path)
                 if self.fill and sh.isClosed():
                     sh = Part.Face(sh)
-                sh = self.applyTrans(sh)
-                obj = self.doc.addObject("Part::Feature", pathname)
-                obj.Shape = sh
-                self.format(obj)
-                if self.currentsymbol:
-                    self.symbols[self.currentsymbol].append(obj)
+                self.addShape(pathname, sh)
         # end process paths
 
         # Process rects
@@ -1308,12 +1318,7 @@ class svgHandler(xml.sax.ContentHandler):
             sh = Part.Wire(edges)
             if self.fill:
                 sh = Part.Face(sh)
-            sh = self.applyTrans(sh)
-            obj = self.doc.addObject("Part::Feature", pathname)
-            obj.Shape = sh
-            self.format(obj)
-            if self.currentsymbol:
-                self.symbols[self.currentsymbol].append(obj)
+            self.addShape(pathname, sh)
 
         # Process lines
         if name == "line":
@@ -1322,12 +1327,7 @@ class svgHandler(xml.sax.ContentHandler):
             p1 = Vector(data['x1'], -data['y1'], 0)
             p2 = Vector(data['x2'], -data['y2'], 0)
             sh = Part.LineSegment(p1, p2).toShape()
-            sh = self.applyTrans(sh)
-            obj = self.doc.addObject("Part::Feature", pathname)
-            obj.Shape = sh
-            self.format(obj)
-            if self.currentsymbol:
-                self.symbols[self.currentsymbol].append(obj)
+            self.addShape(pathname, sh)
 
         # Process polylines and polygons
         if name == "polyline" or name == "polygon":
@@ -1360,11 +1360,7 @@ class svgHandler(xml.sax.ContentHandler):
                     sh = Part.Wire(path)
                     if self.fill and sh.isClosed():
                         sh = Part.Face(sh)
-                    sh = self.applyTrans(sh)
-                    obj = self.doc.addObject("Part::Feature", pathname)
-                    obj.Shape = sh
-                    if self.currentsymbol:
-                        self.symbols[self.currentsymbol].append(obj)
+                    self.addShape(pathname, sh)
 
         # Process ellipses
         if name == "ellipse":
@@ -1392,12 +1388,7 @@ class svgHandler(xml.sax.ContentHandler):
             if self.fill:
                 sh = Part.Wire([sh])
                 sh = Part.Face(sh)
-            sh = self.applyTrans(sh)
-            obj = self.doc.addObject("Part::Feature", pathname)
-            obj.Shape = sh
-            self.format(obj)
-            if self.currentsymbol:
-                self.symbols[self.currentsymbol].append(obj)
+            self.addShape(pathname, sh)
 
         # Process circles
         if name == "circle" and "freecad:skip" not in data:
@@ -1410,12 +1401,7 @@ class svgHandler(xml.sax.ContentHandler):
                 sh = Part.Wire([sh])
                 sh = Part.Face(sh)
             sh.translate(c)
-            sh = self.applyTrans(sh)
-            obj = self.doc.addObject("Part::Feature", pathname)
-            obj.Shape = sh
-            self.format(obj)
-            if self.currentsymbol:
-                self.symbols[self.currentsymbol].append(obj)
+            self.addShape(pathname, sh)
 
         # Process texts
         if name in ["text", "tspan"]:
@@ -1481,9 +1467,8 @@ class svgHandler(xml.sax.ContentHandler):
             if self.transform:
                 vec = self.translateVec(vec, self.transform)
                 # print("own transform: ", self.transform, vec)
-            for transform in self.grouptransform[::-1]:
-                # vec = self.translateVec(vec, transform)
-                vec = transform.multiply(vec)
+            if self.groupmatrix:
+                vec = self.groupmatrix[-1].multiply(vec)
             # print("applying vector: ", vec)
             obj.Position = vec
             if FreeCAD.GuiUp:
@@ -1507,6 +1492,12 @@ class svgHandler(xml.sax.ContentHandler):
         if name == "g" or name == "svg":
             _msg("closing group")
             self.grouptransform.pop()
+            self.groupmatrix.pop()
+        if name == "g":
+            if self.groupdepth == 1:
+                self.flushLayer(self.layer)
+                self.layer = None
+            self.groupdepth -= 1
         if name == "symbol":
             if self.doc.getObject("svgsymbols"):
                 group = self.doc.getObject("svgsymbols")
@@ -1517,6 +1508,97 @@ class svgHandler(xml.sax.ContentHandler):
                 group.addObject(o)
             self.currentsymbol = None
 
+    def pushGroupTransform(self, m):
+        """Add the transform of a group to the stack of group transforms.
+
+        The product with the transforms of the enclosing groups is kept
+        in `groupmatrix`, so the shapes are transformed only once.
+
+        Parameters
+        ----------
+        m : Base::Matrix4D
+            The transform of the group
+        """
+        self.grouptransform.append(m)
+        if self.groupmatrix:
+            m = self.groupmatrix[-1].multiply(m)
+        self.groupmatrix.append(m)
+
+    def getTransform(self):
+        """Return the transform of the current element, or None.
+
+        Returns
+        -------
+        Base::Matrix4D
+            The product of the group transforms and of the transform
+            of the element itself.
+        """
+        mat = self.groupmatrix[-1] if self.groupmatrix else None
+        if self.transform:
+            if mat:
+                mat = mat.multiply(self.transform)
+            else:
+                mat = self.transform
+        return mat
+
+    def addShape(self, name, sh):
+        """Transform a shape and add it to the document.
+
+        If the compound per layer preference is set, shapes which
+        are not part of a symbol are collected and added
+        with `flushLayer` as one compound for each top level group.
+
+        Parameters
+        ----------
+        name : str
+            The name of the new object
+        sh : Part.Shape
+            The shape, before the transformations are applied
+
+        Returns
+        -------
+        Part::Feature
+            The new object, or None if the shape was collected.
+        """
+        sh = self.applyTrans(sh)
+        if self.compoundPerLayer and not self.currentsymbol:
+            if self.layer not in self.layershapes:
+                self.layershapes[self.layer] = ([], (self.color,
+                                                     self.width,
+                                                     self.fill))
+            self.layershapes[self.layer][0].append(sh)
+            return None
+        obj = self.doc.addObject("Part::Feature", name)
+        obj.Shape = sh
+        self.format(obj)
+        if self.currentsymbol:
+            self.symbols[self.currentsymbol].append(obj)
+        return obj
+
+    def flushLayer(self, layer):
+        """Add the shapes collected for a layer as one compound object.
+
+        The object gets the style of the first shape of the layer.
+
+        Parameters
+        ----------
+        layer : str
+            The label of the top level group, or None for the shapes
+            outside of groups
+        """
+        if layer not in self.layershapes:
+            return
+        shapes, style = self.layershapes.pop(layer)
+        obj = self.doc.addObject("Part::Feature", layer or "Shapes")
+        obj.Shape = Part.makeCompound(shapes)
+        self.color, self.width, self.fill = style
+        self.format(obj)
+
+    def endDocument(self):
+        """Add the shapes which are not part of any layer."""
+        for layer in list(self.layershapes):
+            self.flushLayer(layer)
+
     def applyTrans(self, sh):
         """Apply transformation to the shape and return the new shape.
 
@@ -1525,29 +1607,21 @@ class svgHandler(xml.sax.ContentHandler):
         sh : Part.Shape or Draft.Dimension
             Object to be transformed
         """
+        mat = self.getTransform()
         if isinstance(sh, Part.Shape):
-            if self.transform:
-                _msg("applying object transform: {}".format(self.transform))
-                # sh = transformCopyShape(sh, self.transform)
-                # see issue #2062
-                sh = sh.transformGeometry(self.transform)
-            for transform in self.grouptransform[::-1]:
-                _msg("applying group transform: {}".format(transform))
-                # sh = transformCopyShape(sh, transform)
+            if mat:
+                _msg("applying transform: {}".format(mat))
+                # sh = transformCopyShape(sh, mat)
                 # see issue #2062
-                sh = sh.transformGeometry(transform)
+                sh = sh.transformGeometry(mat)
             return sh
         elif Draft.getType(sh) in ["Dimension","LinearDimension"]:
             pts = []
             for p in [sh.Start, sh.End, sh.Dimline]:
                 cp = Vector(p)
-                if self.transform:
-                    _msg("applying object transform: "
-                         "{}".format(self.transform))
-                    cp = self.transform.multiply(cp)
-                for transform in self.grouptransform[::-1]:
-                    _msg("applying group transform: {}".format(transform))
-                    cp = transform.multiply(cp)
+                if mat:
+                    _msg("applying transform: {}".format(mat))
+                    cp = mat.multiply(cp)
                 pts.append(cp)
             sh.Start = pts[0]
             sh.End = pts[1]
@@ -1581,10 +1655,6 @@ class svgHandler(xml.sax.ContentHandler):
         Base::Matrix4D
             The translated matrix.
         """
-        _op = '(matrix|translate|scale|rotate|skewX|skewY)'
-        _val = '\((.*?)\)'
-        _transf = _op + '\s*?' + _val
-        transformre = re.compile(_transf, re.DOTALL)
         m = FreeCAD.Matrix()
         for transformation, arguments in transformre.findall(tr):
             _args_rep = arguments.replace(',', ' ').split()
@@ -60,6 +60,9 @@ FreeCAD.__unit_test__ += ["TestFemApp"]
 # add import and export file types
 FreeCAD.addExportType("FEM mesh Python (*.meshpy)", "feminout.importPyMesh")
 
+FreeCAD.addImportType("FEM mesh NumPy (*.npz)", "feminout.importNumpyMesh")
+FreeCAD.addExportType("FEM mesh NumPy (*.npz)", "feminout.importNumpyMesh")
+
 FreeCAD.addExportType("FEM mesh TetGen (*.poly)", "feminout.convert2TetGen")
 
 # see FemMesh::read() and FemMesh::write() methods in src/Mod/Fem/App/FemMesh.cpp
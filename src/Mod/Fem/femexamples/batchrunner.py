@@ -0,0 +1,275 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FreeCAD FEM examples batch runner"
+__author__ = "FreeCAD Developers"
+__url__ = "https://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+from tempfile import gettempdir
+
+import FreeCAD
+
+
+# ************************************************************************************************
+# run examples and unit tests in separate FreeCADCmd processes
+
+# every job runs in its own FreeCADCmd process with its own document and working directory
+# a pool of threads starts the processes and waits for them
+# the timing report is saved as json file in the batch directory
+
+"""
+# run all examples, write the input files, do not run the solver
+from femexamples.batchrunner import run_examples_batch
+report = run_examples_batch()
+
+
+# run all examples with solver and the solver unit tests
+from femexamples.batchrunner import run_examples_batch, run_tests_batch
+report = run_examples_batch(run_solver=True, processes=4)
+report = run_tests_batch(processes=4)
+
+"""
+
+# the solver unit tests of femtest/app
+solver_tests = (
+    "femtest.app.test_ccxtools",
+    "femtest.app.test_solver_calculix",
+    "femtest.app.test_solver_elmer",
+    "femtest.app.test_solver_z88",
+)
+
+
+def run_examples_batch(
+    examples=None,
+    run_solver=False,
+    processes=None,
+    batch_dir=None,
+    freecadcmd=None
+):
+    """run the examples in a process pool and return the timing report
+    examples: list of example module names, all examples if None
+    """
+    if examples is None:
+        from .manager import get_examples
+        examples = get_examples()
+    batch_dir = get_batch_dir(batch_dir)
+    jobs = []
+    for example in examples:
+        working_dir = join(batch_dir, example)
+        report_file = join(working_dir, "report.json")
+        code = (
+            "from femexamples.batchrunner import run_example_job\n"
+            "run_example_job({!r}, {!r}, {!r}, {!r})\n"
+            .format(example, working_dir, run_solver, report_file)
+        )
+        jobs.append((example, "example", working_dir, report_file, code))
+    return run_jobs(jobs, processes, batch_dir, freecadcmd)
+
+
+def run_tests_batch(
+    tests=solver_tests,
+    processes=None,
+    batch_dir=None,
+    freecadcmd=None
+):
+    """run the unit test modules in a process pool and return the timing report
+    """
+    batch_dir = get_batch_dir(batch_dir)
+    jobs = []
+    for test in tests:
+        working_dir = join(batch_dir, test)
+        report_file = join(working_dir, "report.json")
+        code = (
+            "from femexamples.batchrunner import run_test_job\n"
+            "run_test_job({!r}, {!r})\n"
+            .format(test, report_file)
+        )
+        jobs.append((test, "test", working_dir, report_file, code))
+    return run_jobs(jobs, processes, batch_dir, freecadcmd)
+
+
+def run_jobs(jobs, processes, batch_dir, freecadcmd):
+    if freecadcmd is None:
+        freecadcmd = get_freecadcmd()
+    if processes is None:
+        processes = os.cpu_count() or 1
+    FreeCAD.Console.PrintMessage(
+        "Run {} jobs in {} processes, batch directory: {}\n"
+        .format(len(jobs), processes, batch_dir)
+    )
+
+    def run_job(job):
+        name, kind, working_dir, report_file, code = job
+        if not os.path.exists(working_dir):
+            os.makedirs(working_dir)
+        job_file = join(working_dir, "job.py")
+        with open(job_file, "w") as f:
+            f.write(code)
+        log_file = join(working_dir, "job.log")
+        time_start = time.time()
+        with open(log_file, "w") as log:
+            returncode = subprocess.call(
+                [freecadcmd, job_file],
+                cwd=working_dir,
+                stdout=log,
+                stderr=subprocess.STDOUT
+            )
+        job_report = {
+            "name": name,
+            "type": kind,
+            "returncode": returncode,
+            "wall_time": round(time.time() - time_start, 3),
+            "log": log_file,
+            "times": {},
+        }
+        if os.path.exists(report_file):
+            with open(report_file) as f:
+                job_report.update(json.load(f))
+        FreeCAD.Console.PrintMessage(
+            "{}: {} seconds\n".format(name, job_report["wall_time"])
+        )
+        return job_report
+
+    time_start = time.time()
+    with ThreadPoolExecutor(max_workers=processes) as executor:
+        job_reports = list(executor.map(run_job, jobs))
+    report = {
+        "processes": processes,
+        "wall_time": round(time.time() - time_start, 3),
+        "jobs": job_reports,
+    }
+    report_file = join(batch_dir, "batch_report.json")
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=4)
+    FreeCAD.Console.PrintMessage(
+        "Batch run time: {} seconds, report: {}\n".format(report["wall_time"], report_file)
+    )
+    return report
+
+
+# ************************************************************************************************
+# jobs, run inside the FreeCADCmd processes
+def run_example_job(example, working_dir, run_solver, report_file):
+    """setup the example, write the input file and run the solver if run_solver
+    the times in seconds of all steps are saved in report_file
+    """
+    from importlib import import_module
+    from . import meshes
+    from femtools.femutils import is_derived_from
+
+    times = {}
+    report = {"times": times, "error": ""}
+    try:
+        time_start = time.process_time()
+        doc = import_module("femexamples." + example).setup()
+        times["setup"] = round(time.process_time() - time_start, 3)
+        times["mesh_build"] = round(sum(meshes.load_times.values()), 3)
+
+        solver = None
+        for m in doc.Analysis.Group:
+            if is_derived_from(m, "Fem::FemSolverObjectPython"):
+                solver = m
+                break
+
+        if solver is not None and solver.Proxy.Type == "Fem::SolverCcxTools":
+            # the steps of femsolver.run.run_fem_solver() are timed one by one
+            from femtools.ccxtools import FemToolsCcx
+            fea = FemToolsCcx(doc.Analysis, solver)
+            fea.update_objects()
+            fea.setup_working_dir(working_dir)
+            message = fea.check_prerequisites()
+            if message:
+                raise Exception(message)
+            fea.write_inp_file()
+            times.update(fea.inp_file_timings)
+            if run_solver:
+                fea.setup_ccx()
+                time_start = time.time()
+                fea.ccx_run()
+                times["solve"] = round(time.time() - time_start, 3)
+                time_start = time.process_time()
+                fea.load_results()
+                times["result_import"] = round(time.process_time() - time_start, 3)
+        elif solver is not None and run_solver:
+            # solver framework, input writing, solving and result import at once
+            from femsolver.run import run_fem_solver
+            time_start = time.time()
+            run_fem_solver(solver, working_dir)
+            times["solve"] = round(time.time() - time_start, 3)
+    except Exception as e:
+        import traceback
+        FreeCAD.Console.PrintError(traceback.format_exc())
+        report["error"] = str(e)
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=4)
+
+
+def run_test_job(test, report_file):
+    """run the unit test module test, the result is saved in report_file
+    """
+    import unittest
+    time_start = time.time()
+    result = unittest.TextTestRunner(stream=sys.stdout).run(
+        unittest.TestLoader().loadTestsFromName(test)
+    )
+    report = {
+        "times": {"test": round(time.time() - time_start, 3)},
+        "tests": result.testsRun,
+        "failures": len(result.failures),
+        "errors": len(result.errors),
+        "error": "" if result.wasSuccessful() else "unit tests failed",
+    }
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=4)
+
+
+# ************************************************************************************************
+# helper
+def get_batch_dir(batch_dir=None):
+    if batch_dir is None:
+        batch_dir = join(gettempdir(), "FEM_examples_batch", time.strftime("%Y%m%d_%H%M%S"))
+    if not os.path.exists(batch_dir):
+        os.makedirs(batch_dir)
+    return batch_dir
+
+
+def get_freecadcmd():
+    bin_dir = join(FreeCAD.getHomePath(), "bin")
+    for name in ("FreeCADCmd", "FreeCADCmd.exe", "freecadcmd"):
+        freecadcmd = join(bin_dir, name)
+        if os.path.exists(freecadcmd):
+            return freecadcmd
+    # the binary is in the search path
+    return "FreeCADCmd"
+
+##  @}
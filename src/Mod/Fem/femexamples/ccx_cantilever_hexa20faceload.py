@@ -22,10 +22,6 @@
 # *                                                                         *
 # ***************************************************************************
 
-import FreeCAD
-
-import Fem
-
 from . import manager
 from .ccx_cantilever_faceload import setup as setup_with_faceload
 from .manager import get_meshname
@@ -73,14 +69,8 @@ def setup(doc=None, solvertype="ccxtools"):
     femmesh_obj = doc.getObject(get_meshname())
 
     # load the hexa20 mesh
-    from .meshes.mesh_canticcx_hexa20 import create_nodes, create_elements
-    new_fem_mesh = Fem.FemMesh()
-    control = create_nodes(new_fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(new_fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes import create_femmesh
+    new_fem_mesh = create_femmesh("mesh_canticcx_hexa20")
 
     # overwrite mesh with the hexa20 mesh
     femmesh_obj.FemMesh = new_fem_mesh
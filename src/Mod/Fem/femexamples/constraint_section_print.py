@@ -34,7 +34,6 @@ from BOPTools.SplitFeatures import makeBooleanFragments
 from BOPTools.SplitFeatures import makeSlice
 from CompoundTools.CompoundFilter import makeCompoundFilter
 
-import Fem
 import ObjectsFem
 
 from . import manager
@@ -267,14 +266,8 @@ def setup(doc=None, solvertype="ccxtools"):
     analysis.addObject(con_sectionpr)
 
     # mesh
-    from .meshes.mesh_section_print_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes import create_femmesh
+    fem_mesh = create_femmesh("mesh_section_print_tetra10")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
@@ -30,7 +30,6 @@ from FreeCAD import Units
 import Part
 import Sketcher
 
-import Fem
 import ObjectsFem
 
 from . import manager
@@ -213,14 +212,8 @@ def setup(doc=None, solvertype="elmer"):
     analysis.addObject(con_elect_pot2)
 
     # mesh
-    from .meshes.mesh_electricforce_elmer_nongui6_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes import create_femmesh
+    fem_mesh = create_femmesh("mesh_electricforce_elmer_nongui6_tetra10")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
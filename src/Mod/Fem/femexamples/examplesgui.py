@@ -56,6 +56,7 @@ class FemExamples(QtGui.QWidget):
         not_files = [
             "__init__.py",
             "__pycache__",
+            "batchrunner.py",
             "boxanalysis_base.py",
             "ccx_cantilever_base.py",
             "examplesgui.py",
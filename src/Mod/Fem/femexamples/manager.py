@@ -115,6 +115,25 @@ def setup_all():
     run_example("thermomech_spine")
 
 
+def get_examples():
+    # all example modules with a setup method, same as in the examples gui
+    from os import listdir
+    from os.path import dirname, realpath
+    not_examples = [
+        "__init__.py",
+        "batchrunner.py",
+        "boxanalysis_base.py",
+        "ccx_cantilever_base.py",
+        "examplesgui.py",
+        "manager.py",
+    ]
+    examples = [
+        f[:-3] for f in listdir(dirname(realpath(__file__)))
+        if f.endswith(".py") and f not in not_examples
+    ]
+    return sorted(examples)
+
+
 def run_analysis(doc, base_name, filepath="", run_solver=False):
 
     from os.path import join, exists
@@ -0,0 +1,50 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 Bernd Hahnebach <bernd@bimstatik.org>              *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+# the meshes of the examples are NumPy mesh files, see feminout/importNumpyMesh.py
+# a new example mesh is saved by
+# from feminout import importNumpyMesh
+# importNumpyMesh.write(femmesh_obj.FemMesh, "mesh_name.npz")
+
+import time
+from os.path import dirname
+from os.path import join
+
+from feminout import importNumpyMesh
+
+
+# time in seconds to build the FemMesh of the meshes created in this session
+# {mesh_name: time}, used in the timing report of the femexamples.batchrunner
+load_times = {}
+
+
+def get_mesh_file(mesh_name):
+    return join(dirname(__file__), mesh_name + ".npz")
+
+
+def create_femmesh(mesh_name):
+    """returns the FemMesh of the example mesh mesh_name"""
+    time_start = time.process_time()
+    femmesh = importNumpyMesh.read(get_mesh_file(mesh_name))
+    load_times[mesh_name] = round(time.process_time() - time_start, 3)
+    return femmesh
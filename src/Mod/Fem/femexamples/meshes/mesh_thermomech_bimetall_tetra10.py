@@ -1,4601 +0,0 @@
-def create_nodes(femmesh):
-    # nodes
-    femmesh.addNode(0.0, 0.0, 0.0, 1)
-    femmesh.addNode(0.0, 0.0, 1.0, 2)
-    femmesh.addNode(0.0, 5.0, 1.0, 3)
-    femmesh.addNode(0.0, 5.0, 0.0, 4)
-    femmesh.addNode(100.0, 0.0, 0.0, 5)
-    femmesh.addNode(100.0, 0.0, 1.0, 6)
-    femmesh.addNode(100.0, 5.0, 1.0, 7)
-    femmesh.addNode(100.0, 5.0, 0.0, 8)
-    femmesh.addNode(0.0, 0.0, 2.0, 9)
-    femmesh.addNode(0.0, 5.0, 2.0, 10)
-    femmesh.addNode(100.0, 0.0, 2.0, 11)
-    femmesh.addNode(100.0, 5.0, 2.0, 12)
-    femmesh.addNode(0.0, 0.0, 0.5, 13)
-    femmesh.addNode(0.0, 2.5, 1.0, 14)
-    femmesh.addNode(0.0, 1.25, 1.0, 15)
-    femmesh.addNode(0.0, 3.75, 1.0, 16)
-    femmesh.addNode(0.0, 5.0, 0.5, 17)
-    femmesh.addNode(0.0, 2.5, 0.0, 18)
-    femmesh.addNode(0.0, 1.25, 0.0, 19)
-    femmesh.addNode(0.0, 3.75, 0.0, 20)
-    femmesh.addNode(100.0, 0.0, 0.5, 21)
-    femmesh.addNode(100.0, 2.5, 1.0, 22)
-    femmesh.addNode(100.0, 1.25, 1.0, 23)
-    femmesh.addNode(100.0, 3.75, 1.0, 24)
-    femmesh.addNode(100.0, 5.0, 0.5, 25)
-    femmesh.addNode(100.0, 2.5, 0.0, 26)
-    femmesh.addNode(100.0, 1.25, 0.0, 27)
-    femmesh.addNode(100.0, 3.75, 0.0, 28)
-    femmesh.addNode(2.5, 0.0, 0.0, 29)
-    femmesh.addNode(5.0, 0.0, 0.0, 30)
-    femmesh.addNode(7.5, 0.0, 0.0, 31)
-    femmesh.addNode(10.0, 0.0, 0.0, 32)
-    femmesh.addNode(12.5, 0.0, 0.0, 33)
-    femmesh.addNode(15.0, 0.0, 0.0, 34)
-    femmesh.addNode(17.5, 0.0, 0.0, 35)
-    femmesh.addNode(20.0, 0.0, 0.0, 36)
-    femmesh.addNode(22.5, 0.0, 0.0, 37)
-    femmesh.addNode(25.0, 0.0, 0.0, 38)
-    femmesh.addNode(27.5, 0.0, 0.0, 39)
-    femmesh.addNode(30.0, 0.0, 0.0, 40)
-    femmesh.addNode(32.5, 0.0, 0.0, 41)
-    femmesh.addNode(35.0, 0.0, 0.0, 42)
-    femmesh.addNode(37.5, 0.0, 0.0, 43)
-    femmesh.addNode(40.0, 0.0, 0.0, 44)
-    femmesh.addNode(42.5, 0.0, 0.0, 45)
-    femmesh.addNode(45.0, 0.0, 0.0, 46)
-    femmesh.addNode(47.5, 0.0, 0.0, 47)
-    femmesh.addNode(50.0, 0.0, 0.0, 48)
-    femmesh.addNode(52.5, 0.0, 0.0, 49)
-    femmesh.addNode(55.0, 0.0, 0.0, 50)
-    femmesh.addNode(57.5, 0.0, 0.0, 51)
-    femmesh.addNode(60.0, 0.0, 0.0, 52)
-    femmesh.addNode(62.5, 0.0, 0.0, 53)
-    femmesh.addNode(65.0, 0.0, 0.0, 54)
-    femmesh.addNode(67.5, 0.0, 0.0, 55)
-    femmesh.addNode(70.0, 0.0, 0.0, 56)
-    femmesh.addNode(72.5, 0.0, 0.0, 57)
-    femmesh.addNode(75.0, 0.0, 0.0, 58)
-    femmesh.addNode(77.5, 0.0, 0.0, 59)
-    femmesh.addNode(80.0, 0.0, 0.0, 60)
-    femmesh.addNode(82.5, 0.0, 0.0, 61)
-    femmesh.addNode(85.0, 0.0, 0.0, 62)
-    femmesh.addNode(87.5, 0.0, 0.0, 63)
-    femmesh.addNode(90.0, 0.0, 0.0, 64)
-    femmesh.addNode(92.5, 0.0, 0.0, 65)
-    femmesh.addNode(95.0, 0.0, 0.0, 66)
-    femmesh.addNode(97.5, 0.0, 0.0, 67)
-    femmesh.addNode(1.25, 0.0, 0.0, 68)
-    femmesh.addNode(3.75, 0.0, 0.0, 69)
-    femmesh.addNode(6.25, 0.0, 0.0, 70)
-    femmesh.addNode(8.75, 0.0, 0.0, 71)
-    femmesh.addNode(11.25, 0.0, 0.0, 72)
-    femmesh.addNode(13.75, 0.0, 0.0, 73)
-    femmesh.addNode(16.25, 0.0, 0.0, 74)
-    femmesh.addNode(18.75, 0.0, 0.0, 75)
-    femmesh.addNode(21.25, 0.0, 0.0, 76)
-    femmesh.addNode(23.75, 0.0, 0.0, 77)
-    femmesh.addNode(26.25, 0.0, 0.0, 78)
-    femmesh.addNode(28.75, 0.0, 0.0, 79)
-    femmesh.addNode(31.25, 0.0, 0.0, 80)
-    femmesh.addNode(33.75, 0.0, 0.0, 81)
-    femmesh.addNode(36.25, 0.0, 0.0, 82)
-    femmesh.addNode(38.75, 0.0, 0.0, 83)
-    femmesh.addNode(41.25, 0.0, 0.0, 84)
-    femmesh.addNode(43.75, 0.0, 0.0, 85)
-    femmesh.addNode(46.25, 0.0, 0.0, 86)
-    femmesh.addNode(48.75, 0.0, 0.0, 87)
-    femmesh.addNode(51.25, 0.0, 0.0, 88)
-    femmesh.addNode(53.75, 0.0, 0.0, 89)
-    femmesh.addNode(56.25, 0.0, 0.0, 90)
-    femmesh.addNode(58.75, 0.0, 0.0, 91)
-    femmesh.addNode(61.25, 0.0, 0.0, 92)
-    femmesh.addNode(63.75, 0.0, 0.0, 93)
-    femmesh.addNode(66.25, 0.0, 0.0, 94)
-    femmesh.addNode(68.75, 0.0, 0.0, 95)
-    femmesh.addNode(71.25, 0.0, 0.0, 96)
-    femmesh.addNode(73.75, 0.0, 0.0, 97)
-    femmesh.addNode(76.25, 0.0, 0.0, 98)
-    femmesh.addNode(78.75, 0.0, 0.0, 99)
-    femmesh.addNode(81.25, 0.0, 0.0, 100)
-    femmesh.addNode(83.75, 0.0, 0.0, 101)
-    femmesh.addNode(86.25, 0.0, 0.0, 102)
-    femmesh.addNode(88.75, 0.0, 0.0, 103)
-    femmesh.addNode(91.25, 0.0, 0.0, 104)
-    femmesh.addNode(93.75, 0.0, 0.0, 105)
-    femmesh.addNode(96.25, 0.0, 0.0, 106)
-    femmesh.addNode(98.75, 0.0, 0.0, 107)
-    femmesh.addNode(2.5, 0.0, 1.0, 108)
-    femmesh.addNode(5.0, 0.0, 1.0, 109)
-    femmesh.addNode(7.5, 0.0, 1.0, 110)
-    femmesh.addNode(10.0, 0.0, 1.0, 111)
-    femmesh.addNode(12.5, 0.0, 1.0, 112)
-    femmesh.addNode(15.0, 0.0, 1.0, 113)
-    femmesh.addNode(17.5, 0.0, 1.0, 114)
-    femmesh.addNode(20.0, 0.0, 1.0, 115)
-    femmesh.addNode(22.5, 0.0, 1.0, 116)
-    femmesh.addNode(25.0, 0.0, 1.0, 117)
-    femmesh.addNode(27.5, 0.0, 1.0, 118)
-    femmesh.addNode(30.0, 0.0, 1.0, 119)
-    femmesh.addNode(32.5, 0.0, 1.0, 120)
-    femmesh.addNode(35.0, 0.0, 1.0, 121)
-    femmesh.addNode(37.5, 0.0, 1.0, 122)
-    femmesh.addNode(40.0, 0.0, 1.0, 123)
-    femmesh.addNode(42.5, 0.0, 1.0, 124)
-    femmesh.addNode(45.0, 0.0, 1.0, 125)
-    femmesh.addNode(47.5, 0.0, 1.0, 126)
-    femmesh.addNode(50.0, 0.0, 1.0, 127)
-    femmesh.addNode(52.5, 0.0, 1.0, 128)
-    femmesh.addNode(55.0, 0.0, 1.0, 129)
-    femmesh.addNode(57.5, 0.0, 1.0, 130)
-    femmesh.addNode(60.0, 0.0, 1.0, 131)
-    femmesh.addNode(62.5, 0.0, 1.0, 132)
-    femmesh.addNode(65.0, 0.0, 1.0, 133)
-    femmesh.addNode(67.5, 0.0, 1.0, 134)
-    femmesh.addNode(70.0, 0.0, 1.0, 135)
-    femmesh.addNode(72.5, 0.0, 1.0, 136)
-    femmesh.addNode(75.0, 0.0, 1.0, 137)
-    femmesh.addNode(77.5, 0.0, 1.0, 138)
-    femmesh.addNode(80.0, 0.0, 1.0, 139)
-    femmesh.addNode(82.5, 0.0, 1.0, 140)
-    femmesh.addNode(85.0, 0.0, 1.0, 141)
-    femmesh.addNode(87.5, 0.0, 1.0, 142)
-    femmesh.addNode(90.0, 0.0, 1.0, 143)
-    femmesh.addNode(92.5, 0.0, 1.0, 144)
-    femmesh.addNode(95.0, 0.0, 1.0, 145)
-    femmesh.addNode(97.5, 0.0, 1.0, 146)
-    femmesh.addNode(1.25, 0.0, 1.0, 147)
-    femmesh.addNode(3.75, 0.0, 1.0, 148)
-    femmesh.addNode(6.25, 0.0, 1.0, 149)
-    femmesh.addNode(8.75, 0.0, 1.0, 150)
-    femmesh.addNode(11.25, 0.0, 1.0, 151)
-    femmesh.addNode(13.75, 0.0, 1.0, 152)
-    femmesh.addNode(16.25, 0.0, 1.0, 153)
-    femmesh.addNode(18.75, 0.0, 1.0, 154)
-    femmesh.addNode(21.25, 0.0, 1.0, 155)
-    femmesh.addNode(23.75, 0.0, 1.0, 156)
-    femmesh.addNode(26.25, 0.0, 1.0, 157)
-    femmesh.addNode(28.75, 0.0, 1.0, 158)
-    femmesh.addNode(31.25, 0.0, 1.0, 159)
-    femmesh.addNode(33.75, 0.0, 1.0, 160)
-    femmesh.addNode(36.25, 0.0, 1.0, 161)
-    femmesh.addNode(38.75, 0.0, 1.0, 162)
-    femmesh.addNode(41.25, 0.0, 1.0, 163)
-    femmesh.addNode(43.75, 0.0, 1.0, 164)
-    femmesh.addNode(46.25, 0.0, 1.0, 165)
-    femmesh.addNode(48.75, 0.0, 1.0, 166)
-    femmesh.addNode(51.25, 0.0, 1.0, 167)
-    femmesh.addNode(53.75, 0.0, 1.0, 168)
-    femmesh.addNode(56.25, 0.0, 1.0, 169)
-    femmesh.addNode(58.75, 0.0, 1.0, 170)
-    femmesh.addNode(61.25, 0.0, 1.0, 171)
-    femmesh.addNode(63.75, 0.0, 1.0, 172)
-    femmesh.addNode(66.25, 0.0, 1.0, 173)
-    femmesh.addNode(68.75, 0.0, 1.0, 174)
-    femmesh.addNode(71.25, 0.0, 1.0, 175)
-    femmesh.addNode(73.75, 0.0, 1.0, 176)
-    femmesh.addNode(76.25, 0.0, 1.0, 177)
-    femmesh.addNode(78.75, 0.0, 1.0, 178)
-    femmesh.addNode(81.25, 0.0, 1.0, 179)
-    femmesh.addNode(83.75, 0.0, 1.0, 180)
-    femmesh.addNode(86.25, 0.0, 1.0, 181)
-    femmesh.addNode(88.75, 0.0, 1.0, 182)
-    femmesh.addNode(91.25, 0.0, 1.0, 183)
-    femmesh.addNode(93.75, 0.0, 1.0, 184)
-    femmesh.addNode(96.25, 0.0, 1.0, 185)
-    femmesh.addNode(98.75, 0.0, 1.0, 186)
-    femmesh.addNode(2.5, 5.0, 0.0, 187)
-    femmesh.addNode(5.0, 5.0, 0.0, 188)
-    femmesh.addNode(7.5, 5.0, 0.0, 189)
-    femmesh.addNode(10.0, 5.0, 0.0, 190)
-    femmesh.addNode(12.5, 5.0, 0.0, 191)
-    femmesh.addNode(15.0, 5.0, 0.0, 192)
-    femmesh.addNode(17.5, 5.0, 0.0, 193)
-    femmesh.addNode(20.0, 5.0, 0.0, 194)
-    femmesh.addNode(22.5, 5.0, 0.0, 195)
-    femmesh.addNode(25.0, 5.0, 0.0, 196)
-    femmesh.addNode(27.5, 5.0, 0.0, 197)
-    femmesh.addNode(30.0, 5.0, 0.0, 198)
-    femmesh.addNode(32.5, 5.0, 0.0, 199)
-    femmesh.addNode(35.0, 5.0, 0.0, 200)
-    femmesh.addNode(37.5, 5.0, 0.0, 201)
-    femmesh.addNode(40.0, 5.0, 0.0, 202)
-    femmesh.addNode(42.5, 5.0, 0.0, 203)
-    femmesh.addNode(45.0, 5.0, 0.0, 204)
-    femmesh.addNode(47.5, 5.0, 0.0, 205)
-    femmesh.addNode(50.0, 5.0, 0.0, 206)
-    femmesh.addNode(52.5, 5.0, 0.0, 207)
-    femmesh.addNode(55.0, 5.0, 0.0, 208)
-    femmesh.addNode(57.5, 5.0, 0.0, 209)
-    femmesh.addNode(60.0, 5.0, 0.0, 210)
-    femmesh.addNode(62.5, 5.0, 0.0, 211)
-    femmesh.addNode(65.0, 5.0, 0.0, 212)
-    femmesh.addNode(67.5, 5.0, 0.0, 213)
-    femmesh.addNode(70.0, 5.0, 0.0, 214)
-    femmesh.addNode(72.5, 5.0, 0.0, 215)
-    femmesh.addNode(75.0, 5.0, 0.0, 216)
-    femmesh.addNode(77.5, 5.0, 0.0, 217)
-    femmesh.addNode(80.0, 5.0, 0.0, 218)
-    femmesh.addNode(82.5, 5.0, 0.0, 219)
-    femmesh.addNode(85.0, 5.0, 0.0, 220)
-    femmesh.addNode(87.5, 5.0, 0.0, 221)
-    femmesh.addNode(90.0, 5.0, 0.0, 222)
-    femmesh.addNode(92.5, 5.0, 0.0, 223)
-    femmesh.addNode(95.0, 5.0, 0.0, 224)
-    femmesh.addNode(97.5, 5.0, 0.0, 225)
-    femmesh.addNode(1.25, 5.0, 0.0, 226)
-    femmesh.addNode(3.75, 5.0, 0.0, 227)
-    femmesh.addNode(6.25, 5.0, 0.0, 228)
-    femmesh.addNode(8.75, 5.0, 0.0, 229)
-    femmesh.addNode(11.25, 5.0, 0.0, 230)
-    femmesh.addNode(13.75, 5.0, 0.0, 231)
-    femmesh.addNode(16.25, 5.0, 0.0, 232)
-    femmesh.addNode(18.75, 5.0, 0.0, 233)
-    femmesh.addNode(21.25, 5.0, 0.0, 234)
-    femmesh.addNode(23.75, 5.0, 0.0, 235)
-    femmesh.addNode(26.25, 5.0, 0.0, 236)
-    femmesh.addNode(28.75, 5.0, 0.0, 237)
-    femmesh.addNode(31.25, 5.0, 0.0, 238)
-    femmesh.addNode(33.75, 5.0, 0.0, 239)
-    femmesh.addNode(36.25, 5.0, 0.0, 240)
-    femmesh.addNode(38.75, 5.0, 0.0, 241)
-    femmesh.addNode(41.25, 5.0, 0.0, 242)
-    femmesh.addNode(43.75, 5.0, 0.0, 243)
-    femmesh.addNode(46.25, 5.0, 0.0, 244)
-    femmesh.addNode(48.75, 5.0, 0.0, 245)
-    femmesh.addNode(51.25, 5.0, 0.0, 246)
-    femmesh.addNode(53.75, 5.0, 0.0, 247)
-    femmesh.addNode(56.25, 5.0, 0.0, 248)
-    femmesh.addNode(58.75, 5.0, 0.0, 249)
-    femmesh.addNode(61.25, 5.0, 0.0, 250)
-    femmesh.addNode(63.75, 5.0, 0.0, 251)
-    femmesh.addNode(66.25, 5.0, 0.0, 252)
-    femmesh.addNode(68.75, 5.0, 0.0, 253)
-    femmesh.addNode(71.25, 5.0, 0.0, 254)
-    femmesh.addNode(73.75, 5.0, 0.0, 255)
-    femmesh.addNode(76.25, 5.0, 0.0, 256)
-    femmesh.addNode(78.75, 5.0, 0.0, 257)
-    femmesh.addNode(81.25, 5.0, 0.0, 258)
-    femmesh.addNode(83.75, 5.0, 0.0, 259)
-    femmesh.addNode(86.25, 5.0, 0.0, 260)
-    femmesh.addNode(88.75, 5.0, 0.0, 261)
-    femmesh.addNode(91.25, 5.0, 0.0, 262)
-    femmesh.addNode(93.75, 5.0, 0.0, 263)
-    femmesh.addNode(96.25, 5.0, 0.0, 264)
-    femmesh.addNode(98.75, 5.0, 0.0, 265)
-    femmesh.addNode(2.5, 5.0, 1.0, 266)
-    femmesh.addNode(5.0, 5.0, 1.0, 267)
-    femmesh.addNode(7.5, 5.0, 1.0, 268)
-    femmesh.addNode(10.0, 5.0, 1.0, 269)
-    femmesh.addNode(12.5, 5.0, 1.0, 270)
-    femmesh.addNode(15.0, 5.0, 1.0, 271)
-    femmesh.addNode(17.5, 5.0, 1.0, 272)
-    femmesh.addNode(20.0, 5.0, 1.0, 273)
-    femmesh.addNode(22.5, 5.0, 1.0, 274)
-    femmesh.addNode(25.0, 5.0, 1.0, 275)
-    femmesh.addNode(27.5, 5.0, 1.0, 276)
-    femmesh.addNode(30.0, 5.0, 1.0, 277)
-    femmesh.addNode(32.5, 5.0, 1.0, 278)
-    femmesh.addNode(35.0, 5.0, 1.0, 279)
-    femmesh.addNode(37.5, 5.0, 1.0, 280)
-    femmesh.addNode(40.0, 5.0, 1.0, 281)
-    femmesh.addNode(42.5, 5.0, 1.0, 282)
-    femmesh.addNode(45.0, 5.0, 1.0, 283)
-    femmesh.addNode(47.5, 5.0, 1.0, 284)
-    femmesh.addNode(50.0, 5.0, 1.0, 285)
-    femmesh.addNode(52.5, 5.0, 1.0, 286)
-    femmesh.addNode(55.0, 5.0, 1.0, 287)
-    femmesh.addNode(57.5, 5.0, 1.0, 288)
-    femmesh.addNode(60.0, 5.0, 1.0, 289)
-    femmesh.addNode(62.5, 5.0, 1.0, 290)
-    femmesh.addNode(65.0, 5.0, 1.0, 291)
-    femmesh.addNode(67.5, 5.0, 1.0, 292)
-    femmesh.addNode(70.0, 5.0, 1.0, 293)
-    femmesh.addNode(72.5, 5.0, 1.0, 294)
-    femmesh.addNode(75.0, 5.0, 1.0, 295)
-    femmesh.addNode(77.5, 5.0, 1.0, 296)
-    femmesh.addNode(80.0, 5.0, 1.0, 297)
-    femmesh.addNode(82.5, 5.0, 1.0, 298)
-    femmesh.addNode(85.0, 5.0, 1.0, 299)
-    femmesh.addNode(87.5, 5.0, 1.0, 300)
-    femmesh.addNode(90.0, 5.0, 1.0, 301)
-    femmesh.addNode(92.5, 5.0, 1.0, 302)
-    femmesh.addNode(95.0, 5.0, 1.0, 303)
-    femmesh.addNode(97.5, 5.0, 1.0, 304)
-    femmesh.addNode(1.25, 5.0, 1.0, 305)
-    femmesh.addNode(3.75, 5.0, 1.0, 306)
-    femmesh.addNode(6.25, 5.0, 1.0, 307)
-    femmesh.addNode(8.75, 5.0, 1.0, 308)
-    femmesh.addNode(11.25, 5.0, 1.0, 309)
-    femmesh.addNode(13.75, 5.0, 1.0, 310)
-    femmesh.addNode(16.25, 5.0, 1.0, 311)
-    femmesh.addNode(18.75, 5.0, 1.0, 312)
-    femmesh.addNode(21.25, 5.0, 1.0, 313)
-    femmesh.addNode(23.75, 5.0, 1.0, 314)
-    femmesh.addNode(26.25, 5.0, 1.0, 315)
-    femmesh.addNode(28.75, 5.0, 1.0, 316)
-    femmesh.addNode(31.25, 5.0, 1.0, 317)
-    femmesh.addNode(33.75, 5.0, 1.0, 318)
-    femmesh.addNode(36.25, 5.0, 1.0, 319)
-    femmesh.addNode(38.75, 5.0, 1.0, 320)
-    femmesh.addNode(41.25, 5.0, 1.0, 321)
-    femmesh.addNode(43.75, 5.0, 1.0, 322)
-    femmesh.addNode(46.25, 5.0, 1.0, 323)
-    femmesh.addNode(48.75, 5.0, 1.0, 324)
-    femmesh.addNode(51.25, 5.0, 1.0, 325)
-    femmesh.addNode(53.75, 5.0, 1.0, 326)
-    femmesh.addNode(56.25, 5.0, 1.0, 327)
-    femmesh.addNode(58.75, 5.0, 1.0, 328)
-    femmesh.addNode(61.25, 5.0, 1.0, 329)
-    femmesh.addNode(63.75, 5.0, 1.0, 330)
-    femmesh.addNode(66.25, 5.0, 1.0, 331)
-    femmesh.addNode(68.75, 5.0, 1.0, 332)
-    femmesh.addNode(71.25, 5.0, 1.0, 333)
-    femmesh.addNode(73.75, 5.0, 1.0, 334)
-    femmesh.addNode(76.25, 5.0, 1.0, 335)
-    femmesh.addNode(78.75, 5.0, 1.0, 336)
-    femmesh.addNode(81.25, 5.0, 1.0, 337)
-    femmesh.addNode(83.75, 5.0, 1.0, 338)
-    femmesh.addNode(86.25, 5.0, 1.0, 339)
-    femmesh.addNode(88.75, 5.0, 1.0, 340)
-    femmesh.addNode(91.25, 5.0, 1.0, 341)
-    femmesh.addNode(93.75, 5.0, 1.0, 342)
-    femmesh.addNode(96.25, 5.0, 1.0, 343)
-    femmesh.addNode(98.75, 5.0, 1.0, 344)
-    femmesh.addNode(0.0, 0.0, 1.5, 345)
-    femmesh.addNode(0.0, 2.5, 2.0, 346)
-    femmesh.addNode(0.0, 1.25, 2.0, 347)
-    femmesh.addNode(0.0, 3.75, 2.0, 348)
-    femmesh.addNode(0.0, 5.0, 1.5, 349)
-    femmesh.addNode(100.0, 0.0, 1.5, 350)
-    femmesh.addNode(100.0, 2.5, 2.0, 351)
-    femmesh.addNode(100.0, 1.25, 2.0, 352)
-    femmesh.addNode(100.0, 3.75, 2.0, 353)
-    femmesh.addNode(100.0, 5.0, 1.5, 354)
-    femmesh.addNode(2.5, 0.0, 2.0, 355)
-    femmesh.addNode(5.0, 0.0, 2.0, 356)
-    femmesh.addNode(7.5, 0.0, 2.0, 357)
-    femmesh.addNode(10.0, 0.0, 2.0, 358)
-    femmesh.addNode(12.5, 0.0, 2.0, 359)
-    femmesh.addNode(15.0, 0.0, 2.0, 360)
-    femmesh.addNode(17.5, 0.0, 2.0, 361)
-    femmesh.addNode(20.0, 0.0, 2.0, 362)
-    femmesh.addNode(22.5, 0.0, 2.0, 363)
-    femmesh.addNode(25.0, 0.0, 2.0, 364)
-    femmesh.addNode(27.5, 0.0, 2.0, 365)
-    femmesh.addNode(30.0, 0.0, 2.0, 366)
-    femmesh.addNode(32.5, 0.0, 2.0, 367)
-    femmesh.addNode(35.0, 0.0, 2.0, 368)
-    femmesh.addNode(37.5, 0.0, 2.0, 369)
-    femmesh.addNode(40.0, 0.0, 2.0, 370)
-    femmesh.addNode(42.5, 0.0, 2.0, 371)
-    femmesh.addNode(45.0, 0.0, 2.0, 372)
-    femmesh.addNode(47.5, 0.0, 2.0, 373)
-    femmesh.addNode(50.0, 0.0, 2.0, 374)
-    femmesh.addNode(52.5, 0.0, 2.0, 375)
-    femmesh.addNode(55.0, 0.0, 2.0, 376)
-    femmesh.addNode(57.5, 0.0, 2.0, 377)
-    femmesh.addNode(60.0, 0.0, 2.0, 378)
-    femmesh.addNode(62.5, 0.0, 2.0, 379)
-    femmesh.addNode(65.0, 0.0, 2.0, 380)
-    femmesh.addNode(67.5, 0.0, 2.0, 381)
-    femmesh.addNode(70.0, 0.0, 2.0, 382)
-    femmesh.addNode(72.5, 0.0, 2.0, 383)
-    femmesh.addNode(75.0, 0.0, 2.0, 384)
-    femmesh.addNode(77.5, 0.0, 2.0, 385)
-    femmesh.addNode(80.0, 0.0, 2.0, 386)
-    femmesh.addNode(82.5, 0.0, 2.0, 387)
-    femmesh.addNode(85.0, 0.0, 2.0, 388)
-    femmesh.addNode(87.5, 0.0, 2.0, 389)
-    femmesh.addNode(90.0, 0.0, 2.0, 390)
-    femmesh.addNode(92.5, 0.0, 2.0, 391)
-    femmesh.addNode(95.0, 0.0, 2.0, 392)
-    femmesh.addNode(97.5, 0.0, 2.0, 393)
-    femmesh.addNode(1.25, 0.0, 2.0, 394)
-    femmesh.addNode(3.75, 0.0, 2.0, 395)
-    femmesh.addNode(6.25, 0.0, 2.0, 396)
-    femmesh.addNode(8.75, 0.0, 2.0, 397)
-    femmesh.addNode(11.25, 0.0, 2.0, 398)
-    femmesh.addNode(13.75, 0.0, 2.0, 399)
-    femmesh.addNode(16.25, 0.0, 2.0, 400)
-    femmesh.addNode(18.75, 0.0, 2.0, 401)
-    femmesh.addNode(21.25, 0.0, 2.0, 402)
-    femmesh.addNode(23.75, 0.0, 2.0, 403)
-    femmesh.addNode(26.25, 0.0, 2.0, 404)
-    femmesh.addNode(28.75, 0.0, 2.0, 405)
-    femmesh.addNode(31.25, 0.0, 2.0, 406)
-    femmesh.addNode(33.75, 0.0, 2.0, 407)
-    femmesh.addNode(36.25, 0.0, 2.0, 408)
-    femmesh.addNode(38.75, 0.0, 2.0, 409)
-    femmesh.addNode(41.25, 0.0, 2.0, 410)
-    femmesh.addNode(43.75, 0.0, 2.0, 411)
-    femmesh.addNode(46.25, 0.0, 2.0, 412)
-    femmesh.addNode(48.75, 0.0, 2.0, 413)
-    femmesh.addNode(51.25, 0.0, 2.0, 414)
-    femmesh.addNode(53.75, 0.0, 2.0, 415)
-    femmesh.addNode(56.25, 0.0, 2.0, 416)
-    femmesh.addNode(58.75, 0.0, 2.0, 417)
-    femmesh.addNode(61.25, 0.0, 2.0, 418)
-    femmesh.addNode(63.75, 0.0, 2.0, 419)
-    femmesh.addNode(66.25, 0.0, 2.0, 420)
-    femmesh.addNode(68.75, 0.0, 2.0, 421)
-    femmesh.addNode(71.25, 0.0, 2.0, 422)
-    femmesh.addNode(73.75, 0.0, 2.0, 423)
-    femmesh.addNode(76.25, 0.0, 2.0, 424)
-    femmesh.addNode(78.75, 0.0, 2.0, 425)
-    femmesh.addNode(81.25, 0.0, 2.0, 426)
-    femmesh.addNode(83.75, 0.0, 2.0, 427)
-    femmesh.addNode(86.25, 0.0, 2.0, 428)
-    femmesh.addNode(88.75, 0.0, 2.0, 429)
-    femmesh.addNode(91.25, 0.0, 2.0, 430)
-    femmesh.addNode(93.75, 0.0, 2.0, 431)
-    femmesh.addNode(96.25, 0.0, 2.0, 432)
-    femmesh.addNode(98.75, 0.0, 2.0, 433)
-    femmesh.addNode(2.5, 5.0, 2.0, 434)
-    femmesh.addNode(5.0, 5.0, 2.0, 435)
-    femmesh.addNode(7.5, 5.0, 2.0, 436)
-    femmesh.addNode(10.0, 5.0, 2.0, 437)
-    femmesh.addNode(12.5, 5.0, 2.0, 438)
-    femmesh.addNode(15.0, 5.0, 2.0, 439)
-    femmesh.addNode(17.5, 5.0, 2.0, 440)
-    femmesh.addNode(20.0, 5.0, 2.0, 441)
-    femmesh.addNode(22.5, 5.0, 2.0, 442)
-    femmesh.addNode(25.0, 5.0, 2.0, 443)
-    femmesh.addNode(27.5, 5.0, 2.0, 444)
-    femmesh.addNode(30.0, 5.0, 2.0, 445)
-    femmesh.addNode(32.5, 5.0, 2.0, 446)
-    femmesh.addNode(35.0, 5.0, 2.0, 447)
-    femmesh.addNode(37.5, 5.0, 2.0, 448)
-    femmesh.addNode(40.0, 5.0, 2.0, 449)
-    femmesh.addNode(42.5, 5.0, 2.0, 450)
-    femmesh.addNode(45.0, 5.0, 2.0, 451)
-    femmesh.addNode(47.5, 5.0, 2.0, 452)
-    femmesh.addNode(50.0, 5.0, 2.0, 453)
-    femmesh.addNode(52.5, 5.0, 2.0, 454)
-    femmesh.addNode(55.0, 5.0, 2.0, 455)
-    femmesh.addNode(57.5, 5.0, 2.0, 456)
-    femmesh.addNode(60.0, 5.0, 2.0, 457)
-    femmesh.addNode(62.5, 5.0, 2.0, 458)
-    femmesh.addNode(65.0, 5.0, 2.0, 459)
-    femmesh.addNode(67.5, 5.0, 2.0, 460)
-    femmesh.addNode(70.0, 5.0, 2.0, 461)
-    femmesh.addNode(72.5, 5.0, 2.0, 462)
-    femmesh.addNode(75.0, 5.0, 2.0, 463)
-    femmesh.addNode(77.5, 5.0, 2.0, 464)
-    femmesh.addNode(80.0, 5.0, 2.0, 465)
-    femmesh.addNode(82.5, 5.0, 2.0, 466)
-    femmesh.addNode(85.0, 5.0, 2.0, 467)
-    femmesh.addNode(87.5, 5.0, 2.0, 468)
-    femmesh.addNode(90.0, 5.0, 2.0, 469)
-    femmesh.addNode(92.5, 5.0, 2.0, 470)
-    femmesh.addNode(95.0, 5.0, 2.0, 471)
-    femmesh.addNode(97.5, 5.0, 2.0, 472)
-    femmesh.addNode(1.25, 5.0, 2.0, 473)
-    femmesh.addNode(3.75, 5.0, 2.0, 474)
-    femmesh.addNode(6.25, 5.0, 2.0, 475)
-    femmesh.addNode(8.75, 5.0, 2.0, 476)
-    femmesh.addNode(11.25, 5.0, 2.0, 477)
-    femmesh.addNode(13.75, 5.0, 2.0, 478)
-    femmesh.addNode(16.25, 5.0, 2.0, 479)
-    femmesh.addNode(18.75, 5.0, 2.0, 480)
-    femmesh.addNode(21.25, 5.0, 2.0, 481)
-    femmesh.addNode(23.75, 5.0, 2.0, 482)
-    femmesh.addNode(26.25, 5.0, 2.0, 483)
-    femmesh.addNode(28.75, 5.0, 2.0, 484)
-    femmesh.addNode(31.25, 5.0, 2.0, 485)
-    femmesh.addNode(33.75, 5.0, 2.0, 486)
-    femmesh.addNode(36.25, 5.0, 2.0, 487)
-    femmesh.addNode(38.75, 5.0, 2.0, 488)
-    femmesh.addNode(41.25, 5.0, 2.0, 489)
-    femmesh.addNode(43.75, 5.0, 2.0, 490)
-    femmesh.addNode(46.25, 5.0, 2.0, 491)
-    femmesh.addNode(48.75, 5.0, 2.0, 492)
-    femmesh.addNode(51.25, 5.0, 2.0, 493)
-    femmesh.addNode(53.75, 5.0, 2.0, 494)
-    femmesh.addNode(56.25, 5.0, 2.0, 495)
-    femmesh.addNode(58.75, 5.0, 2.0, 496)
-    femmesh.addNode(61.25, 5.0, 2.0, 497)
-    femmesh.addNode(63.75, 5.0, 2.0, 498)
-    femmesh.addNode(66.25, 5.0, 2.0, 499)
-    femmesh.addNode(68.75, 5.0, 2.0, 500)
-    femmesh.addNode(71.25, 5.0, 2.0, 501)
-    femmesh.addNode(73.75, 5.0, 2.0, 502)
-    femmesh.addNode(76.25, 5.0, 2.0, 503)
-    femmesh.addNode(78.75, 5.0, 2.0, 504)
-    femmesh.addNode(81.25, 5.0, 2.0, 505)
-    femmesh.addNode(83.75, 5.0, 2.0, 506)
-    femmesh.addNode(86.25, 5.0, 2.0, 507)
-    femmesh.addNode(88.75, 5.0, 2.0, 508)
-    femmesh.addNode(91.25, 5.0, 2.0, 509)
-    femmesh.addNode(93.75, 5.0, 2.0, 510)
-    femmesh.addNode(96.25, 5.0, 2.0, 511)
-    femmesh.addNode(98.75, 5.0, 2.0, 512)
-    femmesh.addNode(0.0, 1.25, 0.5, 513)
-    femmesh.addNode(0.0, 3.75, 0.5, 514)
-    femmesh.addNode(0.0, 0.625, 0.75, 515)
-    femmesh.addNode(0.0, 0.625, 0.25, 516)
-    femmesh.addNode(0.0, 1.875, 0.25, 517)
-    femmesh.addNode(0.0, 1.875, 0.75, 518)
-    femmesh.addNode(0.0, 4.375, 0.25, 519)
-    femmesh.addNode(0.0, 4.375, 0.75, 520)
-    femmesh.addNode(0.0, 3.125, 0.75, 521)
-    femmesh.addNode(0.0, 3.125, 0.25, 522)
-    femmesh.addNode(0.0, 2.5, 0.5, 523)
-    femmesh.addNode(100.0, 1.25, 0.5, 524)
-    femmesh.addNode(100.0, 3.75, 0.5, 525)
-    femmesh.addNode(100.0, 0.625, 0.25, 526)
-    femmesh.addNode(100.0, 0.625, 0.75, 527)
-    femmesh.addNode(100.0, 1.875, 0.25, 528)
-    femmesh.addNode(100.0, 1.875, 0.75, 529)
-    femmesh.addNode(100.0, 4.375, 0.75, 530)
-    femmesh.addNode(100.0, 4.375, 0.25, 531)
-    femmesh.addNode(100.0, 3.125, 0.75, 532)
-    femmesh.addNode(100.0, 3.125, 0.25, 533)
-    femmesh.addNode(100.0, 2.5, 0.5, 534)
-    femmesh.addNode(1.25, 0.0, 0.5, 535)
-    femmesh.addNode(98.75, 0.0, 0.5, 536)
-    femmesh.addNode(3.75, 0.0, 0.5, 537)
-    femmesh.addNode(6.25, 0.0, 0.5, 538)
-    femmesh.addNode(8.75, 0.0, 0.5, 539)
-    femmesh.addNode(11.25, 0.0, 0.5, 540)
-    femmesh.addNode(13.75, 0.0, 0.5, 541)
-    femmesh.addNode(16.25, 0.0, 0.5, 542)
-    femmesh.addNode(18.75, 0.0, 0.5, 543)
-    femmesh.addNode(21.25, 0.0, 0.5, 544)
-    femmesh.addNode(23.75, 0.0, 0.5, 545)
-    femmesh.addNode(26.25, 0.0, 0.5, 546)
-    femmesh.addNode(28.75, 0.0, 0.5, 547)
-    femmesh.addNode(31.25, 0.0, 0.5, 548)
-    femmesh.addNode(33.75, 0.0, 0.5, 549)
-    femmesh.addNode(36.25, 0.0, 0.5, 550)
-    femmesh.addNode(38.75, 0.0, 0.5, 551)
-    femmesh.addNode(41.25, 0.0, 0.5, 552)
-    femmesh.addNode(43.75, 0.0, 0.5, 553)
-    femmesh.addNode(46.25, 0.0, 0.5, 554)
-    femmesh.addNode(48.75, 0.0, 0.5, 555)
-    femmesh.addNode(51.25, 0.0, 0.5, 556)
-    femmesh.addNode(53.75, 0.0, 0.5, 557)
-    femmesh.addNode(56.25, 0.0, 0.5, 558)
-    femmesh.addNode(58.75, 0.0, 0.5, 559)
-    femmesh.addNode(61.25, 0.0, 0.5, 560)
-    femmesh.addNode(63.75, 0.0, 0.5, 561)
-    femmesh.addNode(66.25, 0.0, 0.5, 562)
-    femmesh.addNode(68.75, 0.0, 0.5, 563)
-    femmesh.addNode(71.25, 0.0, 0.5, 564)
-    femmesh.addNode(73.75, 0.0, 0.5, 565)
-    femmesh.addNode(76.25, 0.0, 0.5, 566)
-    femmesh.addNode(78.75, 0.0, 0.5, 567)
-    femmesh.addNode(81.25, 0.0, 0.5, 568)
-    femmesh.addNode(83.75, 0.0, 0.5, 569)
-    femmesh.addNode(86.25, 0.0, 0.5, 570)
-    femmesh.addNode(88.75, 0.0, 0.5, 571)
-    femmesh.addNode(91.25, 0.0, 0.5, 572)
-    femmesh.addNode(93.75, 0.0, 0.5, 573)
-    femmesh.addNode(96.25, 0.0, 0.5, 574)
-    femmesh.addNode(0.625, 0.0, 0.25, 575)
-    femmesh.addNode(0.625, 0.0, 0.75, 576)
-    femmesh.addNode(1.875, 0.0, 0.25, 577)
-    femmesh.addNode(1.875, 0.0, 0.75, 578)
-    femmesh.addNode(99.375, 0.0, 0.75, 579)
-    femmesh.addNode(99.375, 0.0, 0.25, 580)
-    femmesh.addNode(98.125, 0.0, 0.25, 581)
-    femmesh.addNode(98.125, 0.0, 0.75, 582)
-    femmesh.addNode(4.375, 0.0, 0.25, 583)
-    femmesh.addNode(3.125, 0.0, 0.25, 584)
-    femmesh.addNode(2.5, 0.0, 0.5, 585)
-    femmesh.addNode(3.125, 0.0, 0.75, 586)
-    femmesh.addNode(6.875, 0.0, 0.25, 587)
-    femmesh.addNode(5.625, 0.0, 0.25, 588)
-    femmesh.addNode(5.0, 0.0, 0.5, 589)
-    femmesh.addNode(4.375, 0.0, 0.75, 590)
-    femmesh.addNode(5.625, 0.0, 0.75, 591)
-    femmesh.addNode(9.375, 0.0, 0.25, 592)
-    femmesh.addNode(8.125, 0.0, 0.25, 593)
-    femmesh.addNode(7.5, 0.0, 0.5, 594)
-    femmesh.addNode(6.875, 0.0, 0.75, 595)
-    femmesh.addNode(8.125, 0.0, 0.75, 596)
-    femmesh.addNode(11.875, 0.0, 0.25, 597)
-    femmesh.addNode(10.625, 0.0, 0.25, 598)
-    femmesh.addNode(10.0, 0.0, 0.5, 599)
-    femmesh.addNode(9.375, 0.0, 0.75, 600)
-    femmesh.addNode(10.625, 0.0, 0.75, 601)
-    femmesh.addNode(14.375, 0.0, 0.25, 602)
-    femmesh.addNode(13.125, 0.0, 0.25, 603)
-    femmesh.addNode(12.5, 0.0, 0.5, 604)
-    femmesh.addNode(11.875, 0.0, 0.75, 605)
-    femmesh.addNode(13.125, 0.0, 0.75, 606)
-    femmesh.addNode(16.875, 0.0, 0.25, 607)
-    femmesh.addNode(15.625, 0.0, 0.25, 608)
-    femmesh.addNode(15.0, 0.0, 0.5, 609)
-    femmesh.addNode(14.375, 0.0, 0.75, 610)
-    femmesh.addNode(15.625, 0.0, 0.75, 611)
-    femmesh.addNode(19.375, 0.0, 0.25, 612)
-    femmesh.addNode(18.125, 0.0, 0.25, 613)
-    femmesh.addNode(17.5, 0.0, 0.5, 614)
-    femmesh.addNode(16.875, 0.0, 0.75, 615)
-    femmesh.addNode(18.125, 0.0, 0.75, 616)
-    femmesh.addNode(21.875, 0.0, 0.25, 617)
-    femmesh.addNode(20.625, 0.0, 0.25, 618)
-    femmesh.addNode(20.0, 0.0, 0.5, 619)
-    femmesh.addNode(19.375, 0.0, 0.75, 620)
-    femmesh.addNode(20.625, 0.0, 0.75, 621)
-    femmesh.addNode(24.375, 0.0, 0.25, 622)
-    femmesh.addNode(23.125, 0.0, 0.25, 623)
-    femmesh.addNode(22.5, 0.0, 0.5, 624)
-    femmesh.addNode(21.875, 0.0, 0.75, 625)
-    femmesh.addNode(23.125, 0.0, 0.75, 626)
-    femmesh.addNode(26.875, 0.0, 0.25, 627)
-    femmesh.addNode(25.625, 0.0, 0.25, 628)
-    femmesh.addNode(25.0, 0.0, 0.5, 629)
-    femmesh.addNode(24.375, 0.0, 0.75, 630)
-    femmesh.addNode(25.625, 0.0, 0.75, 631)
-    femmesh.addNode(29.375, 0.0, 0.25, 632)
-    femmesh.addNode(28.125, 0.0, 0.25, 633)
-    femmesh.addNode(27.5, 0.0, 0.5, 634)
-    femmesh.addNode(26.875, 0.0, 0.75, 635)
-    femmesh.addNode(28.125, 0.0, 0.75, 636)
-    femmesh.addNode(31.875, 0.0, 0.25, 637)
-    femmesh.addNode(30.625, 0.0, 0.25, 638)
-    femmesh.addNode(30.0, 0.0, 0.5, 639)
-    femmesh.addNode(29.375, 0.0, 0.75, 640)
-    femmesh.addNode(30.625, 0.0, 0.75, 641)
-    femmesh.addNode(34.375, 0.0, 0.25, 642)
-    femmesh.addNode(33.125, 0.0, 0.25, 643)
-    femmesh.addNode(32.5, 0.0, 0.5, 644)
-    femmesh.addNode(31.875, 0.0, 0.75, 645)
-    femmesh.addNode(33.125, 0.0, 0.75, 646)
-    femmesh.addNode(36.875, 0.0, 0.25, 647)
-    femmesh.addNode(35.625, 0.0, 0.25, 648)
-    femmesh.addNode(35.0, 0.0, 0.5, 649)
-    femmesh.addNode(34.375, 0.0, 0.75, 650)
-    femmesh.addNode(35.625, 0.0, 0.75, 651)
-    femmesh.addNode(39.375, 0.0, 0.25, 652)
-    femmesh.addNode(38.125, 0.0, 0.25, 653)
-    femmesh.addNode(37.5, 0.0, 0.5, 654)
-    femmesh.addNode(36.875, 0.0, 0.75, 655)
-    femmesh.addNode(38.125, 0.0, 0.75, 656)
-    femmesh.addNode(41.875, 0.0, 0.25, 657)
-    femmesh.addNode(40.625, 0.0, 0.25, 658)
-    femmesh.addNode(40.0, 0.0, 0.5, 659)
-    femmesh.addNode(39.375, 0.0, 0.75, 660)
-    femmesh.addNode(40.625, 0.0, 0.75, 661)
-    femmesh.addNode(44.375, 0.0, 0.25, 662)
-    femmesh.addNode(43.125, 0.0, 0.25, 663)
-    femmesh.addNode(42.5, 0.0, 0.5, 664)
-    femmesh.addNode(41.875, 0.0, 0.75, 665)
-    femmesh.addNode(43.125, 0.0, 0.75, 666)
-    femmesh.addNode(46.875, 0.0, 0.25, 667)
-    femmesh.addNode(45.625, 0.0, 0.25, 668)
-    femmesh.addNode(45.0, 0.0, 0.5, 669)
-    femmesh.addNode(44.375, 0.0, 0.75, 670)
-    femmesh.addNode(45.625, 0.0, 0.75, 671)
-    femmesh.addNode(49.375, 0.0, 0.25, 672)
-    femmesh.addNode(48.125, 0.0, 0.25, 673)
-    femmesh.addNode(47.5, 0.0, 0.5, 674)
-    femmesh.addNode(46.875, 0.0, 0.75, 675)
-    femmesh.addNode(48.125, 0.0, 0.75, 676)
-    femmesh.addNode(51.875, 0.0, 0.25, 677)
-    femmesh.addNode(50.625, 0.0, 0.25, 678)
-    femmesh.addNode(50.0, 0.0, 0.5, 679)
-    femmesh.addNode(49.375, 0.0, 0.75, 680)
-    femmesh.addNode(50.625, 0.0, 0.75, 681)
-    femmesh.addNode(54.375, 0.0, 0.25, 682)
-    femmesh.addNode(53.125, 0.0, 0.25, 683)
-    femmesh.addNode(52.5, 0.0, 0.5, 684)
-    femmesh.addNode(51.875, 0.0, 0.75, 685)
-    femmesh.addNode(53.125, 0.0, 0.75, 686)
-    femmesh.addNode(56.875, 0.0, 0.25, 687)
-    femmesh.addNode(55.625, 0.0, 0.25, 688)
-    femmesh.addNode(55.0, 0.0, 0.5, 689)
-    femmesh.addNode(54.375, 0.0, 0.75, 690)
-    femmesh.addNode(55.625, 0.0, 0.75, 691)
-    femmesh.addNode(59.375, 0.0, 0.25, 692)
-    femmesh.addNode(58.125, 0.0, 0.25, 693)
-    femmesh.addNode(57.5, 0.0, 0.5, 694)
-    femmesh.addNode(56.875, 0.0, 0.75, 695)
-    femmesh.addNode(58.125, 0.0, 0.75, 696)
-    femmesh.addNode(61.875, 0.0, 0.25, 697)
-    femmesh.addNode(60.625, 0.0, 0.25, 698)
-    femmesh.addNode(60.0, 0.0, 0.5, 699)
-    femmesh.addNode(59.375, 0.0, 0.75, 700)
-    femmesh.addNode(60.625, 0.0, 0.75, 701)
-    femmesh.addNode(64.375, 0.0, 0.25, 702)
-    femmesh.addNode(63.125, 0.0, 0.25, 703)
-    femmesh.addNode(62.5, 0.0, 0.5, 704)
-    femmesh.addNode(61.875, 0.0, 0.75, 705)
-    femmesh.addNode(63.125, 0.0, 0.75, 706)
-    femmesh.addNode(66.875, 0.0, 0.25, 707)
-    femmesh.addNode(65.625, 0.0, 0.25, 708)
-    femmesh.addNode(65.0, 0.0, 0.5, 709)
-    femmesh.addNode(64.375, 0.0, 0.75, 710)
-    femmesh.addNode(65.625, 0.0, 0.75, 711)
-    femmesh.addNode(69.375, 0.0, 0.25, 712)
-    femmesh.addNode(68.125, 0.0, 0.25, 713)
-    femmesh.addNode(67.5, 0.0, 0.5, 714)
-    femmesh.addNode(66.875, 0.0, 0.75, 715)
-    femmesh.addNode(68.125, 0.0, 0.75, 716)
-    femmesh.addNode(71.875, 0.0, 0.25, 717)
-    femmesh.addNode(70.625, 0.0, 0.25, 718)
-    femmesh.addNode(70.0, 0.0, 0.5, 719)
-    femmesh.addNode(69.375, 0.0, 0.75, 720)
-    femmesh.addNode(70.625, 0.0, 0.75, 721)
-    femmesh.addNode(74.375, 0.0, 0.25, 722)
-    femmesh.addNode(73.125, 0.0, 0.25, 723)
-    femmesh.addNode(72.5, 0.0, 0.5, 724)
-    femmesh.addNode(71.875, 0.0, 0.75, 725)
-    femmesh.addNode(73.125, 0.0, 0.75, 726)
-    femmesh.addNode(76.875, 0.0, 0.25, 727)
-    femmesh.addNode(75.625, 0.0, 0.25, 728)
-    femmesh.addNode(75.0, 0.0, 0.5, 729)
-    femmesh.addNode(74.375, 0.0, 0.75, 730)
-    femmesh.addNode(75.625, 0.0, 0.75, 731)
-    femmesh.addNode(79.375, 0.0, 0.25, 732)
-    femmesh.addNode(78.125, 0.0, 0.25, 733)
-    femmesh.addNode(77.5, 0.0, 0.5, 734)
-    femmesh.addNode(76.875, 0.0, 0.75, 735)
-    femmesh.addNode(78.125, 0.0, 0.75, 736)
-    femmesh.addNode(81.875, 0.0, 0.25, 737)
-    femmesh.addNode(80.625, 0.0, 0.25, 738)
-    femmesh.addNode(80.0, 0.0, 0.5, 739)
-    femmesh.addNode(79.375, 0.0, 0.75, 740)
-    femmesh.addNode(80.625, 0.0, 0.75, 741)
-    femmesh.addNode(84.375, 0.0, 0.25, 742)
-    femmesh.addNode(83.125, 0.0, 0.25, 743)
-    femmesh.addNode(82.5, 0.0, 0.5, 744)
-    femmesh.addNode(81.875, 0.0, 0.75, 745)
-    femmesh.addNode(83.125, 0.0, 0.75, 746)
-    femmesh.addNode(86.875, 0.0, 0.25, 747)
-    femmesh.addNode(85.625, 0.0, 0.25, 748)
-    femmesh.addNode(85.0, 0.0, 0.5, 749)
-    femmesh.addNode(84.375, 0.0, 0.75, 750)
-    femmesh.addNode(85.625, 0.0, 0.75, 751)
-    femmesh.addNode(89.375, 0.0, 0.25, 752)
-    femmesh.addNode(88.125, 0.0, 0.25, 753)
-    femmesh.addNode(87.5, 0.0, 0.5, 754)
-    femmesh.addNode(86.875, 0.0, 0.75, 755)
-    femmesh.addNode(88.125, 0.0, 0.75, 756)
-    femmesh.addNode(91.875, 0.0, 0.25, 757)
-    femmesh.addNode(90.625, 0.0, 0.25, 758)
-    femmesh.addNode(90.0, 0.0, 0.5, 759)
-    femmesh.addNode(89.375, 0.0, 0.75, 760)
-    femmesh.addNode(90.625, 0.0, 0.75, 761)
-    femmesh.addNode(94.375, 0.0, 0.25, 762)
-    femmesh.addNode(93.125, 0.0, 0.25, 763)
-    femmesh.addNode(92.5, 0.0, 0.5, 764)
-    femmesh.addNode(91.875, 0.0, 0.75, 765)
-    femmesh.addNode(93.125, 0.0, 0.75, 766)
-    femmesh.addNode(96.875, 0.0, 0.25, 767)
-    femmesh.addNode(95.625, 0.0, 0.25, 768)
-    femmesh.addNode(95.0, 0.0, 0.5, 769)
-    femmesh.addNode(94.375, 0.0, 0.75, 770)
-    femmesh.addNode(95.625, 0.0, 0.75, 771)
-    femmesh.addNode(97.5, 0.0, 0.5, 772)
-    femmesh.addNode(96.875, 0.0, 0.75, 773)
-    femmesh.addNode(1.25, 5.0, 0.5, 774)
-    femmesh.addNode(98.75, 5.0, 0.5, 775)
-    femmesh.addNode(3.75, 5.0, 0.5, 776)
-    femmesh.addNode(6.25, 5.0, 0.5, 777)
-    femmesh.addNode(8.75, 5.0, 0.5, 778)
-    femmesh.addNode(11.25, 5.0, 0.5, 779)
-    femmesh.addNode(13.75, 5.0, 0.5, 780)
-    femmesh.addNode(16.25, 5.0, 0.5, 781)
-    femmesh.addNode(18.75, 5.0, 0.5, 782)
-    femmesh.addNode(21.25, 5.0, 0.5, 783)
-    femmesh.addNode(23.75, 5.0, 0.5, 784)
-    femmesh.addNode(26.25, 5.0, 0.5, 785)
-    femmesh.addNode(28.75, 5.0, 0.5, 786)
-    femmesh.addNode(31.25, 5.0, 0.5, 787)
-    femmesh.addNode(33.75, 5.0, 0.5, 788)
-    femmesh.addNode(36.25, 5.0, 0.5, 789)
-    femmesh.addNode(38.75, 5.0, 0.5, 790)
-    femmesh.addNode(41.25, 5.0, 0.5, 791)
-    femmesh.addNode(43.75, 5.0, 0.5, 792)
-    femmesh.addNode(46.25, 5.0, 0.5, 793)
-    femmesh.addNode(48.75, 5.0, 0.5, 794)
-    femmesh.addNode(51.25, 5.0, 0.5, 795)
-    femmesh.addNode(53.75, 5.0, 0.5, 796)
-    femmesh.addNode(56.25, 5.0, 0.5, 797)
-    femmesh.addNode(58.75, 5.0, 0.5, 798)
-    femmesh.addNode(61.25, 5.0, 0.5, 799)
-    femmesh.addNode(63.75, 5.0, 0.5, 800)
-    femmesh.addNode(66.25, 5.0, 0.5, 801)
-    femmesh.addNode(68.75, 5.0, 0.5, 802)
-    femmesh.addNode(71.25, 5.0, 0.5, 803)
-    femmesh.addNode(73.75, 5.0, 0.5, 804)
-    femmesh.addNode(76.25, 5.0, 0.5, 805)
-    femmesh.addNode(78.75, 5.0, 0.5, 806)
-    femmesh.addNode(81.25, 5.0, 0.5, 807)
-    femmesh.addNode(83.75, 5.0, 0.5, 808)
-    femmesh.addNode(86.25, 5.0, 0.5, 809)
-    femmesh.addNode(88.75, 5.0, 0.5, 810)
-    femmesh.addNode(91.25, 5.0, 0.5, 811)
-    femmesh.addNode(93.75, 5.0, 0.5, 812)
-    femmesh.addNode(96.25, 5.0, 0.5, 813)
-    femmesh.addNode(0.625, 5.0, 0.75, 814)
-    femmesh.addNode(0.625, 5.0, 0.25, 815)
-    femmesh.addNode(1.875, 5.0, 0.75, 816)
-    femmesh.addNode(1.875, 5.0, 0.25, 817)
-    femmesh.addNode(99.375, 5.0, 0.25, 818)
-    femmesh.addNode(99.375, 5.0, 0.75, 819)
-    femmesh.addNode(98.125, 5.0, 0.75, 820)
-    femmesh.addNode(98.125, 5.0, 0.25, 821)
-    femmesh.addNode(3.125, 5.0, 0.25, 822)
-    femmesh.addNode(4.375, 5.0, 0.25, 823)
-    femmesh.addNode(2.5, 5.0, 0.5, 824)
-    femmesh.addNode(3.125, 5.0, 0.75, 825)
-    femmesh.addNode(5.625, 5.0, 0.25, 826)
-    femmesh.addNode(6.875, 5.0, 0.25, 827)
-    femmesh.addNode(4.375, 5.0, 0.75, 828)
-    femmesh.addNode(5.0, 5.0, 0.5, 829)
-    femmesh.addNode(5.625, 5.0, 0.75, 830)
-    femmesh.addNode(8.125, 5.0, 0.25, 831)
-    femmesh.addNode(9.375, 5.0, 0.25, 832)
-    femmesh.addNode(6.875, 5.0, 0.75, 833)
-    femmesh.addNode(7.5, 5.0, 0.5, 834)
-    femmesh.addNode(8.125, 5.0, 0.75, 835)
-    femmesh.addNode(10.625, 5.0, 0.25, 836)
-    femmesh.addNode(11.875, 5.0, 0.25, 837)
-    femmesh.addNode(9.375, 5.0, 0.75, 838)
-    femmesh.addNode(10.0, 5.0, 0.5, 839)
-    femmesh.addNode(10.625, 5.0, 0.75, 840)
-    femmesh.addNode(13.125, 5.0, 0.25, 841)
-    femmesh.addNode(14.375, 5.0, 0.25, 842)
-    femmesh.addNode(11.875, 5.0, 0.75, 843)
-    femmesh.addNode(12.5, 5.0, 0.5, 844)
-    femmesh.addNode(13.125, 5.0, 0.75, 845)
-    femmesh.addNode(15.625, 5.0, 0.25, 846)
-    femmesh.addNode(16.875, 5.0, 0.25, 847)
-    femmesh.addNode(14.375, 5.0, 0.75, 848)
-    femmesh.addNode(15.0, 5.0, 0.5, 849)
-    femmesh.addNode(15.625, 5.0, 0.75, 850)
-    femmesh.addNode(18.125, 5.0, 0.25, 851)
-    femmesh.addNode(19.375, 5.0, 0.25, 852)
-    femmesh.addNode(16.875, 5.0, 0.75, 853)
-    femmesh.addNode(17.5, 5.0, 0.5, 854)
-    femmesh.addNode(18.125, 5.0, 0.75, 855)
-    femmesh.addNode(20.625, 5.0, 0.25, 856)
-    femmesh.addNode(21.875, 5.0, 0.25, 857)
-    femmesh.addNode(19.375, 5.0, 0.75, 858)
-    femmesh.addNode(20.0, 5.0, 0.5, 859)
-    femmesh.addNode(20.625, 5.0, 0.75, 860)
-    femmesh.addNode(23.125, 5.0, 0.25, 861)
-    femmesh.addNode(24.375, 5.0, 0.25, 862)
-    femmesh.addNode(21.875, 5.0, 0.75, 863)
-    femmesh.addNode(22.5, 5.0, 0.5, 864)
-    femmesh.addNode(23.125, 5.0, 0.75, 865)
-    femmesh.addNode(25.625, 5.0, 0.25, 866)
-    femmesh.addNode(26.875, 5.0, 0.25, 867)
-    femmesh.addNode(24.375, 5.0, 0.75, 868)
-    femmesh.addNode(25.0, 5.0, 0.5, 869)
-    femmesh.addNode(25.625, 5.0, 0.75, 870)
-    femmesh.addNode(28.125, 5.0, 0.25, 871)
-    femmesh.addNode(29.375, 5.0, 0.25, 872)
-    femmesh.addNode(26.875, 5.0, 0.75, 873)
-    femmesh.addNode(27.5, 5.0, 0.5, 874)
-    femmesh.addNode(28.125, 5.0, 0.75, 875)
-    femmesh.addNode(30.625, 5.0, 0.25, 876)
-    femmesh.addNode(31.875, 5.0, 0.25, 877)
-    femmesh.addNode(29.375, 5.0, 0.75, 878)
-    femmesh.addNode(30.0, 5.0, 0.5, 879)
-    femmesh.addNode(30.625, 5.0, 0.75, 880)
-    femmesh.addNode(33.125, 5.0, 0.25, 881)
-    femmesh.addNode(34.375, 5.0, 0.25, 882)
-    femmesh.addNode(31.875, 5.0, 0.75, 883)
-    femmesh.addNode(32.5, 5.0, 0.5, 884)
-    femmesh.addNode(33.125, 5.0, 0.75, 885)
-    femmesh.addNode(35.625, 5.0, 0.25, 886)
-    femmesh.addNode(36.875, 5.0, 0.25, 887)
-    femmesh.addNode(34.375, 5.0, 0.75, 888)
-    femmesh.addNode(35.0, 5.0, 0.5, 889)
-    femmesh.addNode(35.625, 5.0, 0.75, 890)
-    femmesh.addNode(38.125, 5.0, 0.25, 891)
-    femmesh.addNode(39.375, 5.0, 0.25, 892)
-    femmesh.addNode(36.875, 5.0, 0.75, 893)
-    femmesh.addNode(37.5, 5.0, 0.5, 894)
-    femmesh.addNode(38.125, 5.0, 0.75, 895)
-    femmesh.addNode(40.625, 5.0, 0.25, 896)
-    femmesh.addNode(41.875, 5.0, 0.25, 897)
-    femmesh.addNode(39.375, 5.0, 0.75, 898)
-    femmesh.addNode(40.0, 5.0, 0.5, 899)
-    femmesh.addNode(40.625, 5.0, 0.75, 900)
-    femmesh.addNode(43.125, 5.0, 0.25, 901)
-    femmesh.addNode(44.375, 5.0, 0.25, 902)
-    femmesh.addNode(41.875, 5.0, 0.75, 903)
-    femmesh.addNode(42.5, 5.0, 0.5, 904)
-    femmesh.addNode(43.125, 5.0, 0.75, 905)
-    femmesh.addNode(45.625, 5.0, 0.25, 906)
-    femmesh.addNode(46.875, 5.0, 0.25, 907)
-    femmesh.addNode(44.375, 5.0, 0.75, 908)
-    femmesh.addNode(45.0, 5.0, 0.5, 909)
-    femmesh.addNode(45.625, 5.0, 0.75, 910)
-    femmesh.addNode(48.125, 5.0, 0.25, 911)
-    femmesh.addNode(49.375, 5.0, 0.25, 912)
-    femmesh.addNode(46.875, 5.0, 0.75, 913)
-    femmesh.addNode(47.5, 5.0, 0.5, 914)
-    femmesh.addNode(48.125, 5.0, 0.75, 915)
-    femmesh.addNode(50.625, 5.0, 0.25, 916)
-    femmesh.addNode(51.875, 5.0, 0.25, 917)
-    femmesh.addNode(49.375, 5.0, 0.75, 918)
-    femmesh.addNode(50.0, 5.0, 0.5, 919)
-    femmesh.addNode(50.625, 5.0, 0.75, 920)
-    femmesh.addNode(53.125, 5.0, 0.25, 921)
-    femmesh.addNode(54.375, 5.0, 0.25, 922)
-    femmesh.addNode(51.875, 5.0, 0.75, 923)
-    femmesh.addNode(52.5, 5.0, 0.5, 924)
-    femmesh.addNode(53.125, 5.0, 0.75, 925)
-    femmesh.addNode(55.625, 5.0, 0.25, 926)
-    femmesh.addNode(56.875, 5.0, 0.25, 927)
-    femmesh.addNode(54.375, 5.0, 0.75, 928)
-    femmesh.addNode(55.0, 5.0, 0.5, 929)
-    femmesh.addNode(55.625, 5.0, 0.75, 930)
-    femmesh.addNode(58.125, 5.0, 0.25, 931)
-    femmesh.addNode(59.375, 5.0, 0.25, 932)
-    femmesh.addNode(56.875, 5.0, 0.75, 933)
-    femmesh.addNode(57.5, 5.0, 0.5, 934)
-    femmesh.addNode(58.125, 5.0, 0.75, 935)
-    femmesh.addNode(60.625, 5.0, 0.25, 936)
-    femmesh.addNode(61.875, 5.0, 0.25, 937)
-    femmesh.addNode(59.375, 5.0, 0.75, 938)
-    femmesh.addNode(60.0, 5.0, 0.5, 939)
-    femmesh.addNode(60.625, 5.0, 0.75, 940)
-    femmesh.addNode(63.125, 5.0, 0.25, 941)
-    femmesh.addNode(64.375, 5.0, 0.25, 942)
-    femmesh.addNode(61.875, 5.0, 0.75, 943)
-    femmesh.addNode(62.5, 5.0, 0.5, 944)
-    femmesh.addNode(63.125, 5.0, 0.75, 945)
-    femmesh.addNode(65.625, 5.0, 0.25, 946)
-    femmesh.addNode(66.875, 5.0, 0.25, 947)
-    femmesh.addNode(64.375, 5.0, 0.75, 948)
-    femmesh.addNode(65.0, 5.0, 0.5, 949)
-    femmesh.addNode(65.625, 5.0, 0.75, 950)
-    femmesh.addNode(68.125, 5.0, 0.25, 951)
-    femmesh.addNode(69.375, 5.0, 0.25, 952)
-    femmesh.addNode(66.875, 5.0, 0.75, 953)
-    femmesh.addNode(67.5, 5.0, 0.5, 954)
-    femmesh.addNode(68.125, 5.0, 0.75, 955)
-    femmesh.addNode(70.625, 5.0, 0.25, 956)
-    femmesh.addNode(71.875, 5.0, 0.25, 957)
-    femmesh.addNode(69.375, 5.0, 0.75, 958)
-    femmesh.addNode(70.0, 5.0, 0.5, 959)
-    femmesh.addNode(70.625, 5.0, 0.75, 960)
-    femmesh.addNode(73.125, 5.0, 0.25, 961)
-    femmesh.addNode(74.375, 5.0, 0.25, 962)
-    femmesh.addNode(71.875, 5.0, 0.75, 963)
-    femmesh.addNode(72.5, 5.0, 0.5, 964)
-    femmesh.addNode(73.125, 5.0, 0.75, 965)
-    femmesh.addNode(75.625, 5.0, 0.25, 966)
-    femmesh.addNode(76.875, 5.0, 0.25, 967)
-    femmesh.addNode(74.375, 5.0, 0.75, 968)
-    femmesh.addNode(75.0, 5.0, 0.5, 969)
-    femmesh.addNode(75.625, 5.0, 0.75, 970)
-    femmesh.addNode(78.125, 5.0, 0.25, 971)
-    femmesh.addNode(79.375, 5.0, 0.25, 972)
-    femmesh.addNode(76.875, 5.0, 0.75, 973)
-    femmesh.addNode(77.5, 5.0, 0.5, 974)
-    femmesh.addNode(78.125, 5.0, 0.75, 975)
-    femmesh.addNode(80.625, 5.0, 0.25, 976)
-    femmesh.addNode(81.875, 5.0, 0.25, 977)
-    femmesh.addNode(79.375, 5.0, 0.75, 978)
-    femmesh.addNode(80.0, 5.0, 0.5, 979)
-    femmesh.addNode(80.625, 5.0, 0.75, 980)
-    femmesh.addNode(83.125, 5.0, 0.25, 981)
-    femmesh.addNode(84.375, 5.0, 0.25, 982)
-    femmesh.addNode(81.875, 5.0, 0.75, 983)
-    femmesh.addNode(82.5, 5.0, 0.5, 984)
-    femmesh.addNode(83.125, 5.0, 0.75, 985)
-    femmesh.addNode(85.625, 5.0, 0.25, 986)
-    femmesh.addNode(86.875, 5.0, 0.25, 987)
-    femmesh.addNode(84.375, 5.0, 0.75, 988)
-    femmesh.addNode(85.0, 5.0, 0.5, 989)
-    femmesh.addNode(85.625, 5.0, 0.75, 990)
-    femmesh.addNode(88.125, 5.0, 0.25, 991)
-    femmesh.addNode(89.375, 5.0, 0.25, 992)
-    femmesh.addNode(86.875, 5.0, 0.75, 993)
-    femmesh.addNode(87.5, 5.0, 0.5, 994)
-    femmesh.addNode(88.125, 5.0, 0.75, 995)
-    femmesh.addNode(90.625, 5.0, 0.25, 996)
-    femmesh.addNode(91.875, 5.0, 0.25, 997)
-    femmesh.addNode(89.375, 5.0, 0.75, 998)
-    femmesh.addNode(90.0, 5.0, 0.5, 999)
-    femmesh.addNode(90.625, 5.0, 0.75, 1000)
-    femmesh.addNode(93.125, 5.0, 0.25, 1001)
-    femmesh.addNode(94.375, 5.0, 0.25, 1002)
-    femmesh.addNode(91.875, 5.0, 0.75, 1003)
-    femmesh.addNode(92.5, 5.0, 0.5, 1004)
-    femmesh.addNode(93.125, 5.0, 0.75, 1005)
-    femmesh.addNode(95.625, 5.0, 0.25, 1006)
-    femmesh.addNode(96.875, 5.0, 0.25, 1007)
-    femmesh.addNode(94.375, 5.0, 0.75, 1008)
-    femmesh.addNode(95.0, 5.0, 0.5, 1009)
-    femmesh.addNode(95.625, 5.0, 0.75, 1010)
-    femmesh.addNode(97.5, 5.0, 0.5, 1011)
-    femmesh.addNode(96.875, 5.0, 0.75, 1012)
-    femmesh.addNode(3.5746173469387754, 2.5797193877551017, 0.0, 1013)
-    femmesh.addNode(8.75, 2.5, 0.0, 1014)
-    femmesh.addNode(13.75, 2.5, 0.0, 1015)
-    femmesh.addNode(18.75, 2.5, 0.0, 1016)
-    femmesh.addNode(23.75, 2.5, 0.0, 1017)
-    femmesh.addNode(28.75, 2.5, 0.0, 1018)
-    femmesh.addNode(33.75, 2.5, 0.0, 1019)
-    femmesh.addNode(38.75, 2.5, 0.0, 1020)
-    femmesh.addNode(43.75, 2.5, 0.0, 1021)
-    femmesh.addNode(48.75, 2.5, 0.0, 1022)
-    femmesh.addNode(53.75, 2.5, 0.0, 1023)
-    femmesh.addNode(58.75, 2.5, 0.0, 1024)
-    femmesh.addNode(63.75, 2.5, 0.0, 1025)
-    femmesh.addNode(68.75, 2.5, 0.0, 1026)
-    femmesh.addNode(73.75, 2.5, 0.0, 1027)
-    femmesh.addNode(78.75, 2.5, 0.0, 1028)
-    femmesh.addNode(83.75, 2.5, 0.0, 1029)
-    femmesh.addNode(88.75, 2.5, 0.0, 1030)
-    femmesh.addNode(93.7847222222222, 2.552083333333333, 0.0, 1031)
-    femmesh.addNode(96.50731646825398, 2.55146329365084, 0.0, 1032)
-    femmesh.addNode(6.22076955782313, 2.51328656462585, 0.0, 1033)
-    femmesh.addNode(11.25, 2.5, 0.0, 1034)
-    femmesh.addNode(16.25, 2.5, 0.0, 1035)
-    femmesh.addNode(21.25, 2.5, 0.0, 1036)
-    femmesh.addNode(26.25, 2.5, 0.0, 1037)
-    femmesh.addNode(31.25, 2.5, 0.0, 1038)
-    femmesh.addNode(36.25, 2.5, 0.0, 1039)
-    femmesh.addNode(41.25, 2.5, 0.0, 1040)
-    femmesh.addNode(46.25, 2.5, 0.0, 1041)
-    femmesh.addNode(51.25, 2.5, 0.0, 1042)
-    femmesh.addNode(56.25, 2.5, 0.0, 1043)
-    femmesh.addNode(61.25, 2.5, 0.0, 1044)
-    femmesh.addNode(66.25, 2.5, 0.0, 1045)
-    femmesh.addNode(71.25, 2.5, 0.0, 1046)
-    femmesh.addNode(76.25, 2.5, 0.0, 1047)
-    femmesh.addNode(81.25, 2.5, 0.0, 1048)
-    femmesh.addNode(86.25, 2.5, 0.0, 1049)
-    femmesh.addNode(91.25578703703702, 2.5086805555555554, 0.0, 1050)
-    femmesh.addNode(1.7763883458422938, 1.8384771651267755, 0.0, 1051)
-    femmesh.addNode(98.30199098589867, 1.7570173720606725, 0.0, 1052)
-    femmesh.addNode(98.49882388987963, 3.447719115548904, 0.0, 1053)
-    femmesh.addNode(1.5702011385562138, 3.383639310576376, 0.0, 1054)
-    femmesh.addNode(0.8881941729211469, 2.1692385825633878, 0.0, 1055)
-    femmesh.addNode(0.8881941729211469, 0.9192385825633878, 0.0, 1056)
-    femmesh.addNode(2.138194172921147, 0.9192385825633878, 0.0, 1057)
-    femmesh.addNode(0.7851005692781069, 4.191819655288188, 0.0, 1058)
-    femmesh.addNode(0.7851005692781069, 2.941819655288188, 0.0, 1059)
-    femmesh.addNode(2.035100569278107, 4.191819655288188, 0.0, 1060)
-    femmesh.addNode(99.15099549294933, 0.8785086860303363, 0.0, 1061)
-    femmesh.addNode(99.15099549294933, 2.128508686030336, 0.0, 1062)
-    femmesh.addNode(97.90099549294933, 0.8785086860303363, 0.0, 1063)
-    femmesh.addNode(99.24941194493982, 2.973859557774452, 0.0, 1064)
-    femmesh.addNode(99.24941194493982, 4.2238595577744515, 0.0, 1065)
-    femmesh.addNode(97.99941194493982, 4.2238595577744515, 0.0, 1066)
-    femmesh.addNode(1.673294742199254, 2.6110582378515756, 0.0, 1067)
-    femmesh.addNode(98.40040743788916, 2.602368243804788, 0.0, 1068)
-    femmesh.addNode(3.0373086734693877, 1.2898596938775508, 0.0, 1069)
-    femmesh.addNode(4.287308673469388, 1.2898596938775508, 0.0, 1070)
-    femmesh.addNode(2.6755028463905344, 2.2090982764409386, 0.0, 1071)
-    femmesh.addNode(5.610384778911564, 1.256643282312925, 0.0, 1072)
-    femmesh.addNode(6.860384778911564, 1.256643282312925, 0.0, 1073)
-    femmesh.addNode(4.8976934523809526, 2.546502976190476, 0.0, 1074)
-    femmesh.addNode(8.125, 1.25, 0.0, 1075)
-    femmesh.addNode(9.375, 1.25, 0.0, 1076)
-    femmesh.addNode(7.485384778911564, 2.506643282312925, 0.0, 1077)
-    femmesh.addNode(10.625, 1.25, 0.0, 1078)
-    femmesh.addNode(11.875, 1.25, 0.0, 1079)
-    femmesh.addNode(10.0, 2.5, 0.0, 1080)
-    femmesh.addNode(13.125, 1.25, 0.0, 1081)
-    femmesh.addNode(14.375, 1.25, 0.0, 1082)
-    femmesh.addNode(12.5, 2.5, 0.0, 1083)
-    femmesh.addNode(15.625, 1.25, 0.0, 1084)
-    femmesh.addNode(16.875, 1.25, 0.0, 1085)
-    femmesh.addNode(15.0, 2.5, 0.0, 1086)
-    femmesh.addNode(18.125, 1.25, 0.0, 1087)
-    femmesh.addNode(19.375, 1.25, 0.0, 1088)
-    femmesh.addNode(17.5, 2.5, 0.0, 1089)
-    femmesh.addNode(20.625, 1.25, 0.0, 1090)
-    femmesh.addNode(21.875, 1.25, 0.0, 1091)
-    femmesh.addNode(20.0, 2.5, 0.0, 1092)
-    femmesh.addNode(23.125, 1.25, 0.0, 1093)
-    femmesh.addNode(24.375, 1.25, 0.0, 1094)
-    femmesh.addNode(22.5, 2.5, 0.0, 1095)
-    femmesh.addNode(25.625, 1.25, 0.0, 1096)
-    femmesh.addNode(26.875, 1.25, 0.0, 1097)
-    femmesh.addNode(25.0, 2.5, 0.0, 1098)
-    femmesh.addNode(28.125, 1.25, 0.0, 1099)
-    femmesh.addNode(29.375, 1.25, 0.0, 1100)
-    femmesh.addNode(27.5, 2.5, 0.0, 1101)
-    femmesh.addNode(30.625, 1.25, 0.0, 1102)
-    femmesh.addNode(31.875, 1.25, 0.0, 1103)
-    femmesh.addNode(30.0, 2.5, 0.0, 1104)
-    femmesh.addNode(33.125, 1.25, 0.0, 1105)
-    femmesh.addNode(34.375, 1.25, 0.0, 1106)
-    femmesh.addNode(32.5, 2.5, 0.0, 1107)
-    femmesh.addNode(35.625, 1.25, 0.0, 1108)
-    femmesh.addNode(36.875, 1.25, 0.0, 1109)
-    femmesh.addNode(35.0, 2.5, 0.0, 1110)
-    femmesh.addNode(38.125, 1.25, 0.0, 1111)
-    femmesh.addNode(39.375, 1.25, 0.0, 1112)
-    femmesh.addNode(37.5, 2.5, 0.0, 1113)
-    femmesh.addNode(40.625, 1.25, 0.0, 1114)
-    femmesh.addNode(41.875, 1.25, 0.0, 1115)
-    femmesh.addNode(40.0, 2.5, 0.0, 1116)
-    femmesh.addNode(43.125, 1.25, 0.0, 1117)
-    femmesh.addNode(44.375, 1.25, 0.0, 1118)
-    femmesh.addNode(42.5, 2.5, 0.0, 1119)
-    femmesh.addNode(45.625, 1.25, 0.0, 1120)
-    femmesh.addNode(46.875, 1.25, 0.0, 1121)
-    femmesh.addNode(45.0, 2.5, 0.0, 1122)
-    femmesh.addNode(48.125, 1.25, 0.0, 1123)
-    femmesh.addNode(49.375, 1.25, 0.0, 1124)
-    femmesh.addNode(47.5, 2.5, 0.0, 1125)
-    femmesh.addNode(50.625, 1.25, 0.0, 1126)
-    femmesh.addNode(51.875, 1.25, 0.0, 1127)
-    femmesh.addNode(50.0, 2.5, 0.0, 1128)
-    femmesh.addNode(53.125, 1.25, 0.0, 1129)
-    femmesh.addNode(54.375, 1.25, 0.0, 1130)
-    femmesh.addNode(52.5, 2.5, 0.0, 1131)
-    femmesh.addNode(55.625, 1.25, 0.0, 1132)
-    femmesh.addNode(56.875, 1.25, 0.0, 1133)
-    femmesh.addNode(55.0, 2.5, 0.0, 1134)
-    femmesh.addNode(58.125, 1.25, 0.0, 1135)
-    femmesh.addNode(59.375, 1.25, 0.0, 1136)
-    femmesh.addNode(57.5, 2.5, 0.0, 1137)
-    femmesh.addNode(60.625, 1.25, 0.0, 1138)
-    femmesh.addNode(61.875, 1.25, 0.0, 1139)
-    femmesh.addNode(60.0, 2.5, 0.0, 1140)
-    femmesh.addNode(63.125, 1.25, 0.0, 1141)
-    femmesh.addNode(64.375, 1.25, 0.0, 1142)
-    femmesh.addNode(62.5, 2.5, 0.0, 1143)
-    femmesh.addNode(65.625, 1.25, 0.0, 1144)
-    femmesh.addNode(66.875, 1.25, 0.0, 1145)
-    femmesh.addNode(65.0, 2.5, 0.0, 1146)
-    femmesh.addNode(68.125, 1.25, 0.0, 1147)
-    femmesh.addNode(69.375, 1.25, 0.0, 1148)
-    femmesh.addNode(67.5, 2.5, 0.0, 1149)
-    femmesh.addNode(70.625, 1.25, 0.0, 1150)
-    femmesh.addNode(71.875, 1.25, 0.0, 1151)
-    femmesh.addNode(70.0, 2.5, 0.0, 1152)
-    femmesh.addNode(73.125, 1.25, 0.0, 1153)
-    femmesh.addNode(74.375, 1.25, 0.0, 1154)
-    femmesh.addNode(72.5, 2.5, 0.0, 1155)
-    femmesh.addNode(75.625, 1.25, 0.0, 1156)
-    femmesh.addNode(76.875, 1.25, 0.0, 1157)
-    femmesh.addNode(75.0, 2.5, 0.0, 1158)
-    femmesh.addNode(78.125, 1.25, 0.0, 1159)
-    femmesh.addNode(79.375, 1.25, 0.0, 1160)
-    femmesh.addNode(77.5, 2.5, 0.0, 1161)
-    femmesh.addNode(80.625, 1.25, 0.0, 1162)
-    femmesh.addNode(81.875, 1.25, 0.0, 1163)
-    femmesh.addNode(80.0, 2.5, 0.0, 1164)
-    femmesh.addNode(83.125, 1.25, 0.0, 1165)
-    femmesh.addNode(84.375, 1.25, 0.0, 1166)
-    femmesh.addNode(82.5, 2.5, 0.0, 1167)
-    femmesh.addNode(85.625, 1.25, 0.0, 1168)
-    femmesh.addNode(86.875, 1.25, 0.0, 1169)
-    femmesh.addNode(85.0, 2.5, 0.0, 1170)
-    femmesh.addNode(88.125, 1.25, 0.0, 1171)
-    femmesh.addNode(89.375, 1.25, 0.0, 1172)
-    femmesh.addNode(87.5, 2.5, 0.0, 1173)
-    femmesh.addNode(90.6278935185185, 1.2543402777777777, 0.0, 1174)
-    femmesh.addNode(91.8778935185185, 1.2543402777777777, 0.0, 1175)
-    femmesh.addNode(90.0028935185185, 2.5043402777777777, 0.0, 1176)
-    femmesh.addNode(93.1423611111111, 1.2760416666666665, 0.0, 1177)
-    femmesh.addNode(94.3923611111111, 1.2760416666666665, 0.0, 1178)
-    femmesh.addNode(92.52025462962962, 2.530381944444444, 0.0, 1179)
-    femmesh.addNode(95.75365823412699, 1.27573164682542, 0.0, 1180)
-    femmesh.addNode(97.00365823412699, 1.27573164682542, 0.0, 1181)
-    femmesh.addNode(95.14601934523809, 2.5517733134920864, 0.0, 1182)
-    femmesh.addNode(97.40465372707632, 2.1542403328557564, 0.0, 1183)
-    femmesh.addNode(4.287308673469388, 3.789859693877551, 0.0, 1184)
-    femmesh.addNode(3.0373086734693877, 3.789859693877551, 0.0, 1185)
-    femmesh.addNode(2.5724092427474945, 2.9816793491657387, 0.0, 1186)
-    femmesh.addNode(6.860384778911564, 3.756643282312925, 0.0, 1187)
-    femmesh.addNode(5.610384778911564, 3.756643282312925, 0.0, 1188)
-    femmesh.addNode(9.375, 3.75, 0.0, 1189)
-    femmesh.addNode(8.125, 3.75, 0.0, 1190)
-    femmesh.addNode(11.875, 3.75, 0.0, 1191)
-    femmesh.addNode(10.625, 3.75, 0.0, 1192)
-    femmesh.addNode(14.375, 3.75, 0.0, 1193)
-    femmesh.addNode(13.125, 3.75, 0.0, 1194)
-    femmesh.addNode(16.875, 3.75, 0.0, 1195)
-    femmesh.addNode(15.625, 3.75, 0.0, 1196)
-    femmesh.addNode(19.375, 3.75, 0.0, 1197)
-    femmesh.addNode(18.125, 3.75, 0.0, 1198)
-    femmesh.addNode(21.875, 3.75, 0.0, 1199)
-    femmesh.addNode(20.625, 3.75, 0.0, 1200)
-    femmesh.addNode(24.375, 3.75, 0.0, 1201)
-    femmesh.addNode(23.125, 3.75, 0.0, 1202)
-    femmesh.addNode(26.875, 3.75, 0.0, 1203)
-    femmesh.addNode(25.625, 3.75, 0.0, 1204)
-    femmesh.addNode(29.375, 3.75, 0.0, 1205)
-    femmesh.addNode(28.125, 3.75, 0.0, 1206)
-    femmesh.addNode(31.875, 3.75, 0.0, 1207)
-    femmesh.addNode(30.625, 3.75, 0.0, 1208)
-    femmesh.addNode(34.375, 3.75, 0.0, 1209)
-    femmesh.addNode(33.125, 3.75, 0.0, 1210)
-    femmesh.addNode(36.875, 3.75, 0.0, 1211)
-    femmesh.addNode(35.625, 3.75, 0.0, 1212)
-    femmesh.addNode(39.375, 3.75, 0.0, 1213)
-    femmesh.addNode(38.125, 3.75, 0.0, 1214)
-    femmesh.addNode(41.875, 3.75, 0.0, 1215)
-    femmesh.addNode(40.625, 3.75, 0.0, 1216)
-    femmesh.addNode(44.375, 3.75, 0.0, 1217)
-    femmesh.addNode(43.125, 3.75, 0.0, 1218)
-    femmesh.addNode(46.875, 3.75, 0.0, 1219)
-    femmesh.addNode(45.625, 3.75, 0.0, 1220)
-    femmesh.addNode(49.375, 3.75, 0.0, 1221)
-    femmesh.addNode(48.125, 3.75, 0.0, 1222)
-    femmesh.addNode(51.875, 3.75, 0.0, 1223)
-    femmesh.addNode(50.625, 3.75, 0.0, 1224)
-    femmesh.addNode(54.375, 3.75, 0.0, 1225)
-    femmesh.addNode(53.125, 3.75, 0.0, 1226)
-    femmesh.addNode(56.875, 3.75, 0.0, 1227)
-    femmesh.addNode(55.625, 3.75, 0.0, 1228)
-    femmesh.addNode(59.375, 3.75, 0.0, 1229)
-    femmesh.addNode(58.125, 3.75, 0.0, 1230)
-    femmesh.addNode(61.875, 3.75, 0.0, 1231)
-    femmesh.addNode(60.625, 3.75, 0.0, 1232)
-    femmesh.addNode(64.375, 3.75, 0.0, 1233)
-    femmesh.addNode(63.125, 3.75, 0.0, 1234)
-    femmesh.addNode(66.875, 3.75, 0.0, 1235)
-    femmesh.addNode(65.625, 3.75, 0.0, 1236)
-    femmesh.addNode(69.375, 3.75, 0.0, 1237)
-    femmesh.addNode(68.125, 3.75, 0.0, 1238)
-    femmesh.addNode(71.875, 3.75, 0.0, 1239)
-    femmesh.addNode(70.625, 3.75, 0.0, 1240)
-    femmesh.addNode(74.375, 3.75, 0.0, 1241)
-    femmesh.addNode(73.125, 3.75, 0.0, 1242)
-    femmesh.addNode(76.875, 3.75, 0.0, 1243)
-    femmesh.addNode(75.625, 3.75, 0.0, 1244)
-    femmesh.addNode(79.375, 3.75, 0.0, 1245)
-    femmesh.addNode(78.125, 3.75, 0.0, 1246)
-    femmesh.addNode(81.875, 3.75, 0.0, 1247)
-    femmesh.addNode(80.625, 3.75, 0.0, 1248)
-    femmesh.addNode(84.375, 3.75, 0.0, 1249)
-    femmesh.addNode(83.125, 3.75, 0.0, 1250)
-    femmesh.addNode(86.875, 3.75, 0.0, 1251)
-    femmesh.addNode(85.625, 3.75, 0.0, 1252)
-    femmesh.addNode(89.375, 3.75, 0.0, 1253)
-    femmesh.addNode(88.125, 3.75, 0.0, 1254)
-    femmesh.addNode(91.8778935185185, 3.7543402777777777, 0.0, 1255)
-    femmesh.addNode(90.6278935185185, 3.7543402777777777, 0.0, 1256)
-    femmesh.addNode(94.3923611111111, 3.7760416666666665, 0.0, 1257)
-    femmesh.addNode(93.1423611111111, 3.7760416666666665, 0.0, 1258)
-    femmesh.addNode(97.00365823412699, 3.7757316468254203, 0.0, 1259)
-    femmesh.addNode(95.75365823412699, 3.7757316468254203, 0.0, 1260)
-    femmesh.addNode(97.50307017906681, 2.999591204599872, 0.0, 1261)
-    femmesh.addNode(3.5746173469387754, 2.5797193877551017, 1.0, 1262)
-    femmesh.addNode(8.75, 2.5, 1.0, 1263)
-    femmesh.addNode(13.75, 2.5, 1.0, 1264)
-    femmesh.addNode(18.75, 2.5, 1.0, 1265)
-    femmesh.addNode(23.75, 2.5, 1.0, 1266)
-    femmesh.addNode(28.75, 2.5, 1.0, 1267)
-    femmesh.addNode(33.75, 2.5, 1.0, 1268)
-    femmesh.addNode(38.75, 2.5, 1.0, 1269)
-    femmesh.addNode(43.75, 2.5, 1.0, 1270)
-    femmesh.addNode(48.75, 2.5, 1.0, 1271)
-    femmesh.addNode(53.75, 2.5, 1.0, 1272)
-    femmesh.addNode(58.75, 2.5, 1.0, 1273)
-    femmesh.addNode(63.75, 2.5, 1.0, 1274)
-    femmesh.addNode(68.75, 2.5, 1.0, 1275)
-    femmesh.addNode(73.75, 2.5, 1.0, 1276)
-    femmesh.addNode(78.75, 2.5, 1.0, 1277)
-    femmesh.addNode(83.75, 2.5, 1.0, 1278)
-    femmesh.addNode(88.75, 2.5, 1.0, 1279)
-    femmesh.addNode(93.7847222222222, 2.552083333333333, 1.0, 1280)
-    femmesh.addNode(96.50731646825398, 2.55146329365084, 1.0, 1281)
-    femmesh.addNode(6.22076955782313, 2.51328656462585, 1.0, 1282)
-    femmesh.addNode(11.25, 2.5, 1.0, 1283)
-    femmesh.addNode(16.25, 2.5, 1.0, 1284)
-    femmesh.addNode(21.25, 2.5, 1.0, 1285)
-    femmesh.addNode(26.25, 2.5, 1.0, 1286)
-    femmesh.addNode(31.25, 2.5, 1.0, 1287)
-    femmesh.addNode(36.25, 2.5, 1.0, 1288)
-    femmesh.addNode(41.25, 2.5, 1.0, 1289)
-    femmesh.addNode(46.25, 2.5, 1.0, 1290)
-    femmesh.addNode(51.25, 2.5, 1.0, 1291)
-    femmesh.addNode(56.25, 2.5, 1.0, 1292)
-    femmesh.addNode(61.25, 2.5, 1.0, 1293)
-    femmesh.addNode(66.25, 2.5, 1.0, 1294)
-    femmesh.addNode(71.25, 2.5, 1.0, 1295)
-    femmesh.addNode(76.25, 2.5, 1.0, 1296)
-    femmesh.addNode(81.25, 2.5, 1.0, 1297)
-    femmesh.addNode(86.25, 2.5, 1.0, 1298)
-    femmesh.addNode(91.25578703703702, 2.5086805555555554, 1.0, 1299)
-    femmesh.addNode(1.7763883458422938, 1.8384771651267755, 1.0, 1300)
-    femmesh.addNode(98.30199098589867, 1.7570173720606725, 1.0, 1301)
-    femmesh.addNode(98.49882388987963, 3.447719115548904, 1.0, 1302)
-    femmesh.addNode(1.5702011385562138, 3.383639310576376, 1.0, 1303)
-    femmesh.addNode(0.8881941729211469, 0.9192385825633878, 1.0, 1304)
-    femmesh.addNode(0.8881941729211469, 2.1692385825633878, 1.0, 1305)
-    femmesh.addNode(2.138194172921147, 0.9192385825633878, 1.0, 1306)
-    femmesh.addNode(0.7851005692781069, 2.941819655288188, 1.0, 1307)
-    femmesh.addNode(0.7851005692781069, 4.191819655288188, 1.0, 1308)
-    femmesh.addNode(2.035100569278107, 4.191819655288188, 1.0, 1309)
-    femmesh.addNode(99.15099549294933, 2.128508686030336, 1.0, 1310)
-    femmesh.addNode(99.15099549294933, 0.8785086860303363, 1.0, 1311)
-    femmesh.addNode(97.90099549294933, 0.8785086860303363, 1.0, 1312)
-    femmesh.addNode(99.24941194493982, 4.2238595577744515, 1.0, 1313)
-    femmesh.addNode(99.24941194493982, 2.973859557774452, 1.0, 1314)
-    femmesh.addNode(97.99941194493982, 4.2238595577744515, 1.0, 1315)
-    femmesh.addNode(1.673294742199254, 2.6110582378515756, 1.0, 1316)
-    femmesh.addNode(98.40040743788916, 2.602368243804788, 1.0, 1317)
-    femmesh.addNode(4.287308673469388, 1.2898596938775508, 1.0, 1318)
-    femmesh.addNode(3.0373086734693877, 1.2898596938775508, 1.0, 1319)
-    femmesh.addNode(2.6755028463905344, 2.2090982764409386, 1.0, 1320)
-    femmesh.addNode(6.860384778911564, 1.256643282312925, 1.0, 1321)
-    femmesh.addNode(5.610384778911564, 1.256643282312925, 1.0, 1322)
-    femmesh.addNode(4.8976934523809526, 2.546502976190476, 1.0, 1323)
-    femmesh.addNode(9.375, 1.25, 1.0, 1324)
-    femmesh.addNode(8.125, 1.25, 1.0, 1325)
-    femmesh.addNode(7.485384778911564, 2.506643282312925, 1.0, 1326)
-    femmesh.addNode(11.875, 1.25, 1.0, 1327)
-    femmesh.addNode(10.625, 1.25, 1.0, 1328)
-    femmesh.addNode(10.0, 2.5, 1.0, 1329)
-    femmesh.addNode(14.375, 1.25, 1.0, 1330)
-    femmesh.addNode(13.125, 1.25, 1.0, 1331)
-    femmesh.addNode(12.5, 2.5, 1.0, 1332)
-    femmesh.addNode(16.875, 1.25, 1.0, 1333)
-    femmesh.addNode(15.625, 1.25, 1.0, 1334)
-    femmesh.addNode(15.0, 2.5, 1.0, 1335)
-    femmesh.addNode(19.375, 1.25, 1.0, 1336)
-    femmesh.addNode(18.125, 1.25, 1.0, 1337)
-    femmesh.addNode(17.5, 2.5, 1.0, 1338)
-    femmesh.addNode(21.875, 1.25, 1.0, 1339)
-    femmesh.addNode(20.625, 1.25, 1.0, 1340)
-    femmesh.addNode(20.0, 2.5, 1.0, 1341)
-    femmesh.addNode(24.375, 1.25, 1.0, 1342)
-    femmesh.addNode(23.125, 1.25, 1.0, 1343)
-    femmesh.addNode(22.5, 2.5, 1.0, 1344)
-    femmesh.addNode(26.875, 1.25, 1.0, 1345)
-    femmesh.addNode(25.625, 1.25, 1.0, 1346)
-    femmesh.addNode(25.0, 2.5, 1.0, 1347)
-    femmesh.addNode(29.375, 1.25, 1.0, 1348)
-    femmesh.addNode(28.125, 1.25, 1.0, 1349)
-    femmesh.addNode(27.5, 2.5, 1.0, 1350)
-    femmesh.addNode(31.875, 1.25, 1.0, 1351)
-    femmesh.addNode(30.625, 1.25, 1.0, 1352)
-    femmesh.addNode(30.0, 2.5, 1.0, 1353)
-    femmesh.addNode(34.375, 1.25, 1.0, 1354)
-    femmesh.addNode(33.125, 1.25, 1.0, 1355)
-    femmesh.addNode(32.5, 2.5, 1.0, 1356)
-    femmesh.addNode(36.875, 1.25, 1.0, 1357)
-    femmesh.addNode(35.625, 1.25, 1.0, 1358)
-    femmesh.addNode(35.0, 2.5, 1.0, 1359)
-    femmesh.addNode(39.375, 1.25, 1.0, 1360)
-    femmesh.addNode(38.125, 1.25, 1.0, 1361)
-    femmesh.addNode(37.5, 2.5, 1.0, 1362)
-    femmesh.addNode(41.875, 1.25, 1.0, 1363)
-    femmesh.addNode(40.625, 1.25, 1.0, 1364)
-    femmesh.addNode(40.0, 2.5, 1.0, 1365)
-    femmesh.addNode(44.375, 1.25, 1.0, 1366)
-    femmesh.addNode(43.125, 1.25, 1.0, 1367)
-    femmesh.addNode(42.5, 2.5, 1.0, 1368)
-    femmesh.addNode(46.875, 1.25, 1.0, 1369)
-    femmesh.addNode(45.625, 1.25, 1.0, 1370)
-    femmesh.addNode(45.0, 2.5, 1.0, 1371)
-    femmesh.addNode(49.375, 1.25, 1.0, 1372)
-    femmesh.addNode(48.125, 1.25, 1.0, 1373)
-    femmesh.addNode(47.5, 2.5, 1.0, 1374)
-    femmesh.addNode(51.875, 1.25, 1.0, 1375)
-    femmesh.addNode(50.625, 1.25, 1.0, 1376)
-    femmesh.addNode(50.0, 2.5, 1.0, 1377)
-    femmesh.addNode(54.375, 1.25, 1.0, 1378)
-    femmesh.addNode(53.125, 1.25, 1.0, 1379)
-    femmesh.addNode(52.5, 2.5, 1.0, 1380)
-    femmesh.addNode(56.875, 1.25, 1.0, 1381)
-    femmesh.addNode(55.625, 1.25, 1.0, 1382)
-    femmesh.addNode(55.0, 2.5, 1.0, 1383)
-    femmesh.addNode(59.375, 1.25, 1.0, 1384)
-    femmesh.addNode(58.125, 1.25, 1.0, 1385)
-    femmesh.addNode(57.5, 2.5, 1.0, 1386)
-    femmesh.addNode(61.875, 1.25, 1.0, 1387)
-    femmesh.addNode(60.625, 1.25, 1.0, 1388)
-    femmesh.addNode(60.0, 2.5, 1.0, 1389)
-    femmesh.addNode(64.375, 1.25, 1.0, 1390)
-    femmesh.addNode(63.125, 1.25, 1.0, 1391)
-    femmesh.addNode(62.5, 2.5, 1.0, 1392)
-    femmesh.addNode(66.875, 1.25, 1.0, 1393)
-    femmesh.addNode(65.625, 1.25, 1.0, 1394)
-    femmesh.addNode(65.0, 2.5, 1.0, 1395)
-    femmesh.addNode(69.375, 1.25, 1.0, 1396)
-    femmesh.addNode(68.125, 1.25, 1.0, 1397)
-    femmesh.addNode(67.5, 2.5, 1.0, 1398)
-    femmesh.addNode(71.875, 1.25, 1.0, 1399)
-    femmesh.addNode(70.625, 1.25, 1.0, 1400)
-    femmesh.addNode(70.0, 2.5, 1.0, 1401)
-    femmesh.addNode(74.375, 1.25, 1.0, 1402)
-    femmesh.addNode(73.125, 1.25, 1.0, 1403)
-    femmesh.addNode(72.5, 2.5, 1.0, 1404)
-    femmesh.addNode(76.875, 1.25, 1.0, 1405)
-    femmesh.addNode(75.625, 1.25, 1.0, 1406)
-    femmesh.addNode(75.0, 2.5, 1.0, 1407)
-    femmesh.addNode(79.375, 1.25, 1.0, 1408)
-    femmesh.addNode(78.125, 1.25, 1.0, 1409)
-    femmesh.addNode(77.5, 2.5, 1.0, 1410)
-    femmesh.addNode(81.875, 1.25, 1.0, 1411)
-    femmesh.addNode(80.625, 1.25, 1.0, 1412)
-    femmesh.addNode(80.0, 2.5, 1.0, 1413)
-    femmesh.addNode(84.375, 1.25, 1.0, 1414)
-    femmesh.addNode(83.125, 1.25, 1.0, 1415)
-    femmesh.addNode(82.5, 2.5, 1.0, 1416)
-    femmesh.addNode(86.875, 1.25, 1.0, 1417)
-    femmesh.addNode(85.625, 1.25, 1.0, 1418)
-    femmesh.addNode(85.0, 2.5, 1.0, 1419)
-    femmesh.addNode(89.375, 1.25, 1.0, 1420)
-    femmesh.addNode(88.125, 1.25, 1.0, 1421)
-    femmesh.addNode(87.5, 2.5, 1.0, 1422)
-    femmesh.addNode(91.8778935185185, 1.2543402777777777, 1.0, 1423)
-    femmesh.addNode(90.6278935185185, 1.2543402777777777, 1.0, 1424)
-    femmesh.addNode(90.0028935185185, 2.5043402777777777, 1.0, 1425)
-    femmesh.addNode(94.3923611111111, 1.2760416666666665, 1.0, 1426)
-    femmesh.addNode(93.1423611111111, 1.2760416666666665, 1.0, 1427)
-    femmesh.addNode(92.52025462962962, 2.530381944444444, 1.0, 1428)
-    femmesh.addNode(97.00365823412699, 1.27573164682542, 1.0, 1429)
-    femmesh.addNode(95.75365823412699, 1.27573164682542, 1.0, 1430)
-    femmesh.addNode(95.14601934523809, 2.5517733134920864, 1.0, 1431)
-    femmesh.addNode(97.40465372707632, 2.1542403328557564, 1.0, 1432)
-    femmesh.addNode(3.0373086734693877, 3.789859693877551, 1.0, 1433)
-    femmesh.addNode(4.287308673469388, 3.789859693877551, 1.0, 1434)
-    femmesh.addNode(2.5724092427474945, 2.9816793491657387, 1.0, 1435)
-    femmesh.addNode(5.610384778911564, 3.756643282312925, 1.0, 1436)
-    femmesh.addNode(6.860384778911564, 3.756643282312925, 1.0, 1437)
-    femmesh.addNode(8.125, 3.75, 1.0, 1438)
-    femmesh.addNode(9.375, 3.75, 1.0, 1439)
-    femmesh.addNode(10.625, 3.75, 1.0, 1440)
-    femmesh.addNode(11.875, 3.75, 1.0, 1441)
-    femmesh.addNode(13.125, 3.75, 1.0, 1442)
-    femmesh.addNode(14.375, 3.75, 1.0, 1443)
-    femmesh.addNode(15.625, 3.75, 1.0, 1444)
-    femmesh.addNode(16.875, 3.75, 1.0, 1445)
-    femmesh.addNode(18.125, 3.75, 1.0, 1446)
-    femmesh.addNode(19.375, 3.75, 1.0, 1447)
-    femmesh.addNode(20.625, 3.75, 1.0, 1448)
-    femmesh.addNode(21.875, 3.75, 1.0, 1449)
-    femmesh.addNode(23.125, 3.75, 1.0, 1450)
-    femmesh.addNode(24.375, 3.75, 1.0, 1451)
-    femmesh.addNode(25.625, 3.75, 1.0, 1452)
-    femmesh.addNode(26.875, 3.75, 1.0, 1453)
-    femmesh.addNode(28.125, 3.75, 1.0, 1454)
-    femmesh.addNode(29.375, 3.75, 1.0, 1455)
-    femmesh.addNode(30.625, 3.75, 1.0, 1456)
-    femmesh.addNode(31.875, 3.75, 1.0, 1457)
-    femmesh.addNode(33.125, 3.75, 1.0, 1458)
-    femmesh.addNode(34.375, 3.75, 1.0, 1459)
-    femmesh.addNode(35.625, 3.75, 1.0, 1460)
-    femmesh.addNode(36.875, 3.75, 1.0, 1461)
-    femmesh.addNode(38.125, 3.75, 1.0, 1462)
-    femmesh.addNode(39.375, 3.75, 1.0, 1463)
-    femmesh.addNode(40.625, 3.75, 1.0, 1464)
-    femmesh.addNode(41.875, 3.75, 1.0, 1465)
-    femmesh.addNode(43.125, 3.75, 1.0, 1466)
-    femmesh.addNode(44.375, 3.75, 1.0, 1467)
-    femmesh.addNode(45.625, 3.75, 1.0, 1468)
-    femmesh.addNode(46.875, 3.75, 1.0, 1469)
-    femmesh.addNode(48.125, 3.75, 1.0, 1470)
-    femmesh.addNode(49.375, 3.75, 1.0, 1471)
-    femmesh.addNode(50.625, 3.75, 1.0, 1472)
-    femmesh.addNode(51.875, 3.75, 1.0, 1473)
-    femmesh.addNode(53.125, 3.75, 1.0, 1474)
-    femmesh.addNode(54.375, 3.75, 1.0, 1475)
-    femmesh.addNode(55.625, 3.75, 1.0, 1476)
-    femmesh.addNode(56.875, 3.75, 1.0, 1477)
-    femmesh.addNode(58.125, 3.75, 1.0, 1478)
-    femmesh.addNode(59.375, 3.75, 1.0, 1479)
-    femmesh.addNode(60.625, 3.75, 1.0, 1480)
-    femmesh.addNode(61.875, 3.75, 1.0, 1481)
-    femmesh.addNode(63.125, 3.75, 1.0, 1482)
-    femmesh.addNode(64.375, 3.75, 1.0, 1483)
-    femmesh.addNode(65.625, 3.75, 1.0, 1484)
-    femmesh.addNode(66.875, 3.75, 1.0, 1485)
-    femmesh.addNode(68.125, 3.75, 1.0, 1486)
-    femmesh.addNode(69.375, 3.75, 1.0, 1487)
-    femmesh.addNode(70.625, 3.75, 1.0, 1488)
-    femmesh.addNode(71.875, 3.75, 1.0, 1489)
-    femmesh.addNode(73.125, 3.75, 1.0, 1490)
-    femmesh.addNode(74.375, 3.75, 1.0, 1491)
-    femmesh.addNode(75.625, 3.75, 1.0, 1492)
-    femmesh.addNode(76.875, 3.75, 1.0, 1493)
-    femmesh.addNode(78.125, 3.75, 1.0, 1494)
-    femmesh.addNode(79.375, 3.75, 1.0, 1495)
-    femmesh.addNode(80.625, 3.75, 1.0, 1496)
-    femmesh.addNode(81.875, 3.75, 1.0, 1497)
-    femmesh.addNode(83.125, 3.75, 1.0, 1498)
-    femmesh.addNode(84.375, 3.75, 1.0, 1499)
-    femmesh.addNode(85.625, 3.75, 1.0, 1500)
-    femmesh.addNode(86.875, 3.75, 1.0, 1501)
-    femmesh.addNode(88.125, 3.75, 1.0, 1502)
-    femmesh.addNode(89.375, 3.75, 1.0, 1503)
-    femmesh.addNode(90.6278935185185, 3.7543402777777777, 1.0, 1504)
-    femmesh.addNode(91.8778935185185, 3.7543402777777777, 1.0, 1505)
-    femmesh.addNode(93.1423611111111, 3.7760416666666665, 1.0, 1506)
-    femmesh.addNode(94.3923611111111, 3.7760416666666665, 1.0, 1507)
-    femmesh.addNode(95.75365823412699, 3.7757316468254203, 1.0, 1508)
-    femmesh.addNode(97.00365823412699, 3.7757316468254203, 1.0, 1509)
-    femmesh.addNode(97.50307017906681, 2.999591204599872, 1.0, 1510)
-    femmesh.addNode(0.0, 1.25, 1.5, 1511)
-    femmesh.addNode(0.0, 3.75, 1.5, 1512)
-    femmesh.addNode(0.0, 0.625, 1.75, 1513)
-    femmesh.addNode(0.0, 0.625, 1.25, 1514)
-    femmesh.addNode(0.0, 1.875, 1.25, 1515)
-    femmesh.addNode(0.0, 4.375, 1.25, 1516)
-    femmesh.addNode(0.0, 4.375, 1.75, 1517)
-    femmesh.addNode(0.0, 3.125, 1.25, 1518)
-    femmesh.addNode(0.0, 1.875, 1.75, 1519)
-    femmesh.addNode(0.0, 3.125, 1.75, 1520)
-    femmesh.addNode(0.0, 2.5, 1.5, 1521)
-    femmesh.addNode(100.0, 1.25, 1.5, 1522)
-    femmesh.addNode(100.0, 3.75, 1.5, 1523)
-    femmesh.addNode(100.0, 0.625, 1.25, 1524)
-    femmesh.addNode(100.0, 0.625, 1.75, 1525)
-    femmesh.addNode(100.0, 1.875, 1.25, 1526)
-    femmesh.addNode(100.0, 4.375, 1.75, 1527)
-    femmesh.addNode(100.0, 4.375, 1.25, 1528)
-    femmesh.addNode(100.0, 3.125, 1.25, 1529)
-    femmesh.addNode(100.0, 1.875, 1.75, 1530)
-    femmesh.addNode(100.0, 3.125, 1.75, 1531)
-    femmesh.addNode(100.0, 2.5, 1.5, 1532)
-    femmesh.addNode(1.25, 0.0, 1.5, 1533)
-    femmesh.addNode(98.75, 0.0, 1.5, 1534)
-    femmesh.addNode(3.75, 0.0, 1.5, 1535)
-    femmesh.addNode(6.25, 0.0, 1.5, 1536)
-    femmesh.addNode(8.75, 0.0, 1.5, 1537)
-    femmesh.addNode(11.25, 0.0, 1.5, 1538)
-    femmesh.addNode(13.75, 0.0, 1.5, 1539)
-    femmesh.addNode(16.25, 0.0, 1.5, 1540)
-    femmesh.addNode(18.75, 0.0, 1.5, 1541)
-    femmesh.addNode(21.25, 0.0, 1.5, 1542)
-    femmesh.addNode(23.75, 0.0, 1.5, 1543)
-    femmesh.addNode(26.25, 0.0, 1.5, 1544)
-    femmesh.addNode(28.75, 0.0, 1.5, 1545)
-    femmesh.addNode(31.25, 0.0, 1.5, 1546)
-    femmesh.addNode(33.75, 0.0, 1.5, 1547)
-    femmesh.addNode(36.25, 0.0, 1.5, 1548)
-    femmesh.addNode(38.75, 0.0, 1.5, 1549)
-    femmesh.addNode(41.25, 0.0, 1.5, 1550)
-    femmesh.addNode(43.75, 0.0, 1.5, 1551)
-    femmesh.addNode(46.25, 0.0, 1.5, 1552)
-    femmesh.addNode(48.75, 0.0, 1.5, 1553)
-    femmesh.addNode(51.25, 0.0, 1.5, 1554)
-    femmesh.addNode(53.75, 0.0, 1.5, 1555)
-    femmesh.addNode(56.25, 0.0, 1.5, 1556)
-    femmesh.addNode(58.75, 0.0, 1.5, 1557)
-    femmesh.addNode(61.25, 0.0, 1.5, 1558)
-    femmesh.addNode(63.75, 0.0, 1.5, 1559)
-    femmesh.addNode(66.25, 0.0, 1.5, 1560)
-    femmesh.addNode(68.75, 0.0, 1.5, 1561)
-    femmesh.addNode(71.25, 0.0, 1.5, 1562)
-    femmesh.addNode(73.75, 0.0, 1.5, 1563)
-    femmesh.addNode(76.25, 0.0, 1.5, 1564)
-    femmesh.addNode(78.75, 0.0, 1.5, 1565)
-    femmesh.addNode(81.25, 0.0, 1.5, 1566)
-    femmesh.addNode(83.75, 0.0, 1.5, 1567)
-    femmesh.addNode(86.25, 0.0, 1.5, 1568)
-    femmesh.addNode(88.75, 0.0, 1.5, 1569)
-    femmesh.addNode(91.25, 0.0, 1.5, 1570)
-    femmesh.addNode(93.75, 0.0, 1.5, 1571)
-    femmesh.addNode(96.25, 0.0, 1.5, 1572)
-    femmesh.addNode(0.625, 0.0, 1.25, 1573)
-    femmesh.addNode(0.625, 0.0, 1.75, 1574)
-    femmesh.addNode(1.875, 0.0, 1.25, 1575)
-    femmesh.addNode(99.375, 0.0, 1.75, 1576)
-    femmesh.addNode(99.375, 0.0, 1.25, 1577)
-    femmesh.addNode(98.125, 0.0, 1.25, 1578)
-    femmesh.addNode(1.875, 0.0, 1.75, 1579)
-    femmesh.addNode(98.125, 0.0, 1.75, 1580)
-    femmesh.addNode(4.375, 0.0, 1.25, 1581)
-    femmesh.addNode(3.125, 0.0, 1.25, 1582)
-    femmesh.addNode(2.5, 0.0, 1.5, 1583)
-    femmesh.addNode(3.125, 0.0, 1.75, 1584)
-    femmesh.addNode(6.875, 0.0, 1.25, 1585)
-    femmesh.addNode(5.625, 0.0, 1.25, 1586)
-    femmesh.addNode(5.0, 0.0, 1.5, 1587)
-    femmesh.addNode(4.375, 0.0, 1.75, 1588)
-    femmesh.addNode(5.625, 0.0, 1.75, 1589)
-    femmesh.addNode(9.375, 0.0, 1.25, 1590)
-    femmesh.addNode(8.125, 0.0, 1.25, 1591)
-    femmesh.addNode(7.5, 0.0, 1.5, 1592)
-    femmesh.addNode(6.875, 0.0, 1.75, 1593)
-    femmesh.addNode(8.125, 0.0, 1.75, 1594)
-    femmesh.addNode(11.875, 0.0, 1.25, 1595)
-    femmesh.addNode(10.625, 0.0, 1.25, 1596)
-    femmesh.addNode(10.0, 0.0, 1.5, 1597)
-    femmesh.addNode(9.375, 0.0, 1.75, 1598)
-    femmesh.addNode(10.625, 0.0, 1.75, 1599)
-    femmesh.addNode(14.375, 0.0, 1.25, 1600)
-    femmesh.addNode(13.125, 0.0, 1.25, 1601)
-    femmesh.addNode(12.5, 0.0, 1.5, 1602)
-    femmesh.addNode(11.875, 0.0, 1.75, 1603)
-    femmesh.addNode(13.125, 0.0, 1.75, 1604)
-    femmesh.addNode(16.875, 0.0, 1.25, 1605)
-    femmesh.addNode(15.625, 0.0, 1.25, 1606)
-    femmesh.addNode(15.0, 0.0, 1.5, 1607)
-    femmesh.addNode(14.375, 0.0, 1.75, 1608)
-    femmesh.addNode(15.625, 0.0, 1.75, 1609)
-    femmesh.addNode(19.375, 0.0, 1.25, 1610)
-    femmesh.addNode(18.125, 0.0, 1.25, 1611)
-    femmesh.addNode(17.5, 0.0, 1.5, 1612)
-    femmesh.addNode(16.875, 0.0, 1.75, 1613)
-    femmesh.addNode(18.125, 0.0, 1.75, 1614)
-    femmesh.addNode(21.875, 0.0, 1.25, 1615)
-    femmesh.addNode(20.625, 0.0, 1.25, 1616)
-    femmesh.addNode(20.0, 0.0, 1.5, 1617)
-    femmesh.addNode(19.375, 0.0, 1.75, 1618)
-    femmesh.addNode(20.625, 0.0, 1.75, 1619)
-    femmesh.addNode(24.375, 0.0, 1.25, 1620)
-    femmesh.addNode(23.125, 0.0, 1.25, 1621)
-    femmesh.addNode(22.5, 0.0, 1.5, 1622)
-    femmesh.addNode(21.875, 0.0, 1.75, 1623)
-    femmesh.addNode(23.125, 0.0, 1.75, 1624)
-    femmesh.addNode(26.875, 0.0, 1.25, 1625)
-    femmesh.addNode(25.625, 0.0, 1.25, 1626)
-    femmesh.addNode(25.0, 0.0, 1.5, 1627)
-    femmesh.addNode(24.375, 0.0, 1.75, 1628)
-    femmesh.addNode(25.625, 0.0, 1.75, 1629)
-    femmesh.addNode(29.375, 0.0, 1.25, 1630)
-    femmesh.addNode(28.125, 0.0, 1.25, 1631)
-    femmesh.addNode(27.5, 0.0, 1.5, 1632)
-    femmesh.addNode(26.875, 0.0, 1.75, 1633)
-    femmesh.addNode(28.125, 0.0, 1.75, 1634)
-    femmesh.addNode(31.875, 0.0, 1.25, 1635)
-    femmesh.addNode(30.625, 0.0, 1.25, 1636)
-    femmesh.addNode(30.0, 0.0, 1.5, 1637)
-    femmesh.addNode(29.375, 0.0, 1.75, 1638)
-    femmesh.addNode(30.625, 0.0, 1.75, 1639)
-    femmesh.addNode(34.375, 0.0, 1.25, 1640)
-    femmesh.addNode(33.125, 0.0, 1.25, 1641)
-    femmesh.addNode(32.5, 0.0, 1.5, 1642)
-    femmesh.addNode(31.875, 0.0, 1.75, 1643)
-    femmesh.addNode(33.125, 0.0, 1.75, 1644)
-    femmesh.addNode(36.875, 0.0, 1.25, 1645)
-    femmesh.addNode(35.625, 0.0, 1.25, 1646)
-    femmesh.addNode(35.0, 0.0, 1.5, 1647)
-    femmesh.addNode(34.375, 0.0, 1.75, 1648)
-    femmesh.addNode(35.625, 0.0, 1.75, 1649)
-    femmesh.addNode(39.375, 0.0, 1.25, 1650)
-    femmesh.addNode(38.125, 0.0, 1.25, 1651)
-    femmesh.addNode(37.5, 0.0, 1.5, 1652)
-    femmesh.addNode(36.875, 0.0, 1.75, 1653)
-    femmesh.addNode(38.125, 0.0, 1.75, 1654)
-    femmesh.addNode(41.875, 0.0, 1.25, 1655)
-    femmesh.addNode(40.625, 0.0, 1.25, 1656)
-    femmesh.addNode(40.0, 0.0, 1.5, 1657)
-    femmesh.addNode(39.375, 0.0, 1.75, 1658)
-    femmesh.addNode(40.625, 0.0, 1.75, 1659)
-    femmesh.addNode(44.375, 0.0, 1.25, 1660)
-    femmesh.addNode(43.125, 0.0, 1.25, 1661)
-    femmesh.addNode(42.5, 0.0, 1.5, 1662)
-    femmesh.addNode(41.875, 0.0, 1.75, 1663)
-    femmesh.addNode(43.125, 0.0, 1.75, 1664)
-    femmesh.addNode(46.875, 0.0, 1.25, 1665)
-    femmesh.addNode(45.625, 0.0, 1.25, 1666)
-    femmesh.addNode(45.0, 0.0, 1.5, 1667)
-    femmesh.addNode(44.375, 0.0, 1.75, 1668)
-    femmesh.addNode(45.625, 0.0, 1.75, 1669)
-    femmesh.addNode(49.375, 0.0, 1.25, 1670)
-    femmesh.addNode(48.125, 0.0, 1.25, 1671)
-    femmesh.addNode(47.5, 0.0, 1.5, 1672)
-    femmesh.addNode(46.875, 0.0, 1.75, 1673)
-    femmesh.addNode(48.125, 0.0, 1.75, 1674)
-    femmesh.addNode(51.875, 0.0, 1.25, 1675)
-    femmesh.addNode(50.625, 0.0, 1.25, 1676)
-    femmesh.addNode(50.0, 0.0, 1.5, 1677)
-    femmesh.addNode(49.375, 0.0, 1.75, 1678)
-    femmesh.addNode(50.625, 0.0, 1.75, 1679)
-    femmesh.addNode(54.375, 0.0, 1.25, 1680)
-    femmesh.addNode(53.125, 0.0, 1.25, 1681)
-    femmesh.addNode(52.5, 0.0, 1.5, 1682)
-    femmesh.addNode(51.875, 0.0, 1.75, 1683)
-    femmesh.addNode(53.125, 0.0, 1.75, 1684)
-    femmesh.addNode(56.875, 0.0, 1.25, 1685)
-    femmesh.addNode(55.625, 0.0, 1.25, 1686)
-    femmesh.addNode(55.0, 0.0, 1.5, 1687)
-    femmesh.addNode(54.375, 0.0, 1.75, 1688)
-    femmesh.addNode(55.625, 0.0, 1.75, 1689)
-    femmesh.addNode(59.375, 0.0, 1.25, 1690)
-    femmesh.addNode(58.125, 0.0, 1.25, 1691)
-    femmesh.addNode(57.5, 0.0, 1.5, 1692)
-    femmesh.addNode(56.875, 0.0, 1.75, 1693)
-    femmesh.addNode(58.125, 0.0, 1.75, 1694)
-    femmesh.addNode(61.875, 0.0, 1.25, 1695)
-    femmesh.addNode(60.625, 0.0, 1.25, 1696)
-    femmesh.addNode(60.0, 0.0, 1.5, 1697)
-    femmesh.addNode(59.375, 0.0, 1.75, 1698)
-    femmesh.addNode(60.625, 0.0, 1.75, 1699)
-    femmesh.addNode(64.375, 0.0, 1.25, 1700)
-    femmesh.addNode(63.125, 0.0, 1.25, 1701)
-    femmesh.addNode(62.5, 0.0, 1.5, 1702)
-    femmesh.addNode(61.875, 0.0, 1.75, 1703)
-    femmesh.addNode(63.125, 0.0, 1.75, 1704)
-    femmesh.addNode(66.875, 0.0, 1.25, 1705)
-    femmesh.addNode(65.625, 0.0, 1.25, 1706)
-    femmesh.addNode(65.0, 0.0, 1.5, 1707)
-    femmesh.addNode(64.375, 0.0, 1.75, 1708)
-    femmesh.addNode(65.625, 0.0, 1.75, 1709)
-    femmesh.addNode(69.375, 0.0, 1.25, 1710)
-    femmesh.addNode(68.125, 0.0, 1.25, 1711)
-    femmesh.addNode(67.5, 0.0, 1.5, 1712)
-    femmesh.addNode(66.875, 0.0, 1.75, 1713)
-    femmesh.addNode(68.125, 0.0, 1.75, 1714)
-    femmesh.addNode(71.875, 0.0, 1.25, 1715)
-    femmesh.addNode(70.625, 0.0, 1.25, 1716)
-    femmesh.addNode(70.0, 0.0, 1.5, 1717)
-    femmesh.addNode(69.375, 0.0, 1.75, 1718)
-    femmesh.addNode(70.625, 0.0, 1.75, 1719)
-    femmesh.addNode(74.375, 0.0, 1.25, 1720)
-    femmesh.addNode(73.125, 0.0, 1.25, 1721)
-    femmesh.addNode(72.5, 0.0, 1.5, 1722)
-    femmesh.addNode(71.875, 0.0, 1.75, 1723)
-    femmesh.addNode(73.125, 0.0, 1.75, 1724)
-    femmesh.addNode(76.875, 0.0, 1.25, 1725)
-    femmesh.addNode(75.625, 0.0, 1.25, 1726)
-    femmesh.addNode(75.0, 0.0, 1.5, 1727)
-    femmesh.addNode(74.375, 0.0, 1.75, 1728)
-    femmesh.addNode(75.625, 0.0, 1.75, 1729)
-    femmesh.addNode(79.375, 0.0, 1.25, 1730)
-    femmesh.addNode(78.125, 0.0, 1.25, 1731)
-    femmesh.addNode(77.5, 0.0, 1.5, 1732)
-    femmesh.addNode(76.875, 0.0, 1.75, 1733)
-    femmesh.addNode(78.125, 0.0, 1.75, 1734)
-    femmesh.addNode(81.875, 0.0, 1.25, 1735)
-    femmesh.addNode(80.625, 0.0, 1.25, 1736)
-    femmesh.addNode(80.0, 0.0, 1.5, 1737)
-    femmesh.addNode(79.375, 0.0, 1.75, 1738)
-    femmesh.addNode(80.625, 0.0, 1.75, 1739)
-    femmesh.addNode(84.375, 0.0, 1.25, 1740)
-    femmesh.addNode(83.125, 0.0, 1.25, 1741)
-    femmesh.addNode(82.5, 0.0, 1.5, 1742)
-    femmesh.addNode(81.875, 0.0, 1.75, 1743)
-    femmesh.addNode(83.125, 0.0, 1.75, 1744)
-    femmesh.addNode(86.875, 0.0, 1.25, 1745)
-    femmesh.addNode(85.625, 0.0, 1.25, 1746)
-    femmesh.addNode(85.0, 0.0, 1.5, 1747)
-    femmesh.addNode(84.375, 0.0, 1.75, 1748)
-    femmesh.addNode(85.625, 0.0, 1.75, 1749)
-    femmesh.addNode(89.375, 0.0, 1.25, 1750)
-    femmesh.addNode(88.125, 0.0, 1.25, 1751)
-    femmesh.addNode(87.5, 0.0, 1.5, 1752)
-    femmesh.addNode(86.875, 0.0, 1.75, 1753)
-    femmesh.addNode(88.125, 0.0, 1.75, 1754)
-    femmesh.addNode(91.875, 0.0, 1.25, 1755)
-    femmesh.addNode(90.625, 0.0, 1.25, 1756)
-    femmesh.addNode(90.0, 0.0, 1.5, 1757)
-    femmesh.addNode(89.375, 0.0, 1.75, 1758)
-    femmesh.addNode(90.625, 0.0, 1.75, 1759)
-    femmesh.addNode(94.375, 0.0, 1.25, 1760)
-    femmesh.addNode(93.125, 0.0, 1.25, 1761)
-    femmesh.addNode(92.5, 0.0, 1.5, 1762)
-    femmesh.addNode(91.875, 0.0, 1.75, 1763)
-    femmesh.addNode(93.125, 0.0, 1.75, 1764)
-    femmesh.addNode(96.875, 0.0, 1.25, 1765)
-    femmesh.addNode(95.625, 0.0, 1.25, 1766)
-    femmesh.addNode(95.0, 0.0, 1.5, 1767)
-    femmesh.addNode(94.375, 0.0, 1.75, 1768)
-    femmesh.addNode(95.625, 0.0, 1.75, 1769)
-    femmesh.addNode(97.5, 0.0, 1.5, 1770)
-    femmesh.addNode(96.875, 0.0, 1.75, 1771)
-    femmesh.addNode(1.25, 5.0, 1.5, 1772)
-    femmesh.addNode(98.75, 5.0, 1.5, 1773)
-    femmesh.addNode(3.75, 5.0, 1.5, 1774)
-    femmesh.addNode(6.25, 5.0, 1.5, 1775)
-    femmesh.addNode(8.75, 5.0, 1.5, 1776)
-    femmesh.addNode(11.25, 5.0, 1.5, 1777)
-    femmesh.addNode(13.75, 5.0, 1.5, 1778)
-    femmesh.addNode(16.25, 5.0, 1.5, 1779)
-    femmesh.addNode(18.75, 5.0, 1.5, 1780)
-    femmesh.addNode(21.25, 5.0, 1.5, 1781)
-    femmesh.addNode(23.75, 5.0, 1.5, 1782)
-    femmesh.addNode(26.25, 5.0, 1.5, 1783)
-    femmesh.addNode(28.75, 5.0, 1.5, 1784)
-    femmesh.addNode(31.25, 5.0, 1.5, 1785)
-    femmesh.addNode(33.75, 5.0, 1.5, 1786)
-    femmesh.addNode(36.25, 5.0, 1.5, 1787)
-    femmesh.addNode(38.75, 5.0, 1.5, 1788)
-    femmesh.addNode(41.25, 5.0, 1.5, 1789)
-    femmesh.addNode(43.75, 5.0, 1.5, 1790)
-    femmesh.addNode(46.25, 5.0, 1.5, 1791)
-    femmesh.addNode(48.75, 5.0, 1.5, 1792)
-    femmesh.addNode(51.25, 5.0, 1.5, 1793)
-    femmesh.addNode(53.75, 5.0, 1.5, 1794)
-    femmesh.addNode(56.25, 5.0, 1.5, 1795)
-    femmesh.addNode(58.75, 5.0, 1.5, 1796)
-    femmesh.addNode(61.25, 5.0, 1.5, 1797)
-    femmesh.addNode(63.75, 5.0, 1.5, 1798)
-    femmesh.addNode(66.25, 5.0, 1.5, 1799)
-    femmesh.addNode(68.75, 5.0, 1.5, 1800)
-    femmesh.addNode(71.25, 5.0, 1.5, 1801)
-    femmesh.addNode(73.75, 5.0, 1.5, 1802)
-    femmesh.addNode(76.25, 5.0, 1.5, 1803)
-    femmesh.addNode(78.75, 5.0, 1.5, 1804)
-    femmesh.addNode(81.25, 5.0, 1.5, 1805)
-    femmesh.addNode(83.75, 5.0, 1.5, 1806)
-    femmesh.addNode(86.25, 5.0, 1.5, 1807)
-    femmesh.addNode(88.75, 5.0, 1.5, 1808)
-    femmesh.addNode(91.25, 5.0, 1.5, 1809)
-    femmesh.addNode(93.75, 5.0, 1.5, 1810)
-    femmesh.addNode(96.25, 5.0, 1.5, 1811)
-    femmesh.addNode(0.625, 5.0, 1.75, 1812)
-    femmesh.addNode(0.625, 5.0, 1.25, 1813)
-    femmesh.addNode(1.875, 5.0, 1.25, 1814)
-    femmesh.addNode(99.375, 5.0, 1.25, 1815)
-    femmesh.addNode(99.375, 5.0, 1.75, 1816)
-    femmesh.addNode(98.125, 5.0, 1.25, 1817)
-    femmesh.addNode(1.875, 5.0, 1.75, 1818)
-    femmesh.addNode(98.125, 5.0, 1.75, 1819)
-    femmesh.addNode(3.125, 5.0, 1.25, 1820)
-    femmesh.addNode(4.375, 5.0, 1.25, 1821)
-    femmesh.addNode(2.5, 5.0, 1.5, 1822)
-    femmesh.addNode(3.125, 5.0, 1.75, 1823)
-    femmesh.addNode(5.625, 5.0, 1.25, 1824)
-    femmesh.addNode(6.875, 5.0, 1.25, 1825)
-    femmesh.addNode(4.375, 5.0, 1.75, 1826)
-    femmesh.addNode(5.0, 5.0, 1.5, 1827)
-    femmesh.addNode(5.625, 5.0, 1.75, 1828)
-    femmesh.addNode(8.125, 5.0, 1.25, 1829)
-    femmesh.addNode(9.375, 5.0, 1.25, 1830)
-    femmesh.addNode(6.875, 5.0, 1.75, 1831)
-    femmesh.addNode(7.5, 5.0, 1.5, 1832)
-    femmesh.addNode(8.125, 5.0, 1.75, 1833)
-    femmesh.addNode(10.625, 5.0, 1.25, 1834)
-    femmesh.addNode(11.875, 5.0, 1.25, 1835)
-    femmesh.addNode(9.375, 5.0, 1.75, 1836)
-    femmesh.addNode(10.0, 5.0, 1.5, 1837)
-    femmesh.addNode(10.625, 5.0, 1.75, 1838)
-    femmesh.addNode(13.125, 5.0, 1.25, 1839)
-    femmesh.addNode(14.375, 5.0, 1.25, 1840)
-    femmesh.addNode(11.875, 5.0, 1.75, 1841)
-    femmesh.addNode(12.5, 5.0, 1.5, 1842)
-    femmesh.addNode(13.125, 5.0, 1.75, 1843)
-    femmesh.addNode(15.625, 5.0, 1.25, 1844)
-    femmesh.addNode(16.875, 5.0, 1.25, 1845)
-    femmesh.addNode(14.375, 5.0, 1.75, 1846)
-    femmesh.addNode(15.0, 5.0, 1.5, 1847)
-    femmesh.addNode(15.625, 5.0, 1.75, 1848)
-    femmesh.addNode(18.125, 5.0, 1.25, 1849)
-    femmesh.addNode(19.375, 5.0, 1.25, 1850)
-    femmesh.addNode(16.875, 5.0, 1.75, 1851)
-    femmesh.addNode(17.5, 5.0, 1.5, 1852)
-    femmesh.addNode(18.125, 5.0, 1.75, 1853)
-    femmesh.addNode(20.625, 5.0, 1.25, 1854)
-    femmesh.addNode(21.875, 5.0, 1.25, 1855)
-    femmesh.addNode(19.375, 5.0, 1.75, 1856)
-    femmesh.addNode(20.0, 5.0, 1.5, 1857)
-    femmesh.addNode(20.625, 5.0, 1.75, 1858)
-    femmesh.addNode(23.125, 5.0, 1.25, 1859)
-    femmesh.addNode(24.375, 5.0, 1.25, 1860)
-    femmesh.addNode(21.875, 5.0, 1.75, 1861)
-    femmesh.addNode(22.5, 5.0, 1.5, 1862)
-    femmesh.addNode(23.125, 5.0, 1.75, 1863)
-    femmesh.addNode(25.625, 5.0, 1.25, 1864)
-    femmesh.addNode(26.875, 5.0, 1.25, 1865)
-    femmesh.addNode(24.375, 5.0, 1.75, 1866)
-    femmesh.addNode(25.0, 5.0, 1.5, 1867)
-    femmesh.addNode(25.625, 5.0, 1.75, 1868)
-    femmesh.addNode(28.125, 5.0, 1.25, 1869)
-    femmesh.addNode(29.375, 5.0, 1.25, 1870)
-    femmesh.addNode(26.875, 5.0, 1.75, 1871)
-    femmesh.addNode(27.5, 5.0, 1.5, 1872)
-    femmesh.addNode(28.125, 5.0, 1.75, 1873)
-    femmesh.addNode(30.625, 5.0, 1.25, 1874)
-    femmesh.addNode(31.875, 5.0, 1.25, 1875)
-    femmesh.addNode(29.375, 5.0, 1.75, 1876)
-    femmesh.addNode(30.0, 5.0, 1.5, 1877)
-    femmesh.addNode(30.625, 5.0, 1.75, 1878)
-    femmesh.addNode(33.125, 5.0, 1.25, 1879)
-    femmesh.addNode(34.375, 5.0, 1.25, 1880)
-    femmesh.addNode(31.875, 5.0, 1.75, 1881)
-    femmesh.addNode(32.5, 5.0, 1.5, 1882)
-    femmesh.addNode(33.125, 5.0, 1.75, 1883)
-    femmesh.addNode(35.625, 5.0, 1.25, 1884)
-    femmesh.addNode(36.875, 5.0, 1.25, 1885)
-    femmesh.addNode(34.375, 5.0, 1.75, 1886)
-    femmesh.addNode(35.0, 5.0, 1.5, 1887)
-    femmesh.addNode(35.625, 5.0, 1.75, 1888)
-    femmesh.addNode(38.125, 5.0, 1.25, 1889)
-    femmesh.addNode(39.375, 5.0, 1.25, 1890)
-    femmesh.addNode(36.875, 5.0, 1.75, 1891)
-    femmesh.addNode(37.5, 5.0, 1.5, 1892)
-    femmesh.addNode(38.125, 5.0, 1.75, 1893)
-    femmesh.addNode(40.625, 5.0, 1.25, 1894)
-    femmesh.addNode(41.875, 5.0, 1.25, 1895)
-    femmesh.addNode(39.375, 5.0, 1.75, 1896)
-    femmesh.addNode(40.0, 5.0, 1.5, 1897)
-    femmesh.addNode(40.625, 5.0, 1.75, 1898)
-    femmesh.addNode(43.125, 5.0, 1.25, 1899)
-    femmesh.addNode(44.375, 5.0, 1.25, 1900)
-    femmesh.addNode(41.875, 5.0, 1.75, 1901)
-    femmesh.addNode(42.5, 5.0, 1.5, 1902)
-    femmesh.addNode(43.125, 5.0, 1.75, 1903)
-    femmesh.addNode(45.625, 5.0, 1.25, 1904)
-    femmesh.addNode(46.875, 5.0, 1.25, 1905)
-    femmesh.addNode(44.375, 5.0, 1.75, 1906)
-    femmesh.addNode(45.0, 5.0, 1.5, 1907)
-    femmesh.addNode(45.625, 5.0, 1.75, 1908)
-    femmesh.addNode(48.125, 5.0, 1.25, 1909)
-    femmesh.addNode(49.375, 5.0, 1.25, 1910)
-    femmesh.addNode(46.875, 5.0, 1.75, 1911)
-    femmesh.addNode(47.5, 5.0, 1.5, 1912)
-    femmesh.addNode(48.125, 5.0, 1.75, 1913)
-    femmesh.addNode(50.625, 5.0, 1.25, 1914)
-    femmesh.addNode(51.875, 5.0, 1.25, 1915)
-    femmesh.addNode(49.375, 5.0, 1.75, 1916)
-    femmesh.addNode(50.0, 5.0, 1.5, 1917)
-    femmesh.addNode(50.625, 5.0, 1.75, 1918)
-    femmesh.addNode(53.125, 5.0, 1.25, 1919)
-    femmesh.addNode(54.375, 5.0, 1.25, 1920)
-    femmesh.addNode(51.875, 5.0, 1.75, 1921)
-    femmesh.addNode(52.5, 5.0, 1.5, 1922)
-    femmesh.addNode(53.125, 5.0, 1.75, 1923)
-    femmesh.addNode(55.625, 5.0, 1.25, 1924)
-    femmesh.addNode(56.875, 5.0, 1.25, 1925)
-    femmesh.addNode(54.375, 5.0, 1.75, 1926)
-    femmesh.addNode(55.0, 5.0, 1.5, 1927)
-    femmesh.addNode(55.625, 5.0, 1.75, 1928)
-    femmesh.addNode(58.125, 5.0, 1.25, 1929)
-    femmesh.addNode(59.375, 5.0, 1.25, 1930)
-    femmesh.addNode(56.875, 5.0, 1.75, 1931)
-    femmesh.addNode(57.5, 5.0, 1.5, 1932)
-    femmesh.addNode(58.125, 5.0, 1.75, 1933)
-    femmesh.addNode(60.625, 5.0, 1.25, 1934)
-    femmesh.addNode(61.875, 5.0, 1.25, 1935)
-    femmesh.addNode(59.375, 5.0, 1.75, 1936)
-    femmesh.addNode(60.0, 5.0, 1.5, 1937)
-    femmesh.addNode(60.625, 5.0, 1.75, 1938)
-    femmesh.addNode(63.125, 5.0, 1.25, 1939)
-    femmesh.addNode(64.375, 5.0, 1.25, 1940)
-    femmesh.addNode(61.875, 5.0, 1.75, 1941)
-    femmesh.addNode(62.5, 5.0, 1.5, 1942)
-    femmesh.addNode(63.125, 5.0, 1.75, 1943)
-    femmesh.addNode(65.625, 5.0, 1.25, 1944)
-    femmesh.addNode(66.875, 5.0, 1.25, 1945)
-    femmesh.addNode(64.375, 5.0, 1.75, 1946)
-    femmesh.addNode(65.0, 5.0, 1.5, 1947)
-    femmesh.addNode(65.625, 5.0, 1.75, 1948)
-    femmesh.addNode(68.125, 5.0, 1.25, 1949)
-    femmesh.addNode(69.375, 5.0, 1.25, 1950)
-    femmesh.addNode(66.875, 5.0, 1.75, 1951)
-    femmesh.addNode(67.5, 5.0, 1.5, 1952)
-    femmesh.addNode(68.125, 5.0, 1.75, 1953)
-    femmesh.addNode(70.625, 5.0, 1.25, 1954)
-    femmesh.addNode(71.875, 5.0, 1.25, 1955)
-    femmesh.addNode(69.375, 5.0, 1.75, 1956)
-    femmesh.addNode(70.0, 5.0, 1.5, 1957)
-    femmesh.addNode(70.625, 5.0, 1.75, 1958)
-    femmesh.addNode(73.125, 5.0, 1.25, 1959)
-    femmesh.addNode(74.375, 5.0, 1.25, 1960)
-    femmesh.addNode(71.875, 5.0, 1.75, 1961)
-    femmesh.addNode(72.5, 5.0, 1.5, 1962)
-    femmesh.addNode(73.125, 5.0, 1.75, 1963)
-    femmesh.addNode(75.625, 5.0, 1.25, 1964)
-    femmesh.addNode(76.875, 5.0, 1.25, 1965)
-    femmesh.addNode(74.375, 5.0, 1.75, 1966)
-    femmesh.addNode(75.0, 5.0, 1.5, 1967)
-    femmesh.addNode(75.625, 5.0, 1.75, 1968)
-    femmesh.addNode(78.125, 5.0, 1.25, 1969)
-    femmesh.addNode(79.375, 5.0, 1.25, 1970)
-    femmesh.addNode(76.875, 5.0, 1.75, 1971)
-    femmesh.addNode(77.5, 5.0, 1.5, 1972)
-    femmesh.addNode(78.125, 5.0, 1.75, 1973)
-    femmesh.addNode(80.625, 5.0, 1.25, 1974)
-    femmesh.addNode(81.875, 5.0, 1.25, 1975)
-    femmesh.addNode(79.375, 5.0, 1.75, 1976)
-    femmesh.addNode(80.0, 5.0, 1.5, 1977)
-    femmesh.addNode(80.625, 5.0, 1.75, 1978)
-    femmesh.addNode(83.125, 5.0, 1.25, 1979)
-    femmesh.addNode(84.375, 5.0, 1.25, 1980)
-    femmesh.addNode(81.875, 5.0, 1.75, 1981)
-    femmesh.addNode(82.5, 5.0, 1.5, 1982)
-    femmesh.addNode(83.125, 5.0, 1.75, 1983)
-    femmesh.addNode(85.625, 5.0, 1.25, 1984)
-    femmesh.addNode(86.875, 5.0, 1.25, 1985)
-    femmesh.addNode(84.375, 5.0, 1.75, 1986)
-    femmesh.addNode(85.0, 5.0, 1.5, 1987)
-    femmesh.addNode(85.625, 5.0, 1.75, 1988)
-    femmesh.addNode(88.125, 5.0, 1.25, 1989)
-    femmesh.addNode(89.375, 5.0, 1.25, 1990)
-    femmesh.addNode(86.875, 5.0, 1.75, 1991)
-    femmesh.addNode(87.5, 5.0, 1.5, 1992)
-    femmesh.addNode(88.125, 5.0, 1.75, 1993)
-    femmesh.addNode(90.625, 5.0, 1.25, 1994)
-    femmesh.addNode(91.875, 5.0, 1.25, 1995)
-    femmesh.addNode(89.375, 5.0, 1.75, 1996)
-    femmesh.addNode(90.0, 5.0, 1.5, 1997)
-    femmesh.addNode(90.625, 5.0, 1.75, 1998)
-    femmesh.addNode(93.125, 5.0, 1.25, 1999)
-    femmesh.addNode(94.375, 5.0, 1.25, 2000)
-    femmesh.addNode(91.875, 5.0, 1.75, 2001)
-    femmesh.addNode(92.5, 5.0, 1.5, 2002)
-    femmesh.addNode(93.125, 5.0, 1.75, 2003)
-    femmesh.addNode(95.625, 5.0, 1.25, 2004)
-    femmesh.addNode(96.875, 5.0, 1.25, 2005)
-    femmesh.addNode(94.375, 5.0, 1.75, 2006)
-    femmesh.addNode(95.0, 5.0, 1.5, 2007)
-    femmesh.addNode(95.625, 5.0, 1.75, 2008)
-    femmesh.addNode(97.5, 5.0, 1.5, 2009)
-    femmesh.addNode(96.875, 5.0, 1.75, 2010)
-    femmesh.addNode(3.5746173469387754, 2.5797193877551017, 2.0, 2011)
-    femmesh.addNode(8.75, 2.5, 2.0, 2012)
-    femmesh.addNode(13.75, 2.5, 2.0, 2013)
-    femmesh.addNode(18.75, 2.5, 2.0, 2014)
-    femmesh.addNode(23.75, 2.5, 2.0, 2015)
-    femmesh.addNode(28.75, 2.5, 2.0, 2016)
-    femmesh.addNode(33.75, 2.5, 2.0, 2017)
-    femmesh.addNode(38.75, 2.5, 2.0, 2018)
-    femmesh.addNode(43.75, 2.5, 2.0, 2019)
-    femmesh.addNode(48.75, 2.5, 2.0, 2020)
-    femmesh.addNode(53.75, 2.5, 2.0, 2021)
-    femmesh.addNode(58.75, 2.5, 2.0, 2022)
-    femmesh.addNode(63.75, 2.5, 2.0, 2023)
-    femmesh.addNode(68.75, 2.5, 2.0, 2024)
-    femmesh.addNode(73.75, 2.5, 2.0, 2025)
-    femmesh.addNode(78.75, 2.5, 2.0, 2026)
-    femmesh.addNode(83.75, 2.5, 2.0, 2027)
-    femmesh.addNode(88.75, 2.5, 2.0, 2028)
-    femmesh.addNode(93.7847222222222, 2.552083333333333, 2.0, 2029)
-    femmesh.addNode(96.50731646825398, 2.55146329365084, 2.0, 2030)
-    femmesh.addNode(6.22076955782313, 2.51328656462585, 2.0, 2031)
-    femmesh.addNode(11.25, 2.5, 2.0, 2032)
-    femmesh.addNode(16.25, 2.5, 2.0, 2033)
-    femmesh.addNode(21.25, 2.5, 2.0, 2034)
-    femmesh.addNode(26.25, 2.5, 2.0, 2035)
-    femmesh.addNode(31.25, 2.5, 2.0, 2036)
-    femmesh.addNode(36.25, 2.5, 2.0, 2037)
-    femmesh.addNode(41.25, 2.5, 2.0, 2038)
-    femmesh.addNode(46.25, 2.5, 2.0, 2039)
-    femmesh.addNode(51.25, 2.5, 2.0, 2040)
-    femmesh.addNode(56.25, 2.5, 2.0, 2041)
-    femmesh.addNode(61.25, 2.5, 2.0, 2042)
-    femmesh.addNode(66.25, 2.5, 2.0, 2043)
-    femmesh.addNode(71.25, 2.5, 2.0, 2044)
-    femmesh.addNode(76.25, 2.5, 2.0, 2045)
-    femmesh.addNode(81.25, 2.5, 2.0, 2046)
-    femmesh.addNode(86.25, 2.5, 2.0, 2047)
-    femmesh.addNode(91.25578703703702, 2.5086805555555554, 2.0, 2048)
-    femmesh.addNode(1.7763883458422938, 1.8384771651267755, 2.0, 2049)
-    femmesh.addNode(98.30199098589867, 1.7570173720606725, 2.0, 2050)
-    femmesh.addNode(98.49882388987963, 3.447719115548904, 2.0, 2051)
-    femmesh.addNode(1.5702011385562138, 3.383639310576376, 2.0, 2052)
-    femmesh.addNode(0.8881941729211469, 0.9192385825633878, 2.0, 2053)
-    femmesh.addNode(0.8881941729211469, 2.1692385825633878, 2.0, 2054)
-    femmesh.addNode(2.138194172921147, 0.9192385825633878, 2.0, 2055)
-    femmesh.addNode(0.7851005692781069, 2.941819655288188, 2.0, 2056)
-    femmesh.addNode(0.7851005692781069, 4.191819655288188, 2.0, 2057)
-    femmesh.addNode(2.035100569278107, 4.191819655288188, 2.0, 2058)
-    femmesh.addNode(99.15099549294933, 2.128508686030336, 2.0, 2059)
-    femmesh.addNode(99.15099549294933, 0.8785086860303363, 2.0, 2060)
-    femmesh.addNode(97.90099549294933, 0.8785086860303363, 2.0, 2061)
-    femmesh.addNode(99.24941194493982, 4.2238595577744515, 2.0, 2062)
-    femmesh.addNode(99.24941194493982, 2.973859557774452, 2.0, 2063)
-    femmesh.addNode(97.99941194493982, 4.2238595577744515, 2.0, 2064)
-    femmesh.addNode(1.673294742199254, 2.6110582378515756, 2.0, 2065)
-    femmesh.addNode(98.40040743788916, 2.602368243804788, 2.0, 2066)
-    femmesh.addNode(4.287308673469388, 1.2898596938775508, 2.0, 2067)
-    femmesh.addNode(3.0373086734693877, 1.2898596938775508, 2.0, 2068)
-    femmesh.addNode(2.6755028463905344, 2.2090982764409386, 2.0, 2069)
-    femmesh.addNode(6.860384778911564, 1.256643282312925, 2.0, 2070)
-    femmesh.addNode(5.610384778911564, 1.256643282312925, 2.0, 2071)
-    femmesh.addNode(4.8976934523809526, 2.546502976190476, 2.0, 2072)
-    femmesh.addNode(9.375, 1.25, 2.0, 2073)
-    femmesh.addNode(8.125, 1.25, 2.0, 2074)
-    femmesh.addNode(7.485384778911564, 2.506643282312925, 2.0, 2075)
-    femmesh.addNode(11.875, 1.25, 2.0, 2076)
-    femmesh.addNode(10.625, 1.25, 2.0, 2077)
-    femmesh.addNode(10.0, 2.5, 2.0, 2078)
-    femmesh.addNode(14.375, 1.25, 2.0, 2079)
-    femmesh.addNode(13.125, 1.25, 2.0, 2080)
-    femmesh.addNode(12.5, 2.5, 2.0, 2081)
-    femmesh.addNode(16.875, 1.25, 2.0, 2082)
-    femmesh.addNode(15.625, 1.25, 2.0, 2083)
-    femmesh.addNode(15.0, 2.5, 2.0, 2084)
-    femmesh.addNode(19.375, 1.25, 2.0, 2085)
-    femmesh.addNode(18.125, 1.25, 2.0, 2086)
-    femmesh.addNode(17.5, 2.5, 2.0, 2087)
-    femmesh.addNode(21.875, 1.25, 2.0, 2088)
-    femmesh.addNode(20.625, 1.25, 2.0, 2089)
-    femmesh.addNode(20.0, 2.5, 2.0, 2090)
-    femmesh.addNode(24.375, 1.25, 2.0, 2091)
-    femmesh.addNode(23.125, 1.25, 2.0, 2092)
-    femmesh.addNode(22.5, 2.5, 2.0, 2093)
-    femmesh.addNode(26.875, 1.25, 2.0, 2094)
-    femmesh.addNode(25.625, 1.25, 2.0, 2095)
-    femmesh.addNode(25.0, 2.5, 2.0, 2096)
-    femmesh.addNode(29.375, 1.25, 2.0, 2097)
-    femmesh.addNode(28.125, 1.25, 2.0, 2098)
-    femmesh.addNode(27.5, 2.5, 2.0, 2099)
-    femmesh.addNode(31.875, 1.25, 2.0, 2100)
-    femmesh.addNode(30.625, 1.25, 2.0, 2101)
-    femmesh.addNode(30.0, 2.5, 2.0, 2102)
-    femmesh.addNode(34.375, 1.25, 2.0, 2103)
-    femmesh.addNode(33.125, 1.25, 2.0, 2104)
-    femmesh.addNode(32.5, 2.5, 2.0, 2105)
-    femmesh.addNode(36.875, 1.25, 2.0, 2106)
-    femmesh.addNode(35.625, 1.25, 2.0, 2107)
-    femmesh.addNode(35.0, 2.5, 2.0, 2108)
-    femmesh.addNode(39.375, 1.25, 2.0, 2109)
-    femmesh.addNode(38.125, 1.25, 2.0, 2110)
-    femmesh.addNode(37.5, 2.5, 2.0, 2111)
-    femmesh.addNode(41.875, 1.25, 2.0, 2112)
-    femmesh.addNode(40.625, 1.25, 2.0, 2113)
-    femmesh.addNode(40.0, 2.5, 2.0, 2114)
-    femmesh.addNode(44.375, 1.25, 2.0, 2115)
-    femmesh.addNode(43.125, 1.25, 2.0, 2116)
-    femmesh.addNode(42.5, 2.5, 2.0, 2117)
-    femmesh.addNode(46.875, 1.25, 2.0, 2118)
-    femmesh.addNode(45.625, 1.25, 2.0, 2119)
-    femmesh.addNode(45.0, 2.5, 2.0, 2120)
-    femmesh.addNode(49.375, 1.25, 2.0, 2121)
-    femmesh.addNode(48.125, 1.25, 2.0, 2122)
-    femmesh.addNode(47.5, 2.5, 2.0, 2123)
-    femmesh.addNode(51.875, 1.25, 2.0, 2124)
-    femmesh.addNode(50.625, 1.25, 2.0, 2125)
-    femmesh.addNode(50.0, 2.5, 2.0, 2126)
-    femmesh.addNode(54.375, 1.25, 2.0, 2127)
-    femmesh.addNode(53.125, 1.25, 2.0, 2128)
-    femmesh.addNode(52.5, 2.5, 2.0, 2129)
-    femmesh.addNode(56.875, 1.25, 2.0, 2130)
-    femmesh.addNode(55.625, 1.25, 2.0, 2131)
-    femmesh.addNode(55.0, 2.5, 2.0, 2132)
-    femmesh.addNode(59.375, 1.25, 2.0, 2133)
-    femmesh.addNode(58.125, 1.25, 2.0, 2134)
-    femmesh.addNode(57.5, 2.5, 2.0, 2135)
-    femmesh.addNode(61.875, 1.25, 2.0, 2136)
-    femmesh.addNode(60.625, 1.25, 2.0, 2137)
-    femmesh.addNode(60.0, 2.5, 2.0, 2138)
-    femmesh.addNode(64.375, 1.25, 2.0, 2139)
-    femmesh.addNode(63.125, 1.25, 2.0, 2140)
-    femmesh.addNode(62.5, 2.5, 2.0, 2141)
-    femmesh.addNode(66.875, 1.25, 2.0, 2142)
-    femmesh.addNode(65.625, 1.25, 2.0, 2143)
-    femmesh.addNode(65.0, 2.5, 2.0, 2144)
-    femmesh.addNode(69.375, 1.25, 2.0, 2145)
-    femmesh.addNode(68.125, 1.25, 2.0, 2146)
-    femmesh.addNode(67.5, 2.5, 2.0, 2147)
-    femmesh.addNode(71.875, 1.25, 2.0, 2148)
-    femmesh.addNode(70.625, 1.25, 2.0, 2149)
-    femmesh.addNode(70.0, 2.5, 2.0, 2150)
-    femmesh.addNode(74.375, 1.25, 2.0, 2151)
-    femmesh.addNode(73.125, 1.25, 2.0, 2152)
-    femmesh.addNode(72.5, 2.5, 2.0, 2153)
-    femmesh.addNode(76.875, 1.25, 2.0, 2154)
-    femmesh.addNode(75.625, 1.25, 2.0, 2155)
-    femmesh.addNode(75.0, 2.5, 2.0, 2156)
-    femmesh.addNode(79.375, 1.25, 2.0, 2157)
-    femmesh.addNode(78.125, 1.25, 2.0, 2158)
-    femmesh.addNode(77.5, 2.5, 2.0, 2159)
-    femmesh.addNode(81.875, 1.25, 2.0, 2160)
-    femmesh.addNode(80.625, 1.25, 2.0, 2161)
-    femmesh.addNode(80.0, 2.5, 2.0, 2162)
-    femmesh.addNode(84.375, 1.25, 2.0, 2163)
-    femmesh.addNode(83.125, 1.25, 2.0, 2164)
-    femmesh.addNode(82.5, 2.5, 2.0, 2165)
-    femmesh.addNode(86.875, 1.25, 2.0, 2166)
-    femmesh.addNode(85.625, 1.25, 2.0, 2167)
-    femmesh.addNode(85.0, 2.5, 2.0, 2168)
-    femmesh.addNode(89.375, 1.25, 2.0, 2169)
-    femmesh.addNode(88.125, 1.25, 2.0, 2170)
-    femmesh.addNode(87.5, 2.5, 2.0, 2171)
-    femmesh.addNode(91.8778935185185, 1.2543402777777777, 2.0, 2172)
-    femmesh.addNode(90.6278935185185, 1.2543402777777777, 2.0, 2173)
-    femmesh.addNode(90.0028935185185, 2.5043402777777777, 2.0, 2174)
-    femmesh.addNode(94.3923611111111, 1.2760416666666665, 2.0, 2175)
-    femmesh.addNode(93.1423611111111, 1.2760416666666665, 2.0, 2176)
-    femmesh.addNode(92.52025462962962, 2.530381944444444, 2.0, 2177)
-    femmesh.addNode(97.00365823412699, 1.27573164682542, 2.0, 2178)
-    femmesh.addNode(95.75365823412699, 1.27573164682542, 2.0, 2179)
-    femmesh.addNode(95.14601934523809, 2.5517733134920864, 2.0, 2180)
-    femmesh.addNode(97.40465372707632, 2.1542403328557564, 2.0, 2181)
-    femmesh.addNode(3.0373086734693877, 3.789859693877551, 2.0, 2182)
-    femmesh.addNode(4.287308673469388, 3.789859693877551, 2.0, 2183)
-    femmesh.addNode(2.5724092427474945, 2.9816793491657387, 2.0, 2184)
-    femmesh.addNode(5.610384778911564, 3.756643282312925, 2.0, 2185)
-    femmesh.addNode(6.860384778911564, 3.756643282312925, 2.0, 2186)
-    femmesh.addNode(8.125, 3.75, 2.0, 2187)
-    femmesh.addNode(9.375, 3.75, 2.0, 2188)
-    femmesh.addNode(10.625, 3.75, 2.0, 2189)
-    femmesh.addNode(11.875, 3.75, 2.0, 2190)
-    femmesh.addNode(13.125, 3.75, 2.0, 2191)
-    femmesh.addNode(14.375, 3.75, 2.0, 2192)
-    femmesh.addNode(15.625, 3.75, 2.0, 2193)
-    femmesh.addNode(16.875, 3.75, 2.0, 2194)
-    femmesh.addNode(18.125, 3.75, 2.0, 2195)
-    femmesh.addNode(19.375, 3.75, 2.0, 2196)
-    femmesh.addNode(20.625, 3.75, 2.0, 2197)
-    femmesh.addNode(21.875, 3.75, 2.0, 2198)
-    femmesh.addNode(23.125, 3.75, 2.0, 2199)
-    femmesh.addNode(24.375, 3.75, 2.0, 2200)
-    femmesh.addNode(25.625, 3.75, 2.0, 2201)
-    femmesh.addNode(26.875, 3.75, 2.0, 2202)
-    femmesh.addNode(28.125, 3.75, 2.0, 2203)
-    femmesh.addNode(29.375, 3.75, 2.0, 2204)
-    femmesh.addNode(30.625, 3.75, 2.0, 2205)
-    femmesh.addNode(31.875, 3.75, 2.0, 2206)
-    femmesh.addNode(33.125, 3.75, 2.0, 2207)
-    femmesh.addNode(34.375, 3.75, 2.0, 2208)
-    femmesh.addNode(35.625, 3.75, 2.0, 2209)
-    femmesh.addNode(36.875, 3.75, 2.0, 2210)
-    femmesh.addNode(38.125, 3.75, 2.0, 2211)
-    femmesh.addNode(39.375, 3.75, 2.0, 2212)
-    femmesh.addNode(40.625, 3.75, 2.0, 2213)
-    femmesh.addNode(41.875, 3.75, 2.0, 2214)
-    femmesh.addNode(43.125, 3.75, 2.0, 2215)
-    femmesh.addNode(44.375, 3.75, 2.0, 2216)
-    femmesh.addNode(45.625, 3.75, 2.0, 2217)
-    femmesh.addNode(46.875, 3.75, 2.0, 2218)
-    femmesh.addNode(48.125, 3.75, 2.0, 2219)
-    femmesh.addNode(49.375, 3.75, 2.0, 2220)
-    femmesh.addNode(50.625, 3.75, 2.0, 2221)
-    femmesh.addNode(51.875, 3.75, 2.0, 2222)
-    femmesh.addNode(53.125, 3.75, 2.0, 2223)
-    femmesh.addNode(54.375, 3.75, 2.0, 2224)
-    femmesh.addNode(55.625, 3.75, 2.0, 2225)
-    femmesh.addNode(56.875, 3.75, 2.0, 2226)
-    femmesh.addNode(58.125, 3.75, 2.0, 2227)
-    femmesh.addNode(59.375, 3.75, 2.0, 2228)
-    femmesh.addNode(60.625, 3.75, 2.0, 2229)
-    femmesh.addNode(61.875, 3.75, 2.0, 2230)
-    femmesh.addNode(63.125, 3.75, 2.0, 2231)
-    femmesh.addNode(64.375, 3.75, 2.0, 2232)
-    femmesh.addNode(65.625, 3.75, 2.0, 2233)
-    femmesh.addNode(66.875, 3.75, 2.0, 2234)
-    femmesh.addNode(68.125, 3.75, 2.0, 2235)
-    femmesh.addNode(69.375, 3.75, 2.0, 2236)
-    femmesh.addNode(70.625, 3.75, 2.0, 2237)
-    femmesh.addNode(71.875, 3.75, 2.0, 2238)
-    femmesh.addNode(73.125, 3.75, 2.0, 2239)
-    femmesh.addNode(74.375, 3.75, 2.0, 2240)
-    femmesh.addNode(75.625, 3.75, 2.0, 2241)
-    femmesh.addNode(76.875, 3.75, 2.0, 2242)
-    femmesh.addNode(78.125, 3.75, 2.0, 2243)
-    femmesh.addNode(79.375, 3.75, 2.0, 2244)
-    femmesh.addNode(80.625, 3.75, 2.0, 2245)
-    femmesh.addNode(81.875, 3.75, 2.0, 2246)
-    femmesh.addNode(83.125, 3.75, 2.0, 2247)
-    femmesh.addNode(84.375, 3.75, 2.0, 2248)
-    femmesh.addNode(85.625, 3.75, 2.0, 2249)
-    femmesh.addNode(86.875, 3.75, 2.0, 2250)
-    femmesh.addNode(88.125, 3.75, 2.0, 2251)
-    femmesh.addNode(89.375, 3.75, 2.0, 2252)
-    femmesh.addNode(90.6278935185185, 3.7543402777777777, 2.0, 2253)
-    femmesh.addNode(91.8778935185185, 3.7543402777777777, 2.0, 2254)
-    femmesh.addNode(93.1423611111111, 3.7760416666666665, 2.0, 2255)
-    femmesh.addNode(94.3923611111111, 3.7760416666666665, 2.0, 2256)
-    femmesh.addNode(95.75365823412699, 3.7757316468254203, 2.0, 2257)
-    femmesh.addNode(97.00365823412699, 3.7757316468254203, 2.0, 2258)
-    femmesh.addNode(97.50307017906681, 2.999591204599872, 2.0, 2259)
-    femmesh.addNode(99.24941194493982, 3.598859557774452, 0.75, 2260)
-    femmesh.addNode(99.24941194493982, 3.598859557774452, 0.25, 2261)
-    femmesh.addNode(0.7851005692781069, 3.566819655288188, 0.25, 2262)
-    femmesh.addNode(0.7851005692781069, 3.566819655288188, 0.75, 2263)
-    femmesh.addNode(99.15099549294933, 1.5035086860303362, 0.25, 2264)
-    femmesh.addNode(99.15099549294933, 1.5035086860303362, 0.75, 2265)
-    femmesh.addNode(98.62441194493982, 4.2238595577744515, 0.25, 2266)
-    femmesh.addNode(98.62441194493982, 4.2238595577744515, 0.75, 2267)
-    femmesh.addNode(0.8881941729211469, 1.5442385825633878, 0.75, 2268)
-    femmesh.addNode(0.8881941729211469, 1.5442385825633878, 0.25, 2269)
-    femmesh.addNode(1.4101005692781068, 4.191819655288188, 0.25, 2270)
-    femmesh.addNode(1.4101005692781068, 4.191819655288188, 0.75, 2271)
-    femmesh.addNode(11.25, 1.25, 0.25, 2272)
-    femmesh.addNode(13.75, 1.25, 0.25, 2273)
-    femmesh.addNode(38.75, 1.25, 0.25, 2274)
-    femmesh.addNode(18.75, 1.25, 0.25, 2275)
-    femmesh.addNode(33.75, 1.25, 0.25, 2276)
-    femmesh.addNode(16.25, 1.25, 0.25, 2277)
-    femmesh.addNode(16.25, 3.75, 0.75, 2278)
-    femmesh.addNode(18.75, 1.25, 0.75, 2279)
-    femmesh.addNode(26.25, 3.75, 0.75, 2280)
-    femmesh.addNode(21.25, 1.25, 0.25, 2281)
-    femmesh.addNode(43.75, 1.25, 0.25, 2282)
-    femmesh.addNode(46.25, 1.25, 0.25, 2283)
-    femmesh.addNode(26.25, 1.25, 0.25, 2284)
-    femmesh.addNode(23.75, 1.25, 0.25, 2285)
-    femmesh.addNode(31.25, 1.25, 0.25, 2286)
-    femmesh.addNode(18.75, 3.75, 0.75, 2287)
-    femmesh.addNode(21.25, 3.75, 0.75, 2288)
-    femmesh.addNode(36.25, 1.25, 0.25, 2289)
-    femmesh.addNode(48.75, 1.25, 0.25, 2290)
-    femmesh.addNode(41.25, 1.25, 0.25, 2291)
-    femmesh.addNode(43.75, 1.25, 0.75, 2292)
-    femmesh.addNode(28.75, 1.25, 0.25, 2293)
-    femmesh.addNode(38.75, 3.75, 0.25, 2294)
-    femmesh.addNode(18.75, 3.75, 0.25, 2295)
-    femmesh.addNode(33.75, 3.75, 0.75, 2296)
-    femmesh.addNode(31.25, 3.75, 0.25, 2297)
-    femmesh.addNode(31.25, 3.75, 0.75, 2298)
-    femmesh.addNode(33.75, 3.75, 0.25, 2299)
-    femmesh.addNode(28.75, 3.75, 0.75, 2300)
-    femmesh.addNode(23.75, 3.75, 0.25, 2301)
-    femmesh.addNode(16.25, 3.75, 0.25, 2302)
-    femmesh.addNode(28.75, 3.75, 0.25, 2303)
-    femmesh.addNode(26.25, 3.75, 0.25, 2304)
-    femmesh.addNode(21.25, 3.75, 0.25, 2305)
-    femmesh.addNode(11.25, 3.75, 0.25, 2306)
-    femmesh.addNode(13.75, 3.75, 0.25, 2307)
-    femmesh.addNode(46.25, 3.75, 0.25, 2308)
-    femmesh.addNode(43.75, 3.75, 0.25, 2309)
-    femmesh.addNode(58.75, 1.25, 0.25, 2310)
-    femmesh.addNode(36.25, 3.75, 0.25, 2311)
-    femmesh.addNode(41.25, 3.75, 0.25, 2312)
-    femmesh.addNode(61.25, 1.25, 0.25, 2313)
-    femmesh.addNode(43.75, 3.75, 0.75, 2314)
-    femmesh.addNode(48.75, 3.75, 0.75, 2315)
-    femmesh.addNode(13.75, 3.75, 0.75, 2316)
-    femmesh.addNode(33.75, 1.25, 0.75, 2317)
-    femmesh.addNode(41.25, 1.25, 0.75, 2318)
-    femmesh.addNode(16.25, 1.25, 0.75, 2319)
-    femmesh.addNode(13.75, 1.25, 0.75, 2320)
-    femmesh.addNode(11.25, 1.25, 0.75, 2321)
-    femmesh.addNode(21.25, 1.25, 0.75, 2322)
-    femmesh.addNode(46.25, 1.25, 0.75, 2323)
-    femmesh.addNode(68.75, 1.25, 0.75, 2324)
-    femmesh.addNode(73.75, 3.75, 0.75, 2325)
-    femmesh.addNode(61.25, 3.75, 0.25, 2326)
-    femmesh.addNode(58.75, 1.25, 0.75, 2327)
-    femmesh.addNode(53.75, 3.75, 0.25, 2328)
-    femmesh.addNode(83.75, 1.25, 0.75, 2329)
-    femmesh.addNode(76.25, 1.25, 0.25, 2330)
-    femmesh.addNode(78.75, 1.25, 0.75, 2331)
-    femmesh.addNode(81.25, 1.25, 0.75, 2332)
-    femmesh.addNode(76.25, 3.75, 0.75, 2333)
-    femmesh.addNode(88.75, 3.75, 0.75, 2334)
-    femmesh.addNode(58.75, 3.75, 0.25, 2335)
-    femmesh.addNode(68.75, 3.75, 0.25, 2336)
-    femmesh.addNode(81.25, 3.75, 0.25, 2337)
-    femmesh.addNode(68.75, 3.75, 0.75, 2338)
-    femmesh.addNode(71.25, 3.75, 0.25, 2339)
-    femmesh.addNode(51.25, 3.75, 0.25, 2340)
-    femmesh.addNode(48.75, 1.25, 0.75, 2341)
-    femmesh.addNode(53.75, 3.75, 0.75, 2342)
-    femmesh.addNode(83.75, 3.75, 0.75, 2343)
-    femmesh.addNode(51.25, 3.75, 0.75, 2344)
-    femmesh.addNode(48.75, 3.75, 0.25, 2345)
-    femmesh.addNode(61.25, 3.75, 0.75, 2346)
-    femmesh.addNode(66.25, 3.75, 0.75, 2347)
-    femmesh.addNode(86.25, 3.75, 0.75, 2348)
-    femmesh.addNode(78.75, 3.75, 0.75, 2349)
-    femmesh.addNode(73.75, 3.75, 0.25, 2350)
-    femmesh.addNode(56.25, 3.75, 0.25, 2351)
-    femmesh.addNode(68.75, 1.25, 0.25, 2352)
-    femmesh.addNode(63.75, 3.75, 0.25, 2353)
-    femmesh.addNode(76.25, 3.75, 0.25, 2354)
-    femmesh.addNode(73.75, 1.25, 0.75, 2355)
-    femmesh.addNode(78.75, 3.75, 0.25, 2356)
-    femmesh.addNode(83.75, 3.75, 0.25, 2357)
-    femmesh.addNode(86.25, 3.75, 0.25, 2358)
-    femmesh.addNode(88.75, 3.75, 0.25, 2359)
-    femmesh.addNode(66.25, 3.75, 0.25, 2360)
-    femmesh.addNode(51.25, 1.25, 0.25, 2361)
-    femmesh.addNode(56.25, 1.25, 0.25, 2362)
-    femmesh.addNode(53.75, 1.25, 0.25, 2363)
-    femmesh.addNode(61.25, 1.25, 0.75, 2364)
-    femmesh.addNode(56.25, 1.25, 0.75, 2365)
-    femmesh.addNode(51.25, 1.25, 0.75, 2366)
-    femmesh.addNode(66.25, 1.25, 0.25, 2367)
-    femmesh.addNode(63.75, 1.25, 0.75, 2368)
-    femmesh.addNode(63.75, 1.25, 0.25, 2369)
-    femmesh.addNode(73.75, 1.25, 0.25, 2370)
-    femmesh.addNode(71.25, 1.25, 0.25, 2371)
-    femmesh.addNode(81.25, 1.25, 0.25, 2372)
-    femmesh.addNode(78.75, 1.25, 0.25, 2373)
-    femmesh.addNode(86.25, 1.25, 0.25, 2374)
-    femmesh.addNode(83.75, 1.25, 0.25, 2375)
-    femmesh.addNode(76.25, 1.25, 0.75, 2376)
-    femmesh.addNode(41.25, 3.75, 0.75, 2377)
-    femmesh.addNode(23.75, 3.75, 0.75, 2378)
-    femmesh.addNode(56.25, 3.75, 0.75, 2379)
-    femmesh.addNode(63.75, 3.75, 0.75, 2380)
-    femmesh.addNode(26.25, 1.25, 0.75, 2381)
-    femmesh.addNode(66.25, 1.25, 0.75, 2382)
-    femmesh.addNode(11.25, 3.75, 0.75, 2383)
-    femmesh.addNode(36.25, 1.25, 0.75, 2384)
-    femmesh.addNode(38.75, 3.75, 0.75, 2385)
-    femmesh.addNode(81.25, 3.75, 0.75, 2386)
-    femmesh.addNode(28.75, 1.25, 0.75, 2387)
-    femmesh.addNode(31.25, 1.25, 0.75, 2388)
-    femmesh.addNode(38.75, 1.25, 0.75, 2389)
-    femmesh.addNode(86.25, 1.25, 0.75, 2390)
-    femmesh.addNode(71.25, 3.75, 0.75, 2391)
-    femmesh.addNode(23.75, 1.25, 0.75, 2392)
-    femmesh.addNode(58.75, 3.75, 0.75, 2393)
-    femmesh.addNode(71.25, 1.25, 0.75, 2394)
-    femmesh.addNode(53.75, 1.25, 0.75, 2395)
-    femmesh.addNode(46.25, 3.75, 0.75, 2396)
-    femmesh.addNode(36.25, 3.75, 0.75, 2397)
-    femmesh.addNode(8.75, 3.75, 0.25, 2398)
-    femmesh.addNode(8.75, 3.75, 0.75, 2399)
-    femmesh.addNode(88.75, 1.25, 0.75, 2400)
-    femmesh.addNode(88.75, 1.25, 0.25, 2401)
-    femmesh.addNode(91.2528935185185, 3.7543402777777777, 0.75, 2402)
-    femmesh.addNode(91.2528935185185, 3.7543402777777777, 0.25, 2403)
-    femmesh.addNode(8.75, 1.25, 0.75, 2404)
-    femmesh.addNode(8.75, 1.25, 0.25, 2405)
-    femmesh.addNode(6.235384778911564, 3.756643282312925, 0.25, 2406)
-    femmesh.addNode(6.235384778911564, 3.756643282312925, 0.75, 2407)
-    femmesh.addNode(91.2528935185185, 1.2543402777777777, 0.25, 2408)
-    femmesh.addNode(91.2528935185185, 1.2543402777777777, 0.75, 2409)
-    femmesh.addNode(98.52599549294933, 0.8785086860303363, 0.75, 2410)
-    femmesh.addNode(98.52599549294933, 0.8785086860303363, 0.25, 2411)
-    femmesh.addNode(3.6623086734693877, 3.789859693877551, 0.75, 2412)
-    femmesh.addNode(3.6623086734693877, 3.789859693877551, 0.25, 2413)
-    femmesh.addNode(96.37865823412699, 3.7757316468254203, 0.75, 2414)
-    femmesh.addNode(96.37865823412699, 3.7757316468254203, 0.25, 2415)
-    femmesh.addNode(96.37865823412699, 1.27573164682542, 0.25, 2416)
-    femmesh.addNode(96.37865823412699, 1.27573164682542, 0.75, 2417)
-    femmesh.addNode(3.6623086734693877, 1.2898596938775508, 0.25, 2418)
-    femmesh.addNode(3.6623086734693877, 1.2898596938775508, 0.75, 2419)
-    femmesh.addNode(6.235384778911564, 1.256643282312925, 0.25, 2420)
-    femmesh.addNode(6.235384778911564, 1.256643282312925, 0.75, 2421)
-    femmesh.addNode(93.7673611111111, 3.7760416666666665, 0.75, 2422)
-    femmesh.addNode(93.7673611111111, 3.7760416666666665, 0.25, 2423)
-    femmesh.addNode(1.5131941729211469, 0.9192385825633878, 0.25, 2424)
-    femmesh.addNode(1.5131941729211469, 0.9192385825633878, 0.75, 2425)
-    femmesh.addNode(93.7673611111111, 1.2760416666666665, 0.25, 2426)
-    femmesh.addNode(93.7673611111111, 1.2760416666666665, 0.75, 2427)
-    femmesh.addNode(0.625, 0.625, 0.5, 2428)
-    femmesh.addNode(99.375, 0.625, 0.5, 2429)
-    femmesh.addNode(95.75365823412699, 1.27573164682542, 0.5, 2430)
-    femmesh.addNode(96.50731646825398, 2.55146329365084, 0.5, 2431)
-    femmesh.addNode(4.287308673469388, 1.2898596938775508, 0.5, 2432)
-    femmesh.addNode(3.5746173469387754, 2.5797193877551017, 0.5, 2433)
-    femmesh.addNode(95.75365823412699, 3.7757316468254203, 0.5, 2434)
-    femmesh.addNode(0.625, 4.375, 0.5, 2435)
-    femmesh.addNode(93.1423611111111, 1.2760416666666665, 0.5, 2436)
-    femmesh.addNode(93.7847222222222, 2.552083333333333, 0.5, 2437)
-    femmesh.addNode(6.860384778911564, 1.256643282312925, 0.5, 2438)
-    femmesh.addNode(6.22076955782313, 2.51328656462585, 0.5, 2439)
-    femmesh.addNode(90.6278935185185, 1.2543402777777777, 0.5, 2440)
-    femmesh.addNode(91.25578703703702, 2.5086805555555554, 0.5, 2441)
-    femmesh.addNode(68.75, 2.5, 0.5, 2442)
-    femmesh.addNode(69.375, 1.25, 0.5, 2443)
-    femmesh.addNode(74.375, 1.25, 0.5, 2444)
-    femmesh.addNode(66.875, 1.25, 0.5, 2445)
-    femmesh.addNode(79.375, 1.25, 0.5, 2446)
-    femmesh.addNode(71.875, 1.25, 0.5, 2447)
-    femmesh.addNode(64.375, 1.25, 0.5, 2448)
-    femmesh.addNode(65.625, 1.25, 0.5, 2449)
-    femmesh.addNode(75.625, 1.25, 0.5, 2450)
-    femmesh.addNode(80.625, 1.25, 0.5, 2451)
-    femmesh.addNode(85.625, 1.25, 0.5, 2452)
-    femmesh.addNode(84.375, 1.25, 0.5, 2453)
-    femmesh.addNode(83.75, 2.5, 0.5, 2454)
-    femmesh.addNode(88.125, 1.25, 0.5, 2455)
-    femmesh.addNode(88.75, 2.5, 0.5, 2456)
-    femmesh.addNode(69.375, 3.75, 0.5, 2457)
-    femmesh.addNode(89.375, 3.75, 0.5, 2458)
-    femmesh.addNode(70.625, 3.75, 0.5, 2459)
-    femmesh.addNode(64.375, 3.75, 0.5, 2460)
-    femmesh.addNode(73.125, 3.75, 0.5, 2461)
-    femmesh.addNode(71.875, 3.75, 0.5, 2462)
-    femmesh.addNode(76.875, 3.75, 0.5, 2463)
-    femmesh.addNode(74.375, 3.75, 0.5, 2464)
-    femmesh.addNode(86.875, 3.75, 0.5, 2465)
-    femmesh.addNode(86.25, 2.5, 0.5, 2466)
-    femmesh.addNode(65.625, 3.75, 0.5, 2467)
-    femmesh.addNode(66.25, 2.5, 0.5, 2468)
-    femmesh.addNode(81.875, 3.75, 0.5, 2469)
-    femmesh.addNode(66.875, 3.75, 0.5, 2470)
-    femmesh.addNode(75.625, 3.75, 0.5, 2471)
-    femmesh.addNode(78.125, 3.75, 0.5, 2472)
-    femmesh.addNode(79.375, 3.75, 0.5, 2473)
-    femmesh.addNode(84.375, 3.75, 0.5, 2474)
-    femmesh.addNode(85.625, 3.75, 0.5, 2475)
-    femmesh.addNode(46.875, 3.75, 0.5, 2476)
-    femmesh.addNode(19.375, 3.75, 0.5, 2477)
-    femmesh.addNode(43.75, 2.5, 0.5, 2478)
-    femmesh.addNode(43.125, 3.75, 0.5, 2479)
-    femmesh.addNode(40.625, 3.75, 0.5, 2480)
-    femmesh.addNode(41.25, 2.5, 0.5, 2481)
-    femmesh.addNode(41.875, 3.75, 0.5, 2482)
-    femmesh.addNode(26.875, 3.75, 0.5, 2483)
-    femmesh.addNode(26.25, 2.5, 0.5, 2484)
-    femmesh.addNode(33.125, 3.75, 0.5, 2485)
-    femmesh.addNode(36.875, 3.75, 0.5, 2486)
-    femmesh.addNode(49.375, 3.75, 0.5, 2487)
-    femmesh.addNode(44.375, 3.75, 0.5, 2488)
-    femmesh.addNode(38.125, 3.75, 0.5, 2489)
-    femmesh.addNode(38.75, 2.5, 0.5, 2490)
-    femmesh.addNode(31.25, 2.5, 0.5, 2491)
-    femmesh.addNode(31.875, 3.75, 0.5, 2492)
-    femmesh.addNode(33.75, 2.5, 0.5, 2493)
-    femmesh.addNode(34.375, 3.75, 0.5, 2494)
-    femmesh.addNode(16.875, 3.75, 0.5, 2495)
-    femmesh.addNode(20.625, 3.75, 0.5, 2496)
-    femmesh.addNode(21.25, 2.5, 0.5, 2497)
-    femmesh.addNode(58.125, 3.75, 0.5, 2498)
-    femmesh.addNode(51.875, 3.75, 0.5, 2499)
-    femmesh.addNode(51.25, 2.5, 0.5, 2500)
-    femmesh.addNode(56.25, 2.5, 0.5, 2501)
-    femmesh.addNode(55.625, 3.75, 0.5, 2502)
-    femmesh.addNode(63.125, 3.75, 0.5, 2503)
-    femmesh.addNode(63.75, 2.5, 0.5, 2504)
-    femmesh.addNode(38.125, 1.25, 0.5, 2505)
-    femmesh.addNode(19.375, 1.25, 0.5, 2506)
-    femmesh.addNode(18.125, 1.25, 0.5, 2507)
-    femmesh.addNode(18.75, 2.5, 0.5, 2508)
-    femmesh.addNode(25.625, 1.25, 0.5, 2509)
-    femmesh.addNode(30.625, 3.75, 0.5, 2510)
-    femmesh.addNode(44.375, 1.25, 0.5, 2511)
-    femmesh.addNode(48.75, 2.5, 0.5, 2512)
-    femmesh.addNode(49.375, 1.25, 0.5, 2513)
-    femmesh.addNode(33.125, 1.25, 0.5, 2514)
-    femmesh.addNode(29.375, 1.25, 0.5, 2515)
-    femmesh.addNode(16.875, 1.25, 0.5, 2516)
-    femmesh.addNode(36.875, 1.25, 0.5, 2517)
-    femmesh.addNode(36.25, 2.5, 0.5, 2518)
-    femmesh.addNode(28.125, 1.25, 0.5, 2519)
-    femmesh.addNode(23.125, 1.25, 0.5, 2520)
-    femmesh.addNode(55.625, 1.25, 0.5, 2521)
-    femmesh.addNode(21.875, 1.25, 0.5, 2522)
-    femmesh.addNode(34.375, 1.25, 0.5, 2523)
-    femmesh.addNode(50.625, 3.75, 0.5, 2524)
-    femmesh.addNode(53.125, 3.75, 0.5, 2525)
-    femmesh.addNode(53.75, 2.5, 0.5, 2526)
-    femmesh.addNode(45.625, 1.25, 0.5, 2527)
-    femmesh.addNode(39.375, 1.25, 0.5, 2528)
-    femmesh.addNode(28.75, 2.5, 0.5, 2529)
-    femmesh.addNode(35.625, 1.25, 0.5, 2530)
-    femmesh.addNode(45.625, 3.75, 0.5, 2531)
-    femmesh.addNode(46.875, 1.25, 0.5, 2532)
-    femmesh.addNode(46.25, 2.5, 0.5, 2533)
-    femmesh.addNode(43.125, 1.25, 0.5, 2534)
-    femmesh.addNode(24.375, 1.25, 0.5, 2535)
-    femmesh.addNode(23.75, 2.5, 0.5, 2536)
-    femmesh.addNode(20.625, 1.25, 0.5, 2537)
-    femmesh.addNode(24.375, 3.75, 0.5, 2538)
-    femmesh.addNode(21.875, 3.75, 0.5, 2539)
-    femmesh.addNode(16.25, 2.5, 0.5, 2540)
-    femmesh.addNode(23.125, 3.75, 0.5, 2541)
-    femmesh.addNode(25.625, 3.75, 0.5, 2542)
-    femmesh.addNode(54.375, 3.75, 0.5, 2543)
-    femmesh.addNode(39.375, 3.75, 0.5, 2544)
-    femmesh.addNode(26.875, 1.25, 0.5, 2545)
-    femmesh.addNode(41.875, 1.25, 0.5, 2546)
-    femmesh.addNode(40.625, 1.25, 0.5, 2547)
-    femmesh.addNode(18.125, 3.75, 0.5, 2548)
-    femmesh.addNode(31.875, 1.25, 0.5, 2549)
-    femmesh.addNode(58.75, 2.5, 0.5, 2550)
-    femmesh.addNode(58.125, 1.25, 0.5, 2551)
-    femmesh.addNode(56.875, 1.25, 0.5, 2552)
-    femmesh.addNode(61.875, 1.25, 0.5, 2553)
-    femmesh.addNode(59.375, 1.25, 0.5, 2554)
-    femmesh.addNode(60.625, 3.75, 0.5, 2555)
-    femmesh.addNode(59.375, 3.75, 0.5, 2556)
-    femmesh.addNode(53.125, 1.25, 0.5, 2557)
-    femmesh.addNode(51.875, 1.25, 0.5, 2558)
-    femmesh.addNode(50.625, 1.25, 0.5, 2559)
-    femmesh.addNode(63.125, 1.25, 0.5, 2560)
-    femmesh.addNode(14.375, 1.25, 0.5, 2561)
-    femmesh.addNode(13.75, 2.5, 0.5, 2562)
-    femmesh.addNode(10.625, 1.25, 0.5, 2563)
-    femmesh.addNode(11.25, 2.5, 0.5, 2564)
-    femmesh.addNode(13.125, 3.75, 0.5, 2565)
-    femmesh.addNode(13.125, 1.25, 0.5, 2566)
-    femmesh.addNode(11.875, 3.75, 0.5, 2567)
-    femmesh.addNode(11.875, 1.25, 0.5, 2568)
-    femmesh.addNode(15.625, 1.25, 0.5, 2569)
-    femmesh.addNode(8.75, 2.5, 0.5, 2570)
-    femmesh.addNode(9.375, 1.25, 0.5, 2571)
-    femmesh.addNode(9.375, 3.75, 0.5, 2572)
-    femmesh.addNode(15.625, 3.75, 0.5, 2573)
-    femmesh.addNode(10.625, 3.75, 0.5, 2574)
-    femmesh.addNode(14.375, 3.75, 0.5, 2575)
-    femmesh.addNode(48.125, 1.25, 0.5, 2576)
-    femmesh.addNode(30.625, 1.25, 0.5, 2577)
-    femmesh.addNode(60.625, 1.25, 0.5, 2578)
-    femmesh.addNode(61.25, 2.5, 0.5, 2579)
-    femmesh.addNode(54.375, 1.25, 0.5, 2580)
-    femmesh.addNode(48.125, 3.75, 0.5, 2581)
-    femmesh.addNode(28.125, 3.75, 0.5, 2582)
-    femmesh.addNode(29.375, 3.75, 0.5, 2583)
-    femmesh.addNode(35.625, 3.75, 0.5, 2584)
-    femmesh.addNode(56.875, 3.75, 0.5, 2585)
-    femmesh.addNode(61.875, 3.75, 0.5, 2586)
-    femmesh.addNode(71.25, 2.5, 0.5, 2587)
-    femmesh.addNode(68.125, 1.25, 0.5, 2588)
-    femmesh.addNode(70.625, 1.25, 0.5, 2589)
-    femmesh.addNode(81.25, 2.5, 0.5, 2590)
-    femmesh.addNode(83.125, 1.25, 0.5, 2591)
-    femmesh.addNode(73.75, 2.5, 0.5, 2592)
-    femmesh.addNode(88.125, 3.75, 0.5, 2593)
-    femmesh.addNode(83.125, 3.75, 0.5, 2594)
-    femmesh.addNode(86.875, 1.25, 0.5, 2595)
-    femmesh.addNode(81.875, 1.25, 0.5, 2596)
-    femmesh.addNode(80.625, 3.75, 0.5, 2597)
-    femmesh.addNode(78.75, 2.5, 0.5, 2598)
-    femmesh.addNode(73.125, 1.25, 0.5, 2599)
-    femmesh.addNode(76.875, 1.25, 0.5, 2600)
-    femmesh.addNode(76.25, 2.5, 0.5, 2601)
-    femmesh.addNode(78.125, 1.25, 0.5, 2602)
-    femmesh.addNode(68.125, 3.75, 0.5, 2603)
-    femmesh.addNode(8.125, 3.75, 0.5, 2604)
-    femmesh.addNode(89.375, 1.25, 0.5, 2605)
-    femmesh.addNode(6.860384778911564, 3.756643282312925, 0.5, 2606)
-    femmesh.addNode(91.8778935185185, 3.7543402777777777, 0.5, 2607)
-    femmesh.addNode(90.6278935185185, 3.7543402777777777, 0.5, 2608)
-    femmesh.addNode(8.125, 1.25, 0.5, 2609)
-    femmesh.addNode(4.287308673469388, 3.789859693877551, 0.5, 2610)
-    femmesh.addNode(91.8778935185185, 1.2543402777777777, 0.5, 2611)
-    femmesh.addNode(93.1423611111111, 3.7760416666666665, 0.5, 2612)
-    femmesh.addNode(5.610384778911564, 3.756643282312925, 0.5, 2613)
-    femmesh.addNode(94.3923611111111, 1.2760416666666665, 0.5, 2614)
-    femmesh.addNode(5.610384778911564, 1.256643282312925, 0.5, 2615)
-    femmesh.addNode(97.00365823412699, 1.27573164682542, 0.5, 2616)
-    femmesh.addNode(3.0373086734693877, 3.789859693877551, 0.5, 2617)
-    femmesh.addNode(95.14601934523809, 2.5517733134920864, 0.5, 2618)
-    femmesh.addNode(97.00365823412699, 3.7757316468254203, 0.5, 2619)
-    femmesh.addNode(99.375, 4.375, 0.5, 2620)
-    femmesh.addNode(7.485384778911564, 2.506643282312925, 0.5, 2621)
-    femmesh.addNode(4.8976934523809526, 2.546502976190476, 0.5, 2622)
-    femmesh.addNode(94.3923611111111, 3.7760416666666665, 0.5, 2623)
-    femmesh.addNode(15.0, 2.5, 0.5, 2624)
-    femmesh.addNode(12.5, 2.5, 0.5, 2625)
-    femmesh.addNode(35.0, 2.5, 0.5, 2626)
-    femmesh.addNode(27.5, 2.5, 0.5, 2627)
-    femmesh.addNode(25.0, 2.5, 0.5, 2628)
-    femmesh.addNode(45.0, 2.5, 0.5, 2629)
-    femmesh.addNode(22.5, 2.5, 0.5, 2630)
-    femmesh.addNode(30.0, 2.5, 0.5, 2631)
-    femmesh.addNode(52.5, 2.5, 0.5, 2632)
-    femmesh.addNode(62.5, 2.5, 0.5, 2633)
-    femmesh.addNode(55.0, 2.5, 0.5, 2634)
-    femmesh.addNode(82.5, 2.5, 0.5, 2635)
-    femmesh.addNode(17.5, 2.5, 0.5, 2636)
-    femmesh.addNode(37.5, 2.5, 0.5, 2637)
-    femmesh.addNode(47.5, 2.5, 0.5, 2638)
-    femmesh.addNode(40.0, 2.5, 0.5, 2639)
-    femmesh.addNode(20.0, 2.5, 0.5, 2640)
-    femmesh.addNode(42.5, 2.5, 0.5, 2641)
-    femmesh.addNode(32.5, 2.5, 0.5, 2642)
-    femmesh.addNode(10.0, 2.5, 0.5, 2643)
-    femmesh.addNode(50.0, 2.5, 0.5, 2644)
-    femmesh.addNode(60.0, 2.5, 0.5, 2645)
-    femmesh.addNode(70.0, 2.5, 0.5, 2646)
-    femmesh.addNode(65.0, 2.5, 0.5, 2647)
-    femmesh.addNode(85.0, 2.5, 0.5, 2648)
-    femmesh.addNode(72.5, 2.5, 0.5, 2649)
-    femmesh.addNode(77.5, 2.5, 0.5, 2650)
-    femmesh.addNode(75.0, 2.5, 0.5, 2651)
-    femmesh.addNode(57.5, 2.5, 0.5, 2652)
-    femmesh.addNode(87.5, 2.5, 0.5, 2653)
-    femmesh.addNode(80.0, 2.5, 0.5, 2654)
-    femmesh.addNode(67.5, 2.5, 0.5, 2655)
-    femmesh.addNode(90.0028935185185, 2.5043402777777777, 0.5, 2656)
-    femmesh.addNode(92.52025462962962, 2.530381944444444, 0.5, 2657)
-    femmesh.addNode(97.99941194493982, 4.2238595577744515, 0.5, 2658)
-    femmesh.addNode(98.49882388987963, 3.447719115548904, 0.5, 2659)
-    femmesh.addNode(97.50307017906681, 2.999591204599872, 0.5, 2660)
-    femmesh.addNode(1.7763883458422938, 1.8384771651267755, 0.5, 2661)
-    femmesh.addNode(98.30199098589867, 1.7570173720606725, 0.5, 2662)
-    femmesh.addNode(2.5724092427474945, 2.9816793491657387, 0.5, 2663)
-    femmesh.addNode(1.5702011385562138, 3.383639310576376, 0.5, 2664)
-    femmesh.addNode(2.035100569278107, 4.191819655288188, 0.5, 2665)
-    femmesh.addNode(97.90099549294933, 0.8785086860303363, 0.5, 2666)
-    femmesh.addNode(97.40465372707632, 2.1542403328557564, 0.5, 2667)
-    femmesh.addNode(98.40040743788916, 2.602368243804788, 0.5, 2668)
-    femmesh.addNode(99.24941194493982, 2.973859557774452, 0.5, 2669)
-    femmesh.addNode(0.7851005692781069, 2.941819655288188, 0.5, 2670)
-    femmesh.addNode(99.15099549294933, 2.128508686030336, 0.5, 2671)
-    femmesh.addNode(0.8881941729211469, 2.1692385825633878, 0.5, 2672)
-    femmesh.addNode(1.673294742199254, 2.6110582378515756, 0.5, 2673)
-    femmesh.addNode(2.138194172921147, 0.9192385825633878, 0.5, 2674)
-    femmesh.addNode(2.6755028463905344, 2.2090982764409386, 0.5, 2675)
-    femmesh.addNode(3.0373086734693877, 1.2898596938775508, 0.5, 2676)
-    femmesh.addNode(99.24941194493982, 3.598859557774452, 1.75, 2677)
-    femmesh.addNode(99.24941194493982, 3.598859557774452, 1.25, 2678)
-    femmesh.addNode(0.7851005692781069, 3.566819655288188, 1.25, 2679)
-    femmesh.addNode(0.7851005692781069, 3.566819655288188, 1.75, 2680)
-    femmesh.addNode(99.15099549294933, 1.5035086860303362, 1.75, 2681)
-    femmesh.addNode(99.15099549294933, 1.5035086860303362, 1.25, 2682)
-    femmesh.addNode(98.62441194493982, 4.2238595577744515, 1.75, 2683)
-    femmesh.addNode(98.62441194493982, 4.2238595577744515, 1.25, 2684)
-    femmesh.addNode(0.8881941729211469, 1.5442385825633878, 1.75, 2685)
-    femmesh.addNode(0.8881941729211469, 1.5442385825633878, 1.25, 2686)
-    femmesh.addNode(1.4101005692781068, 4.191819655288188, 1.25, 2687)
-    femmesh.addNode(1.4101005692781068, 4.191819655288188, 1.75, 2688)
-    femmesh.addNode(41.25, 1.25, 1.25, 2689)
-    femmesh.addNode(46.25, 1.25, 1.25, 2690)
-    femmesh.addNode(38.75, 1.25, 1.25, 2691)
-    femmesh.addNode(28.75, 1.25, 1.25, 2692)
-    femmesh.addNode(16.25, 3.75, 1.75, 2693)
-    femmesh.addNode(33.75, 3.75, 1.25, 2694)
-    femmesh.addNode(18.75, 1.25, 1.25, 2695)
-    femmesh.addNode(26.25, 3.75, 1.25, 2696)
-    femmesh.addNode(53.75, 1.25, 1.25, 2697)
-    femmesh.addNode(78.75, 1.25, 1.75, 2698)
-    femmesh.addNode(66.25, 3.75, 1.75, 2699)
-    femmesh.addNode(58.75, 1.25, 1.75, 2700)
-    femmesh.addNode(33.75, 3.75, 1.75, 2701)
-    femmesh.addNode(16.25, 1.25, 1.25, 2702)
-    femmesh.addNode(43.75, 1.25, 1.25, 2703)
-    femmesh.addNode(23.75, 1.25, 1.25, 2704)
-    femmesh.addNode(66.25, 1.25, 1.75, 2705)
-    femmesh.addNode(23.75, 3.75, 1.25, 2706)
-    femmesh.addNode(18.75, 3.75, 1.25, 2707)
-    femmesh.addNode(46.25, 3.75, 1.25, 2708)
-    femmesh.addNode(28.75, 3.75, 1.25, 2709)
-    femmesh.addNode(36.25, 1.25, 1.25, 2710)
-    femmesh.addNode(43.75, 3.75, 1.25, 2711)
-    femmesh.addNode(11.25, 3.75, 1.25, 2712)
-    femmesh.addNode(38.75, 3.75, 1.75, 2713)
-    femmesh.addNode(38.75, 3.75, 1.25, 2714)
-    femmesh.addNode(48.75, 3.75, 1.25, 2715)
-    femmesh.addNode(23.75, 3.75, 1.75, 2716)
-    femmesh.addNode(41.25, 3.75, 1.25, 2717)
-    femmesh.addNode(36.25, 1.25, 1.75, 2718)
-    femmesh.addNode(36.25, 3.75, 1.25, 2719)
-    femmesh.addNode(21.25, 3.75, 1.25, 2720)
-    femmesh.addNode(16.25, 3.75, 1.25, 2721)
-    femmesh.addNode(26.25, 3.75, 1.75, 2722)
-    femmesh.addNode(33.75, 1.25, 1.75, 2723)
-    femmesh.addNode(13.75, 3.75, 1.75, 2724)
-    femmesh.addNode(18.75, 1.25, 1.75, 2725)
-    femmesh.addNode(31.25, 1.25, 1.25, 2726)
-    femmesh.addNode(48.75, 1.25, 1.75, 2727)
-    femmesh.addNode(48.75, 3.75, 1.75, 2728)
-    femmesh.addNode(41.25, 3.75, 1.75, 2729)
-    femmesh.addNode(43.75, 3.75, 1.75, 2730)
-    femmesh.addNode(11.25, 3.75, 1.75, 2731)
-    femmesh.addNode(21.25, 3.75, 1.75, 2732)
-    femmesh.addNode(18.75, 3.75, 1.75, 2733)
-    femmesh.addNode(33.75, 1.25, 1.25, 2734)
-    femmesh.addNode(21.25, 1.25, 1.75, 2735)
-    femmesh.addNode(16.25, 1.25, 1.75, 2736)
-    femmesh.addNode(13.75, 1.25, 1.75, 2737)
-    femmesh.addNode(11.25, 1.25, 1.75, 2738)
-    femmesh.addNode(21.25, 1.25, 1.25, 2739)
-    femmesh.addNode(31.25, 3.75, 1.25, 2740)
-    femmesh.addNode(48.75, 1.25, 1.25, 2741)
-    femmesh.addNode(56.25, 1.25, 1.75, 2742)
-    femmesh.addNode(41.25, 1.25, 1.75, 2743)
-    femmesh.addNode(46.25, 1.25, 1.75, 2744)
-    femmesh.addNode(38.75, 1.25, 1.75, 2745)
-    femmesh.addNode(31.25, 1.25, 1.75, 2746)
-    femmesh.addNode(26.25, 1.25, 1.25, 2747)
-    femmesh.addNode(23.75, 1.25, 1.75, 2748)
-    femmesh.addNode(36.25, 3.75, 1.75, 2749)
-    femmesh.addNode(31.25, 3.75, 1.75, 2750)
-    femmesh.addNode(26.25, 1.25, 1.75, 2751)
-    femmesh.addNode(28.75, 3.75, 1.75, 2752)
-    femmesh.addNode(28.75, 1.25, 1.75, 2753)
-    femmesh.addNode(46.25, 3.75, 1.75, 2754)
-    femmesh.addNode(43.75, 1.25, 1.75, 2755)
-    femmesh.addNode(73.75, 3.75, 1.75, 2756)
-    femmesh.addNode(58.75, 3.75, 1.75, 2757)
-    femmesh.addNode(76.25, 1.25, 1.75, 2758)
-    femmesh.addNode(71.25, 1.25, 1.25, 2759)
-    femmesh.addNode(61.25, 1.25, 1.75, 2760)
-    femmesh.addNode(73.75, 1.25, 1.75, 2761)
-    femmesh.addNode(68.75, 1.25, 1.75, 2762)
-    femmesh.addNode(63.75, 1.25, 1.75, 2763)
-    femmesh.addNode(61.25, 1.25, 1.25, 2764)
-    femmesh.addNode(51.25, 1.25, 1.75, 2765)
-    femmesh.addNode(58.75, 1.25, 1.25, 2766)
-    femmesh.addNode(63.75, 1.25, 1.25, 2767)
-    femmesh.addNode(68.75, 3.75, 1.75, 2768)
-    femmesh.addNode(86.25, 1.25, 1.75, 2769)
-    femmesh.addNode(83.75, 1.25, 1.75, 2770)
-    femmesh.addNode(81.25, 1.25, 1.75, 2771)
-    femmesh.addNode(83.75, 3.75, 1.75, 2772)
-    femmesh.addNode(53.75, 3.75, 1.75, 2773)
-    femmesh.addNode(71.25, 1.25, 1.75, 2774)
-    femmesh.addNode(53.75, 1.25, 1.75, 2775)
-    femmesh.addNode(63.75, 3.75, 1.75, 2776)
-    femmesh.addNode(78.75, 3.75, 1.75, 2777)
-    femmesh.addNode(76.25, 3.75, 1.75, 2778)
-    femmesh.addNode(81.25, 3.75, 1.75, 2779)
-    femmesh.addNode(81.25, 3.75, 1.25, 2780)
-    femmesh.addNode(86.25, 3.75, 1.75, 2781)
-    femmesh.addNode(88.75, 3.75, 1.75, 2782)
-    femmesh.addNode(71.25, 3.75, 1.75, 2783)
-    femmesh.addNode(66.25, 3.75, 1.25, 2784)
-    femmesh.addNode(61.25, 3.75, 1.75, 2785)
-    femmesh.addNode(56.25, 3.75, 1.75, 2786)
-    femmesh.addNode(56.25, 3.75, 1.25, 2787)
-    femmesh.addNode(51.25, 3.75, 1.75, 2788)
-    femmesh.addNode(61.25, 3.75, 1.25, 2789)
-    femmesh.addNode(68.75, 3.75, 1.25, 2790)
-    femmesh.addNode(83.75, 3.75, 1.25, 2791)
-    femmesh.addNode(53.75, 3.75, 1.25, 2792)
-    femmesh.addNode(58.75, 3.75, 1.25, 2793)
-    femmesh.addNode(71.25, 3.75, 1.25, 2794)
-    femmesh.addNode(73.75, 3.75, 1.25, 2795)
-    femmesh.addNode(88.75, 3.75, 1.25, 2796)
-    femmesh.addNode(76.25, 3.75, 1.25, 2797)
-    femmesh.addNode(63.75, 3.75, 1.25, 2798)
-    femmesh.addNode(73.75, 1.25, 1.25, 2799)
-    femmesh.addNode(66.25, 1.25, 1.25, 2800)
-    femmesh.addNode(76.25, 1.25, 1.25, 2801)
-    femmesh.addNode(83.75, 1.25, 1.25, 2802)
-    femmesh.addNode(81.25, 1.25, 1.25, 2803)
-    femmesh.addNode(86.25, 1.25, 1.25, 2804)
-    femmesh.addNode(78.75, 1.25, 1.25, 2805)
-    femmesh.addNode(13.75, 3.75, 1.25, 2806)
-    femmesh.addNode(86.25, 3.75, 1.25, 2807)
-    femmesh.addNode(78.75, 3.75, 1.25, 2808)
-    femmesh.addNode(68.75, 1.25, 1.25, 2809)
-    femmesh.addNode(51.25, 3.75, 1.25, 2810)
-    femmesh.addNode(11.25, 1.25, 1.25, 2811)
-    femmesh.addNode(56.25, 1.25, 1.25, 2812)
-    femmesh.addNode(13.75, 1.25, 1.25, 2813)
-    femmesh.addNode(51.25, 1.25, 1.25, 2814)
-    femmesh.addNode(8.75, 3.75, 1.25, 2815)
-    femmesh.addNode(8.75, 3.75, 1.75, 2816)
-    femmesh.addNode(88.75, 1.25, 1.75, 2817)
-    femmesh.addNode(88.75, 1.25, 1.25, 2818)
-    femmesh.addNode(91.2528935185185, 3.7543402777777777, 1.75, 2819)
-    femmesh.addNode(91.2528935185185, 3.7543402777777777, 1.25, 2820)
-    femmesh.addNode(8.75, 1.25, 1.25, 2821)
-    femmesh.addNode(8.75, 1.25, 1.75, 2822)
-    femmesh.addNode(6.235384778911564, 3.756643282312925, 1.75, 2823)
-    femmesh.addNode(6.235384778911564, 3.756643282312925, 1.25, 2824)
-    femmesh.addNode(91.2528935185185, 1.2543402777777777, 1.75, 2825)
-    femmesh.addNode(91.2528935185185, 1.2543402777777777, 1.25, 2826)
-    femmesh.addNode(98.52599549294933, 0.8785086860303363, 1.25, 2827)
-    femmesh.addNode(98.52599549294933, 0.8785086860303363, 1.75, 2828)
-    femmesh.addNode(3.6623086734693877, 3.789859693877551, 1.25, 2829)
-    femmesh.addNode(3.6623086734693877, 3.789859693877551, 1.75, 2830)
-    femmesh.addNode(96.37865823412699, 3.7757316468254203, 1.25, 2831)
-    femmesh.addNode(96.37865823412699, 3.7757316468254203, 1.75, 2832)
-    femmesh.addNode(96.37865823412699, 1.27573164682542, 1.75, 2833)
-    femmesh.addNode(96.37865823412699, 1.27573164682542, 1.25, 2834)
-    femmesh.addNode(3.6623086734693877, 1.2898596938775508, 1.75, 2835)
-    femmesh.addNode(3.6623086734693877, 1.2898596938775508, 1.25, 2836)
-    femmesh.addNode(6.235384778911564, 1.256643282312925, 1.25, 2837)
-    femmesh.addNode(6.235384778911564, 1.256643282312925, 1.75, 2838)
-    femmesh.addNode(93.7673611111111, 3.7760416666666665, 1.75, 2839)
-    femmesh.addNode(93.7673611111111, 3.7760416666666665, 1.25, 2840)
-    femmesh.addNode(1.5131941729211469, 0.9192385825633878, 1.75, 2841)
-    femmesh.addNode(1.5131941729211469, 0.9192385825633878, 1.25, 2842)
-    femmesh.addNode(93.7673611111111, 1.2760416666666665, 1.25, 2843)
-    femmesh.addNode(93.7673611111111, 1.2760416666666665, 1.75, 2844)
-    femmesh.addNode(0.625, 0.625, 1.5, 2845)
-    femmesh.addNode(99.375, 0.625, 1.5, 2846)
-    femmesh.addNode(95.75365823412699, 1.27573164682542, 1.5, 2847)
-    femmesh.addNode(96.50731646825398, 2.55146329365084, 1.5, 2848)
-    femmesh.addNode(4.287308673469388, 1.2898596938775508, 1.5, 2849)
-    femmesh.addNode(3.5746173469387754, 2.5797193877551017, 1.5, 2850)
-    femmesh.addNode(95.75365823412699, 3.7757316468254203, 1.5, 2851)
-    femmesh.addNode(0.625, 4.375, 1.5, 2852)
-    femmesh.addNode(93.7847222222222, 2.552083333333333, 1.5, 2853)
-    femmesh.addNode(93.1423611111111, 1.2760416666666665, 1.5, 2854)
-    femmesh.addNode(6.860384778911564, 1.256643282312925, 1.5, 2855)
-    femmesh.addNode(6.22076955782313, 2.51328656462585, 1.5, 2856)
-    femmesh.addNode(90.6278935185185, 1.2543402777777777, 1.5, 2857)
-    femmesh.addNode(91.25578703703702, 2.5086805555555554, 1.5, 2858)
-    femmesh.addNode(66.875, 1.25, 1.5, 2859)
-    femmesh.addNode(85.625, 1.25, 1.5, 2860)
-    femmesh.addNode(79.375, 1.25, 1.5, 2861)
-    femmesh.addNode(64.375, 1.25, 1.5, 2862)
-    femmesh.addNode(71.875, 1.25, 1.5, 2863)
-    femmesh.addNode(75.625, 1.25, 1.5, 2864)
-    femmesh.addNode(69.375, 1.25, 1.5, 2865)
-    femmesh.addNode(68.75, 2.5, 1.5, 2866)
-    femmesh.addNode(70.625, 1.25, 1.5, 2867)
-    femmesh.addNode(76.875, 1.25, 1.5, 2868)
-    femmesh.addNode(80.625, 1.25, 1.5, 2869)
-    femmesh.addNode(76.25, 2.5, 1.5, 2870)
-    femmesh.addNode(84.375, 1.25, 1.5, 2871)
-    femmesh.addNode(68.125, 1.25, 1.5, 2872)
-    femmesh.addNode(74.375, 1.25, 1.5, 2873)
-    femmesh.addNode(86.875, 1.25, 1.5, 2874)
-    femmesh.addNode(86.25, 2.5, 1.5, 2875)
-    femmesh.addNode(66.875, 3.75, 1.5, 2876)
-    femmesh.addNode(66.25, 2.5, 1.5, 2877)
-    femmesh.addNode(71.875, 3.75, 1.5, 2878)
-    femmesh.addNode(65.625, 3.75, 1.5, 2879)
-    femmesh.addNode(73.125, 3.75, 1.5, 2880)
-    femmesh.addNode(74.375, 3.75, 1.5, 2881)
-    femmesh.addNode(84.375, 3.75, 1.5, 2882)
-    femmesh.addNode(80.625, 3.75, 1.5, 2883)
-    femmesh.addNode(76.875, 3.75, 1.5, 2884)
-    femmesh.addNode(70.625, 3.75, 1.5, 2885)
-    femmesh.addNode(71.25, 2.5, 1.5, 2886)
-    femmesh.addNode(89.375, 3.75, 1.5, 2887)
-    femmesh.addNode(83.125, 3.75, 1.5, 2888)
-    femmesh.addNode(83.75, 2.5, 1.5, 2889)
-    femmesh.addNode(25.625, 3.75, 1.5, 2890)
-    femmesh.addNode(26.25, 2.5, 1.5, 2891)
-    femmesh.addNode(43.125, 3.75, 1.5, 2892)
-    femmesh.addNode(51.25, 2.5, 1.5, 2893)
-    femmesh.addNode(50.625, 3.75, 1.5, 2894)
-    femmesh.addNode(16.875, 3.75, 1.5, 2895)
-    femmesh.addNode(44.375, 3.75, 1.5, 2896)
-    femmesh.addNode(38.75, 2.5, 1.5, 2897)
-    femmesh.addNode(39.375, 3.75, 1.5, 2898)
-    femmesh.addNode(24.375, 3.75, 1.5, 2899)
-    femmesh.addNode(59.375, 3.75, 1.5, 2900)
-    femmesh.addNode(58.75, 2.5, 1.5, 2901)
-    femmesh.addNode(38.125, 3.75, 1.5, 2902)
-    femmesh.addNode(21.25, 2.5, 1.5, 2903)
-    femmesh.addNode(20.625, 3.75, 1.5, 2904)
-    femmesh.addNode(48.125, 3.75, 1.5, 2905)
-    femmesh.addNode(48.75, 2.5, 1.5, 2906)
-    femmesh.addNode(31.875, 3.75, 1.5, 2907)
-    femmesh.addNode(31.25, 2.5, 1.5, 2908)
-    femmesh.addNode(30.625, 3.75, 1.5, 2909)
-    femmesh.addNode(49.375, 3.75, 1.5, 2910)
-    femmesh.addNode(53.75, 2.5, 1.5, 2911)
-    femmesh.addNode(54.375, 3.75, 1.5, 2912)
-    femmesh.addNode(63.125, 3.75, 1.5, 2913)
-    femmesh.addNode(51.875, 3.75, 1.5, 2914)
-    femmesh.addNode(55.625, 3.75, 1.5, 2915)
-    femmesh.addNode(53.125, 3.75, 1.5, 2916)
-    femmesh.addNode(56.25, 2.5, 1.5, 2917)
-    femmesh.addNode(61.25, 2.5, 1.5, 2918)
-    femmesh.addNode(60.625, 3.75, 1.5, 2919)
-    femmesh.addNode(29.375, 3.75, 1.5, 2920)
-    femmesh.addNode(40.625, 1.25, 1.5, 2921)
-    femmesh.addNode(41.25, 2.5, 1.5, 2922)
-    femmesh.addNode(48.125, 1.25, 1.5, 2923)
-    femmesh.addNode(53.125, 1.25, 1.5, 2924)
-    femmesh.addNode(23.125, 1.25, 1.5, 2925)
-    femmesh.addNode(23.75, 2.5, 1.5, 2926)
-    femmesh.addNode(45.625, 1.25, 1.5, 2927)
-    femmesh.addNode(46.25, 2.5, 1.5, 2928)
-    femmesh.addNode(45.625, 3.75, 1.5, 2929)
-    femmesh.addNode(25.625, 1.25, 1.5, 2930)
-    femmesh.addNode(46.875, 3.75, 1.5, 2931)
-    femmesh.addNode(24.375, 1.25, 1.5, 2932)
-    femmesh.addNode(38.125, 1.25, 1.5, 2933)
-    femmesh.addNode(36.875, 3.75, 1.5, 2934)
-    femmesh.addNode(41.875, 3.75, 1.5, 2935)
-    femmesh.addNode(26.875, 3.75, 1.5, 2936)
-    femmesh.addNode(30.625, 1.25, 1.5, 2937)
-    femmesh.addNode(19.375, 3.75, 1.5, 2938)
-    femmesh.addNode(23.125, 3.75, 1.5, 2939)
-    femmesh.addNode(34.375, 3.75, 1.5, 2940)
-    femmesh.addNode(43.75, 2.5, 1.5, 2941)
-    femmesh.addNode(44.375, 1.25, 1.5, 2942)
-    femmesh.addNode(33.125, 1.25, 1.5, 2943)
-    femmesh.addNode(33.75, 2.5, 1.5, 2944)
-    femmesh.addNode(56.875, 3.75, 1.5, 2945)
-    femmesh.addNode(39.375, 1.25, 1.5, 2946)
-    femmesh.addNode(20.625, 1.25, 1.5, 2947)
-    femmesh.addNode(16.25, 2.5, 1.5, 2948)
-    femmesh.addNode(18.75, 2.5, 1.5, 2949)
-    femmesh.addNode(18.125, 1.25, 1.5, 2950)
-    femmesh.addNode(21.875, 3.75, 1.5, 2951)
-    femmesh.addNode(36.25, 2.5, 1.5, 2952)
-    femmesh.addNode(36.875, 1.25, 1.5, 2953)
-    femmesh.addNode(41.875, 1.25, 1.5, 2954)
-    femmesh.addNode(46.875, 1.25, 1.5, 2955)
-    femmesh.addNode(43.125, 1.25, 1.5, 2956)
-    femmesh.addNode(31.875, 1.25, 1.5, 2957)
-    femmesh.addNode(28.125, 1.25, 1.5, 2958)
-    femmesh.addNode(28.75, 2.5, 1.5, 2959)
-    femmesh.addNode(29.375, 1.25, 1.5, 2960)
-    femmesh.addNode(35.625, 1.25, 1.5, 2961)
-    femmesh.addNode(26.875, 1.25, 1.5, 2962)
-    femmesh.addNode(63.125, 1.25, 1.5, 2963)
-    femmesh.addNode(63.75, 2.5, 1.5, 2964)
-    femmesh.addNode(58.125, 1.25, 1.5, 2965)
-    femmesh.addNode(60.625, 1.25, 1.5, 2966)
-    femmesh.addNode(56.875, 1.25, 1.5, 2967)
-    femmesh.addNode(61.875, 1.25, 1.5, 2968)
-    femmesh.addNode(59.375, 1.25, 1.5, 2969)
-    femmesh.addNode(54.375, 1.25, 1.5, 2970)
-    femmesh.addNode(58.125, 3.75, 1.5, 2971)
-    femmesh.addNode(61.875, 3.75, 1.5, 2972)
-    femmesh.addNode(51.875, 1.25, 1.5, 2973)
-    femmesh.addNode(55.625, 1.25, 1.5, 2974)
-    femmesh.addNode(50.625, 1.25, 1.5, 2975)
-    femmesh.addNode(10.625, 1.25, 1.5, 2976)
-    femmesh.addNode(13.125, 3.75, 1.5, 2977)
-    femmesh.addNode(13.75, 2.5, 1.5, 2978)
-    femmesh.addNode(14.375, 1.25, 1.5, 2979)
-    femmesh.addNode(11.875, 3.75, 1.5, 2980)
-    femmesh.addNode(15.625, 3.75, 1.5, 2981)
-    femmesh.addNode(14.375, 3.75, 1.5, 2982)
-    femmesh.addNode(10.625, 3.75, 1.5, 2983)
-    femmesh.addNode(13.125, 1.25, 1.5, 2984)
-    femmesh.addNode(15.625, 1.25, 1.5, 2985)
-    femmesh.addNode(9.375, 1.25, 1.5, 2986)
-    femmesh.addNode(9.375, 3.75, 1.5, 2987)
-    femmesh.addNode(8.75, 2.5, 1.5, 2988)
-    femmesh.addNode(11.25, 2.5, 1.5, 2989)
-    femmesh.addNode(11.875, 1.25, 1.5, 2990)
-    femmesh.addNode(19.375, 1.25, 1.5, 2991)
-    femmesh.addNode(21.875, 1.25, 1.5, 2992)
-    femmesh.addNode(49.375, 1.25, 1.5, 2993)
-    femmesh.addNode(34.375, 1.25, 1.5, 2994)
-    femmesh.addNode(16.875, 1.25, 1.5, 2995)
-    femmesh.addNode(28.125, 3.75, 1.5, 2996)
-    femmesh.addNode(33.125, 3.75, 1.5, 2997)
-    femmesh.addNode(18.125, 3.75, 1.5, 2998)
-    femmesh.addNode(40.625, 3.75, 1.5, 2999)
-    femmesh.addNode(35.625, 3.75, 1.5, 3000)
-    femmesh.addNode(85.625, 3.75, 1.5, 3001)
-    femmesh.addNode(81.875, 1.25, 1.5, 3002)
-    femmesh.addNode(78.125, 3.75, 1.5, 3003)
-    femmesh.addNode(65.625, 1.25, 1.5, 3004)
-    femmesh.addNode(81.25, 2.5, 1.5, 3005)
-    femmesh.addNode(73.125, 1.25, 1.5, 3006)
-    femmesh.addNode(73.75, 2.5, 1.5, 3007)
-    femmesh.addNode(88.125, 1.25, 1.5, 3008)
-    femmesh.addNode(78.125, 1.25, 1.5, 3009)
-    femmesh.addNode(78.75, 2.5, 1.5, 3010)
-    femmesh.addNode(83.125, 1.25, 1.5, 3011)
-    femmesh.addNode(75.625, 3.75, 1.5, 3012)
-    femmesh.addNode(81.875, 3.75, 1.5, 3013)
-    femmesh.addNode(69.375, 3.75, 1.5, 3014)
-    femmesh.addNode(64.375, 3.75, 1.5, 3015)
-    femmesh.addNode(88.75, 2.5, 1.5, 3016)
-    femmesh.addNode(68.125, 3.75, 1.5, 3017)
-    femmesh.addNode(88.125, 3.75, 1.5, 3018)
-    femmesh.addNode(79.375, 3.75, 1.5, 3019)
-    femmesh.addNode(86.875, 3.75, 1.5, 3020)
-    femmesh.addNode(8.125, 3.75, 1.5, 3021)
-    femmesh.addNode(89.375, 1.25, 1.5, 3022)
-    femmesh.addNode(6.860384778911564, 3.756643282312925, 1.5, 3023)
-    femmesh.addNode(91.8778935185185, 3.7543402777777777, 1.5, 3024)
-    femmesh.addNode(90.6278935185185, 3.7543402777777777, 1.5, 3025)
-    femmesh.addNode(8.125, 1.25, 1.5, 3026)
-    femmesh.addNode(4.287308673469388, 3.789859693877551, 1.5, 3027)
-    femmesh.addNode(91.8778935185185, 1.2543402777777777, 1.5, 3028)
-    femmesh.addNode(93.1423611111111, 3.7760416666666665, 1.5, 3029)
-    femmesh.addNode(5.610384778911564, 3.756643282312925, 1.5, 3030)
-    femmesh.addNode(94.3923611111111, 1.2760416666666665, 1.5, 3031)
-    femmesh.addNode(5.610384778911564, 1.256643282312925, 1.5, 3032)
-    femmesh.addNode(97.00365823412699, 1.27573164682542, 1.5, 3033)
-    femmesh.addNode(3.0373086734693877, 3.789859693877551, 1.5, 3034)
-    femmesh.addNode(95.14601934523809, 2.5517733134920864, 1.5, 3035)
-    femmesh.addNode(97.00365823412699, 3.7757316468254203, 1.5, 3036)
-    femmesh.addNode(99.375, 4.375, 1.5, 3037)
-    femmesh.addNode(7.485384778911564, 2.506643282312925, 1.5, 3038)
-    femmesh.addNode(4.8976934523809526, 2.546502976190476, 1.5, 3039)
-    femmesh.addNode(94.3923611111111, 3.7760416666666665, 1.5, 3040)
-    femmesh.addNode(22.5, 2.5, 1.5, 3041)
-    femmesh.addNode(60.0, 2.5, 1.5, 3042)
-    femmesh.addNode(35.0, 2.5, 1.5, 3043)
-    femmesh.addNode(50.0, 2.5, 1.5, 3044)
-    femmesh.addNode(70.0, 2.5, 1.5, 3045)
-    femmesh.addNode(37.5, 2.5, 1.5, 3046)
-    femmesh.addNode(72.5, 2.5, 1.5, 3047)
-    femmesh.addNode(67.5, 2.5, 1.5, 3048)
-    femmesh.addNode(75.0, 2.5, 1.5, 3049)
-    femmesh.addNode(82.5, 2.5, 1.5, 3050)
-    femmesh.addNode(80.0, 2.5, 1.5, 3051)
-    femmesh.addNode(10.0, 2.5, 1.5, 3052)
-    femmesh.addNode(12.5, 2.5, 1.5, 3053)
-    femmesh.addNode(57.5, 2.5, 1.5, 3054)
-    femmesh.addNode(27.5, 2.5, 1.5, 3055)
-    femmesh.addNode(52.5, 2.5, 1.5, 3056)
-    femmesh.addNode(47.5, 2.5, 1.5, 3057)
-    femmesh.addNode(42.5, 2.5, 1.5, 3058)
-    femmesh.addNode(15.0, 2.5, 1.5, 3059)
-    femmesh.addNode(40.0, 2.5, 1.5, 3060)
-    femmesh.addNode(25.0, 2.5, 1.5, 3061)
-    femmesh.addNode(32.5, 2.5, 1.5, 3062)
-    femmesh.addNode(20.0, 2.5, 1.5, 3063)
-    femmesh.addNode(17.5, 2.5, 1.5, 3064)
-    femmesh.addNode(45.0, 2.5, 1.5, 3065)
-    femmesh.addNode(30.0, 2.5, 1.5, 3066)
-    femmesh.addNode(62.5, 2.5, 1.5, 3067)
-    femmesh.addNode(85.0, 2.5, 1.5, 3068)
-    femmesh.addNode(77.5, 2.5, 1.5, 3069)
-    femmesh.addNode(87.5, 2.5, 1.5, 3070)
-    femmesh.addNode(55.0, 2.5, 1.5, 3071)
-    femmesh.addNode(65.0, 2.5, 1.5, 3072)
-    femmesh.addNode(90.0028935185185, 2.5043402777777777, 1.5, 3073)
-    femmesh.addNode(92.52025462962962, 2.530381944444444, 1.5, 3074)
-    femmesh.addNode(97.99941194493982, 4.2238595577744515, 1.5, 3075)
-    femmesh.addNode(97.50307017906681, 2.999591204599872, 1.5, 3076)
-    femmesh.addNode(98.49882388987963, 3.447719115548904, 1.5, 3077)
-    femmesh.addNode(1.7763883458422938, 1.8384771651267755, 1.5, 3078)
-    femmesh.addNode(98.30199098589867, 1.7570173720606725, 1.5, 3079)
-    femmesh.addNode(2.5724092427474945, 2.9816793491657387, 1.5, 3080)
-    femmesh.addNode(2.035100569278107, 4.191819655288188, 1.5, 3081)
-    femmesh.addNode(1.5702011385562138, 3.383639310576376, 1.5, 3082)
-    femmesh.addNode(97.90099549294933, 0.8785086860303363, 1.5, 3083)
-    femmesh.addNode(97.40465372707632, 2.1542403328557564, 1.5, 3084)
-    femmesh.addNode(98.40040743788916, 2.602368243804788, 1.5, 3085)
-    femmesh.addNode(99.24941194493982, 2.973859557774452, 1.5, 3086)
-    femmesh.addNode(0.7851005692781069, 2.941819655288188, 1.5, 3087)
-    femmesh.addNode(99.15099549294933, 2.128508686030336, 1.5, 3088)
-    femmesh.addNode(0.8881941729211469, 2.1692385825633878, 1.5, 3089)
-    femmesh.addNode(1.673294742199254, 2.6110582378515756, 1.5, 3090)
-    femmesh.addNode(2.138194172921147, 0.9192385825633878, 1.5, 3091)
-    femmesh.addNode(2.6755028463905344, 2.2090982764409386, 1.5, 3092)
-    femmesh.addNode(3.0373086734693877, 1.2898596938775508, 1.5, 3093)
-    return True
-
-
-def create_elements(femmesh):
-    # elements
-    femmesh.addVolume([7, 1302, 22, 525, 1313, 1314, 24, 530, 2260, 532], 1431)
-    femmesh.addVolume([525, 26, 8, 1053, 533, 28, 531, 2261, 1064, 1065], 1432)
-    femmesh.addVolume([4, 1054, 18, 514, 1058, 1059, 20, 519, 2262, 522], 1433)
-    femmesh.addVolume([1303, 514, 3, 14, 2263, 520, 1308, 1307, 521, 16], 1434)
-    femmesh.addVolume([5, 1052, 26, 524, 1061, 1062, 27, 526, 2264, 528], 1435)
-    femmesh.addVolume([22, 1301, 6, 524, 1310, 1311, 23, 529, 2265, 527], 1436)
-    femmesh.addVolume([8, 225, 775, 1053, 265, 821, 818, 1065, 1066, 2266], 1437)
-    femmesh.addVolume([7, 1302, 775, 304, 1313, 2267, 819, 344, 1315, 820], 1438)
-    femmesh.addVolume([14, 513, 2, 1300, 518, 515, 15, 1305, 2268, 1304], 1439)
-    femmesh.addVolume([1, 513, 18, 1051, 516, 517, 19, 1056, 2269, 1055], 1440)
-    femmesh.addVolume([4, 187, 1054, 774, 226, 1060, 1058, 815, 817, 2270], 1441)
-    femmesh.addVolume([1303, 3, 774, 266, 1308, 814, 2271, 1309, 305, 816], 1442)
-    femmesh.addVolume([540, 32, 33, 1034, 598, 72, 597, 2272, 1078, 1079], 1443)
-    femmesh.addVolume([541, 33, 34, 1015, 603, 73, 602, 2273, 1081, 1082], 1444)
-    femmesh.addVolume([551, 43, 44, 1020, 653, 83, 652, 2274, 1111, 1112], 1445)
-    femmesh.addVolume([543, 35, 36, 1016, 613, 75, 612, 2275, 1087, 1088], 1446)
-    femmesh.addVolume([42, 549, 41, 1019, 642, 643, 81, 1106, 2276, 1105], 1447)
-    femmesh.addVolume([542, 34, 35, 1035, 608, 74, 607, 2277, 1084, 1085], 1448)
-    femmesh.addVolume([271, 1284, 272, 781, 1444, 1445, 311, 850, 2278, 853], 1449)
-    femmesh.addVolume([115, 1265, 114, 543, 1336, 1337, 154, 620, 2279, 616], 1450)
-    femmesh.addVolume([275, 1286, 276, 785, 1452, 1453, 315, 870, 2280, 873], 1451)
-    femmesh.addVolume([544, 36, 37, 1036, 618, 76, 617, 2281, 1090, 1091], 1452)
-    femmesh.addVolume([46, 553, 45, 1021, 662, 663, 85, 1118, 2282, 1117], 1453)
-    femmesh.addVolume([47, 554, 46, 1041, 667, 668, 86, 1121, 2283, 1120], 1454)
-    femmesh.addVolume([39, 546, 38, 1037, 627, 628, 78, 1097, 2284, 1096], 1455)
-    femmesh.addVolume([545, 37, 38, 1017, 623, 77, 622, 2285, 1093, 1094], 1456)
-    femmesh.addVolume([41, 548, 40, 1038, 637, 638, 80, 1103, 2286, 1102], 1457)
-    femmesh.addVolume([272, 1265, 273, 782, 1446, 1447, 312, 855, 2287, 858], 1458)
-    femmesh.addVolume([273, 1285, 274, 783, 1448, 1449, 313, 860, 2288, 863], 1459)
-    femmesh.addVolume([43, 550, 42, 1039, 647, 648, 82, 1109, 2289, 1108], 1460)
-    femmesh.addVolume([48, 555, 47, 1022, 672, 673, 87, 1124, 2290, 1123], 1461)
-    femmesh.addVolume([45, 552, 44, 1040, 657, 658, 84, 1115, 2291, 1114], 1462)
-    femmesh.addVolume([125, 1270, 124, 553, 1366, 1367, 164, 670, 2292, 666], 1463)
-    femmesh.addVolume([40, 547, 39, 1018, 632, 633, 79, 1100, 2293, 1099], 1464)
-    femmesh.addVolume([1020, 201, 202, 790, 1214, 241, 1213, 2294, 891, 892], 1465)
-    femmesh.addVolume([1016, 193, 194, 782, 1198, 233, 1197, 2295, 851, 852], 1466)
-    femmesh.addVolume([278, 1268, 279, 788, 1458, 1459, 318, 885, 2296, 888], 1467)
-    femmesh.addVolume([1038, 198, 199, 787, 1208, 238, 1207, 2297, 876, 877], 1468)
-    femmesh.addVolume([277, 1287, 278, 787, 1456, 1457, 317, 880, 2298, 883], 1469)
-    femmesh.addVolume([1019, 199, 200, 788, 1210, 239, 1209, 2299, 881, 882], 1470)
-    femmesh.addVolume([276, 1267, 277, 786, 1454, 1455, 316, 875, 2300, 878], 1471)
-    femmesh.addVolume([1017, 195, 196, 784, 1202, 235, 1201, 2301, 861, 862], 1472)
-    femmesh.addVolume([1035, 192, 193, 781, 1196, 232, 1195, 2302, 846, 847], 1473)
-    femmesh.addVolume([1018, 197, 198, 786, 1206, 237, 1205, 2303, 871, 872], 1474)
-    femmesh.addVolume([1037, 196, 197, 785, 1204, 236, 1203, 2304, 866, 867], 1475)
-    femmesh.addVolume([1036, 194, 195, 783, 1200, 234, 1199, 2305, 856, 857], 1476)
-    femmesh.addVolume([190, 191, 1034, 779, 230, 1191, 1192, 836, 837, 2306], 1477)
-    femmesh.addVolume([191, 192, 1015, 780, 231, 1193, 1194, 841, 842, 2307], 1478)
-    femmesh.addVolume([205, 1041, 204, 793, 1219, 1220, 244, 907, 2308, 906], 1479)
-    femmesh.addVolume([204, 1021, 203, 792, 1217, 1218, 243, 902, 2309, 901], 1480)
-    femmesh.addVolume([51, 1024, 52, 559, 1135, 1136, 91, 693, 2310, 692], 1481)
-    femmesh.addVolume([1039, 200, 201, 789, 1212, 240, 1211, 2311, 886, 887], 1482)
-    femmesh.addVolume([203, 1040, 202, 791, 1215, 1216, 242, 897, 2312, 896], 1483)
-    femmesh.addVolume([52, 1044, 53, 560, 1138, 1139, 92, 698, 2313, 697], 1484)
-    femmesh.addVolume([282, 1270, 283, 792, 1466, 1467, 322, 905, 2314, 908], 1485)
-    femmesh.addVolume([284, 1271, 285, 794, 1470, 1471, 324, 915, 2315, 918], 1486)
-    femmesh.addVolume([270, 1264, 271, 780, 1442, 1443, 310, 845, 2316, 848], 1487)
-    femmesh.addVolume([120, 549, 121, 1268, 646, 650, 160, 1355, 2317, 1354], 1488)
-    femmesh.addVolume([124, 1289, 123, 552, 1363, 1364, 163, 665, 2318, 661], 1489)
-    femmesh.addVolume([114, 1284, 113, 542, 1333, 1334, 153, 615, 2319, 611], 1490)
-    femmesh.addVolume([112, 541, 113, 1264, 606, 610, 152, 1331, 2320, 1330], 1491)
-    femmesh.addVolume([111, 540, 112, 1283, 601, 605, 151, 1328, 2321, 1327], 1492)
-    femmesh.addVolume([115, 544, 116, 1285, 621, 625, 155, 1340, 2322, 1339], 1493)
-    femmesh.addVolume([126, 1290, 125, 554, 1369, 1370, 165, 675, 2323, 671], 1494)
-    femmesh.addVolume([134, 563, 135, 1275, 716, 720, 174, 1397, 2324, 1396], 1495)
-    femmesh.addVolume([294, 1276, 295, 804, 1490, 1491, 334, 965, 2325, 968], 1496)
-    femmesh.addVolume([799, 211, 210, 1044, 937, 250, 936, 2326, 1231, 1232], 1497)
-    femmesh.addVolume([130, 559, 131, 1273, 696, 700, 170, 1385, 2327, 1384], 1498)
-    femmesh.addVolume([796, 208, 207, 1023, 922, 247, 921, 2328, 1225, 1226], 1499)
-    femmesh.addVolume([141, 1278, 140, 569, 1414, 1415, 180, 750, 2329, 746], 1500)
-    femmesh.addVolume([58, 1047, 59, 566, 1156, 1157, 98, 728, 2330, 727], 1501)
-    femmesh.addVolume([139, 1277, 138, 567, 1408, 1409, 178, 740, 2331, 736], 1502)
-    femmesh.addVolume([140, 1297, 139, 568, 1411, 1412, 179, 745, 2332, 741], 1503)
-    femmesh.addVolume([295, 1296, 296, 805, 1492, 1493, 335, 970, 2333, 973], 1504)
-    femmesh.addVolume([300, 1279, 301, 810, 1502, 1503, 340, 995, 2334, 998], 1505)
-    femmesh.addVolume([798, 210, 209, 1024, 932, 249, 931, 2335, 1229, 1230], 1506)
-    femmesh.addVolume([213, 802, 214, 1026, 951, 952, 253, 1238, 2336, 1237], 1507)
-    femmesh.addVolume([218, 807, 219, 1048, 976, 977, 258, 1248, 2337, 1247], 1508)
-    femmesh.addVolume([292, 1275, 293, 802, 1486, 1487, 332, 955, 2338, 958], 1509)
-    femmesh.addVolume([214, 803, 215, 1046, 956, 957, 254, 1240, 2339, 1239], 1510)
-    femmesh.addVolume([206, 795, 207, 1042, 916, 917, 246, 1224, 2340, 1223], 1511)
-    femmesh.addVolume([127, 1271, 126, 555, 1372, 1373, 166, 680, 2341, 676], 1512)
-    femmesh.addVolume([286, 1272, 287, 796, 1474, 1475, 326, 925, 2342, 928], 1513)
-    femmesh.addVolume([298, 1278, 299, 808, 1498, 1499, 338, 985, 2343, 988], 1514)
-    femmesh.addVolume([285, 1291, 286, 795, 1472, 1473, 325, 920, 2344, 923], 1515)
-    femmesh.addVolume([1022, 794, 205, 206, 2345, 911, 1222, 1221, 912, 245], 1516)
-    femmesh.addVolume([289, 1293, 290, 799, 1480, 1481, 329, 940, 2346, 943], 1517)
-    femmesh.addVolume([291, 1294, 292, 801, 1484, 1485, 331, 950, 2347, 953], 1518)
-    femmesh.addVolume([299, 1298, 300, 809, 1500, 1501, 339, 990, 2348, 993], 1519)
-    femmesh.addVolume([296, 1277, 297, 806, 1494, 1495, 336, 975, 2349, 978], 1520)
-    femmesh.addVolume([216, 215, 804, 1027, 255, 961, 962, 1241, 1242, 2350], 1521)
-    femmesh.addVolume([797, 209, 208, 1043, 927, 248, 926, 2351, 1227, 1228], 1522)
-    femmesh.addVolume([1026, 56, 55, 563, 1148, 95, 1147, 2352, 712, 713], 1523)
-    femmesh.addVolume([211, 800, 212, 1025, 941, 942, 251, 1234, 2353, 1233], 1524)
-    femmesh.addVolume([216, 805, 217, 1047, 966, 967, 256, 1244, 2354, 1243], 1525)
-    femmesh.addVolume([137, 1276, 136, 565, 1402, 1403, 176, 730, 2355, 726], 1526)
-    femmesh.addVolume([217, 806, 218, 1028, 971, 972, 257, 1246, 2356, 1245], 1527)
-    femmesh.addVolume([219, 808, 220, 1029, 981, 982, 259, 1250, 2357, 1249], 1528)
-    femmesh.addVolume([220, 809, 221, 1049, 986, 987, 260, 1252, 2358, 1251], 1529)
-    femmesh.addVolume([221, 810, 222, 1030, 991, 992, 261, 1254, 2359, 1253], 1530)
-    femmesh.addVolume([801, 213, 212, 1045, 947, 252, 946, 2360, 1235, 1236], 1531)
-    femmesh.addVolume([1042, 49, 48, 556, 1127, 88, 1126, 2361, 677, 678], 1532)
-    femmesh.addVolume([50, 1043, 51, 558, 1132, 1133, 90, 688, 2362, 687], 1533)
-    femmesh.addVolume([49, 1023, 50, 557, 1129, 1130, 89, 683, 2363, 682], 1534)
-    femmesh.addVolume([132, 1293, 131, 560, 1387, 1388, 171, 705, 2364, 701], 1535)
-    femmesh.addVolume([129, 558, 130, 1292, 691, 695, 169, 1382, 2365, 1381], 1536)
-    femmesh.addVolume([127, 556, 128, 1291, 681, 685, 167, 1376, 2366, 1375], 1537)
-    femmesh.addVolume([54, 1045, 55, 562, 1144, 1145, 94, 708, 2367, 707], 1538)
-    femmesh.addVolume([133, 1274, 132, 561, 1390, 1391, 172, 710, 2368, 706], 1539)
-    femmesh.addVolume([53, 1025, 54, 561, 1141, 1142, 93, 703, 2369, 702], 1540)
-    femmesh.addVolume([57, 1027, 58, 565, 1153, 1154, 97, 723, 2370, 722], 1541)
-    femmesh.addVolume([1046, 57, 56, 564, 1151, 96, 1150, 2371, 717, 718], 1542)
-    femmesh.addVolume([60, 1048, 61, 568, 1162, 1163, 100, 738, 2372, 737], 1543)
-    femmesh.addVolume([1028, 60, 59, 567, 1160, 99, 1159, 2373, 732, 733], 1544)
-    femmesh.addVolume([62, 1049, 63, 570, 1168, 1169, 102, 748, 2374, 747], 1545)
-    femmesh.addVolume([61, 1029, 62, 569, 1165, 1166, 101, 743, 2375, 742], 1546)
-    femmesh.addVolume([138, 1296, 137, 566, 1405, 1406, 177, 735, 2376, 731], 1547)
-    femmesh.addVolume([281, 1289, 282, 791, 1464, 1465, 321, 900, 2377, 903], 1548)
-    femmesh.addVolume([274, 1266, 275, 784, 1450, 1451, 314, 865, 2378, 868], 1549)
-    femmesh.addVolume([287, 1292, 288, 797, 1476, 1477, 327, 930, 2379, 933], 1550)
-    femmesh.addVolume([290, 1274, 291, 800, 1482, 1483, 330, 945, 2380, 948], 1551)
-    femmesh.addVolume([118, 1286, 117, 546, 1345, 1346, 157, 635, 2381, 631], 1552)
-    femmesh.addVolume([134, 1294, 133, 562, 1393, 1394, 173, 715, 2382, 711], 1553)
-    femmesh.addVolume([269, 1283, 270, 779, 1440, 1441, 309, 840, 2383, 843], 1554)
-    femmesh.addVolume([121, 550, 122, 1288, 651, 655, 161, 1358, 2384, 1357], 1555)
-    femmesh.addVolume([280, 1269, 281, 790, 1462, 1463, 320, 895, 2385, 898], 1556)
-    femmesh.addVolume([297, 1297, 298, 807, 1496, 1497, 337, 980, 2386, 983], 1557)
-    femmesh.addVolume([118, 547, 119, 1267, 636, 640, 158, 1349, 2387, 1348], 1558)
-    femmesh.addVolume([119, 548, 120, 1287, 641, 645, 159, 1352, 2388, 1351], 1559)
-    femmesh.addVolume([122, 551, 123, 1269, 656, 660, 162, 1361, 2389, 1360], 1560)
-    femmesh.addVolume([142, 1298, 141, 570, 1417, 1418, 181, 755, 2390, 751], 1561)
-    femmesh.addVolume([293, 1295, 294, 803, 1488, 1489, 333, 960, 2391, 963], 1562)
-    femmesh.addVolume([116, 545, 117, 1266, 626, 630, 156, 1343, 2392, 1342], 1563)
-    femmesh.addVolume([288, 1273, 289, 798, 1478, 1479, 328, 935, 2393, 938], 1564)
-    femmesh.addVolume([136, 1295, 135, 564, 1399, 1400, 175, 725, 2394, 721], 1565)
-    femmesh.addVolume([128, 557, 129, 1272, 686, 690, 168, 1379, 2395, 1378], 1566)
-    femmesh.addVolume([283, 1290, 284, 793, 1468, 1469, 323, 910, 2396, 913], 1567)
-    femmesh.addVolume([279, 1288, 280, 789, 1460, 1461, 319, 890, 2397, 893], 1568)
-    femmesh.addVolume([189, 190, 1014, 778, 229, 1189, 1190, 831, 832, 2398], 1569)
-    femmesh.addVolume([268, 1263, 269, 778, 1438, 1439, 308, 835, 2399, 838], 1570)
-    femmesh.addVolume([142, 571, 143, 1279, 756, 760, 182, 1421, 2400, 1420], 1571)
-    femmesh.addVolume([1030, 64, 63, 571, 1172, 103, 1171, 2401, 752, 753], 1572)
-    femmesh.addVolume([301, 1299, 302, 811, 1504, 1505, 341, 1000, 2402, 1003], 1573)
-    femmesh.addVolume([811, 223, 222, 1050, 997, 262, 996, 2403, 1255, 1256], 1574)
-    femmesh.addVolume([110, 539, 111, 1263, 596, 600, 150, 1325, 2404, 1324], 1575)
-    femmesh.addVolume([539, 31, 32, 1014, 593, 71, 592, 2405, 1075, 1076], 1576)
-    femmesh.addVolume([1033, 188, 189, 777, 1188, 228, 1187, 2406, 826, 827], 1577)
-    femmesh.addVolume([267, 1282, 268, 777, 1436, 1437, 307, 830, 2407, 833], 1578)
-    femmesh.addVolume([1050, 65, 64, 572, 1175, 104, 1174, 2408, 757, 758], 1579)
-    femmesh.addVolume([143, 572, 144, 1299, 761, 765, 183, 1424, 2409, 1423], 1580)
-    femmesh.addVolume([536, 1301, 6, 146, 2410, 1311, 579, 582, 1312, 186], 1581)
-    femmesh.addVolume([1052, 5, 67, 536, 1061, 107, 1063, 2411, 580, 581], 1582)
-    femmesh.addVolume([266, 1262, 267, 776, 1433, 1434, 306, 825, 2412, 828], 1583)
-    femmesh.addVolume([1013, 187, 188, 776, 1185, 227, 1184, 2413, 822, 823], 1584)
-    femmesh.addVolume([303, 1281, 304, 813, 1508, 1509, 343, 1010, 2414, 1012], 1585)
-    femmesh.addVolume([224, 813, 225, 1032, 1006, 1007, 264, 1260, 2415, 1259], 1586)
-    femmesh.addVolume([1032, 67, 66, 574, 1181, 106, 1180, 2416, 767, 768], 1587)
-    femmesh.addVolume([146, 1281, 145, 574, 1429, 1430, 185, 773, 2417, 771], 1588)
-    femmesh.addVolume([537, 29, 30, 1013, 584, 69, 583, 2418, 1069, 1070], 1589)
-    femmesh.addVolume([109, 1262, 108, 537, 1318, 1319, 148, 590, 2419, 586], 1590)
-    femmesh.addVolume([538, 30, 31, 1033, 588, 70, 587, 2420, 1072, 1073], 1591)
-    femmesh.addVolume([110, 1282, 109, 538, 1321, 1322, 149, 595, 2421, 591], 1592)
-    femmesh.addVolume([302, 1280, 303, 812, 1506, 1507, 342, 1005, 2422, 1008], 1593)
-    femmesh.addVolume([223, 812, 224, 1031, 1001, 1002, 263, 1258, 2423, 1257], 1594)
-    femmesh.addVolume([535, 1, 29, 1051, 575, 68, 577, 2424, 1056, 1057], 1595)
-    femmesh.addVolume([535, 2, 1300, 108, 576, 1304, 2425, 578, 147, 1306], 1596)
-    femmesh.addVolume([1031, 66, 65, 573, 1178, 105, 1177, 2426, 762, 763], 1597)
-    femmesh.addVolume([144, 573, 145, 1280, 766, 770, 184, 1427, 2427, 1426], 1598)
-    femmesh.addVolume([513, 1, 535, 1051, 516, 575, 2428, 2269, 1056, 2424], 1599)
-    femmesh.addVolume([1300, 2, 535, 513, 1304, 576, 2425, 2268, 515, 2428], 1600)
-    femmesh.addVolume([6, 1301, 536, 524, 1311, 2410, 579, 527, 2265, 2429], 1601)
-    femmesh.addVolume([524, 5, 1052, 536, 526, 1061, 2264, 2429, 580, 2411], 1602)
-    femmesh.addVolume([66, 145, 1032, 574, 769, 2430, 1180, 768, 771, 2416], 1603)
-    femmesh.addVolume([145, 1281, 1032, 574, 1430, 2431, 2430, 771, 2417, 2416], 1604)
-    femmesh.addVolume([537, 30, 109, 1262, 583, 589, 590, 2419, 2432, 1318], 1605)
-    femmesh.addVolume([1013, 30, 537, 1262, 1070, 583, 2418, 2433, 2432, 2419], 1606)
-    femmesh.addVolume([1281, 813, 303, 224, 2414, 1010, 1508, 2434, 1006, 1009], 1607)
-    femmesh.addVolume([774, 3, 1303, 514, 814, 1308, 2271, 2435, 520, 2263], 1608)
-    femmesh.addVolume([4, 774, 1054, 514, 815, 2270, 1058, 519, 2435, 2262], 1609)
-    femmesh.addVolume([65, 144, 1280, 573, 764, 1427, 2436, 763, 766, 2427], 1610)
-    femmesh.addVolume([1031, 65, 1280, 573, 1177, 2436, 2437, 2426, 763, 2427], 1611)
-    femmesh.addVolume([1282, 110, 31, 538, 1321, 594, 2438, 2421, 595, 587], 1612)
-    femmesh.addVolume([1282, 538, 31, 1033, 2421, 587, 2438, 2439, 2420, 1073], 1613)
-    femmesh.addVolume([64, 143, 1299, 572, 759, 1424, 2440, 758, 761, 2409], 1614)
-    femmesh.addVolume([1050, 64, 1299, 572, 1174, 2440, 2441, 2408, 758, 2409], 1615)
-    femmesh.addVolume([135, 1026, 1275, 563, 2443, 2442, 1396, 720, 2352, 2324], 1616)
-    femmesh.addVolume([58, 565, 1276, 137, 722, 2355, 2444, 729, 730, 1402], 1617)
-    femmesh.addVolume([55, 562, 1294, 134, 707, 2382, 2445, 714, 715, 1393], 1618)
-    femmesh.addVolume([139, 60, 1277, 567, 739, 2446, 1408, 740, 732, 2331], 1619)
-    femmesh.addVolume([57, 564, 1295, 136, 717, 2394, 2447, 724, 725, 1399], 1620)
-    femmesh.addVolume([133, 54, 1274, 561, 709, 2448, 1390, 710, 702, 2368], 1621)
-    femmesh.addVolume([54, 133, 1294, 562, 709, 1394, 2449, 708, 711, 2382], 1622)
-    femmesh.addVolume([137, 1296, 58, 566, 1406, 2450, 729, 731, 2376, 728], 1623)
-    femmesh.addVolume([139, 1297, 60, 568, 1412, 2451, 739, 741, 2332, 738], 1624)
-    femmesh.addVolume([141, 1298, 62, 570, 1418, 2452, 749, 751, 2390, 748], 1625)
-    femmesh.addVolume([62, 1029, 1278, 569, 1166, 2454, 2453, 742, 2375, 2329], 1626)
-    femmesh.addVolume([142, 1279, 1030, 571, 1421, 2456, 2455, 756, 2400, 2401], 1627)
-    femmesh.addVolume([63, 142, 1030, 571, 754, 2455, 1171, 753, 756, 2401], 1628)
-    femmesh.addVolume([293, 802, 1275, 1026, 958, 2338, 1487, 2457, 2336, 2442], 1629)
-    femmesh.addVolume([301, 222, 810, 1030, 999, 992, 998, 2458, 1253, 2359], 1630)
-    femmesh.addVolume([214, 802, 293, 1026, 952, 958, 959, 1237, 2336, 2457], 1631)
-    femmesh.addVolume([214, 293, 803, 1046, 959, 960, 956, 1240, 2459, 2339], 1632)
-    femmesh.addVolume([291, 212, 800, 1274, 949, 942, 948, 1483, 2460, 2380], 1633)
-    femmesh.addVolume([215, 294, 804, 1027, 964, 965, 961, 1242, 2461, 2350], 1634)
-    femmesh.addVolume([294, 215, 803, 1046, 964, 957, 963, 2462, 1239, 2339], 1635)
-    femmesh.addVolume([296, 217, 805, 1047, 974, 967, 973, 2463, 1243, 2354], 1636)
-    femmesh.addVolume([295, 216, 804, 1276, 969, 962, 968, 1491, 2464, 2325], 1637)
-    femmesh.addVolume([221, 809, 1298, 1049, 987, 2348, 2465, 1251, 2358, 2466], 1638)
-    femmesh.addVolume([212, 1294, 801, 1045, 2467, 2347, 946, 1236, 2468, 2360], 1639)
-    femmesh.addVolume([298, 219, 807, 1048, 984, 977, 983, 2469, 1247, 2337], 1640)
-    femmesh.addVolume([213, 801, 1294, 1045, 947, 2347, 2470, 1235, 2360, 2468], 1641)
-    femmesh.addVolume([216, 295, 805, 1047, 969, 970, 966, 1244, 2471, 2354], 1642)
-    femmesh.addVolume([217, 296, 806, 1028, 974, 975, 971, 1246, 2472, 2356], 1643)
-    femmesh.addVolume([297, 218, 806, 1028, 979, 972, 978, 2473, 1245, 2356], 1644)
-    femmesh.addVolume([299, 220, 808, 1029, 989, 982, 988, 2474, 1249, 2357], 1645)
-    femmesh.addVolume([220, 299, 809, 1049, 989, 990, 986, 1252, 2475, 2358], 1646)
-    femmesh.addVolume([1041, 793, 205, 284, 2308, 907, 1219, 2476, 913, 914], 1647)
-    femmesh.addVolume([1016, 782, 194, 273, 2295, 852, 1197, 2477, 858, 859], 1648)
-    femmesh.addVolume([1021, 792, 1270, 282, 2309, 2314, 2478, 2479, 905, 1466], 1649)
-    femmesh.addVolume([1040, 281, 791, 1289, 2480, 900, 2312, 2481, 1464, 2377], 1650)
-    femmesh.addVolume([1040, 791, 282, 1289, 2312, 903, 2482, 2481, 2377, 1465], 1651)
-    femmesh.addVolume([1037, 785, 276, 1286, 2304, 873, 2483, 2484, 2280, 1453], 1652)
-    femmesh.addVolume([1268, 199, 788, 278, 2485, 881, 2296, 1458, 884, 885], 1653)
-    femmesh.addVolume([1039, 789, 201, 280, 2311, 887, 1211, 2486, 893, 894], 1654)
-    femmesh.addVolume([1040, 203, 282, 791, 1215, 904, 2482, 2312, 897, 903], 1655)
-    femmesh.addVolume([1022, 285, 794, 206, 2487, 918, 2345, 1221, 919, 912], 1656)
-    femmesh.addVolume([1270, 792, 1021, 283, 2314, 2309, 2478, 1467, 908, 2488], 1657)
-    femmesh.addVolume([1020, 280, 790, 1269, 2489, 895, 2294, 2490, 1462, 2385], 1658)
-    femmesh.addVolume([1038, 787, 199, 1287, 2297, 877, 1207, 2491, 2298, 2492], 1659)
-    femmesh.addVolume([1019, 788, 200, 1268, 2299, 882, 1209, 2493, 2296, 2494], 1660)
-    femmesh.addVolume([1035, 781, 193, 272, 2302, 847, 1195, 2495, 853, 854], 1661)
-    femmesh.addVolume([1036, 273, 783, 1285, 2496, 860, 2305, 2497, 1448, 2288], 1662)
-    femmesh.addVolume([1273, 798, 288, 209, 2393, 935, 1478, 2498, 931, 934], 1663)
-    femmesh.addVolume([1291, 207, 795, 1042, 2499, 917, 2344, 2500, 1223, 2340], 1664)
-    femmesh.addVolume([1292, 797, 287, 1043, 2379, 930, 1476, 2501, 2351, 2502], 1665)
-    femmesh.addVolume([1025, 290, 800, 1274, 2503, 945, 2353, 2504, 1482, 2380], 1666)
-    femmesh.addVolume([1269, 551, 43, 122, 2389, 653, 2505, 1361, 656, 654], 1667)
-    femmesh.addVolume([543, 36, 115, 1016, 612, 619, 620, 2275, 1088, 2506], 1668)
-    femmesh.addVolume([1265, 35, 543, 1016, 2507, 613, 2279, 2508, 1087, 2275], 1669)
-    femmesh.addVolume([546, 117, 38, 1037, 631, 629, 628, 2284, 2509, 1096], 1670)
-    femmesh.addVolume([787, 1038, 277, 1287, 2297, 2510, 880, 2298, 2491, 1456], 1671)
-    femmesh.addVolume([1270, 46, 553, 125, 2511, 662, 2292, 1366, 669, 670], 1672)
-    femmesh.addVolume([1022, 48, 555, 1271, 1124, 672, 2290, 2512, 2513, 2341], 1673)
-    femmesh.addVolume([549, 120, 41, 1019, 646, 644, 643, 2276, 2514, 1105], 1674)
-    femmesh.addVolume([547, 40, 119, 1018, 632, 639, 640, 2293, 1100, 2515], 1675)
-    femmesh.addVolume([542, 35, 114, 1284, 607, 614, 615, 2319, 2516, 1333], 1676)
-    femmesh.addVolume([1288, 550, 43, 1039, 2384, 647, 2517, 2518, 2289, 1109], 1677)
-    femmesh.addVolume([547, 118, 39, 1267, 636, 634, 633, 2387, 1349, 2519], 1678)
-    femmesh.addVolume([545, 116, 37, 1017, 626, 624, 623, 2285, 2520, 1093], 1679)
-    femmesh.addVolume([543, 114, 35, 1265, 616, 614, 613, 2279, 1337, 2507], 1680)
-    femmesh.addVolume([558, 50, 1043, 129, 688, 1132, 2362, 691, 689, 2521], 1681)
-    femmesh.addVolume([544, 37, 116, 1036, 617, 624, 625, 2281, 1091, 2522], 1682)
-    femmesh.addVolume([1019, 42, 549, 121, 1106, 642, 2276, 2523, 649, 650], 1683)
-    femmesh.addVolume([795, 285, 1291, 206, 920, 1472, 2344, 916, 919, 2524], 1684)
-    femmesh.addVolume([796, 286, 1272, 1023, 925, 1474, 2342, 2328, 2525, 2526], 1685)
-    femmesh.addVolume([790, 1020, 201, 280, 2294, 1214, 891, 895, 2489, 894], 1686)
-    femmesh.addVolume([1290, 554, 46, 125, 2323, 668, 2527, 1370, 671, 669], 1687)
-    femmesh.addVolume([551, 44, 123, 1020, 652, 659, 660, 2274, 1112, 2528], 1688)
-    femmesh.addVolume([1270, 553, 46, 1021, 2292, 662, 2511, 2478, 2282, 1118], 1689)
-    femmesh.addVolume([550, 1288, 43, 122, 2384, 2517, 647, 655, 1357, 654], 1690)
-    femmesh.addVolume([792, 1021, 203, 282, 2309, 1218, 901, 905, 2479, 904], 1691)
-    femmesh.addVolume([1267, 39, 547, 1018, 2519, 633, 2387, 2529, 1099, 2293], 1692)
-    femmesh.addVolume([1288, 550, 42, 121, 2384, 648, 2530, 1358, 651, 649], 1693)
-    femmesh.addVolume([793, 1041, 204, 283, 2308, 1220, 906, 910, 2531, 909], 1694)
-    femmesh.addVolume([1290, 554, 47, 1041, 2323, 667, 2532, 2533, 2283, 1121], 1695)
-    femmesh.addVolume([1290, 46, 554, 1041, 2527, 668, 2323, 2533, 1120, 2283], 1696)
-    femmesh.addVolume([1270, 45, 553, 1021, 2534, 663, 2292, 2478, 1117, 2282], 1697)
-    femmesh.addVolume([793, 1290, 1041, 283, 2396, 2533, 2308, 910, 1468, 2531], 1698)
-    femmesh.addVolume([783, 1036, 194, 273, 2305, 1200, 856, 860, 2496, 859], 1699)
-    femmesh.addVolume([1017, 117, 545, 1266, 2535, 630, 2285, 2536, 1342, 2392], 1700)
-    femmesh.addVolume([544, 115, 36, 1285, 621, 619, 618, 2322, 1340, 2537], 1701)
-    femmesh.addVolume([784, 196, 1017, 1266, 862, 1201, 2301, 2378, 2538, 2536], 1702)
-    femmesh.addVolume([783, 195, 1036, 274, 857, 1199, 2305, 863, 864, 2539], 1703)
-    femmesh.addVolume([781, 1035, 1284, 272, 2302, 2540, 2278, 853, 2495, 1445], 1704)
-    femmesh.addVolume([782, 1016, 1265, 273, 2295, 2508, 2287, 858, 2477, 1447], 1705)
-    femmesh.addVolume([784, 1017, 195, 1266, 2301, 1202, 861, 2378, 2536, 2541], 1706)
-    femmesh.addVolume([785, 1037, 275, 1286, 2304, 2542, 870, 2280, 2484, 1452], 1707)
-    femmesh.addVolume([788, 1019, 199, 1268, 2299, 1210, 881, 2296, 2493, 2485], 1708)
-    femmesh.addVolume([789, 1039, 1288, 280, 2311, 2518, 2397, 893, 2486, 1461], 1709)
-    femmesh.addVolume([796, 1272, 287, 1023, 2342, 1475, 928, 2328, 2526, 2543], 1710)
-    femmesh.addVolume([791, 1040, 202, 281, 2312, 1216, 896, 900, 2480, 899], 1711)
-    femmesh.addVolume([792, 204, 1021, 283, 902, 1217, 2309, 908, 909, 2488], 1712)
-    femmesh.addVolume([793, 1041, 1290, 284, 2308, 2533, 2396, 913, 2476, 1469], 1713)
-    femmesh.addVolume([794, 1022, 1271, 285, 2345, 2512, 2315, 918, 2487, 1471], 1714)
-    femmesh.addVolume([551, 1020, 123, 1269, 2274, 2528, 660, 2389, 2490, 1360], 1715)
-    femmesh.addVolume([1020, 551, 43, 1269, 2274, 653, 1111, 2490, 2389, 2505], 1716)
-    femmesh.addVolume([790, 202, 1020, 1269, 892, 1213, 2294, 2385, 2544, 2490], 1717)
-    femmesh.addVolume([1037, 39, 546, 1286, 1097, 627, 2284, 2484, 2545, 2381], 1718)
-    femmesh.addVolume([552, 45, 124, 1289, 657, 664, 665, 2318, 2546, 1363], 1719)
-    femmesh.addVolume([1040, 45, 552, 1289, 1115, 657, 2291, 2481, 2546, 2318], 1720)
-    femmesh.addVolume([1040, 552, 123, 1289, 2291, 661, 2547, 2481, 2318, 1364], 1721)
-    femmesh.addVolume([784, 1266, 195, 274, 2378, 2541, 861, 865, 1450, 864], 1722)
-    femmesh.addVolume([782, 1265, 193, 272, 2287, 2548, 851, 855, 1446, 854], 1723)
-    femmesh.addVolume([783, 274, 1036, 1285, 863, 2539, 2305, 2288, 1449, 2497], 1724)
-    femmesh.addVolume([1038, 548, 120, 41, 2286, 645, 2549, 1103, 637, 644], 1725)
-    femmesh.addVolume([1290, 47, 554, 126, 2532, 667, 2323, 1369, 674, 675], 1726)
-    femmesh.addVolume([549, 1268, 1019, 121, 2317, 2493, 2276, 650, 1354, 2523], 1727)
-    femmesh.addVolume([1036, 116, 544, 1285, 2522, 625, 2281, 2497, 1339, 2322], 1728)
-    femmesh.addVolume([1024, 51, 1273, 559, 1135, 2551, 2550, 2310, 693, 2327], 1729)
-    femmesh.addVolume([1043, 130, 51, 558, 2552, 694, 1133, 2362, 695, 687], 1730)
-    femmesh.addVolume([1293, 132, 53, 560, 1387, 704, 2553, 2364, 705, 697], 1731)
-    femmesh.addVolume([1273, 51, 130, 559, 2551, 694, 1385, 2327, 693, 696], 1732)
-    femmesh.addVolume([1273, 131, 52, 559, 1384, 699, 2554, 2327, 700, 692], 1733)
-    femmesh.addVolume([799, 289, 1293, 210, 940, 1480, 2346, 936, 939, 2555], 1734)
-    femmesh.addVolume([795, 1291, 286, 207, 2344, 1473, 923, 917, 2499, 924], 1735)
-    femmesh.addVolume([1271, 48, 555, 127, 2513, 672, 2341, 1372, 679, 680], 1736)
-    femmesh.addVolume([798, 1273, 289, 1024, 2393, 1479, 938, 2335, 2550, 2556], 1737)
-    femmesh.addVolume([795, 206, 1291, 1042, 916, 2524, 2344, 2340, 1224, 2500], 1738)
-    femmesh.addVolume([557, 49, 1023, 128, 683, 1129, 2363, 686, 684, 2557], 1739)
-    femmesh.addVolume([1272, 557, 1023, 128, 2395, 2363, 2526, 1379, 686, 2557], 1740)
-    femmesh.addVolume([1292, 558, 1043, 129, 2365, 2362, 2501, 1382, 691, 2521], 1741)
-    femmesh.addVolume([556, 1291, 1042, 128, 2366, 2500, 2361, 685, 1375, 2558], 1742)
-    femmesh.addVolume([1291, 556, 48, 127, 2366, 678, 2559, 1376, 681, 679], 1743)
-    femmesh.addVolume([1025, 561, 132, 1274, 2369, 706, 2560, 2504, 2368, 1391], 1744)
-    femmesh.addVolume([113, 1264, 541, 1015, 1330, 2320, 610, 2561, 2562, 2273], 1745)
-    femmesh.addVolume([32, 1034, 540, 1283, 1078, 2272, 598, 2563, 2564, 2321], 1746)
-    femmesh.addVolume([191, 780, 1264, 270, 841, 2316, 2565, 844, 845, 1442], 1747)
-    femmesh.addVolume([541, 112, 33, 1015, 606, 604, 603, 2273, 2566, 1081], 1748)
-    femmesh.addVolume([541, 34, 113, 1015, 602, 609, 610, 2273, 1082, 2561], 1749)
-    femmesh.addVolume([779, 270, 1034, 1283, 843, 2567, 2306, 2383, 1441, 2564], 1750)
-    femmesh.addVolume([540, 33, 112, 1034, 597, 604, 605, 2272, 1079, 2568], 1751)
-    femmesh.addVolume([542, 113, 34, 1284, 611, 609, 608, 2319, 1334, 2569], 1752)
-    femmesh.addVolume([1284, 34, 542, 1035, 2569, 608, 2319, 2540, 1084, 2277], 1753)
-    femmesh.addVolume([1264, 112, 541, 1015, 1331, 606, 2320, 2562, 2566, 2273], 1754)
-    femmesh.addVolume([1014, 32, 539, 1263, 1076, 592, 2405, 2570, 2571, 2404], 1755)
-    femmesh.addVolume([778, 269, 1014, 1263, 838, 2572, 2398, 2399, 1439, 2570], 1756)
-    femmesh.addVolume([778, 190, 1014, 269, 832, 1189, 2398, 838, 839, 2572], 1757)
-    femmesh.addVolume([781, 1035, 192, 271, 2302, 1196, 846, 850, 2573, 849], 1758)
-    femmesh.addVolume([779, 1034, 190, 269, 2306, 1192, 836, 840, 2574, 839], 1759)
-    femmesh.addVolume([781, 1284, 1035, 271, 2278, 2540, 2302, 850, 1444, 2573], 1760)
-    femmesh.addVolume([1264, 191, 1015, 780, 2565, 1194, 2562, 2316, 841, 2307], 1761)
-    femmesh.addVolume([1264, 780, 1015, 271, 2316, 2307, 2562, 1443, 848, 2575], 1762)
-    femmesh.addVolume([1034, 269, 779, 1283, 2574, 840, 2306, 2564, 1440, 2383], 1763)
-    femmesh.addVolume([539, 32, 111, 1263, 592, 599, 600, 2404, 2571, 1324], 1764)
-    femmesh.addVolume([780, 192, 1015, 271, 842, 1193, 2307, 848, 849, 2575], 1765)
-    femmesh.addVolume([779, 191, 1034, 270, 837, 1191, 2306, 843, 844, 2567], 1766)
-    femmesh.addVolume([1034, 112, 540, 1283, 2568, 605, 2272, 2564, 1327, 2321], 1767)
-    femmesh.addVolume([540, 111, 32, 1283, 601, 599, 598, 2321, 1328, 2563], 1768)
-    femmesh.addVolume([117, 545, 38, 1017, 630, 622, 629, 2535, 2285, 1094], 1769)
-    femmesh.addVolume([115, 1265, 543, 1016, 1336, 2279, 620, 2506, 2508, 2275], 1770)
-    femmesh.addVolume([116, 1017, 545, 1266, 2520, 2285, 626, 1343, 2536, 2392], 1771)
-    femmesh.addVolume([47, 1271, 555, 126, 2576, 2341, 673, 674, 1373, 676], 1772)
-    femmesh.addVolume([44, 552, 123, 1040, 658, 661, 659, 1114, 2291, 2547], 1773)
-    femmesh.addVolume([120, 548, 1038, 1287, 645, 2286, 2549, 1351, 2388, 2491], 1774)
-    femmesh.addVolume([45, 553, 124, 1270, 663, 666, 664, 2534, 2292, 1367], 1775)
-    femmesh.addVolume([47, 1022, 555, 1271, 1123, 2290, 673, 2576, 2512, 2341], 1776)
-    femmesh.addVolume([35, 1284, 542, 1035, 2516, 2319, 607, 1085, 2540, 2277], 1777)
-    femmesh.addVolume([40, 548, 119, 1038, 638, 641, 639, 1102, 2286, 2577], 1778)
-    femmesh.addVolume([119, 1267, 547, 1018, 1348, 2387, 640, 2515, 2529, 2293], 1779)
-    femmesh.addVolume([120, 1019, 549, 1268, 2514, 2276, 646, 1355, 2493, 2317], 1780)
-    femmesh.addVolume([119, 1038, 548, 1287, 2577, 2286, 641, 1352, 2491, 2388], 1781)
-    femmesh.addVolume([118, 546, 39, 1286, 635, 627, 634, 1345, 2381, 2545], 1782)
-    femmesh.addVolume([117, 1037, 546, 1286, 2509, 2284, 631, 1346, 2484, 2381], 1783)
-    femmesh.addVolume([42, 550, 1288, 1039, 648, 2384, 2530, 1108, 2289, 2518], 1784)
-    femmesh.addVolume([36, 1036, 544, 1285, 1090, 2281, 618, 2537, 2497, 2322], 1785)
-    femmesh.addVolume([52, 131, 1293, 560, 699, 1388, 2578, 698, 701, 2364], 1786)
-    femmesh.addVolume([52, 1024, 1273, 559, 1136, 2550, 2554, 692, 2310, 2327], 1787)
-    femmesh.addVolume([132, 561, 1025, 53, 706, 2369, 2560, 704, 703, 1141], 1788)
-    femmesh.addVolume([52, 560, 1293, 1044, 698, 2364, 2578, 1138, 2313, 2579], 1789)
-    femmesh.addVolume([53, 1044, 1293, 560, 1139, 2579, 2553, 697, 2313, 2364], 1790)
-    femmesh.addVolume([48, 556, 1291, 1042, 678, 2366, 2559, 1126, 2361, 2500], 1791)
-    femmesh.addVolume([130, 1043, 1292, 558, 2552, 2501, 1381, 695, 2362, 2365], 1792)
-    femmesh.addVolume([50, 1023, 1272, 557, 1130, 2526, 2580, 682, 2363, 2395], 1793)
-    femmesh.addVolume([50, 557, 1272, 129, 682, 2395, 2580, 689, 690, 1378], 1794)
-    femmesh.addVolume([49, 556, 1042, 128, 677, 2361, 1127, 684, 685, 2558], 1795)
-    femmesh.addVolume([277, 198, 1038, 787, 879, 1208, 2510, 880, 876, 2297], 1796)
-    femmesh.addVolume([205, 1022, 1271, 794, 1222, 2512, 2581, 911, 2345, 2315], 1797)
-    femmesh.addVolume([276, 197, 1018, 786, 874, 1206, 2582, 875, 871, 2303], 1798)
-    femmesh.addVolume([275, 196, 784, 1266, 869, 862, 868, 1451, 2538, 2378], 1799)
-    femmesh.addVolume([193, 1016, 1265, 782, 1198, 2508, 2548, 851, 2295, 2287], 1800)
-    femmesh.addVolume([275, 196, 1037, 785, 869, 1204, 2542, 870, 866, 2304], 1801)
-    femmesh.addVolume([197, 276, 1037, 785, 874, 2483, 1203, 867, 873, 2304], 1802)
-    femmesh.addVolume([276, 1018, 1267, 786, 2582, 2529, 1454, 875, 2303, 2300], 1803)
-    femmesh.addVolume([277, 1267, 1018, 786, 1455, 2529, 2583, 878, 2300, 2303], 1804)
-    femmesh.addVolume([198, 277, 1018, 786, 879, 2583, 1205, 872, 878, 2303], 1805)
-    femmesh.addVolume([200, 789, 1288, 279, 886, 2397, 2584, 889, 890, 1460], 1806)
-    femmesh.addVolume([200, 1039, 1288, 789, 1212, 2518, 2584, 886, 2311, 2397], 1807)
-    femmesh.addVolume([200, 1268, 788, 279, 2494, 2296, 882, 889, 1459, 888], 1808)
-    femmesh.addVolume([281, 202, 790, 1269, 899, 892, 898, 1463, 2544, 2385], 1809)
-    femmesh.addVolume([205, 794, 1271, 284, 911, 2315, 2581, 914, 915, 1470], 1810)
-    femmesh.addVolume([278, 199, 787, 1287, 884, 877, 883, 1457, 2492, 2298], 1811)
-    femmesh.addVolume([207, 286, 796, 1023, 924, 925, 921, 1226, 2525, 2328], 1812)
-    femmesh.addVolume([288, 797, 1292, 209, 933, 2379, 1477, 934, 927, 2585], 1813)
-    femmesh.addVolume([287, 208, 796, 1023, 929, 922, 928, 2543, 1225, 2328], 1814)
-    femmesh.addVolume([289, 210, 798, 1024, 939, 932, 938, 2556, 1229, 2335], 1815)
-    femmesh.addVolume([209, 1273, 798, 1024, 2498, 2393, 931, 1230, 2550, 2335], 1816)
-    femmesh.addVolume([211, 290, 800, 1025, 944, 945, 941, 1234, 2503, 2353], 1817)
-    femmesh.addVolume([211, 799, 1293, 1044, 937, 2346, 2586, 1231, 2326, 2579], 1818)
-    femmesh.addVolume([290, 799, 1293, 211, 943, 2346, 1481, 944, 937, 2586], 1819)
-    femmesh.addVolume([210, 1293, 799, 1044, 2555, 2346, 936, 1232, 2579, 2326], 1820)
-    femmesh.addVolume([209, 797, 1292, 1043, 927, 2379, 2585, 1227, 2351, 2501], 1821)
-    femmesh.addVolume([208, 287, 797, 1043, 929, 930, 926, 1228, 2502, 2351], 1822)
-    femmesh.addVolume([1274, 54, 1025, 561, 2448, 1142, 2504, 2368, 702, 2369], 1823)
-    femmesh.addVolume([1294, 292, 801, 213, 1485, 953, 2347, 2470, 954, 947], 1824)
-    femmesh.addVolume([1295, 564, 57, 1046, 2394, 717, 2447, 2587, 2371, 1151], 1825)
-    femmesh.addVolume([1025, 800, 212, 1274, 2353, 942, 1233, 2504, 2380, 2460], 1826)
-    femmesh.addVolume([1045, 54, 1294, 562, 1144, 2449, 2468, 2367, 708, 2382], 1827)
-    femmesh.addVolume([1275, 55, 134, 563, 2588, 714, 1397, 2324, 713, 716], 1828)
-    femmesh.addVolume([1046, 135, 1295, 564, 2589, 1400, 2587, 2371, 721, 2394], 1829)
-    femmesh.addVolume([1026, 135, 56, 563, 2443, 719, 1148, 2352, 720, 712], 1830)
-    femmesh.addVolume([1026, 55, 1275, 563, 1147, 2588, 2442, 2352, 713, 2324], 1831)
-    femmesh.addVolume([1046, 56, 135, 564, 1150, 719, 2589, 2371, 718, 721], 1832)
-    femmesh.addVolume([1049, 62, 1298, 570, 1168, 2452, 2466, 2374, 748, 2390], 1833)
-    femmesh.addVolume([1048, 60, 1297, 568, 1162, 2451, 2590, 2372, 738, 2332], 1834)
-    femmesh.addVolume([1278, 569, 1029, 140, 2329, 2375, 2454, 1415, 746, 2591], 1835)
-    femmesh.addVolume([1276, 804, 294, 1027, 2325, 965, 1490, 2592, 2350, 2461], 1836)
-    femmesh.addVolume([1279, 810, 300, 221, 2334, 995, 1502, 2593, 991, 994], 1837)
-    femmesh.addVolume([1278, 808, 298, 219, 2343, 985, 1498, 2594, 981, 984], 1838)
-    femmesh.addVolume([570, 1049, 63, 142, 2374, 1169, 747, 755, 2595, 754], 1839)
-    femmesh.addVolume([1298, 809, 299, 1049, 2348, 990, 1500, 2466, 2358, 2475], 1840)
-    femmesh.addVolume([569, 61, 1029, 140, 743, 1165, 2375, 746, 744, 2591], 1841)
-    femmesh.addVolume([568, 1048, 61, 140, 2372, 1163, 737, 745, 2596, 744], 1842)
-    femmesh.addVolume([568, 1297, 1048, 140, 2332, 2590, 2372, 745, 1411, 2596], 1843)
-    femmesh.addVolume([1297, 807, 297, 218, 2386, 980, 1496, 2597, 976, 979], 1844)
-    femmesh.addVolume([1298, 809, 221, 300, 2348, 987, 2465, 1501, 993, 994], 1845)
-    femmesh.addVolume([1276, 565, 58, 1027, 2355, 722, 2444, 2592, 2370, 1154], 1846)
-    femmesh.addVolume([1277, 806, 296, 1028, 2349, 975, 1494, 2598, 2356, 2472], 1847)
-    femmesh.addVolume([1027, 57, 136, 565, 1153, 724, 2599, 2370, 723, 726], 1848)
-    femmesh.addVolume([566, 1296, 59, 138, 2376, 2600, 727, 735, 1405, 734], 1849)
-    femmesh.addVolume([570, 1298, 1049, 142, 2390, 2466, 2374, 755, 1417, 2595], 1850)
-    femmesh.addVolume([1294, 562, 55, 1045, 2382, 707, 2445, 2468, 2367, 1145], 1851)
-    femmesh.addVolume([1027, 136, 1276, 565, 2599, 1403, 2592, 2370, 726, 2355], 1852)
-    femmesh.addVolume([1047, 1296, 59, 566, 2601, 2600, 1157, 2330, 2376, 727], 1853)
-    femmesh.addVolume([1047, 58, 1296, 566, 1156, 2450, 2601, 2330, 728, 2376], 1854)
-    femmesh.addVolume([1277, 1028, 59, 567, 2598, 1159, 2602, 2331, 2373, 733], 1855)
-    femmesh.addVolume([1028, 1277, 60, 567, 2598, 2446, 1160, 2373, 2331, 732], 1856)
-    femmesh.addVolume([1278, 141, 62, 569, 1414, 749, 2453, 2329, 750, 742], 1857)
-    femmesh.addVolume([567, 59, 1277, 138, 733, 2602, 2331, 736, 734, 1409], 1858)
-    femmesh.addVolume([803, 293, 1295, 1046, 960, 1488, 2391, 2339, 2459, 2587], 1859)
-    femmesh.addVolume([801, 291, 1294, 212, 950, 1484, 2347, 946, 949, 2467], 1860)
-    femmesh.addVolume([807, 218, 1297, 1048, 976, 2597, 2386, 2337, 1248, 2590], 1861)
-    femmesh.addVolume([810, 1279, 301, 1030, 2334, 1503, 998, 2359, 2456, 2458], 1862)
-    femmesh.addVolume([808, 1278, 299, 1029, 2343, 1499, 988, 2357, 2454, 2474], 1863)
-    femmesh.addVolume([805, 1296, 296, 1047, 2333, 1493, 973, 2354, 2601, 2463], 1864)
-    femmesh.addVolume([806, 1277, 297, 1028, 2349, 1495, 978, 2356, 2598, 2473], 1865)
-    femmesh.addVolume([807, 1297, 298, 1048, 2386, 1497, 983, 2337, 2590, 2469], 1866)
-    femmesh.addVolume([802, 213, 1275, 1026, 951, 2603, 2338, 2336, 1238, 2442], 1867)
-    femmesh.addVolume([805, 295, 1296, 1047, 970, 1492, 2333, 2354, 2471, 2601], 1868)
-    femmesh.addVolume([802, 292, 1275, 213, 955, 1486, 2338, 951, 954, 2603], 1869)
-    femmesh.addVolume([803, 1295, 294, 1046, 2391, 1489, 963, 2339, 2587, 2462], 1870)
-    femmesh.addVolume([808, 219, 1278, 1029, 981, 2594, 2343, 2357, 1250, 2454], 1871)
-    femmesh.addVolume([810, 221, 1279, 1030, 991, 2593, 2334, 2359, 1254, 2456], 1872)
-    femmesh.addVolume([804, 1276, 216, 1027, 2325, 2464, 962, 2350, 2592, 1241], 1873)
-    femmesh.addVolume([1014, 268, 778, 1263, 2604, 835, 2398, 2570, 1438, 2399], 1874)
-    femmesh.addVolume([778, 1014, 189, 268, 2398, 1190, 831, 835, 2604, 834], 1875)
-    femmesh.addVolume([1279, 143, 1030, 571, 1420, 2605, 2456, 2400, 760, 2401], 1876)
-    femmesh.addVolume([268, 189, 777, 1282, 834, 827, 833, 1437, 2606, 2407], 1877)
-    femmesh.addVolume([143, 64, 1030, 571, 759, 1172, 2605, 760, 752, 2401], 1878)
-    femmesh.addVolume([302, 223, 811, 1050, 1004, 997, 1003, 2607, 1255, 2403], 1879)
-    femmesh.addVolume([222, 301, 811, 1050, 999, 1000, 996, 1256, 2608, 2403], 1880)
-    femmesh.addVolume([31, 1014, 539, 1263, 1075, 2405, 593, 2609, 2570, 2404], 1881)
-    femmesh.addVolume([1299, 811, 301, 1050, 2402, 1000, 1504, 2441, 2403, 2608], 1882)
-    femmesh.addVolume([1033, 777, 189, 1282, 2406, 827, 1187, 2439, 2407, 2606], 1883)
-    femmesh.addVolume([813, 224, 1281, 1032, 1006, 2434, 2414, 2415, 1260, 2431], 1884)
-    femmesh.addVolume([811, 1299, 302, 1050, 2402, 1505, 1003, 2403, 2441, 2607], 1885)
-    femmesh.addVolume([539, 110, 31, 1263, 596, 594, 593, 2404, 1325, 2609], 1886)
-    femmesh.addVolume([776, 188, 1013, 267, 823, 1184, 2413, 828, 829, 2610], 1887)
-    femmesh.addVolume([1299, 572, 65, 1050, 2409, 757, 2611, 2441, 2408, 1175], 1888)
-    femmesh.addVolume([1299, 144, 65, 572, 1423, 764, 2611, 2409, 765, 757], 1889)
-    femmesh.addVolume([223, 302, 812, 1031, 1004, 1005, 1001, 1258, 2612, 2423], 1890)
-    femmesh.addVolume([777, 1033, 188, 267, 2406, 1188, 826, 830, 2613, 829], 1891)
-    femmesh.addVolume([1033, 267, 777, 1282, 2613, 830, 2406, 2439, 1436, 2407], 1892)
-    femmesh.addVolume([267, 1013, 776, 1262, 2610, 2413, 828, 1434, 2433, 2412], 1893)
-    femmesh.addVolume([1280, 812, 302, 1031, 2422, 1005, 1506, 2437, 2423, 2612], 1894)
-    femmesh.addVolume([1031, 1280, 66, 573, 2437, 2614, 1178, 2426, 2427, 762], 1895)
-    femmesh.addVolume([30, 1033, 538, 1282, 1072, 2420, 588, 2615, 2439, 2421], 1896)
-    femmesh.addVolume([1281, 146, 67, 574, 1429, 772, 2616, 2417, 773, 767], 1897)
-    femmesh.addVolume([145, 66, 1280, 573, 769, 2614, 1426, 770, 762, 2427], 1898)
-    femmesh.addVolume([538, 109, 30, 1282, 591, 589, 588, 2421, 1322, 2615], 1899)
-    femmesh.addVolume([187, 266, 776, 1262, 824, 825, 822, 2617, 1433, 2412], 1900)
-    femmesh.addVolume([1280, 1031, 66, 1032, 2437, 1178, 2614, 2618, 1182, 1180], 1901)
-    femmesh.addVolume([304, 225, 813, 1032, 1011, 1007, 1012, 2619, 1259, 2415], 1902)
-    femmesh.addVolume([8, 775, 525, 1053, 818, 2620, 531, 1065, 2266, 2261], 1903)
-    femmesh.addVolume([775, 1302, 7, 525, 2267, 1313, 819, 2620, 2260, 530], 1904)
-    femmesh.addVolume([1014, 31, 1282, 1263, 1075, 2438, 2621, 2570, 2609, 1326], 1905)
-    femmesh.addVolume([1033, 30, 1013, 1282, 1072, 1070, 1074, 2439, 2615, 2622], 1906)
-    femmesh.addVolume([1282, 268, 1014, 1263, 1437, 2604, 2621, 1326, 1438, 2570], 1907)
-    femmesh.addVolume([268, 1014, 189, 1282, 2604, 1190, 834, 1437, 2621, 2606], 1908)
-    femmesh.addVolume([224, 812, 1280, 1031, 1002, 2422, 2623, 1257, 2423, 2437], 1909)
-    femmesh.addVolume([113, 1284, 1264, 1015, 1334, 1335, 1330, 2561, 2624, 2562], 1910)
-    femmesh.addVolume([1015, 1264, 112, 1034, 2562, 1331, 2566, 1083, 2625, 2568], 1911)
-    femmesh.addVolume([1288, 42, 1019, 121, 2530, 1106, 2626, 1358, 649, 2523], 1912)
-    femmesh.addVolume([1015, 112, 33, 1034, 2566, 604, 1081, 1083, 2568, 1079], 1913)
-    femmesh.addVolume([34, 1015, 1284, 113, 1082, 2624, 2569, 609, 2561, 1334], 1914)
-    femmesh.addVolume([1037, 276, 1267, 1286, 2483, 1454, 2627, 2484, 1453, 1350], 1915)
-    femmesh.addVolume([275, 1266, 1037, 196, 1451, 2628, 2542, 869, 2538, 1204], 1916)
-    femmesh.addVolume([1018, 198, 1038, 277, 1205, 1208, 1104, 2583, 879, 2510], 1917)
-    femmesh.addVolume([1270, 46, 1290, 1021, 2511, 2527, 1371, 2478, 1118, 2629], 1918)
-    femmesh.addVolume([1041, 1290, 46, 1021, 2533, 2527, 1120, 1122, 2629, 1118], 1919)
-    femmesh.addVolume([1269, 43, 1288, 122, 2505, 2517, 1362, 1361, 654, 1357], 1920)
-    femmesh.addVolume([274, 1266, 1036, 1285, 1450, 2630, 2539, 1449, 1344, 2497], 1921)
-    femmesh.addVolume([1265, 114, 35, 1284, 1337, 614, 2507, 1338, 1333, 2516], 1922)
-    femmesh.addVolume([1036, 116, 1266, 1017, 2522, 1343, 2630, 1095, 2520, 2536], 1923)
-    femmesh.addVolume([1266, 1036, 195, 274, 2630, 1199, 2541, 1450, 2539, 864], 1924)
-    femmesh.addVolume([1018, 119, 1267, 1038, 2515, 1348, 2529, 1104, 2577, 2631], 1925)
-    femmesh.addVolume([1288, 200, 1019, 1039, 2584, 1209, 2626, 2518, 1212, 1110], 1926)
-    femmesh.addVolume([1291, 128, 1023, 1042, 1375, 2557, 2632, 2500, 2558, 1131], 1927)
-    femmesh.addVolume([1276, 1296, 58, 137, 1407, 2450, 2444, 1402, 1406, 729], 1928)
-    femmesh.addVolume([290, 1025, 1293, 1274, 2503, 2633, 1481, 1482, 2504, 1392], 1929)
-    femmesh.addVolume([287, 1272, 1292, 1043, 1475, 1383, 1476, 2502, 2634, 2501], 1930)
-    femmesh.addVolume([1048, 1278, 219, 1029, 2635, 2594, 1247, 1167, 2454, 1250], 1931)
-    femmesh.addVolume([1035, 1016, 1265, 193, 1089, 2508, 2636, 1195, 1198, 2548], 1932)
-    femmesh.addVolume([1037, 1266, 275, 1286, 2628, 1451, 2542, 2484, 1347, 1452], 1933)
-    femmesh.addVolume([1038, 119, 1267, 1287, 2577, 1348, 2631, 2491, 1352, 1353], 1934)
-    femmesh.addVolume([1266, 116, 1036, 1285, 1343, 2522, 2630, 1344, 1339, 2497], 1935)
-    femmesh.addVolume([1017, 116, 37, 1036, 2520, 624, 1093, 1095, 2522, 1091], 1936)
-    femmesh.addVolume([1026, 293, 214, 1046, 2457, 959, 1237, 1152, 2459, 1240], 1937)
-    femmesh.addVolume([1025, 132, 1293, 1274, 2560, 1387, 2633, 2504, 1391, 1392], 1938)
-    femmesh.addVolume([1017, 38, 117, 1037, 1094, 629, 2535, 1098, 1096, 2509], 1939)
-    femmesh.addVolume([1039, 43, 1288, 1020, 1109, 2517, 2518, 1113, 1111, 2637], 1940)
-    femmesh.addVolume([1284, 1015, 34, 1035, 2624, 1082, 2569, 2540, 1086, 1084], 1941)
-    femmesh.addVolume([1019, 1268, 1288, 121, 2493, 1359, 2626, 2523, 1354, 1358], 1942)
-    femmesh.addVolume([1041, 1022, 1271, 205, 1125, 2512, 2638, 1219, 1222, 2581], 1943)
-    femmesh.addVolume([46, 1270, 1290, 125, 2511, 1371, 2527, 669, 1366, 1370], 1944)
-    femmesh.addVolume([1288, 1019, 42, 1039, 2626, 1106, 2530, 2518, 1110, 1108], 1945)
-    femmesh.addVolume([1020, 1040, 123, 1269, 1116, 2547, 2528, 2490, 2639, 1360], 1946)
-    femmesh.addVolume([1016, 36, 115, 1285, 1088, 619, 2506, 2640, 2537, 1340], 1947)
-    femmesh.addVolume([1284, 35, 1265, 1035, 2516, 2507, 1338, 2540, 1085, 2636], 1948)
-    femmesh.addVolume([1268, 200, 1288, 279, 2494, 2584, 1359, 1459, 889, 1460], 1949)
-    femmesh.addVolume([1016, 1265, 35, 1035, 2508, 2507, 1087, 1089, 2636, 1085], 1950)
-    femmesh.addVolume([1016, 115, 1265, 1285, 2506, 1336, 2508, 2640, 1340, 1341], 1951)
-    femmesh.addVolume([1036, 36, 1016, 1285, 1090, 1088, 1092, 2497, 2537, 2640], 1952)
-    femmesh.addVolume([205, 1271, 1041, 284, 2581, 2638, 1219, 914, 1470, 2476], 1953)
-    femmesh.addVolume([1037, 39, 1267, 1018, 1097, 2519, 2627, 1101, 1099, 2529], 1954)
-    femmesh.addVolume([119, 1018, 40, 1038, 2515, 1100, 639, 2577, 1104, 1102], 1955)
-    femmesh.addVolume([41, 1019, 120, 1038, 1105, 2514, 644, 1103, 1107, 2549], 1956)
-    femmesh.addVolume([1271, 47, 1022, 1041, 2576, 1123, 2512, 2638, 1121, 1125], 1957)
-    femmesh.addVolume([195, 1017, 1036, 1266, 1202, 1095, 1199, 2541, 2536, 2630], 1958)
-    femmesh.addVolume([45, 1021, 1270, 1040, 1117, 2478, 2534, 1115, 1119, 2641], 1959)
-    femmesh.addVolume([1037, 197, 1018, 276, 1203, 1206, 1101, 2483, 874, 2582], 1960)
-    femmesh.addVolume([1021, 1041, 1290, 283, 1122, 2533, 2629, 2488, 2531, 1468], 1961)
-    femmesh.addVolume([1294, 55, 134, 1275, 2445, 714, 1393, 1398, 2588, 1397], 1962)
-    femmesh.addVolume([199, 1019, 1038, 1268, 1210, 1107, 1207, 2485, 2493, 2642], 1963)
-    femmesh.addVolume([1264, 1034, 1015, 191, 2625, 1083, 2562, 2565, 1191, 1194], 1964)
-    femmesh.addVolume([1015, 192, 1035, 271, 1193, 1196, 1086, 2575, 849, 2573], 1965)
-    femmesh.addVolume([1034, 191, 1264, 270, 1191, 2565, 2625, 2567, 844, 1442], 1966)
-    femmesh.addVolume([270, 1264, 1034, 1283, 1442, 2625, 2567, 1441, 1332, 2564], 1967)
-    femmesh.addVolume([1264, 1015, 1284, 271, 2562, 2624, 1335, 1443, 2575, 1444], 1968)
-    femmesh.addVolume([1035, 1284, 1015, 271, 2540, 2624, 1086, 2573, 1444, 2575], 1969)
-    femmesh.addVolume([1268, 120, 1038, 1287, 1355, 2549, 2642, 1356, 1351, 2491], 1970)
-    femmesh.addVolume([1017, 196, 1037, 1266, 1201, 1204, 1098, 2536, 2538, 2628], 1971)
-    femmesh.addVolume([1037, 117, 1266, 1286, 2509, 1342, 2628, 2484, 1346, 1347], 1972)
-    femmesh.addVolume([190, 1034, 1014, 269, 1192, 1080, 1189, 839, 2574, 2572], 1973)
-    femmesh.addVolume([193, 1265, 1035, 272, 2548, 2636, 1195, 854, 1446, 2495], 1974)
-    femmesh.addVolume([1016, 194, 1036, 273, 1197, 1200, 1092, 2477, 859, 2496], 1975)
-    femmesh.addVolume([1038, 1267, 1018, 277, 2631, 2529, 1104, 2510, 1455, 2583], 1976)
-    femmesh.addVolume([1020, 43, 1288, 1269, 1111, 2517, 2637, 2490, 2505, 1362], 1977)
-    femmesh.addVolume([1267, 276, 1037, 1018, 1454, 2483, 2627, 2529, 2582, 1101], 1978)
-    femmesh.addVolume([1039, 201, 1020, 280, 1211, 1214, 1113, 2486, 894, 2489], 1979)
-    femmesh.addVolume([1040, 282, 1270, 1289, 2482, 1466, 2641, 2481, 1465, 1368], 1980)
-    femmesh.addVolume([1270, 282, 1040, 1021, 1466, 2482, 2641, 2478, 2479, 1119], 1981)
-    femmesh.addVolume([1288, 280, 1020, 1269, 1461, 2489, 2637, 1362, 1462, 2490], 1982)
-    femmesh.addVolume([282, 1040, 1021, 203, 2482, 1119, 2479, 904, 1215, 1218], 1983)
-    femmesh.addVolume([1290, 1041, 1271, 284, 2533, 2638, 1374, 1469, 2476, 1470], 1984)
-    femmesh.addVolume([123, 1040, 1020, 44, 2547, 1116, 2528, 659, 1114, 1112], 1985)
-    femmesh.addVolume([204, 1041, 1021, 283, 1220, 1122, 1217, 909, 2531, 2488], 1986)
-    femmesh.addVolume([1290, 1271, 47, 126, 1374, 2576, 2532, 1369, 1373, 674], 1987)
-    femmesh.addVolume([1020, 280, 1288, 1039, 2489, 1461, 2637, 1113, 2486, 2518], 1988)
-    femmesh.addVolume([47, 1271, 1290, 1041, 2576, 1374, 2532, 1121, 2638, 2533], 1989)
-    femmesh.addVolume([1020, 202, 1040, 1269, 1213, 1216, 1116, 2490, 2544, 2639], 1990)
-    femmesh.addVolume([281, 1040, 202, 1269, 2480, 1216, 899, 1463, 2639, 2544], 1991)
-    femmesh.addVolume([1266, 117, 1037, 1017, 1342, 2509, 2628, 2536, 2535, 1098], 1992)
-    femmesh.addVolume([39, 1267, 118, 1286, 2519, 1349, 634, 2545, 1350, 1345], 1993)
-    femmesh.addVolume([1037, 1267, 39, 1286, 2627, 2519, 1097, 2484, 1350, 2545], 1994)
-    femmesh.addVolume([1270, 124, 45, 1289, 1367, 664, 2534, 1368, 1363, 2546], 1995)
-    femmesh.addVolume([45, 1040, 1270, 1289, 1115, 2641, 2534, 2546, 2481, 1368], 1996)
-    femmesh.addVolume([123, 1269, 1040, 1289, 1360, 2639, 2547, 1364, 1365, 2481], 1997)
-    femmesh.addVolume([1040, 1269, 281, 1289, 2639, 1463, 2480, 2481, 1365, 1464], 1998)
-    femmesh.addVolume([1019, 200, 1288, 1268, 1209, 2584, 2626, 2493, 2494, 1359], 1999)
-    femmesh.addVolume([199, 1268, 1038, 1287, 2485, 2642, 1207, 2492, 1356, 2491], 2000)
-    femmesh.addVolume([278, 1268, 199, 1287, 1458, 2485, 884, 1457, 1356, 2492], 2001)
-    femmesh.addVolume([1021, 1290, 1270, 283, 2629, 1371, 2478, 2488, 1468, 1467], 2002)
-    femmesh.addVolume([1038, 120, 1268, 1019, 2549, 1355, 2642, 1107, 2514, 2493], 2003)
-    femmesh.addVolume([1035, 1265, 1284, 272, 2636, 1338, 2540, 2495, 1446, 1445], 2004)
-    femmesh.addVolume([269, 1034, 1014, 1283, 2574, 1080, 2572, 1440, 2564, 2643], 2005)
-    femmesh.addVolume([1016, 273, 1036, 1285, 2477, 2496, 1092, 2640, 1448, 2497], 2006)
-    femmesh.addVolume([112, 1034, 1264, 1283, 2568, 2625, 1331, 1327, 2564, 1332], 2007)
-    femmesh.addVolume([1267, 277, 1038, 1287, 1455, 2510, 2631, 1353, 1456, 2491], 2008)
-    femmesh.addVolume([285, 1022, 1271, 1291, 2487, 2512, 1471, 1472, 2644, 1377], 2009)
-    femmesh.addVolume([289, 1273, 1293, 1024, 1479, 1389, 1480, 2556, 2550, 2645], 2010)
-    femmesh.addVolume([273, 1016, 1265, 1285, 2477, 2508, 1447, 1448, 2640, 1341], 2011)
-    femmesh.addVolume([1014, 32, 1283, 1034, 1076, 2563, 2643, 1080, 1078, 2564], 2012)
-    femmesh.addVolume([1283, 32, 1014, 1263, 2563, 1076, 2643, 1329, 2571, 2570], 2013)
-    femmesh.addVolume([1283, 111, 32, 1263, 1328, 599, 2563, 1329, 1324, 2571], 2014)
-    femmesh.addVolume([269, 1283, 1014, 1263, 1440, 2643, 2572, 1439, 1329, 2570], 2015)
-    femmesh.addVolume([1277, 59, 1296, 138, 2602, 2600, 1410, 1409, 734, 1405], 2016)
-    femmesh.addVolume([1025, 211, 1293, 1044, 1234, 2586, 2633, 1143, 1231, 2579], 2017)
-    femmesh.addVolume([49, 1042, 1023, 128, 1127, 1131, 1129, 684, 2558, 2557], 2018)
-    femmesh.addVolume([53, 1025, 1293, 1044, 1141, 2633, 2553, 1139, 1143, 2579], 2019)
-    femmesh.addVolume([290, 211, 1293, 1025, 944, 2586, 1481, 2503, 1234, 2633], 2020)
-    femmesh.addVolume([1294, 212, 291, 1274, 2467, 949, 1484, 1395, 2460, 1483], 2021)
-    femmesh.addVolume([1026, 56, 135, 1046, 1148, 719, 2443, 1152, 1150, 2589], 2022)
-    femmesh.addVolume([1026, 135, 1295, 1046, 2443, 1400, 2646, 1152, 2589, 2587], 2023)
-    femmesh.addVolume([1274, 1294, 212, 1045, 1395, 2467, 2460, 2647, 2468, 1236], 2024)
-    femmesh.addVolume([1274, 1294, 54, 133, 1395, 2449, 2448, 1390, 1394, 709], 2025)
-    femmesh.addVolume([1279, 1298, 221, 300, 1422, 2465, 2593, 1502, 1501, 994], 2026)
-    femmesh.addVolume([299, 1278, 1298, 1049, 1499, 1419, 1500, 2475, 2648, 2466], 2027)
-    femmesh.addVolume([1292, 1273, 288, 209, 1386, 1478, 1477, 2585, 2498, 934], 2028)
-    femmesh.addVolume([1029, 61, 1048, 140, 1165, 1163, 1167, 2591, 744, 2596], 2029)
-    femmesh.addVolume([1278, 62, 141, 1298, 2453, 749, 1414, 1419, 2452, 1418], 2030)
-    femmesh.addVolume([1274, 212, 1025, 1045, 2460, 1233, 2504, 2647, 1236, 1146], 2031)
-    femmesh.addVolume([1027, 294, 1295, 1046, 2461, 1489, 2649, 1155, 2462, 2587], 2032)
-    femmesh.addVolume([59, 1277, 1296, 1028, 2602, 1410, 2600, 1159, 2598, 2650], 2033)
-    femmesh.addVolume([1278, 219, 298, 1048, 2594, 984, 1498, 2635, 1247, 2469], 2034)
-    femmesh.addVolume([139, 1277, 60, 1297, 1408, 2446, 739, 1412, 1413, 2451], 2035)
-    femmesh.addVolume([1047, 296, 217, 1028, 2463, 974, 1243, 1161, 2472, 1246], 2036)
-    femmesh.addVolume([295, 1047, 216, 1276, 2471, 1244, 969, 1491, 2651, 2464], 2037)
-    femmesh.addVolume([1295, 294, 1027, 1276, 1489, 2461, 2649, 1404, 1490, 2592], 2038)
-    femmesh.addVolume([1291, 48, 1022, 1271, 2559, 1124, 2644, 1377, 2513, 2512], 2039)
-    femmesh.addVolume([1271, 1291, 48, 127, 1377, 2559, 2513, 1372, 1376, 679], 2040)
-    femmesh.addVolume([1043, 50, 1272, 129, 1132, 2580, 2634, 2521, 689, 1378], 2041)
-    femmesh.addVolume([1022, 48, 1291, 1042, 1124, 2559, 2644, 1128, 1126, 2500], 2042)
-    femmesh.addVolume([1022, 1291, 285, 206, 2644, 1472, 2487, 1221, 2524, 919], 2043)
-    femmesh.addVolume([1043, 1272, 1292, 129, 2634, 1383, 2501, 2521, 1378, 1382], 2044)
-    femmesh.addVolume([1023, 1272, 287, 1043, 2526, 1475, 2543, 1134, 2634, 2502], 2045)
-    femmesh.addVolume([209, 1292, 1273, 1043, 2585, 1386, 2498, 1227, 2501, 2652], 2046)
-    femmesh.addVolume([1272, 286, 1291, 1023, 1474, 1473, 1380, 2526, 2525, 2632], 2047)
-    femmesh.addVolume([292, 1294, 1275, 213, 1485, 1398, 1486, 954, 2470, 2603], 2048)
-    femmesh.addVolume([1275, 135, 1295, 1026, 1396, 1400, 1401, 2442, 2443, 2646], 2049)
-    femmesh.addVolume([298, 1297, 1278, 1048, 1497, 1416, 1498, 2469, 2590, 2635], 2050)
-    femmesh.addVolume([221, 1298, 1279, 1030, 2465, 1422, 2593, 1254, 2653, 2456], 2051)
-    femmesh.addVolume([1047, 1296, 296, 1028, 2601, 1493, 2463, 1161, 2650, 2472], 2052)
-    femmesh.addVolume([1296, 1047, 295, 1276, 2601, 2471, 1492, 1407, 2651, 1491], 2053)
-    femmesh.addVolume([1278, 1048, 1297, 140, 2635, 2590, 1416, 1415, 2596, 1411], 2054)
-    femmesh.addVolume([1298, 1278, 62, 1049, 1419, 2453, 2452, 2466, 2648, 1168], 2055)
-    femmesh.addVolume([296, 1296, 1277, 1028, 1493, 1410, 1494, 2472, 2650, 2598], 2056)
-    femmesh.addVolume([1292, 130, 1273, 1043, 1381, 1385, 1386, 2501, 2552, 2652], 2057)
-    femmesh.addVolume([1296, 1047, 59, 1028, 2601, 1157, 2600, 2650, 1161, 1159], 2058)
-    femmesh.addVolume([1276, 58, 1047, 1027, 2444, 1156, 2651, 2592, 1154, 1158], 2059)
-    femmesh.addVolume([1273, 1024, 209, 1043, 2550, 1230, 2498, 2652, 1137, 1227], 2060)
-    femmesh.addVolume([207, 1291, 286, 1023, 2499, 1473, 924, 1226, 2632, 2525], 2061)
-    femmesh.addVolume([51, 1273, 130, 1043, 2551, 1385, 694, 1133, 2652, 2552], 2062)
-    femmesh.addVolume([1023, 287, 208, 1043, 2543, 929, 1225, 1134, 2502, 1228], 2063)
-    femmesh.addVolume([1023, 50, 1272, 1043, 1130, 2580, 2526, 1134, 1132, 2634], 2064)
-    femmesh.addVolume([51, 1024, 1273, 1043, 1135, 2550, 2551, 1133, 1137, 2652], 2065)
-    femmesh.addVolume([1297, 1277, 60, 1028, 1413, 2446, 2451, 2654, 2598, 1160], 2066)
-    femmesh.addVolume([297, 1277, 1297, 1028, 1495, 1413, 1496, 2473, 2598, 2654], 2067)
-    femmesh.addVolume([1297, 218, 297, 1028, 2597, 979, 1496, 2654, 1245, 2473], 2068)
-    femmesh.addVolume([1297, 1048, 218, 1028, 2590, 1248, 2597, 2654, 1164, 1245], 2069)
-    femmesh.addVolume([60, 1048, 1297, 1028, 1162, 2590, 2451, 1160, 1164, 2654], 2070)
-    femmesh.addVolume([1029, 1278, 299, 1049, 2454, 1499, 2474, 1170, 2648, 2475], 2071)
-    femmesh.addVolume([1030, 221, 1298, 1049, 1254, 2465, 2653, 1173, 1251, 2466], 2072)
-    femmesh.addVolume([1029, 299, 220, 1049, 2474, 989, 1249, 1170, 2475, 1252], 2073)
-    femmesh.addVolume([1029, 62, 1278, 1049, 1166, 2453, 2454, 1170, 1168, 2648], 2074)
-    femmesh.addVolume([1298, 142, 1030, 1049, 1417, 2455, 2653, 2466, 2595, 1173], 2075)
-    femmesh.addVolume([1293, 1025, 53, 132, 2633, 1141, 2553, 1387, 2560, 704], 2076)
-    femmesh.addVolume([136, 1276, 1295, 1027, 1403, 1404, 1399, 2599, 2592, 2649], 2077)
-    femmesh.addVolume([1047, 58, 1276, 1296, 1156, 2444, 2651, 2601, 2450, 1407], 2078)
-    femmesh.addVolume([1295, 57, 136, 1027, 2447, 724, 1399, 2649, 1153, 2599], 2079)
-    femmesh.addVolume([206, 1022, 1291, 1042, 1221, 2644, 2524, 1224, 1128, 2500], 2080)
-    femmesh.addVolume([1023, 207, 1291, 1042, 1226, 2499, 2632, 1131, 1223, 2500], 2081)
-    femmesh.addVolume([1023, 128, 1291, 1272, 2557, 1375, 2632, 2526, 1379, 1380], 2082)
-    femmesh.addVolume([210, 1024, 1293, 1044, 1229, 2645, 2555, 1232, 1140, 2579], 2083)
-    femmesh.addVolume([1293, 1024, 210, 289, 2645, 1229, 2555, 1480, 2556, 939], 2084)
-    femmesh.addVolume([1293, 52, 1273, 131, 2578, 2554, 1389, 1388, 699, 1384], 2085)
-    femmesh.addVolume([1293, 52, 1024, 1273, 2578, 1136, 2645, 1389, 2554, 2550], 2086)
-    femmesh.addVolume([1024, 52, 1293, 1044, 1136, 2578, 2645, 1140, 1138, 2579], 2087)
-    femmesh.addVolume([55, 1275, 1294, 1045, 2588, 1398, 2445, 1145, 2655, 2468], 2088)
-    femmesh.addVolume([1026, 1275, 55, 1045, 2442, 2588, 1147, 1149, 2655, 1145], 2089)
-    femmesh.addVolume([213, 1294, 1275, 1045, 2470, 1398, 2603, 1235, 2468, 2655], 2090)
-    femmesh.addVolume([1275, 1026, 213, 1045, 2442, 1238, 2603, 2655, 1149, 1235], 2091)
-    femmesh.addVolume([1274, 54, 1294, 1045, 2448, 2449, 1395, 2647, 1144, 2468], 2092)
-    femmesh.addVolume([54, 1274, 1025, 1045, 2448, 2504, 1142, 1144, 2647, 1146], 2093)
-    femmesh.addVolume([216, 1276, 1047, 1027, 2464, 2651, 1244, 1241, 2592, 1158], 2094)
-    femmesh.addVolume([294, 1027, 215, 1046, 2461, 1242, 964, 2462, 1155, 1239], 2095)
-    femmesh.addVolume([1295, 293, 1026, 1046, 1488, 2457, 2646, 2587, 2459, 1152], 2096)
-    femmesh.addVolume([1026, 293, 1295, 1275, 2457, 1488, 2646, 2442, 1487, 1401], 2097)
-    femmesh.addVolume([57, 1027, 1295, 1046, 1153, 2649, 2447, 1151, 1155, 2587], 2098)
-    femmesh.addVolume([1278, 1029, 1048, 140, 2454, 1167, 2635, 1415, 2591, 2596], 2099)
-    femmesh.addVolume([1049, 1030, 63, 142, 1173, 1171, 1169, 2595, 2455, 754], 2100)
-    femmesh.addVolume([1030, 142, 1298, 1279, 2455, 1417, 2653, 2456, 1421, 1422], 2101)
-    femmesh.addVolume([1299, 1030, 1279, 143, 2656, 2456, 1425, 1424, 2605, 1420], 2102)
-    femmesh.addVolume([31, 1282, 1263, 110, 2438, 1326, 2609, 594, 1321, 1325], 2103)
-    femmesh.addVolume([1282, 31, 1014, 1033, 2438, 1075, 2621, 2439, 1073, 1077], 2104)
-    femmesh.addVolume([64, 1030, 1299, 143, 1172, 2656, 2440, 759, 2605, 1424], 2105)
-    femmesh.addVolume([1299, 1030, 64, 1050, 2656, 1172, 2440, 2441, 1176, 1174], 2106)
-    femmesh.addVolume([301, 1279, 1299, 1030, 1503, 1425, 1504, 2458, 2456, 2656], 2107)
-    femmesh.addVolume([301, 1050, 222, 1030, 2608, 1256, 999, 2458, 1176, 1253], 2108)
-    femmesh.addVolume([189, 1014, 1033, 1282, 1190, 1077, 1187, 2606, 2621, 2439], 2109)
-    femmesh.addVolume([1280, 812, 224, 303, 2422, 1002, 2623, 1507, 1008, 1009], 2110)
-    femmesh.addVolume([1299, 65, 1031, 1050, 2611, 1177, 2657, 2441, 1175, 1179], 2111)
-    femmesh.addVolume([1299, 1050, 301, 1030, 2441, 2608, 1504, 2656, 1176, 2458], 2112)
-    femmesh.addVolume([1032, 1280, 1281, 145, 2618, 1431, 2431, 2430, 1426, 1430], 2113)
-    femmesh.addVolume([1280, 1032, 66, 145, 2618, 1180, 2614, 1426, 2430, 769], 2114)
-    femmesh.addVolume([1013, 188, 1033, 267, 1184, 1188, 1074, 2610, 829, 2613], 2115)
-    femmesh.addVolume([1013, 267, 1033, 1282, 2610, 2613, 1074, 2622, 1436, 2439], 2116)
-    femmesh.addVolume([65, 1299, 1280, 144, 2611, 1428, 2436, 764, 1423, 1427], 2117)
-    femmesh.addVolume([1031, 65, 1299, 1280, 1177, 2611, 2657, 2437, 2436, 1428], 2118)
-    femmesh.addVolume([302, 1031, 223, 1050, 2612, 1258, 1004, 2607, 1179, 1255], 2119)
-    femmesh.addVolume([1032, 1281, 67, 574, 2431, 2616, 1181, 2416, 2417, 767], 2120)
-    femmesh.addVolume([1031, 1280, 224, 1032, 2437, 2623, 1257, 1182, 2618, 1260], 2121)
-    femmesh.addVolume([1031, 302, 1299, 1050, 2612, 1505, 2657, 1179, 2607, 2441], 2122)
-    femmesh.addVolume([1262, 30, 109, 1282, 2432, 589, 1318, 1323, 2615, 1322], 2123)
-    femmesh.addVolume([1262, 1013, 30, 1282, 2433, 1070, 2432, 1323, 2622, 2615], 2124)
-    femmesh.addVolume([303, 1280, 1281, 224, 1507, 1431, 1508, 1009, 2623, 2434], 2125)
-    femmesh.addVolume([302, 1299, 1280, 1031, 1505, 1428, 1506, 2612, 2657, 2437], 2126)
-    femmesh.addVolume([1262, 267, 1013, 1282, 1434, 2610, 2433, 1323, 1436, 2622], 2127)
-    femmesh.addVolume([224, 1280, 1281, 1032, 2623, 1431, 2434, 1260, 2618, 2431], 2128)
-    femmesh.addVolume([776, 1013, 187, 1262, 2413, 1185, 822, 2412, 2433, 2617], 2129)
-    femmesh.addVolume([1302, 1053, 225, 1032, 2659, 1066, 2658, 2660, 1261, 1259], 2130)
-    femmesh.addVolume([1051, 535, 513, 1300, 2424, 2428, 2269, 2661, 2425, 2268], 2131)
-    femmesh.addVolume([813, 1281, 304, 1032, 2414, 1509, 1012, 2415, 2431, 2619], 2132)
-    femmesh.addVolume([1052, 1301, 524, 536, 2662, 2265, 2264, 2411, 2410, 2429], 2133)
-    femmesh.addVolume([1054, 187, 1262, 1303, 1060, 2617, 2663, 2664, 2665, 1435], 2134)
-    femmesh.addVolume([1054, 514, 774, 1303, 2262, 2435, 2270, 2664, 2263, 2271], 2135)
-    femmesh.addVolume([775, 1302, 525, 1053, 2267, 2260, 2620, 2266, 2659, 2261], 2136)
-    femmesh.addVolume([1052, 67, 1032, 1301, 1063, 1181, 1183, 2662, 2666, 2667], 2137)
-    femmesh.addVolume([1302, 225, 304, 1032, 2658, 1011, 1315, 2660, 1259, 2619], 2138)
-    femmesh.addVolume([187, 1303, 266, 1262, 2665, 1309, 824, 2617, 1435, 1433], 2139)
-    femmesh.addVolume([1281, 67, 146, 1301, 2616, 772, 1429, 1432, 2666, 1312], 2140)
-    femmesh.addVolume([304, 1281, 1302, 1032, 1509, 1510, 1315, 2619, 2431, 2660], 2141)
-    femmesh.addVolume([1262, 187, 1054, 1013, 2617, 1060, 2663, 2433, 1185, 1186], 2142)
-    femmesh.addVolume([1032, 67, 1281, 1301, 1181, 2616, 2431, 2667, 2666, 1432], 2143)
-    femmesh.addVolume([1032, 1302, 1053, 1052, 2660, 2659, 1261, 1183, 2668, 1068], 2144)
-    femmesh.addVolume([225, 1302, 775, 1053, 2658, 2267, 821, 1066, 2659, 2266], 2145)
-    femmesh.addVolume([774, 187, 1054, 1303, 817, 1060, 2270, 2271, 2665, 2664], 2146)
-    femmesh.addVolume([1302, 1052, 1032, 1301, 2668, 1183, 2660, 1317, 2662, 2667], 2147)
-    femmesh.addVolume([525, 1302, 22, 1053, 2260, 1314, 532, 2261, 2659, 2669], 2148)
-    femmesh.addVolume([514, 1054, 14, 1303, 2262, 2670, 521, 2263, 2664, 1307], 2149)
-    femmesh.addVolume([1053, 1302, 22, 1052, 2659, 1314, 2669, 1068, 2668, 2671], 2150)
-    femmesh.addVolume([513, 14, 18, 1051, 518, 523, 517, 2269, 2672, 1055], 2151)
-    femmesh.addVolume([1262, 1054, 1303, 1300, 2663, 2664, 1435, 1320, 2673, 1316], 2152)
-    femmesh.addVolume([67, 1301, 1052, 536, 2666, 2662, 1063, 581, 2410, 2411], 2153)
-    femmesh.addVolume([22, 524, 1052, 1301, 529, 2264, 2671, 1310, 2265, 2662], 2154)
-    femmesh.addVolume([14, 1051, 513, 1300, 2672, 2269, 518, 1305, 2661, 2268], 2155)
-    femmesh.addVolume([1052, 22, 26, 524, 2671, 534, 1062, 2264, 529, 528], 2156)
-    femmesh.addVolume([1051, 108, 535, 1300, 2674, 578, 2424, 2661, 1306, 2425], 2157)
-    femmesh.addVolume([18, 1054, 14, 514, 1059, 2670, 523, 522, 2262, 521], 2158)
-    femmesh.addVolume([26, 525, 22, 1053, 533, 532, 534, 1064, 2261, 2669], 2159)
-    femmesh.addVolume([22, 1052, 1302, 1301, 2671, 2668, 1314, 1310, 2662, 1317], 2160)
-    femmesh.addVolume([266, 187, 774, 1303, 824, 817, 816, 1309, 2665, 2271], 2161)
-    femmesh.addVolume([1302, 775, 304, 225, 2267, 820, 1315, 2658, 821, 1011], 2162)
-    femmesh.addVolume([14, 1303, 1054, 1300, 1307, 2664, 2670, 1305, 1316, 2673], 2163)
-    femmesh.addVolume([26, 1053, 22, 1052, 1064, 2669, 534, 1062, 1068, 2671], 2164)
-    femmesh.addVolume([1262, 1051, 1054, 1300, 2675, 1067, 2663, 1320, 2661, 2673], 2165)
-    femmesh.addVolume([1301, 67, 146, 536, 2666, 772, 1312, 2410, 581, 582], 2166)
-    femmesh.addVolume([1032, 1281, 1302, 1301, 2431, 1510, 2660, 2667, 1432, 1317], 2167)
-    femmesh.addVolume([108, 535, 29, 1051, 578, 577, 585, 2674, 2424, 1057], 2168)
-    femmesh.addVolume([7, 525, 8, 775, 530, 531, 25, 819, 2620, 818], 2169)
-    femmesh.addVolume([524, 6, 5, 536, 527, 21, 526, 2429, 579, 580], 2170)
-    femmesh.addVolume([774, 4, 3, 514, 815, 17, 814, 2435, 519, 520], 2171)
-    femmesh.addVolume([1051, 1054, 14, 18, 1067, 2670, 2672, 1055, 1059, 523], 2172)
-    femmesh.addVolume([14, 1054, 1051, 1300, 2670, 1067, 2672, 1305, 2673, 2661], 2173)
-    femmesh.addVolume([1, 535, 2, 513, 575, 576, 13, 516, 2428, 515], 2174)
-    femmesh.addVolume([1051, 1054, 1013, 1262, 1067, 1186, 1071, 2675, 2663, 2433], 2175)
-    femmesh.addVolume([1051, 1262, 108, 1300, 2675, 1319, 2674, 2661, 1320, 1306], 2176)
-    femmesh.addVolume([1013, 1262, 29, 1051, 2433, 2676, 1069, 1071, 2675, 1057], 2177)
-    femmesh.addVolume([1013, 29, 1262, 537, 1069, 2676, 2433, 2418, 584, 2419], 2178)
-    femmesh.addVolume([108, 29, 1262, 1051, 585, 2676, 1319, 2674, 1057, 2675], 2179)
-    femmesh.addVolume([108, 1262, 29, 537, 1319, 2676, 585, 586, 2419, 584], 2180)
-    femmesh.addVolume([12, 2051, 351, 1523, 2062, 2063, 353, 1527, 2677, 1531], 2181)
-    femmesh.addVolume([22, 1302, 7, 1523, 1314, 1313, 24, 1529, 2678, 1528], 2182)
-    femmesh.addVolume([1512, 1303, 3, 14, 2679, 1308, 1516, 1518, 1307, 16], 2183)
-    femmesh.addVolume([10, 2052, 1512, 346, 2057, 2680, 1517, 348, 2056, 1520], 2184)
-    femmesh.addVolume([2050, 1522, 11, 351, 2681, 1525, 2060, 2059, 1530, 352], 2185)
-    femmesh.addVolume([22, 1522, 6, 1301, 1526, 1524, 23, 1310, 2682, 1311], 2186)
-    femmesh.addVolume([12, 472, 2051, 1773, 512, 2064, 2062, 1816, 1819, 2683], 2187)
-    femmesh.addVolume([7, 1302, 304, 1773, 1313, 1315, 344, 1815, 2684, 1817], 2188)
-    femmesh.addVolume([9, 2049, 346, 1511, 2053, 2054, 347, 1513, 2685, 1519], 2189)
-    femmesh.addVolume([14, 1300, 2, 1511, 1305, 1304, 15, 1515, 2686, 1514], 2190)
-    femmesh.addVolume([266, 1303, 3, 1772, 1309, 1308, 305, 1814, 2687, 1813], 2191)
-    femmesh.addVolume([434, 1772, 10, 2052, 1818, 1812, 473, 2058, 2688, 2057], 2192)
-    femmesh.addVolume([123, 1289, 124, 1550, 1364, 1363, 163, 1656, 2689, 1655], 2193)
-    femmesh.addVolume([125, 1290, 126, 1552, 1370, 1369, 165, 1666, 2690, 1665], 2194)
-    femmesh.addVolume([122, 1269, 123, 1549, 1361, 1360, 162, 1651, 2691, 1650], 2195)
-    femmesh.addVolume([118, 1267, 119, 1545, 1349, 1348, 158, 1631, 2692, 1630], 2196)
-    femmesh.addVolume([440, 1779, 439, 2033, 1851, 1848, 479, 2194, 2693, 2193], 2197)
-    femmesh.addVolume([279, 1268, 278, 1786, 1459, 1458, 318, 1880, 2694, 1879], 2198)
-    femmesh.addVolume([114, 1265, 115, 1541, 1337, 1336, 154, 1611, 2695, 1610], 2199)
-    femmesh.addVolume([275, 1783, 276, 1286, 1864, 1865, 315, 1452, 2696, 1453], 2200)
-    femmesh.addVolume([128, 1272, 129, 1555, 1379, 1378, 168, 1681, 2697, 1680], 2201)
-    femmesh.addVolume([386, 385, 1565, 2026, 425, 1734, 1738, 2157, 2158, 2698], 2202)
-    femmesh.addVolume([459, 2043, 460, 1799, 2233, 2234, 499, 1948, 2699, 1951], 2203)
-    femmesh.addVolume([2022, 377, 378, 1557, 2134, 417, 2133, 2700, 1694, 1698], 2204)
-    femmesh.addVolume([447, 1786, 446, 2017, 1886, 1883, 486, 2208, 2701, 2207], 2205)
-    femmesh.addVolume([113, 1284, 114, 1540, 1334, 1333, 153, 1606, 2702, 1605], 2206)
-    femmesh.addVolume([124, 1270, 125, 1551, 1367, 1366, 164, 1661, 2703, 1660], 2207)
-    femmesh.addVolume([116, 1266, 117, 1543, 1343, 1342, 156, 1621, 2704, 1620], 2208)
-    femmesh.addVolume([2043, 380, 381, 1560, 2143, 420, 2142, 2705, 1709, 1713], 2209)
-    femmesh.addVolume([275, 1266, 274, 1782, 1451, 1450, 314, 1860, 2706, 1859], 2210)
-    femmesh.addVolume([273, 1265, 272, 1780, 1447, 1446, 312, 1850, 2707, 1849], 2211)
-    femmesh.addVolume([283, 1791, 284, 1290, 1904, 1905, 323, 1468, 2708, 1469], 2212)
-    femmesh.addVolume([277, 1267, 276, 1784, 1455, 1454, 316, 1870, 2709, 1869], 2213)
-    femmesh.addVolume([121, 1288, 122, 1548, 1358, 1357, 161, 1646, 2710, 1645], 2214)
-    femmesh.addVolume([283, 1270, 282, 1790, 1467, 1466, 322, 1900, 2711, 1899], 2215)
-    femmesh.addVolume([270, 1283, 269, 1777, 1441, 1440, 309, 1835, 2712, 1834], 2216)
-    femmesh.addVolume([448, 449, 1788, 2018, 488, 1896, 1893, 2211, 2212, 2713], 2217)
-    femmesh.addVolume([281, 1269, 280, 1788, 1463, 1462, 320, 1890, 2714, 1889], 2218)
-    femmesh.addVolume([284, 1792, 285, 1271, 1909, 1910, 324, 1470, 2715, 1471], 2219)
-    femmesh.addVolume([443, 1782, 442, 2015, 1866, 1863, 482, 2200, 2716, 2199], 2220)
-    femmesh.addVolume([282, 1289, 281, 1789, 1465, 1464, 321, 1895, 2717, 1894], 2221)
-    femmesh.addVolume([368, 1548, 369, 2037, 1649, 1653, 408, 2107, 2718, 2106], 2222)
-    femmesh.addVolume([279, 1787, 280, 1288, 1884, 1885, 319, 1460, 2719, 1461], 2223)
-    femmesh.addVolume([274, 1285, 273, 1781, 1449, 1448, 313, 1855, 2720, 1854], 2224)
-    femmesh.addVolume([272, 1284, 271, 1779, 1445, 1444, 311, 1845, 2721, 1844], 2225)
-    femmesh.addVolume([444, 1783, 443, 2035, 1871, 1868, 483, 2202, 2722, 2201], 2226)
-    femmesh.addVolume([368, 1547, 2017, 367, 1648, 2723, 2103, 407, 1644, 2104], 2227)
-    femmesh.addVolume([1778, 438, 439, 2013, 1843, 478, 1846, 2724, 2191, 2192], 2228)
-    femmesh.addVolume([2014, 361, 362, 1541, 2086, 401, 2085, 2725, 1614, 1618], 2229)
-    femmesh.addVolume([119, 1287, 120, 1546, 1352, 1351, 159, 1636, 2726, 1635], 2230)
-    femmesh.addVolume([1553, 374, 373, 2020, 1678, 413, 1674, 2727, 2121, 2122], 2231)
-    femmesh.addVolume([1792, 2020, 452, 453, 2728, 2219, 1913, 1916, 2220, 492], 2232)
-    femmesh.addVolume([1789, 449, 450, 2038, 1898, 489, 1901, 2729, 2213, 2214], 2233)
-    femmesh.addVolume([1790, 450, 451, 2019, 1903, 490, 1906, 2730, 2215, 2216], 2234)
-    femmesh.addVolume([438, 1777, 437, 2032, 1841, 1838, 477, 2190, 2731, 2189], 2235)
-    femmesh.addVolume([1781, 441, 442, 2034, 1858, 481, 1861, 2732, 2197, 2198], 2236)
-    femmesh.addVolume([441, 1780, 440, 2014, 1856, 1853, 480, 2196, 2733, 2195], 2237)
-    femmesh.addVolume([120, 1268, 121, 1547, 1355, 1354, 160, 1641, 2734, 1640], 2238)
-    femmesh.addVolume([2034, 362, 363, 1542, 2089, 402, 2088, 2735, 1619, 1623], 2239)
-    femmesh.addVolume([2033, 360, 361, 1540, 2083, 400, 2082, 2736, 1609, 1613], 2240)
-    femmesh.addVolume([360, 2013, 359, 1539, 2079, 2080, 399, 1608, 2737, 1604], 2241)
-    femmesh.addVolume([2032, 358, 359, 1538, 2077, 398, 2076, 2738, 1599, 1603], 2242)
-    femmesh.addVolume([115, 1285, 116, 1542, 1340, 1339, 155, 1616, 2739, 1615], 2243)
-    femmesh.addVolume([278, 1287, 277, 1785, 1457, 1456, 317, 1875, 2740, 1874], 2244)
-    femmesh.addVolume([126, 1271, 127, 1553, 1373, 1372, 166, 1671, 2741, 1670], 2245)
-    femmesh.addVolume([2041, 376, 377, 1556, 2131, 416, 2130, 2742, 1689, 1693], 2246)
-    femmesh.addVolume([370, 1550, 371, 2038, 1659, 1663, 410, 2113, 2743, 2112], 2247)
-    femmesh.addVolume([372, 1552, 373, 2039, 1669, 1673, 412, 2119, 2744, 2118], 2248)
-    femmesh.addVolume([369, 2018, 1549, 370, 2110, 2745, 1654, 409, 2109, 1658], 2249)
-    femmesh.addVolume([366, 1546, 367, 2036, 1639, 1643, 406, 2101, 2746, 2100], 2250)
-    femmesh.addVolume([117, 1286, 118, 1544, 1346, 1345, 157, 1626, 2747, 1625], 2251)
-    femmesh.addVolume([2015, 1543, 363, 364, 2748, 1624, 2092, 2091, 1628, 403], 2252)
-    femmesh.addVolume([448, 1787, 447, 2037, 1891, 1888, 487, 2210, 2749, 2209], 2253)
-    femmesh.addVolume([446, 1785, 445, 2036, 1881, 1878, 485, 2206, 2750, 2205], 2254)
-    femmesh.addVolume([1544, 365, 364, 2035, 1633, 404, 1629, 2751, 2094, 2095], 2255)
-    femmesh.addVolume([445, 1784, 444, 2016, 1876, 1873, 484, 2204, 2752, 2203], 2256)
-    femmesh.addVolume([1545, 366, 365, 2016, 1638, 405, 1634, 2753, 2097, 2098], 2257)
-    femmesh.addVolume([1791, 451, 452, 2039, 1908, 491, 1911, 2754, 2217, 2218], 2258)
-    femmesh.addVolume([371, 1551, 372, 2019, 1664, 1668, 411, 2116, 2755, 2115], 2259)
-    femmesh.addVolume([2025, 463, 462, 1802, 2240, 502, 2239, 2756, 1966, 1963], 2260)
-    femmesh.addVolume([456, 2022, 457, 1796, 2227, 2228, 496, 1933, 2757, 1936], 2261)
-    femmesh.addVolume([385, 384, 1564, 2045, 424, 1729, 1733, 2154, 2155, 2758], 2262)
-    femmesh.addVolume([135, 1295, 136, 1562, 1400, 1399, 175, 1716, 2759, 1715], 2263)
-    femmesh.addVolume([379, 2042, 378, 1558, 2136, 2137, 418, 1703, 2760, 1699], 2264)
-    femmesh.addVolume([2025, 383, 384, 1563, 2152, 423, 2151, 2761, 1724, 1728], 2265)
-    femmesh.addVolume([381, 382, 2024, 1561, 421, 2145, 2146, 1714, 1718, 2762], 2266)
-    femmesh.addVolume([2023, 379, 380, 1559, 2140, 419, 2139, 2763, 1704, 1708], 2267)
-    femmesh.addVolume([131, 1293, 132, 1558, 1388, 1387, 171, 1696, 2764, 1695], 2268)
-    femmesh.addVolume([374, 375, 2040, 1554, 414, 2124, 2125, 1679, 1683, 2765], 2269)
-    femmesh.addVolume([130, 1273, 131, 1557, 1385, 1384, 170, 1691, 2766, 1690], 2270)
-    femmesh.addVolume([132, 1274, 133, 1559, 1391, 1390, 172, 1701, 2767, 1700], 2271)
-    femmesh.addVolume([461, 460, 2024, 1800, 500, 2235, 2236, 1956, 1953, 2768], 2272)
-    femmesh.addVolume([388, 1568, 389, 2047, 1749, 1753, 428, 2167, 2769, 2166], 2273)
-    femmesh.addVolume([387, 1567, 388, 2027, 1744, 1748, 427, 2164, 2770, 2163], 2274)
-    femmesh.addVolume([386, 1566, 387, 2046, 1739, 1743, 426, 2161, 2771, 2160], 2275)
-    femmesh.addVolume([2027, 467, 466, 1806, 2248, 506, 2247, 2772, 1986, 1983], 2276)
-    femmesh.addVolume([454, 2021, 455, 1794, 2223, 2224, 494, 1923, 2773, 1926], 2277)
-    femmesh.addVolume([382, 1562, 383, 2044, 1719, 1723, 422, 2149, 2774, 2148], 2278)
-    femmesh.addVolume([375, 1555, 376, 2021, 1684, 1688, 415, 2128, 2775, 2127], 2279)
-    femmesh.addVolume([459, 458, 2023, 1798, 498, 2231, 2232, 1946, 1943, 2776], 2280)
-    femmesh.addVolume([2026, 465, 464, 1804, 2244, 504, 2243, 2777, 1976, 1973], 2281)
-    femmesh.addVolume([2045, 464, 463, 1803, 2242, 503, 2241, 2778, 1971, 1968], 2282)
-    femmesh.addVolume([2046, 466, 465, 1805, 2246, 505, 2245, 2779, 1981, 1978], 2283)
-    femmesh.addVolume([298, 1297, 297, 1805, 1497, 1496, 337, 1975, 2780, 1974], 2284)
-    femmesh.addVolume([2047, 468, 467, 1807, 2250, 507, 2249, 2781, 1991, 1988], 2285)
-    femmesh.addVolume([2028, 469, 468, 1808, 2252, 508, 2251, 2782, 1996, 1993], 2286)
-    femmesh.addVolume([2044, 462, 461, 1801, 2238, 501, 2237, 2783, 1961, 1958], 2287)
-    femmesh.addVolume([292, 1294, 291, 1799, 1485, 1484, 331, 1945, 2784, 1944], 2288)
-    femmesh.addVolume([457, 2042, 458, 1797, 2229, 2230, 497, 1938, 2785, 1941], 2289)
-    femmesh.addVolume([455, 2041, 456, 1795, 2225, 2226, 495, 1928, 2786, 1931], 2290)
-    femmesh.addVolume([287, 1795, 288, 1292, 1924, 1925, 327, 1476, 2787, 1477], 2291)
-    femmesh.addVolume([453, 2040, 454, 1793, 2221, 2222, 493, 1918, 2788, 1921], 2292)
-    femmesh.addVolume([289, 1797, 290, 1293, 1934, 1935, 329, 1480, 2789, 1481], 2293)
-    femmesh.addVolume([293, 1275, 292, 1800, 1487, 1486, 332, 1950, 2790, 1949], 2294)
-    femmesh.addVolume([299, 1278, 298, 1806, 1499, 1498, 338, 1980, 2791, 1979], 2295)
-    femmesh.addVolume([287, 1272, 286, 1794, 1475, 1474, 326, 1920, 2792, 1919], 2296)
-    femmesh.addVolume([288, 1796, 289, 1273, 1929, 1930, 328, 1478, 2793, 1479], 2297)
-    femmesh.addVolume([294, 1295, 293, 1801, 1489, 1488, 333, 1955, 2794, 1954], 2298)
-    femmesh.addVolume([294, 1802, 295, 1276, 1959, 1960, 334, 1490, 2795, 1491], 2299)
-    femmesh.addVolume([301, 1279, 300, 1808, 1503, 1502, 340, 1990, 2796, 1989], 2300)
-    femmesh.addVolume([296, 1296, 295, 1803, 1493, 1492, 335, 1965, 2797, 1964], 2301)
-    femmesh.addVolume([290, 1798, 291, 1274, 1939, 1940, 330, 1482, 2798, 1483], 2302)
-    femmesh.addVolume([136, 1276, 137, 1563, 1403, 1402, 176, 1721, 2799, 1720], 2303)
-    femmesh.addVolume([133, 1294, 134, 1560, 1394, 1393, 173, 1706, 2800, 1705], 2304)
-    femmesh.addVolume([137, 1296, 138, 1564, 1406, 1405, 177, 1726, 2801, 1725], 2305)
-    femmesh.addVolume([140, 1278, 141, 1567, 1415, 1414, 180, 1741, 2802, 1740], 2306)
-    femmesh.addVolume([139, 1297, 140, 1566, 1412, 1411, 179, 1736, 2803, 1735], 2307)
-    femmesh.addVolume([141, 1298, 142, 1568, 1418, 1417, 181, 1746, 2804, 1745], 2308)
-    femmesh.addVolume([138, 1277, 139, 1565, 1409, 1408, 178, 1731, 2805, 1730], 2309)
-    femmesh.addVolume([270, 1778, 271, 1264, 1839, 1840, 310, 1442, 2806, 1443], 2310)
-    femmesh.addVolume([299, 1807, 300, 1298, 1984, 1985, 339, 1500, 2807, 1501], 2311)
-    femmesh.addVolume([296, 1804, 297, 1277, 1969, 1970, 336, 1494, 2808, 1495], 2312)
-    femmesh.addVolume([134, 1275, 135, 1561, 1397, 1396, 174, 1711, 2809, 1710], 2313)
-    femmesh.addVolume([285, 1793, 286, 1291, 1914, 1915, 325, 1472, 2810, 1473], 2314)
-    femmesh.addVolume([111, 1283, 112, 1538, 1328, 1327, 151, 1596, 2811, 1595], 2315)
-    femmesh.addVolume([129, 1292, 130, 1556, 1382, 1381, 169, 1686, 2812, 1685], 2316)
-    femmesh.addVolume([112, 1264, 113, 1539, 1331, 1330, 152, 1601, 2813, 1600], 2317)
-    femmesh.addVolume([127, 1291, 128, 1554, 1376, 1375, 167, 1676, 2814, 1675], 2318)
-    femmesh.addVolume([269, 1263, 268, 1776, 1439, 1438, 308, 1830, 2815, 1829], 2319)
-    femmesh.addVolume([437, 1776, 436, 2012, 1836, 1833, 476, 2188, 2816, 2187], 2320)
-    femmesh.addVolume([389, 1569, 390, 2028, 1754, 1758, 429, 2170, 2817, 2169], 2321)
-    femmesh.addVolume([142, 1279, 143, 1569, 1421, 1420, 182, 1751, 2818, 1750], 2322)
-    femmesh.addVolume([469, 2048, 470, 1809, 2253, 2254, 509, 1998, 2819, 2001], 2323)
-    femmesh.addVolume([301, 1809, 302, 1299, 1994, 1995, 341, 1504, 2820, 1505], 2324)
-    femmesh.addVolume([110, 1263, 111, 1537, 1325, 1324, 150, 1591, 2821, 1590], 2325)
-    femmesh.addVolume([2012, 357, 358, 1537, 2074, 397, 2073, 2822, 1594, 1598], 2326)
-    femmesh.addVolume([436, 1775, 435, 2031, 1831, 1828, 475, 2186, 2823, 2185], 2327)
-    femmesh.addVolume([267, 1775, 268, 1282, 1824, 1825, 307, 1436, 2824, 1437], 2328)
-    femmesh.addVolume([1570, 391, 390, 2048, 1763, 430, 1759, 2825, 2172, 2173], 2329)
-    femmesh.addVolume([143, 1299, 144, 1570, 1424, 1423, 183, 1756, 2826, 1755], 2330)
-    femmesh.addVolume([146, 1301, 6, 1534, 1312, 1311, 186, 1578, 2827, 1577], 2331)
-    femmesh.addVolume([11, 393, 1534, 2050, 433, 1580, 1576, 2060, 2061, 2828], 2332)
-    femmesh.addVolume([266, 1774, 267, 1262, 1820, 1821, 306, 1433, 2829, 1434], 2333)
-    femmesh.addVolume([435, 1774, 434, 2011, 1826, 1823, 474, 2183, 2830, 2182], 2334)
-    femmesh.addVolume([304, 1281, 303, 1811, 1509, 1508, 343, 2005, 2831, 2004], 2335)
-    femmesh.addVolume([2030, 472, 471, 1811, 2258, 511, 2257, 2832, 2010, 2008], 2336)
-    femmesh.addVolume([392, 1572, 393, 2030, 1769, 1771, 432, 2179, 2833, 2178], 2337)
-    femmesh.addVolume([145, 1281, 146, 1572, 1430, 1429, 185, 1766, 2834, 1765], 2338)
-    femmesh.addVolume([356, 2011, 355, 1535, 2067, 2068, 395, 1588, 2835, 1584], 2339)
-    femmesh.addVolume([108, 1262, 109, 1535, 1319, 1318, 148, 1582, 2836, 1581], 2340)
-    femmesh.addVolume([109, 1282, 110, 1536, 1322, 1321, 149, 1586, 2837, 1585], 2341)
-    femmesh.addVolume([2031, 356, 357, 1536, 2071, 396, 2070, 2838, 1589, 1593], 2342)
-    femmesh.addVolume([2029, 471, 470, 1810, 2256, 510, 2255, 2839, 2006, 2003], 2343)
-    femmesh.addVolume([302, 1810, 303, 1280, 1999, 2000, 342, 1506, 2840, 1507], 2344)
-    femmesh.addVolume([355, 2049, 9, 1533, 2055, 2053, 394, 1579, 2841, 1574], 2345)
-    femmesh.addVolume([2, 1300, 108, 1533, 1304, 1306, 147, 1573, 2842, 1575], 2346)
-    femmesh.addVolume([144, 1280, 145, 1571, 1427, 1426, 184, 1761, 2843, 1760], 2347)
-    femmesh.addVolume([391, 1571, 392, 2029, 1764, 1768, 431, 2176, 2844, 2175], 2348)
-    femmesh.addVolume([9, 1533, 2049, 1511, 1574, 2841, 2053, 1513, 2845, 2685], 2349)
-    femmesh.addVolume([1300, 1533, 2, 1511, 2842, 1573, 1304, 2686, 2845, 1514], 2350)
-    femmesh.addVolume([1534, 1522, 11, 2050, 2846, 1525, 1576, 2828, 2681, 2060], 2351)
-    femmesh.addVolume([1301, 1522, 6, 1534, 2682, 1524, 1311, 2827, 2846, 1577], 2352)
-    femmesh.addVolume([1572, 2030, 392, 145, 2833, 2179, 1769, 1766, 2847, 1767], 2353)
-    femmesh.addVolume([1281, 2030, 1572, 145, 2848, 2833, 2834, 1430, 2847, 1766], 2354)
-    femmesh.addVolume([356, 109, 2011, 1535, 1587, 2849, 2067, 1588, 1581, 2835], 2355)
-    femmesh.addVolume([2011, 109, 1262, 1535, 2849, 1318, 2850, 2835, 1581, 2836], 2356)
-    femmesh.addVolume([1281, 1811, 471, 303, 2831, 2008, 2851, 1508, 2004, 2007], 2357)
-    femmesh.addVolume([10, 1772, 1512, 2052, 1812, 2852, 1517, 2057, 2688, 2680], 2358)
-    femmesh.addVolume([3, 1303, 1512, 1772, 1308, 2679, 1516, 1813, 2687, 2852], 2359)
-    femmesh.addVolume([1571, 2029, 391, 1280, 2844, 2176, 1764, 2843, 2853, 2854], 2360)
-    femmesh.addVolume([1571, 1280, 391, 144, 2843, 2854, 1764, 1761, 1427, 1762], 2361)
-    femmesh.addVolume([110, 1536, 2031, 357, 1585, 2838, 2855, 1592, 1593, 2070], 2362)
-    femmesh.addVolume([2031, 1536, 110, 1282, 2838, 1585, 2855, 2856, 2837, 1321], 2363)
-    femmesh.addVolume([1570, 2048, 390, 143, 2825, 2173, 1759, 1756, 2857, 1757], 2364)
-    femmesh.addVolume([1299, 2048, 1570, 143, 2858, 2825, 2826, 1424, 2857, 1756], 2365)
-    femmesh.addVolume([134, 381, 1560, 1294, 1712, 1713, 1705, 1393, 2859, 2800], 2366)
-    femmesh.addVolume([388, 141, 1568, 2047, 1747, 1746, 1749, 2167, 2860, 2769], 2367)
-    femmesh.addVolume([139, 1565, 2026, 386, 1730, 2698, 2861, 1737, 1738, 2157], 2368)
-    femmesh.addVolume([380, 1274, 1559, 133, 2862, 2767, 1708, 1707, 1390, 1700], 2369)
-    femmesh.addVolume([136, 383, 1562, 1295, 1722, 1723, 1715, 1399, 2863, 2759], 2370)
-    femmesh.addVolume([384, 1564, 1296, 137, 1729, 2801, 2864, 1727, 1726, 1406], 2371)
-    femmesh.addVolume([135, 2024, 1561, 1275, 2865, 2762, 1710, 1396, 2866, 2809], 2372)
-    femmesh.addVolume([382, 135, 1562, 1295, 1717, 1716, 1719, 2867, 1400, 2759], 2373)
-    femmesh.addVolume([385, 1296, 1564, 138, 2868, 2801, 1733, 1732, 1405, 1725], 2374)
-    femmesh.addVolume([386, 139, 1566, 2046, 1737, 1736, 1739, 2161, 2869, 2771], 2375)
-    femmesh.addVolume([385, 1564, 1296, 2045, 1733, 2801, 2868, 2154, 2758, 2870], 2376)
-    femmesh.addVolume([388, 1567, 141, 1278, 1748, 1740, 1747, 2871, 2802, 1414], 2377)
-    femmesh.addVolume([134, 1561, 2024, 1275, 1711, 2762, 2872, 1397, 2809, 2866], 2378)
-    femmesh.addVolume([384, 1276, 1563, 137, 2873, 2799, 1728, 1727, 1402, 1720], 2379)
-    femmesh.addVolume([389, 1568, 1298, 2047, 1753, 2804, 2874, 2166, 2769, 2875], 2380)
-    femmesh.addVolume([460, 2043, 1294, 1799, 2234, 2877, 2876, 1951, 2699, 2784], 2381)
-    femmesh.addVolume([294, 462, 2044, 1801, 1962, 2238, 2878, 1955, 1961, 2783], 2382)
-    femmesh.addVolume([291, 2043, 459, 1799, 2879, 2233, 1947, 1944, 2699, 1948], 2383)
-    femmesh.addVolume([462, 294, 2025, 1802, 1962, 2880, 2239, 1963, 1959, 2756], 2384)
-    femmesh.addVolume([295, 463, 2025, 1802, 1967, 2240, 2881, 1960, 1966, 2756], 2385)
-    femmesh.addVolume([467, 1806, 1278, 299, 1986, 2791, 2882, 1987, 1980, 1499], 2386)
-    femmesh.addVolume([465, 1297, 1805, 297, 2883, 2780, 1978, 1977, 1496, 1974], 2387)
-    femmesh.addVolume([464, 2045, 1296, 1803, 2242, 2870, 2884, 1971, 2778, 2797], 2388)
-    femmesh.addVolume([461, 293, 2044, 1801, 1957, 2885, 2237, 1958, 1954, 2783], 2389)
-    femmesh.addVolume([294, 2044, 1295, 1801, 2878, 2886, 1489, 1955, 2783, 2794], 2390)
-    femmesh.addVolume([293, 1295, 2044, 1801, 1488, 2886, 2885, 1954, 2794, 2783], 2391)
-    femmesh.addVolume([291, 1294, 2043, 1799, 1484, 2877, 2879, 1944, 2784, 2699], 2392)
-    femmesh.addVolume([469, 301, 1808, 1279, 1997, 1990, 1996, 2887, 1503, 2796], 2393)
-    femmesh.addVolume([298, 2027, 1806, 1278, 2888, 2772, 1979, 1498, 2889, 2791], 2394)
-    femmesh.addVolume([1286, 443, 1783, 2035, 2890, 1868, 2696, 2891, 2201, 2722], 2395)
-    femmesh.addVolume([1270, 1790, 450, 282, 2711, 1903, 2892, 1466, 1899, 1902], 2396)
-    femmesh.addVolume([2040, 1793, 453, 1291, 2788, 1918, 2221, 2893, 2810, 2894], 2397)
-    femmesh.addVolume([1284, 1779, 272, 440, 2721, 1845, 1445, 2895, 1851, 1852], 2398)
-    femmesh.addVolume([1270, 1790, 283, 451, 2711, 1900, 1467, 2896, 1906, 1907], 2399)
-    femmesh.addVolume([1269, 1788, 281, 2018, 2714, 1890, 1463, 2897, 2713, 2898], 2400)
-    femmesh.addVolume([1266, 1782, 275, 443, 2706, 1860, 1451, 2899, 1866, 1867], 2401)
-    femmesh.addVolume([1273, 1796, 457, 2022, 2793, 1936, 2900, 2901, 2757, 2228], 2402)
-    femmesh.addVolume([1269, 448, 1788, 2018, 2902, 1893, 2714, 2897, 2211, 2713], 2403)
-    femmesh.addVolume([2034, 1781, 441, 1285, 2732, 1858, 2197, 2903, 2720, 2904], 2404)
-    femmesh.addVolume([1271, 452, 1792, 2020, 2905, 1913, 2715, 2906, 2219, 2728], 2405)
-    femmesh.addVolume([1287, 1785, 446, 2036, 2740, 1881, 2907, 2908, 2750, 2206], 2406)
-    femmesh.addVolume([1287, 445, 1785, 2036, 2909, 1878, 2740, 2908, 2205, 2750], 2407)
-    femmesh.addVolume([1271, 1792, 285, 2020, 2715, 1910, 1471, 2906, 2728, 2910], 2408)
-    femmesh.addVolume([1272, 455, 2021, 1794, 2912, 2224, 2911, 2792, 1926, 2773], 2409)
-    femmesh.addVolume([2023, 1798, 458, 290, 2776, 1943, 2231, 2913, 1939, 1942], 2410)
-    femmesh.addVolume([1291, 454, 1793, 286, 2914, 1921, 2810, 1473, 1922, 1915], 2411)
-    femmesh.addVolume([1292, 1795, 455, 287, 2787, 1928, 2915, 1476, 1924, 1927], 2412)
-    femmesh.addVolume([1272, 1794, 2021, 286, 2792, 2773, 2911, 1474, 1919, 2916], 2413)
-    femmesh.addVolume([2041, 1795, 455, 1292, 2786, 1928, 2225, 2917, 2787, 2915], 2414)
-    femmesh.addVolume([1273, 289, 457, 1796, 1479, 1937, 2900, 2793, 1930, 1936], 2415)
-    femmesh.addVolume([2042, 1797, 457, 1293, 2785, 1938, 2229, 2918, 2789, 2919], 2416)
-    femmesh.addVolume([1293, 1797, 457, 289, 2789, 1938, 2919, 1480, 1934, 1937], 2417)
-    femmesh.addVolume([1784, 277, 1267, 445, 1870, 1455, 2709, 1876, 1877, 2920], 2418)
-    femmesh.addVolume([1550, 123, 1289, 2038, 1656, 1364, 2689, 2743, 2921, 2922], 2419)
-    femmesh.addVolume([1553, 126, 1271, 373, 1671, 1373, 2741, 1674, 1672, 2923], 2420)
-    femmesh.addVolume([2021, 375, 1555, 128, 2128, 1684, 2775, 2924, 1682, 1681], 2421)
-    femmesh.addVolume([2015, 1266, 116, 1543, 2926, 1343, 2925, 2748, 2704, 1621], 2422)
-    femmesh.addVolume([1290, 1552, 372, 2039, 2690, 1669, 2927, 2928, 2744, 2119], 2423)
-    femmesh.addVolume([1791, 1290, 283, 451, 2708, 1468, 1904, 1908, 2929, 1907], 2424)
-    femmesh.addVolume([1544, 117, 1286, 2035, 1626, 1346, 2747, 2751, 2930, 2891], 2425)
-    femmesh.addVolume([1791, 284, 1290, 2039, 1905, 1469, 2708, 2754, 2931, 2928], 2426)
-    femmesh.addVolume([2015, 117, 1266, 1543, 2932, 1342, 2926, 2748, 1620, 2704], 2427)
-    femmesh.addVolume([1549, 122, 1269, 369, 1651, 1361, 2691, 1654, 1652, 2933], 2428)
-    femmesh.addVolume([1785, 446, 278, 1287, 1881, 1882, 1875, 2740, 2907, 1457], 2429)
-    femmesh.addVolume([1783, 1286, 275, 443, 2696, 1452, 1864, 1868, 2890, 1867], 2430)
-    femmesh.addVolume([1787, 280, 1288, 448, 1885, 1461, 2719, 1891, 1892, 2934], 2431)
-    femmesh.addVolume([1789, 282, 1289, 450, 1895, 1465, 2717, 1901, 1902, 2935], 2432)
-    femmesh.addVolume([1783, 444, 1286, 2035, 1871, 2936, 2696, 2722, 2202, 2891], 2433)
-    femmesh.addVolume([1546, 119, 1287, 366, 1636, 1352, 2726, 1639, 1637, 2937], 2434)
-    femmesh.addVolume([1783, 276, 1286, 444, 1865, 1453, 2696, 1871, 1872, 2936], 2435)
-    femmesh.addVolume([1780, 273, 1265, 441, 1850, 1447, 2707, 1856, 1857, 2938], 2436)
-    femmesh.addVolume([1782, 1266, 274, 442, 2706, 1450, 1859, 1863, 2939, 1862], 2437)
-    femmesh.addVolume([1786, 447, 279, 2017, 1886, 1887, 1880, 2701, 2208, 2940], 2438)
-    femmesh.addVolume([1543, 2015, 117, 364, 2748, 2932, 1620, 1628, 2091, 1627], 2439)
-    femmesh.addVolume([1792, 1271, 284, 452, 2715, 1470, 1909, 1913, 2905, 1912], 2440)
-    femmesh.addVolume([1551, 1270, 125, 2019, 2703, 1366, 1660, 2755, 2941, 2942], 2441)
-    femmesh.addVolume([2017, 1268, 120, 1547, 2944, 1355, 2943, 2723, 2734, 1641], 2442)
-    femmesh.addVolume([1795, 2041, 456, 1292, 2786, 2226, 1931, 2787, 2917, 2945], 2443)
-    femmesh.addVolume([1549, 2018, 123, 370, 2745, 2946, 1650, 1658, 2109, 1657], 2444)
-    femmesh.addVolume([1542, 2034, 362, 1285, 2735, 2089, 1619, 2739, 2903, 2947], 2445)
-    femmesh.addVolume([1779, 440, 1284, 2033, 1851, 2895, 2721, 2693, 2194, 2948], 2446)
-    femmesh.addVolume([1265, 361, 2014, 1541, 2950, 2086, 2949, 2695, 1614, 2725], 2447)
-    femmesh.addVolume([1781, 2034, 442, 1285, 2732, 2198, 1861, 2720, 2903, 2951], 2448)
-    femmesh.addVolume([1548, 1288, 122, 2037, 2710, 1357, 1645, 2718, 2952, 2953], 2449)
-    femmesh.addVolume([2018, 123, 1269, 1549, 2946, 1360, 2897, 2745, 1650, 2691], 2450)
-    femmesh.addVolume([1550, 1289, 124, 371, 2689, 1363, 1655, 1663, 2954, 1662], 2451)
-    femmesh.addVolume([1552, 1290, 126, 2039, 2690, 1369, 1665, 2744, 2928, 2955], 2452)
-    femmesh.addVolume([1270, 1551, 124, 371, 2703, 1661, 1367, 2956, 1664, 1662], 2453)
-    femmesh.addVolume([2018, 1549, 1269, 369, 2745, 2691, 2897, 2110, 1654, 2933], 2454)
-    femmesh.addVolume([1546, 1287, 120, 2036, 2726, 1351, 1635, 2746, 2908, 2957], 2455)
-    femmesh.addVolume([1289, 371, 1550, 2038, 2954, 1663, 2689, 2922, 2112, 2743], 2456)
-    femmesh.addVolume([1547, 120, 2017, 367, 1641, 2943, 2723, 1644, 1642, 2104], 2457)
-    femmesh.addVolume([1267, 1545, 118, 365, 2692, 1631, 1349, 2958, 1634, 1632], 2458)
-    femmesh.addVolume([1546, 366, 1287, 2036, 1639, 2937, 2726, 2746, 2101, 2908], 2459)
-    femmesh.addVolume([1545, 1267, 119, 2016, 2692, 1348, 1630, 2753, 2959, 2960], 2460)
-    femmesh.addVolume([1288, 1548, 368, 2037, 2710, 1649, 2961, 2952, 2718, 2107], 2461)
-    femmesh.addVolume([1286, 1544, 365, 118, 2747, 1633, 2962, 1345, 1625, 1632], 2462)
-    femmesh.addVolume([1793, 285, 453, 1291, 1914, 1917, 1918, 2810, 1472, 2894], 2463)
-    femmesh.addVolume([1794, 454, 2021, 286, 1923, 2223, 2773, 1919, 1922, 2916], 2464)
-    femmesh.addVolume([2023, 1274, 132, 1559, 2964, 1391, 2963, 2763, 2767, 1701], 2465)
-    femmesh.addVolume([2022, 1557, 130, 377, 2700, 1691, 2965, 2134, 1694, 1692], 2466)
-    femmesh.addVolume([1794, 1272, 455, 287, 2792, 2912, 1926, 1920, 1475, 1927], 2467)
-    femmesh.addVolume([1558, 2042, 378, 131, 2760, 2137, 1699, 1696, 2966, 1697], 2468)
-    femmesh.addVolume([2041, 1556, 377, 130, 2742, 1693, 2130, 2967, 1685, 1692], 2469)
-    femmesh.addVolume([2042, 1558, 379, 132, 2760, 1703, 2136, 2968, 1695, 1702], 2470)
-    femmesh.addVolume([1793, 2040, 454, 1291, 2788, 2222, 1921, 2810, 2893, 2914], 2471)
-    femmesh.addVolume([2021, 1555, 1272, 128, 2775, 2697, 2911, 2924, 1681, 1379], 2472)
-    femmesh.addVolume([2022, 1557, 378, 131, 2700, 1698, 2133, 2969, 1690, 1697], 2473)
-    femmesh.addVolume([1272, 376, 1555, 2021, 2970, 1688, 2697, 2911, 2127, 2775], 2474)
-    femmesh.addVolume([1796, 456, 1273, 288, 1933, 2971, 2793, 1929, 1932, 1478], 2475)
-    femmesh.addVolume([1797, 2042, 458, 290, 2785, 2230, 1941, 1935, 2972, 1942], 2476)
-    femmesh.addVolume([2042, 131, 1558, 1293, 2966, 1696, 2760, 2918, 1388, 2764], 2477)
-    femmesh.addVolume([2040, 1554, 375, 1291, 2765, 1683, 2124, 2893, 2814, 2973], 2478)
-    femmesh.addVolume([2023, 1559, 132, 379, 2763, 1701, 2963, 2140, 1704, 1702], 2479)
-    femmesh.addVolume([1292, 2041, 1556, 129, 2917, 2742, 2812, 1382, 2974, 1686], 2480)
-    femmesh.addVolume([1556, 2041, 376, 129, 2742, 2131, 1689, 1686, 2974, 1687], 2481)
-    femmesh.addVolume([1291, 374, 1554, 127, 2975, 1679, 2814, 1376, 1677, 1676], 2482)
-    femmesh.addVolume([358, 2032, 111, 1538, 2077, 2976, 1597, 1599, 2738, 1596], 2483)
-    femmesh.addVolume([438, 1778, 1264, 2013, 1843, 2806, 2977, 2191, 2724, 2978], 2484)
-    femmesh.addVolume([360, 113, 2013, 1539, 1607, 2979, 2079, 1608, 1600, 2737], 2485)
-    femmesh.addVolume([438, 270, 1777, 1283, 1842, 1835, 1841, 2980, 1441, 2712], 2486)
-    femmesh.addVolume([271, 439, 1779, 2033, 1847, 1848, 1844, 2981, 2193, 2693], 2487)
-    femmesh.addVolume([439, 271, 1778, 2013, 1847, 1840, 1846, 2192, 2982, 2724], 2488)
-    femmesh.addVolume([269, 437, 1777, 1283, 1837, 1838, 1834, 1440, 2983, 2712], 2489)
-    femmesh.addVolume([359, 1264, 112, 1539, 2984, 1331, 1602, 1604, 2813, 1601], 2490)
-    femmesh.addVolume([360, 2033, 113, 1540, 2083, 2985, 1607, 1609, 2736, 1606], 2491)
-    femmesh.addVolume([358, 111, 2012, 1537, 1597, 2986, 2073, 1598, 1590, 2822], 2492)
-    femmesh.addVolume([437, 269, 1776, 1263, 1837, 1830, 1836, 2987, 1439, 2815], 2493)
-    femmesh.addVolume([1776, 2012, 437, 1263, 2816, 2188, 1836, 2815, 2988, 2987], 2494)
-    femmesh.addVolume([1777, 2032, 438, 1283, 2731, 2190, 1841, 2712, 2989, 2980], 2495)
-    femmesh.addVolume([1778, 1264, 270, 438, 2806, 1442, 1839, 1843, 2977, 1842], 2496)
-    femmesh.addVolume([2013, 113, 1264, 1539, 2979, 1330, 2978, 2737, 1600, 2813], 2497)
-    femmesh.addVolume([2033, 1284, 113, 1540, 2948, 1334, 2985, 2736, 2702, 1606], 2498)
-    femmesh.addVolume([1778, 271, 1264, 2013, 1840, 1443, 2806, 2724, 2982, 2978], 2499)
-    femmesh.addVolume([2032, 1777, 437, 1283, 2731, 1838, 2189, 2989, 2712, 2983], 2500)
-    femmesh.addVolume([1779, 1284, 271, 2033, 2721, 1444, 1844, 2693, 2948, 2981], 2501)
-    femmesh.addVolume([1264, 359, 2013, 1539, 2984, 2080, 2978, 2813, 1604, 2737], 2502)
-    femmesh.addVolume([1538, 112, 359, 1283, 1595, 1602, 1603, 2811, 1327, 2990], 2503)
-    femmesh.addVolume([1538, 2032, 111, 1283, 2738, 2976, 1596, 2811, 2989, 1328], 2504)
-    femmesh.addVolume([2032, 1538, 359, 1283, 2738, 1603, 2076, 2989, 2811, 2990], 2505)
-    femmesh.addVolume([1537, 111, 2012, 1263, 1590, 2986, 2822, 2821, 1324, 2988], 2506)
-    femmesh.addVolume([362, 1265, 2014, 1541, 2991, 2949, 2085, 1618, 2695, 2725], 2507)
-    femmesh.addVolume([116, 1285, 2034, 1542, 1339, 2903, 2992, 1615, 2739, 2735], 2508)
-    femmesh.addVolume([372, 1552, 1290, 125, 1669, 2690, 2927, 1667, 1666, 1370], 2509)
-    femmesh.addVolume([374, 1271, 1553, 127, 2993, 2741, 1678, 1677, 1372, 1670], 2510)
-    femmesh.addVolume([374, 1553, 1271, 2020, 1678, 2741, 2993, 2121, 2727, 2906], 2511)
-    femmesh.addVolume([361, 1265, 114, 1541, 2950, 1337, 1612, 1614, 2695, 1611], 2512)
-    femmesh.addVolume([370, 123, 1550, 2038, 1657, 1656, 1659, 2113, 2921, 2743], 2513)
-    femmesh.addVolume([121, 1268, 2017, 1547, 1354, 2944, 2994, 1640, 2734, 2723], 2514)
-    femmesh.addVolume([132, 2042, 1558, 1293, 2968, 2760, 1695, 1387, 2918, 2764], 2515)
-    femmesh.addVolume([130, 2041, 1556, 1292, 2967, 2742, 1685, 1381, 2917, 2812], 2516)
-    femmesh.addVolume([362, 115, 1265, 1541, 1617, 1336, 2991, 1618, 1610, 2695], 2517)
-    femmesh.addVolume([363, 2015, 116, 1543, 2092, 2925, 1622, 1624, 2748, 1621], 2518)
-    femmesh.addVolume([361, 114, 1284, 1540, 1612, 1333, 2995, 1613, 1605, 2702], 2519)
-    femmesh.addVolume([361, 1284, 2033, 1540, 2995, 2948, 2082, 1613, 2702, 2736], 2520)
-    femmesh.addVolume([115, 1542, 362, 1285, 1616, 1619, 1617, 1340, 2739, 2947], 2521)
-    femmesh.addVolume([120, 367, 1546, 2036, 1642, 1643, 1635, 2957, 2100, 2746], 2522)
-    femmesh.addVolume([126, 373, 1552, 2039, 1672, 1673, 1665, 2955, 2118, 2744], 2523)
-    femmesh.addVolume([365, 1267, 1545, 2016, 2958, 2692, 1634, 2098, 2959, 2753], 2524)
-    femmesh.addVolume([121, 1547, 2017, 368, 1640, 2723, 2994, 1647, 1648, 2103], 2525)
-    femmesh.addVolume([368, 1548, 1288, 121, 1649, 2710, 2961, 1647, 1646, 1358], 2526)
-    femmesh.addVolume([122, 369, 1548, 2037, 1652, 1653, 1645, 2953, 2106, 2718], 2527)
-    femmesh.addVolume([364, 117, 1544, 2035, 1627, 1626, 1629, 2095, 2930, 2751], 2528)
-    femmesh.addVolume([365, 1544, 1286, 2035, 1633, 2747, 2962, 2094, 2751, 2891], 2529)
-    femmesh.addVolume([119, 366, 1545, 2016, 1637, 1638, 1630, 2960, 2097, 2753], 2530)
-    femmesh.addVolume([373, 1271, 1553, 2020, 2923, 2741, 1674, 2122, 2906, 2727], 2531)
-    femmesh.addVolume([125, 372, 1551, 2019, 1667, 1668, 1660, 2942, 2115, 2755], 2532)
-    femmesh.addVolume([371, 1270, 1551, 2019, 2956, 2703, 1664, 2116, 2941, 2755], 2533)
-    femmesh.addVolume([376, 1272, 1555, 129, 2970, 2697, 1688, 1687, 1378, 1680], 2534)
-    femmesh.addVolume([116, 1542, 2034, 363, 1615, 2735, 2992, 1622, 1623, 2088], 2535)
-    femmesh.addVolume([131, 2022, 1557, 1273, 2969, 2700, 1690, 1384, 2901, 2766], 2536)
-    femmesh.addVolume([130, 1557, 2022, 1273, 1691, 2700, 2965, 1385, 2766, 2901], 2537)
-    femmesh.addVolume([374, 1554, 2040, 1291, 1679, 2765, 2125, 2975, 2814, 2893], 2538)
-    femmesh.addVolume([375, 1291, 1554, 128, 2973, 2814, 1683, 1682, 1375, 1675], 2539)
-    femmesh.addVolume([276, 1784, 1267, 2016, 1869, 2709, 1454, 2996, 2752, 2959], 2540)
-    femmesh.addVolume([278, 1786, 1268, 446, 1879, 2694, 1458, 1882, 1883, 2997], 2541)
-    femmesh.addVolume([448, 1288, 1787, 2037, 2934, 2719, 1891, 2210, 2952, 2749], 2542)
-    femmesh.addVolume([443, 1266, 1782, 2015, 2899, 2706, 1866, 2200, 2926, 2716], 2543)
-    femmesh.addVolume([451, 1270, 1790, 2019, 2896, 2711, 1906, 2216, 2941, 2730], 2544)
-    femmesh.addVolume([272, 1780, 1265, 440, 1849, 2707, 1446, 1852, 1853, 2998], 2545)
-    femmesh.addVolume([452, 284, 1791, 2039, 1912, 1905, 1911, 2218, 2931, 2754], 2546)
-    femmesh.addVolume([281, 1789, 1289, 449, 1894, 2717, 1464, 1897, 1898, 2999], 2547)
-    femmesh.addVolume([285, 2020, 1792, 453, 2910, 2728, 1910, 1917, 2220, 1916], 2548)
-    femmesh.addVolume([450, 1289, 1789, 2038, 2935, 2717, 1901, 2214, 2922, 2729], 2549)
-    femmesh.addVolume([440, 1780, 1265, 2014, 1853, 2707, 2998, 2195, 2733, 2949], 2550)
-    femmesh.addVolume([279, 1268, 1786, 2017, 1459, 2694, 1880, 2940, 2944, 2701], 2551)
-    femmesh.addVolume([279, 1787, 1288, 447, 1884, 2719, 1460, 1887, 1888, 3000], 2552)
-    femmesh.addVolume([446, 1786, 1268, 2017, 1883, 2694, 2997, 2207, 2701, 2944], 2553)
-    femmesh.addVolume([442, 1782, 1266, 2015, 1863, 2706, 2939, 2199, 2716, 2926], 2554)
-    femmesh.addVolume([273, 441, 1781, 1285, 1857, 1858, 1854, 1448, 2904, 2720], 2555)
-    femmesh.addVolume([280, 1788, 1269, 448, 1889, 2714, 1462, 1892, 1893, 2902], 2556)
-    femmesh.addVolume([449, 281, 1788, 2018, 1897, 1890, 1896, 2212, 2898, 2713], 2557)
-    femmesh.addVolume([442, 274, 1781, 1285, 1862, 1855, 1861, 2951, 1449, 2720], 2558)
-    femmesh.addVolume([441, 1265, 1780, 2014, 2938, 2707, 1856, 2196, 2949, 2733], 2559)
-    femmesh.addVolume([444, 1784, 276, 2016, 1873, 1869, 1872, 2203, 2752, 2996], 2560)
-    femmesh.addVolume([277, 445, 1785, 1287, 1877, 1878, 1874, 1456, 2909, 2740], 2561)
-    femmesh.addVolume([449, 1789, 1289, 2038, 1898, 2717, 2999, 2213, 2729, 2922], 2562)
-    femmesh.addVolume([450, 1790, 1270, 2019, 1903, 2711, 2892, 2215, 2730, 2941], 2563)
-    femmesh.addVolume([447, 1787, 1288, 2037, 1888, 2719, 3000, 2209, 2749, 2952], 2564)
-    femmesh.addVolume([445, 1267, 1784, 2016, 2920, 2709, 1876, 2204, 2959, 2752], 2565)
-    femmesh.addVolume([451, 1791, 1290, 2039, 1908, 2708, 2929, 2217, 2754, 2928], 2566)
-    femmesh.addVolume([290, 2023, 1798, 1274, 2913, 2776, 1939, 1482, 2964, 2798], 2567)
-    femmesh.addVolume([456, 1273, 2022, 1796, 2971, 2901, 2227, 1933, 2793, 2757], 2568)
-    femmesh.addVolume([456, 288, 1795, 1292, 1932, 1925, 1931, 2945, 1477, 2787], 2569)
-    femmesh.addVolume([290, 1797, 2042, 1293, 1935, 2785, 2972, 1481, 2789, 2918], 2570)
-    femmesh.addVolume([1298, 1807, 467, 299, 2807, 1988, 3001, 1500, 1984, 1987], 2571)
-    femmesh.addVolume([2046, 1566, 387, 140, 2771, 1743, 2160, 3002, 1735, 1742], 2572)
-    femmesh.addVolume([2026, 1804, 464, 296, 2777, 1973, 2243, 3003, 1969, 1972], 2573)
-    femmesh.addVolume([1560, 2043, 380, 1294, 2705, 2143, 1709, 2800, 2877, 3004], 2574)
-    femmesh.addVolume([2046, 1805, 465, 1297, 2779, 1978, 2245, 3005, 2780, 2883], 2575)
-    femmesh.addVolume([2047, 141, 1568, 1298, 2860, 1746, 2769, 2875, 1418, 2804], 2576)
-    femmesh.addVolume([2043, 1560, 381, 1294, 2705, 1713, 2142, 2877, 2800, 2859], 2577)
-    femmesh.addVolume([1563, 2025, 383, 136, 2761, 2152, 1724, 1721, 3006, 1722], 2578)
-    femmesh.addVolume([1294, 380, 1560, 133, 3004, 1709, 2800, 1394, 1707, 1706], 2579)
-    femmesh.addVolume([1561, 2024, 381, 134, 2762, 2146, 1714, 1711, 2872, 1712], 2580)
-    femmesh.addVolume([2024, 1561, 382, 135, 2762, 1718, 2145, 2865, 1710, 1717], 2581)
-    femmesh.addVolume([2025, 1563, 384, 1276, 2761, 1728, 2151, 3007, 2799, 2873], 2582)
-    femmesh.addVolume([1569, 1279, 389, 142, 2818, 3008, 1754, 1751, 1421, 1752], 2583)
-    femmesh.addVolume([2027, 1567, 388, 1278, 2770, 1748, 2163, 2889, 2802, 2871], 2584)
-    femmesh.addVolume([1296, 1564, 384, 2045, 2801, 1729, 2864, 2870, 2758, 2155], 2585)
-    femmesh.addVolume([1565, 385, 1277, 2026, 1734, 3009, 2805, 2698, 2158, 3010], 2586)
-    femmesh.addVolume([2026, 1565, 139, 1277, 2698, 1730, 2861, 3010, 2805, 1408], 2587)
-    femmesh.addVolume([1295, 1562, 382, 2044, 2759, 1719, 2867, 2886, 2774, 2149], 2588)
-    femmesh.addVolume([1295, 383, 1562, 2044, 2863, 1723, 2759, 2886, 2148, 2774], 2589)
-    femmesh.addVolume([1567, 2027, 387, 1278, 2770, 2164, 1744, 2802, 2889, 3011], 2590)
-    femmesh.addVolume([2045, 1803, 463, 295, 2778, 1968, 2241, 3012, 1964, 1967], 2591)
-    femmesh.addVolume([2027, 1806, 466, 298, 2772, 1983, 2247, 2888, 1979, 1982], 2592)
-    femmesh.addVolume([2046, 298, 1805, 1297, 3013, 1975, 2779, 3005, 1497, 2780], 2593)
-    femmesh.addVolume([1297, 1566, 2046, 140, 2803, 2771, 3005, 1411, 1735, 3002], 2594)
-    femmesh.addVolume([2024, 293, 461, 1800, 3014, 1957, 2236, 2768, 1950, 1956], 2595)
-    femmesh.addVolume([2023, 291, 459, 1798, 3015, 1947, 2232, 2776, 1940, 1946], 2596)
-    femmesh.addVolume([1278, 1806, 467, 2027, 2791, 1986, 2882, 2889, 2772, 2248], 2597)
-    femmesh.addVolume([1569, 2028, 389, 1279, 2817, 2170, 1754, 2818, 3016, 3008], 2598)
-    femmesh.addVolume([2046, 139, 1566, 1297, 2869, 1736, 2771, 3005, 1412, 2803], 2599)
-    femmesh.addVolume([1275, 1800, 460, 292, 2790, 1953, 3017, 1486, 1949, 1952], 2600)
-    femmesh.addVolume([2028, 1279, 1808, 300, 3016, 2796, 2782, 3018, 1502, 1989], 2601)
-    femmesh.addVolume([1277, 385, 1565, 138, 3009, 1734, 2805, 1409, 1732, 1731], 2602)
-    femmesh.addVolume([1298, 1568, 389, 142, 2804, 1753, 2874, 1417, 1745, 1752], 2603)
-    femmesh.addVolume([2023, 1559, 380, 1274, 2763, 1708, 2139, 2964, 2767, 2862], 2604)
-    femmesh.addVolume([2025, 136, 1563, 1276, 3006, 1721, 2761, 3007, 1403, 2799], 2605)
-    femmesh.addVolume([1567, 1278, 387, 140, 2802, 3011, 1744, 1741, 1415, 1742], 2606)
-    femmesh.addVolume([1803, 1296, 464, 296, 2797, 2884, 1971, 1965, 1493, 1972], 2607)
-    femmesh.addVolume([1802, 2025, 295, 1276, 2756, 2881, 1960, 2795, 3007, 1491], 2608)
-    femmesh.addVolume([1803, 2045, 1296, 295, 2778, 2870, 2797, 1964, 3012, 1492], 2609)
-    femmesh.addVolume([1799, 1294, 460, 292, 2784, 2876, 1951, 1945, 1485, 1952], 2610)
-    femmesh.addVolume([1805, 2046, 466, 298, 2779, 2246, 1981, 1975, 3013, 1982], 2611)
-    femmesh.addVolume([1802, 294, 2025, 1276, 1959, 2880, 2756, 2795, 1490, 3007], 2612)
-    femmesh.addVolume([1804, 1277, 2026, 297, 2808, 3010, 2777, 1970, 1495, 3019], 2613)
-    femmesh.addVolume([1804, 2026, 1277, 296, 2777, 3010, 2808, 1969, 3003, 1494], 2614)
-    femmesh.addVolume([1808, 468, 2028, 300, 1993, 2251, 2782, 1989, 1992, 3018], 2615)
-    femmesh.addVolume([1807, 2047, 468, 1298, 2781, 2250, 1991, 2807, 2875, 3020], 2616)
-    femmesh.addVolume([1808, 2028, 469, 1279, 2782, 2252, 1996, 2796, 3016, 2887], 2617)
-    femmesh.addVolume([1804, 2026, 465, 297, 2777, 2244, 1976, 1970, 3019, 1977], 2618)
-    femmesh.addVolume([1800, 2024, 293, 1275, 2768, 3014, 1950, 2790, 2866, 1487], 2619)
-    femmesh.addVolume([1800, 460, 2024, 1275, 1953, 2235, 2768, 2790, 3017, 2866], 2620)
-    femmesh.addVolume([1807, 467, 2047, 1298, 1988, 2249, 2781, 2807, 3001, 2875], 2621)
-    femmesh.addVolume([1807, 1298, 468, 300, 2807, 3020, 1991, 1985, 1501, 1992], 2622)
-    femmesh.addVolume([1798, 2023, 291, 1274, 2776, 3015, 1940, 2798, 2964, 1483], 2623)
-    femmesh.addVolume([2012, 1776, 436, 1263, 2816, 1833, 2187, 2988, 2815, 3021], 2624)
-    femmesh.addVolume([268, 436, 1776, 1263, 1832, 1833, 1829, 1438, 3021, 2815], 2625)
-    femmesh.addVolume([1279, 1569, 2028, 143, 2818, 2817, 3016, 1420, 1750, 3022], 2626)
-    femmesh.addVolume([436, 268, 1775, 2031, 1832, 1825, 1831, 2186, 3023, 2823], 2627)
-    femmesh.addVolume([2028, 1569, 390, 143, 2817, 1758, 2169, 3022, 1750, 1757], 2628)
-    femmesh.addVolume([1809, 2048, 470, 302, 2819, 2254, 2001, 1995, 3024, 2002], 2629)
-    femmesh.addVolume([301, 469, 1809, 1299, 1997, 1998, 1994, 1504, 3025, 2820], 2630)
-    femmesh.addVolume([110, 1537, 2012, 1263, 1591, 2822, 3026, 1325, 2821, 2988], 2631)
-    femmesh.addVolume([1809, 469, 2048, 1299, 1998, 2253, 2819, 2820, 3025, 2858], 2632)
-    femmesh.addVolume([1775, 268, 1282, 2031, 1825, 1437, 2824, 2823, 3023, 2856], 2633)
-    femmesh.addVolume([1811, 471, 2030, 1281, 2008, 2257, 2832, 2831, 2851, 2848], 2634)
-    femmesh.addVolume([302, 1809, 2048, 1299, 1995, 2819, 3024, 1505, 2820, 2858], 2635)
-    femmesh.addVolume([357, 2012, 110, 1537, 2074, 3026, 1592, 1594, 2822, 1591], 2636)
-    femmesh.addVolume([435, 267, 1774, 2011, 1827, 1821, 1826, 2183, 3027, 2830], 2637)
-    femmesh.addVolume([2048, 1570, 391, 1299, 2825, 1763, 2172, 2858, 2826, 3028], 2638)
-    femmesh.addVolume([1299, 1570, 391, 144, 2826, 1763, 3028, 1423, 1755, 1762], 2639)
-    femmesh.addVolume([2029, 1810, 470, 302, 2839, 2003, 2255, 3029, 1999, 2002], 2640)
-    femmesh.addVolume([1282, 1775, 435, 267, 2824, 1828, 3030, 1436, 1824, 1827], 2641)
-    femmesh.addVolume([435, 1775, 1282, 2031, 1828, 2824, 3030, 2185, 2823, 2856], 2642)
-    femmesh.addVolume([1262, 1774, 267, 2011, 2829, 1821, 1434, 2850, 2830, 3027], 2643)
-    femmesh.addVolume([302, 2029, 1810, 1280, 3029, 2839, 1999, 1506, 2853, 2840], 2644)
-    femmesh.addVolume([2029, 1571, 392, 1280, 2844, 1768, 2175, 2853, 2843, 3031], 2645)
-    femmesh.addVolume([2031, 1282, 109, 1536, 2856, 1322, 3032, 2838, 2837, 1586], 2646)
-    femmesh.addVolume([393, 1572, 146, 1281, 1771, 1765, 1770, 3033, 2834, 1429], 2647)
-    femmesh.addVolume([1280, 1571, 392, 145, 2843, 1768, 3031, 1426, 1760, 1767], 2648)
-    femmesh.addVolume([356, 2031, 109, 1536, 2071, 3032, 1587, 1589, 2838, 1586], 2649)
-    femmesh.addVolume([266, 434, 1774, 2011, 1822, 1823, 1820, 3034, 2182, 2830], 2650)
-    femmesh.addVolume([2029, 392, 2030, 1280, 2175, 2179, 2180, 2853, 3031, 3035], 2651)
-    femmesh.addVolume([1281, 472, 1811, 304, 3036, 2010, 2831, 1509, 2009, 2005], 2652)
-    femmesh.addVolume([12, 1773, 2051, 1523, 1816, 2683, 2062, 1527, 3037, 2677], 2653)
-    femmesh.addVolume([7, 1523, 1302, 1773, 1528, 2678, 1313, 1815, 3037, 2684], 2654)
-    femmesh.addVolume([2012, 2031, 110, 1263, 2075, 2855, 3026, 2988, 3038, 1325], 2655)
-    femmesh.addVolume([2031, 2011, 109, 1282, 2072, 2849, 3032, 2856, 3039, 1322], 2656)
-    femmesh.addVolume([2012, 436, 2031, 1263, 2187, 2186, 2075, 2988, 3021, 3038], 2657)
-    femmesh.addVolume([268, 2031, 436, 1263, 3023, 2186, 1832, 1438, 3038, 3021], 2658)
-    femmesh.addVolume([1810, 2029, 471, 1280, 2839, 2256, 2006, 2840, 2853, 3040], 2659)
-    femmesh.addVolume([1266, 116, 2034, 2015, 1343, 2992, 3041, 2926, 2925, 2093], 2660)
-    femmesh.addVolume([1266, 275, 1286, 443, 1451, 1452, 1347, 2899, 1867, 2890], 2661)
-    femmesh.addVolume([2042, 457, 1273, 1293, 2229, 2900, 3042, 2918, 2919, 1389], 2662)
-    femmesh.addVolume([2034, 116, 1266, 1285, 2992, 1343, 3041, 2903, 1339, 1344], 2663)
-    femmesh.addVolume([2017, 1288, 1268, 121, 3043, 1359, 2944, 2994, 1358, 1354], 2664)
-    femmesh.addVolume([1271, 2020, 285, 1291, 2906, 2910, 1471, 1377, 3044, 1472], 2665)
-    femmesh.addVolume([135, 382, 2024, 1295, 1717, 2145, 2865, 1400, 2867, 3045], 2666)
-    femmesh.addVolume([1271, 1291, 374, 2020, 1377, 2975, 2993, 2906, 3044, 2121], 2667)
-    femmesh.addVolume([369, 122, 1269, 2037, 1652, 1361, 2933, 2106, 2953, 3046], 2668)
-    femmesh.addVolume([124, 1289, 1270, 371, 1363, 1368, 1367, 1662, 2954, 2956], 2669)
-    femmesh.addVolume([1295, 2025, 383, 2044, 3047, 2152, 2863, 2886, 2153, 2148], 2670)
-    femmesh.addVolume([134, 2024, 381, 1294, 2872, 2146, 1712, 1393, 3048, 2859], 2671)
-    femmesh.addVolume([2025, 2045, 295, 1276, 2156, 3012, 2881, 3007, 3049, 1491], 2672)
-    femmesh.addVolume([1297, 2046, 1278, 140, 3005, 3050, 1416, 1411, 3002, 1415], 2673)
-    femmesh.addVolume([2046, 465, 2026, 1297, 2245, 2244, 2162, 3005, 2883, 3051], 2674)
-    femmesh.addVolume([2026, 139, 2046, 1297, 2861, 2869, 2162, 3051, 1412, 3005], 2675)
-    femmesh.addVolume([437, 2012, 2032, 1283, 2188, 2078, 2189, 2983, 3052, 2989], 2676)
-    femmesh.addVolume([111, 2012, 2032, 358, 2986, 2078, 2976, 1597, 2073, 2077], 2677)
-    femmesh.addVolume([2013, 1264, 2032, 359, 2978, 3053, 2081, 2080, 2984, 2076], 2678)
-    femmesh.addVolume([2041, 130, 2022, 1273, 2967, 2965, 2135, 3054, 1385, 2901], 2679)
-    femmesh.addVolume([369, 1269, 2018, 2037, 2933, 2897, 2110, 2106, 3046, 2111], 2680)
-    femmesh.addVolume([282, 1270, 1289, 450, 1466, 1368, 1465, 1902, 2892, 2935], 2681)
-    femmesh.addVolume([283, 1290, 1270, 451, 1468, 1371, 1467, 1907, 2929, 2896], 2682)
-    femmesh.addVolume([438, 1264, 270, 1283, 2977, 1442, 1842, 2980, 1332, 1441], 2683)
-    femmesh.addVolume([2044, 1295, 2025, 294, 2886, 3047, 2153, 2878, 1489, 2880], 2684)
-    femmesh.addVolume([1286, 2035, 444, 2016, 2891, 2202, 2936, 3055, 2099, 2203], 2685)
-    femmesh.addVolume([441, 273, 1265, 1285, 1857, 1447, 2938, 2904, 1448, 1341], 2686)
-    femmesh.addVolume([1268, 279, 1288, 2017, 1459, 1460, 1359, 2944, 2940, 3043], 2687)
-    femmesh.addVolume([2021, 1291, 1272, 286, 3056, 1380, 2911, 2916, 1473, 1474], 2688)
-    femmesh.addVolume([373, 126, 1271, 2039, 1672, 1373, 2923, 2118, 2955, 3057], 2689)
-    femmesh.addVolume([453, 285, 2020, 1291, 1917, 2910, 2220, 2894, 1472, 3044], 2690)
-    femmesh.addVolume([381, 2024, 2043, 1294, 2146, 2147, 2142, 2859, 3048, 2877], 2691)
-    femmesh.addVolume([371, 1289, 1270, 2038, 2954, 1368, 2956, 2112, 2922, 3058], 2692)
-    femmesh.addVolume([1283, 437, 2012, 1263, 2983, 2188, 3052, 1329, 2987, 2988], 2693)
-    femmesh.addVolume([445, 277, 1267, 1287, 1877, 1455, 2920, 2909, 1456, 1353], 2694)
-    femmesh.addVolume([1267, 1286, 276, 2016, 1350, 1453, 1454, 2959, 3055, 2996], 2695)
-    femmesh.addVolume([452, 1271, 284, 2039, 2905, 1470, 1912, 2218, 3057, 2931], 2696)
-    femmesh.addVolume([2013, 271, 1284, 2033, 2982, 1444, 3059, 2084, 2981, 2948], 2697)
-    femmesh.addVolume([281, 1289, 1269, 2018, 1464, 1365, 1463, 2898, 3060, 2897], 2698)
-    femmesh.addVolume([443, 1286, 1266, 2035, 2890, 1347, 2899, 2201, 2891, 3061], 2699)
-    femmesh.addVolume([2017, 120, 1268, 1287, 2943, 1355, 2944, 3062, 1351, 1356], 2700)
-    femmesh.addVolume([1265, 2034, 441, 1285, 3063, 2197, 2938, 1341, 2903, 2904], 2701)
-    femmesh.addVolume([1283, 269, 437, 1263, 1440, 1837, 2983, 1329, 1439, 2987], 2702)
-    femmesh.addVolume([1264, 271, 1284, 2013, 1443, 1444, 1335, 2978, 2982, 3059], 2703)
-    femmesh.addVolume([1284, 113, 1264, 2013, 1334, 1330, 1335, 3059, 2979, 2978], 2704)
-    femmesh.addVolume([271, 2013, 439, 2033, 2982, 2192, 1847, 2981, 2084, 2193], 2705)
-    femmesh.addVolume([2015, 1266, 442, 2034, 2926, 2939, 2199, 2093, 3041, 2198], 2706)
-    femmesh.addVolume([2034, 1266, 442, 1285, 3041, 2939, 2198, 2903, 1344, 2951], 2707)
-    femmesh.addVolume([272, 1265, 1284, 440, 1446, 1338, 1445, 1852, 2998, 2895], 2708)
-    femmesh.addVolume([2032, 1264, 438, 1283, 3053, 2977, 2190, 2989, 1332, 2980], 2709)
-    femmesh.addVolume([2015, 116, 2034, 363, 2925, 2992, 2093, 2092, 1622, 2088], 2710)
-    femmesh.addVolume([2014, 1265, 1284, 361, 2949, 1338, 3064, 2086, 2950, 2995], 2711)
-    femmesh.addVolume([2018, 449, 1289, 2038, 2212, 2999, 3060, 2114, 2213, 2922], 2712)
-    femmesh.addVolume([1269, 1288, 280, 448, 1362, 1461, 1462, 2902, 2934, 1892], 2713)
-    femmesh.addVolume([447, 1288, 279, 2017, 3000, 1460, 1887, 2208, 3043, 2940], 2714)
-    femmesh.addVolume([2017, 367, 120, 2036, 2104, 1642, 2943, 2105, 2100, 2957], 2715)
-    femmesh.addVolume([1290, 284, 1271, 2039, 1469, 1470, 1374, 2928, 2931, 3057], 2716)
-    femmesh.addVolume([1271, 126, 1290, 2039, 1373, 1369, 1374, 3057, 2955, 2928], 2717)
-    femmesh.addVolume([368, 2017, 1288, 2037, 2103, 3043, 2961, 2107, 2108, 2952], 2718)
-    femmesh.addVolume([2039, 1290, 451, 2019, 2928, 2929, 2217, 2120, 3065, 2216], 2719)
-    femmesh.addVolume([2038, 450, 1270, 2019, 2214, 2892, 3058, 2117, 2215, 2941], 2720)
-    femmesh.addVolume([2032, 438, 1264, 2013, 2190, 2977, 3053, 2081, 2191, 2978], 2721)
-    femmesh.addVolume([1267, 1286, 365, 118, 1350, 2962, 2958, 1349, 1345, 1632], 2722)
-    femmesh.addVolume([366, 119, 1287, 2016, 1637, 1352, 2937, 2097, 2960, 3066], 2723)
-    femmesh.addVolume([1287, 1267, 445, 2016, 1353, 2920, 2909, 3066, 2959, 2204], 2724)
-    femmesh.addVolume([1288, 448, 1269, 2037, 2934, 2902, 1362, 2952, 2210, 3046], 2725)
-    femmesh.addVolume([449, 1289, 281, 2018, 2999, 1464, 1897, 2212, 3060, 2898], 2726)
-    femmesh.addVolume([2018, 1269, 448, 2037, 2897, 2902, 2211, 2111, 3046, 2210], 2727)
-    femmesh.addVolume([2017, 447, 1288, 2037, 2208, 3000, 3043, 2108, 2209, 2952], 2728)
-    femmesh.addVolume([442, 1266, 274, 1285, 2939, 1450, 1862, 2951, 1344, 1449], 2729)
-    femmesh.addVolume([440, 1265, 1284, 2014, 2998, 1338, 2895, 2195, 2949, 3064], 2730)
-    femmesh.addVolume([1283, 2012, 111, 1263, 3052, 2986, 1328, 1329, 2988, 1324], 2731)
-    femmesh.addVolume([359, 1264, 2032, 1283, 2984, 3053, 2076, 2990, 1332, 2989], 2732)
-    femmesh.addVolume([2014, 1284, 440, 2033, 3064, 2895, 2195, 2087, 2948, 2194], 2733)
-    femmesh.addVolume([2014, 441, 1265, 2034, 2196, 2938, 2949, 2090, 2197, 3063], 2734)
-    femmesh.addVolume([114, 1284, 1265, 361, 1333, 1338, 1337, 1612, 2995, 2950], 2735)
-    femmesh.addVolume([113, 2013, 1284, 2033, 2979, 3059, 1334, 2985, 2084, 2948], 2736)
-    femmesh.addVolume([1284, 2033, 2014, 361, 2948, 2087, 3064, 2995, 2082, 2086], 2737)
-    femmesh.addVolume([2033, 113, 2013, 360, 2985, 2979, 2084, 2083, 1607, 2079], 2738)
-    femmesh.addVolume([117, 2035, 2015, 1266, 2930, 2096, 2932, 1342, 3061, 2926], 2739)
-    femmesh.addVolume([359, 112, 1264, 1283, 1602, 1331, 2984, 2990, 1327, 1332], 2740)
-    femmesh.addVolume([2012, 111, 2032, 1283, 2986, 2976, 2078, 3052, 1328, 2989], 2741)
-    femmesh.addVolume([362, 1265, 115, 1285, 2991, 1336, 1617, 2947, 1341, 1340], 2742)
-    femmesh.addVolume([1265, 362, 2034, 1285, 2991, 2089, 3063, 1341, 2947, 2903], 2743)
-    femmesh.addVolume([2034, 362, 1265, 2014, 2089, 2991, 3063, 2090, 2085, 2949], 2744)
-    femmesh.addVolume([446, 1268, 278, 1287, 2997, 1458, 1882, 2907, 1356, 1457], 2745)
-    femmesh.addVolume([1269, 122, 1288, 2037, 1361, 1357, 1362, 3046, 2953, 2952], 2746)
-    femmesh.addVolume([454, 2040, 2021, 1291, 2222, 2129, 2223, 2914, 2893, 3056], 2747)
-    femmesh.addVolume([1293, 2023, 290, 1274, 3067, 2913, 1481, 1392, 2964, 1482], 2748)
-    femmesh.addVolume([451, 1290, 1270, 2019, 2929, 1371, 2896, 2216, 3065, 2941], 2749)
-    femmesh.addVolume([125, 1270, 1290, 2019, 1366, 1371, 1370, 2942, 2941, 3065], 2750)
-    femmesh.addVolume([121, 2017, 1288, 368, 2994, 3043, 1358, 1647, 2103, 2961], 2751)
-    femmesh.addVolume([1289, 123, 2018, 2038, 1364, 2946, 3060, 2922, 2921, 2114], 2752)
-    femmesh.addVolume([2035, 1286, 365, 2016, 2891, 2962, 2094, 2099, 3055, 2098], 2753)
-    femmesh.addVolume([365, 1286, 1267, 2016, 2962, 1350, 2958, 2098, 3055, 2959], 2754)
-    femmesh.addVolume([1287, 119, 1267, 2016, 1352, 1348, 1353, 3066, 2960, 2959], 2755)
-    femmesh.addVolume([120, 1287, 2017, 2036, 1351, 3062, 2943, 2957, 2908, 2105], 2756)
-    femmesh.addVolume([2017, 446, 1287, 1268, 2207, 2907, 3062, 2944, 2997, 1356], 2757)
-    femmesh.addVolume([1287, 446, 2017, 2036, 2907, 2207, 3062, 2908, 2206, 2105], 2758)
-    femmesh.addVolume([117, 1266, 1286, 2035, 1342, 1347, 1346, 2930, 3061, 2891], 2759)
-    femmesh.addVolume([2015, 2035, 117, 364, 2096, 2930, 2932, 2091, 2095, 1627], 2760)
-    femmesh.addVolume([1266, 2015, 443, 2035, 2926, 2200, 2899, 3061, 2096, 2201], 2761)
-    femmesh.addVolume([444, 276, 1286, 2016, 1872, 1453, 2936, 2203, 2996, 3055], 2762)
-    femmesh.addVolume([445, 2036, 1287, 2016, 2205, 2908, 2909, 2204, 2102, 3066], 2763)
-    femmesh.addVolume([1287, 2036, 366, 2016, 2908, 2101, 2937, 3066, 2102, 2097], 2764)
-    femmesh.addVolume([2018, 123, 1289, 1269, 2946, 1364, 3060, 2897, 1360, 1365], 2765)
-    femmesh.addVolume([123, 370, 2018, 2038, 1657, 2109, 2946, 2921, 2113, 2114], 2766)
-    femmesh.addVolume([1270, 450, 2038, 1289, 2892, 2214, 3058, 1368, 2935, 2922], 2767)
-    femmesh.addVolume([1290, 2039, 372, 2019, 2928, 2119, 2927, 3065, 2120, 2115], 2768)
-    femmesh.addVolume([1290, 372, 125, 2019, 2927, 1667, 1370, 3065, 2115, 2942], 2769)
-    femmesh.addVolume([2038, 1270, 371, 2019, 3058, 2956, 2112, 2117, 2941, 2116], 2770)
-    femmesh.addVolume([131, 2042, 2022, 1273, 2966, 2138, 2969, 1384, 3042, 2901], 2771)
-    femmesh.addVolume([453, 2020, 2040, 1291, 2220, 2126, 2221, 2894, 3044, 2893], 2772)
-    femmesh.addVolume([2039, 452, 1271, 2020, 2218, 2905, 3057, 2123, 2219, 2906], 2773)
-    femmesh.addVolume([373, 2039, 1271, 2020, 2118, 3057, 2923, 2122, 2123, 2906], 2774)
-    femmesh.addVolume([1292, 455, 1272, 287, 2915, 2912, 1383, 1476, 1927, 1475], 2775)
-    femmesh.addVolume([1295, 2024, 135, 1275, 3045, 2865, 1400, 1401, 2866, 1396], 2776)
-    femmesh.addVolume([374, 2040, 2020, 1291, 2125, 2126, 2121, 2975, 2893, 3044], 2777)
-    femmesh.addVolume([290, 2042, 2023, 1293, 2972, 2141, 2913, 1481, 2918, 3067], 2778)
-    femmesh.addVolume([1294, 2024, 2043, 460, 3048, 2147, 2877, 2876, 2235, 2234], 2779)
-    femmesh.addVolume([1273, 2041, 130, 1292, 3054, 2967, 1385, 1386, 2917, 1381], 2780)
-    femmesh.addVolume([2024, 293, 1295, 2044, 3014, 1488, 3045, 2150, 2885, 2886], 2781)
-    femmesh.addVolume([2041, 456, 1273, 2022, 2226, 2971, 3054, 2135, 2227, 2901], 2782)
-    femmesh.addVolume([2041, 377, 2022, 130, 2130, 2134, 2135, 2967, 1692, 2965], 2783)
-    femmesh.addVolume([378, 2042, 2022, 131, 2137, 2138, 2133, 1697, 2966, 2969], 2784)
-    femmesh.addVolume([383, 136, 2025, 1295, 1722, 3006, 2152, 2863, 1399, 3047], 2785)
-    femmesh.addVolume([2025, 294, 1295, 1276, 2880, 1489, 3047, 3007, 1490, 1404], 2786)
-    femmesh.addVolume([295, 2045, 2025, 463, 3012, 2156, 2881, 1967, 2241, 2240], 2787)
-    femmesh.addVolume([1294, 134, 2024, 1275, 1393, 2872, 3048, 1398, 1397, 2866], 2788)
-    femmesh.addVolume([1276, 384, 1296, 137, 2873, 2864, 1407, 1402, 1727, 1406], 2789)
-    femmesh.addVolume([2027, 388, 2047, 1278, 2163, 2167, 2168, 2889, 2871, 3068], 2790)
-    femmesh.addVolume([1296, 385, 1277, 138, 2868, 3009, 1410, 1405, 1732, 1409], 2791)
-    femmesh.addVolume([1278, 141, 2047, 1298, 1414, 2860, 3068, 1419, 1418, 2875], 2792)
-    femmesh.addVolume([387, 1278, 2046, 140, 3011, 3050, 2160, 1742, 1415, 3002], 2793)
-    femmesh.addVolume([464, 2026, 1296, 2045, 2243, 3069, 2884, 2242, 2159, 2870], 2794)
-    femmesh.addVolume([1296, 385, 2026, 1277, 2868, 2158, 3069, 1410, 3009, 3010], 2795)
-    femmesh.addVolume([1296, 2026, 464, 296, 3069, 2243, 2884, 1493, 3003, 1972], 2796)
-    femmesh.addVolume([2026, 385, 1296, 2045, 2158, 2868, 3069, 2159, 2154, 2870], 2797)
-    femmesh.addVolume([468, 2047, 2028, 1298, 2250, 2171, 2251, 3020, 2875, 3070], 2798)
-    femmesh.addVolume([2026, 1277, 139, 1297, 3010, 1408, 2861, 3051, 1413, 1412], 2799)
-    femmesh.addVolume([139, 2046, 386, 2026, 2869, 2161, 1737, 2861, 2162, 2157], 2800)
-    femmesh.addVolume([2024, 1295, 382, 2044, 3045, 2867, 2145, 2150, 2886, 2149], 2801)
-    femmesh.addVolume([1272, 2041, 376, 2021, 3071, 2131, 2970, 2911, 2132, 2127], 2802)
-    femmesh.addVolume([1295, 293, 2024, 1275, 1488, 3014, 3045, 1401, 1487, 2866], 2803)
-    femmesh.addVolume([1297, 2026, 1277, 297, 3051, 3010, 1413, 1496, 3019, 1495], 2804)
-    femmesh.addVolume([466, 2046, 2027, 298, 2246, 2165, 2247, 1982, 3013, 2888], 2805)
-    femmesh.addVolume([461, 2024, 2044, 293, 2236, 2150, 2237, 1957, 3014, 2885], 2806)
-    femmesh.addVolume([1298, 467, 1278, 299, 3001, 2882, 1419, 1500, 1987, 1499], 2807)
-    femmesh.addVolume([2025, 462, 2044, 294, 2239, 2238, 2153, 2880, 1962, 2878], 2808)
-    femmesh.addVolume([2026, 1297, 465, 297, 3051, 2883, 2244, 3019, 1496, 1977], 2809)
-    femmesh.addVolume([141, 2047, 388, 1278, 2860, 2167, 1747, 1414, 3068, 2871], 2810)
-    femmesh.addVolume([2026, 1296, 1277, 296, 3069, 1410, 3010, 3003, 1493, 1494], 2811)
-    femmesh.addVolume([387, 2027, 2046, 1278, 2164, 2165, 2160, 3011, 2889, 3050], 2812)
-    femmesh.addVolume([1298, 2028, 468, 300, 3070, 2251, 3020, 1501, 3018, 1992], 2813)
-    femmesh.addVolume([459, 2023, 2043, 291, 2232, 2144, 2233, 1947, 3015, 2879], 2814)
-    femmesh.addVolume([2045, 384, 1296, 1276, 2155, 2864, 2870, 3049, 2873, 1407], 2815)
-    femmesh.addVolume([458, 2042, 2023, 290, 2230, 2141, 2231, 1942, 2972, 2913], 2816)
-    femmesh.addVolume([1273, 456, 2041, 1292, 2971, 2226, 3054, 1386, 2945, 2917], 2817)
-    femmesh.addVolume([1273, 457, 2042, 2022, 2900, 2229, 3042, 2901, 2228, 2138], 2818)
-    femmesh.addVolume([1292, 1272, 2041, 129, 1383, 3071, 2917, 1382, 1378, 2974], 2819)
-    femmesh.addVolume([1272, 455, 2041, 2021, 2912, 2225, 3071, 2911, 2224, 2132], 2820)
-    femmesh.addVolume([1273, 131, 2042, 1293, 1384, 2966, 3042, 1389, 1388, 2918], 2821)
-    femmesh.addVolume([291, 2023, 2043, 1274, 3015, 2144, 2879, 1483, 2964, 3072], 2822)
-    femmesh.addVolume([288, 456, 1273, 1292, 1932, 2971, 1478, 1477, 2945, 1386], 2823)
-    femmesh.addVolume([2041, 455, 1272, 1292, 2225, 2912, 3071, 2917, 2915, 1383], 2824)
-    femmesh.addVolume([1291, 2021, 454, 286, 3056, 2223, 2914, 1473, 2916, 1922], 2825)
-    femmesh.addVolume([1291, 2021, 375, 2040, 3056, 2128, 2973, 2893, 2129, 2124], 2826)
-    femmesh.addVolume([2041, 1272, 376, 129, 3071, 2970, 2131, 2974, 1378, 1687], 2827)
-    femmesh.addVolume([1296, 295, 2045, 1276, 1492, 3012, 2870, 1407, 1491, 3049], 2828)
-    femmesh.addVolume([2024, 460, 1294, 1275, 2235, 2876, 3048, 2866, 3017, 1398], 2829)
-    femmesh.addVolume([389, 2028, 2047, 1298, 2170, 2171, 2166, 2874, 3070, 2875], 2830)
-    femmesh.addVolume([2047, 467, 1278, 1298, 2249, 2882, 3068, 2875, 3001, 1419], 2831)
-    femmesh.addVolume([1278, 467, 2047, 2027, 2882, 2249, 3068, 2889, 2248, 2168], 2832)
-    femmesh.addVolume([1279, 2028, 1298, 300, 3016, 3070, 1422, 1502, 3018, 1501], 2833)
-    femmesh.addVolume([2046, 298, 1278, 2027, 3013, 1498, 3050, 2165, 2888, 2889], 2834)
-    femmesh.addVolume([1278, 298, 2046, 1297, 1498, 3013, 3050, 1416, 1497, 3005], 2835)
-    femmesh.addVolume([457, 1273, 1293, 289, 2900, 1389, 2919, 1937, 1479, 1480], 2836)
-    femmesh.addVolume([1275, 460, 1294, 292, 3017, 2876, 1398, 1486, 1952, 1485], 2837)
-    femmesh.addVolume([380, 2043, 2023, 1274, 2143, 2144, 2139, 2862, 3072, 2964], 2838)
-    femmesh.addVolume([1294, 1274, 380, 133, 1395, 2862, 3004, 1394, 1390, 1707], 2839)
-    femmesh.addVolume([291, 2043, 1294, 1274, 2879, 2877, 1484, 1483, 3072, 1395], 2840)
-    femmesh.addVolume([2042, 2023, 132, 379, 2141, 2963, 2968, 2136, 2140, 1702], 2841)
-    femmesh.addVolume([2023, 132, 1293, 2042, 2963, 1387, 3067, 2141, 2968, 2918], 2842)
-    femmesh.addVolume([384, 2045, 2025, 1276, 2155, 2156, 2151, 2873, 3049, 3007], 2843)
-    femmesh.addVolume([1293, 132, 2023, 1274, 1387, 2963, 3067, 1392, 1391, 2964], 2844)
-    femmesh.addVolume([380, 1274, 1294, 2043, 2862, 1395, 3004, 2143, 3072, 2877], 2845)
-    femmesh.addVolume([2025, 1295, 136, 1276, 3047, 1399, 3006, 3007, 1404, 1403], 2846)
-    femmesh.addVolume([374, 1291, 1271, 127, 2975, 1377, 2993, 1677, 1376, 1372], 2847)
-    femmesh.addVolume([375, 2021, 1291, 128, 2128, 3056, 2973, 1682, 2924, 1375], 2848)
-    femmesh.addVolume([1272, 1291, 2021, 128, 1380, 3056, 2911, 1379, 1375, 2924], 2849)
-    femmesh.addVolume([389, 1298, 1279, 2028, 2874, 1422, 3008, 2170, 3070, 3016], 2850)
-    femmesh.addVolume([1279, 1298, 389, 142, 1422, 2874, 3008, 1421, 1417, 1752], 2851)
-    femmesh.addVolume([1279, 2028, 2048, 143, 3016, 2174, 3073, 1420, 3022, 2857], 2852)
-    femmesh.addVolume([110, 2031, 2012, 357, 2855, 2075, 3026, 1592, 2070, 2074], 2853)
-    femmesh.addVolume([2031, 1282, 110, 1263, 2856, 1321, 2855, 3038, 1326, 1325], 2854)
-    femmesh.addVolume([1279, 2048, 1299, 143, 3073, 2858, 1425, 1420, 2857, 1424], 2855)
-    femmesh.addVolume([390, 2048, 2028, 143, 2173, 2174, 2169, 1757, 2857, 3022], 2856)
-    femmesh.addVolume([469, 2028, 2048, 1279, 2252, 2174, 2253, 2887, 3016, 3073], 2857)
-    femmesh.addVolume([469, 1299, 301, 1279, 3025, 1504, 1997, 2887, 1425, 1503], 2858)
-    femmesh.addVolume([2031, 268, 1282, 1263, 3023, 1437, 2856, 3038, 1438, 1326], 2859)
-    femmesh.addVolume([1810, 1280, 471, 303, 2840, 3040, 2006, 2000, 1507, 2007], 2860)
-    femmesh.addVolume([391, 2029, 2048, 1299, 2176, 2177, 2172, 3028, 3074, 2858], 2861)
-    femmesh.addVolume([2048, 1299, 469, 1279, 2858, 3025, 2253, 3073, 1425, 2887], 2862)
-    femmesh.addVolume([2030, 1281, 1280, 145, 2848, 1431, 3035, 2847, 1430, 1426], 2863)
-    femmesh.addVolume([1280, 392, 2030, 145, 3031, 2179, 3035, 1426, 1767, 2847], 2864)
-    femmesh.addVolume([435, 1282, 267, 2011, 3030, 1436, 1827, 2183, 3039, 3027], 2865)
-    femmesh.addVolume([2011, 435, 1282, 2031, 2183, 3030, 3039, 2072, 2185, 2856], 2866)
-    femmesh.addVolume([1299, 391, 1280, 144, 3028, 2854, 1428, 1423, 1762, 1427], 2867)
-    femmesh.addVolume([1280, 2029, 391, 1299, 2853, 2176, 2854, 1428, 3074, 3028], 2868)
-    femmesh.addVolume([470, 2048, 2029, 302, 2254, 2177, 2255, 2002, 3024, 3029], 2869)
-    femmesh.addVolume([2030, 1572, 393, 1281, 2833, 1771, 2178, 2848, 2834, 3033], 2870)
-    femmesh.addVolume([2030, 471, 2029, 1280, 2257, 2256, 2180, 3035, 3040, 2853], 2871)
-    femmesh.addVolume([302, 2048, 2029, 1299, 3024, 2177, 3029, 1505, 2858, 3074], 2872)
-    femmesh.addVolume([109, 2011, 2031, 356, 2849, 2072, 3032, 1587, 2067, 2071], 2873)
-    femmesh.addVolume([1282, 109, 1262, 2011, 1322, 1318, 1323, 3039, 2849, 2850], 2874)
-    femmesh.addVolume([1281, 471, 1280, 303, 2851, 3040, 1431, 1508, 2007, 1507], 2875)
-    femmesh.addVolume([2029, 1280, 302, 1299, 2853, 1506, 3029, 3074, 1428, 1505], 2876)
-    femmesh.addVolume([267, 1282, 1262, 2011, 1436, 1323, 1434, 3027, 3039, 2850], 2877)
-    femmesh.addVolume([1280, 2030, 471, 1281, 3035, 2257, 3040, 1431, 2848, 2851], 2878)
-    femmesh.addVolume([1774, 1262, 266, 2011, 2829, 1433, 1820, 2830, 2850, 3034], 2879)
-    femmesh.addVolume([472, 2030, 2051, 1302, 2258, 2259, 2064, 3075, 3076, 3077], 2880)
-    femmesh.addVolume([1300, 2049, 1533, 1511, 3078, 2841, 2842, 2686, 2685, 2845], 2881)
-    femmesh.addVolume([1811, 2030, 472, 1281, 2832, 2258, 2010, 2831, 2848, 3036], 2882)
-    femmesh.addVolume([1522, 2050, 1534, 1301, 2681, 2828, 2846, 2682, 3079, 2827], 2883)
-    femmesh.addVolume([1262, 266, 2052, 1303, 1433, 3081, 3080, 1435, 1309, 3082], 2884)
-    femmesh.addVolume([1772, 1303, 1512, 2052, 2687, 2679, 2852, 2688, 3082, 2680], 2885)
-    femmesh.addVolume([2051, 1523, 1773, 1302, 2677, 3037, 2683, 3077, 2678, 2684], 2886)
-    femmesh.addVolume([2050, 1281, 146, 1301, 3084, 1429, 3083, 3079, 1432, 1312], 2887)
-    femmesh.addVolume([1302, 472, 1281, 304, 3075, 3036, 1510, 1315, 2009, 1509], 2888)
-    femmesh.addVolume([266, 2052, 434, 2011, 3081, 2058, 1822, 3034, 2184, 2182], 2889)
-    femmesh.addVolume([146, 1281, 2050, 393, 1429, 3084, 3083, 1770, 3033, 2061], 2890)
-    femmesh.addVolume([1281, 2030, 472, 1302, 2848, 2258, 3036, 1510, 3076, 3075], 2891)
-    femmesh.addVolume([2052, 266, 1262, 2011, 3081, 1433, 3080, 2184, 3034, 2850], 2892)
-    femmesh.addVolume([2030, 393, 2050, 1281, 2178, 2061, 2181, 2848, 3033, 3084], 2893)
-    femmesh.addVolume([2050, 2051, 2030, 1302, 2066, 2259, 2181, 3085, 3077, 3076], 2894)
-    femmesh.addVolume([2051, 1773, 472, 1302, 2683, 1819, 2064, 3077, 2684, 3075], 2895)
-    femmesh.addVolume([266, 1772, 2052, 1303, 1814, 2688, 3081, 1309, 2687, 3082], 2896)
-    femmesh.addVolume([2050, 1302, 1281, 1301, 3085, 1510, 3084, 3079, 1317, 1432], 2897)
-    femmesh.addVolume([1523, 2051, 22, 1302, 2677, 3086, 1529, 2678, 3077, 1314], 2898)
-    femmesh.addVolume([14, 1512, 1303, 2052, 1518, 2679, 1307, 3087, 2680, 3082], 2899)
-    femmesh.addVolume([1302, 22, 2050, 2051, 1314, 3088, 3085, 3077, 3086, 2066], 2900)
-    femmesh.addVolume([1300, 14, 346, 1511, 1305, 1521, 3089, 2686, 1515, 1519], 2901)
-    femmesh.addVolume([1303, 2052, 1262, 1300, 3082, 3080, 1435, 1316, 3090, 1320], 2902)
-    femmesh.addVolume([2050, 146, 1534, 1301, 3083, 1578, 2828, 3079, 1312, 2827], 2903)
-    femmesh.addVolume([22, 2050, 1522, 1301, 3088, 2681, 1526, 1310, 3079, 2682], 2904)
-    femmesh.addVolume([1300, 346, 2049, 1511, 3089, 2054, 3078, 2686, 1519, 2685], 2905)
-    femmesh.addVolume([2050, 22, 1522, 351, 3088, 1526, 2681, 2059, 1532, 1530], 2906)
-    femmesh.addVolume([2049, 1533, 355, 1300, 2841, 1579, 2055, 3078, 2842, 3091], 2907)
-    femmesh.addVolume([2052, 14, 1512, 346, 3087, 1518, 2680, 2056, 1521, 1520], 2908)
-    femmesh.addVolume([2051, 22, 351, 1523, 3086, 1532, 2063, 2677, 1529, 1531], 2909)
-    femmesh.addVolume([2050, 22, 1302, 1301, 3088, 1314, 3085, 3079, 1310, 1317], 2910)
-    femmesh.addVolume([2052, 1772, 266, 434, 2688, 1814, 3081, 2058, 1818, 1822], 2911)
-    femmesh.addVolume([1302, 1773, 472, 304, 2684, 1819, 3075, 1315, 1817, 2009], 2912)
-    femmesh.addVolume([14, 2052, 1303, 1300, 3087, 3082, 1307, 1305, 3090, 1316], 2913)
-    femmesh.addVolume([22, 351, 2050, 2051, 1532, 2059, 3088, 3086, 2063, 2066], 2914)
-    femmesh.addVolume([1262, 2052, 2049, 1300, 3080, 2065, 3092, 1320, 3090, 3078], 2915)
-    femmesh.addVolume([393, 146, 1534, 2050, 1770, 1578, 1580, 2061, 3083, 2828], 2916)
-    femmesh.addVolume([2030, 1281, 2050, 1302, 2848, 3084, 2181, 3076, 1510, 3085], 2917)
-    femmesh.addVolume([1533, 108, 355, 1300, 1575, 1583, 1579, 2842, 1306, 3091], 2918)
-    femmesh.addVolume([1522, 11, 6, 1534, 1525, 350, 1524, 2846, 1576, 1577], 2919)
-    femmesh.addVolume([1512, 10, 3, 1772, 1517, 349, 1516, 2852, 1812, 1813], 2920)
-    femmesh.addVolume([1773, 12, 7, 1523, 1816, 354, 1815, 3037, 1527, 1528], 2921)
-    femmesh.addVolume([14, 346, 2052, 1300, 1521, 2056, 3087, 1305, 3089, 3090], 2922)
-    femmesh.addVolume([2049, 2052, 346, 1300, 2065, 2056, 2054, 3078, 3090, 3089], 2923)
-    femmesh.addVolume([2, 1533, 9, 1511, 1573, 1574, 345, 1514, 2845, 1513], 2924)
-    femmesh.addVolume([2049, 2052, 1262, 2011, 2065, 3080, 3092, 2069, 2184, 2850], 2925)
-    femmesh.addVolume([355, 1262, 2011, 2049, 3093, 2850, 2068, 2055, 3092, 2069], 2926)
-    femmesh.addVolume([1262, 355, 2011, 1535, 3093, 2068, 2850, 2836, 1584, 2835], 2927)
-    femmesh.addVolume([1262, 355, 1300, 2049, 3093, 3091, 1320, 3092, 2055, 3078], 2928)
-    femmesh.addVolume([108, 355, 1262, 1535, 1583, 3093, 1319, 1582, 1584, 2836], 2929)
-    femmesh.addVolume([108, 1262, 355, 1300, 1319, 3093, 1583, 1306, 1320, 3091], 2930)
-    return True
@@ -1,65 +0,0 @@
-def create_nodes(femmesh):
-    # nodes
-    femmesh.addNode(203.2, 25.4, 0.0, 1)
-    femmesh.addNode(203.2, 25.4, 25.4, 2)
-    femmesh.addNode(203.2, 0.0, 0.0, 3)
-    femmesh.addNode(203.2, 0.0, 25.4, 4)
-    femmesh.addNode(0.0, 25.4, 0.0, 5)
-    femmesh.addNode(0.0, 25.4, 25.4, 6)
-    femmesh.addNode(0.0, 0.0, 0.0, 7)
-    femmesh.addNode(0.0, 0.0, 25.4, 8)
-    femmesh.addNode(98.3488, 25.4, 25.4, 9)
-    femmesh.addNode(102.616, 0.0, 25.4, 10)
-    femmesh.addNode(98.3488, 25.4, 0.0, 11)
-    femmesh.addNode(102.616, 0.0, 0.0, 12)
-    femmesh.addNode(0.0, 12.7, 25.4, 13)
-    femmesh.addNode(49.1744, 25.4, 25.4, 14)
-    femmesh.addNode(150.774, 25.4, 25.4, 15)
-    femmesh.addNode(203.2, 12.7, 25.4, 16)
-    femmesh.addNode(51.308, 0.0, 25.4, 17)
-    femmesh.addNode(152.908, 0.0, 25.4, 18)
-    femmesh.addNode(0.0, 12.7, 0.0, 19)
-    femmesh.addNode(49.1744, 25.4, 0.0, 20)
-    femmesh.addNode(150.774, 25.4, 0.0, 21)
-    femmesh.addNode(203.2, 12.7, 0.0, 22)
-    femmesh.addNode(51.308, 0.0, 0.0, 23)
-    femmesh.addNode(152.908, 0.0, 0.0, 24)
-    femmesh.addNode(203.2, 25.4, 12.7, 25)
-    femmesh.addNode(0.0, 25.4, 12.7, 26)
-    femmesh.addNode(203.2, 0.0, 12.7, 27)
-    femmesh.addNode(0.0, 0.0, 12.7, 28)
-    femmesh.addNode(0.0, 12.7, 12.7, 29)
-    femmesh.addNode(51.308, 12.7, 25.4, 30)
-    femmesh.addNode(100.482, 12.7, 25.4, 31)
-    femmesh.addNode(152.908, 12.7, 25.4, 32)
-    femmesh.addNode(51.308, 12.7, 0.0, 33)
-    femmesh.addNode(100.482, 12.7, 0.0, 34)
-    femmesh.addNode(152.908, 12.7, 0.0, 35)
-    femmesh.addNode(203.2, 12.7, 12.7, 36)
-    femmesh.addNode(49.1744, 25.4, 12.7, 37)
-    femmesh.addNode(150.774, 25.4, 12.7, 38)
-    femmesh.addNode(98.3488, 25.4, 12.7, 39)
-    femmesh.addNode(51.308, 0.0, 12.7, 40)
-    femmesh.addNode(152.908, 0.0, 12.7, 41)
-    femmesh.addNode(102.616, 0.0, 12.7, 42)
-    femmesh.addNode(51.308, 12.7, 12.7, 43)
-    femmesh.addNode(100.482, 12.7, 12.7, 44)
-    femmesh.addNode(152.908, 12.7, 12.7, 45)
-    return True
-
-
-def create_elements(femmesh):
-    # elements
-    femmesh.addVolume([6, 5, 12, 11, 26, 33, 43, 37, 20, 34], 1)
-    femmesh.addVolume([12, 9, 11, 2, 44, 39, 34, 45, 15, 38], 2)
-    femmesh.addVolume([4, 3, 1, 12, 27, 22, 36, 41, 24, 35], 3)
-    femmesh.addVolume([12, 2, 11, 1, 45, 38, 34, 35, 25, 21], 4)
-    femmesh.addVolume([12, 2, 1, 4, 45, 25, 35, 41, 16, 36], 5)
-    femmesh.addVolume([12, 9, 2, 10, 44, 15, 45, 42, 31, 32], 6)
-    femmesh.addVolume([12, 2, 4, 10, 45, 16, 41, 42, 32, 18], 7)
-    femmesh.addVolume([12, 9, 10, 6, 44, 31, 42, 43, 14, 30], 8)
-    femmesh.addVolume([12, 9, 6, 11, 44, 14, 43, 34, 39, 37], 9)
-    femmesh.addVolume([7, 6, 5, 12, 29, 26, 19, 23, 43, 33], 10)
-    femmesh.addVolume([7, 8, 6, 12, 28, 13, 29, 23, 40, 43], 11)
-    femmesh.addVolume([10, 12, 6, 8, 42, 43, 30, 17, 40, 13], 12)
-    return True
@@ -28,14 +28,12 @@ setup()
 
 """
 
-
 import FreeCAD
 from FreeCAD import Rotation
 from FreeCAD import Vector
 
 from BOPTools import SplitFeatures
 
-import Fem
 import ObjectsFem
 
 from . import manager
@@ -211,14 +209,8 @@ def setup(doc=None, solvertype="ccxtools"):
     analysis.addObject(con_temp)
 
     # mesh
-    from .meshes.mesh_thermomech_bimetall_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes import create_femmesh
+    fem_mesh = create_femmesh("mesh_thermomech_bimetall_tetra10")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
@@ -27,7 +27,6 @@ from FreeCAD import Vector as vec
 
 from Draft import makeWire
 
-import Fem
 import ObjectsFem
 
 from . import manager
@@ -254,14 +253,8 @@ def setup(doc=None, solvertype="ccxtools"):
     analysis.addObject(self_weight)
 
     # mesh
-    from .meshes.mesh_thermomech_flow1d_seg3 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes import create_femmesh
+    fem_mesh = create_femmesh("mesh_thermomech_flow1d_seg3")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
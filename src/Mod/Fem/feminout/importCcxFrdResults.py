@@ -33,6 +33,8 @@ __url__ = "https://www.freecadweb.org"
 
 import os
 
+import numpy as np
+
 import FreeCAD
 from FreeCAD import Console
 
@@ -70,8 +72,15 @@ def importFrd(
     filename,
     analysis=None,
     result_name_prefix="",
-    result_analysis_type=""
+    result_analysis_type="",
+    steps=None,
+    indexed_reader=False
 ):
+    """
+    steps: list of result step indices (0 based, in frd file order) to import.
+    If steps is given or indexed_reader is True the frd file is read with the
+    indexed array reader, only the requested steps are parsed.
+    """
     import ObjectsFem
     from . import importToolsFem
 
@@ -80,12 +89,24 @@ def importFrd(
     else:
         doc = FreeCAD.ActiveDocument
 
-    m = read_frd_result(filename)
+    if steps is not None or indexed_reader is True:
+        frd_index = index_frd_result(filename)
+        m = read_frd_mesh_arrays(filename, frd_index)
+        number_of_increments = len(frd_index["Steps"])
+        result_sets = iter_frd_result_steps(filename, steps, frd_index)
+        make_femmesh = importToolsFem.make_femmesh_from_arrays
+        fill_femresult = importToolsFem.fill_femresult_mechanical_from_arrays
+    else:
+        m = read_frd_result(filename)
+        number_of_increments = len(m["Results"])
+        result_sets = m["Results"]
+        make_femmesh = importToolsFem.make_femmesh
+        fill_femresult = importToolsFem.fill_femresult_mechanical
     result_mesh_object = None
     res_obj = None
 
     if len(m["Nodes"]) > 0:
-        mesh = importToolsFem.make_femmesh(m)
+        mesh = make_femmesh(m)
         result_mesh_object = ObjectsFem.makeMeshResult(
             doc,
             "ResultMesh"
@@ -94,12 +115,11 @@ def importFrd(
         res_mesh_is_compacted = False
         nodenumbers_for_compacted_mesh = []
 
-        number_of_increments = len(m["Results"])
         Console.PrintLog(
             "Increments: " + str(number_of_increments) + "\n"
         )
-        if len(m["Results"]) > 0:
-            for result_set in m["Results"]:
+        if number_of_increments > 0:
+            for result_set in result_sets:
                 if "number" in result_set:
                     eigenmode_number = result_set["number"]
                 else:
@@ -133,7 +153,7 @@ def importFrd(
 
                 res_obj = ObjectsFem.makeResultMechanical(doc, results_name)
                 res_obj.Mesh = result_mesh_object
-                res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+                res_obj = fill_femresult(res_obj, result_set)
                 if analysis:
                     # need to be here, becasause later on, the analysis objs are needed
                     # see fill of principal stresses
@@ -141,7 +161,6 @@ def importFrd(
 
                 # more result object calculations
                 from femresult import resulttools
-                from femtools import femutils
                 if not res_obj.MassFlowRate:
                     # information 1:
                     # only compact result if not Flow 1D results
@@ -165,36 +184,9 @@ def importFrd(
 
                 # fill DisplacementLengths
                 res_obj = resulttools.add_disp_apps(res_obj)
-                # fill vonMises
-                res_obj = resulttools.add_von_mises(res_obj)
-                # fill principal stress
-                # if material reinforced object use add additional values to the res_obj
-                if res_obj.getParentGroup():
-                    has_reinforced_mat = False
-                    for obj in res_obj.getParentGroup().Group:
-                        if femutils.is_of_type(obj, "Fem::MaterialReinforced"):
-                            has_reinforced_mat = True
-                            Console.PrintLog(
-                                "Reinforced material object detected, "
-                                "reinforced principal stresses and standard principal "
-                                "stresses will be added.\n"
-                            )
-                            resulttools.add_principal_stress_reinforced(res_obj)
-                            break
-                    if has_reinforced_mat is False:
-                        Console.PrintLog(
-                            "No reinforced material object detected, "
-                            "standard principal stresses will be added.\n"
-                        )
-                        # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                        res_obj = resulttools.add_principal_stress_std(res_obj)
-                else:
-                    Console.PrintLog(
-                        "No Analysis detected, standard principal stresses will be added.\n"
-                    )
-                    # if a pure frd file was opened no analysis and thus no parent group
-                    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                    res_obj = resulttools.add_principal_stress_std(res_obj)
+                # fill vonMises, principal stress and max shear
+                # if material reinforced object in analysis reinforced values are added
+                res_obj = resulttools.add_stress_results(res_obj)
                 # fill Stats
                 res_obj = resulttools.fill_femresult_stats(res_obj)
 
@@ -788,3 +780,342 @@ def read_frd_result(
         "Penta15Elem": elements_penta15,
         "Results": results
     }
+
+
+# ********* indexed array reader *********
+# the frd file is scanned once to get the byte offsets of the node, element
+# and result blocks, afterwards only the requested blocks are parsed
+# into numpy arrays by fixed width column slicing
+
+# frd element type: (FreeCAD element key, number of nodes, frd to FreeCAD node order)
+# for the node order see comments in read_frd_result
+FRD_ELEMENT_TYPES = {
+    1: ("Hexa8Elem", 8, (5, 6, 7, 4, 1, 2, 3, 0)),
+    2: ("Penta6Elem", 6, (4, 5, 3, 1, 2, 0)),
+    3: ("Tetra4Elem", 4, (1, 0, 2, 3)),
+    4: ("Hexa20Elem", 20, (
+        7, 4, 5, 6, 3, 0, 1, 2, 19, 16, 17, 18, 11, 8, 9, 10, 15, 12, 13, 14
+    )),
+    5: ("Penta15Elem", 15, (4, 5, 3, 1, 2, 0, 13, 14, 12, 7, 8, 6, 10, 11, 9)),
+    6: ("Tetra10Elem", 10, (1, 0, 2, 3, 4, 6, 5, 8, 7, 9)),
+    7: ("Tria3Elem", 3, (0, 1, 2)),
+    8: ("Tria6Elem", 6, (0, 1, 2, 3, 4, 5)),
+    9: ("Quad4Elem", 4, (0, 1, 2, 3)),
+    10: ("Quad8Elem", 8, (0, 1, 2, 3, 4, 5, 6, 7)),
+    11: ("Seg2Elem", 2, (0, 1)),
+    12: ("Seg3Elem", 3, (0, 1, 2)),
+}
+
+# (frd result block name, result_set key, number of components)
+FRD_RESULT_BLOCKS = (
+    ("DISP", "disp", 3),
+    ("STRESS", "stress", 6),
+    ("TOSTRAIN", "strain", 6),
+    ("PE", "peeq", 1),
+    ("NDTEMP", "temp", 1),
+    ("MAFLOW", "mflow", 1),
+    ("STPRES", "npressure", 1),
+)
+
+
+def index_frd_result(
+    frd_input
+):
+    """Scan a frd file once and return the byte ranges of its blocks.
+
+    Returns a dict with the keys:
+    "Nodes" and "Elements": (start, end) byte range or None
+    "Steps": list of dicts with the keys "number", "time" and "blocks",
+    blocks maps the result_set key (disp, stress, ...) to a (start, end) byte range.
+    The steps are separated the same way read_frd_result does it,
+    a new step starts if the eigenmode or the time increases.
+    """
+    frd_index = {"Nodes": None, "Elements": None, "Steps": []}
+    step = None
+    eigenmode = 0
+    timestep = 0
+    mode_eigen_changed = False
+    mode_time_changed = False
+    mode_time_found = False
+    block_key = None
+    block_start = 0
+    offset = 0
+    with pyopen(frd_input, "rb") as frd_file:
+        for line in frd_file:
+            line_start = offset
+            offset += len(line)
+
+            if line[1:3] == b"-1" or line[1:3] == b"-2":
+                # data line, most of the lines in a frd file
+                continue
+            elif line[4:6] == b"2C" or line[4:6] == b"3C":
+                block_key = "Nodes" if line[4:6] == b"2C" else "Elements"
+                block_start = offset
+            elif line[5:10] == b"PMODE":
+                eigentemp = int(line[30:36])
+                if eigentemp > eigenmode:
+                    eigenmode = eigentemp
+                    mode_eigen_changed = True
+            elif line[4:10] == b"1PSTEP":
+                mode_time_found = True
+            elif mode_time_found and line[2:7] == b"100CL":
+                timetemp = float(line[13:25])
+                if timetemp > timestep:
+                    timestep = timetemp
+                    mode_time_changed = True
+                mode_time_found = False
+            elif line[1:3] == b"-4":
+                name = line[5:13].decode()
+                block_key = None
+                for frd_name, key, ncomp in FRD_RESULT_BLOCKS:
+                    if name.startswith(frd_name):
+                        block_key = key
+                        break
+                if step is None or mode_eigen_changed or mode_time_changed:
+                    step = {
+                        "number": eigenmode if mode_eigen_changed else float("NaN"),
+                        "time": timestep if mode_time_changed else float("NaN"),
+                        "blocks": {},
+                    }
+                    frd_index["Steps"].append(step)
+                    mode_eigen_changed = False
+                    mode_time_changed = False
+                block_start = offset
+            elif line[1:3] == b"-3":
+                if block_key in ("Nodes", "Elements"):
+                    frd_index[block_key] = (block_start, line_start)
+                elif block_key is not None:
+                    step["blocks"][block_key] = (block_start, line_start)
+                block_key = None
+            elif line[1:5] == b"9999":
+                break
+    return frd_index
+
+
+def read_frd_mesh_arrays(
+    frd_input,
+    frd_index=None
+):
+    """Read the mesh of a frd file into numpy arrays.
+
+    Returns a dict which can be used by importToolsFem.make_femmesh_from_arrays.
+    "Nodes" is a (n, 3) float array, "NodeNumbers" the node ids.
+    Every element key ("Tetra10Elem", ...) is a (n, nodes per element) int array,
+    the element ids are in the key with the suffix "Numbers" ("Tetra10ElemNumbers").
+    """
+    if frd_index is None:
+        frd_index = index_frd_result(frd_input)
+    inout_nodes = _read_frd_inout_nodes(frd_input)
+    mesh_arrays = {
+        "Nodes": np.empty((0, 3), dtype=float),
+        "NodeNumbers": np.empty(0, dtype=int),
+    }
+    with pyopen(frd_input, "rb") as frd_file:
+        if frd_index["Nodes"] is not None:
+            lines = _read_frd_block_lines(frd_file, frd_index["Nodes"], b"-1")
+            chars = _frd_char_matrix(lines, 49)
+            mesh_arrays["NodeNumbers"] = _frd_column(chars, 3, 13, int)
+            mesh_arrays["Nodes"] = _frd_float_columns(chars, 3)
+        if frd_index["Elements"] is not None:
+            mesh_arrays.update(_read_frd_element_arrays(
+                frd_file,
+                frd_index["Elements"],
+                inout_nodes
+            ))
+    if not len(mesh_arrays["Nodes"]):
+        Console.PrintError("FEM: No nodes found in Frd file.\n")
+    return mesh_arrays
+
+
+def iter_frd_result_steps(
+    frd_input,
+    steps=None,
+    frd_index=None
+):
+    """Generator which parses the result steps of a frd file one after the other.
+
+    steps: list of step indices to parse, None parses all steps.
+    Every yielded result_set has the keys "number" and "time"
+    and a (node numbers, values) tuple of numpy arrays for every result
+    found in the step (disp, stress, strain, peeq, temp, mflow, npressure).
+    The stress and strain tensor components are in FreeCAD order
+    (xx, yy, zz, xy, xz, yz), the mass flow is converted to kg/s.
+    """
+    if frd_index is None:
+        frd_index = index_frd_result(frd_input)
+    if steps is None:
+        steps = range(len(frd_index["Steps"]))
+    inout_nodes = _read_frd_inout_nodes(frd_input)
+    with pyopen(frd_input, "rb") as frd_file:
+        for step_index in steps:
+            step = frd_index["Steps"][step_index]
+            result_set = {"number": step["number"], "time": step["time"]}
+            for key, byte_range in step["blocks"].items():
+                result_set[key] = _read_frd_result_block(
+                    frd_file,
+                    byte_range,
+                    key,
+                    inout_nodes
+                )
+            yield result_set
+
+
+def _read_frd_inout_nodes(
+    frd_input
+):
+    inout_nodes = []
+    inout_nodes_file = frd_input.rsplit(".", 1)[0] + "_inout_nodes.txt"
+    if os.path.exists(inout_nodes_file):
+        with pyopen(inout_nodes_file, "r") as f:
+            for line in f:
+                a = line.split(",")
+                inout_nodes.append((int(a[1]), int(a[2])))
+    return inout_nodes
+
+
+def _read_frd_block_lines(
+    frd_file,
+    byte_range,
+    marker
+):
+    frd_file.seek(byte_range[0])
+    block = frd_file.read(byte_range[1] - byte_range[0])
+    return [line for line in block.splitlines() if line[1:3] == marker]
+
+
+def _frd_char_matrix(
+    lines,
+    width
+):
+    # every line as one row of a fixed width byte matrix
+    # columns are sliced out of it and converted by numpy at once
+    if not lines:
+        return np.empty((0, width), dtype="S1")
+    buf = b"".join(line[:width].ljust(width) for line in lines)
+    return np.frombuffer(buf, dtype="S1").reshape(len(lines), width)
+
+
+def _frd_column(
+    chars,
+    start,
+    end,
+    dtype
+):
+    column = np.ascontiguousarray(chars[:, start:end])
+    return column.view("S{}".format(end - start)).ravel().astype(dtype)
+
+
+def _frd_float_columns(
+    chars,
+    ncomp
+):
+    return np.column_stack([
+        _frd_column(chars, 13 + 12 * i, 25 + 12 * i, float) for i in range(ncomp)
+    ])
+
+
+def _read_frd_element_arrays(
+    frd_file,
+    byte_range,
+    inout_nodes
+):
+    frd_file.seek(byte_range[0])
+    block = frd_file.read(byte_range[1] - byte_range[0])
+    lines = [line for line in block.splitlines() if line[1:3] in (b"-1", b"-2")]
+    if not lines:
+        return {}
+    chars = _frd_char_matrix(lines, 103)
+    is_first_line = (chars[:, 2] == b"1")
+    first_rows = np.flatnonzero(is_first_line)
+    node_rows = np.flatnonzero(~is_first_line)
+    elem_ids = _frd_column(chars[first_rows], 3, 13, int)
+    elem_types = _frd_column(chars[first_rows], 14, 18, int)
+    # the node lines of an element follow its first line
+    # thus the index of the first node line of every element is
+    # the number of node lines of all elements before
+    node_line_end = np.searchsorted(node_rows, np.append(first_rows[1:], len(lines)))
+    node_line_start = np.concatenate(([0], node_line_end[:-1]))
+
+    element_arrays = {}
+    for elem_type, (key, nnodes, node_order) in FRD_ELEMENT_TYPES.items():
+        sel = np.flatnonzero(elem_types == elem_type)
+        if not len(sel):
+            continue
+        columns = []
+        for line_index in range((nnodes + 9) // 10):
+            rows = node_rows[node_line_start[sel] + line_index]
+            for i in range(min(10, nnodes - 10 * line_index)):
+                columns.append(_frd_column(chars[rows], 3 + 10 * i, 13 + 10 * i, int))
+        conn = np.column_stack(columns)[:, node_order]
+        ids = elem_ids[sel]
+        if elem_type == 12 and inout_nodes:
+            # 1D flow D elements, see read_frd_result
+            ids, conn = _apply_frd_inout_nodes_seg3(ids, conn, inout_nodes)
+        element_arrays[key] = conn
+        element_arrays[key + "Numbers"] = ids
+    return element_arrays
+
+
+def _apply_frd_inout_nodes_seg3(
+    ids,
+    conn,
+    inout_nodes
+):
+    # only elements with an inlet or outlet node are kept
+    # the same as it is done in read_frd_result
+    keep = np.zeros(len(ids), dtype=bool)
+    new_conn = conn.copy()
+    for frd_node, inout_node in inout_nodes:
+        # fluid inlet node numbering
+        inlet = conn[:, 0] == frd_node
+        new_conn[inlet, 0] = inout_node
+        new_conn[inlet, 1] = conn[inlet, 2]
+        new_conn[inlet, 2] = conn[inlet, 0]
+        # fluid outlet node numbering
+        outlet = ~inlet & (conn[:, 2] == frd_node)
+        new_conn[outlet] = conn[outlet]
+        new_conn[outlet, 1] = inout_node
+        keep |= inlet | outlet
+    return ids[keep], new_conn[keep]
+
+
+def _read_frd_result_block(
+    frd_file,
+    byte_range,
+    key,
+    inout_nodes
+):
+    ncomp = dict((k, n) for name, k, n in FRD_RESULT_BLOCKS)[key]
+    lines = _read_frd_block_lines(frd_file, byte_range, b"-1")
+    chars = _frd_char_matrix(lines, 13 + 12 * ncomp)
+    node_numbers = _frd_column(chars, 3, 13, int)
+    values = _frd_float_columns(chars, ncomp)
+    if ncomp == 6:
+        # CalculiX frd files: (xx, yy, zz, xy, yz, zx)
+        # FreeCAD:            (xx, yy, zz, xy, xz, yz)
+        values = values[:, (0, 1, 2, 3, 5, 4)]
+    elif ncomp == 1:
+        values = values[:, 0]
+    if key == "mflow":
+        values = values * 1000  # convert units to kg/s from t/s
+    if key in ("mflow", "npressure") and inout_nodes:
+        # the value of the frd node is copied to its inout node
+        # node order and values are kept the same as in read_frd_result
+        for frd_node, inout_node in inout_nodes:
+            positions = np.flatnonzero(node_numbers == frd_node)
+            if not len(positions):
+                continue
+            position = positions[0]
+            existing = np.flatnonzero(node_numbers == inout_node)
+            if len(existing) and existing[0] < position:
+                values[existing[0]] = values[position]
+                continue
+            value = values[position]
+            if len(existing):
+                # a later frd line of the inout node overwrites the value
+                value = values[existing[0]]
+                node_numbers = np.delete(node_numbers, existing[0])
+                values = np.delete(values, existing[0])
+            node_numbers = np.insert(node_numbers, position + 1, inout_node)
+            values = np.insert(values, position + 1, value)
+    return node_numbers, values
@@ -0,0 +1,188 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FreeCAD NumPy Mesh reader and writer for FEM workbench"
+__author__ = "FreeCAD Developers"
+__url__ = "https://www.freecadweb.org"
+
+## @package importNumpyMesh
+#  \ingroup FEM
+#  \brief FreeCAD NumPy Mesh reader and writer for FEM workbench
+#
+# the mesh is saved as compressed NumPy archive (npz) with the arrays
+# Nodes: node coordinates (n, 3), NodeNumbers: node ids (n)
+# Tetra10Elem: element nodes (m, 10), Tetra10ElemNumbers: element ids (m)
+# and the same for all other element types, see importToolsFem.make_arrays_from_femmesh
+# GroupNames, GroupElementTypes and Group0, Group1, ...: mesh groups with their element ids
+
+import os
+
+import numpy as np
+
+import FreeCAD
+from FreeCAD import Console
+
+from . import importToolsFem
+
+
+# ************************************************************************************************
+# ********* generic FreeCAD import and export methods ********************************************
+# names are fix given from FreeCAD, these methods are called from FreeCAD
+# they are set in FEM modules Init.py
+
+if open.__module__ == "__builtin__":
+    # because we'll redefine open below (Python2)
+    pyopen = open
+elif open.__module__ == "io":
+    # because we'll redefine open below (Python3)
+    pyopen = open
+
+
+def open(
+    filename
+):
+    """called when freecad opens a file
+    a FEM mesh object is created in a new document"""
+
+    docname = os.path.splitext(os.path.basename(filename))[0]
+    return insert(filename, docname)
+
+
+def insert(
+    filename,
+    docname
+):
+    """called when freecad wants to import a file"
+    a FEM mesh object is created in a existing document"""
+
+    try:
+        doc = FreeCAD.getDocument(docname)
+    except NameError:
+        doc = FreeCAD.newDocument(docname)
+    FreeCAD.ActiveDocument = doc
+
+    import_numpy_mesh(filename)
+    return doc
+
+
+def export(
+    objectslist,
+    filename
+):
+    "called when freecad exports a file"
+    if len(objectslist) != 1:
+        Console.PrintError("This exporter can only export one object.\n")
+        return
+    obj = objectslist[0]
+    if not obj.isDerivedFrom("Fem::FemMeshObject"):
+        Console.PrintError("No FEM mesh object selected.\n")
+        return
+
+    write(obj.FemMesh, filename)
+
+
+# ************************************************************************************************
+# ********* module specific methods **************************************************************
+# reader:
+# - a method uses a FemMesh instance, creates the FEM mesh document object and
+#     returns this object
+# - a method reads the arrays from file and creates a FemMesh instance out of them
+#
+# writer:
+# - a method directly writes a FemMesh to the mesh file
+
+# ********* reader *******************************************************************************
+def import_numpy_mesh(
+    filename
+):
+    """read a FemMesh from a NumPy mesh file
+    insert a FreeCAD FEM Mesh object in the ActiveDocument
+    return the FEM mesh document object
+    """
+
+    mesh_name = os.path.basename(os.path.splitext(filename)[0])
+
+    mesh_object = None
+    femmesh = read(filename)
+    if femmesh:
+        mesh_object = FreeCAD.ActiveDocument.addObject(
+            "Fem::FemMeshObject",
+            mesh_name
+        )
+        mesh_object.FemMesh = femmesh
+
+    return mesh_object
+
+
+def read(
+    filename
+):
+    """read a FemMesh from a NumPy mesh file and return the FemMesh
+    """
+    # no document object is created, just the FemMesh is returned
+
+    with np.load(filename) as npz_file:
+        mesh_arrays = {key: npz_file[key] for key in npz_file.files}
+
+    femmesh = importToolsFem.make_femmesh_from_arrays(mesh_arrays)
+
+    if "GroupNames" in mesh_arrays:
+        for i, (name, element_type) in enumerate(zip(
+            mesh_arrays["GroupNames"].tolist(),
+            mesh_arrays["GroupElementTypes"].tolist()
+        )):
+            group_id = femmesh.addGroup(name, element_type)
+            femmesh.addGroupElements(group_id, mesh_arrays["Group{}".format(i)].tolist())
+
+    return femmesh
+
+
+# ********* writer *******************************************************************************
+def write(
+    fem_mesh,
+    filename
+):
+    """directly write a FemMesh to a NumPy mesh file
+    fem_mesh: a FemMesh"""
+
+    if not fem_mesh.isDerivedFrom("Fem::FemMesh"):
+        Console.PrintError("Not a FemMesh was given as parameter.\n")
+        return
+
+    mesh_arrays = importToolsFem.make_arrays_from_femmesh(fem_mesh)
+
+    groups = fem_mesh.Groups
+    if groups:
+        mesh_arrays["GroupNames"] = np.array([fem_mesh.getGroupName(g) for g in groups])
+        mesh_arrays["GroupElementTypes"] = np.array(
+            [fem_mesh.getGroupElementType(g) for g in groups]
+        )
+        for i, group in enumerate(groups):
+            mesh_arrays["Group{}".format(i)] = np.array(
+                fem_mesh.getGroupElements(group),
+                dtype=np.int64
+            )
+
+    # a file object, because with a file name NumPy would add the extension npz
+    with pyopen(filename, "wb") as f:
+        np.savez_compressed(f, **mesh_arrays)
@@ -29,6 +29,8 @@ __url__ = "https://www.freecadweb.org"
 #  \ingroup FEM
 #  \brief FreeCAD FEM import tools
 
+import numpy as np
+
 import FreeCAD
 from FreeCAD import Console
 
@@ -245,6 +247,99 @@ def make_femmesh(
     return mesh
 
 
+def make_femmesh_from_arrays(
+    mesh_arrays
+):
+    """ makes an FreeCAD FEM Mesh object from FEM Mesh numpy arrays
+    the format is the one of importCcxFrdResults.read_frd_mesh_arrays
+    and of make_arrays_from_femmesh
+    """
+    import Fem
+    mesh = Fem.FemMesh()
+    m = mesh_arrays
+    if ("Nodes" in m) and (len(m["Nodes"]) > 0):
+        FreeCAD.Console.PrintLog("Found: nodes\n")
+        for i, n in zip(m["NodeNumbers"].tolist(), m["Nodes"].tolist()):
+            mesh.addNode(n[0], n[1], n[2], i)
+        elem_count = []
+        for key, add_element in (
+            ("Hexa8Elem", mesh.addVolume),
+            ("Penta6Elem", mesh.addVolume),
+            ("Tetra4Elem", mesh.addVolume),
+            ("Tetra10Elem", mesh.addVolume),
+            ("Penta15Elem", mesh.addVolume),
+            ("Hexa20Elem", mesh.addVolume),
+            ("Tria3Elem", mesh.addFace),
+            ("Tria6Elem", mesh.addFace),
+            ("Quad4Elem", mesh.addFace),
+            ("Quad8Elem", mesh.addFace),
+            ("Seg2Elem", mesh.addEdge),
+            ("Seg3Elem", mesh.addEdge),
+        ):
+            if key not in m:
+                continue
+            for i, e in zip(m[key + "Numbers"].tolist(), m[key].tolist()):
+                add_element(e, i)
+            elem_count.append("{} {}".format(len(m[key]), key))
+        if elem_count:
+            Console.PrintLog(
+                "imported mesh: {} nodes, {}\n"
+                .format(len(m["Nodes"]), ", ".join(elem_count))
+            )
+        else:
+            Console.PrintError("No Elements found!\n")
+    else:
+        Console.PrintError("No Nodes found!\n")
+    return mesh
+
+
+def make_arrays_from_femmesh(
+    femmesh
+):
+    """
+    Converts FemMesh into numpy arrays which can immediately used
+    from importToolsFem.make_femmesh_from_arrays(mesh_arrays) to create a valid FEM mesh.
+    """
+    # the arrays can be saved and reloaded by numpy
+    # see importNumpyMesh for a implementation
+
+    len_to_edge = {2: "Seg2Elem", 3: "Seg3Elem"}
+    len_to_face = {3: "Tria3Elem", 6: "Tria6Elem", 4: "Quad4Elem", 8: "Quad8Elem"}
+    len_to_volume = {
+        4: "Tetra4Elem",
+        10: "Tetra10Elem",
+        8: "Hexa8Elem",
+        20: "Hexa20Elem",
+        6: "Penta6Elem",
+        15: "Penta15Elem"
+    }
+
+    elements = {}
+    for element_ids, len_to_key in (
+        (femmesh.Edges, len_to_edge),
+        (femmesh.Faces, len_to_face),
+        (femmesh.Volumes, len_to_volume),
+    ):
+        for e in element_ids:
+            t = femmesh.getElementNodes(e)
+            numbers, nodes = elements.setdefault(len_to_key[len(t)], ([], []))
+            numbers.append(e)
+            nodes.append(t)
+
+    femnodes_mesh = femmesh.Nodes
+    mesh_arrays = {
+        "Nodes": np.array(
+            [(v.x, v.y, v.z) for v in femnodes_mesh.values()],
+            dtype=np.float64
+        ).reshape(-1, 3),
+        "NodeNumbers": np.array(list(femnodes_mesh.keys()), dtype=np.int64),
+    }
+    for key, (numbers, nodes) in elements.items():
+        mesh_arrays[key] = np.array(nodes, dtype=np.int64)
+        mesh_arrays[key + "Numbers"] = np.array(numbers, dtype=np.int64)
+    return mesh_arrays
+
+
 def make_dict_from_femmesh(
     femmesh
 ):
@@ -468,3 +563,80 @@ def fill_femresult_mechanical(
             res_obj.Time = step_time
 
     return res_obj
+
+
+def fill_femresult_mechanical_from_arrays(
+    res_obj,
+    result_set
+):
+    """ fills a FreeCAD FEM mechanical result object with result data
+    the result_set values are (node numbers, values) numpy array tuples
+    as they are returned by importCcxFrdResults.iter_frd_result_steps
+    """
+    if "number" in result_set:
+        eigenmode_number = result_set["number"]
+    else:
+        eigenmode_number = 0
+
+    if "time" in result_set:
+        step_time = result_set["time"]
+        step_time = round(step_time, 2)
+
+    if "disp" in result_set:
+        node_numbers, disp = result_set["disp"]
+        number_of_nodes = len(node_numbers)
+        res_obj.DisplacementVectors = list(map(tuple, disp.tolist()))
+        res_obj.NodeNumbers = node_numbers.tolist()
+
+        if "stress" in result_set:
+            stress = result_set["stress"][1]
+            res_obj.NodeStressXX = stress[:, 0].tolist()
+            res_obj.NodeStressYY = stress[:, 1].tolist()
+            res_obj.NodeStressZZ = stress[:, 2].tolist()
+            res_obj.NodeStressXY = stress[:, 3].tolist()
+            res_obj.NodeStressXZ = stress[:, 4].tolist()
+            res_obj.NodeStressYZ = stress[:, 5].tolist()
+
+        if "strain" in result_set:
+            strain = result_set["strain"][1]
+            res_obj.NodeStrainXX = strain[:, 0].tolist()
+            res_obj.NodeStrainYY = strain[:, 1].tolist()
+            res_obj.NodeStrainZZ = strain[:, 2].tolist()
+            res_obj.NodeStrainXY = strain[:, 3].tolist()
+            res_obj.NodeStrainXZ = strain[:, 4].tolist()
+            res_obj.NodeStrainYZ = strain[:, 5].tolist()
+
+        if "peeq" in result_set:
+            peeq = result_set["peeq"][1]
+            if len(peeq) > 0:
+                if len(peeq) != number_of_nodes:
+                    Console.PrintError("PEEQ seams to have exptra nodes.\n")
+                res_obj.Peeq = peeq[:number_of_nodes].tolist()
+
+        if eigenmode_number > 0:
+            res_obj.Eigenmode = eigenmode_number
+
+        # see fill_femresult_mechanical
+        if "temp" in result_set:
+            temperature = result_set["temp"][1]
+            if len(temperature) > 0:
+                if len(temperature) != number_of_nodes:
+                    Console.PrintError("Temperature seams to have exptra nodes.\n")
+                res_obj.Temperature = temperature[:number_of_nodes].tolist()
+                res_obj.Time = step_time
+
+    if "mflow" in result_set:
+        node_numbers, mass_flow = result_set["mflow"]
+        if len(mass_flow) > 0:
+            res_obj.MassFlowRate = mass_flow.tolist()
+            res_obj.Time = step_time
+            # disp does not exist, res_obj.NodeNumbers needs to be set
+            res_obj.NodeNumbers = node_numbers.tolist()
+
+    if "npressure" in result_set:
+        network_pressure = result_set["npressure"][1]
+        if len(network_pressure) > 0:
+            res_obj.NetworkPressure = network_pressure.tolist()
+            res_obj.Time = step_time
+
+    return res_obj
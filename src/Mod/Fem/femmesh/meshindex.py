@@ -0,0 +1,218 @@
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FreeCAD FEM mesh adjacency index"
+__author__ = "FreeCAD Developers"
+__url__ = "https://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+from itertools import chain
+
+import numpy as np
+
+import FreeCAD
+
+
+# CalculiX element face masks of volume elements
+# {number of element nodes: {bit pattern of the face nodes: ccx face number}}
+# the bit at position i is set if the i-th node of the element is a face node
+# see meshtools.get_ccxelement_faces_from_binary_search for more information
+# the order of the faces is the order the faces are returned
+CCX_VOLUME_FACE_MASKS = {
+    4: {  # tet4
+        7: 1,
+        11: 2,
+        13: 3,
+        14: 4},
+    6: {  # pent6
+        56: 1,
+        7: 2,
+        54: 3,
+        45: 4,
+        27: 5},
+    8: {  # hex8
+        240: 1,
+        15: 2,
+        102: 3,
+        204: 4,
+        153: 5,
+        51: 6},
+    10: {  # tet10
+        119: 1,
+        411: 2,
+        717: 3,
+        814: 4},
+    15: {  # pent15
+        3640: 1,
+        455: 2,
+        25782: 3,
+        22829: 4,
+        12891: 5},
+    20: {  # hex20
+        61680: 1,
+        3855: 2,
+        402022: 3,
+        804044: 4,
+        624793: 5,
+        201011: 6},
+}
+
+
+class FemMeshIndex(object):
+    """Node and element adjacency of a femelement_table in compressed sparse row arrays
+
+    The index is built once from the femelement_table
+    { elementid : [ nodeid, nodeid, ... , nodeid ] }
+    see meshtools.get_femelement_table() and can be shared by all
+    constraints which search elements or element faces by nodes.
+
+    element to nodes:
+        element_ids[i] has the nodes
+        element_nodes[element_nodes_ptr[i]:element_nodes_ptr[i + 1]]
+    node to elements:
+        node_ids[j] is used by the elements with the indices
+        node_elements[node_elements_ptr[j]:node_elements_ptr[j + 1]]
+        at the node positions node_element_positions[...] inside these elements
+    """
+
+    def __init__(self, femelement_table):
+        count = len(femelement_table)
+        self.element_ids = np.fromiter(femelement_table.keys(), dtype=np.int64, count=count)
+        self.element_node_counts = np.fromiter(
+            (len(nodes) for nodes in femelement_table.values()),
+            dtype=np.int64,
+            count=count
+        )
+        self.element_nodes_ptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(self.element_node_counts, out=self.element_nodes_ptr[1:])
+        self.element_nodes = np.fromiter(
+            chain.from_iterable(femelement_table.values()),
+            dtype=np.int64,
+            count=self.element_nodes_ptr[-1]
+        )
+
+        # element index and node position inside the element for every entry of element_nodes
+        entry_elements = np.repeat(np.arange(count), self.element_node_counts)
+        entry_positions = (
+            np.arange(len(self.element_nodes))
+            - np.repeat(self.element_nodes_ptr[:-1], self.element_node_counts)
+        )
+
+        # node to elements, a stable sort keeps the element order for every node
+        order = np.argsort(self.element_nodes, kind="stable")
+        self.node_ids, node_element_counts = np.unique(
+            self.element_nodes[order],
+            return_counts=True
+        )
+        self.node_elements_ptr = np.zeros(len(self.node_ids) + 1, dtype=np.int64)
+        np.cumsum(node_element_counts, out=self.node_elements_ptr[1:])
+        self.node_elements = entry_elements[order]
+        self.node_element_positions = entry_positions[order]
+
+        FreeCAD.Console.PrintLog(
+            "FemMeshIndex: {} elements, {} nodes\n"
+            .format(len(self.element_ids), len(self.node_ids))
+        )
+
+    def get_element_nodes(self, element_index):
+        """nodes of the element with the index element_index (not the element id)"""
+        start = self.element_nodes_ptr[element_index]
+        end = self.element_nodes_ptr[element_index + 1]
+        return self.element_nodes[start:end]
+
+    def get_element_bit_patterns(self, node_set):
+        """Returns (element indices, bit patterns) of all elements which use a node of node_set
+
+        The bit at position i of the pattern is set
+        if the i-th node of the element is in node_set.
+        It is the same information as in meshtools.get_bit_pattern_dict()
+        but only elements which use at least one node of node_set are returned.
+        """
+        nodes = np.unique(np.asarray(list(node_set), dtype=np.int64))
+        node_indices = np.searchsorted(self.node_ids, nodes)
+        found = node_indices < len(self.node_ids)
+        found[found] = self.node_ids[node_indices[found]] == nodes[found]
+        node_indices = node_indices[found]
+
+        # gather the node_elements ranges of all nodes at once
+        starts = self.node_elements_ptr[node_indices]
+        lengths = self.node_elements_ptr[node_indices + 1] - starts
+        entries = (
+            np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            + np.arange(lengths.sum())
+        )
+        elements = self.node_elements[entries]
+        bits = np.left_shift(1, self.node_element_positions[entries])
+
+        element_indices, inverse = np.unique(elements, return_inverse=True)
+        patterns = np.zeros(len(element_indices), dtype=np.int64)
+        # every node is only once in an element, thus adding the bits is an or
+        np.add.at(patterns, inverse, bits)
+        return element_indices, patterns
+
+    def get_elements_by_nodes(self, node_set):
+        """Returns the ids of all elements which have all their nodes in node_set
+
+        Same as meshtools.get_femelements_by_femnodes_std()
+        """
+        element_indices, patterns = self.get_element_bit_patterns(node_set)
+        full_patterns = np.left_shift(1, self.element_node_counts[element_indices]) - 1
+        return self.element_ids[element_indices[patterns == full_patterns]].tolist()
+
+    def get_ccx_element_faces(self, node_set):
+        """Returns [[element id, ccx face number], ...] of all volume element faces
+        which have all their nodes in node_set
+
+        Same as meshtools.get_ccxelement_faces_from_binary_search()
+        the face masks are matched for all elements at once.
+        """
+        element_indices, patterns = self.get_element_bit_patterns(node_set)
+        node_counts = self.element_node_counts[element_indices]
+        found_elements = []
+        found_mask_order = []
+        found_faces = []
+        for node_count, mask_dict in CCX_VOLUME_FACE_MASKS.items():
+            of_type = node_counts == node_count
+            if not of_type.any():
+                continue
+            type_indices = element_indices[of_type]
+            type_patterns = patterns[of_type]
+            for mask_order, (mask, face) in enumerate(mask_dict.items()):
+                matches = (type_patterns & mask) == mask
+                found_elements.append(type_indices[matches])
+                found_mask_order.append(np.full(matches.sum(), mask_order))
+                found_faces.append(np.full(matches.sum(), face))
+        if not found_elements:
+            return []
+        found_elements = np.concatenate(found_elements)
+        found_faces = np.concatenate(found_faces)
+        # element order of the femelement_table and face order of the masks
+        order = np.lexsort((np.concatenate(found_mask_order), found_elements))
+        return np.column_stack((
+            self.element_ids[found_elements[order]],
+            found_faces[order]
+        )).tolist()
+
+##  @}
@@ -28,7 +28,9 @@ __url__ = "https://www.freecadweb.org"
 ## \addtogroup FEM
 #  @{
 
+import copy
 import time
+from collections import OrderedDict
 
 import FreeCAD
 
@@ -36,6 +38,16 @@ from femmesh import meshtools
 from femtools.femutils import type_of_obj
 
 
+# constraint sets of former runs, least recently used first
+# {(document name, constraint name, set name): (sets key, set)}
+# the sets key is made from the mesh, the reference shapes and the constraint properties
+# the set depends on, see MeshSetsGetter.get_cached_set()
+_sets_cache = OrderedDict()
+_sets_cache_max_size = 256
+# cache hits and misses, see sets_cache_info()
+_sets_cache_stats = {"hits": 0, "misses": 0}
+
+
 class MeshSetsGetter():
     def __init__(
         self,
@@ -83,12 +95,14 @@ class MeshSetsGetter():
         self.femelement_table = {}
         self.constraint_conflict_nodes = []
         self.femnodes_ele_table = {}
+        self.mesh_index = None
         self.femelements_edges_only = []
         self.femelements_faces_only = []
         self.femelement_volumes_table = {}
         self.femelement_faces_table = {}
         self.femelement_edges_table = {}
         self.femelement_count_test = True
+        self.mesh_key = None
 
     # ********************************************************************************************
     # ********************************************************************************************
@@ -98,6 +112,67 @@ class MeshSetsGetter():
     #     - done in return value of meshtools.get_femnodes_by_femobj_with_references
     # TODO FIXME might be appropriate for element sets and surfaceface sets too
 
+    # ********************************************************************************************
+    # ********************************************************************************************
+    # mesh data, retrieved once and used by all set getters
+    def get_femnodes_mesh(self):
+        if not self.femnodes_mesh:
+            self.femnodes_mesh = self.femmesh.Nodes
+        return self.femnodes_mesh
+
+    def get_femelement_table(self):
+        if not self.femelement_table:
+            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
+        return self.femelement_table
+
+    def get_mesh_index(self):
+        if self.mesh_index is None:
+            self.mesh_index = meshtools.get_mesh_index(self.get_femelement_table())
+        return self.mesh_index
+
+    def get_mesh_key(self):
+        if self.mesh_key is None:
+            self.mesh_key = get_mesh_key(self.mesh_object, self.get_femnodes_mesh())
+        return self.mesh_key
+
+    # ********************************************************************************************
+    # ********************************************************************************************
+    # sets are reused if the mesh, the reference shapes and the properties did not change
+    def get_cached_set(self, femobj, set_name, getter, properties=()):
+        """return the set getter(femobj) of the constraint femobj["Object"]
+        properties are the names of the constraint properties the set depends on
+        """
+        obj = femobj["Object"]
+        sets_key = (
+            self.get_mesh_key(),
+            get_references_key(obj.References),
+            tuple(getattr(obj, prop) for prop in properties)
+        )
+        cache_id = (self.document.Name, obj.Name, set_name)
+        cached = _sets_cache.get(cache_id)
+        if cached is not None and cached[0] == sets_key:
+            FreeCAD.Console.PrintLog(
+                "    {} of {} taken from the sets cache.\n"
+                .format(set_name, obj.Name)
+            )
+            _sets_cache.move_to_end(cache_id)
+            _sets_cache_stats["hits"] += 1
+            return copy.deepcopy(cached[1])
+        _sets_cache_stats["misses"] += 1
+        mesh_set = getter(femobj)
+        _sets_cache[cache_id] = (sets_key, copy.deepcopy(mesh_set))
+        _sets_cache.move_to_end(cache_id)
+        while len(_sets_cache) > _sets_cache_max_size:
+            _sets_cache.popitem(last=False)
+        return mesh_set
+
+    def get_constraint_nodes(self, femobj):
+        return self.get_cached_set(
+            femobj,
+            "Nodes",
+            lambda fobj: meshtools.get_femnodes_by_femobj_with_references(self.femmesh, fobj)
+        )
+
     # ********************************************************************************************
     # ********************************************************************************************
     # get all known sets
@@ -149,10 +224,7 @@ class MeshSetsGetter():
         for femobj in self.member.cons_fixed:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            femobj["Nodes"] = self.get_constraint_nodes(femobj)
             # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
             for node in femobj["Nodes"]:
                 self.constraint_conflict_nodes.append(node)
@@ -170,18 +242,17 @@ class MeshSetsGetter():
                 self.femelement_volumes_table = meshtools.get_femelement_volumes_table(
                     self.femmesh
                 )
+            volume_nodes = set()
+            for ve in self.femelement_volumes_table:
+                volume_nodes.update(self.femelement_volumes_table[ve])
             for femobj in self.member.cons_fixed:
                 # femobj --> dict, FreeCAD document object is femobj["Object"]
                 nds_solid = []
                 nds_faceedge = []
                 for n in femobj["Nodes"]:
-                    solid_node = False
-                    for ve in self.femelement_volumes_table:
-                        if n in self.femelement_volumes_table[ve]:
-                            solid_node = True
-                            nds_solid.append(n)
-                            break
-                    if not solid_node:
+                    if n in volume_nodes:
+                        nds_solid.append(n)
+                    else:
                         nds_faceedge.append(n)
                 femobj["NodesSolid"] = set(nds_solid)
                 femobj["NodesFaceEdge"] = set(nds_faceedge)
@@ -193,10 +264,7 @@ class MeshSetsGetter():
         for femobj in self.member.cons_displacement:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            femobj["Nodes"] = self.get_constraint_nodes(femobj)
             # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
             for node in femobj["Nodes"]:
                 self.constraint_conflict_nodes.append(node)
@@ -208,10 +276,7 @@ class MeshSetsGetter():
         for femobj in self.member.cons_planerotation:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            femobj["Nodes"] = self.get_constraint_nodes(femobj)
 
     def get_constraints_transform_nodes(self):
         if not self.member.cons_transform:
@@ -220,10 +285,7 @@ class MeshSetsGetter():
         for femobj in self.member.cons_transform:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            femobj["Nodes"] = self.get_constraint_nodes(femobj)
 
     def get_constraints_temperature_nodes(self):
         if not self.member.cons_temperature:
@@ -232,10 +294,7 @@ class MeshSetsGetter():
         for femobj in self.member.cons_temperature:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            femobj["Nodes"] = self.get_constraint_nodes(femobj)
 
     def get_constraints_fluidsection_nodes(self):
         if not self.member.geos_fluidsection:
@@ -244,10 +303,7 @@ class MeshSetsGetter():
         for femobj in self.member.geos_fluidsection:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            femobj["Nodes"] = self.get_constraint_nodes(femobj)
 
     def get_constraints_force_nodeloads(self):
         if not self.member.cons_force:
@@ -268,19 +324,13 @@ class MeshSetsGetter():
                     "    solid_mesh with face data --> The femelement_table is not "
                     "needed but the femnodes_mesh is needed for node load calculation.\n"
                 )
-                if not self.femnodes_mesh:
-                    self.femnodes_mesh = self.femmesh.Nodes
             else:
                 FreeCAD.Console.PrintLog(
                     "    mesh without needed data --> The femelement_table "
                     "and femnodes_mesh are not needed for node load calculation.\n"
                 )
-                if not self.femnodes_mesh:
-                    self.femnodes_mesh = self.femmesh.Nodes
-                if not self.femelement_table:
-                    self.femelement_table = meshtools.get_femelement_table(
-                        self.femmesh
-                    )
+        # femelement_table and femnodes_mesh are only retrieved
+        # if the node loads are not taken from the sets of the former run
         # get node loads
         FreeCAD.Console.PrintLog(
             "    Finite element mesh nodes will be retrieved by searching "
@@ -297,21 +347,38 @@ class MeshSetsGetter():
             if frc_obj.Force == 0:
                 FreeCAD.Console.PrintMessage("  Warning --> Force = 0\n")
             if femobj["RefShapeType"] == "Vertex":  # point load on vertices
-                femobj["NodeLoadTable"] = meshtools.get_force_obj_vertex_nodeload_table(
-                    self.femmesh,
-                    frc_obj
+                femobj["NodeLoadTable"] = self.get_cached_set(
+                    femobj,
+                    "NodeLoadTable",
+                    lambda fobj: meshtools.get_force_obj_vertex_nodeload_table(
+                        self.femmesh,
+                        fobj["Object"]
+                    ),
+                    ("Force",)
                 )
             elif femobj["RefShapeType"] == "Edge":  # line load on edges
-                femobj["NodeLoadTable"] = meshtools.get_force_obj_edge_nodeload_table(
-                    self.femmesh,
-                    self.femelement_table,
-                    self.femnodes_mesh, frc_obj
+                femobj["NodeLoadTable"] = self.get_cached_set(
+                    femobj,
+                    "NodeLoadTable",
+                    lambda fobj: meshtools.get_force_obj_edge_nodeload_table(
+                        self.femmesh,
+                        self.get_femelement_table(),
+                        self.get_femnodes_mesh(),
+                        fobj["Object"]
+                    ),
+                    ("Force",)
                 )
             elif femobj["RefShapeType"] == "Face":  # area load on faces
-                femobj["NodeLoadTable"] = meshtools.get_force_obj_face_nodeload_table(
-                    self.femmesh,
-                    self.femelement_table,
-                    self.femnodes_mesh, frc_obj
+                femobj["NodeLoadTable"] = self.get_cached_set(
+                    femobj,
+                    "NodeLoadTable",
+                    lambda fobj: meshtools.get_force_obj_face_nodeload_table(
+                        self.femmesh,
+                        self.get_femelement_table(),
+                        self.get_femnodes_mesh(),
+                        fobj["Object"]
+                    ),
+                    ("Force",)
                 )
 
     # ********************************************************************************************
@@ -335,23 +402,18 @@ class MeshSetsGetter():
             # print(femobj["PressureFaces"])
         """
 
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
-        if not self.femelement_table:
-            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
-
         for femobj in self.member.cons_pressure:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            pressure_faces = meshtools.get_pressure_obj_faces(
-                self.femmesh,
-                self.femelement_table,
-                self.femnodes_ele_table, femobj
+            pressure_faces = self.get_cached_set(
+                femobj,
+                "PressureFaces",
+                lambda fobj: meshtools.get_pressure_obj_faces(
+                    self.femmesh,
+                    self.get_femelement_table(),
+                    self.femnodes_ele_table, fobj,
+                    self.get_mesh_index()
+                )
             )
             # the data model is for compatibility reason with deprecated version
             # get_pressure_obj_faces_depreciated returns the face ids in a tuple per ref_shape
@@ -364,23 +426,18 @@ class MeshSetsGetter():
     def get_constraints_contact_faces(self):
         if not self.member.cons_contact:
             return
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
-        if not self.femelement_table:
-            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
-
         for femobj in self.member.cons_contact:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            contact_slave_faces, contact_master_faces = meshtools.get_contact_obj_faces(
-                self.femmesh,
-                self.femelement_table,
-                self.femnodes_ele_table, femobj
+            contact_slave_faces, contact_master_faces = self.get_cached_set(
+                femobj,
+                "ContactFaces",
+                lambda fobj: meshtools.get_contact_obj_faces(
+                    self.femmesh,
+                    self.get_femelement_table(),
+                    self.femnodes_ele_table, fobj,
+                    self.get_mesh_index()
+                )
             )
             # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
             # whereas the ele_face_id might be ccx specific
@@ -399,23 +456,18 @@ class MeshSetsGetter():
     def get_constraints_tie_faces(self):
         if not self.member.cons_tie:
             return
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
-        if not self.femelement_table:
-            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
-
         for femobj in self.member.cons_tie:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            slave_faces, master_faces = meshtools.get_tie_obj_faces(
-                self.femmesh,
-                self.femelement_table,
-                self.femnodes_ele_table, femobj
+            slave_faces, master_faces = self.get_cached_set(
+                femobj,
+                "TieFaces",
+                lambda fobj: meshtools.get_tie_obj_faces(
+                    self.femmesh,
+                    self.get_femelement_table(),
+                    self.femnodes_ele_table, fobj,
+                    self.get_mesh_index()
+                )
             )
             # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
             # whereas the ele_face_id might be ccx specific
@@ -444,7 +496,11 @@ class MeshSetsGetter():
                     # in the gui this is checked
                     ref_shape = o.Shape.getElement(elem)
                     if ref_shape.ShapeType == "Face":
-                        v = self.mesh_object.FemMesh.getccxVolumesByFace(ref_shape)
+                        v = self.get_cached_set(
+                            femobj,
+                            "SectionPrintFaces:{}:{}".format(o.Name, elem),
+                            lambda fobj: self.mesh_object.FemMesh.getccxVolumesByFace(ref_shape)
+                        )
                         if len(v) > 0:
                             femobj["SectionPrintFaces"] = v
                             # volume elements found
@@ -480,15 +536,23 @@ class MeshSetsGetter():
         #     ]
         for femobj in self.member.cons_heatflux:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
-            heatflux_obj = femobj["Object"]
-            femobj["HeatFluxFaceTable"] = []
-            for o, elem_tup in heatflux_obj.References:
-                for elem in elem_tup:
-                    ho = o.Shape.getElement(elem)
-                    if ho.ShapeType == "Face":
-                        elem_info = "{}:{}".format(o.Name, elem)
-                        face_table = self.mesh_object.FemMesh.getccxVolumesByFace(ho)
-                        femobj["HeatFluxFaceTable"].append((elem_info, face_table))
+            femobj["HeatFluxFaceTable"] = self.get_cached_set(
+                femobj,
+                "HeatFluxFaceTable",
+                self.get_heatflux_face_table
+            )
+
+    def get_heatflux_face_table(self, femobj):
+        heatflux_obj = femobj["Object"]
+        heatflux_face_table = []
+        for o, elem_tup in heatflux_obj.References:
+            for elem in elem_tup:
+                ho = o.Shape.getElement(elem)
+                if ho.ShapeType == "Face":
+                    elem_info = "{}:{}".format(o.Name, elem)
+                    face_table = self.mesh_object.FemMesh.getccxVolumesByFace(ho)
+                    heatflux_face_table.append((elem_info, face_table))
+        return heatflux_face_table
 
     # ********************************************************************************************
     # ********************************************************************************************
@@ -519,22 +583,14 @@ class MeshSetsGetter():
             FreeCAD.Console.PrintMessage(all_found)
             FreeCAD.Console.PrintMessage("\n")
         if all_found is False:
-            if not self.femelement_table:
-                self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-            # we're going to use the binary search for get_femelements_by_femnodes()
-            # thus we need the parameter values self.femnodes_ele_table
-            if not self.femnodes_mesh:
-                self.femnodes_mesh = self.femmesh.Nodes
-            if not self.femnodes_ele_table:
-                self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                    self.femnodes_mesh,
-                    self.femelement_table
-                )
+            # the indexed search is used for get_femelements_by_femnodes()
+            self.get_mesh_index()
             control = meshtools.get_femelement_sets(
                 self.femmesh,
                 self.femelement_table,
                 femobjs,
-                self.femnodes_ele_table
+                self.femnodes_ele_table,
+                self.mesh_index
             )
             # we only need to set it, if it is still True
             if (self.femelement_count_test is True) and (control is False):
@@ -1040,6 +1096,48 @@ def get_ccx_elset_name_short(names):
         raise Exception(error)
 
 
+def get_mesh_key(mesh_obj, femnodes_mesh):
+    # the mesh fingerprint, a remeshed mesh has other node coordinates
+    # or other element ids even if the counts and the bound box are equal
+    if mesh_obj is None:
+        return None
+    femmesh = mesh_obj.FemMesh
+    return (
+        mesh_obj.Name,
+        femmesh.NodeCount,
+        femmesh.EdgeCount,
+        femmesh.FaceCount,
+        femmesh.VolumeCount,
+        femmesh.GroupCount,
+        hash(tuple((n, v.x, v.y, v.z) for n, v in femnodes_mesh.items())),
+        hash((femmesh.Edges, femmesh.Faces, femmesh.Volumes)),
+    )
+
+
+def get_references_key(references):
+    # a recomputed or moved reference shape has a new hash code
+    return tuple(
+        (
+            ref_obj.Name,
+            tuple(elements),
+            ref_obj.Shape.hashCode(),
+            str(ref_obj.Shape.BoundBox)
+        )
+        for ref_obj, elements in references
+    )
+
+
+def clear_sets_cache():
+    _sets_cache.clear()
+    _sets_cache_stats["hits"] = 0
+    _sets_cache_stats["misses"] = 0
+
+
+def sets_cache_info():
+    # hits and misses of the sets cache since the last clear_sets_cache()
+    return dict(_sets_cache_stats, size=len(_sets_cache))
+
+
 def print_obj_info(obj, log=False):
     if log is False:
         FreeCAD.Console.PrintMessage("{}:\n".format(obj.Label))
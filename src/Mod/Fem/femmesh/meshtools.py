@@ -29,6 +29,8 @@ __url__ = "https://www.freecadweb.org"
 
 import FreeCAD
 
+from femmesh.meshindex import CCX_VOLUME_FACE_MASKS
+from femmesh.meshindex import FemMeshIndex
 from femtools import geomtools
 
 
@@ -65,7 +67,8 @@ def get_femelements_by_references(
     femmesh,
     femelement_table,
     references,
-    femnodes_ele_table=None
+    femnodes_ele_table=None,
+    mesh_index=None
 ):
     """get the femelements for a list of references
     """
@@ -73,7 +76,10 @@ def get_femelements_by_references(
     for ref in references:
         # femnodes for the current ref
         ref_femnodes = get_femnodes_by_refshape(femmesh, ref)
-        if femnodes_ele_table:
+        if mesh_index is not None:
+            # indexed search, works for all elements of the femelement_table
+            references_femelements += mesh_index.get_elements_by_nodes(ref_femnodes)
+        elif femnodes_ele_table:
             # blind fast binary search, works for volumes only
             # femelements for all references
             references_femelements += get_femelements_by_femnodes_bin(
@@ -199,6 +205,18 @@ def get_femelement_edges_table(
     return table
 
 
+# ************************************************************************************************
+def get_mesh_index(
+    femelement_table
+):
+    """get_mesh_index(femelement_table): FemMeshIndex
+    node to element and element to node adjacency of the femelement_table
+    it replaces the femnodes_ele_table and the bit_pattern_dict,
+    build it once and share it for all constraints, see femmesh/meshindex.py
+    """
+    return FemMeshIndex(femelement_table)
+
+
 # ************************************************************************************************
 def get_femnodes_ele_table(
     femnodes_mesh,
@@ -293,49 +311,9 @@ def get_ccxelement_faces_from_binary_search(
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=17318&start=60#p141484
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=17318&start=50#p141108
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=17318&start=40#p140371
-    tet10_mask = {
-        119: 1,
-        411: 2,
-        717: 3,
-        814: 4}
-    tet4_mask = {
-        7: 1,
-        11: 2,
-        13: 3,
-        14: 4}
-    hex8_mask = {
-        240: 1,
-        15: 2,
-        102: 3,
-        204: 4,
-        153: 5,
-        51: 6}
-    hex20_mask = {
-        61680: 1,
-        3855: 2,
-        402022: 3,
-        804044: 4,
-        624793: 5,
-        201011: 6}
-    pent6_mask = {
-        56: 1,
-        7: 2,
-        54: 3,
-        45: 4,
-        27: 5}
-    pent15_mask = {
-        3640: 1,
-        455: 2,
-        25782: 3,
-        22829: 4,
-        12891: 5}
-    vol_dict = {
-        4: tet4_mask,
-        6: pent6_mask,
-        8: hex8_mask,
-        10: tet10_mask,
-        15: pent15_mask,
-        20: hex20_mask}
+    # the masks are defined in module femmesh/meshindex.py
+    # the FemMeshIndex matches them for all elements at once
+    vol_dict = CCX_VOLUME_FACE_MASKS
     faces = []
     for ele in bit_pattern_dict:
         mask_dict = vol_dict[bit_pattern_dict[ele][0]]
@@ -347,6 +325,29 @@ def get_ccxelement_faces_from_binary_search(
     return faces
 
 
+# ************************************************************************************************
+def get_ccxelement_faces_by_femnodes(
+    femelement_table,
+    femnodes_ele_table,
+    node_set,
+    mesh_index=None
+):
+    """get the CalculiX element faces [[eleID, faceID], ...] with all face nodes in node_set
+    with the mesh_index all element face masks are matched at once,
+    without the bit_pattern_dict is filled and searched
+    """
+    if mesh_index is not None:
+        faces = mesh_index.get_ccx_element_faces(node_set)
+        FreeCAD.Console.PrintLog("found Faces: {}\n".format(len(faces)))
+        return faces
+    bit_pattern_dict = get_bit_pattern_dict(
+        femelement_table,
+        femnodes_ele_table,
+        node_set
+    )
+    return get_ccxelement_faces_from_binary_search(bit_pattern_dict)
+
+
 # ************************************************************************************************
 def get_femelements_by_femnodes_bin(
     femelement_table,
@@ -396,6 +397,7 @@ def get_femelements_by_femnodes_std(
     e: elementlist
     nodes: nodelist """
     FreeCAD.Console.PrintMessage("std search: get_femelements_by_femnodes_std\n")
+    node_list = set(node_list)
     e = []  # elementlist
     for elementID in sorted(femelement_table):
         nodecount = 0
@@ -425,6 +427,7 @@ def get_femvolumeelements_by_femfacenodes(
         --> if exact 6 or 8 element nodes are in node_list --> add femelement
     e: elementlist
     nodes: nodelist """
+    node_list = set(node_list)
     e = []  # elementlist
     for elementID in sorted(femelement_table):
         nodecount = 0
@@ -480,7 +483,8 @@ def get_femelement_sets(
     femmesh,
     femelement_table,
     fem_objects,
-    femnodes_ele_table=None
+    femnodes_ele_table=None,
+    mesh_index=None
 ):
     # fem_objects = FreeCAD FEM document objects
     # get femelements for reference shapes of each obj.References
@@ -501,7 +505,8 @@ def get_femelement_sets(
             ref_shape_femelements = get_femelements_by_references(
                 femmesh, femelement_table,
                 obj.References,
-                femnodes_ele_table
+                femnodes_ele_table,
+                mesh_index
             )
             referenced_femelements += ref_shape_femelements
             count_femelements += len(ref_shape_femelements)
@@ -511,6 +516,7 @@ def get_femelement_sets(
     # get remaining femelements for the fem_objects
     if has_remaining_femelements:
         remaining_femelements = []
+        referenced_femelements = set(referenced_femelements)
         for elemid in femelement_table:
             if elemid not in referenced_femelements:
                 remaining_femelements.append(elemid)
@@ -1591,7 +1597,8 @@ def get_pressure_obj_faces(
     femmesh,
     femelement_table,
     femnodes_ele_table,
-    femobj
+    femobj,
+    mesh_index=None
 ):
     # see get_ccxelement_faces_from_binary_search for more information
     if is_solid_femmesh(femmesh):
@@ -1599,13 +1606,12 @@ def get_pressure_obj_faces(
         # sorted and duplicates removed
         prs_face_node_set = get_femnodes_by_femobj_with_references(femmesh, femobj)
         # FreeCAD.Console.PrintMessage("prs_face_node_set: {}\n".format(prs_face_node_set))
-        # fill the bit_pattern_dict and search for the faces
-        bit_pattern_dict = get_bit_pattern_dict(
+        pressure_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
-            prs_face_node_set
+            prs_face_node_set,
+            mesh_index
         )
-        pressure_faces = get_ccxelement_faces_from_binary_search(bit_pattern_dict)
     elif is_face_femmesh(femmesh):
         pressure_faces = []
         # normally we should call get_femelements_by_references and
@@ -1662,7 +1668,8 @@ def get_contact_obj_faces(
     femmesh,
     femelement_table,
     femnodes_ele_table,
-    femobj
+    femobj,
+    mesh_index=None
 ):
     # see comment on get_pressure_obj_faces_depreciated in the regard of getccxVolumesByFace()
 
@@ -1717,22 +1724,20 @@ def get_contact_obj_faces(
         FreeCAD.Console.PrintLog("    slaveface_nds: {}\n".format(slaveface_nds))
         FreeCAD.Console.PrintLog("    masterface_nds: {}\n".format(slaveface_nds))
 
-        FreeCAD.Console.PrintLog("    Fill the bit_pattern_dict and search for the faces.\n")
-        slave_bit_pattern_dict = get_bit_pattern_dict(
+        FreeCAD.Console.PrintLog("    Get the FaceIDs.\n")
+        slave_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
-            slaveface_nds
+            slaveface_nds,
+            mesh_index
         )
-        master_bit_pattern_dict = get_bit_pattern_dict(
+        master_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
-            masterface_nds
+            masterface_nds,
+            mesh_index
         )
 
-        FreeCAD.Console.PrintLog("    Get the FaceIDs.\n")
-        slave_faces = get_ccxelement_faces_from_binary_search(slave_bit_pattern_dict)
-        master_faces = get_ccxelement_faces_from_binary_search(master_bit_pattern_dict)
-
     elif is_face_femmesh(femmesh):
         slave_ref_shape = slave_ref[0].Shape.getElement(slave_ref[1][0])
         master_ref_shape = master_ref[0].Shape.getElement(master_ref[1][0])
@@ -1764,7 +1769,8 @@ def get_tie_obj_faces(
     femmesh,
     femelement_table,
     femnodes_ele_table,
-    femobj
+    femobj,
+    mesh_index=None
 ):
     # see comment get_contact_obj_faces
     # solid mesh is same as contact, but face mesh is not allowed for tie
@@ -1809,22 +1815,20 @@ def get_tie_obj_faces(
         # FreeCAD.Console.PrintLog("slaveface_nds: {}\n".format(slaveface_nds))
         # FreeCAD.Console.PrintLog("masterface_nds: {}\n".format(slaveface_nds))
 
-        # fill the bit_pattern_dict and search for the faces
-        slave_bit_pattern_dict = get_bit_pattern_dict(
+        # get the faces ids
+        slave_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
-            slaveface_nds
+            slaveface_nds,
+            mesh_index
         )
-        master_bit_pattern_dict = get_bit_pattern_dict(
+        master_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
-            masterface_nds
+            masterface_nds,
+            mesh_index
         )
 
-        # get the faces ids
-        slave_faces = get_ccxelement_faces_from_binary_search(slave_bit_pattern_dict)
-        master_faces = get_ccxelement_faces_from_binary_search(master_bit_pattern_dict)
-
     elif is_face_femmesh(femmesh):
         FreeCAD.Console.PrintError(
             "Shell mesh is not allowed for constraint tie.\n"
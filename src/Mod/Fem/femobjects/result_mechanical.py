@@ -298,6 +298,12 @@ class ResultMechanical(base_fempythonobject.BaseFemPythonObject):
         zero_list = 26 * [0]
         obj.Stats = zero_list
 
+    def onChanged(self, obj, prop):
+        # resulttools.get_stats_dict caches the result stats on the Proxy
+        # it is not saved, a restored object starts without cached stats
+        if prop != "Stats":
+            self.stats_cache = None
+
     def onDocumentRestored(self, obj):
         # migrate old result objects, because property "StressValues"
         # was renamed to "vonMises" in commit 8b68ab7
@@ -53,6 +53,7 @@ def purge_results(analysis):
         if m.isDerivedFrom("Fem::FemResultObject"):
             if m.Mesh and is_of_type(m.Mesh, "Fem::MeshResult"):
                 analysis.Document.removeObject(m.Mesh.Name)
+            clear_stats_cache(m)
             analysis.Document.removeObject(m.Name)
     analysis.Document.recompute()
 
@@ -180,6 +181,39 @@ def show_color_by_scalar_with_cutoff(resultobj, values, limit=None):
         )
 
 
+# stats types in the order of the Stats property list of the result object
+# stats type: (result object property, vector component or None)
+#  - U1, U2, U3 - deformation
+#  - Uabs - absolute deformation
+#  - Sabs - Von Mises stress
+#  - MaxPrin - Principal stress 1
+#  - MidPrin - Principal stress 2
+#  - MinPrin - Principal stress 3
+#  - MaxShear - maximum shear stress
+#  - Peeq - peeq strain
+#  - Temp - Temperature
+#  - MFlow - MassFlowRate
+#  - NPress - NetworkPressure
+# do not forget to adapt initialization of all Stats items in modules:
+# - module femobjects/result_mechanical.py
+# - module femtest/app/support_utils.py
+STATS_TYPES = (
+    ("U1", "DisplacementVectors", 0),
+    ("U2", "DisplacementVectors", 1),
+    ("U3", "DisplacementVectors", 2),
+    ("Uabs", "DisplacementLengths", None),
+    ("Sabs", "vonMises", None),
+    ("MaxPrin", "PrincipalMax", None),
+    ("MidPrin", "PrincipalMed", None),
+    ("MinPrin", "PrincipalMin", None),
+    ("MaxShear", "MaxShear", None),
+    ("Peeq", "Peeq", None),
+    ("Temp", "Temperature", None),
+    ("MFlow", "MassFlowRate", None),
+    ("NPress", "NetworkPressure", None),
+)
+
+
 def get_stats(res_obj, result_type):
     """Returns minimum and maximum value for provided result type
 
@@ -189,7 +223,7 @@ def get_stats(res_obj, result_type):
         FreeCAD FEM mechanical result object
     result_type : str
         type of FEM result
-        allowed are: see dict keys in def get_all_stats()
+        allowed are: see STATS_TYPES
         None - always return (0.0, 0.0)
 
     """
@@ -202,17 +236,6 @@ def get_stats(res_obj, result_type):
     return stats
 
 
-#  - U1, U2, U3 - deformation
-#  - Uabs - absolute deformation
-#  - Sabs - Von Mises stress
-#  - Prin1 - Principal stress 1
-#  - Prin2 - Principal stress 2
-#  - Prin3 - Principal stress 3
-#  - MaxSear - maximum shear stress
-#  - Peeq - peeq strain
-#  - Temp - Temperature
-#  - MFlow - MassFlowRate
-#  - NPress - NetworkPressure
 def get_all_stats(res_obj):
     """Returns all stats for provided result type
 
@@ -244,24 +267,133 @@ def get_all_stats(res_obj):
     """
 
     m = res_obj.Stats
-    stats_dict = {
-        "U1": (m[0], m[1]),
-        "U2": (m[2], m[3]),
-        "U3": (m[4], m[5]),
-        "Uabs": (m[6], m[7]),
-        "Sabs": (m[8], m[9]),
-        "MaxPrin": (m[10], m[11]),
-        "MidPrin": (m[12], m[13]),
-        "MinPrin": (m[14], m[15]),
-        "MaxShear": (m[16], m[17]),
-        "Peeq": (m[18], m[19]),
-        "Temp": (m[20], m[21]),
-        "MFlow": (m[22], m[23]),
-        "NPress": (m[24], m[25])
-    }
+    stats_dict = {}
+    for i, (stats_type, prop, component) in enumerate(STATS_TYPES):
+        stats_dict[stats_type] = (m[2 * i], m[2 * i + 1])
     return stats_dict
 
 
+def get_stats_dict(res_obj, percentiles=()):
+    """Returns min, max, mean and percentiles of all result types
+
+    The stats are cached as long as the result data of the result
+    object does not change. Thus it is cheap to call this method
+    repeatedly on results with many values.
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    percentiles : sequence of float
+        percentiles in the range 0 to 100 to calculate, see calculate_stats
+
+    Returns
+    -------
+    dict
+        see calculate_stats
+    """
+
+    percentiles = tuple(percentiles)
+    # the cache is held by the result object Proxy, its onChanged
+    # resets it if result data changes, result objects without this
+    # Proxy are not cached
+    proxy = getattr(res_obj, "Proxy", None)
+    cacheable = is_of_type(res_obj, "Fem::ResultMechanical") and proxy is not None
+    if cacheable:
+        cached = getattr(proxy, "stats_cache", None)
+        if cached is not None and cached[0] == percentiles:
+            return cached[1]
+    stats = calculate_stats(res_obj, percentiles)
+    if cacheable:
+        proxy.stats_cache = (percentiles, stats)
+    return stats
+
+
+def clear_stats_cache(res_obj):
+    """Removes the cached stats of get_stats_dict from a result object
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    """
+
+    proxy = getattr(res_obj, "Proxy", None)
+    if proxy is not None and hasattr(proxy, "stats_cache"):
+        proxy.stats_cache = None
+
+
+def calculate_stats(res_obj, percentiles=()):
+    """Calculates min, max, mean and percentiles of all result types
+
+    Every result property is read only once into a numpy array,
+    for the displacement vectors all three components are evaluated at once.
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    percentiles : sequence of float
+        percentiles in the range 0 to 100 to calculate
+
+    Returns
+    -------
+    dict
+        key is the stats type see STATS_TYPES,
+        value is a dict with the keys "min", "max", "mean", "count"
+        and for every percentile q the key "p{q}" ("p95" for q=95)
+        result types without values have count 0 and all other values 0.0
+    """
+
+    stats = {}
+    arrays = {}
+    for stats_type, prop, component in STATS_TYPES:
+        if prop not in arrays:
+            values = getattr(res_obj, prop, [])
+            if prop == "DisplacementVectors":
+                arrays[prop] = np.asarray(values, dtype=float).reshape(-1, 3)
+            else:
+                arrays[prop] = np.asarray(values, dtype=float)
+            arrays[prop] = _calculate_array_stats(arrays[prop], percentiles)
+        prop_stats = arrays[prop]
+        if component is None:
+            stats[stats_type] = prop_stats
+        else:
+            stats[stats_type] = dict(
+                (name, value if name == "count" else value[component])
+                for name, value in prop_stats.items()
+            )
+    return stats
+
+
+def _calculate_array_stats(values, percentiles):
+    # column wise stats for 2D arrays
+    names = ["min", "max", "mean"] + ["p{:g}".format(q) for q in percentiles]
+    if not len(values):
+        zeros = np.zeros(values.shape[1:]).tolist() if values.ndim > 1 else 0.0
+        stats = dict((name, zeros) for name in names)
+        stats["count"] = 0
+        return stats
+    # NaN values, for example of a failed frd read, are ignored
+    # as Python's min and max did before
+    stats = {
+        "min": np.nanmin(values, axis=0),
+        "max": np.nanmax(values, axis=0),
+        "mean": np.nanmean(values, axis=0),
+        "count": len(values),
+    }
+    if percentiles:
+        # one partition of the array for all percentiles
+        for name, value in zip(names[3:], np.nanpercentile(values, percentiles, axis=0)):
+            stats[name] = value
+    for name in names:
+        if values.ndim == 1:
+            stats[name] = float(stats[name])
+        else:
+            stats[name] = stats[name].tolist()
+    return stats
+
+
 def fill_femresult_stats(res_obj):
     """Fills a FreeCAD FEM mechanical result object with stats data
 
@@ -274,87 +406,13 @@ def fill_femresult_stats(res_obj):
     FreeCAD.Console.PrintLog(
         "Calculate stats list for result obj: " + res_obj.Name + "\n"
     )
-    # set stats values to 0, they may not exist in res_obj
-    x_min = y_min = z_min = x_max = y_max = z_max = 0
-    a_max = a_min = s_max = s_min = 0
-    p1_min = p1_max = p2_min = p2_max = p3_min = p3_max = 0
-    ms_min = ms_max = peeq_min = peeq_max = 0
-    temp_min = temp_max = 0
-    mflow_min = mflow_max = npress_min = npress_max = 0
-
-    if res_obj.DisplacementVectors:
-        x_max, y_max, z_max = map(max, zip(*res_obj.DisplacementVectors))
-        x_min, y_min, z_min = map(min, zip(*res_obj.DisplacementVectors))
-    if res_obj.DisplacementLengths:
-        a_min = min(res_obj.DisplacementLengths)
-        a_max = max(res_obj.DisplacementLengths)
-    if res_obj.vonMises:
-        s_min = min(res_obj.vonMises)
-        s_max = max(res_obj.vonMises)
-    if res_obj.PrincipalMax:
-        p1_min = min(res_obj.PrincipalMax)
-        p1_max = max(res_obj.PrincipalMax)
-    if res_obj.PrincipalMed:
-        p2_min = min(res_obj.PrincipalMed)
-        p2_max = max(res_obj.PrincipalMed)
-    if res_obj.PrincipalMin:
-        p3_min = min(res_obj.PrincipalMin)
-        p3_max = max(res_obj.PrincipalMin)
-    if res_obj.MaxShear:
-        ms_min = min(res_obj.MaxShear)
-        ms_max = max(res_obj.MaxShear)
-    if res_obj.Peeq:
-        peeq_min = min(res_obj.Peeq)
-        peeq_max = max(res_obj.Peeq)
-    if res_obj.Temperature:
-        temp_min = min(res_obj.Temperature)
-        temp_max = max(res_obj.Temperature)
-    if res_obj.MassFlowRate:
-        # DisplacementVectors is empty, no_of_values needs to be set
-        mflow_min = min(res_obj.MassFlowRate)
-        mflow_max = max(res_obj.MassFlowRate)
-    if res_obj.NetworkPressure:
-        npress_min = min(res_obj.NetworkPressure)
-        npress_max = max(res_obj.NetworkPressure)
-
-    res_obj.Stats = [x_min, x_max,
-                     y_min, y_max,
-                     z_min, z_max,
-                     a_min, a_max,
-                     s_min, s_max,
-                     p1_min, p1_max,
-                     p2_min, p2_max,
-                     p3_min, p3_max,
-                     ms_min, ms_max,
-                     peeq_min, peeq_max,
-                     temp_min, temp_max,
-                     mflow_min, mflow_max,
-                     npress_min, npress_max]
-    """
-    stat_types = [
-        "U1",
-        "U2",
-        "U3",
-        "Uabs",
-        "Sabs",
-        "MaxPrin",
-        "MidPrin",
-        "MinPrin",
-        "MaxShear",
-        "Peeq",
-        "Temp",
-        "MFlow",
-        "NPress"
-    ]
-    """
-    # len(stat_types) == 13*3 == 39
-    # do not forget to adapt initialization of all Stats items in modules:
-    # - module femobjects/_FemResultMechanical.py
-    # do not forget to adapt the def get_stats in:
-    # - get_stats in module femresult/resulttools.py
-    # - module femtest/testccxtools.py
-    # TODO: all stats stuff should be reimplemented
-    # maybe a dictionary would be far more robust than a list
+    # min and max of every stats type, 0 if the values do not exist in res_obj
+    stats = get_stats_dict(res_obj)
+    stats_list = []
+    for stats_type, prop, component in STATS_TYPES:
+        stats_list.append(stats[stats_type]["min"])
+        stats_list.append(stats[stats_type]["max"])
+    res_obj.Stats = stats_list
 
     FreeCAD.Console.PrintLog("Stats list for result obj: " + res_obj.Name + " calculated\n")
     return res_obj
@@ -367,53 +425,92 @@ def add_disp_apps(res_obj):
 
 
 def add_von_mises(res_obj):
-    mstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        mstress.append(calculate_von_mises((Sxx, Syy, Szz, Sxy, Sxz, Syz)))
-    res_obj.vonMises = mstress
+    stress_tensors = get_stress_tensors(res_obj)
+    res_obj.vonMises = calculate_von_mises_batch(stress_tensors).tolist()
     FreeCAD.Console.PrintLog("Added von Mises stress.\n")
     return res_obj
 
 
-def add_principal_stress_std(res_obj):
+def add_principal_stress_std(res_obj, stress_tensors=None):
     # saved into PrincipalMax, PrincipalMed, PrincipalMin
     # TODO may be use only one container for principal stresses in result object
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&p=416006#p416006
     # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        prin1, prin2, prin3, shear = calculate_principal_stress_std((Sxx, Syy, Szz, Sxy, Sxz, Syz))
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    if stress_tensors is None:
+        stress_tensors = get_stress_tensors(res_obj)
+    prin1, prin2, prin3, shear = calculate_principal_stress_std_batch(stress_tensors)
+    res_obj.PrincipalMax = prin1.tolist()
+    res_obj.PrincipalMed = prin2.tolist()
+    res_obj.PrincipalMin = prin3.tolist()
+    res_obj.MaxShear = shear.tolist()
     FreeCAD.Console.PrintLog("Added standard principal stresses and max shear values.\n")
     return res_obj
 
 
+def add_stress_results(res_obj):
+    """Fills von Mises stress, principal stresses and max shear of a result object
+
+    The stress tensors are read only once from the result object and
+    all values are calculated vectorized for all nodes. If the result
+    object is in an analysis with a reinforced material object the
+    reinforced principal stresses, reinforcement ratios and Mohr Coulomb
+    values are added, otherwise the standard principal stresses.
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    """
+
+    stress_tensors = get_stress_tensors(res_obj)
+    res_obj.vonMises = calculate_von_mises_batch(stress_tensors).tolist()
+    FreeCAD.Console.PrintLog("Added von Mises stress.\n")
+    # if material reinforced object use add additional values to the res_obj
+    if res_obj.getParentGroup():
+        for obj in res_obj.getParentGroup().Group:
+            if is_of_type(obj, "Fem::MaterialReinforced"):
+                FreeCAD.Console.PrintLog(
+                    "Reinforced material object detected, "
+                    "reinforced principal stresses and standard principal "
+                    "stresses will be added.\n"
+                )
+                return add_principal_stress_reinforced(res_obj, stress_tensors)
+        FreeCAD.Console.PrintLog(
+            "No reinforced material object detected, "
+            "standard principal stresses will be added.\n"
+        )
+    else:
+        # if a pure frd file was opened no analysis and thus no parent group
+        FreeCAD.Console.PrintLog(
+            "No Analysis detected, standard principal stresses will be added.\n"
+        )
+    return add_principal_stress_std(res_obj, stress_tensors)
+
+
+def get_stress_tensors(res_obj):
+    """Returns the stress tensors of all nodes as (number of nodes, 6) numpy array
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+
+    Returns
+    -------
+    numpy.ndarray
+        rows are (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    """
+
+    return np.column_stack((
+        np.asarray(res_obj.NodeStressXX, dtype=float),
+        np.asarray(res_obj.NodeStressYY, dtype=float),
+        np.asarray(res_obj.NodeStressZZ, dtype=float),
+        np.asarray(res_obj.NodeStressXY, dtype=float),
+        np.asarray(res_obj.NodeStressXZ, dtype=float),
+        np.asarray(res_obj.NodeStressYZ, dtype=float)
+    ))
+
+
 def get_concrete_nodes(res_obj):
 
     #
@@ -459,7 +556,7 @@ def get_concrete_nodes(res_obj):
     return ic
 
 
-def add_principal_stress_reinforced(res_obj):
+def add_principal_stress_reinforced(res_obj, stress_tensors=None):
 
     #
     # HarryvL: determine concrete / non-concrete nodes
@@ -473,21 +570,6 @@ def add_principal_stress_reinforced(res_obj):
     # TODO may be use only one container for principal stresses in result object
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&p=416006#p416006
     # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    ps1v = []
-    ps2v = []
-    ps3v = []
-    #
-    # HarryvL: additional arrays to hold reinforcement ratios
-    # and mohr coulomb stress
-    #
-    rhx = []
-    rhy = []
-    rhz = []
-    moc = []
 
     # material parameter
     for obj in res_obj.getParentGroup().Group:
@@ -505,70 +587,53 @@ def add_principal_stress_reinforced(res_obj):
     # print(matrix_cs)
     # print(reinforce_yield)
 
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
+    if stress_tensors is None:
+        stress_tensors = get_stress_tensors(res_obj)
+    number_of_values = len(stress_tensors)
+    prin1, prin2, prin3, shear, psv = calculate_principal_stress_reinforced_batch(
+        stress_tensors
     )
-    for isv, stress_tensor in enumerate(iterator):
-
-        rhox = 0.
-        rhoy = 0.
-        rhoz = 0.
-        mc = 0.
-
-        if ic[isv] == 1:
-            #
-            # HarryvL: for concrete scxx etc. are affected by
-            # reinforcement (see calculate_rho(stress_tensor)). for all other
-            # materials scxx etc. are the original stresses
-            #
-            rhox, rhoy, rhoz = calculate_rho(
-                stress_tensor,
-                reinforce_yield
-            )
 
-        prin1, prin2, prin3, shear, psv = calculate_principal_stress_reinforced(
-            stress_tensor
+    #
+    # HarryvL: reinforcement ratios and mohr coulomb stress
+    # only for concrete nodes, for all other nodes they are zero
+    # for concrete scxx etc. are affected by reinforcement
+    # (see calculate_rho(stress_tensor)). for all other
+    # materials scxx etc. are the original stresses
+    #
+    concrete = ic[:number_of_values] == 1
+    rhx = np.zeros(number_of_values)
+    rhy = np.zeros(number_of_values)
+    rhz = np.zeros(number_of_values)
+    moc = np.zeros(number_of_values)
+    if concrete.any():
+        rhx[concrete], rhy[concrete], rhz[concrete] = calculate_rho_batch(
+            stress_tensors[concrete],
+            reinforce_yield
+        )
+        moc[concrete] = calculate_mohr_coulomb_batch(
+            prin1[concrete],
+            prin3[concrete],
+            matrix_af,
+            matrix_cs
         )
 
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-        ps1v.append(psv[0])
-        ps2v.append(psv[1])
-        ps3v.append(psv[2])
-
-        #
-        # reinforcement ratios and mohr coulomb criterion
-        #
-        rhx.append(rhox)
-        rhy.append(rhoy)
-        rhz.append(rhoz)
-        if ic[isv] == 1:
-            mc = calculate_mohr_coulomb(prin1, prin3, matrix_af, matrix_cs)
-        moc.append(mc)
-
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    res_obj.PrincipalMax = prin1.tolist()
+    res_obj.PrincipalMed = prin2.tolist()
+    res_obj.PrincipalMin = prin3.tolist()
+    res_obj.MaxShear = shear.tolist()
     #
     # HarryvL: additional concrete and principal stress plot
     # results for use in _ViewProviderFemResultMechanical
     #
-    res_obj.ReinforcementRatio_x = rhx
-    res_obj.ReinforcementRatio_y = rhy
-    res_obj.ReinforcementRatio_z = rhz
-    res_obj.MohrCoulomb = moc
+    res_obj.ReinforcementRatio_x = rhx.tolist()
+    res_obj.ReinforcementRatio_y = rhy.tolist()
+    res_obj.ReinforcementRatio_z = rhz.tolist()
+    res_obj.MohrCoulomb = moc.tolist()
 
-    res_obj.PS1Vector = ps1v
-    res_obj.PS2Vector = ps2v
-    res_obj.PS3Vector = ps3v
+    res_obj.PS1Vector = list(map(tuple, psv[:, 0].tolist()))
+    res_obj.PS2Vector = list(map(tuple, psv[:, 1].tolist()))
+    res_obj.PS3Vector = list(map(tuple, psv[:, 2].tolist()))
 
     FreeCAD.Console.PrintLog(
         "Added reinforcement principal stresses and max shear values as well as "
@@ -862,6 +927,187 @@ def calculate_mohr_coulomb(prin1, prin3, phi, fck):
 
 def calculate_disp_abs(displacements):
     # see https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&start=100#p296657
-    return [np.linalg.norm(nd) for nd in displacements]
+    displacements = np.asarray(displacements, dtype=float).reshape(-1, 3)
+    return np.linalg.norm(displacements, axis=1).tolist()
+
+
+# ************************************************************************************************
+# batch versions of the calculate methods
+# they take the stress tensors of all nodes as (number of nodes, 6) array
+# rows are (Sxx, Syy, Szz, Sxy, Sxz, Syz), see get_stress_tensors()
+# and return numpy arrays with one value per node
+def _get_stress_matrices(stress_tensors):
+    # (number of nodes, 3, 3) symmetric stress matrices
+    s = np.asarray(stress_tensors, dtype=float).reshape(-1, 6)
+    return np.stack((
+        np.column_stack((s[:, 0], s[:, 3], s[:, 4])),
+        np.column_stack((s[:, 3], s[:, 1], s[:, 5])),
+        np.column_stack((s[:, 4], s[:, 5], s[:, 2]))
+    ), axis=1)
+
+
+def calculate_von_mises_batch(stress_tensors):
+    # see calculate_von_mises()
+    s = np.asarray(stress_tensors, dtype=float).reshape(-1, 6)
+    normal = s[:, :3]
+    shear = s[:, 3:]
+    pressure = normal.mean(axis=1)
+    return np.sqrt(
+        1.5 * ((normal - pressure[:, None])**2).sum(axis=1)
+        + 3.0 * (shear**2).sum(axis=1)
+    )
+
+
+def calculate_principal_stress_std_batch(stress_tensors):
+    # see calculate_principal_stress_std()
+    # nodes with NaN inside the stress tensor get NaN values
+    sigma = _get_stress_matrices(stress_tensors)
+    eigvals = np.full((len(sigma), 3), float("NaN"))
+    finite = np.isfinite(sigma).all(axis=(1, 2))
+    if finite.any():
+        # eigvalsh returns ascending eigenvalues
+        eigvals[finite] = np.linalg.eigvalsh(sigma[finite])[:, ::-1]
+    maxshear = (eigvals[:, 0] - eigvals[:, 2]) / 2.0
+    return eigvals[:, 0], eigvals[:, 1], eigvals[:, 2], maxshear
+
+
+def calculate_principal_stress_reinforced_batch(stress_tensors):
+    # see calculate_principal_stress_reinforced()
+    # principal stress vectors are returned as (number of nodes, 3, 3) array
+    # psv[:, 0] are the vectors of the max principal stress
+    sigma = _get_stress_matrices(stress_tensors)
+    eigenvalues = np.full((len(sigma), 3), float("NaN"))
+    eigenvectors = np.full((len(sigma), 3, 3), float("NaN"))
+    finite = np.isfinite(sigma).all(axis=(1, 2))
+    if finite.any():
+        values, vectors = np.linalg.eig(sigma[finite])
+        # HarryvL: suppress complex eigenvalue and vectors that may occur for
+        # near-zero (numerical noise) stress fields
+        eigenvalues[finite] = values.real
+        eigenvectors[finite] = vectors.real
+    eigenvectors = eigenvectors * eigenvalues[:, None, :]
+
+    idx = np.argsort(eigenvalues, axis=1)[:, ::-1]
+    eigenvalues = np.take_along_axis(eigenvalues, idx, axis=1)
+    eigenvectors = np.take_along_axis(eigenvectors, idx[:, None, :], axis=2)
+
+    maxshear = (eigenvalues[:, 0] - eigenvalues[:, 2]) / 2.0
+
+    return (eigenvalues[:, 0], eigenvalues[:, 1], eigenvalues[:, 2], maxshear,
+            eigenvectors.transpose(0, 2, 1))
+
+
+def calculate_rho_batch(stress_tensors, fy):
+    # see calculate_rho() for the solutions
+    s = np.asarray(stress_tensors, dtype=float).reshape(-1, 6)
+    sxx = s[:, 0]
+    syy = s[:, 1]
+    szz = s[:, 2]
+    sxy = s[:, 3]
+    sxz = s[:, 4]
+    syz = s[:, 5]
+
+    rhox = np.zeros((len(s), 15))
+    rhoy = np.zeros((len(s), 15))
+    rhoz = np.zeros((len(s), 15))
+
+    i3 = (sxx * syy * szz + 2 * sxy * sxz * syz - sxx * syz**2
+          - syy * sxz**2 - szz * sxy**2)
+
+    # the division by zero results are not used, see np.where
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        # Solution (5), (6), (7)
+        d = (sxx * syy - sxy**2)
+        rhoz[:, 0] = np.where(d != 0., i3 / d / fy, 0.)
+        d = (sxx * szz - sxz**2)
+        rhoy[:, 1] = np.where(d != 0., i3 / d / fy, 0.)
+        d = (syy * szz - syz**2)
+        rhox[:, 2] = np.where(d != 0., i3 / d / fy, 0.)
+
+        # Solution (9+), (9-)
+        nz = sxx != 0.
+        fc = sxz * sxy / sxx - syz
+        fxy = sxy**2 / sxx
+        fxz = sxz**2 / sxx
+        rhoy[:, 3] = np.where(nz, (syy - fxy + fc) / fy, 0.)
+        rhoz[:, 3] = np.where(nz, (szz - fxz + fc) / fy, 0.)
+        rhoy[:, 4] = np.where(nz, (syy - fxy - fc) / fy, 0.)
+        rhoz[:, 4] = np.where(nz, (szz - fxz - fc) / fy, 0.)
+
+        # Solution (10+), (10-)
+        nz = syy != 0.
+        fc = syz * sxy / syy - sxz
+        fxy = sxy**2 / syy
+        fyz = syz**2 / syy
+        rhox[:, 5] = np.where(nz, (sxx - fxy + fc) / fy, 0.)
+        rhoz[:, 5] = np.where(nz, (szz - fyz + fc) / fy, 0.)
+        rhox[:, 6] = np.where(nz, (sxx - fxy - fc) / fy, 0.)
+        rhoz[:, 6] = np.where(nz, (szz - fyz - fc) / fy, 0.)
+
+        # Solution (11+), (11-)
+        nz = szz != 0.
+        fc = sxz * syz / szz - sxy
+        fxz = sxz**2 / szz
+        fyz = syz**2 / szz
+        rhox[:, 7] = np.where(nz, (sxx - fxz + fc) / fy, 0.)
+        rhoy[:, 7] = np.where(nz, (syy - fyz + fc) / fy, 0.)
+        rhox[:, 8] = np.where(nz, (sxx - fxz - fc) / fy, 0.)
+        rhoy[:, 8] = np.where(nz, (syy - fyz - fc) / fy, 0.)
+
+        # Solution (13), (14), (15), (16)
+        rhox[:, 9] = (sxx + sxy + sxz) / fy
+        rhoy[:, 9] = (syy + sxy + syz) / fy
+        rhoz[:, 9] = (szz + sxz + syz) / fy
+        rhox[:, 10] = (sxx + sxy - sxz) / fy
+        rhoy[:, 10] = (syy + sxy - syz) / fy
+        rhoz[:, 10] = (szz - sxz - syz) / fy
+        rhox[:, 11] = (sxx - sxy - sxz) / fy
+        rhoy[:, 11] = (syy - sxy + syz) / fy
+        rhoz[:, 11] = (szz - sxz + syz) / fy
+        rhox[:, 12] = (sxx - sxy + sxz) / fy
+        rhoy[:, 12] = (syy - sxy - syz) / fy
+        rhoz[:, 12] = (szz + sxz - syz) / fy
+
+        # Solution (17)
+        rhox[:, 13] = np.where(syz != 0., (sxx - sxy * sxz / syz) / fy, 0.)
+        rhoy[:, 13] = np.where(sxz != 0., (syy - sxy * syz / sxz) / fy, 0.)
+        rhoz[:, 13] = np.where(sxy != 0., (szz - sxz * syz / sxy) / fy, 0.)
+
+    # Concrete Stresses of all solutions
+    scxx = sxx[:, None] - rhox * fy
+    scyy = syy[:, None] - rhoy * fy
+    sczz = szz[:, None] - rhoz * fy
+    sxy = sxy[:, None]
+    sxz = sxz[:, None]
+    syz = syz[:, None]
+    ic1 = (scxx + scyy + sczz)
+    ic2 = (scxx * scyy + scyy * sczz + sczz * scxx - sxy**2
+           - sxz**2 - syz**2)
+    ic3 = (scxx * scyy * sczz + 2 * sxy * sxz * syz - scxx * syz**2
+           - scyy * sxz**2 - sczz * sxy**2)
+    rsum = rhox + rhoy + rhoz
+
+    valid = (
+        (rhox >= -1.e-10) & (rhoy >= -1.e-10) & (rhoz > -1.e-10)
+        & (ic1 <= 1.e-6) & (ic2 >= -1.e-6) & (ic3 <= 1.0e-6)
+        & (rsum < 1.0e9) & (rsum > 0.)
+    )
+    # the first solution with the smallest sum, solution 14 if there is none
+    eqmin = np.where(
+        valid.any(axis=1),
+        np.where(valid, rsum, np.inf).argmin(axis=1),
+        14
+    )
+    rows = np.arange(len(s))
+    return rhox[rows, eqmin], rhoy[rows, eqmin], rhoz[rows, eqmin]
+
+
+def calculate_mohr_coulomb_batch(prin1, prin3, phi, fck):
+    # see calculate_mohr_coulomb()
+    coh = fck * (1 - np.sin(phi)) / 2 / np.cos(phi)
+    mc_stress = ((prin1 - prin3) + (prin1 + prin3) * np.sin(phi)
+                 - 2. * coh * np.cos(phi))
+    return np.maximum(mc_stress, 0.)
 
 ##  @}
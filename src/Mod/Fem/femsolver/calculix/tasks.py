@@ -33,8 +33,6 @@ import os
 import os.path
 import subprocess
 
-import FreeCAD
-
 from . import writer
 from .. import run
 from .. import settings
@@ -44,7 +42,9 @@ from femtools import femutils
 from femtools import membertools
 
 
-_inputFileName = None
+# input file names by working directory
+# machines with different working directories may run at the same time
+_inputFileNames = {}
 
 
 class Check(run.Check):
@@ -58,7 +58,6 @@ class Check(run.Check):
 class Prepare(run.Prepare):
 
     def run(self):
-        global _inputFileName
         self.pushStatus("Preparing input files...\n")
         w = writer.FemInputWriterCcx(
             self.analysis,
@@ -73,20 +72,20 @@ class Prepare(run.Prepare):
             self.pushStatus("Write completed!")
         else:
             self.pushStatus("Writing CalculiX input file failed!")
-        _inputFileName = os.path.splitext(os.path.basename(path))[0]
+        _inputFileNames[self.directory] = os.path.splitext(os.path.basename(path))[0]
 
 
 class Solve(run.Solve):
 
     def run(self):
-        if not _inputFileName:
+        if not _inputFileNames.get(self.directory):
             # TODO do not run solver
             # do not try to read results in a smarter way than an Exception
             raise Exception("Error on writing CalculiX input file.\n")
         self.pushStatus("Executing solver...\n")
         binary = settings.get_binary("Calculix")
         self._process = subprocess.Popen(
-            [binary, "-i", _inputFileName],
+            [binary, "-i", _inputFileNames[self.directory]],
             cwd=self.directory,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE)
@@ -102,13 +101,11 @@ class Solve(run.Solve):
 class Results(run.Results):
 
     def run(self):
-        if not _inputFileName:
+        if not _inputFileNames.get(self.directory):
             # TODO do not run solver
             # do not try to read results in a smarter way than an Exception
             raise Exception("Error on writing CalculiX input file.\n")
-        prefs = FreeCAD.ParamGet(
-            "User parameter:BaseApp/Preferences/Mod/Fem/General")
-        if not prefs.GetBool("KeepResultsOnReRun", False):
+        if not self.keepResultsOnReRun():
             self.purge_results()
         self.load_results_ccxfrd()
         self.load_results_ccxdat()
@@ -122,7 +119,7 @@ class Results(run.Results):
 
     def load_results_ccxfrd(self):
         frd_result_file = os.path.join(
-            self.directory, _inputFileName + ".frd")
+            self.directory, _inputFileNames[self.directory] + ".frd")
         if os.path.isfile(frd_result_file):
             result_name_prefix = "CalculiX_" + self.solver.AnalysisType + "_"
             importCcxFrdResults.importFrd(
@@ -133,7 +130,7 @@ class Results(run.Results):
 
     def load_results_ccxdat(self):
         dat_result_file = os.path.join(
-            self.directory, _inputFileName + ".dat")
+            self.directory, _inputFileNames[self.directory] + ".dat")
         if os.path.isfile(dat_result_file):
             mode_frequencies = importCcxDatResults.import_dat(
                 dat_result_file, self.analysis)
@@ -66,8 +66,7 @@ def write_meshdata_constraint(f, femobj, centrif_obj, ccxwriter):
     if isinstance(femobj["FEMElements"], six.string_types):
         f.write("{}\n".format(femobj["FEMElements"]))
     else:
-        for e in femobj["FEMElements"]:
-            f.write("{},\n".format(e))
+        f.write("".join("{},\n".format(e) for e in femobj["FEMElements"]))
 
 
 def write_constraint(f, femobj, centrif_obj, ccxwriter):
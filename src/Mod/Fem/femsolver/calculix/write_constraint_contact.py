@@ -57,12 +57,10 @@ def get_after_write_constraint():
 def write_meshdata_constraint(f, femobj, contact_obj, ccxwriter):
     # slave DEP
     f.write("*SURFACE, NAME=DEP{}\n".format(contact_obj.Name))
-    for i in femobj["ContactSlaveFaces"]:
-        f.write("{},S{}\n".format(i[0], i[1]))
+    f.write("".join("{},S{}\n".format(i[0], i[1]) for i in femobj["ContactSlaveFaces"]))
     # master IND
     f.write("*SURFACE, NAME=IND{}\n".format(contact_obj.Name))
-    for i in femobj["ContactMasterFaces"]:
-        f.write("{},S{}\n".format(i[0], i[1]))
+    f.write("".join("{},S{}\n".format(i[0], i[1]) for i in femobj["ContactMasterFaces"]))
 
 
 def write_constraint(f, femobj, contact_obj, ccxwriter):
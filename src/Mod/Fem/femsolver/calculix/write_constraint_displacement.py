@@ -56,8 +56,7 @@ def get_after_write_constraint():
 
 def write_meshdata_constraint(f, femobj, disp_obj, ccxwriter):
     f.write("*NSET,NSET={}\n".format(disp_obj.Name))
-    for n in femobj["Nodes"]:
-        f.write("{},\n".format(n))
+    f.write("".join("{},\n".format(n) for n in femobj["Nodes"]))
 
 
 def write_constraint(f, femobj, disp_obj, ccxwriter):
@@ -64,16 +64,13 @@ def write_meshdata_constraint(f, femobj, fix_obj, ccxwriter):
     ):
         if len(femobj["NodesSolid"]) > 0:
             f.write("*NSET,NSET={}Solid\n".format(fix_obj.Name))
-            for n in femobj["NodesSolid"]:
-                f.write("{},\n".format(n))
+            f.write("".join("{},\n".format(n) for n in femobj["NodesSolid"]))
         if len(femobj["NodesFaceEdge"]) > 0:
             f.write("*NSET,NSET={}FaceEdge\n".format(fix_obj.Name))
-            for n in femobj["NodesFaceEdge"]:
-                f.write("{},\n".format(n))
+            f.write("".join("{},\n".format(n) for n in femobj["NodesFaceEdge"]))
     else:
         f.write("*NSET,NSET=" + fix_obj.Name + "\n")
-        for n in femobj["Nodes"]:
-            f.write("{},\n".format(n))
+        f.write("".join("{},\n".format(n) for n in femobj["Nodes"]))
 
 
 def write_constraint(f, femobj, fix_obj, ccxwriter):
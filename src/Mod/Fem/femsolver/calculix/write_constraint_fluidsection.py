@@ -26,13 +26,13 @@ __author__ = "Bernd Hahnebach"
 __url__ = "https://www.freecadweb.org"
 
 
-import codecs
 import os
 import six
 from os.path import join
 
 import FreeCAD
 
+from . import write_mesh
 from femmesh import meshtools
 
 
@@ -129,7 +129,7 @@ def handle_fluidsection_liquid_inlet_outlet(inpfile, ccxwriter):
             ccxwriter.femmesh_file,
             ccxwriter.fluid_inout_nodes_file
         )
-        inpfile = codecs.open(ccxwriter.file_name, "a", encoding="utf-8")
+        inpfile = write_mesh.open_inpfile(ccxwriter, "a")
 
     return inpfile
 
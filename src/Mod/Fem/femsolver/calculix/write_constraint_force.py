@@ -47,18 +47,19 @@ def write_meshdata_constraint(f, femobj, force_obj, ccxwriter):
     # floats read from ccx should use {:.13G}, see comment in writer module
 
     direction_vec = femobj["Object"].DirectionVector
+    # only the directions with a component are written
+    directions = [
+        (dof, component)
+        for dof, component in enumerate((direction_vec.x, direction_vec.y, direction_vec.z), 1)
+        if component != 0.0
+    ]
     for ref_shape in femobj["NodeLoadTable"]:
         f.write("** " + ref_shape[0] + "\n")
+        lines = []
         for n in sorted(ref_shape[1]):
             node_load = ref_shape[1][n]
-            if (direction_vec.x != 0.0):
-                v1 = "{:.13E}".format(direction_vec.x * node_load)
-                f.write("{},1,{}\n".format(n, v1))
-            if (direction_vec.y != 0.0):
-                v2 = "{:.13E}".format(direction_vec.y * node_load)
-                f.write("{},2,{}\n".format(n, v2))
-            if (direction_vec.z != 0.0):
-                v3 = "{:.13E}".format(direction_vec.z * node_load)
-                f.write("{},3,{}\n".format(n, v3))
+            for dof, component in directions:
+                lines.append("{},{},{:.13E}\n".format(n, dof, component * node_load))
+        f.write("".join(lines))
         f.write("\n")
     f.write("\n")
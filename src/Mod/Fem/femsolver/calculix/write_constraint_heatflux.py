@@ -64,11 +64,8 @@ def write_meshdata_constraint(f, femobj, heatflux_obj, ccxwriter):
         elem_string = ref_shape[0]
         face_table = ref_shape[1]
         f.write("** Heat flux on face {}\n".format(elem_string))
-        for i in face_table:
-            # OvG: Only write out the VolumeIDs linked to a particular face
-            f.write("{},{}{},{}\n".format(
-                i[0],
-                heatflux_facetype,
-                i[1],
-                heatflux_values
-            ))
+        # OvG: Only write out the VolumeIDs linked to a particular face
+        f.write("".join(
+            "{},{}{},{}\n".format(i[0], heatflux_facetype, i[1], heatflux_values)
+            for i in face_table
+        ))
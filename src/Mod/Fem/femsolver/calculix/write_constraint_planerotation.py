@@ -80,20 +80,11 @@ def write_meshdata_constraint(f, femobj, fric_obj, ccxwriter):
             ccxwriter.femnodes_mesh[node].z
         ))
     node_planerotation = meshtools.get_three_non_colinear_nodes(nodes_coords)
-    for i in range(len(l_nodes)):
-        if l_nodes[i] not in node_planerotation:
-            node_planerotation.append(l_nodes[i])
-    MPC_nodes = []
-    for i in range(len(node_planerotation)):
-        cnt = 0
-        for j in range(len(ccxwriter.constraint_conflict_nodes)):
-            if node_planerotation[i] == ccxwriter.constraint_conflict_nodes[j]:
-                cnt = cnt + 1
-        if cnt == 0:
-            MPC = node_planerotation[i]
-            MPC_nodes.append(MPC)
-    for i in range(len(MPC_nodes)):
-        f.write("{},\n".format(MPC_nodes[i]))
+    three_nodes = set(node_planerotation)
+    node_planerotation += [n for n in l_nodes if n not in three_nodes]
+    conflict_nodes = set(ccxwriter.constraint_conflict_nodes)
+    MPC_nodes = [n for n in node_planerotation if n not in conflict_nodes]
+    f.write("".join("{},\n".format(n) for n in MPC_nodes))
 
 
 def write_constraint(f, femobj, fric_obj, ccxwriter):
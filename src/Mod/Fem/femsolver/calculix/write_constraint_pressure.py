@@ -55,14 +55,16 @@ def write_meshdata_constraint(f, femobj, prs_obj, ccxwriter):
         # in deprecated method get_pressure_obj_faces_depreciated
         # the face ids where per ref_shape
         f.write("** " + ref_shape[0] + "\n")
+        lines = []
         for face, fno in ref_shape[1]:
             if fno > 0:  # solid mesh face
-                f.write("{},P{},{:.13G}\n".format(face, fno, press_rev))
+                lines.append("{},P{},{:.13G}\n".format(face, fno, press_rev))
             # on shell mesh face: fno == 0
             # normal of element face == face normal
             elif fno == 0:
-                f.write("{},P,{:.13G}\n".format(face, press_rev))
+                lines.append("{},P,{:.13G}\n".format(face, press_rev))
             # on shell mesh face: fno == -1
             # normal of element face opposite direction face normal
             elif fno == -1:
-                f.write("{},P,{:.13G}\n".format(face, -1 * press_rev))
+                lines.append("{},P,{:.13G}\n".format(face, -1 * press_rev))
+        f.write("".join(lines))
@@ -56,8 +56,7 @@ def get_after_write_constraint():
 
 def write_meshdata_constraint(f, femobj, sectionprint_obj, ccxwriter):
     f.write("*SURFACE, NAME=SECTIONFACE{}\n".format(sectionprint_obj.Name))
-    for i in femobj["SectionPrintFaces"]:
-        f.write("{},S{}\n".format(i[0], i[1]))
+    f.write("".join("{},S{}\n".format(i[0], i[1]) for i in femobj["SectionPrintFaces"]))
 
 
 def write_constraint(f, femobj, sectionprint_obj, ccxwriter):
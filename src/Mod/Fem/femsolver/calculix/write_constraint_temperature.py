@@ -40,8 +40,7 @@ def get_constraint_title():
 
 def write_meshdata_constraint(f, femobj, temp_obj, ccxwriter):
     f.write("*NSET,NSET={}\n".format(temp_obj.Name))
-    for n in femobj["Nodes"]:
-        f.write("{},\n".format(n))
+    f.write("".join("{},\n".format(n) for n in femobj["Nodes"]))
 
 
 def get_before_write_meshdata_constraint():
@@ -57,12 +57,10 @@ def get_after_write_constraint():
 def write_meshdata_constraint(f, femobj, tie_obj, ccxwriter):
     # slave DEP
     f.write("*SURFACE, NAME=TIE_DEP{}\n".format(tie_obj.Name))
-    for i in femobj["TieSlaveFaces"]:
-        f.write("{},S{}\n".format(i[0], i[1]))
+    f.write("".join("{},S{}\n".format(i[0], i[1]) for i in femobj["TieSlaveFaces"]))
     # master IND
     f.write("*SURFACE, NAME=TIE_IND{}\n".format(tie_obj.Name))
-    for i in femobj["TieMasterFaces"]:
-        f.write("{},S{}\n".format(i[0], i[1]))
+    f.write("".join("{},S{}\n".format(i[0], i[1]) for i in femobj["TieMasterFaces"]))
 
 
 def write_constraint(f, femobj, tie_obj, ccxwriter):
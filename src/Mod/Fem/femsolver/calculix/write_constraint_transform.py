@@ -62,8 +62,7 @@ def write_meshdata_constraint(f, femobj, trans_obj, ccxwriter):
         f.write("*NSET,NSET=Rect{}\n".format(trans_obj.Name))
     elif trans_obj.TransformType == "Cylindrical":
         f.write("*NSET,NSET=Cylin{}\n".format(trans_obj.Name))
-    for n in femobj["Nodes"]:
-        f.write("{},\n".format(n))
+    f.write("".join("{},\n".format(n) for n in femobj["Nodes"]))
 
 
 def write_constraint(f, femobj, trans_obj, ccxwriter):
@@ -43,5 +43,4 @@ def write_femelement_matgeosets(f, ccxwriter):
         if isinstance(ccx_elset["ccx_elset"], six.string_types):
             f.write("{}\n".format(ccx_elset["ccx_elset"]))
         else:
-            for elid in ccx_elset["ccx_elset"]:
-                f.write(str(elid) + ",\n")
+            f.write("".join("{},\n".format(elid) for elid in ccx_elset["ccx_elset"]))
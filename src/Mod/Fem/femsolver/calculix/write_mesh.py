@@ -26,7 +26,6 @@ __author__ = "Bernd Hahnebach"
 __url__ = "https://www.freecadweb.org"
 
 
-import codecs
 from os.path import join
 
 from femmesh import meshtools
@@ -51,7 +50,7 @@ def write_mesh(ccxwriter):
         if ccxwriter.member.geos_fluidsection:
             meshtools.write_D_network_element_to_inputfile(ccxwriter.femmesh_file)
 
-        inpfile = codecs.open(ccxwriter.file_name, "w", encoding="utf-8")
+        inpfile = open_inpfile(ccxwriter, "w")
         inpfile.write("{}\n".format(59 * "*"))
         inpfile.write("** {}\n".format(write_name))
         inpfile.write("*INCLUDE,INPUT={}\n".format(file_name_split))
@@ -69,8 +68,18 @@ def write_mesh(ccxwriter):
             # inpfile is closed
             meshtools.write_D_network_element_to_inputfile(ccxwriter.femmesh_file)
 
-        # reopen file with "append" to add all the rest
-        inpfile = codecs.open(ccxwriter.femmesh_file, "a", encoding="utf-8")
+        # the mesh is written by the FemMesh, open the file once to stream all the rest
+        inpfile = open_inpfile(ccxwriter, "a")
         inpfile.write("\n\n")
 
     return inpfile
+
+
+def open_inpfile(ccxwriter, mode):
+    # main input file, a large write buffer for the bulk formatted sets
+    return open(
+        ccxwriter.file_name,
+        mode,
+        encoding="utf-8",
+        buffering=ccxwriter.write_buffer_size
+    )
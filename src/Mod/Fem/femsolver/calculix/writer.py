@@ -30,6 +30,7 @@ __url__ = "https://www.freecadweb.org"
 #  @{
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from os.path import join
 
 import FreeCAD
@@ -145,10 +146,50 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         if self.solver_obj.SplitInputWriter is True:
             FreeCAD.Console.PrintMessage("Split input file.\n")
             self.split_inpfile = True
+            # the include files are written in parallel if more than one worker is set
+            max_workers = FreeCAD.ParamGet(
+                "User parameter:BaseApp/Preferences/Mod/Fem/Ccx"
+            ).GetInt("SplitInputWriterMaxWorkers", 4)
+            if max_workers > 1:
+                self.split_inpfile_executor = ThreadPoolExecutor(max_workers=max_workers)
         else:
             FreeCAD.Console.PrintMessage("One monster input file.\n")
             self.split_inpfile = False
 
+        # the executor of the split include files is shut down even if writing fails
+        try:
+            self.write_calculix_input_sections()
+        finally:
+            self.wait_split_inpfiles()
+
+        setstime = round((time_getsets - time_start), 3)
+        writetime = round((time.process_time() - time_getsets), 3)
+        all_time = round((setstime + writetime), 3)
+        self.timings = {"mesh_sets": setstime, "input_writing": writetime}
+        FreeCAD.Console.PrintMessage(
+            "Getting mesh sets or groups time: {} seconds \n".format(setstime)
+        )
+        FreeCAD.Console.PrintMessage(
+            "Writing time CalculiX input file: {} seconds \n".format(writetime)
+        )
+        FreeCAD.Console.PrintMessage(
+            "Overall time CalculiX input file: {} seconds \n\n"
+            .format(all_time)
+        )
+
+        # return
+        if self.femelement_count_test is True:
+            return self.file_name
+        else:
+            FreeCAD.Console.PrintError(
+                "Problems on writing input file, check report prints.\n\n"
+            )
+            return ""
+
+    # ********************************************************************************************
+    # write the sections of the calculix input file
+    def write_calculix_input_sections(self):
+
         # mesh
         inpfile = write_mesh.write_mesh(self)
 
@@ -209,27 +250,4 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # close file
         inpfile.close()
 
-        setstime = round((time_getsets - time_start), 3)
-        writetime = round((time.process_time() - time_getsets), 3)
-        all_time = round((setstime + writetime), 3)
-        FreeCAD.Console.PrintMessage(
-            "Getting mesh sets or groups time: {} seconds \n".format(setstime)
-        )
-        FreeCAD.Console.PrintMessage(
-            "Writing time CalculiX input file: {} seconds \n".format(writetime)
-        )
-        FreeCAD.Console.PrintMessage(
-            "Overall time CalculiX input file: {} seconds \n\n"
-            .format(all_time)
-        )
-
-        # return
-        if self.femelement_count_test is True:
-            return self.file_name
-        else:
-            FreeCAD.Console.PrintError(
-                "Problems on writing input file, check report prints.\n\n"
-            )
-            return ""
-
 ##  @}
@@ -107,6 +107,7 @@ class Solve(run.Solve):
         # if the solver fails, the existing result from a former run file will be loaded
         # TODO: delete result file (may be delete all files which will be recreated)
         self.pushStatus("Executing solver...\n")
+        self._output = None
         binary = settings.get_binary("ElmerSolver")
         if binary is not None:
             # if ELMER_HOME is not set, set it.
@@ -130,11 +131,18 @@ class Solve(run.Solve):
             self._process.communicate()
             self.signalAbort.remove(self._process.terminate)
             if not self.aborted:
-                self._updateOutput(output)
+                self._output = output
+                if not self.deferDocumentUpdate:
+                    self.updateDocument()
         else:
             self.report.error("ElmerSolver executable not found.")
             self.fail()
 
+    def updateDocument(self):
+        if self._output is not None:
+            self._updateOutput(self._output)
+            self._output = None
+
     def _updateOutput(self, output):
         if self.solver.ElmerOutput is None:
             self._createOutput()
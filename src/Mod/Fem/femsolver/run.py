@@ -38,9 +38,11 @@ __url__ = "https://www.freecadweb.org"
 
 import os
 import os.path
+import queue
 import shutil
 import tempfile
-# import threading  # not used ATM
+import threading
+from concurrent.futures import Future
 
 import FreeCAD as App
 
@@ -166,6 +168,290 @@ def run_fem_solver(solver, working_dir=None):
                     display(machine.report, "Run Report", error_message)
 
 
+def run_fem_solvers(solvers, working_dirs=None, max_jobs=None):
+    """ Execute many *solvers* of the solver framework at the same time.
+
+    Uses a :class:`SolverQueue` to run the solvers. Up to *max_jobs* solvers
+    run at the same time, the results are loaded one after the other into the
+    document. This method is blocking, it waits for all solvers to finish
+    before returning.
+
+    :param solvers:
+        A list of framework compliant solver document objects, see
+        :func:`run_fem_solver`.
+
+    :param working_dirs:
+        A list with one working directory for every solver. If ``None`` the
+        automatic working directory management is used.
+
+    :param max_jobs:
+        Number of solvers running at the same time. If ``None`` the
+        :term:`General/SolverMaxJobs` parameter is used.
+
+    :returns:
+        The list of the futures of the jobs, see :class:`Job`.
+    """
+    if working_dirs is None:
+        working_dirs = [None] * len(solvers)
+    solver_queue = SolverQueue(max_jobs)
+    for solver, working_dir in zip(solvers, working_dirs):
+        solver_queue.add(solver, working_dir)
+    return solver_queue.run()
+
+
+class Job(object):
+    """ A solver run of a :class:`SolverQueue`.
+
+    :ivar solver:
+        The solver document object.
+
+    :ivar directory:
+        The working directory or ``None`` for the automatic working directory
+        management.
+
+    :ivar setup:
+        ``None`` or a callable which is called with the solver as argument
+        before the job is started. It is used to change the document for a
+        parameter variant, for example the value of a constraint.
+
+    :ivar machine:
+        The :class:`Machine` of the job, set as soon as the job is started.
+
+    :ivar future:
+        A :class:`concurrent.futures.Future` with the machine of the job as
+        result. If the machine failed or was aborted the exception of the
+        future is set.
+    """
+
+    def __init__(self, solver, directory=None, setup=None):
+        self.solver = solver
+        self.directory = directory
+        self.setup = setup
+        self.machine = None
+        self.future = Future()
+        self._slots = []
+
+    @property
+    def state(self):
+        if self.machine is None:
+            return None
+        return self.machine.state
+
+
+class SolverQueue(object):
+    """ Run many solver jobs at the same time.
+
+    The jobs are added by :meth:`add` and executed by :meth:`run`. All tasks
+    which read or change the document, the check, prepare and results tasks,
+    run one after the other in the thread which called :meth:`run` (the
+    document thread). Only the solve tasks, which run the solver processes,
+    are executed in the background. Up to *maxJobs* solve tasks run at the
+    same time.
+
+    Results of former runs are purged before the results of the first job of
+    an analysis are loaded, if the :term:`General/KeepResultsOnReRun`
+    parameter is not set. The results of the other jobs of the analysis are
+    always kept, thus every job adds its own result objects.
+
+    All signals of the queue are notified in the thread which called
+    :meth:`run`:
+
+    :ivar signalJobStarted:
+        Notified with the job as argument after the job has been started.
+
+    :ivar signalJobState:
+        Notified with the job and the state (``CHECK``, ``PREPARE``, ...) as
+        arguments if a task of the job is started.
+
+    :ivar signalJobFinished:
+        Notified with the job as argument after the results of the job have
+        been loaded or the job has failed. The future of the job is done.
+
+    Jobs with a *setup* callable are parameter variants of a solver. The setup
+    is called in the thread which called :meth:`run` right before the check
+    task of the job. Every variant of the same solver needs its own working
+    directory.
+    """
+
+    def __init__(self, maxJobs=None, target=RESULTS, testmode=False):
+        if maxJobs is None:
+            maxJobs = settings.get_max_jobs()
+        self.maxJobs = max(1, maxJobs)
+        self.target = target
+        self.testmode = testmode
+        self.jobs = []
+        self.signalJobStarted = set()
+        self.signalJobState = set()
+        self.signalJobFinished = set()
+        self._pending = []
+        self._running = []
+        self._events = queue.Queue()
+        # analyses with loaded results, see _loadResults
+        self._loadedAnalyses = set()
+
+    def add(self, solver, directory=None, setup=None):
+        """ Add a job for *solver* and return the :class:`Job`. """
+        if solver.Proxy.Type == "Fem::SolverCcxTools":
+            raise ValueError(
+                "The solver {} does not use the solver framework.".format(solver.Label)
+            )
+        if directory is None:
+            for job in self.jobs:
+                if job.solver == solver and job.directory is None:
+                    raise ValueError(
+                        "The solver {} is already queued without working directory."
+                        .format(solver.Label)
+                    )
+        job = Job(solver, directory, setup)
+        self.jobs.append(job)
+        self._pending.append(job)
+        return job
+
+    def run(self):
+        """ Execute all pending jobs and wait for them to finish.
+
+        :returns: The list of the futures of all jobs of the queue.
+        """
+        try:
+            while self._pending or self._running:
+                while self._pending and len(self._running) < self.maxJobs:
+                    self._startJob(self._pending.pop(0))
+                if not self._running:
+                    continue
+                kind, job, state = self._events.get()
+                if kind == "state":
+                    signal.notify(self.signalJobState, job, state)
+                else:
+                    self._running.remove(job)
+                    self._finishJob(job)
+        except BaseException:
+            self.abort()
+            raise
+        return [job.future for job in self.jobs]
+
+    def abort(self):
+        """ Abort all running jobs and cancel all pending jobs. """
+        for job in self._pending:
+            job.future.cancel()
+        self._pending = []
+        for job in self._running:
+            job.machine.abort()
+
+    def _getMachine(self, job):
+        if job.directory is None:
+            return getMachine(job.solver)
+        if not os.path.isdir(job.directory):
+            os.makedirs(job.directory)
+        # not cached, every variant of a solver has its own machine
+        return job.solver.Proxy.createMachine(job.solver, job.directory, self.testmode)
+
+    def _startJob(self, job):
+        job.future.set_running_or_notify_cancel()
+        try:
+            job.machine = self._getMachine(job)
+        except (MustSaveError, DirectoryDoesNotExistError) as e:
+            job.future.set_exception(e)
+            signal.notify(self.signalJobFinished, job)
+            return
+        machine = job.machine
+        machine.reset()
+        for state in (CHECK, PREPARE, SOLVE, RESULTS):
+            stateTask = machine._getTask(state)
+            slot = self._stateSlot(job, state)
+            stateTask.signalStarting.add(slot)
+            job._slots.append((stateTask, slot))
+        signal.notify(self.signalJobStarted, job)
+
+        # check and prepare read and change the document
+        if job.setup is not None:
+            job.setup(job.solver)
+        machine.target = min(PREPARE, self.target)
+        machine.runInCaller()
+        self._flushStates()
+        if machine.failed or machine.aborted or self.target <= PREPARE:
+            self._finishJob(job)
+            return
+
+        # only the solve task runs in the background, its document
+        # changes are applied by _finishJob in this thread
+        machine.solve.deferDocumentUpdate = True
+        machine.target = SOLVE
+        machine.start()
+        self._running.append(job)
+
+        def waitForStop():
+            machine.join()
+            self._events.put(("stopped", job, None))
+        thread = threading.Thread(target=waitForStop)
+        thread.daemon = True
+        thread.start()
+
+    def _stateSlot(self, job, state):
+        def slot():
+            self._events.put(("state", job, state))
+        return slot
+
+    def _flushStates(self):
+        # state notifications of a job executed in this thread
+        while True:
+            try:
+                kind, job, state = self._events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "state":
+                signal.notify(self.signalJobState, job, state)
+            else:
+                # a stopped job of the background threads, handled by run
+                self._events.put((kind, job, state))
+                return
+
+    def _finishJob(self, job):
+        machine = job.machine
+        if machine.solve.deferDocumentUpdate:
+            machine.solve.deferDocumentUpdate = False
+            if not machine.failed and not machine.aborted:
+                machine.solve.updateDocument()
+        if (
+            not machine.failed
+            and not machine.aborted
+            and self.target == RESULTS
+            and machine.state == RESULTS
+        ):
+            self._loadResults(job)
+        self._flushStates()
+        for stateTask, slot in job._slots:
+            stateTask.signalStarting.discard(slot)
+        job._slots = []
+        if machine.failed or machine.aborted:
+            App.Console.PrintError(
+                "Machine of solver {} in {} failed to run.\n"
+                .format(job.solver.Label, machine.directory)
+            )
+            from .report import displayLog
+            displayLog(machine.report)
+            job.future.set_exception(RuntimeError(
+                "Solver {} failed to run in {}.".format(job.solver.Label, machine.directory)
+            ))
+        else:
+            job.future.set_result(machine)
+        signal.notify(self.signalJobFinished, job)
+
+    def _loadResults(self, job):
+        # the first job of an analysis purges the results of former runs,
+        # the following jobs must not purge the results of the other jobs
+        machine = job.machine
+        analysis = job.solver.getParentGroup()
+        key = (analysis.Document.Name, analysis.Name)
+        if key in self._loadedAnalyses:
+            machine.results.keepResults = True
+        self._loadedAnalyses.add(key)
+        try:
+            machine.target = RESULTS
+            machine.runInCaller()
+        finally:
+            machine.results.keepResults = None
+
+
 def getMachine(solver, path=None):
     """ Get or create :class:`Machine` using caching mechanism.
 
@@ -334,6 +620,7 @@ class Machine(BaseTask):
         self._state = CHECK
         self._pendingState = None
         self._isReset = False
+        self._inCaller = False
         self.testmode = testmode
 
     @property
@@ -360,6 +647,13 @@ class Machine(BaseTask):
                 self._pendingState += 1
         self._applyPending()
 
+    def runInCaller(self):
+        self._inCaller = True
+        try:
+            super(Machine, self).runInCaller()
+        finally:
+            self._inCaller = False
+
     def reset(self, newState=CHECK):
         state = (self.state
                  if self._pendingState is None
@@ -397,8 +691,11 @@ class Machine(BaseTask):
             task.abort()
         self.signalAbort.add(killer)
         task.signalStatus.add(statusProxy)
-        task.start()
-        task.join()
+        if self._inCaller:
+            task.runInCaller()
+        else:
+            task.start()
+            task.join()
         self.signalAbort.remove(killer)
         task.signalStatus.remove(statusProxy)
 
@@ -457,6 +754,16 @@ class Check(BaseTask):
 
 class Solve(BaseTask):
 
+    def __init__(self):
+        super(Solve, self).__init__()
+        # set by SolverQueue, which runs the solve task in the background
+        # the document changes are applied by updateDocument afterwards
+        self.deferDocumentUpdate = False
+
+    def updateDocument(self):
+        """ Apply the document changes of a solve task run in the background. """
+        pass
+
     def _observeSolver(self, process):
         output = ""
         line = femutils.pydecode(process.stdout.readline())
@@ -476,7 +783,18 @@ class Prepare(BaseTask):
 
 
 class Results(BaseTask):
-    pass
+
+    def __init__(self):
+        super(Results, self).__init__()
+        # None uses the General/KeepResultsOnReRun parameter
+        # SolverQueue keeps the results of the other jobs of an analysis
+        self.keepResults = None
+
+    def keepResultsOnReRun(self):
+        if self.keepResults is not None:
+            return self.keepResults
+        prefs = App.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/General")
+        return prefs.GetBool("KeepResultsOnReRun", False)
 
 
 class _DocObserver(object):
@@ -46,6 +46,8 @@ __author__ = "Markus Hovorka, Bernd Hahnebach"
 __url__ = "https://www.freecadweb.org"
 
 
+import os
+
 import FreeCAD
 
 
@@ -146,6 +148,16 @@ def get_dir_setting():
     return DirSetting.TEMPORARY
 
 
+def get_max_jobs():
+    """ Get value for :term:`General/SolverMaxJobs` parameter.
+
+    Number of solver jobs a :class:`femsolver.run.SolverQueue` runs at the
+    same time. If the parameter is not set the number of CPUs is returned.
+    """
+    param_group = FreeCAD.ParamGet(_GENERAL_PARAM)
+    return param_group.GetInt("SolverMaxJobs", os.cpu_count() or 1)
+
+
 class _SolverDlg(object):
     """ Internal query logic for solver specific settings.
 
@@ -31,6 +31,7 @@ __url__ = "https://www.freecadweb.org"
 
 import threading
 import time
+import traceback
 
 from . import report
 from . import signal
@@ -139,6 +140,17 @@ class Thread(Task):
         if self._thread is not None:
             self._thread.join()
 
+    def runInCaller(self):
+        """ Run the task in the calling thread and return after it stopped. """
+        super(Thread, self).start()
+        try:
+            self.protector()
+        except Exception:
+            traceback.print_exc()
+        finally:
+            signal.notify(self.signalStopping)
+            signal.notify(self.signalStopped)
+
     def _attachObserver(self):
         def waitForStop():
             self._thread.join()
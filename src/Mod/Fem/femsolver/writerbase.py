@@ -113,6 +113,11 @@ class FemInputWriter():
         self.femelement_edges_table = {}
         self.femelement_count_test = True
 
+        # input file writing
+        self.write_buffer_size = 1024 * 1024
+        self.split_inpfile_executor = None
+        self.split_inpfile_futures = []
+
         # materials
         self.material_objects = member.mats_linear
         self.material_nonlinear_objects = member.mats_nonlinear
@@ -164,14 +169,14 @@ class FemInputWriter():
 
         def constraint_sets_loop_writing(the_file, femobjs, write_before, write_after):
             if write_before != "":
-                f.write(write_before)
+                the_file.write(write_before)
             for femobj in femobjs:
                 # femobj --> dict, FreeCAD document object is femobj["Object"]
                 the_obj = femobj["Object"]
-                f.write("** {}\n".format(the_obj.Label))
+                the_file.write("** {}\n".format(the_obj.Label))
                 con_module.write_meshdata_constraint(the_file, femobj, the_obj, self)
             if write_after != "":
-                f.write(write_after)
+                the_file.write(write_after)
 
         write_before = con_module.get_before_write_meshdata_constraint()
         write_after = con_module.get_after_write_meshdata_constraint()
@@ -185,12 +190,50 @@ class FemInputWriter():
             file_name_split = "{}_{}.inp".format(self.mesh_name, write_name)
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_split))
-            inpfile_split = open(join(self.dir_name, file_name_split), "w")
-            constraint_sets_loop_writing(inpfile_split, femobjs, write_before, write_after)
-            inpfile_split.close()
+            self.write_split_inpfile(
+                file_name_split,
+                constraint_sets_loop_writing,
+                femobjs,
+                write_before,
+                write_after
+            )
         else:
             constraint_sets_loop_writing(f, femobjs, write_before, write_after)
 
+    # write an include file of a split input file
+    # with an executor the include files are written in parallel in its worker threads
+    def write_split_inpfile(
+        self,
+        file_name_split,
+        write_method,
+        *args
+    ):
+        def write_file():
+            with open(
+                join(self.dir_name, file_name_split),
+                "w",
+                encoding="utf-8",
+                buffering=self.write_buffer_size
+            ) as inpfile_split:
+                write_method(inpfile_split, *args)
+
+        if self.split_inpfile_executor is None:
+            write_file()
+        else:
+            self.split_inpfile_futures.append(self.split_inpfile_executor.submit(write_file))
+
+    # wait for the include files written by the executor, exceptions are raised here
+    def wait_split_inpfiles(
+        self
+    ):
+        if self.split_inpfile_executor is None:
+            return
+        self.split_inpfile_executor.shutdown(wait=True)
+        self.split_inpfile_executor = None
+        futures, self.split_inpfile_futures = self.split_inpfile_futures, []
+        for future in futures:
+            future.result()
+
     # write constraint property data
     def write_constraints_propdata(
         self,
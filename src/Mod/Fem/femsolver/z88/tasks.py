@@ -32,8 +32,6 @@ import os
 import os.path
 import subprocess
 
-import FreeCAD
-
 from . import writer
 from .. import run
 from .. import settings
@@ -108,9 +106,7 @@ class Solve(run.Solve):
 class Results(run.Results):
 
     def run(self):
-        prefs = FreeCAD.ParamGet(
-            "User parameter:BaseApp/Preferences/Mod/Fem/General")
-        if not prefs.GetBool("KeepResultsOnReRun", False):
+        if not self.keepResultsOnReRun():
             self.purge_results()
         self.load_results_z88o2()
 
@@ -34,6 +34,7 @@ import FreeCAD
 from . import support_utils as testtools
 from .support_utils import fcc_print
 from .support_utils import get_namefromdef
+from femmesh import meshsetsgetter
 from femtools import ccxtools
 
 
@@ -135,6 +136,47 @@ class TestCcxTools(unittest.TestCase):
             res_obj_name=res_obj_name,
         )
 
+    # ********************************************************************************************
+    def test_box_static_sets_cache(
+        self
+    ):
+        # set up
+        from femexamples.boxanalysis_static import setup
+        setup(self.document, "ccxtools")
+        base_name = "box_static"
+        analysis_dir = testtools.get_fem_test_tmp_dir(
+            self.pre_dir_name + get_namefromdef("test_")
+        )
+
+        # the second input file writing takes the constraint sets from the sets cache
+        meshsetsgetter.clear_sets_cache()
+        self.input_file_writing_test(
+            None,
+            base_name,
+            analysis_dir=analysis_dir,
+            test_end=True,
+        )
+        first_run = meshsetsgetter.sets_cache_info()
+        self.assertEqual(0, first_run["hits"], "Sets cache hit on the first input file writing.")
+        self.assertTrue(first_run["misses"] > 0, "No sets were cached on the first writing.")
+        self.input_file_writing_test(
+            None,
+            base_name,
+            analysis_dir=analysis_dir,
+            test_end=True,
+        )
+        second_run = meshsetsgetter.sets_cache_info()
+        self.assertEqual(
+            first_run["misses"],
+            second_run["misses"],
+            "Sets cache miss on the second input file writing."
+        )
+        self.assertEqual(
+            first_run["misses"],
+            second_run["hits"],
+            "Not all sets of the second input file writing were taken from the sets cache."
+        )
+
     # ********************************************************************************************
     def test_thermomech_flow1D(
         self
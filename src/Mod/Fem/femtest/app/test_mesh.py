@@ -31,6 +31,7 @@ from os.path import join
 import FreeCAD
 
 import Fem
+from femmesh import meshtools
 from . import support_utils as testtools
 from .support_utils import fcc_print
 
@@ -179,6 +180,43 @@ class TestMeshCommon(unittest.TestCase):
             "Nodes order of quadratic volume element is unexpected"
         )
 
+    # ********************************************************************************************
+    def test_numpy_save_load(
+        self
+    ):
+        from femexamples.meshes import create_femmesh
+        from feminout import importNumpyMesh
+
+        fm = create_femmesh("mesh_canticcx_tetra10")
+        group_id = fm.addGroup("MyNodeGroup", "Node")
+        fm.addGroupElements(group_id, [1, 2, 3])
+
+        npz_file = join(testtools.get_fem_test_tmp_dir("mesh_common_npz_save"), "tetra10_mesh.npz")
+        importNumpyMesh.write(fm, npz_file)
+        newmesh = importNumpyMesh.read(npz_file)
+        self.assertEqual(
+            (fm.NodeCount, fm.VolumeCount),
+            (newmesh.NodeCount, newmesh.VolumeCount),
+            "Node or volume count of the NumPy loaded mesh is unexpected"
+        )
+        for element in fm.Volumes:
+            self.assertEqual(
+                fm.getElementNodes(element),
+                newmesh.getElementNodes(element),
+                "Nodes of element {} of the NumPy loaded mesh are unexpected".format(element)
+            )
+        self.assertEqual(
+            fm.Nodes[9],
+            newmesh.Nodes[9],
+            "Node coordinates of the NumPy loaded mesh are unexpected"
+        )
+        new_group = newmesh.Groups[-1]
+        self.assertEqual(
+            ("MyNodeGroup", (1, 2, 3)),
+            (newmesh.getGroupName(new_group), tuple(newmesh.getGroupElements(new_group))),
+            "Group of the NumPy loaded mesh is unexpected"
+        )
+
     # ********************************************************************************************
     def test_writeAbaqus_precision(
         self
@@ -220,6 +258,44 @@ class TestMeshCommon(unittest.TestCase):
             )
         )
 
+    # ********************************************************************************************
+    def test_mesh_index(
+        self
+    ):
+        # two tetra4 sharing the face 2, 3, 4 and a hexa8 on top of them
+        femelement_table = {
+            1: (1, 2, 3, 4),
+            2: (5, 2, 3, 4),
+            3: (11, 12, 13, 14, 15, 16, 17, 18),
+        }
+        femnodes_mesh = {n: None for n in (1, 2, 3, 4, 5) + tuple(range(11, 19))}
+        femnodes_ele_table = meshtools.get_femnodes_ele_table(femnodes_mesh, femelement_table)
+        mesh_index = meshtools.get_mesh_index(femelement_table)
+        node_sets = (
+            [2, 3, 4],
+            [1, 2, 3, 4, 5],
+            [11, 12, 13, 14, 15, 16],
+            [4],
+            [],
+        )
+        for node_set in node_sets:
+            expected_faces = meshtools.get_ccxelement_faces_from_binary_search(
+                meshtools.get_bit_pattern_dict(femelement_table, femnodes_ele_table, node_set)
+            )
+            self.assertEqual(
+                expected_faces,
+                mesh_index.get_ccx_element_faces(node_set),
+                "Problem in test_mesh_index faces, node set {}".format(node_set)
+            )
+            self.assertEqual(
+                meshtools.get_femelements_by_femnodes_std(femelement_table, node_set),
+                mesh_index.get_elements_by_nodes(node_set),
+                "Problem in test_mesh_index elements, node set {}".format(node_set)
+            )
+        # nodes which are not used by any element are ignored
+        self.assertEqual([[1, 4], [2, 4]], mesh_index.get_ccx_element_faces([2, 3, 4, 99]))
+        self.assertEqual([1, 2], mesh_index.get_elements_by_nodes([1, 2, 3, 4, 5, 99]))
+
 
 # ************************************************************************************************
 # ************************************************************************************************
@@ -577,16 +653,9 @@ class TestMeshGroups(unittest.TestCase):
         correct.
         """
 
-        from femexamples.meshes.mesh_canticcx_tetra10 import create_elements
-        from femexamples.meshes.mesh_canticcx_tetra10 import create_nodes
+        from femexamples.meshes import create_femmesh
 
-        fm = Fem.FemMesh()
-        control = create_nodes(fm)
-        if not control:
-            fcc_print("failed to create nodes")
-        control = create_elements(fm)
-        if not control:
-            fcc_print("failed to create elements")
+        fm = create_femmesh("mesh_canticcx_tetra10")
 
         # information
         # fcc_print(fm)
@@ -639,16 +708,9 @@ class TestMeshGroups(unittest.TestCase):
         Adds a number of groups to FemMesh and deletes them
         afterwards. Checks whether GroupCount is OK
         """
-        from femexamples.meshes.mesh_canticcx_tetra10 import create_elements
-        from femexamples.meshes.mesh_canticcx_tetra10 import create_nodes
+        from femexamples.meshes import create_femmesh
 
-        fm = Fem.FemMesh()
-        control = create_nodes(fm)
-        if not control:
-            fcc_print("failed to create nodes")
-        control = create_elements(fm)
-        if not control:
-            fcc_print("failed to create elements")
+        fm = create_femmesh("mesh_canticcx_tetra10")
 
         # information
         # fcc_print(fm)
@@ -673,16 +735,9 @@ class TestMeshGroups(unittest.TestCase):
         Add a node group, add elements to it. Verify that elements added
         and elements in getGroupElements are the same.
         """
-        from femexamples.meshes.mesh_canticcx_tetra10 import create_elements
-        from femexamples.meshes.mesh_canticcx_tetra10 import create_nodes
-
-        fm = Fem.FemMesh()
-        control = create_nodes(fm)
-        if not control:
-            fcc_print("failed to create nodes")
-        control = create_elements(fm)
-        if not control:
-            fcc_print("failed to create elements")
+        from femexamples.meshes import create_femmesh
+
+        fm = create_femmesh("mesh_canticcx_tetra10")
 
         # information
         # fcc_print(fm)
@@ -286,6 +286,85 @@ class TestResult(unittest.TestCase):
             "Values of read npressure result data are unexpected"
         )
 
+    # ********************************************************************************************
+    def test_read_frd_indexed(
+        self
+    ):
+        # the indexed array reader has to read the same data as the standard reader
+        from feminout import importCcxFrdResults
+        for frd_name in (
+            "box_frequency",
+            "box_static",
+            "thermomech_flow1D",
+            "thermomech_spine",
+        ):
+            frd_file = join(
+                testtools.get_fem_test_home_dir(),
+                "calculix",
+                frd_name + ".frd"
+            )
+            frd_content = importCcxFrdResults.read_frd_result(frd_file)
+            frd_index = importCcxFrdResults.index_frd_result(frd_file)
+            mesh_arrays = importCcxFrdResults.read_frd_mesh_arrays(frd_file, frd_index)
+            result_sets = list(importCcxFrdResults.iter_frd_result_steps(
+                frd_file,
+                frd_index=frd_index
+            ))
+
+            self.assertEqual(
+                list(frd_content["Nodes"].keys()),
+                mesh_arrays["NodeNumbers"].tolist(),
+                "Node numbers of indexed reader are unexpected for {}".format(frd_name)
+            )
+            for key in frd_content:
+                if not key.endswith("Elem") or not frd_content[key]:
+                    continue
+                self.assertEqual(
+                    [list(nodes) for nodes in frd_content[key].values()],
+                    mesh_arrays[key].tolist(),
+                    "{} of indexed reader are unexpected for {}".format(key, frd_name)
+                )
+            self.assertEqual(
+                len(frd_content["Results"]),
+                len(result_sets),
+                "Number of result steps of indexed reader is unexpected for {}".format(frd_name)
+            )
+            for expected_set, result_set in zip(frd_content["Results"], result_sets):
+                self.assertEqual(
+                    sorted(expected_set.keys()),
+                    sorted(result_set.keys()),
+                    "Result keys of indexed reader are unexpected for {}".format(frd_name)
+                )
+                for key in ("disp", "stress", "strain", "peeq", "temp", "mflow", "npressure"):
+                    if key not in expected_set:
+                        continue
+                    node_numbers, values = result_set[key]
+                    self.assertEqual(
+                        list(expected_set[key].keys()),
+                        node_numbers.tolist(),
+                        "Result {} nodes are unexpected for {}".format(key, frd_name)
+                    )
+                    for expected, value in zip(expected_set[key].values(), values.tolist()):
+                        self.assertEqual(
+                            expected,
+                            tuple(value) if isinstance(value, list) else value,
+                            "Result {} values are unexpected for {}".format(key, frd_name)
+                        )
+
+        # only the requested steps are parsed
+        frd_file = join(
+            testtools.get_fem_test_home_dir(),
+            "calculix",
+            "thermomech_flow1D.frd"
+        )
+        result_sets = list(importCcxFrdResults.iter_frd_result_steps(frd_file, [12]))
+        self.assertEqual(len(result_sets), 1)
+        self.assertEqual(
+            result_sets[0]["mflow"][1].tolist(),
+            list(importCcxFrdResults.read_frd_result(frd_file)["Results"][12]["mflow"].values()),
+            "Values of read mflow result data of step 12 are unexpected"
+        )
+
     # ********************************************************************************************
     def get_stress_values(
         self
@@ -445,6 +524,125 @@ class TestResult(unittest.TestCase):
                 .format(i + 1)
             )
 
+    # ********************************************************************************************
+    def test_stress_batch(
+        self
+    ):
+        # the batch methods have to return the same values as the per node methods
+        from femresult import resulttools
+        stress_tensors = [
+            self.get_stress_values(),
+            (2.000, -2.000, 5.000, 6.000, -4.000, 2.000),
+            (-3.000, -7.000, 0.000, 6.000, -4.000, 2.000),
+            (1.000, 0.000, 3.000, 10.000, -8.000, 7.000),
+            (0.000, 0.000, 0.000, 5.000, 0.000, 0.000),
+            (15.000, 0.000, 0.000, 0.000, 0.000, 0.000),
+        ]
+        mises = resulttools.calculate_von_mises_batch(stress_tensors)
+        prin_std = resulttools.calculate_principal_stress_std_batch(stress_tensors)
+        prin_rc = resulttools.calculate_principal_stress_reinforced_batch(stress_tensors)
+        rho = resulttools.calculate_rho_batch(stress_tensors, 500)
+        for i, stress in enumerate(stress_tensors):
+            self.assertAlmostEqual(
+                mises[i],
+                resulttools.calculate_von_mises(stress),
+                places=6,
+                msg="Batch von Mises stress of tensor {} is not the expected value.".format(i)
+            )
+            for j, expected in enumerate(resulttools.calculate_principal_stress_std(stress)):
+                self.assertAlmostEqual(
+                    prin_std[j][i],
+                    expected,
+                    places=6,
+                    msg="Batch principal stress of tensor {} is not the expected value.".format(i)
+                )
+            expected_rc = resulttools.calculate_principal_stress_reinforced(stress)
+            for j in range(4):
+                self.assertAlmostEqual(
+                    prin_rc[j][i],
+                    expected_rc[j],
+                    places=6,
+                    msg="Batch principal reinforced stress of tensor {} is not expected."
+                    .format(i)
+                )
+            for j, expected in enumerate(resulttools.calculate_rho(stress, 500)):
+                self.assertAlmostEqual(
+                    rho[j][i],
+                    expected,
+                    places=10,
+                    msg="Batch rho of tensor {} is not the expected value.".format(i)
+                )
+
+        # NaN inside the stress tensor
+        nan = float("NaN")
+        prin_std = resulttools.calculate_principal_stress_std_batch([(nan, 0, 0, 0, 0, 0)])
+        self.assertTrue(
+            all(p[0] != p[0] for p in prin_std),
+            "Batch principal stress of tensor with NaN is not NaN."
+        )
+
+    # ********************************************************************************************
+    def test_stats(
+        self
+    ):
+        import ObjectsFem
+        from femresult import resulttools
+        res_obj = ObjectsFem.makeResultMechanical(self.document, "Result")
+        res_obj.DisplacementVectors = [
+            FreeCAD.Vector(1.0, 2.0, 3.0),
+            FreeCAD.Vector(-1.0, 5.0, 0.0)
+        ]
+        res_obj.vonMises = [3.0, 4.0, 5.0, 8.0]
+        resulttools.fill_femresult_stats(res_obj)
+
+        self.assertEqual(
+            resulttools.get_stats(res_obj, "U2"),
+            (2.0, 5.0),
+            "Stats of U2 are not the expected values."
+        )
+        self.assertEqual(
+            resulttools.get_stats(res_obj, "Temp"),
+            (0.0, 0.0),
+            "Stats of Temp without values are not the expected values."
+        )
+        stats = resulttools.get_stats_dict(res_obj, (50,))
+        self.assertEqual(
+            (stats["Sabs"]["min"], stats["Sabs"]["max"], stats["Sabs"]["mean"]),
+            (3.0, 8.0, 5.0),
+            "Stats dict of Sabs is not the expected values."
+        )
+        self.assertEqual(stats["Sabs"]["p50"], 4.5)
+        self.assertEqual(stats["U1"]["count"], 2)
+
+        # changed result values have to invalidate the cached stats
+        res_obj.vonMises = [1.0, 2.0]
+        stats = resulttools.get_stats_dict(res_obj, (50,))
+        self.assertEqual(
+            (stats["Sabs"]["min"], stats["Sabs"]["max"]),
+            (1.0, 2.0),
+            "Stats dict of Sabs was not updated."
+        )
+
+        # NaN values are ignored
+        res_obj.vonMises = [1.0, float("nan"), 3.0]
+        stats = resulttools.get_stats_dict(res_obj, (50,))
+        self.assertEqual(
+            (stats["Sabs"]["min"], stats["Sabs"]["max"], stats["Sabs"]["p50"]),
+            (1.0, 3.0, 2.0),
+            "Stats dict of Sabs with a NaN value are not the expected values."
+        )
+
+        # a new result object with the same name must not get the old stats
+        self.document.removeObject(res_obj.Name)
+        res_obj = ObjectsFem.makeResultMechanical(self.document, "Result")
+        res_obj.vonMises = [6.0, 7.0]
+        stats = resulttools.get_stats_dict(res_obj, (50,))
+        self.assertEqual(
+            (stats["Sabs"]["min"], stats["Sabs"]["max"]),
+            (6.0, 7.0),
+            "Stats dict of a recreated result object are the old stats."
+        )
+
     # ********************************************************************************************
     def test_disp_abs(
         self
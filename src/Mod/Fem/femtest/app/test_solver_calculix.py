@@ -95,6 +95,123 @@ class TestSolverCalculix(unittest.TestCase):
         setup(self.document, "calculix")
         self.input_file_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_box_static_solver_queue(
+        self
+    ):
+        fcc_print("")
+        from femexamples.boxanalysis_static import setup
+        setup(self.document, "calculix")
+        self.document.recompute()
+        base_name = "box_static"
+
+        # two jobs of the same solver in their own working directories
+        # the second job is a parameter variant with a setup
+        solver_queue = femsolver.run.SolverQueue(
+            maxJobs=2,
+            target=femsolver.run.PREPARE,
+            testmode=True
+        )
+        started_states = []
+        solver_queue.signalJobState.add(
+            lambda job, state: started_states.append((job.directory, state))
+        )
+        working_dirs = []
+        for i in range(2):
+            working_dir = testtools.get_fem_test_tmp_dir(
+                self.pre_dir_name + "solver_queue_{}".format(i)
+            )
+            working_dirs.append(working_dir)
+            solver_queue.add(
+                self.document.SolverCalculiX,
+                working_dir,
+                setup=(lambda solver: self.document.recompute()) if i else None
+            )
+        futures = solver_queue.run()
+
+        self.assertEqual(len(futures), 2)
+        inpfile_given = join(self.test_file_dir, base_name + self.ending)
+        for future, working_dir in zip(futures, working_dirs):
+            self.assertTrue(future.done())
+            self.assertIsNone(future.exception())
+            self.assertEqual(future.result().directory, working_dir)
+            self.assertIn((working_dir, femsolver.run.PREPARE), started_states)
+            ret = testtools.compare_inp_files(
+                inpfile_given,
+                join(working_dir, self.infilename + self.ending)
+            )
+            self.assertFalse(
+                ret,
+                "CalculiX solver queue input file for {0} test failed.\n{1}"
+                .format(working_dir, ret)
+            )
+
+    # ********************************************************************************************
+    def test_box_static_solver_queue_results(
+        self
+    ):
+        fcc_print("")
+        import shutil
+        from femsolver.calculix import tasks
+        from femexamples.boxanalysis_static import setup
+        setup(self.document, "calculix")
+        self.document.recompute()
+        solver = self.document.SolverCalculiX
+        base_name = "box_static"
+        test_file_dir = self.test_file_dir
+        infilename = self.infilename
+
+        # the solve task copies the given result files instead of running ccx
+        class CopyResultsSolve(tasks.Solve):
+            def run(self):
+                for ending in (".frd", ".dat"):
+                    shutil.copyfile(
+                        join(test_file_dir, base_name + ending),
+                        join(self.directory, infilename + ending)
+                    )
+
+        def create_machine(obj, directory, testmode=False):
+            return femsolver.run.Machine(
+                solver=obj, directory=directory,
+                check=tasks.Check(),
+                prepare=tasks.Prepare(),
+                solve=CopyResultsSolve(),
+                results=tasks.Results(),
+                testmode=testmode)
+
+        solver.Proxy.createMachine = create_machine
+        fem_prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/General")
+        keep_results = fem_prefs.GetBool("KeepResultsOnReRun", False)
+        fem_prefs.SetBool("KeepResultsOnReRun", False)
+        try:
+            # run the queue twice, the second run purges the results of the first
+            for queue_run in range(2):
+                solver_queue = femsolver.run.SolverQueue(maxJobs=2, testmode=True)
+                for i in range(2):
+                    solver_queue.add(
+                        solver,
+                        testtools.get_fem_test_tmp_dir(
+                            self.pre_dir_name + "solver_queue_results_{}".format(i)
+                        )
+                    )
+                futures = solver_queue.run()
+                for future in futures:
+                    self.assertIsNone(future.exception())
+                    self.assertEqual(future.result().state, femsolver.run.DONE)
+                results = [
+                    obj for obj in self.document.Analysis.Group
+                    if obj.isDerivedFrom("Fem::FemResultObject")
+                ]
+                self.assertEqual(
+                    len(results),
+                    2,
+                    "Run {} of the solver queue did not keep one result per job."
+                    .format(queue_run)
+                )
+        finally:
+            del solver.Proxy.createMachine
+            fem_prefs.SetBool("KeepResultsOnReRun", keep_results)
+
     # ********************************************************************************************
     def test_ccx_buckling_flexuralbuckling(
             self
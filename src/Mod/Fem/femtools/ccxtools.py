@@ -368,6 +368,7 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
     def write_inp_file(self):
         import femsolver.calculix.writer as iw
         self.inp_file_name = ""
+        self.inp_file_timings = {}
         try:
             inp_writer = iw.FemInputWriterCcx(
                 self.analysis,
@@ -377,6 +378,8 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
                 self.working_dir
             )
             self.inp_file_name = inp_writer.write_calculix_input_file()
+            # process time of getting the mesh sets and of writing the input file
+            self.inp_file_timings = inp_writer.timings
         except Exception:
             FreeCAD.Console.PrintError(
                 "Unexpected error when writing CalculiX input file: {}\n"
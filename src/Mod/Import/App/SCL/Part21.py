@@ -32,9 +32,21 @@
 import re
 from . import Utils
 import time
+import array
+import bisect
+import mmap
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
 
 INSTANCE_DEFINITION_RE = re.compile("#(\d+)[^\S\n]?=[^\S\n]?(.*?)\((.*)\)[^\S\n]?;[\\r]?$")
+# a whole instance definition in the DATA section, the ; inside of strings are skipped
+# groups: id, entity name (empty for complex entity instances)
+INSTANCE_RECORD_RE = re.compile(br"#(\d+)\s*=\s*([A-Za-z0-9_]*)[^;']*(?:'[^']*'[^;']*)*;")
+DATA_SECTION_RE = re.compile(br"^DATA\s*;", re.MULTILINE)
+FILE_SCHEMA_RE = re.compile(br"FILE_SCHEMA\s*\(\s*\(\s*'([^']*)'")
 
 def map_string_to_num(stri):
     """ Take a string, check whether it is an integer, a float or not
@@ -155,6 +167,169 @@ class Part21Parser:
         print('done in %fs.'%(time.time()-init_time))
         print('schema: - %s entities %i'%(self._schema_name,len(list(self._instances_definition.keys()))))
 
+class IndexedPart21Parser:
+    """
+    Indexes all instances definition of a Part21 file without loading them into memory.
+    The file is memory mapped and one pass over it builds an index:
+    instance integer id -> byte range of the definition and entity name.
+    The attributes of an instance are parsed when the instance is accessed.
+    self._instances_definition is a read only dict like object with the same
+    content as the dict of Part21Parser, thus both parsers can be used the same way.
+    """
+    def __init__(self, filename):
+        self._filename = filename
+        # the schema
+        self._schema_name = ""
+        self._file = None
+        self._data = None
+        # the index, sorted by instance id
+        self._ids = array.array('q')
+        self._starts = array.array('q')
+        self._ends = array.array('q')
+        self._entity_indices = array.array('l')
+        self._entity_names = []
+        # entity name -> array of index positions of its instances
+        self._instances_of_entity = {}
+        self._instances_definition = LazyInstancesDefinition(self)
+        self.index_file()
+
+    def get_schema_name(self):
+        return self._schema_name
+
+    def get_number_of_instances(self):
+        return len(self._ids)
+
+    def index_file(self):
+        init_time = time.time()
+        print("Indexing file %s..."%self._filename)
+        self._file = open(self._filename, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        data_section = DATA_SECTION_RE.search(self._data)
+        data_start = data_section.end() if data_section else 0
+        match_schema = FILE_SCHEMA_RE.search(self._data, 0, data_start)
+        if match_schema:
+            self._schema_name = match_schema.group(1).decode('latin-1').split(" ")[0].lower()
+
+        entity_name_indices = {}
+        for match_record in INSTANCE_RECORD_RE.finditer(self._data, data_start):
+            entity_name = match_record.group(2)
+            entity_index = entity_name_indices.get(entity_name)
+            if entity_index is None:
+                entity_index = len(self._entity_names)
+                entity_name_indices[entity_name] = entity_index
+                self._entity_names.append(entity_name.decode('latin-1'))
+            self._ids.append(int(match_record.group(1)))
+            self._starts.append(match_record.start())
+            self._ends.append(match_record.end())
+            self._entity_indices.append(entity_index)
+
+        # instances are not necessarily in the order of their ids
+        ids = self._ids
+        if any(ids[i] > ids[i + 1] for i in range(len(ids) - 1)):
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            for name in ('_ids', '_starts', '_ends', '_entity_indices'):
+                values = getattr(self, name)
+                setattr(self, name, array.array(values.typecode, [values[i] for i in order]))
+
+        for position, entity_index in enumerate(self._entity_indices):
+            entity_name = self._entity_names[entity_index]
+            if entity_name not in self._instances_of_entity:
+                self._instances_of_entity[entity_name] = array.array('q')
+            self._instances_of_entity[entity_name].append(position)
+        print('done in %fs.'%(time.time()-init_time))
+        print('schema: - %s entities %i'%(self._schema_name,len(self._ids)))
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_position(self, instance_id):
+        position = bisect.bisect_left(self._ids, instance_id)
+        if position == len(self._ids) or self._ids[position] != instance_id:
+            raise KeyError(instance_id)
+        return position
+
+    def has_instance(self, instance_id):
+        try:
+            self._get_position(instance_id)
+        except KeyError:
+            return False
+        return True
+
+    def get_instance_ids(self, entity_name=None):
+        """ All instance ids, or the ids of the instances of entity_name only
+        """
+        if entity_name is None:
+            return list(self._ids)
+        positions = self._instances_of_entity.get(entity_name.upper(), ())
+        return [self._ids[position] for position in positions]
+
+    def get_entity_names(self):
+        """ The entity names of all instances, an empty name is a complex entity instance
+        """
+        return list(self._instances_of_entity.keys())
+
+    def get_entity_name(self, instance_id):
+        """ The entity name of an instance, its attributes are not parsed
+        """
+        return self._entity_names[self._entity_indices[self._get_position(instance_id)]]
+
+    def get_instance_source(self, instance_id):
+        """ The definition string of an instance as it is in the file
+        """
+        position = self._get_position(instance_id)
+        return self._data[self._starts[position]:self._ends[position]].decode('latin-1')
+
+    def get_instance_definition(self, instance_id):
+        """ Parses the definition of an instance, returns the same
+        (entity_name, entity_attrs_list) as Part21Parser
+        """
+        line = self.get_instance_source(instance_id).replace("\n","").replace("\r","")
+        match_instance_definition = INSTANCE_DEFINITION_RE.search(line)
+        if not match_instance_definition:
+            raise ValueError("Instance #%i can not be parsed: %s"%(instance_id, line))
+        instance_id, entity_name, entity_attrs = match_instance_definition.groups()
+        entity_attrs_list, str_len = Utils.process_nested_parent_str(entity_attrs)
+        return (entity_name,entity_attrs_list)
+
+    def iter_instances(self, entity_name=None):
+        """ Yields (instance id, (entity_name, entity_attrs_list)) of all instances,
+        or of the instances of entity_name only. The attributes are parsed one by one.
+        """
+        for instance_id in self.get_instance_ids(entity_name):
+            yield instance_id, self.get_instance_definition(instance_id)
+
+
+class LazyInstancesDefinition(Mapping):
+    """
+    Read only dict instance id -> (entity_name, entity_attrs_list) of an IndexedPart21Parser,
+    the definition is parsed on every access.
+    """
+    def __init__(self, parser):
+        self._parser = parser
+
+    def __getitem__(self, instance_id):
+        return self._parser.get_instance_definition(instance_id)
+
+    def __contains__(self, instance_id):
+        return self._parser.has_instance(instance_id)
+
+    def __iter__(self):
+        return iter(self._parser._ids)
+
+    def __len__(self):
+        return len(self._parser._ids)
+
 class EntityInstancesFactory(object):
     '''
     This class creates entity instances from the str definition
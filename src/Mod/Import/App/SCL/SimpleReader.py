@@ -54,11 +54,17 @@ class SimpleParser:
     Part21.Part21Parser._instance_definition : stores attributes, key is the instance integer id
     Part21.Part21Parser._number_of_ancestors : stores the number of ancestors of entity id. This enables
     to define the order of instances creation.
+
+    With lazy=True Part21.IndexedPart21Parser is used instead. It only indexes the file
+    and parses the instances on access, which makes inspecting huge files possible.
     """
-    def __init__(self, filename):
+    def __init__(self, filename, lazy=False):
         import time
         import sys
-        self._p21loader = Part21.Part21Parser(filename)
+        if lazy:
+            self._p21loader = Part21.IndexedPart21Parser(filename)
+        else:
+            self._p21loader = Part21.Part21Parser(filename)
         #self._p21loader._number_of_ancestors = {} # not needed, save memory
         self.schemaModule = None
         self.schemaClasses = None
@@ -66,6 +72,18 @@ class SimpleParser:
         #for i in self._p21loader._instances_definition.keys():
         #    print i,self._p21loader._instances_definition[i][0],self._p21loader._instances_definition[i][1]
 
+    def iterInstances(self,entityName=None):
+        """Yields (id, (entity name, attribute list)) of all instances or
+        of the instances of the entity entityName (e.g. 'PRODUCT') only"""
+        if isinstance(self._p21loader, Part21.IndexedPart21Parser):
+            for item in self._p21loader.iter_instances(entityName):
+                yield item
+            return
+        for i in list(self._p21loader._instances_definition.keys()):
+            instance_definition = self._p21loader._instances_definition[i]
+            if entityName is None or instance_definition[0] == entityName.upper():
+                yield i, instance_definition
+
     def _writeGraphVizEdge(self,num,attrList,file):
         for i in attrList:
             if isinstance(i,list):
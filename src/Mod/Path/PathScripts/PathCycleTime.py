@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+'''
+Cycle time estimation of paths, operations and jobs.
+
+The moves of a path are collected into arrays and all their times are computed at once.
+A MachineProfile describes the limits of the machine: the rapid rate and acceleration of
+each axis, the jerk, how much the machine may deviate from a corner to keep its speed
+and how long a tool change takes.
+
+With acceleration limits every move accelerates from its entry speed to its cruise speed
+and decelerates to its exit speed. The speeds at the junctions of the moves are limited by
+the angle between them (junction deviation) and by the distance available to accelerate
+and decelerate, which is a forward and a backward pass over all junctions. Both passes are
+done with cumulative minimums instead of a loop over the moves.
+
+All values are in FreeCAD's internal units: mm, mm/s, mm/s^2, mm/s^3 and seconds.
+'''
+
+import math
+import numpy
+
+import PathScripts.PathGeom as PathGeom
+import PathScripts.PathLog as PathLog
+import PathScripts.PathUtil as PathUtil
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+#PathLog.trackModule(PathLog.thisModule())
+
+# kinds of moves
+Rapid    = 0
+Straight = 1
+CW       = 2
+CCW      = 3
+Dwell    = 4
+
+CmdDwell       = ['G4', 'G04']
+CmdToolChange  = ['M6', 'M06']
+CmdCannedCycle = ['G73', 'G81', 'G82', 'G83', 'G84', 'G85', 'G86', 'G89']
+CmdCycleCancel = ['G80']
+CmdRetract     = ['G98', 'G99']
+CmdPeck        = ['G73', 'G83']
+CmdDwellAtDepth = ['G82', 'G86', 'G89']
+CmdFeedOut     = ['G84', 'G85', 'G89']
+
+
+class MachineProfile(object):
+    '''MachineProfile(rapidRates=None, accelerations=None, jerk=None, junctionDeviation=0.01, toolChangeTime=0.)
+    Limits of a machine:
+        rapidRates:         (X, Y, Z) rapid rates, None to use the rapid rates of the tool controllers
+        accelerations:      (X, Y, Z) accelerations, None for moves at constant speed
+        jerk:               jerk limit of all axes, None for unlimited jerk
+        junctionDeviation:  distance the machine may deviate from a corner without stopping
+        toolChangeTime:     duration of a tool change
+    The rapid rates also limit the feed rate of each axis.'''
+
+    def __init__(self, rapidRates=None, accelerations=None, jerk=None, junctionDeviation=0.01, toolChangeTime=0.):
+        self.rapidRates = rapidRates
+        self.accelerations = accelerations
+        self.jerk = jerk
+        self.junctionDeviation = junctionDeviation
+        self.toolChangeTime = toolChangeTime
+
+    def templateAttrs(self):
+        return {'rapidRates': self.rapidRates, 'accelerations': self.accelerations, 'jerk': self.jerk,
+                'junctionDeviation': self.junctionDeviation, 'toolChangeTime': self.toolChangeTime}
+
+    @classmethod
+    def fromTemplate(cls, attrs):
+        '''fromTemplate(attrs) ... returns the profile of a dictionary as returned by templateAttrs().'''
+        return cls(**attrs)
+
+
+class Moves(object):
+    '''Moves() ... the moves of paths collected into arrays.
+    Canned drilling cycles are expanded into their moves, dwells and tool changes are
+    moves of kind Dwell with a duration and without a length.'''
+
+    def __init__(self):
+        self.kinds = []
+        self.starts = []
+        self.ends = []
+        self.centers = []
+        self.feeds = []
+        self.dwells = []
+        self.toolChanges = 0
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind, start, end, center=(0., 0., 0.), feed=0., dwell=0.):
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.centers.append(center)
+        self.feeds.append(feed)
+        self.dwells.append(dwell)
+
+    def arrays(self):
+        '''arrays() ... returns (kind, start, end, center, feed, dwell) arrays of all moves.'''
+        return (numpy.array(self.kinds, dtype=numpy.int8),
+                numpy.array(self.starts, dtype=float).reshape(-1, 3),
+                numpy.array(self.ends, dtype=float).reshape(-1, 3),
+                numpy.array(self.centers, dtype=float).reshape(-1, 3),
+                numpy.array(self.feeds, dtype=float),
+                numpy.array(self.dwells, dtype=float))
+
+
+class MoveReader(object):
+    '''MoveReader(hFeed, vFeed, toolChangeTime=0., position=(0, 0, 0)) ... collects the moves of Path commands.
+    Feed moves without a feed rate use hFeed, or vFeed if they change the height.'''
+
+    def __init__(self, hFeed, vFeed, toolChangeTime=0., position=(0., 0., 0.)):
+        self.hFeed = hFeed
+        self.vFeed = vFeed
+        self.toolChangeTime = toolChangeTime
+        self.position = tuple(position)
+        self.feed = None
+        self.retract = 'G98'
+        self.initialZ = None
+        self.moves = Moves()
+
+    def feedFor(self, start, end):
+        if self.feed:
+            return self.feed
+        return self.vFeed if start[2] != end[2] else self.hFeed
+
+    def moveTo(self, kind, end, feed=None):
+        start = self.position
+        if end != start:
+            if kind != Rapid and feed is None:
+                feed = self.feedFor(start, end)
+            self.moves.add(kind, start, end, feed=feed or 0.)
+        self.position = end
+
+    def dwell(self, seconds):
+        self.moves.add(Dwell, self.position, self.position, dwell=seconds)
+
+    def read(self, commands):
+        '''read(commands) ... adds the moves of commands and returns the moves of all commands read so far.'''
+        for cmd in commands:
+            name = cmd.Name
+            if name[0] == '(':
+                continue
+            params = cmd.Parameters
+            if 'F' in params and params['F'] > 0:
+                self.feed = params['F']
+
+            if name in CmdCannedCycle:
+                self.cannedCycle(name, params)
+                continue
+            self.initialZ = None
+
+            if name in PathGeom.CmdMoveRapid or name in PathGeom.CmdMoveStraight:
+                (x, y, z) = self.position
+                end = (params.get('X', x), params.get('Y', y), params.get('Z', z))
+                self.moveTo(Rapid if name in PathGeom.CmdMoveRapid else Straight, end)
+            elif name in PathGeom.CmdMoveArc:
+                (x, y, z) = start = self.position
+                end = (params.get('X', x), params.get('Y', y), params.get('Z', z))
+                center = (x + params.get('I', 0.), y + params.get('J', 0.), z + params.get('K', 0.))
+                kind = CW if name in PathGeom.CmdMoveCW else CCW
+                self.moves.add(kind, start, end, center, self.feedFor(start, end))
+                self.position = end
+            elif name in CmdDwell:
+                self.dwell(params.get('P', 0.))
+            elif name in CmdToolChange:
+                self.moves.toolChanges += 1
+                self.dwell(self.toolChangeTime)
+            elif name in CmdRetract:
+                self.retract = name
+        return self.moves
+
+    def cannedCycle(self, name, params):
+        '''cannedCycle(name, params) ... adds the moves of a drilling cycle in absolute coordinates.'''
+        (x, y, z) = self.position
+        if self.initialZ is None:
+            self.initialZ = z
+        r = params.get('R', z)
+        depth = params.get('Z', z)
+        x = params.get('X', x)
+        y = params.get('Y', y)
+
+        if z < r:
+            self.moveTo(Rapid, (self.position[0], self.position[1], r))
+        self.moveTo(Rapid, (x, y, self.position[2]))
+        self.moveTo(Rapid, (x, y, r))
+
+        peck = params.get('Q', 0.)
+        if name in CmdPeck and peck > 0:
+            level = r
+            while level - peck > depth:
+                level -= peck
+                self.moveTo(Straight, (x, y, level))
+                if name in ['G83']:
+                    # retract to clear the chips and return to the last depth
+                    self.moveTo(Rapid, (x, y, r))
+                    self.moveTo(Rapid, (x, y, level))
+                else:
+                    self.dwell(0.)
+        self.moveTo(Straight, (x, y, depth))
+
+        if name in CmdDwellAtDepth:
+            self.dwell(params.get('P', 0.))
+
+        top = max(self.initialZ, r) if self.retract == 'G98' else r
+        if name in CmdFeedOut:
+            self.moveTo(Straight, (x, y, r))
+        self.moveTo(Rapid, (x, y, top))
+
+
+def _axisLimit(limits, direction):
+    '''Returns the largest value along each direction which doesn't exceed any of the per axis limits.'''
+    direction = numpy.fabs(direction)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return numpy.min(numpy.where(direction > 0, numpy.asarray(limits, dtype=float) / direction, numpy.inf), axis=1)
+
+
+def _phaseTimes(dv, a, jerk):
+    '''Returns the times to change the speed by dv with acceleration a and the jerk limit.'''
+    if not jerk:
+        return dv / a
+    full = dv >= a * a / jerk
+    return numpy.where(full, dv / a + a / jerk, 2 * numpy.sqrt(dv / jerk))
+
+
+def moveTimes(kind, start, end, center, feed, dwell, profile, rapidRates):
+    '''moveTimes(kind, start, end, center, feed, dwell, profile, rapidRates) ... returns (times, lengths) of all moves.
+    rapidRates are the (X, Y, Z) rapid rates, they are used if the profile doesn't define any.'''
+    n = len(kind)
+    if not n:
+        return (numpy.zeros(0), numpy.zeros(0))
+
+    d = end - start
+    chord = numpy.linalg.norm(d, axis=1)
+    lengths = chord.copy()
+    tStart = numpy.zeros((n, 3))
+    tEnd = numpy.zeros((n, 3))
+    lines = numpy.flatnonzero((kind <= Straight) & (chord > 0))
+    tStart[lines] = d[lines] / chord[lines, None]
+    tEnd[lines] = tStart[lines]
+
+    arcs = numpy.flatnonzero((kind == CW) | (kind == CCW))
+    radius = numpy.zeros(n)
+    if len(arcs):
+        a = start[arcs, :2] - center[arcs, :2]
+        b = end[arcs, :2] - center[arcs, :2]
+        r = numpy.hypot(a[:, 0], a[:, 1])
+        sign = numpy.where(kind[arcs] == CW, -1., 1.)
+        sweep = ((numpy.arctan2(b[:, 1], b[:, 0]) - numpy.arctan2(a[:, 1], a[:, 0])) * sign) % (2 * math.pi)
+        # start and end point coincide for full circles
+        sweep[numpy.hypot(*(b - a).T) <= PathGeom.Tolerance] = 2 * math.pi
+        dz = d[arcs, 2]
+        length = numpy.hypot(r * sweep, dz)
+        lengths[arcs] = length
+        radius[arcs] = r
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            h = numpy.where(length > 0, r * sweep / length, 0.) / numpy.where(r > 0, r, 1.)
+            vz = numpy.where(length > 0, dz / length, 0.)
+        tStart[arcs] = numpy.column_stack((-a[:, 1] * sign * h, a[:, 0] * sign * h, vz))
+        tEnd[arcs] = numpy.column_stack((-b[:, 1] * sign * h, b[:, 0] * sign * h, vz))
+
+    # the largest component of an arc's direction in the XY plane is its horizontal share
+    direction = numpy.fabs(tStart)
+    if len(arcs):
+        horizontal = numpy.hypot(tStart[arcs, 0], tStart[arcs, 1])
+        direction[arcs, 0] = horizontal
+        direction[arcs, 1] = horizontal
+
+    rates = profile.rapidRates if profile.rapidRates else rapidRates
+    vmax = _axisLimit(rates, direction)
+    moving = kind != Rapid
+    vmax[moving] = numpy.minimum(vmax[moving], feed[moving])
+    dwells = kind == Dwell
+    vmax[dwells] = 0.
+    moves = lengths > 0
+
+    times = dwell.copy()
+    if profile.accelerations is None:
+        times[moves] += lengths[moves] / vmax[moves]
+        return (times, lengths)
+
+    acc = _axisLimit(profile.accelerations, direction)
+    acc[~numpy.isfinite(acc)] = 1.
+    if len(arcs):
+        # centripetal acceleration
+        vmax[arcs] = numpy.minimum(vmax[arcs], numpy.sqrt(acc[arcs] * radius[arcs]))
+    vmax2 = vmax * vmax
+
+    # the squared speed limit of each junction, the path starts and ends at rest
+    junction = numpy.zeros(n + 1)
+    if n > 1:
+        cos = numpy.einsum('ij,ij->i', tEnd[:-1], tStart[1:])
+        sinHalf = numpy.sqrt(numpy.clip(0.5 * (1. + cos), 0., 1.))
+        with numpy.errstate(divide='ignore'):
+            deviation = numpy.minimum(acc[:-1], acc[1:]) * profile.junctionDeviation * sinHalf / (1. - sinHalf)
+        junction[1:-1] = numpy.minimum(numpy.minimum(vmax2[:-1], vmax2[1:]), deviation)
+
+    # forward and backward pass: v(b+1)^2 <= v(b)^2 + 2 a L
+    reach = 2. * acc * lengths
+    total = numpy.concatenate(([0.], numpy.cumsum(reach)))
+    forward = total + numpy.minimum.accumulate(junction - total)
+    speed2 = numpy.minimum.accumulate((forward + total)[::-1])[::-1] - total
+    speed2 = numpy.maximum(speed2, 0.)
+
+    u0 = speed2[:-1]
+    u1 = speed2[1:]
+    peak2 = numpy.maximum(numpy.minimum(vmax2, (reach + u0 + u1) / 2.), numpy.maximum(u0, u1))
+    vp = numpy.sqrt(peak2)
+    v0 = numpy.sqrt(u0)
+    v1 = numpy.sqrt(u1)
+    tAcc = _phaseTimes(vp - v0, acc, profile.jerk)
+    tDec = _phaseTimes(vp - v1, acc, profile.jerk)
+    cruise = numpy.maximum(lengths - (v0 + vp) / 2. * tAcc - (vp + v1) / 2. * tDec, 0.)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        cruiseTime = numpy.where(vp > 0, cruise / vp, 0.)
+    times[moves] += (tAcc + tDec + cruiseTime)[moves]
+    return (times, lengths)
+
+
+class PathTime(object):
+    '''PathTime(times, lengths, kinds, toolChanges) ... the estimated times of the moves of a path.'''
+
+    def __init__(self, times, lengths, kinds, toolChanges=0):
+        rapid = kinds == Rapid
+        dwell = kinds == Dwell
+        feed = ~(rapid | dwell)
+        self.time = float(times.sum())
+        self.rapidTime = float(times[rapid].sum())
+        self.feedTime = float(times[feed].sum())
+        self.dwellTime = float(times[dwell].sum())
+        self.rapidLength = float(lengths[rapid].sum())
+        self.feedLength = float(lengths[feed].sum())
+        self.toolChanges = toolChanges
+
+    def templateAttrs(self):
+        return {'time': self.time, 'rapidTime': self.rapidTime, 'feedTime': self.feedTime,
+                'dwellTime': self.dwellTime, 'rapidLength': self.rapidLength,
+                'feedLength': self.feedLength, 'toolChanges': self.toolChanges}
+
+
+def toolControllerRates(tc):
+    '''toolControllerRates(tc) ... returns (hFeed, vFeed, rapidRates) of tc.
+    Rapid rates which are not set are replaced by the feed rates, the same as Path.getCycleTime does.'''
+    hFeed = tc.HorizFeed.Value
+    vFeed = tc.VertFeed.Value
+    hRapid = tc.HorizRapid.Value or hFeed
+    vRapid = tc.VertRapid.Value or vFeed
+    return (hFeed, vFeed, (hRapid, hRapid, vRapid))
+
+
+def estimateCommands(commands, profile, hFeed, vFeed, rapidRates, position=(0., 0., 0.)):
+    '''estimateCommands(commands, profile, hFeed, vFeed, rapidRates, position=(0, 0, 0)) ... returns (PathTime, end position) of commands.'''
+    reader = MoveReader(hFeed, vFeed, profile.toolChangeTime, position)
+    moves = reader.read(commands)
+    (kind, start, end, center, feed, dwell) = moves.arrays()
+    (times, lengths) = moveTimes(kind, start, end, center, feed, dwell, profile, rapidRates)
+    return (PathTime(times, lengths, kind, moves.toolChanges), reader.position)
+
+
+def estimatePath(path, tc, profile=None):
+    '''estimatePath(path, tc, profile=None) ... returns the estimated cycle time of path in seconds.
+    The feed and rapid rates of tool controller tc are used where the path and the profile don't define them.
+    Without a profile the moves are assumed to run at constant speed.
+    Returns 0 if the feed rates of tc are not set.'''
+    if profile is None:
+        profile = MachineProfile()
+    (hFeed, vFeed, rapidRates) = toolControllerRates(tc)
+    if not hFeed or not vFeed:
+        return 0
+    return estimateCommands(path.Commands, profile, hFeed, vFeed, rapidRates)[0].time
+
+
+def estimateJob(job, profile=None):
+    '''estimateJob(job, profile=None) ... returns the estimated cycle time of all active operations of job.
+    The result is a dictionary with
+        time:           total time in seconds, tool changes included
+        toolChangeTime: time spent on tool changes
+        operations:     list of the times of every operation, see PathTime.templateAttrs, with the
+                        name, label and tool number of the operation
+        tools:          {tool number: time of all operations using the tool}
+        toolChanges:    list of the tool changes, each with the tool number, the labels of the
+                        operations until the next tool change and their time
+        skipped:        labels of the operations which are not estimated because the feed rates
+                        of their tool controller are not set, the time is incomplete if there are any
+    The operations are assumed to follow each other without a move in between, as they are posted.'''
+    if profile is None:
+        profile = MachineProfile()
+
+    result = {'time': 0., 'toolChangeTime': 0., 'operations': [], 'tools': {}, 'toolChanges': [], 'skipped': []}
+    position = (0., 0., 0.)
+    lastTool = None
+    change = None
+    for op in job.Operations.Group:
+        if PathUtil.opProperty(op, 'Active') is False:
+            continue
+        tc = PathUtil.toolControllerForOp(op)
+        if tc is None or not hasattr(op, 'Path'):
+            continue
+
+        (hFeed, vFeed, rapidRates) = toolControllerRates(tc)
+        if not hFeed or not vFeed:
+            PathLog.warning("%s: feed rates of %s are not set, the operation is not estimated" % (op.Label, tc.Label))
+            result['skipped'].append(op.Label)
+            continue
+
+        if tc.ToolNumber != lastTool:
+            lastTool = tc.ToolNumber
+            change = {'tool': tc.ToolNumber, 'time': profile.toolChangeTime, 'operations': []}
+            result['toolChanges'].append(change)
+            result['toolChangeTime'] += profile.toolChangeTime
+            result['time'] += profile.toolChangeTime
+
+        (opTime, position) = estimateCommands(op.Path.Commands, profile, hFeed, vFeed, rapidRates, position)
+        attrs = opTime.templateAttrs()
+        attrs.update({'name': op.Name, 'label': op.Label, 'tool': tc.ToolNumber})
+        result['operations'].append(attrs)
+        result['tools'][tc.ToolNumber] = result['tools'].get(tc.ToolNumber, 0.) + opTime.time
+        result['time'] += opTime.time
+        change['time'] += opTime.time
+        change['operations'].append(op.Label)
+
+    PathLog.debug("%s: %.1fs, %d tool changes" % (job.Label, result['time'], len(result['toolChanges'])))
+    return result
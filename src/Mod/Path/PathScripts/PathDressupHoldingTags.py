@@ -38,7 +38,9 @@ from PySide import QtCore
 from lazy_loader.lazy_loader import LazyLoader
 Part = LazyLoader('Part', globals(), 'Part')
 
-PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+LOG_MODULE = PathLog.thisModule()
+
+PathLog.setLevel(PathLog.Level.INFO, LOG_MODULE)
 #PathLog.trackModule()
 
 failures = []
@@ -49,7 +51,7 @@ def translate(context, text, disambig=None):
 
 
 def debugEdge(edge, prefix, force=False):
-    if force or PathLog.getLevel(PathLog.thisModule()) == PathLog.Level.DEBUG:
+    if force or PathLog.getLevel(LOG_MODULE) == PathLog.Level.DEBUG:
         pf = edge.valueAt(edge.FirstParameter)
         pl = edge.valueAt(edge.LastParameter)
         if type(edge.Curve) == Part.Line or type(edge.Curve) == Part.LineSegment:
@@ -60,7 +62,7 @@ def debugEdge(edge, prefix, force=False):
 
 
 def debugMarker(vector, label, color=None, radius=0.5):
-    if PathLog.getLevel(PathLog.thisModule()) == PathLog.Level.DEBUG:
+    if PathLog.getLevel(LOG_MODULE) == PathLog.Level.DEBUG:
         obj = FreeCAD.ActiveDocument.addObject("Part::Sphere", label)
         obj.Label = label
         obj.Radius = radius
@@ -70,7 +72,7 @@ def debugMarker(vector, label, color=None, radius=0.5):
 
 
 def debugCylinder(vector, r, height, label, color=None):
-    if PathLog.getLevel(PathLog.thisModule()) == PathLog.Level.DEBUG:
+    if PathLog.getLevel(LOG_MODULE) == PathLog.Level.DEBUG:
         obj = FreeCAD.ActiveDocument.addObject("Part::Cylinder", label)
         obj.Label = label
         obj.Radius = r
@@ -82,7 +84,7 @@ def debugCylinder(vector, r, height, label, color=None):
 
 
 def debugCone(vector, r1, r2, height, label, color=None):
-    if PathLog.getLevel(PathLog.thisModule()) == PathLog.Level.DEBUG:
+    if PathLog.getLevel(LOG_MODULE) == PathLog.Level.DEBUG:
         obj = FreeCAD.ActiveDocument.addObject("Part::Cone", label)
         obj.Label = label
         obj.Radius1 = r1
@@ -534,39 +536,19 @@ class MapWireToTag:
         return self.complete
 
 
-class _RapidEdges:
-    def __init__(self, rapid):
-        self.rapid = rapid
-
-    def isRapid(self, edge):
-        if type(edge.Curve) == Part.Line or type(edge.Curve) == Part.LineSegment:
-            v0 = edge.Vertexes[0]
-            v1 = edge.Vertexes[1]
-            for r in self.rapid:
-                r0 = r.Vertexes[0]
-                r1 = r.Vertexes[1]
-                if PathGeom.isRoughly(r0.X, v0.X) and PathGeom.isRoughly(r0.Y, v0.Y) and PathGeom.isRoughly(r0.Z, v0.Z) and PathGeom.isRoughly(r1.X, v1.X) and PathGeom.isRoughly(r1.Y, v1.Y) and PathGeom.isRoughly(r1.Z, v1.Z):
-                    return True
-        return False
-
-
 class PathData:
     def __init__(self, obj):
         PathLog.track(obj.Base.Name)
         self.obj = obj
-        self.wire, rapid = PathGeom.wireForPath(obj.Base.Path)
-        self.rapid = _RapidEdges(rapid)
-        if self.wire:
-            self.edges = self.wire.Edges
-        else:
-            self.edges = []
+        # the edges are only created for the moves which need them
+        self.edges = PathGeom.PathSegments(obj.Base.Path)
         self.baseWire = self.findBottomWire(self.edges)
 
     def findBottomWire(self, edges):
         (minZ, maxZ) = self.findZLimits(edges)
         self.minZ = minZ
         self.maxZ = maxZ
-        bottom = [e for e in edges if PathGeom.isRoughly(e.Vertexes[0].Point.z, minZ) and PathGeom.isRoughly(e.Vertexes[1].Point.z, minZ)]
+        bottom = [edges[i] for i in edges.horizontalAt(minZ)]
         self.bottomEdges = bottom
         try:
             wire = Part.Wire(bottom)
@@ -584,17 +566,7 @@ class PathData:
 
     def findZLimits(self, edges):
         # not considering arcs and spheres in Z direction, find the highest and lowest Z values
-        minZ = 99999999999
-        maxZ = -99999999999
-        for e in edges:
-            if self.rapid.isRapid(e):
-                continue
-            for v in e.Vertexes:
-                if v.Point.z < minZ:
-                    minZ = v.Point.z
-                if v.Point.z > maxZ:
-                    maxZ = v.Point.z
-        return (minZ, maxZ)
+        return edges.zLimits()
 
     def shortestAndLongestPathEdge(self):
         edges = sorted(self.bottomEdges, key=lambda e: e.Length)
@@ -846,6 +818,7 @@ class ObjectTagDressup:
         t = 0
         # inters = None
         edge = None
+        edgeIndex = None
 
         segm = 50
         if hasattr(obj, 'SegmentationFactor'):
@@ -863,10 +836,22 @@ class ObjectTagDressup:
         horizRapid = tc.HorizRapid.Value
         vertRapid = tc.VertRapid.Value
 
+        # moves which cannot intersect any tag are converted without creating their edges
+        touchesTag = pathData.edges.intersectsBoundBoxes([tag.solid.BoundBox for tag in tags if tag.enabled], 0.01)
+
         while edge or lastEdge < len(pathData.edges):
-            PathLog.debug("------- lastEdge = %d/%d.%d/%d" % (lastEdge, lastTag, t, len(tags)))
+            if not edge and not mapper and not touchesTag[lastEdge]:
+                if pathData.edges.isRapid(lastEdge):
+                    commands.append(self.rapidCommand(commands, pathData.edges.endPoint(lastEdge), horizRapid, vertRapid))
+                else:
+                    commands.extend(pathData.edges.commandsFor(lastEdge, segm=segm, hSpeed=horizFeed, vSpeed=vertFeed))
+                lastEdge += 1
+                t = 0
+                continue
+
             if not edge:
                 edge = pathData.edges[lastEdge]
+                edgeIndex = lastEdge
                 debugEdge(edge, "=======  new edge: %d/%d" % (lastEdge, len(pathData.edges)))
                 lastEdge += 1
                 # sameTag = None
@@ -876,6 +861,7 @@ class ObjectTagDressup:
                 if mapper.mappingComplete():
                     commands.extend(mapper.commands)
                     edge = mapper.tail
+                    edgeIndex = None
                     mapper = None
                 else:
                     edge = None
@@ -888,18 +874,14 @@ class ObjectTagDressup:
                     mapper = MapWireToTag(edge, tags[tIndex], i, segm, pathData.maxZ, hSpeed = horizFeed, vSpeed = vertFeed)
                     self.mappers.append(mapper)
                     edge = mapper.tail
+                    edgeIndex = None
 
             if not mapper and t >= len(tags):
                 # gone through all tags, consume edge and move on
                 if edge:
                     debugEdge(edge, '++++++++')
-                    if pathData.rapid.isRapid(edge):
-                        v = edge.Vertexes[1]
-                        if not commands and PathGeom.isRoughly(0, v.X) and PathGeom.isRoughly(0, v.Y) and not PathGeom.isRoughly(0, v.Z):
-                            # The very first move is just to move to ClearanceHeight
-                            commands.append(Path.Command('G0', {'Z': v.Z, 'F': horizRapid}))
-                        else:
-                            commands.append(Path.Command('G0', {'X': v.X, 'Y': v.Y, 'Z': v.Z, 'F': vertRapid}))
+                    if edgeIndex is not None and pathData.edges.isRapid(edgeIndex):
+                        commands.append(self.rapidCommand(commands, edge.Vertexes[1].Point, horizRapid, vertRapid))
                     else:
                         commands.extend(PathGeom.cmdsForEdge(edge, segm=segm, hSpeed = horizFeed, vSpeed = vertFeed))
                 edge = None
@@ -907,6 +889,12 @@ class ObjectTagDressup:
 
         return Path.Path(commands)
 
+    def rapidCommand(self, commands, v, horizRapid, vertRapid):
+        if not commands and PathGeom.isRoughly(0, v.x) and PathGeom.isRoughly(0, v.y) and not PathGeom.isRoughly(0, v.z):
+            # The very first move is just to move to ClearanceHeight
+            return Path.Command('G0', {'Z': v.z, 'F': horizRapid})
+        return Path.Command('G0', {'X': v.x, 'Y': v.y, 'Z': v.z, 'F': vertRapid})
+
     def problems(self):
         return list([m for m in self.mappers if m.haveProblem])
 
@@ -1008,7 +996,7 @@ class ObjectTagDressup:
         global failures # pylint: disable=global-statement
         failures = []
         tagID = 0
-        if PathLog.getLevel(PathLog.thisModule()) == PathLog.Level.DEBUG:
+        if PathLog.getLevel(LOG_MODULE) == PathLog.Level.DEBUG:
             for tag in self.tags:
                 tagID += 1
                 if tag.enabled:
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import math
+import re
+
+__title__ = "PathGCodeReader - streaming G-code reader"
+__author__ = "FreeCAD Developers"
+__url__ = "https://www.freecadweb.org"
+__doc__ = "Tokenizer and modal interpreter for G-code programs, used by the G-code importer."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+CmdMoveRapid = ['G0']
+CmdMoveStraight = ['G1']
+CmdMoveArc = ['G2', 'G3']
+CmdMove = CmdMoveRapid + CmdMoveStraight + CmdMoveArc
+CmdCannedCycle = ['G73', 'G81', 'G82', 'G83', 'G84', 'G85', 'G86', 'G89']
+CmdMotion = CmdMove + CmdCannedCycle
+
+# all axis and arc parameters are lengths, converted to mm for programs in inches
+Axes = ['X', 'Y', 'Z', 'A', 'B', 'C', 'U', 'V', 'W']
+LinearAxes = ['X', 'Y', 'Z', 'U', 'V', 'W']
+ArcParameters = ['I', 'J', 'K', 'R']
+ParameterOrder = Axes + ['I', 'J', 'K', 'R', 'Q', 'P', 'L', 'F']
+AxesSet = frozenset(Axes)
+
+# arc plane: (first axis, second axis, normal axis, center offsets)
+Planes = {
+    'G17': ('X', 'Y', 'Z', ('I', 'J')),
+    'G18': ('Z', 'X', 'Y', ('K', 'I')),
+    'G19': ('Y', 'Z', 'X', ('J', 'K')),
+}
+
+_Comment = re.compile(r'\([^)]*\)|;.*')
+_Word = re.compile(r'([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))')
+
+
+def tokenize(line):
+    '''tokenize(line) ... returns (words, comments) of a line of G-code.
+    words is a list of (letter, value) tuples, the letters in upper case and the values as floats.
+    comments is a list of the comments of the line, without the parentheses.
+    Line numbers, checksums, block delete and program delimiters are removed.'''
+    comments = []
+    if '(' in line or ';' in line:
+        for c in _Comment.findall(line):
+            comments.append(c[1:-1].strip() if c[0] == '(' else c[1:].strip())
+        line = _Comment.sub(' ', line)
+    if '*' in line:
+        line = line.split('*', 1)[0]
+    words = [(letter, float(value)) for (letter, value) in _Word.findall(line.upper()) if letter != 'N']
+    return (words, comments)
+
+
+def codeName(letter, value):
+    '''codeName(letter, value) ... returns the normalized name of a G or M code, e.g. G01 -> G1, G90.1 -> G90.1'''
+    if value == int(value):
+        return "%s%d" % (letter, value)
+    return "%s%g" % (letter, value)
+
+
+class GCodeReader(object):
+    '''GCodeReader() ... modal interpreter of G-code programs.
+    The reader keeps the modal state of the program: the motion mode, absolute or incremental
+    distances, the units, the arc plane, the arc center mode, the canned cycle parameters
+    and the selected tool. Every line is converted into commands with absolute coordinates in mm
+    and with arc centers relative to the start point of the arc, as Path expects them.
+    The reader does not keep any commands, read() is a generator and files are read line by line.'''
+
+    def __init__(self, keepComments=False):
+        self.keepComments = keepComments
+        self.motion = 'G0'
+        self.absolute = True
+        self.arcAbsolute = False
+        self.scale = 1.0
+        self.plane = 'G17'
+        self.retract = 'G98'
+        self.tool = 0
+        self.feed = None
+        self.position = dict((a, None) for a in Axes)
+        self.cycle = {}
+        self.lineCount = 0
+
+    def value(self, axis):
+        '''value(axis) ... returns the current value of axis, 0 if it was never set.'''
+        v = self.position[axis]
+        return 0.0 if v is None else v
+
+    def read(self, lines):
+        '''read(lines) ... generator of (name, parameters) tuples of the commands of lines.
+        Tool changes are returned as ('M6', {'T': tool}).'''
+        for line in lines:
+            self.lineCount += 1
+            (words, comments) = tokenize(line)
+            if self.keepComments:
+                for comment in comments:
+                    yield ('(%s)' % comment, {})
+            if words:
+                for cmd in self.readWords(words):
+                    yield cmd
+
+    def readFile(self, filename):
+        '''readFile(filename) ... generator of the commands of the file, which is read line by line.'''
+        with open(filename) as fp:
+            for cmd in self.read(fp):
+                yield cmd
+
+    def readWords(self, words):
+        '''readWords(words) ... generator of the commands of one line, given as list of (letter, value).'''
+        params = {}
+        codes = []
+        for (letter, value) in words:
+            if letter == 'G' or letter == 'M':
+                codes.append(codeName(letter, value))
+            else:
+                params[letter] = value
+
+        motion = None
+        toolChange = False
+        ignoreAxes = False
+        dwell = False
+        for code in codes:
+            if code in ['G0', 'G1', 'G2', 'G3'] or code in CmdCannedCycle:
+                motion = code
+            elif code == 'G80':
+                self.motion = None
+                self.cycle = {}
+                yield ('G80', {})
+            elif code == 'G90':
+                self.absolute = True
+            elif code == 'G91':
+                self.absolute = False
+            elif code == 'G90.1':
+                self.arcAbsolute = True
+            elif code == 'G91.1':
+                self.arcAbsolute = False
+            elif code == 'G20':
+                self.scale = 25.4
+            elif code == 'G21':
+                self.scale = 1.0
+            elif code in Planes:
+                if code != self.plane:
+                    self.plane = code
+                    yield (code, {})
+            elif code in ['G98', 'G99']:
+                if code != self.retract:
+                    self.retract = code
+                    yield (code, {})
+            elif code == 'G4':
+                dwell = True
+            elif code in ['G10', 'G28', 'G30', 'G53', 'G92', 'G92.1', 'G92.2', 'G92.3']:
+                # axis words of these codes are no moves in work coordinates
+                PathLog.debug("line %d: %s ignored" % (self.lineCount, code))
+                ignoreAxes = True
+            elif code == 'M6':
+                toolChange = True
+
+        if 'T' in params:
+            self.tool = int(params['T'])
+        if 'F' in params:
+            self.feed = params['F'] * self.scale
+
+        if motion is not None:
+            if motion in CmdCannedCycle and motion != self.motion:
+                self.cycle = {}
+            self.motion = motion
+
+        if dwell:
+            yield ('G4', {'P': params.get('P', 0.0)})
+        elif not ignoreAxes and self.motion is not None and not AxesSet.isdisjoint(params):
+            for cmd in self.readMotion(params):
+                yield cmd
+
+        if toolChange:
+            yield ('M6', {'T': self.tool})
+
+    def lengths(self, params):
+        '''lengths(params) ... returns params with all lengths converted to mm.'''
+        if self.scale == 1.0:
+            return params
+        return dict((k, v * self.scale if k in LinearAxes or k in ArcParameters or k == 'Q' else v) for (k, v) in params.items())
+
+    def readMotion(self, params):
+        params = self.lengths(params)
+        if self.motion in CmdCannedCycle:
+            for cmd in self.readCannedCycle(params):
+                yield cmd
+            return
+
+        position = self.position
+        start = dict(position) if self.motion in CmdMoveArc else position
+        out = {}
+        for (axis, v) in params.items():
+            if axis in AxesSet:
+                if not self.absolute:
+                    v += self.value(axis)
+                out[axis] = v
+                position[axis] = v
+
+        if self.motion in CmdMoveArc:
+            (a0, a1, _, offsets) = Planes[self.plane]
+            if 'R' in params:
+                center = self.arcCenter(start, params['R'], a0, a1)
+                if center is None:
+                    PathLog.warning("line %d: arc with invalid radius ignored" % self.lineCount)
+                    return
+                out[offsets[0]] = center[0]
+                out[offsets[1]] = center[1]
+            else:
+                for (axis, offset) in zip((a0, a1), offsets):
+                    v = params.get(offset, 0.0)
+                    if self.arcAbsolute and start[axis] is not None:
+                        v -= start[axis]
+                    out[offset] = v
+        # the feed is modal, every feed move carries it, also after lines which only set the feed
+        if self.feed is not None and (self.motion not in CmdMoveRapid or 'F' in params):
+            out['F'] = self.feed
+        yield (self.motion, out)
+
+    def arcCenter(self, start, radius, a0, a1):
+        '''arcCenter(start, radius, a0, a1) ... returns the center of an arc given by its radius,
+        relative to the start point. A negative radius selects the arc larger than a half circle.'''
+        x0 = 0.0 if start[a0] is None else start[a0]
+        y0 = 0.0 if start[a1] is None else start[a1]
+        dx = self.value(a0) - x0
+        dy = self.value(a1) - y0
+        d = math.sqrt(dx * dx + dy * dy)
+        r = abs(radius)
+        if d == 0 or d > 2 * r + 1e-6:
+            return None
+        h = math.sqrt(max(0.0, r * r - d * d / 4))
+        # the center is left of the chord for ccw arcs smaller than a half circle
+        side = 1.0 if self.motion == 'G3' else -1.0
+        if radius < 0:
+            side = -side
+        return (dx / 2 - side * h * dy / d, dy / 2 + side * h * dx / d)
+
+    def readCannedCycle(self, params):
+        '''readCannedCycle(params) ... returns the holes of a canned cycle with absolute Z and R.
+        In incremental mode X and Y are relative to the previous hole, R is relative to the
+        initial level and Z relative to R. Repeats given by L are returned as separate holes.'''
+        (a0, a1, an, _) = Planes[self.plane]
+        initial = self.value(an)
+        cycle = self.cycle
+        if 'R' in params:
+            cycle['R'] = params['R'] if self.absolute else initial + params['R']
+        if an in params:
+            cycle['depth'] = params[an] if self.absolute else cycle.get('R', initial) + params[an]
+        for p in ['Q', 'P']:
+            if p in params:
+                cycle[p] = params[p]
+
+        repeat = int(params.get('L', 1)) if not self.absolute else 1
+        for _ in range(max(1, repeat)):
+            out = {}
+            for axis in (a0, a1):
+                if axis in params:
+                    v = params[axis]
+                    if not self.absolute:
+                        v += self.value(axis)
+                    self.position[axis] = v
+                out[axis] = self.value(axis)
+            if 'depth' in cycle:
+                out[an] = cycle['depth']
+            out['R'] = cycle.get('R', initial)
+            for p in ['Q', 'P']:
+                if p in cycle:
+                    out[p] = cycle[p]
+            if self.feed is not None:
+                out['F'] = self.feed
+            # the tool ends at the initial level for G98 and at R for G99
+            self.position[an] = max(initial, out['R']) if self.retract == 'G98' else out['R']
+            yield (self.motion, out)
+
+
+def commandString(name, params, precision=6):
+    '''commandString(name, params, precision=6) ... returns the G-code line of a command, as Path.Command() parses it.'''
+    words = [name]
+    for p in ParameterOrder:
+        if p in params:
+            v = ("%.*f" % (precision, params[p])).rstrip('0').rstrip('.')
+            if v in ['-0', '']:
+                v = '0'
+            words.append(p + v)
+    return " ".join(words)
+
+
+class GCodeStatistics(object):
+    '''GCodeStatistics(rapidFeed=5000.) ... accumulates statistics of commands returned by a GCodeReader.
+    The extents, the rapid and cut lengths and an estimated machining time are collected
+    without keeping the commands, so the memory does not grow with the size of the program.
+    Feeds are expected in mm/min, the rapid moves are assumed to run at rapidFeed mm/min.'''
+
+    def __init__(self, rapidFeed=5000.):
+        self.rapidFeed = rapidFeed
+        self.position = {'X': None, 'Y': None, 'Z': None}
+        self.boundMin = {'X': None, 'Y': None, 'Z': None}
+        self.boundMax = {'X': None, 'Y': None, 'Z': None}
+        self.plane = 'G17'
+        self.retract = 'G98'
+        self.feed = None
+        self.commands = 0
+        self.toolChanges = 0
+        self.tools = set()
+        self.rapidLength = 0.0
+        self.cutLength = 0.0
+        self.time = 0.0
+
+    def include(self, axis, v):
+        if self.boundMin[axis] is None or v < self.boundMin[axis]:
+            self.boundMin[axis] = v
+        if self.boundMax[axis] is None or v > self.boundMax[axis]:
+            self.boundMax[axis] = v
+
+    def moveTo(self, params, rapid):
+        length = 0.0
+        for axis in ['X', 'Y', 'Z']:
+            if axis in params:
+                v = params[axis]
+                if self.position[axis] is not None:
+                    length += (v - self.position[axis]) ** 2
+                self.position[axis] = v
+                self.include(axis, v)
+        self.addLength(math.sqrt(length), rapid)
+
+    def addLength(self, length, rapid):
+        if rapid:
+            self.rapidLength += length
+            if self.rapidFeed:
+                self.time += length / self.rapidFeed * 60
+        else:
+            self.cutLength += length
+            if self.feed:
+                self.time += length / self.feed * 60
+
+    def arcTo(self, name, params):
+        (a0, a1, an, offsets) = Planes[self.plane]
+        x0 = self.position[a0] or 0.0
+        y0 = self.position[a1] or 0.0
+        z0 = self.position[an] or 0.0
+        cx = x0 + params.get(offsets[0], 0.0)
+        cy = y0 + params.get(offsets[1], 0.0)
+        x1 = params.get(a0, x0)
+        y1 = params.get(a1, y0)
+        z1 = params.get(an, z0)
+        r = math.hypot(x0 - cx, y0 - cy)
+        s = math.atan2(y0 - cy, x0 - cx)
+        e = math.atan2(y1 - cy, x1 - cx)
+        if name == 'G2':
+            sweep = s - e
+        else:
+            sweep = e - s
+        if sweep <= 1e-9:
+            sweep += 2 * math.pi
+        # the extreme points of the circle inside the sweep
+        for k in range(4):
+            angle = k * math.pi / 2
+            d = (angle - s) if name == 'G3' else (s - angle)
+            if d % (2 * math.pi) < sweep:
+                self.include(a0, cx + r * math.cos(angle))
+                self.include(a1, cy + r * math.sin(angle))
+        for (axis, v) in ((a0, x1), (a1, y1), (an, z1)):
+            self.position[axis] = v
+            self.include(axis, v)
+        self.addLength(math.hypot(r * sweep, z1 - z0), False)
+
+    def cannedCycle(self, name, params):
+        (a0, a1, an, _) = Planes[self.plane]
+        initial = self.position[an]
+        if initial is None:
+            initial = params['R']
+        self.moveTo(dict((a, params[a]) for a in (a0, a1)), True)
+        r = params['R']
+        depth = params.get(an, r)
+        self.moveTo({an: r}, True)
+        self.moveTo({an: depth}, False)
+        if 'P' in params and name in ['G82', 'G86', 'G89']:
+            self.time += params['P']
+        # feed out for boring and tapping cycles
+        self.moveTo({an: r}, name not in ['G84', 'G85', 'G89'])
+        if self.retract == 'G98' and initial > r:
+            self.moveTo({an: initial}, True)
+
+    def add(self, name, params, feed=None):
+        '''add(name, params, feed=None) ... adds the command to the statistics.
+        feed is the modal feed of the program, like GCodeReader.feed, used for commands without F.'''
+        self.commands += 1
+        if 'F' in params:
+            self.feed = params['F']
+        elif feed is not None:
+            self.feed = feed
+        if name in CmdMoveRapid:
+            self.moveTo(params, True)
+        elif name in CmdMoveStraight:
+            self.moveTo(params, False)
+        elif name in CmdMoveArc:
+            self.arcTo(name, params)
+        elif name in CmdCannedCycle:
+            self.cannedCycle(name, params)
+        elif name in Planes:
+            self.plane = name
+        elif name in ['G98', 'G99']:
+            self.retract = name
+        elif name == 'G4':
+            self.time += params.get('P', 0.0)
+        elif name == 'M6':
+            self.toolChanges += 1
+            self.tools.add(params['T'])
+
+    def result(self):
+        '''result() ... returns the statistics as dictionary.'''
+        return {
+            'commands': self.commands,
+            'toolChanges': self.toolChanges,
+            'tools': sorted(self.tools),
+            'boundMin': dict(self.boundMin),
+            'boundMax': dict(self.boundMax),
+            'rapidLength': self.rapidLength,
+            'cutLength': self.cutLength,
+            'time': self.time,
+        }
+
+
+def statistics(lines, rapidFeed=5000.):
+    '''statistics(lines, rapidFeed=5000.) ... returns the statistics of a G-code program, see GCodeStatistics.
+    lines can be any iterable of lines, like an open file.'''
+    reader = GCodeReader()
+    stats = GCodeStatistics(rapidFeed)
+    for (name, params) in reader.read(lines):
+        stats.add(name, params, reader.feed)
+    result = stats.result()
+    result['lines'] = reader.lineCount
+    return result
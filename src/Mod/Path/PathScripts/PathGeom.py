@@ -24,6 +24,7 @@ import FreeCAD
 import Path
 import PathScripts.PathLog as PathLog
 import math
+import numpy
 
 from FreeCAD import Vector
 from PySide import QtCore
@@ -39,8 +40,10 @@ __doc__ = "Functions to extract and convert between Path.Command and Part.Edge a
 
 Tolerance = 0.000001
 
-PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
-#PathLog.trackModule(PathLog.thisModule())
+LOG_MODULE = PathLog.thisModule()
+
+PathLog.setLevel(PathLog.Level.INFO, LOG_MODULE)
+#PathLog.trackModule(LOG_MODULE)
 
 # Qt translation handling
 def translate(context, text, disambig=None):
@@ -306,8 +309,10 @@ def edgeForCmd(cmd, startPoint):
     """edgeForCmd(cmd, startPoint).
     Returns an Edge representing the given command, assuming a given startPoint."""
 
-    PathLog.debug("cmd: {}".format(cmd))
-    PathLog.debug("startpoint {}".format(startPoint))
+    debug = PathLog.getLevel(LOG_MODULE) == PathLog.Level.DEBUG
+    if debug:
+        PathLog.debug("cmd: {}".format(cmd))
+        PathLog.debug("startpoint {}".format(startPoint))
 
     endPoint = commandEndPoint(cmd, startPoint)
     if (cmd.Name in CmdMoveStraight) or (cmd.Name in CmdMoveRapid):
@@ -317,52 +322,57 @@ def edgeForCmd(cmd, startPoint):
 
     if cmd.Name in CmdMoveArc:
         center = startPoint + commandEndPoint(cmd, Vector(0,0,0), 'I', 'J', 'K')
-        A = xy(startPoint - center)
-        B = xy(endPoint - center)
-        d = -B.x * A.y + B.y * A.x
+        return _edgeForArc(startPoint, endPoint, center, cmd.Name in CmdMoveCW, debug)
+    return None
 
-        if isRoughly(d, 0, 0.005):
+def _edgeForArc(startPoint, endPoint, center, cw, debug=False):
+    """_edgeForArc(startPoint, endPoint, center, cw, debug=False)
+    Returns an arc or a helix from startPoint to endPoint around center."""
+    A = xy(startPoint - center)
+    B = xy(endPoint - center)
+    d = -B.x * A.y + B.y * A.x
+
+    if isRoughly(d, 0, 0.005):
+        if debug:
             PathLog.debug("Half circle arc at: (%.2f, %.2f, %.2f)" % (center.x, center.y, center.z))
-            # we're dealing with half a circle here
-            angle = getAngle(A) + math.pi/2
-            if cmd.Name in CmdMoveCW:
-                angle -= math.pi
-        else:
-            C = A + B
-            angle = getAngle(C)
+        # we're dealing with half a circle here
+        angle = getAngle(A) + math.pi/2
+        if cw:
+            angle -= math.pi
+    else:
+        C = A + B
+        angle = getAngle(C)
+        if debug:
             PathLog.debug("Arc (%8f) at: (%.2f, %.2f, %.2f) -> angle=%f" % (d, center.x, center.y, center.z, angle / math.pi))
 
-        R = A.Length
+    R = A.Length
+    if debug:
         PathLog.debug("arc: p1=(%.2f, %.2f) p2=(%.2f, %.2f) -> center=(%.2f, %.2f)" % (startPoint.x, startPoint.y, endPoint.x, endPoint.y, center.x, center.y))
         PathLog.debug("arc: A=(%.2f, %.2f) B=(%.2f, %.2f) -> d=%.2f" % (A.x, A.y, B.x, B.y, d))
         PathLog.debug("arc: R=%.2f angle=%.2f" % (R, angle/math.pi))
-        if isRoughly(startPoint.z, endPoint.z):
-            midPoint = center + Vector(math.cos(angle), math.sin(angle), 0) * R
+    if isRoughly(startPoint.z, endPoint.z):
+        midPoint = center + Vector(math.cos(angle), math.sin(angle), 0) * R
+        if debug:
             PathLog.debug("arc: (%.2f, %.2f) -> (%.2f, %.2f) -> (%.2f, %.2f)" % (startPoint.x, startPoint.y, midPoint.x, midPoint.y, endPoint.x, endPoint.y))
             PathLog.debug("StartPoint:{}".format(startPoint))
             PathLog.debug("MidPoint:{}".format(midPoint))
             PathLog.debug("EndPoint:{}".format(endPoint))
 
-            return Part.Edge(Part.Arc(startPoint, midPoint, endPoint))
-
-        # It's a Helix
-        #print('angle: A=%.2f B=%.2f' % (getAngle(A)/math.pi, getAngle(B)/math.pi))
-        if cmd.Name in CmdMoveCW:
-            cw = True
-        else:
-            cw = False
-        angle = diffAngle(getAngle(A), getAngle(B), 'CW' if cw else 'CCW')
-        height = endPoint.z - startPoint.z
-        pitch = height * math.fabs(2 * math.pi / angle)
-        if angle > 0:
-            cw = not cw
-        #print("Helix: R=%.2f h=%.2f angle=%.2f pitch=%.2f" % (R, height, angle/math.pi, pitch))
-        helix = Part.makeHelix(pitch, height, R, 0, not cw)
-        helix.rotate(Vector(), Vector(0,0,1), 180 * getAngle(A) / math.pi)
-        e = helix.Edges[0]
-        helix.translate(startPoint - e.valueAt(e.FirstParameter))
-        return helix.Edges[0]
-    return None
+        return Part.Edge(Part.Arc(startPoint, midPoint, endPoint))
+
+    # It's a Helix
+    #print('angle: A=%.2f B=%.2f' % (getAngle(A)/math.pi, getAngle(B)/math.pi))
+    angle = diffAngle(getAngle(A), getAngle(B), 'CW' if cw else 'CCW')
+    height = endPoint.z - startPoint.z
+    pitch = height * math.fabs(2 * math.pi / angle)
+    if angle > 0:
+        cw = not cw
+    #print("Helix: R=%.2f h=%.2f angle=%.2f pitch=%.2f" % (R, height, angle/math.pi, pitch))
+    helix = Part.makeHelix(pitch, height, R, 0, not cw)
+    helix.rotate(Vector(), Vector(0,0,1), 180 * getAngle(A) / math.pi)
+    e = helix.Edges[0]
+    helix.translate(startPoint - e.valueAt(e.FirstParameter))
+    return helix.Edges[0]
 
 def wireForPath(path, startPoint = Vector(0, 0, 0)):
     """wireForPath(path, [startPoint=Vector(0,0,0)])
@@ -400,6 +410,173 @@ def wiresForPath(path, startPoint = Vector(0, 0, 0)):
             wires.append(Part.Wire(edges))
     return wires
 
+class PathSegments(object):
+    """PathSegments(path, [startPoint=Vector(0,0,0)])
+    Lightweight geometry of all moves of a path, the same moves wireForPath turns into edges.
+    The start and end points, the arc centers and the kind of every move are kept in arrays,
+    queries like z-limits, lengths and bounding boxes are answered from them directly.
+    Edges are only created when they are accessed and then cached, the object can be used
+    as a sequence of edges."""
+
+    Rapid    = 0
+    Straight = 1
+    CW       = 2
+    CCW      = 3
+
+    def __init__(self, path, startPoint = Vector(0, 0, 0)):
+        kinds = []
+        starts = []
+        ends = []
+        centers = []
+        self.commandIndex = []
+        x, y, z = startPoint.x, startPoint.y, startPoint.z
+        commands = path.Commands if hasattr(path, "Commands") else []
+        for i, cmd in enumerate(commands):
+            name = cmd.Name
+            if name in CmdMoveStraight or name in CmdMoveRapid:
+                kind = self.Rapid if name in CmdMoveRapid else self.Straight
+                center = (0., 0., 0.)
+            elif name in CmdMoveArc:
+                kind = self.CW if name in CmdMoveCW else self.CCW
+            else:
+                continue
+            params = cmd.Parameters
+            end = (params.get('X', x), params.get('Y', y), params.get('Z', z))
+            if kind in (self.Rapid, self.Straight):
+                if isRoughly(x, end[0]) and isRoughly(y, end[1]) and isRoughly(z, end[2]):
+                    continue
+            else:
+                center = (x + params.get('I', 0.), y + params.get('J', 0.), z + params.get('K', 0.))
+            kinds.append(kind)
+            starts.append((x, y, z))
+            ends.append(end)
+            centers.append(center)
+            self.commandIndex.append(i)
+            x, y, z = end
+        self.kind = numpy.array(kinds, dtype=numpy.int8)
+        self.start = numpy.array(starts, dtype=float).reshape(-1, 3)
+        self.end = numpy.array(ends, dtype=float).reshape(-1, 3)
+        self.center = numpy.array(centers, dtype=float).reshape(-1, 3)
+        self.edges = {}
+
+    def __len__(self):
+        return len(self.kind)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError(i)
+        return self.edge(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.edge(i)
+
+    def startPoint(self, i):
+        return Vector(*self.start[i])
+
+    def endPoint(self, i):
+        return Vector(*self.end[i])
+
+    def isRapid(self, i):
+        return self.kind[i] == self.Rapid
+
+    def isArc(self, i):
+        return self.kind[i] >= self.CW
+
+    def edge(self, i):
+        """edge(i) ... returns the edge of move i, which is created on first access."""
+        edge = self.edges.get(i)
+        if edge is None:
+            startPoint = self.startPoint(i)
+            endPoint = self.endPoint(i)
+            if self.isArc(i):
+                edge = _edgeForArc(startPoint, endPoint, Vector(*self.center[i]), self.kind[i] == self.CW)
+            else:
+                edge = Part.Edge(Part.LineSegment(startPoint, endPoint))
+            self.edges[i] = edge
+        return edge
+
+    def wire(self):
+        """wire() ... returns a wire of all moves, or None if there are none."""
+        if not len(self):
+            return None
+        return Part.Wire(list(self))
+
+    def rapidEdges(self):
+        return [self.edge(i) for i in numpy.flatnonzero(self.kind == self.Rapid)]
+
+    def zLimits(self, includeRapid = False):
+        """zLimits([includeRapid=False]) ... returns (minZ, maxZ) of the start and end points of the moves."""
+        sel = slice(None) if includeRapid else self.kind != self.Rapid
+        z = numpy.concatenate((self.start[sel, 2], self.end[sel, 2]))
+        if not len(z):
+            return (99999999999, -99999999999)
+        return (float(z.min()), float(z.max()))
+
+    def horizontalAt(self, z, error = Tolerance):
+        """horizontalAt(z, [error=Tolerance]) ... returns the indices of the moves which start and end at height z."""
+        return numpy.flatnonzero((numpy.fabs(self.start[:, 2] - z) <= error) & (numpy.fabs(self.end[:, 2] - z) <= error))
+
+    def radii(self):
+        return numpy.hypot(self.start[:, 0] - self.center[:, 0], self.start[:, 1] - self.center[:, 1])
+
+    def lengths(self):
+        """lengths() ... returns the lengths of all moves, arcs and helices included."""
+        lengths = numpy.linalg.norm(self.end - self.start, axis=1)
+        arcs = numpy.flatnonzero(self.kind >= self.CW)
+        if len(arcs):
+            a = self.start[arcs, :2] - self.center[arcs, :2]
+            b = self.end[arcs, :2] - self.center[arcs, :2]
+            sweep = numpy.arctan2(b[:, 1], b[:, 0]) - numpy.arctan2(a[:, 1], a[:, 0])
+            sweep = numpy.where(self.kind[arcs] == self.CW, -sweep, sweep) % (2 * math.pi)
+            # start and end point coincide for full circles
+            sweep[numpy.hypot(*(b - a).T) <= Tolerance] = 2 * math.pi
+            r = numpy.hypot(a[:, 0], a[:, 1])
+            lengths[arcs] = numpy.hypot(r * sweep, self.end[arcs, 2] - self.start[arcs, 2])
+        return lengths
+
+    def boundBoxes(self):
+        """boundBoxes() ... returns (lower, upper) corners of the bounding boxes of all moves.
+        The boxes of arcs contain the full circle, they are used to rule out intersections."""
+        lower = numpy.minimum(self.start, self.end)
+        upper = numpy.maximum(self.start, self.end)
+        arcs = numpy.flatnonzero(self.kind >= self.CW)
+        if len(arcs):
+            r = self.radii()[arcs]
+            lower[arcs, :2] = self.center[arcs, :2] - r[:, None]
+            upper[arcs, :2] = self.center[arcs, :2] + r[:, None]
+        return (lower, upper)
+
+    def intersectsBoundBoxes(self, boxes, error = Tolerance):
+        """intersectsBoundBoxes(boxes, [error=Tolerance]) ... returns a boolean array which is True
+        for all moves whose bounding box intersects any of the given FreeCAD.BoundBox objects."""
+        (lower, upper) = self.boundBoxes()
+        result = numpy.zeros(len(self), dtype=bool)
+        for bb in boxes:
+            result |= numpy.all(lower <= (bb.XMax + error, bb.YMax + error, bb.ZMax + error), axis=1) & \
+                      numpy.all(upper >= (bb.XMin - error, bb.YMin - error, bb.ZMin - error), axis=1)
+        return result
+
+    def commandsFor(self, i, segm = 50, hSpeed = 0, vSpeed = 0):
+        """commandsFor(i, [segm=50], [hSpeed=0], [vSpeed=0]) ... returns the commands of move i,
+        the same cmdsForEdge returns for its edge. Only helices need the edge to be created."""
+        startPoint = self.startPoint(i)
+        endPoint = self.endPoint(i)
+        params = {'X': endPoint.x, 'Y': endPoint.y, 'Z': endPoint.z}
+        if not self.isArc(i):
+            if hSpeed > 0 and vSpeed > 0:
+                params.update({'F': speedBetweenPoints(endPoint, startPoint, hSpeed, vSpeed)})
+            return [Path.Command('G1', params)]
+        if not isRoughly(startPoint.z, endPoint.z):
+            return cmdsForEdge(self.edge(i), segm=segm, hSpeed=hSpeed, vSpeed=vSpeed)
+        offset = Vector(*self.center[i]) - startPoint
+        params.update({'I': offset.x, 'J': offset.y, 'K': 0})
+        if hSpeed > 0:
+            params.update({'F': hSpeed})
+        return [Path.Command('G2' if self.kind[i] == self.CW else 'G3', params)]
+
 def arcToHelix(edge, z0, z1):
     """arcToHelix(edge, z0, z1)
     Assuming edge is an arc it'll return a helix matching the arc starting at z0 and rising/falling to z1."""
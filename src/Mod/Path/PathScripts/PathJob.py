@@ -105,6 +105,26 @@ class NotificationClass(QtCore.QObject):
 Notification = NotificationClass()
 
 
+def formatCycleTime(seconds):
+    '''formatCycleTime(seconds) ... returns seconds in HH:MM:SS format.'''
+    return time.strftime("%H:%M:%S", time.gmtime(seconds))
+
+
+def opCycleTime(op):
+    '''opCycleTime(op) ... returns the cycle time of op in seconds, 0 if it is unknown.
+    The numeric value of the last execution of op is used if available, otherwise the
+    formatted CycleTime of op, for instance after the document was restored.'''
+    cache = getattr(getattr(op, 'Proxy', None), 'pathCache', None)
+    if cache:
+        return cache[2]
+    try:
+        # Convert the formatted time from HH:MM:SS to just seconds
+        seconds = sum(x * int(t) for x, t in zip([1, 60, 3600], reversed(op.CycleTime.split(":"))))
+    except Exception:  # pylint: disable=broad-except
+        return 0
+    return max(seconds, 0)
+
+
 class ObjectJob:
 
     def __init__(self, obj, models, templateFile=None):
@@ -223,6 +243,10 @@ class ObjectJob:
         PathLog.track(obj.Label, arg2)
         doc = obj.Document
 
+        # the OCL STLs of 3D Surface and Waterline ops are not needed anymore
+        import PathScripts.PathSurfaceSupport as PathSurfaceSupport
+        PathSurfaceSupport.clearSTLCache(doc)
+
         if getattr(obj, 'Operations', None):
             # the first to tear down are the ops, they depend on other resources
             PathLog.debug('taking down ops: %s' % [o.Name for o in self.allOperations()])
@@ -419,32 +443,39 @@ class ObjectJob:
             self.getCycleTime()
 
     def getCycleTime(self):
-        seconds = 0
+        '''getCycleTime() ... sums the cycle times of all active operations into the job's CycleTime.'''
+        self.cycleTimes = {}
+        for op in self.obj.Operations.Group:
 
-        if len(self.obj.Operations.Group):
-            for op in self.obj.Operations.Group:
+            # Skip inactive operations
+            if PathUtil.opProperty(op, 'Active') is False:
+                continue
 
-                # Skip inactive operations
-                if PathUtil.opProperty(op, 'Active') is False:
-                    continue
+            # Dressups report the cycle time of their base operation
+            base = op
+            while not hasattr(base, 'CycleTime') and hasattr(base, 'Base'):
+                base = base.Base
 
-                # Skip operations that don't have a cycletime attribute
-                if PathUtil.opProperty(op, 'CycleTime') is None:
-                    continue
+            # Skip operations that don't have a cycletime attribute
+            if not hasattr(base, 'CycleTime'):
+                continue
 
-                formattedCycleTime = PathUtil.opProperty(op, 'CycleTime')
-                opCycleTime = 0
-                try:
-                    # Convert the formatted time from HH:MM:SS to just seconds
-                    opCycleTime = sum(x * int(t) for x, t in zip([1, 60, 3600], reversed(formattedCycleTime.split(":"))))
-                except Exception:
-                    continue
+            self.cycleTimes[base.Name] = opCycleTime(base)
 
-                if opCycleTime > 0:
-                    seconds = seconds + opCycleTime
+        self.cycleTimeTotal = sum(self.cycleTimes.values())
+        self.obj.CycleTime = formatCycleTime(self.cycleTimeTotal)
 
-        cycleTimeString = time.strftime("%H:%M:%S", time.gmtime(seconds))
-        self.obj.CycleTime = cycleTimeString
+    def updateCycleTime(self, op, seconds):
+        '''updateCycleTime(op, seconds) ... replaces the cycle time of op in the job's CycleTime.
+        Operations which are not part of the running total yet cause all cycle times to be summed again.'''
+        cycleTimes = getattr(self, 'cycleTimes', None)
+        if cycleTimes is None or op.Name not in cycleTimes:
+            self.getCycleTime()
+            return
+        if seconds != cycleTimes[op.Name]:
+            self.cycleTimeTotal += seconds - cycleTimes[op.Name]
+            cycleTimes[op.Name] = seconds
+            self.obj.CycleTime = formatCycleTime(self.cycleTimeTotal)
 
     def addOperation(self, op, before=None, removeBefore=False):
         group = self.obj.Operations.Group
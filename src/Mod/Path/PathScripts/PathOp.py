@@ -25,8 +25,10 @@ import time
 from PySide import QtCore
 
 import Path
+import PathScripts.PathCycleTime as PathCycleTime
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
+import PathScripts.PathOpCache as PathOpCache
 import PathScripts.PathPreferences as PathPreferences
 import PathScripts.PathUtil as PathUtil
 import PathScripts.PathUtils as PathUtils
@@ -186,6 +188,7 @@ class ObjectOp(object):
         self.vertFeed = None
         self.vertRapid = None
         self.addNewProps = None
+        self.pathCache = None
 
         self.initOperation(obj)
 
@@ -503,12 +506,16 @@ class ObjectOp(object):
         opExecute(obj) - which is expected to add the generated commands to self.commandlist
         Finally the base implementation adds a rapid move to clearance height and assigns
         the receiver's Path property from the command list.
+        The generated Path is cached with a key of all its inputs, see PathOpCache. If none
+        of them changed since the last execution the cached Path is assigned again without
+        calling opExecute(obj).
         '''
         PathLog.track()
 
         if not obj.Active:
             path = Path.Path("(inactive operation)")
             obj.Path = path
+            self.pathCache = None
             return
 
         if not self._setBaseAndStock(obj):
@@ -544,6 +551,16 @@ class ObjectOp(object):
         # in case they still have an expression referencing any op values
         obj.recompute()
 
+        cache = getattr(self, 'pathCache', None)
+        if cache and cache[0] == PathOpCache.opInputKey(obj, self.job):
+            PathLog.debug("%s: inputs unchanged, using cached path" % obj.Label)
+            (key, path, seconds, cycleTime, result) = cache
+            obj.Path = path
+            obj.CycleTime = cycleTime
+            self.job.Proxy.updateCycleTime(obj, seconds)
+            return result
+        self.pathCache = None
+
         self.commandlist = []
         self.commandlist.append(Path.Command("(%s)" % obj.Label))
         if obj.Comment:
@@ -557,17 +574,26 @@ class ObjectOp(object):
 
         path = Path.Path(self.commandlist)
         obj.Path = path
-        obj.CycleTime = self.getCycleTimeEstimate(obj)
-        self.job.Proxy.getCycleTime()
+        (seconds, cycleTime) = self.cycleTimeEstimate(obj)
+        obj.CycleTime = cycleTime
+        # opExecute might have updated some properties, the key is taken after it finished
+        self.pathCache = (PathOpCache.opInputKey(obj, self.job), path, seconds, cycleTime, result)
+        self.job.Proxy.updateCycleTime(obj, seconds)
         return result
 
     def getCycleTimeEstimate(self, obj):
+        '''getCycleTimeEstimate(obj) ... returns the cycle time of obj's Path in HH:MM:SS format, or an error message.'''
+        return self.cycleTimeEstimate(obj)[1]
+
+    def cycleTimeEstimate(self, obj):
+        '''cycleTimeEstimate(obj) ... returns the cycle time of obj's Path in seconds and in HH:MM:SS format.
+        If the cycle time cannot be estimated the seconds are 0 and the format is an error message.'''
 
         tc = obj.ToolController
 
         if tc is None or tc.ToolNumber == 0:
             PathLog.error(translate("Path", "No Tool Controller selected."))
-            return translate('Path', 'Tool Error')
+            return (0, translate('Path', 'Tool Error'))
 
         hFeedrate = tc.HorizFeed.Value
         vFeedrate = tc.VertFeed.Value
@@ -576,21 +602,24 @@ class ObjectOp(object):
 
         if (hFeedrate == 0 or vFeedrate == 0) and not PathPreferences.suppressAllSpeedsWarning():
             PathLog.warning(translate("Path", "Tool Controller feedrates required to calculate the cycle time."))
-            return translate('Path', 'Feedrate Error')
+            return (0, translate('Path', 'Feedrate Error'))
 
         if (hRapidrate == 0 or vRapidrate == 0) and not PathPreferences.suppressRapidSpeedsWarning():
             PathLog.warning(translate("Path", "Add Tool Controller Rapid Speeds on the SetupSheet for more accurate cycle times."))
 
-        # Get the cycle time in seconds
-        seconds = obj.Path.getCycleTime(hFeedrate, vFeedrate, hRapidrate, vRapidrate)
+        # Get the cycle time in seconds, the junction aware estimate has to be enabled explicitly
+        if PathPreferences.junctionCycleTimeEnabled():
+            seconds = PathCycleTime.estimatePath(obj.Path, tc)
+        else:
+            seconds = obj.Path.getCycleTime(hFeedrate, vFeedrate, hRapidrate, vRapidrate)
 
         if not seconds:
-            return translate('Path', 'Cycletime Error')
+            return (0, translate('Path', 'Cycletime Error'))
 
         # Convert the cycle time to a HH:MM:SS format
         cycleTime = time.strftime("%H:%M:%S", time.gmtime(seconds))
 
-        return cycleTime
+        return (seconds, cycleTime)
 
     def addBase(self, obj, base, sub):
         PathLog.track(obj, base, sub)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+'''
+Input keys for caching the generated Path of operations.
+
+The key of an operation is a digest of everything its Path is generated from: the values
+of its properties, the tool controller and tool, the shapes of the base objects and the
+model and stock of the job. An operation only has to regenerate its Path if its key
+changed since the last time it was generated.
+
+Shapes are represented by a fingerprint of their geometry instead of their hash code,
+because a recomputed shape gets a new hash code, even if its geometry didn't change.
+'''
+
+import FreeCAD
+import hashlib
+
+# properties which are results of an operation or don't influence its Path
+IGNORED_PROPERTIES = set(['Path', 'CycleTime', 'ExpressionEngine', 'Label2', 'Proxy', 'Visibility'])
+
+# property types which hold results, like the Path, or internal state of an operation
+IGNORED_PROPERTY_TYPES = set(['App::PropertyPath', 'App::PropertyPythonObject'])
+
+# properties of linked objects which don't influence the Path of an operation
+IGNORED_LINK_PROPERTIES = set(['Label', 'Label2'])
+
+# number of decimals of the coordinates in shape fingerprints
+FINGERPRINT_PRECISION = 7
+
+
+def shapeKey(shape):
+    '''shapeKey(shape) ... returns a fingerprint of the geometry of shape.'''
+    if shape is None or shape.isNull():
+        return None
+    bb = shape.BoundBox
+    key = [shape.ShapeType, len(shape.Faces), len(shape.Edges), len(shape.Vertexes),
+           round(bb.XMin, FINGERPRINT_PRECISION), round(bb.YMin, FINGERPRINT_PRECISION), round(bb.ZMin, FINGERPRINT_PRECISION),
+           round(bb.XMax, FINGERPRINT_PRECISION), round(bb.YMax, FINGERPRINT_PRECISION), round(bb.ZMax, FINGERPRINT_PRECISION),
+           round(shape.Length, FINGERPRINT_PRECISION)]
+    if shape.Faces:
+        key.append(round(shape.Area, FINGERPRINT_PRECISION))
+    if shape.Solids:
+        key.append(round(shape.Volume, FINGERPRINT_PRECISION))
+    for v in shape.Vertexes:
+        p = v.Point
+        key.append((round(p.x, FINGERPRINT_PRECISION), round(p.y, FINGERPRINT_PRECISION), round(p.z, FINGERPRINT_PRECISION)))
+    return tuple(key)
+
+
+def objectKey(obj, visited):
+    '''objectKey(obj, visited) ... returns the key of a linked object.
+    Objects with a shape are represented by the fingerprint of their shape and their plain
+    property values, links of objects without a shape, like tool controllers, are followed.
+    Objects in visited are only represented by their name.'''
+    if obj.Name in visited:
+        return obj.Name
+    visited.add(obj.Name)
+    shape = getattr(obj, 'Shape', None)
+    if shape is not None and not shape.isNull():
+        return (obj.Name, shapeKey(shape), propertiesKey(obj, visited, IGNORED_LINK_PROPERTIES, False))
+    return (obj.Name, propertiesKey(obj, visited, IGNORED_LINK_PROPERTIES, True))
+
+
+def valueKey(value, visited, followLinks=True):
+    '''valueKey(value, visited, followLinks=True) ... returns a hashable representation of a property value.'''
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(valueKey(v, visited, followLinks) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, valueKey(v, visited, followLinks)) for k, v in value.items()))
+    if isinstance(value, FreeCAD.Units.Quantity):
+        return value.Value
+    if isinstance(value, FreeCAD.Vector):
+        return (value.x, value.y, value.z)
+    if isinstance(value, FreeCAD.Placement):
+        return (valueKey(value.Base, visited), value.Rotation.Q)
+    if isinstance(value, FreeCAD.DocumentObject):
+        if followLinks:
+            return objectKey(value, visited)
+        return value.Name
+    if hasattr(value, 'Content'):
+        # Persistence objects, like legacy tools, represent their state as XML
+        return value.Content
+    return repr(value)
+
+
+def propertiesKey(obj, visited, ignored, followLinks=True):
+    '''propertiesKey(obj, visited, ignored, followLinks=True) ... returns the values of all properties of obj,
+    except the ones in ignored and the ones holding results.'''
+    key = []
+    for prop in sorted(obj.PropertiesList):
+        if prop in ignored or prop in IGNORED_PROPERTIES:
+            continue
+        if obj.getTypeIdOfProperty(prop) in IGNORED_PROPERTY_TYPES:
+            continue
+        key.append((prop, valueKey(getattr(obj, prop, None), visited, followLinks)))
+    return tuple(key)
+
+
+def opInputKey(op, job):
+    '''opInputKey(op, job) ... returns the digest of all inputs of op's Path, including the model and stock of job.'''
+    visited = set([op.Name])
+    key = [propertiesKey(op, visited, ())]
+    if job:
+        key.append(valueKey(getattr(job, 'GeometryTolerance', None), visited))
+        key.append(tuple(objectKey(model, visited) for model in job.Model.Group))
+        if job.Stock:
+            key.append(objectKey(job.Stock, visited))
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
@@ -63,6 +63,7 @@ WarningSuppressSelectionMode    = "WarningSuppressSelectionMode"
 WarningSuppressOpenCamLib       = "WarningSuppressOpenCamLib"
 EnableExperimentalFeatures      = "EnableExperimentalFeatures"
 EnableAdvancedOCLFeatures      = "EnableAdvancedOCLFeatures"
+UseJunctionCycleTime            = "UseJunctionCycleTime"
 
 
 def preferences():
@@ -248,6 +249,10 @@ def experimentalFeaturesEnabled():
     return preferences().GetBool(EnableExperimentalFeatures, False)
 
 
+def junctionCycleTimeEnabled():
+    return preferences().GetBool(UseJunctionCycleTime, False)
+
+
 def suppressAllSpeedsWarning():
     return preferences().GetBool(WarningSuppressAllSpeeds, True)
 
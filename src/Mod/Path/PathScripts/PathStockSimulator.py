@@ -0,0 +1,460 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+'''
+Headless simulation of the material removal of a job on a heightmap of the stock.
+
+The stock and the model are sampled on a regular grid, every cell holds the height of the
+top surface above the cell's center. The moves of a path are cut into the stock by
+lowering the cells within the tool's radius to the height of the tool's cutting surface.
+A cut is a single array operation per move, no shapes are created, so whole jobs can be
+simulated in batch, for instance to check posted programs.
+
+A heightmap only represents 2.5D material, overhangs and undercuts are not simulated.
+
+The simulation reports the removed volume, the time spent cutting air, rapid moves which
+cut material (collisions) and cuts below the surface of the model (gouges). The final
+stock can be converted into a mesh.
+'''
+
+import math
+import numpy
+
+import PathScripts.PathCycleTime as PathCycleTime
+import PathScripts.PathLog as PathLog
+import PathScripts.PathUtil as PathUtil
+
+from lazy_loader.lazy_loader import LazyLoader
+Mesh = LazyLoader('Mesh', globals(), 'Mesh')
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+#PathLog.trackModule(PathLog.thisModule())
+
+# maximum number of (triangle, cell) pairs processed at once by rasterize()
+RASTER_CHUNK_SIZE = 2000000
+
+# maximum number of gouges and collisions reported per operation
+MAX_REPORTED = 100
+
+
+def shapeTriangles(shape, tolerance):
+    '''shapeTriangles(shape, tolerance) ... returns an (n, 3, 3) array of the triangles of shape's tessellation.'''
+    (points, facets) = shape.tessellate(tolerance)
+    if not facets:
+        return numpy.zeros((0, 3, 3))
+    points = numpy.array([(p.x, p.y, p.z) for p in points], dtype=float)
+    return points[numpy.array(facets, dtype=int)]
+
+
+class HeightMap(object):
+    '''HeightMap(xmin, ymin, resolution, nx, ny, height) ... a grid of nx * ny cells of size resolution.
+    heights[iy, ix] is the height of the cell with the center (xmin + (ix + 0.5) * resolution, ymin + (iy + 0.5) * resolution).'''
+
+    def __init__(self, xmin, ymin, resolution, nx, ny, height=0.):
+        self.xmin = xmin
+        self.ymin = ymin
+        self.resolution = resolution
+        self.nx = nx
+        self.ny = ny
+        self.x = xmin + (numpy.arange(nx) + 0.5) * resolution
+        self.y = ymin + (numpy.arange(ny) + 0.5) * resolution
+        self.heights = numpy.full((ny, nx), height, dtype=float)
+
+    @classmethod
+    def forBoundBox(cls, bb, resolution, height=0.):
+        '''forBoundBox(bb, resolution, height=0.) ... returns a heightmap covering bounding box bb.'''
+        nx = max(1, int(math.ceil(bb.XLength / resolution)))
+        ny = max(1, int(math.ceil(bb.YLength / resolution)))
+        return cls(bb.XMin, bb.YMin, resolution, nx, ny, height)
+
+    def cellArea(self):
+        return self.resolution * self.resolution
+
+    def indexRange(self, lo, hi, origin, n):
+        '''Returns the range of the cells whose centers are between lo and hi along one axis.'''
+        i0 = max(0, int(math.ceil((lo - origin) / self.resolution - 0.5)))
+        i1 = min(n - 1, int(math.floor((hi - origin) / self.resolution - 0.5)))
+        return (i0, i1)
+
+    def rasterize(self, triangles, top=True):
+        '''rasterize(triangles, top=True) ... raises the cells to the highest point of the triangles above their centers,
+        or lowers them to the lowest point if top is False.'''
+        if not len(triangles):
+            return
+        res = self.resolution
+        xs = triangles[:, :, 0]
+        ys = triangles[:, :, 1]
+        zs = triangles[:, :, 2]
+        ix0 = numpy.maximum(numpy.ceil((xs.min(axis=1) - self.xmin) / res - 0.5), 0).astype(int)
+        ix1 = numpy.minimum(numpy.floor((xs.max(axis=1) - self.xmin) / res - 0.5), self.nx - 1).astype(int)
+        iy0 = numpy.maximum(numpy.ceil((ys.min(axis=1) - self.ymin) / res - 0.5), 0).astype(int)
+        iy1 = numpy.minimum(numpy.floor((ys.max(axis=1) - self.ymin) / res - 0.5), self.ny - 1).astype(int)
+        det = (ys[:, 1] - ys[:, 2]) * (xs[:, 0] - xs[:, 2]) + (xs[:, 2] - xs[:, 1]) * (ys[:, 0] - ys[:, 2])
+        # triangles seen edge on, like vertical faces, don't cover any cell
+        valid = numpy.flatnonzero((ix1 >= ix0) & (iy1 >= iy0) & (numpy.fabs(det) > 1e-12))
+        if not len(valid):
+            return
+
+        width = (ix1 - ix0 + 1)[valid]
+        counts = width * (iy1 - iy0 + 1)[valid]
+        ends = numpy.cumsum(counts)
+        begin = 0
+        while begin < len(valid):
+            start = ends[begin] - counts[begin]
+            end = max(begin + 1, numpy.searchsorted(ends, start + RASTER_CHUNK_SIZE, side='right'))
+            chunk = valid[begin:end]
+            n = counts[begin:end]
+            t = numpy.repeat(numpy.arange(len(chunk)), n)
+            k = numpy.arange(n.sum()) - numpy.repeat(numpy.cumsum(n) - n, n)
+            w = width[begin:end][t]
+            tri = chunk[t]
+            ix = ix0[tri] + k % w
+            iy = iy0[tri] + k // w
+            px = self.x[ix]
+            py = self.y[iy]
+            (x0, x1, x2) = (xs[tri, 0], xs[tri, 1], xs[tri, 2])
+            (y0, y1, y2) = (ys[tri, 0], ys[tri, 1], ys[tri, 2])
+            d = det[tri]
+            l0 = ((y1 - y2) * (px - x2) + (x2 - x1) * (py - y2)) / d
+            l1 = ((y2 - y0) * (px - x2) + (x0 - x2) * (py - y2)) / d
+            l2 = 1. - l0 - l1
+            inside = (l0 >= -1e-9) & (l1 >= -1e-9) & (l2 >= -1e-9)
+            z = (l0 * zs[tri, 0] + l1 * zs[tri, 1] + l2 * zs[tri, 2])[inside]
+            if top:
+                numpy.maximum.at(self.heights, (iy[inside], ix[inside]), z)
+            else:
+                numpy.minimum.at(self.heights, (iy[inside], ix[inside]), z)
+            begin = end
+
+    def meshArrays(self, bottom):
+        '''meshArrays(bottom) ... returns (points, facets) of a closed mesh of the material between bottom and the heights.
+        The points are the cell centers at their height and at bottom, the facets index the points.
+        The grid needs at least 2 x 2 cells.'''
+        (ny, nx) = self.heights.shape
+        # the outer points are moved to the border of the grid, so the mesh covers all cells
+        x = self.x.copy()
+        y = self.y.copy()
+        (x[0], x[-1]) = (self.xmin, self.xmin + nx * self.resolution)
+        (y[0], y[-1]) = (self.ymin, self.ymin + ny * self.resolution)
+        (gx, gy) = numpy.meshgrid(x, y)
+        top = numpy.column_stack((gx.ravel(), gy.ravel(), self.heights.ravel()))
+        base = numpy.column_stack((gx.ravel(), gy.ravel(), numpy.full(nx * ny, bottom)))
+        points = numpy.concatenate((top, base))
+        offset = nx * ny
+
+        idx = numpy.arange(nx * ny).reshape(ny, nx)
+        a = idx[:-1, :-1].ravel()
+        b = idx[:-1, 1:].ravel()
+        c = idx[1:, 1:].ravel()
+        d = idx[1:, :-1].ravel()
+        facets = [numpy.column_stack((a, b, c)), numpy.column_stack((a, c, d)),
+                  numpy.column_stack((a, c, b)) + offset, numpy.column_stack((a, d, c)) + offset]
+
+        # the walls along the border, counter clockwise seen from above
+        border = numpy.concatenate((idx[0, :], idx[1:, -1], idx[-1, -2::-1], idx[-2:0:-1, 0], idx[:1, 0]))
+        if len(border) > 2:
+            p = border[:-1]
+            q = border[1:]
+            facets.append(numpy.column_stack((p, q + offset, q)))
+            facets.append(numpy.column_stack((p, p + offset, q + offset)))
+        return (points, numpy.concatenate(facets))
+
+    def mesh(self, bottom):
+        '''mesh(bottom) ... returns a Mesh of the material between bottom and the heights.'''
+        (points, facets) = self.meshArrays(bottom)
+        return Mesh.Mesh(points[facets].reshape(-1, 3).tolist())
+
+
+class ToolProfile(object):
+    '''ToolProfile(radius, heights) ... the height of a tool's cutting surface above its tip.
+    heights are sampled at equidistant distances from the tool's axis, from 0 to radius.'''
+
+    def __init__(self, radius, heights):
+        self.radius = radius
+        self.heights = numpy.asarray(heights, dtype=float)
+        self.distances = numpy.linspace(0., radius, len(self.heights))
+
+    def at(self, distance):
+        '''at(distance) ... returns the heights at the given distances from the axis, inf outside of the tool.'''
+        h = numpy.interp(distance, self.distances, self.heights)
+        return numpy.where(distance < self.radius, h, numpy.inf)
+
+    @classmethod
+    def fromFunction(cls, radius, f, samples=200):
+        '''fromFunction(radius, f, samples=200) ... returns the profile of f(distance), f must accept arrays.'''
+        return cls(radius, f(numpy.linspace(0., radius, samples)))
+
+    @classmethod
+    def fromShape(cls, shape, radius, samples=100):
+        '''fromShape(shape, radius, samples=100) ... returns the profile of the lower surface of a tool's solid.
+        The tool's axis has to be the z-axis.'''
+        step = radius / samples
+        n = 2 * samples + 2
+        grid = HeightMap(-(samples + 1) * step, -(samples + 1) * step, step, n, n, numpy.inf)
+        grid.rasterize(shapeTriangles(shape, step / 2.), top=False)
+        (gx, gy) = numpy.meshgrid(grid.x, grid.y)
+        bins = numpy.minimum(numpy.round(numpy.hypot(gx, gy) / step).astype(int), samples + 1)
+        heights = numpy.full(samples + 2, numpy.inf)
+        numpy.minimum.at(heights, bins.ravel(), grid.heights.ravel())
+        heights = heights[:samples + 1]
+        known = numpy.isfinite(heights)
+        if not known.any():
+            return cls(radius, numpy.zeros(samples + 1))
+        heights = numpy.interp(numpy.arange(samples + 1), numpy.flatnonzero(known), heights[known])
+        return cls(radius, heights - heights.min())
+
+
+def _point(p):
+    return tuple(float(v) for v in p)
+
+
+def _vProfile(angle):
+    slope = 1. / math.tan(math.radians(min(max(angle, 1.), 179.)) / 2.)
+    return lambda d: d * slope
+
+
+def toolProfile(tool):
+    '''toolProfile(tool) ... returns the ToolProfile of a tool bit or of a legacy tool.
+    Known shapes are described analytically, the profile of other tool bits is taken from their shape.'''
+    radius = float(tool.Diameter) / 2.
+    shape = getattr(tool, 'ShapeName', None)
+    if shape is None:
+        # legacy tools
+        shape = {'BallEndMill': 'ballend', 'ChamferMill': 'chamfer', 'Engraver': 'v-bit',
+                 'CenterDrill': 'drill', 'Drill': 'drill', 'CounterSink': 'chamfer'}.get(getattr(tool, 'ToolType', None), 'endmill')
+    # the shape name is the name of the shape's document, which has no dashes
+    shape = shape.replace('_', '-').lower()
+    angle = float(getattr(tool, 'CuttingEdgeAngle', 0) or getattr(tool, 'TipAngle', 0) or 0)
+
+    if shape == 'ballend':
+        return ToolProfile.fromFunction(radius, lambda d: radius - numpy.sqrt(numpy.maximum(radius * radius - d * d, 0.)))
+    if shape == 'bullnose':
+        flat = float(getattr(tool, 'FlatRadius', 0))
+        corner = radius - flat
+        return ToolProfile.fromFunction(radius, lambda d: numpy.where(d <= flat, 0., corner - numpy.sqrt(numpy.maximum(corner * corner - (d - flat) ** 2, 0.))))
+    if shape in ['v-bit', 'chamfer', 'drill'] and angle:
+        flat = float(getattr(tool, 'TipDiameter', 0) or 0) / 2. if shape != 'drill' else 0.
+        v = _vProfile(angle)
+        return ToolProfile.fromFunction(radius, lambda d: v(numpy.maximum(d - flat, 0.)))
+    if shape != 'endmill' and getattr(tool, 'Shape', None) and not tool.Shape.isNull():
+        return ToolProfile.fromShape(tool.Shape, radius)
+    return ToolProfile(radius, [0., 0.])
+
+
+class StockSimulator(object):
+    '''StockSimulator(stock, model=None, resolution=0.5, tolerance=0.01) ... simulates cutting stock, a shape, on a heightmap.
+    Cuts deeper than tolerance below the top surface of model, a shape or a list of shapes, are gouges.'''
+
+    def __init__(self, stock, model=None, resolution=0.5, tolerance=0.01):
+        bb = stock.BoundBox
+        self.resolution = resolution
+        self.tolerance = tolerance
+        self.bottom = bb.ZMin
+        self.top = bb.ZMax
+        self.stock = HeightMap.forBoundBox(bb, resolution, -numpy.inf)
+        self.stock.rasterize(shapeTriangles(stock, resolution / 4.))
+        self.stock.heights = numpy.maximum(self.stock.heights, self.bottom)
+        self.initialVolume = self.volume()
+
+        self.model = None
+        if model is not None:
+            self.model = HeightMap(self.stock.xmin, self.stock.ymin, resolution, self.stock.nx, self.stock.ny, -numpy.inf)
+            for shape in (model if isinstance(model, list) else [model]):
+                self.model.rasterize(shapeTriangles(shape, resolution / 4.))
+
+    def volume(self):
+        '''volume() ... returns the volume of the remaining stock.'''
+        return float((self.stock.heights - self.bottom).sum()) * self.stock.cellArea()
+
+    def mesh(self):
+        '''mesh() ... returns a Mesh of the remaining stock.'''
+        return self.stock.mesh(self.bottom)
+
+    def cutSegment(self, p0, p1, profile):
+        '''cutSegment(p0, p1, profile) ... cuts a straight move from p0 to p1 into the stock.
+        Returns (removed volume, gouge) where gouge is None or (depth, x, y) of the deepest cut below the model.'''
+        grid = self.stock
+        r = profile.radius
+        (ix0, ix1) = grid.indexRange(min(p0[0], p1[0]) - r, max(p0[0], p1[0]) + r, grid.xmin, grid.nx)
+        (iy0, iy1) = grid.indexRange(min(p0[1], p1[1]) - r, max(p0[1], p1[1]) + r, grid.ymin, grid.ny)
+        if ix1 < ix0 or iy1 < iy0:
+            return (0., None)
+
+        dx = grid.x[None, ix0:ix1 + 1] - p0[0]
+        dy = grid.y[iy0:iy1 + 1, None] - p0[1]
+        sx = p1[0] - p0[0]
+        sy = p1[1] - p0[1]
+        length2 = sx * sx + sy * sy
+        if length2 > 0:
+            t = numpy.clip((dx * sx + dy * sy) / length2, 0., 1.)
+            z = p0[2] + t * (p1[2] - p0[2]) + profile.at(numpy.hypot(dx - t * sx, dy - t * sy))
+        else:
+            # plunges and retracts cut at their lower end
+            z = min(p0[2], p1[2]) + profile.at(numpy.hypot(dx, dy))
+
+        window = (slice(iy0, iy1 + 1), slice(ix0, ix1 + 1))
+        old = grid.heights[window]
+        new = numpy.maximum(numpy.minimum(old, z), self.bottom)
+        removed = float((old - new).sum()) * grid.cellArea()
+        # old is a view of the heights, only the cells lowered by this cut can be gouged by it
+        lowered = new < old
+        grid.heights[window] = new
+
+        gouge = None
+        if self.model is not None and removed > 0:
+            depth = numpy.where(lowered, self.model.heights[window] - new, -numpy.inf)
+            i = numpy.argmax(depth)
+            (iy, ix) = numpy.unravel_index(i, depth.shape)
+            if depth[iy, ix] > self.tolerance:
+                gouge = (float(depth[iy, ix]), float(grid.x[ix0 + ix]), float(grid.y[iy0 + iy]))
+        return (removed, gouge)
+
+    def segments(self, kind, start, end, center, pieceLength):
+        '''segments(kind, start, end, center, pieceLength) ... returns the straight pieces of a move.
+        Arcs are split into chords deviating less than a quarter of the resolution, moves
+        which change the height are split into pieces of at most one resolution in height
+        and straight moves into pieces no longer than pieceLength.'''
+        points = [start]
+        if kind in (PathCycleTime.CW, PathCycleTime.CCW):
+            a = (start[0] - center[0], start[1] - center[1])
+            b = (end[0] - center[0], end[1] - center[1])
+            r = math.hypot(a[0], a[1])
+            sign = -1. if kind == PathCycleTime.CW else 1.
+            sweep = ((math.atan2(b[1], b[0]) - math.atan2(a[1], a[0])) * sign) % (2 * math.pi)
+            if math.hypot(b[0] - a[0], b[1] - a[1]) <= 1e-6:
+                sweep = 2 * math.pi
+            sagitta = self.resolution / 4.
+            step = 2 * math.acos(max(1. - sagitta / r, -1.)) if r > sagitta else math.pi / 2
+            n = max(1, int(math.ceil(sweep / step)), int(math.ceil(abs(end[2] - start[2]) / self.resolution)))
+            a0 = math.atan2(a[1], a[0])
+            for i in range(1, n):
+                angle = a0 + sign * sweep * i / n
+                points.append((center[0] + r * math.cos(angle), center[1] + r * math.sin(angle), start[2] + (end[2] - start[2]) * i / n))
+        else:
+            # long diagonal moves are split as well, to keep the cells of each cut close to the move
+            n = max(int(math.ceil(abs(end[2] - start[2]) / self.resolution)), int(math.ceil(math.hypot(end[0] - start[0], end[1] - start[1]) / pieceLength)))
+            for i in range(1, n):
+                f = float(i) / n
+                points.append(tuple(s + (e - s) * f for s, e in zip(start, end)))
+        points.append(end)
+        return zip(points[:-1], points[1:])
+
+    def simulateCommands(self, commands, tool, hFeed, vFeed, rapidRates, position=None, profile=None):
+        '''simulateCommands(commands, tool, hFeed, vFeed, rapidRates, position=None, profile=None) ... cuts the moves of commands.
+        tool is a ToolProfile, the feeds and rapid rates are used to estimate the time of each move
+        with PathCycleTime. The tool starts at position, or above the origin at the top of the stock.
+        Without feed rates the moves are only cut, their times are 0 and timed is False in the result.
+        Returns (result, end position), see simulateJob() for the result.'''
+        if position is None:
+            position = (0., 0., self.top)
+        if profile is None:
+            profile = PathCycleTime.MachineProfile()
+        reader = PathCycleTime.MoveReader(hFeed, vFeed, profile.toolChangeTime, position)
+        moves = reader.read(commands)
+        (kind, start, end, center, feed, dwell) = moves.arrays()
+        timed = bool(hFeed and vFeed)
+        if timed:
+            (times, _) = PathCycleTime.moveTimes(kind, start, end, center, feed, dwell, profile, rapidRates)
+        else:
+            times = numpy.zeros(len(kind))
+
+        result = {'removedVolume': 0., 'cutTime': 0., 'airCutTime': 0., 'gouges': [], 'collisions': [], 'timed': timed}
+        pieceLength = max(4 * tool.radius, 16 * self.resolution)
+        for i in range(len(kind)):
+            k = int(kind[i])
+            if k == PathCycleTime.Dwell:
+                continue
+            removed = 0.
+            deepest = None
+            for (p0, p1) in self.segments(k, tuple(start[i]), tuple(end[i]), tuple(center[i]), pieceLength):
+                (r, gouge) = self.cutSegment(p0, p1, tool)
+                removed += r
+                if gouge and (deepest is None or gouge[0] > deepest[0]):
+                    deepest = gouge
+            result['removedVolume'] += removed
+
+            # removing less than the tolerance from a single cell is rounding
+            cuts = removed > self.tolerance * self.stock.cellArea()
+            if k == PathCycleTime.Rapid:
+                if cuts and len(result['collisions']) < MAX_REPORTED:
+                    result['collisions'].append({'start': _point(start[i]), 'end': _point(end[i]), 'volume': removed})
+            elif cuts:
+                result['cutTime'] += times[i]
+            else:
+                result['airCutTime'] += times[i]
+            if deepest and len(result['gouges']) < MAX_REPORTED:
+                result['gouges'].append({'depth': deepest[0], 'position': (deepest[1], deepest[2]), 'move': (_point(start[i]), _point(end[i]))})
+        return (result, reader.position)
+
+    def simulateJob(self, job, profile=None):
+        '''simulateJob(job, profile=None) ... cuts all active operations of job into the stock.
+        The result is a dictionary with
+            removedVolume:  volume of the removed material
+            volume:         volume of the remaining stock
+            cutTime:        time of the feed moves which remove material
+            airCutTime:     time of the feed moves which don't remove material
+            gouges:         cuts deeper than the tolerance below the model, with the depth,
+                            the position of the deepest cell and the move
+            collisions:     rapid moves which remove material, with the move and the volume
+            operations:     list of the results of each operation, with its name and label
+            untimed:        labels of the operations without times because the feed rates of their
+                            tool controller are not set, they are cut but not in cutTime and airCutTime
+        Gouges and collisions are listed with the label of their operation.'''
+        result = {'removedVolume': 0., 'cutTime': 0., 'airCutTime': 0., 'gouges': [], 'collisions': [], 'operations': [], 'untimed': []}
+        position = None
+        for op in job.Operations.Group:
+            if PathUtil.opProperty(op, 'Active') is False:
+                continue
+            tc = PathUtil.toolControllerForOp(op)
+            if tc is None or not hasattr(op, 'Path'):
+                continue
+            tool = toolProfile(tc.Tool)
+            (hFeed, vFeed, rapidRates) = PathCycleTime.toolControllerRates(tc)
+            (opResult, position) = self.simulateCommands(op.Path.Commands, tool, hFeed, vFeed, rapidRates, position, profile)
+            if not opResult['timed']:
+                PathLog.warning("%s: feed rates of %s are not set, the times of the operation are not included" % (op.Label, tc.Label))
+                result['untimed'].append(op.Label)
+
+            for key in ['removedVolume', 'cutTime', 'airCutTime']:
+                result[key] += opResult[key]
+            for key in ['gouges', 'collisions']:
+                for item in opResult[key]:
+                    item['operation'] = op.Label
+                    result[key].append(item)
+            opResult.update({'name': op.Name, 'label': op.Label})
+            result['operations'].append(opResult)
+            PathLog.debug("%s: removed %.1f, %d gouges, %d collisions" % (op.Label, opResult['removedVolume'], len(opResult['gouges']), len(opResult['collisions'])))
+
+        result['volume'] = self.volume()
+        return result
+
+
+def simulateJob(job, resolution=0.5, tolerance=0.01, profile=None):
+    '''simulateJob(job, resolution=0.5, tolerance=0.01, profile=None) ... simulates job on a heightmap of its stock.
+    Returns (result, simulator), see StockSimulator.simulateJob() for the result and
+    StockSimulator.mesh() for the final stock.'''
+    model = [m.Shape for m in job.Model.Group]
+    simulator = StockSimulator(job.Stock.Shape, model, resolution, tolerance)
+    return (simulator.simulateJob(job, profile), simulator)
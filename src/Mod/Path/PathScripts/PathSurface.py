@@ -188,6 +188,8 @@ class ObjectSurface(PathOp.ObjectOp):
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Enable separate optimization of transitions between, and breaks within, each step over path.")),
             ("App::PropertyBool", "CircularUseG2G3", "Optimization",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Convert co-planar arcs to G2/G3 gcode commands for `Circular` and `CircularZigZag` cut patterns.")),
+            ("App::PropertyInteger", "ScanThreads", "Optimization",
+                QtCore.QT_TRANSLATE_NOOP("App::Property", "Number of threads of the OCL drop-cutter scans. Set to 0 to use the OCL default, all CPU cores.")),
             ("App::PropertyDistance", "GapThreshold", "Optimization",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Collinear and co-radial artifact gaps that are smaller than this threshold are closed in the path.")),
             ("App::PropertyString", "GapSizes", "Optimization",
@@ -247,6 +249,7 @@ class ObjectSurface(PathOp.ObjectOp):
             'AvoidLastX_Faces': 0,
             'PatternCenterCustom': FreeCAD.Vector(0.0, 0.0, 0.0),
             'GapThreshold': 0.005,
+            'ScanThreads': 0,
             'AngularDeflection': 0.25,  # AngularDeflection is unused
             # Reasonable compromise between speed & precision
             'LinearDeflection': 0.001,
@@ -451,6 +454,7 @@ class ObjectSurface(PathOp.ObjectOp):
 
         self.modelSTLs = list()
         self.safeSTLs = list()
+        self.scanParams = None
         self.modelTypes = list()
         self.boundBoxes = list()
         self.profileShapes = list()
@@ -665,6 +669,7 @@ class ObjectSurface(PathOp.ObjectOp):
 
         self.modelSTLs = None
         self.safeSTLs = None
+        self.scanParams = None
         self.modelTypes = None
         self.boundBoxes = None
         self.gaps = None
@@ -779,6 +784,8 @@ class ObjectSurface(PathOp.ObjectOp):
         # Prepare PathDropCutter objects with STL data
         pdc = self._planarGetPDC(self.modelSTLs[mdlIdx], depthparams[lenDP - 1], obj.SampleInterval.Value, self.cutter)
         safePDC = self._planarGetPDC(self.safeSTLs[mdlIdx], depthparams[lenDP - 1], obj.SampleInterval.Value, self.cutter)
+        # The line scans are run in batches, see _planarDropCutScans()
+        self.scanParams = (self.modelSTLs[mdlIdx], depthparams[lenDP - 1], obj.SampleInterval.Value)
 
         profScan = list()
         if obj.ProfileEdges != 'None':
@@ -901,6 +908,7 @@ class ObjectSurface(PathOp.ObjectOp):
 
         if offsetPoints or obj.CutPattern == 'Offset':
             PNTSET = PathSurfaceSupport.pathGeomToOffsetPointSet(obj, pathGeom)
+            scans = self._planarDropCutScans(obj, [I for D in PNTSET for I in D if I != 'BRK'])
             for D in PNTSET:
                 stpOvr = list()
                 ofst = list()
@@ -911,8 +919,7 @@ class ObjectSurface(PathOp.ObjectOp):
                         ofst = list()
                     else:
                         # D format is ((p1, p2), (p3, p4))
-                        (A, B) = I
-                        ofst.extend(self._planarDropCutScan(pdc, A, B))
+                        ofst.extend(next(scans))
                 if len(ofst) > 0:
                     stpOvr.append(ofst)
                 SCANS.extend(stpOvr)
@@ -927,14 +934,14 @@ class ObjectSurface(PathOp.ObjectOp):
             elif obj.CutPattern == 'Spiral':
                 PNTSET = PathSurfaceSupport.pathGeomToSpiralPointSet(obj, pathGeom)
 
+            scans = self._planarDropCutScans(obj, [LN for STEP in PNTSET for LN in STEP if LN != 'BRK'])
             for STEP in PNTSET:
                 for LN in STEP:
                     if LN == 'BRK':
                         stpOvr.append(LN)
                     else:
                         # D format is ((p1, p2), (p3, p4))
-                        (A, B) = LN
-                        stpOvr.append(self._planarDropCutScan(pdc, A, B))
+                        stpOvr.append(next(scans))
                 SCANS.append(stpOvr)
                 stpOvr = list()
         elif obj.CutPattern in ['Circular', 'CircularZigZag']:
@@ -971,6 +978,14 @@ class ObjectSurface(PathOp.ObjectOp):
 
         return SCANS
 
+    def _planarDropCutScans(self, obj, lines):
+        '''_planarDropCutScans(obj, lines) ... returns an iterator over the scans of lines,
+        a list of ((x1, y1), (x2, y2)) tuples, in the order of the lines.
+        All lines are scanned in one batch with obj.ScanThreads threads,
+        0 uses the OCL default.'''
+        (stl, finalDep, SampleInterval) = self.scanParams
+        return iter(PathSurfaceSupport.dropCutScanLines(ocl, stl, self.cutter, finalDep, SampleInterval, lines, obj.ScanThreads))
+
     def _planarDropCutScan(self, pdc, A, B):
         (x1, y1) = A
         (x2, y2) = B
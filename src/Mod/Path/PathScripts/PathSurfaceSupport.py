@@ -34,6 +34,7 @@ import Path
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathOpTools as PathOpTools
+import collections
 import math
 
 # lazily loaded modules
@@ -1139,14 +1140,92 @@ def getSliceFromEnvelope(env):
 
 
 
+# OCL STL surfaces are shared by all Surface and Waterline operations.
+# The ocl.STLSurf objects are only read by the OCL operations, thus an STL
+# built for one operation can be used by every other operation with the same key.
+# The second item of every key is the name of the document of the model.
+STL_CACHE_SIZE = 16
+_stlCache = collections.OrderedDict()
+
+
+class _STLCacheObserver(object):
+    '''Releases the cached STLs of a document when it is closed.'''
+
+    _instance = None
+
+    @classmethod
+    def attach(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+            FreeCAD.addDocumentObserver(cls._instance)
+
+    def slotDeletedDocument(self, doc):
+        clearSTLCache(doc)
+
+
+def clearSTLCache(doc=None):
+    '''clearSTLCache(doc=None) ... removes the cached OCL STL surfaces of doc,
+    all cached STL surfaces if doc is None.'''
+    if doc is None:
+        _stlCache.clear()
+        return
+    for key in [k for k in _stlCache if k[1] == doc.Name]:
+        del _stlCache[key]
+
+
+def _getCachedSTL(key, makeSTL):
+    '''_getCachedSTL(key, makeSTL) ... returns the cached STL of key,
+    if there is none makeSTL() is called and its result is cached.'''
+    _STLCacheObserver.attach()
+    stl = _stlCache.pop(key, None)
+    if stl is None:
+        stl = makeSTL()
+    else:
+        PathLog.debug('STL cache hit: {}'.format(key[:3]))
+    _stlCache[key] = stl
+    while len(_stlCache) > STL_CACHE_SIZE:
+        _stlCache.popitem(last=False)
+    return stl
+
+
+def _getModelSTLKey(model, obj, model_type=None):
+    '''_getModelSTLKey(model, obj, model_type) ... key of the STL of a model:
+    (document name, model name, shape key, LinearDeflection, placement).
+    The hash of a shape changes if the model is recomputed. Meshes can be
+    edited in place, their key is a fingerprint of the points and facets.'''
+    if model_type == 'M':
+        points, facets = model.Mesh.Topology
+        shapeKey = (
+            len(points),
+            len(facets),
+            hash(tuple((p.x, p.y, p.z) for p in points)),
+            hash(tuple(facets)))
+    else:
+        shapeKey = (model.Shape.hashCode(), str(model.Shape.BoundBox))
+    return (model.Document.Name, model.Name, shapeKey, obj.LinearDeflection.Value,
+            str(model.Placement))
+
+
+def _getShapesKey(shapes):
+    '''_getShapesKey(shapes) ... geometric key of temporary shapes, which
+    are recreated by every operation and thus have no stable hash.'''
+    return tuple((shp.ShapeType, round(shp.Area, 6), str(shp.BoundBox)) for shp in shapes)
+
+
 def _prepareModelSTLs(self, JOB, obj, m, ocl):
     """Tessellate model shapes or copy existing meshes into ocl.STLSurf
     objects"""
     PathLog.debug('_prepareModelSTLs()')
     if self.modelSTLs[m] is True:
         model = JOB.Model.Group[m]
-        if self.modelSTLs[m] is True:
-            self.modelSTLs[m] = _makeSTL(model, obj, ocl, self.modelTypes[m])
+        modelType = self.modelTypes[m]
+        if getattr(obj, 'ScanType', None) == 'Rotational':
+            # rotational scans rotate the STL, it can not be shared
+            self.modelSTLs[m] = _makeSTL(model, obj, ocl, modelType)
+            return
+        self.modelSTLs[m] = _getCachedSTL(
+            ('model',) + _getModelSTLKey(model, obj, modelType),
+            lambda: _makeSTL(model, obj, ocl, modelType))
 
 
 def _makeSafeSTL(self, JOB, obj, mdlIdx, faceShapes, voidShapes, ocl):
@@ -1156,8 +1235,30 @@ def _makeSafeSTL(self, JOB, obj, mdlIdx, faceShapes, voidShapes, ocl):
     STL object to determine minimum travel height to clear stock and model.'''
     PathLog.debug('_makeSafeSTL()')
 
-    fuseShapes = list()
     Mdl = JOB.Model.Group[mdlIdx]
+    if self.showDebugObjects:
+        # the fused shape is added to the document as debug object
+        self.safeSTLs[mdlIdx] = _makeSafeShapeSTL(self, JOB, obj, Mdl, faceShapes, voidShapes, ocl)
+        return
+
+    stockShape = JOB.Stock.Shape
+    key = ('safe',) + _getModelSTLKey(Mdl, obj) + (
+        (stockShape.hashCode(), str(stockShape.BoundBox)),
+        obj.BoundBox,
+        obj.BoundaryAdjustment.Value,
+        self.cutter.getDiameter(),
+        tuple(self.depthParams.data),
+        _getShapesKey(faceShapes),
+        _getShapesKey(voidShapes or []))
+    self.safeSTLs[mdlIdx] = _getCachedSTL(
+        key,
+        lambda: _makeSafeShapeSTL(self, JOB, obj, Mdl, faceShapes, voidShapes, ocl))
+
+
+def _makeSafeShapeSTL(self, JOB, obj, Mdl, faceShapes, voidShapes, ocl):
+    '''_makeSafeShapeSTL(JOB, obj, Mdl, faceShapes, voidShapes, ocl)...
+    Fuses waste stock, model, and avoided faces and returns the OCL.stl object of them.'''
+    fuseShapes = list()
     mBB = Mdl.Shape.BoundBox
     sBB = JOB.Stock.Shape.BoundBox
 
@@ -1224,7 +1325,7 @@ def _makeSafeSTL(self, JOB, obj, mdlIdx, faceShapes, voidShapes, ocl):
         T.purgeTouched()
         self.tempGroup.addObject(T)
 
-    self.safeSTLs[mdlIdx] = _makeSTL(fused, obj, ocl)
+    return _makeSTL(fused, obj, ocl)
 
 
 def _makeSTL(model, obj, ocl, model_type=None):
@@ -1232,7 +1333,7 @@ def _makeSTL(model, obj, ocl, model_type=None):
     tolerance specified in obj.LinearDeflection.
     Returns an ocl.STLSurf()."""
     if model_type == 'M':
-        facets = model.Mesh.Facets.Points
+        vertices, facet_indices = model.Mesh.Topology
     else:
         if hasattr(model, 'Shape'):
             shape = model.Shape
@@ -1240,18 +1341,52 @@ def _makeSTL(model, obj, ocl, model_type=None):
             shape = model
         vertices, facet_indices = shape.tessellate(
             obj.LinearDeflection.Value)
-        facets = ((vertices[f[0]], vertices[f[1]], vertices[f[2]])
-                  for f in facet_indices)
+    # vertex and index buffers: one ocl.Point per vertex, shared by all its triangles
+    points = [ocl.Point(v[0], v[1], v[2]) for v in vertices]
     stl = ocl.STLSurf()
-    for tri in facets:
-        v1, v2, v3 = tri
-        t = ocl.Triangle(ocl.Point(v1[0], v1[1], v1[2]),
-                         ocl.Point(v2[0], v2[1], v2[2]),
-                         ocl.Point(v3[0], v3[1], v3[2]))
-        stl.addTriangle(t)
+    addTriangle = stl.addTriangle
+    Triangle = ocl.Triangle
+    for f in facet_indices:
+        addTriangle(Triangle(points[f[0]], points[f[1]], points[f[2]]))
     return stl
 
 
+# Batch drop-cutter scans
+def dropCutScanLines(ocl, stl, cutter, finalDep, sampleInterval, lines, threads=0):
+    '''dropCutScanLines(ocl, stl, cutter, finalDep, sampleInterval, lines, threads=0)...
+    Drop-cutter scan of many independent lines at once.
+    `lines` is a list of ((x1, y1), (x2, y2)) tuples. Every line is sampled exactly like
+    ocl.PathDropCutter samples a line, but the sample points of all lines are scanned
+    in a single ocl.BatchDropCutter run, which distributes them over `threads` threads.
+    With `threads` set to 0, the OCL default is used, all CPU cores.
+    Returns a list with a list of FreeCAD.Vector points for each line, in the order of `lines`.'''
+    bdc = ocl.BatchDropCutter()
+    bdc.setSTL(stl)
+    bdc.setCutter(cutter)
+    if threads > 0 and hasattr(bdc, 'setThreads'):
+        bdc.setThreads(threads)
+
+    counts = list()
+    for ((x1, y1), (x2, y2)) in lines:
+        dx = x2 - x1
+        dy = y2 - y1
+        numSteps = int(math.sqrt(dx * dx + dy * dy) / sampleInterval + 1)
+        for i in range(0, numSteps + 1):
+            fraction = float(i) / numSteps
+            bdc.appendPoint(ocl.CLPoint(x1 + fraction * dx, y1 + fraction * dy, finalDep))
+        counts.append(numSteps + 1)
+
+    bdc.run()
+    CLP = bdc.getCLPoints()
+
+    scans = list()
+    start = 0
+    for cnt in counts:
+        scans.append([FreeCAD.Vector(p.x, p.y, p.z) for p in CLP[start:start + cnt]])
+        start += cnt
+    return scans
+
+
 # Functions to convert path geometry into line/arc segments for OCL input or directly to g-code
 def pathGeomToLinesPointSet(self, obj, compGeoShp):
     '''pathGeomToLinesPointSet(self, obj, compGeoShp)...
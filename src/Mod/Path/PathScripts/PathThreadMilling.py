@@ -290,7 +290,7 @@ class ObjectThreadMilling(PathCircularHoleBase.ObjectOp):
                 return
 
             # rapid to clearance height
-            for loc in holes:
+            for loc in PathUtils.sort_jobs(holes, ['x', 'y']):
                 self.executeThreadMill(obj, FreeCAD.Vector(loc['x'], loc['y'], 0), cmd, zStart, zFinal, pitch)
         else:
             PathLog.error("No suitable Tool found for thread milling operation")
@@ -25,6 +25,7 @@ import Path
 # import PathScripts
 import PathScripts.PathJob as PathJob
 import PathScripts.PathGeom as PathGeom
+import heapq
 import math
 import numpy
 
@@ -655,28 +656,148 @@ def rampPlunge(edge, rampangle, destZ, startZ):
     return rampCmds
 
 
-def sort_jobs(locations, keys, attractors=None):
+class LocationTree(object):
+    '''LocationTree(locations, keys, weights=None) ... spatial index of the locations for sort_jobs.
+    The locations are split into a k-d tree with up to LeafSize locations per leaf, every split
+    halves the locations along the longer side of their bound box, thus clustered locations
+    get as small boxes as scattered ones.
+    Locations are referenced by their index in locations and can be removed from the tree.
+    weights are the non negative weights of the locations added to the distances by closest().'''
+
+    LeafSize = 8
+
+    def __init__(self, locations, keys, weights=None):
+        self.xs = [loc[keys[0]] for loc in locations]
+        self.ys = [loc[keys[1]] for loc in locations]
+        if weights is None:
+            weights = [0.0] * len(locations)
+        self.weights = weights
+        self.count = len(locations)
+
+        # nodes, the children of a leaf are None
+        self.boxes = []     # (xmin, ymin, xmax, ymax) of the locations of the node
+        self.children = []  # (left, right)
+        self.parents = []
+        self.items = []     # locations of a leaf
+        self.alive = []     # number of locations of the node, which are not removed
+        self.minWeight = []  # lowest weight of these locations
+        self.leafOf = [0] * len(locations)
+
+        stack = [(list(range(len(locations))), -1, 0)]
+        while stack:
+            (idx, parent, side) = stack.pop()
+            node = self._addNode(idx, parent)
+            if parent >= 0:
+                children = list(self.children[parent])
+                children[side] = node
+                self.children[parent] = tuple(children)
+            if len(idx) <= self.LeafSize:
+                self.items[node] = idx
+                for i in idx:
+                    self.leafOf[i] = node
+                continue
+            (xmin, ymin, xmax, ymax) = self.boxes[node]
+            coords = self.xs if xmax - xmin >= ymax - ymin else self.ys
+            idx.sort(key=lambda i: coords[i])
+            half = len(idx) // 2
+            self.children[node] = (None, None)
+            stack.append((idx[half:], node, 1))
+            stack.append((idx[:half], node, 0))
+
+    def _addNode(self, idx, parent):
+        xs = [self.xs[i] for i in idx]
+        ys = [self.ys[i] for i in idx]
+        self.boxes.append((min(xs), min(ys), max(xs), max(ys)))
+        self.children.append(None)
+        self.parents.append(parent)
+        self.items.append(None)
+        self.alive.append(len(idx))
+        self.minWeight.append(min(self.weights[i] for i in idx))
+        return len(self.boxes) - 1
+
+    def remove(self, i):
+        node = self.leafOf[i]
+        self.items[node].remove(i)
+        self.count -= 1
+        weights = [self.weights[j] for j in self.items[node]]
+        self.alive[node] -= 1
+        self.minWeight[node] = min(weights) if weights else math.inf
+        node = self.parents[node]
+        while node >= 0:
+            (left, right) = self.children[node]
+            self.alive[node] -= 1
+            self.minWeight[node] = min(self.minWeight[left], self.minWeight[right])
+            node = self.parents[node]
+
+    def gap2(self, node, x, y):
+        '''gap2(node, x, y) ... square distance of x, y to the bound box of the node.'''
+        (xmin, ymin, xmax, ymax) = self.boxes[node]
+        dx = max(xmin - x, 0.0, x - xmax)
+        dy = max(ymin - y, 0.0, y - ymax)
+        return dx * dx + dy * dy
+
+    def closest(self, x, y, cost):
+        '''closest(x, y, cost) ... returns the index i of the location with the lowest (cost(i), i),
+        cost(i) must be at least the square distance of the location to x, y plus its weight.'''
+        best = None
+        limit = None
+        heap = [(0.0, 0)]
+        while heap:
+            (bound, node) = heapq.heappop(heap)
+            if limit is not None and bound > limit:
+                break
+            if self.children[node] is None:
+                for i in self.items[node]:
+                    c = (cost(i), i)
+                    if best is None or c < best:
+                        best = c
+                        limit = best[0] + 1e-9 * (abs(best[0]) + 1.0)
+                continue
+            for child in self.children[node]:
+                if self.alive[child]:
+                    bound = self.gap2(child, x, y) + self.minWeight[child]
+                    if limit is None or bound <= limit:
+                        heapq.heappush(heap, (bound, child))
+        return best[1]
+
+    def nearest(self, i, count):
+        '''nearest(i, count) ... returns the indices of the count nearest locations of location i.'''
+        x = self.xs[i]
+        y = self.ys[i]
+        found = []
+        heap = [(0.0, 0)]
+        while heap:
+            (bound, node) = heapq.heappop(heap)
+            if len(found) >= count and bound > found[count - 1][0]:
+                break
+            if self.children[node] is None:
+                for j in self.items[node]:
+                    if j != i:
+                        found.append(((self.xs[j] - x) ** 2 + (self.ys[j] - y) ** 2, j))
+                found.sort()
+                del found[count:]
+                continue
+            for child in self.children[node]:
+                if self.alive[child]:
+                    heapq.heappush(heap, (self.gap2(child, x, y), child))
+        return [j for (d, j) in found]
+
+
+def sort_jobs(locations, keys, attractors=None, optimize=False):
     """ sort holes by the nearest neighbor method
         keys: two-element list of keys for X and Y coordinates. for example ['x','y']
+        attractors: keys whose absolute values are added to the distances, the default is keys[0]
+        optimize: if True the nearest neighbor order is shortened by 2-opt moves afterwards
+        The next location is searched in a LocationTree, only near leaves are checked.
         originally written by m0n5t3r for PathHelix
     """
     if attractors is None:
         attractors = []
-    try:
-        from queue import PriorityQueue
-    except ImportError:
-        from Queue import PriorityQueue
-    from collections import defaultdict
 
     attractors = attractors or [keys[0]]
 
-    def sqdist(a, b):
-        """ square Euclidean distance """
-        d = 0
-        for k in keys:
-            d += (a[k] - b[k]) ** 2
-
-        return d
+    if not locations:
+        return []
 
     def weight(location):
         w = 0
@@ -686,29 +807,82 @@ def sort_jobs(locations, keys, attractors=None):
 
         return w
 
-    def find_closest(location_list, location, dist):
-        q = PriorityQueue()
-
-        for i, j in enumerate(location_list):
-            # prevent dictionary comparison by inserting the index
-            q.put((dist(j, location) + weight(j), i, j))
-
-        prio, i, result = q.get()  # pylint: disable=unused-variable
-
-        return result
-
-    out = []
-    zero = defaultdict(lambda: 0)
-
-    out.append(find_closest(locations, zero, sqdist))
-    locations.remove(out[-1])
+    weights = [weight(loc) for loc in locations]
+    tree = LocationTree(locations, keys, weights)
+    (xs, ys) = (tree.xs, tree.ys)
+
+    order = []
+    x = y = 0
+    while tree.count:
+        # square Euclidean distance plus weight, like sqdist(location, last) + weight(location)
+        def cost(i):
+            d = 0
+            d += (xs[i] - x) ** 2
+            d += (ys[i] - y) ** 2
+            return d + weights[i]
+
+        i = tree.closest(x, y, cost)
+        tree.remove(i)
+        order.append(i)
+        (x, y) = (xs[i], ys[i])
+
+    if optimize:
+        order = _optimize_jobs_order(LocationTree(locations, keys), order)
+
+    out = [locations[i] for i in order]
+    PathLog.debug("sort_jobs: {} locations, rapid distance {:.3f}".format(len(out), rapid_distance(out, keys)))
+    return out
 
-    while locations:
-        closest = find_closest(locations, out[-1], sqdist)
-        out.append(closest)
-        locations.remove(closest)
 
-    return out
+def _optimize_jobs_order(tree, order, neighbours=8, maxPasses=10):
+    '''_optimize_jobs_order(tree, order, neighbours=8, maxPasses=10) ... improves the order of the locations
+    of tree with 2-opt moves, the path starts at the origin.
+    Only the nearest neighbours of every location are checked as new successors.'''
+    (xs, ys) = (tree.xs, tree.ys)
+    # the origin is the fixed start point at index -1
+    path = [-1] + order
+
+    def dist(i, j):
+        if j is None:
+            return 0.0
+        return math.hypot((xs[i] if i >= 0 else 0.0) - xs[j], (ys[i] if i >= 0 else 0.0) - ys[j])
+
+    near = [tree.nearest(i, neighbours) for i in range(len(order))]
+    for npass in range(maxPasses):
+        pos = {p: k for (k, p) in enumerate(path)}
+        improved = False
+        for k in range(len(path) - 1):
+            a = path[k]
+            b = path[k + 1]
+            for c in (near[a] if a >= 0 else []):
+                m = pos[c]
+                if m <= k + 1:
+                    continue
+                d = path[m + 1] if m + 1 < len(path) else None
+                # replace a-b and c-d by a-c and b-d
+                if dist(a, c) + dist(b, d) < dist(a, b) + dist(c, d) - 1e-9:
+                    path[k + 1:m + 1] = path[m:k:-1]
+                    for n in range(k + 1, m + 1):
+                        pos[path[n]] = n
+                    b = path[k + 1]
+                    improved = True
+        if not improved:
+            break
+    return path[1:]
+
+
+def rapid_distance(locations, keys, start=None):
+    """ rapid_distance(locations, keys, start=None) ... returns the length of the XY moves between
+        the locations, in their order. If start is given, the move from start to the first location is included.
+        keys: two-element list of keys for X and Y coordinates. for example ['x','y']
+    """
+    distance = 0.0
+    last = start
+    for loc in locations:
+        if last is not None:
+            distance += math.hypot(loc[keys[0]] - last[keys[0]], loc[keys[1]] - last[keys[1]])
+        last = loc
+    return distance
 
 
 def guessDepths(objshape, subs=None):
@@ -50,6 +50,7 @@ import PathScripts.PathOp as PathOp
 import PathScripts.PathSurfaceSupport as PathSurfaceSupport
 import time
 import math
+import numpy
 
 # lazily loaded modules
 from lazy_loader.lazy_loader import LazyLoader
@@ -173,6 +174,8 @@ class ObjectWaterline(PathOp.ObjectOp):
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Enable optimization of linear paths (co-linear points). Removes unnecessary co-linear points from G-Code output.")),
             ("App::PropertyBool", "OptimizeStepOverTransitions", "Optimization",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Enable separate optimization of transitions between, and breaks within, each step over path.")),
+            ("App::PropertyInteger", "ScanThreads", "Optimization",
+                QtCore.QT_TRANSLATE_NOOP("App::Property", "Number of threads of the OCL drop-cutter scans. Set to 0 to use the OCL default, all CPU cores.")),
             ("App::PropertyDistance", "GapThreshold", "Optimization",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Collinear and co-radial artifact gaps that are smaller than this threshold are closed in the path.")),
             ("App::PropertyString", "GapSizes", "Optimization",
@@ -227,6 +230,7 @@ class ObjectWaterline(PathOp.ObjectOp):
             'AvoidLastX_Faces': 0,
             'PatternCenterCustom': FreeCAD.Vector(0.0, 0.0, 0.0),
             'GapThreshold': 0.005,
+            'ScanThreads': 0,
             'AngularDeflection': 0.25,
             'LinearDeflection': 0.0001,
             # For debugging
@@ -911,22 +915,11 @@ class ObjectWaterline(PathOp.ObjectOp):
             depthparams = [dp for dp in self.depthParams]
         lenDP = len(depthparams)
 
-        # Scan the piece to depth at smplInt
-        oclScan = []
-        oclScan = self._waterlineDropCutScan(stl, smplInt, xmin, xmax, ymin, depthparams[lenDP - 1], numScanLines)
-        oclScan = [FreeCAD.Vector(P.x, P.y, P.z + depOfst) for P in oclScan]
-        lenOS = len(oclScan)
-        ptPrLn = int(lenOS / numScanLines)
-
-        # Convert oclScan list of points to multi-dimensional list
-        scanLines = []
-        for L in range(0, numScanLines):
-            scanLines.append([])
-            for P in range(0, ptPrLn):
-                pi = L * ptPrLn + P
-                scanLines[L].append(oclScan[pi])
-        lenSL = len(scanLines)
-        pntsPerLine = len(scanLines[0])
+        # Scan the piece to depth at smplInt, one list of points per scan line
+        scanLines = self._waterlineDropCutScan(obj, stl, smplInt, xmin, xmax, ymin, depthparams[lenDP - 1], numScanLines)
+        # Heights of the scan, one line of the array per scan line
+        zMap = numpy.array([[P.z for P in SL] for SL in scanLines]) + depOfst
+        (lenSL, pntsPerLine) = zMap.shape
         msg = "--OCL scan: " + str(lenSL * pntsPerLine) + " points, with "
         msg += str(numScanLines) + " lines and " + str(pntsPerLine) + " pts/line"
         PathLog.debug(msg)
@@ -935,47 +928,34 @@ class ObjectWaterline(PathOp.ObjectOp):
         lyr = 0
         cmds = []
         layTime = time.time()
-        self.topoMap = []
         for layDep in depthparams:
-            cmds = self._getWaterline(obj, scanLines, layDep, lyr, lenSL, pntsPerLine)
+            cmds = self._getWaterline(obj, scanLines, zMap, layDep, lyr)
             commands.extend(cmds)
             lyr += 1
         PathLog.debug("--All layer scans combined took " + str(time.time() - layTime) + " s")
         return commands
 
-    def _waterlineDropCutScan(self, stl, smplInt, xmin, xmax, ymin, fd, numScanLines):
-        '''_waterlineDropCutScan(stl, smplInt, xmin, xmax, ymin, fd, numScanLines) ...
-        Perform OCL scan for waterline purpose.'''
-        pdc = ocl.PathDropCutter()   # create a pdc
-        pdc.setSTL(stl)
-        pdc.setCutter(self.cutter)
-        pdc.setZ(fd)  # set minimumZ (final / target depth value)
-        pdc.setSampling(smplInt)
-
-        # Create line object as path
-        path = ocl.Path()                   # create an empty path object
+    def _waterlineDropCutScan(self, obj, stl, smplInt, xmin, xmax, ymin, fd, numScanLines):
+        '''_waterlineDropCutScan(obj, stl, smplInt, xmin, xmax, ymin, fd, numScanLines) ...
+        Perform OCL scan for waterline purpose.
+        All scan lines are scanned in one batch, using obj.ScanThreads threads.
+        Returns a list of FreeCAD.Vector points for each scan line.'''
+        lines = list()
         for nSL in range(0, numScanLines):
             yVal = ymin + (nSL * smplInt)
-            p1 = ocl.Point(xmin, yVal, fd)   # start-point of line
-            p2 = ocl.Point(xmax, yVal, fd)   # end-point of line
-            path.append(ocl.Line(p1, p2))
-            # path.append(l)        # add the line to the path
-        pdc.setPath(path)
-        pdc.run()  # run drop-cutter on the path
-
-        # return the list of points
-        return pdc.getCLPoints()
-
-    def _getWaterline(self, obj, scanLines, layDep, lyr, lenSL, pntsPerLine):
-        '''_getWaterline(obj, scanLines, layDep, lyr, lenSL, pntsPerLine) ... Get waterline.'''
+            lines.append(((xmin, yVal), (xmax, yVal)))
+
+        return PathSurfaceSupport.dropCutScanLines(ocl, stl, self.cutter, fd, smplInt, lines, obj.ScanThreads)
+
+    def _getWaterline(self, obj, scanLines, zMap, layDep, lyr):
+        '''_getWaterline(obj, scanLines, zMap, layDep, lyr) ... Get waterline.'''
         commands = []
         cmds = []
         loopList = []
-        self.topoMap = []
-        # Create topo map from scanLines (highs and lows)
-        self.topoMap = self._createTopoMap(scanLines, layDep, lenSL, pntsPerLine)
+        # Create topo map from the scan heights (highs and lows)
+        self.topoMap = self._createTopoMap(zMap, layDep)
         # Add buffer lines and columns to topo map
-        self._bufferTopoMap(lenSL, pntsPerLine)
+        self._bufferTopoMap()
         # Identify layer waterline from OCL scan
         self._highlightWaterline(4, 9)
         # Extract waterline and convert to gcode
@@ -986,110 +966,96 @@ class ObjectWaterline(PathOp.ObjectOp):
             commands.extend(cmds)
         return commands
 
-    def _createTopoMap(self, scanLines, layDep, lenSL, pntsPerLine):
-        '''_createTopoMap(scanLines, layDep, lenSL, pntsPerLine) ... Create topo map version of OCL scan data.'''
-        topoMap = []
-        for L in range(0, lenSL):
-            topoMap.append([])
-            for P in range(0, pntsPerLine):
-                if scanLines[L][P].z > layDep:
-                    topoMap[L].append(2)
-                else:
-                    topoMap[L].append(0)
-        return topoMap
-
-    def _bufferTopoMap(self, lenSL, pntsPerLine):
-        '''_bufferTopoMap(lenSL, pntsPerLine) ... Add buffer boarder of zeros to all sides to topoMap data.'''
-        pre = [0, 0]
-        post = [0, 0]
-        for p in range(0, pntsPerLine):
-            pre.append(0)
-            post.append(0)
-        for i in range(0, lenSL):
-            self.topoMap[i].insert(0, 0)
-            self.topoMap[i].append(0)
-        self.topoMap.insert(0, pre)
-        self.topoMap.append(post)
+    def _createTopoMap(self, zMap, layDep):
+        '''_createTopoMap(zMap, layDep) ... Create topo map version of OCL scan data.
+        Returns an array of the scan heights zMap with 2 above layDep and 0 for all others.'''
+        return numpy.where(zMap > layDep, 2, 0).astype(numpy.int8)
+
+    def _bufferTopoMap(self):
+        '''_bufferTopoMap() ... Add buffer boarder of zeros to all sides to topoMap data.'''
+        self.topoMap = numpy.pad(self.topoMap, 1, mode='constant', constant_values=0)
         return True
 
     def _highlightWaterline(self, extraMaterial, insCorn):
-        '''_highlightWaterline(extraMaterial, insCorn) ... Highlight the waterline data, separating from extra material.'''
+        '''_highlightWaterline(extraMaterial, insCorn) ... Highlight the waterline data, separating from extra material.
+        The ridges are found for the whole topo map at once, the corners are only checked at the ridge points.'''
         TM = self.topoMap
-        lastPnt = len(TM[1]) - 1
-        lastLn = len(TM) - 1
-        highFlag = 0
+        high = TM == 2
+        # first and last lines and points are ignored
+        inner = numpy.zeros(TM.shape, dtype=bool)
+        inner[1:-1, 1:-1] = True
 
         # ("--Convert parallel data to ridges")
-        for lin in range(1, lastLn):
-            for pt in range(1, lastPnt):  # Ignore first and last points
-                if TM[lin][pt] == 0:
-                    if TM[lin][pt + 1] == 2:  # step up
-                        TM[lin][pt] = 1
-                    if TM[lin][pt - 1] == 2:  # step down
-                        TM[lin][pt] = 1
+        step = numpy.zeros(TM.shape, dtype=bool)
+        step[:, 1:-1] = high[:, 2:] | high[:, :-2]  # step up or step down
+        TM[inner & (TM == 0) & step] = 1
 
         # ("--Convert perpendicular data to ridges and highlight ridges")
-        for pt in range(1, lastPnt):  # Ignore first and last points
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 0:
-                    highFlag = 0
-                    if TM[lin + 1][pt] == 2:  # step up
-                        TM[lin][pt] = 1
-                    if TM[lin - 1][pt] == 2:  # step down
-                        TM[lin][pt] = 1
-                elif TM[lin][pt] == 2:
-                    highFlag += 1
-                    if highFlag == 3:
-                        if TM[lin - 1][pt - 1] < 2 or TM[lin - 1][pt + 1] < 2:
-                            highFlag = 2
-                        else:
-                            TM[lin - 1][pt] = extraMaterial
-                            highFlag = 2
+        step[:] = False
+        step[1:-1, :] = high[2:, :] | high[:-2, :]  # step up or step down
+        low = inner & (TM == 0)
+        # The points are scanned point by point and line by line within.
+        # Every third and following high point after the last low point is flagged,
+        # the point before it is extra material if its neighbour points are high or extra material.
+        scan = TM[1:-1, 1:-1].ravel(order='F')
+        highCnt = numpy.cumsum(scan == 2)
+        lowCnt = numpy.maximum.accumulate(numpy.where(scan == 0, highCnt, 0))
+        flagged = ((scan == 2) & (highCnt - lowCnt >= 3)).reshape(TM[1:-1, 1:-1].shape, order='F')
+        extra = numpy.zeros(TM.shape, dtype=bool)
+        for pt in (numpy.nonzero(flagged.any(axis=0))[0] + 1).tolist():
+            extra[:-2, pt] = flagged[:, pt - 1] & (high[:-2, pt - 1] | extra[:-2, pt - 1]) & high[:-2, pt + 1]
+        TM[low & step] = 1
+        TM[extra] = extraMaterial
 
         # ("--Square corners")
-        for pt in range(1, lastPnt):
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 1:                    # point == 1
+        for (pt, lin) in self._ridgePoints(order='F'):
+            if TM[lin, pt] == 1:                    # point == 1
+                cont = True
+                if TM[lin + 1, pt] == 0:            # forward == 0
+                    if TM[lin + 1, pt - 1] == 1:    # forward left == 1
+                        if TM[lin, pt - 1] == 2:    # left == 2
+                            TM[lin + 1, pt] = 1     # square the corner
+                            cont = False
+
+                    if cont is True and TM[lin + 1, pt + 1] == 1:  # forward right == 1
+                        if TM[lin, pt + 1] == 2:    # right == 2
+                            TM[lin + 1, pt] = 1     # square the corner
                     cont = True
-                    if TM[lin + 1][pt] == 0:            # forward == 0
-                        if TM[lin + 1][pt - 1] == 1:    # forward left == 1
-                            if TM[lin][pt - 1] == 2:    # left == 2
-                                TM[lin + 1][pt] = 1     # square the corner
-                                cont = False
-
-                        if cont is True and TM[lin + 1][pt + 1] == 1:  # forward right == 1
-                            if TM[lin][pt + 1] == 2:    # right == 2
-                                TM[lin + 1][pt] = 1     # square the corner
-                        cont = True
-
-                    if TM[lin - 1][pt] == 0:          # back == 0
-                        if TM[lin - 1][pt - 1] == 1:    # back left == 1
-                            if TM[lin][pt - 1] == 2:    # left == 2
-                                TM[lin - 1][pt] = 1     # square the corner
-                                cont = False
-
-                        if cont is True and TM[lin - 1][pt + 1] == 1:  # back right == 1
-                            if TM[lin][pt + 1] == 2:    # right == 2
-                                TM[lin - 1][pt] = 1     # square the corner
+
+                if TM[lin - 1, pt] == 0:          # back == 0
+                    if TM[lin - 1, pt - 1] == 1:    # back left == 1
+                        if TM[lin, pt - 1] == 2:    # left == 2
+                            TM[lin - 1, pt] = 1     # square the corner
+                            cont = False
+
+                    if cont is True and TM[lin - 1, pt + 1] == 1:  # back right == 1
+                        if TM[lin, pt + 1] == 2:    # right == 2
+                            TM[lin - 1, pt] = 1     # square the corner
 
         # remove inside corners
-        for pt in range(1, lastPnt):
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 1:                    # point == 1
-                    if TM[lin][pt + 1] == 1:
-                        if TM[lin - 1][pt + 1] == 1 or TM[lin + 1][pt + 1] == 1:
-                            TM[lin][pt + 1] = insCorn
-                    elif TM[lin][pt - 1] == 1:
-                        if TM[lin - 1][pt - 1] == 1 or TM[lin + 1][pt - 1] == 1:
-                            TM[lin][pt - 1] = insCorn
+        for (pt, lin) in self._ridgePoints(order='F'):
+            if TM[lin, pt] == 1:                    # point == 1
+                if TM[lin, pt + 1] == 1:
+                    if TM[lin - 1, pt + 1] == 1 or TM[lin + 1, pt + 1] == 1:
+                        TM[lin, pt + 1] = insCorn
+                elif TM[lin, pt - 1] == 1:
+                    if TM[lin - 1, pt - 1] == 1 or TM[lin + 1, pt - 1] == 1:
+                        TM[lin, pt - 1] = insCorn
 
         return True
 
+    def _ridgePoints(self, order='C'):
+        '''_ridgePoints(order='C') ... Returns the [line, point] indices of the ridge points (== 1)
+        of the topo map without the buffer, line by line for order 'C'.
+        For order 'F' point by point, as [point, line] indices.'''
+        TM = self.topoMap[1:-1, 1:-1]
+        if order == 'F':
+            TM = TM.T
+        return (numpy.argwhere(TM == 1) + 1).tolist()
+
     def _extractWaterlines(self, obj, oclScan, lyr, layDep):
         '''_extractWaterlines(obj, oclScan, lyr, layDep) ... Extract water lines from OCL scan data.'''
         srch = True
-        lastPnt = len(self.topoMap[0]) - 1
-        lastLn = len(self.topoMap) - 1
         maxSrchs = 5
         srchCnt = 1
         loopList = []
@@ -1103,85 +1069,65 @@ class ObjectWaterline(PathOp.ObjectOp):
             lC = [1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0]
             pC = [-1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1]
 
+        # Search order of the 8 neighbours for each direction the current point was reached from
+        nbrs = dict()
+        for s in range(0, 8):
+            nbrs[(lC[s + 3], pC[s + 3])] = [(lC[s + r], pC[s + r]) for r in range(0, 8)]
+
         while srch is True:
             srch = False
             if srchCnt > maxSrchs:
                 PathLog.debug("Max search scans, " + str(maxSrchs) + " reached\nPossible incomplete waterline result!")
                 break
-            for L in range(1, lastLn):
-                for P in range(1, lastPnt):
-                    if self.topoMap[L][P] == 1:
-                        # start loop follow
-                        srch = True
-                        loopNum += 1
-                        loop = self._trackLoop(oclScan, lC, pC, L, P, loopNum)
-                        self.topoMap[L][P] = 0  # Mute the starting point
-                        loopList.append(loop)
+            for (L, P) in self._ridgePoints():
+                if self.topoMap[L, P] == 1:
+                    # start loop follow
+                    srch = True
+                    loopNum += 1
+                    loop = self._trackLoop(oclScan, nbrs, L, P, loopNum)
+                    self.topoMap[L, P] = 0  # Mute the starting point
+                    loopList.append(loop)
             srchCnt += 1
         PathLog.debug("Search count for layer " + str(lyr) + " is " + str(srchCnt) + ", with " + str(loopNum) + " loops.")
         return loopList
 
-    def _trackLoop(self, oclScan, lC, pC, L, P, loopNum):
-        '''_trackLoop(oclScan, lC, pC, L, P, loopNum) ... Track the loop direction.'''
+    def _trackLoop(self, oclScan, nbrs, L, P, loopNum):
+        '''_trackLoop(oclScan, nbrs, L, P, loopNum) ... Track the loop direction.'''
         loop = [oclScan[L - 1][P - 1]]  # Start loop point list
-        cur = [L, P, 1]
-        prv = [L, P - 1, 1]
-        nxt = [L, P + 1, 1]
-        follow = True
+        cur = (L, P)
+        prv = (L, P - 1)
+        nxt = (L, P + 1)
         ptc = 0
         ptLmt = 200000
-        while follow is True:
+        while True:
             ptc += 1
             if ptc > ptLmt:
                 PathLog.debug("Loop number " + str(loopNum) + " at [" + str(nxt[0]) + ", " + str(nxt[1]) + "] pnt count exceeds, " + str(ptLmt) + ".  Stopped following loop.")
                 break
-            nxt = self._findNextWlPoint(lC, pC, cur[0], cur[1], prv[0], prv[1])  # get next point
+            nxt = self._findNextWlPoint(nbrs, cur, prv)  # get next point
             loop.append(oclScan[nxt[0] - 1][nxt[1] - 1])  # add it to loop point list
-            self.topoMap[nxt[0]][nxt[1]] = nxt[2]  # Mute the point, if not Y stem
-            if nxt[0] == L and nxt[1] == P:  # check if loop complete
-                follow = False
-            elif nxt[0] == cur[0] and nxt[1] == cur[1]:  # check if line cannot be detected
-                follow = False
+            self.topoMap[nxt] = 0  # Mute the point
+            if nxt == (L, P):  # check if loop complete
+                break
+            elif nxt == cur:  # check if line cannot be detected
+                break
             prv = cur
             cur = nxt
         return loop
 
-    def _findNextWlPoint(self, lC, pC, cl, cp, pl, pp):
-        '''_findNextWlPoint(lC, pC, cl, cp, pl, pp) ...
-        Find the next waterline point in the point cloud layer provided.'''
-        dl = cl - pl
-        dp = cp - pp
-        num = 0
-        i = 3
-        s = 0
-        mtch = 0
-        found = False
-        while mtch < 8:  # check all 8 points around current point
-            if lC[i] == dl:
-                if pC[i] == dp:
-                    s = i - 3
-                    found = True
-                    # Check for y branch where current point is connection between branches
-                    for y in range(1, mtch):
-                        if lC[i + y] == dl:
-                            if pC[i + y] == dp:
-                                num = 1
-                                break
-                    break
-            i += 1
-            mtch += 1
-        if found is False:
-            # ("_findNext: No start point found.")
-            return [cl, cp, num]
-
-        for r in range(0, 8):
-            l = cl + lC[s + r]
-            p = cp + pC[s + r]
-            if self.topoMap[l][p] == 1:
-                return [l, p, num]
+    def _findNextWlPoint(self, nbrs, cur, prv):
+        '''_findNextWlPoint(nbrs, cur, prv) ...
+        Find the next waterline point in the point cloud layer provided.
+        The neighbours of cur are searched in the order nbrs lists for the direction from prv to cur.
+        Returns cur if no next point is found.'''
+        (cl, cp) = cur
+        TM = self.topoMap
+        for (dl, dp) in nbrs.get((cl - prv[0], cp - prv[1]), ()):
+            if TM[cl + dl, cp + dp] == 1:
+                return (cl + dl, cp + dp)
 
         # ("_findNext: No next pnt found")
-        return [cl, cp, num]
+        return cur
 
     def _loopToGcode(self, obj, layDep, loop):
         '''_loopToGcode(obj, layDep, loop) ... Convert set of loop points to Gcode.'''
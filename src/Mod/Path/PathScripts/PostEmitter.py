@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+'''
+G-code emitter shared by the post processors.
+
+A GCodeEmitter converts the commands of Path objects into G-code lines and writes
+them to a stream. The unit conversions and number formats are prepared once, every
+command is converted with a single lookup of its parameters.
+A dialect is a set of settings, see GCodeEmitter.__init__, and a table of hooks
+for commands which need special treatment, like tool changes.
+Dialects which need more control overwrite startPath(), startCommand(), endCommand()
+and writeWords().
+'''
+
+import FreeCAD
+
+# parameter order of the linuxcnc post processor
+PARAMETER_ORDER = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
+
+# parameters written as integer values
+INTEGER_PARAMETERS = ['S', 'T', 'H', 'D']
+
+RAPID_MOVES = ['G0', 'G00']
+
+# the number of lines collected before they are written to the stream
+WRITE_CHUNK_SIZE = 10000
+
+
+def unitScale(unit):
+    '''unitScale(unit) ... returns the value of unit, like '1 in' or '1 mm/min', in FreeCAD's internal units.
+    Internal values are converted to unit by a division with the returned value,
+    the same as Units.Quantity.getValueAs(unit) does.'''
+    return FreeCAD.Units.Quantity('1 ' + unit).Value
+
+
+class GCodeEmitter(object):
+    '''GCodeEmitter(**settings) ... converts Path commands into G-code lines.'''
+
+    def __init__(self,
+                 precision=3,
+                 lengthUnit='mm',
+                 speedUnit='mm/min',
+                 parameterOrder=None,
+                 integerParameters=None,
+                 rawParameters=None,
+                 unscaledParameters=None,
+                 modal=False,
+                 outputDoubles=True,
+                 outputComments=True,
+                 outputLineNumbers=False,
+                 lineNumber=100,
+                 lineNumberStep=10,
+                 commandSpace=' ',
+                 stripLines=False,
+                 rapidFeed=False,
+                 firstLocation=None,
+                 commandHooks=None):
+        '''Settings of the dialect:
+        precision:          number of decimals of the length and speed values
+        lengthUnit:         unit of the axis values, 'mm' or 'in'
+        speedUnit:          unit of the feed rates, 'mm/min' or 'in/min'
+        parameterOrder:     order of the parameters in the lines, other parameters are not written
+        integerParameters:  parameters written as integers, without conversion
+        rawParameters:      parameters written as they are, with str()
+        unscaledParameters: parameters written with precision but without unit conversion, like angles
+        modal:              suppress the command name if it is the same as the one of the last command
+        outputDoubles:      if False, axis values and feed rates equal to the last ones are suppressed
+        outputComments:     if False, comments are suppressed
+        outputLineNumbers:  prefix the lines with line numbers
+        lineNumber:         the line number before the first line
+        lineNumberStep:     increment of the line numbers
+        commandSpace:       appended to every word of a line
+        stripLines:         strip trailing white space from the lines
+        rapidFeed:          if False, feed rates of rapid moves are suppressed
+        firstLocation:      parameters assumed before the first command of every path
+        commandHooks:       {command name: hook(emitter, command, parameters, words)}
+            A hook is called after the words of the command are made, it can change the list
+            of words and add lines with emitter.writeLine() before the line of the command.'''
+        self.precision = int(precision)
+        self.lengthScale = unitScale(lengthUnit)
+        self.speedScale = unitScale(speedUnit)
+        self.parameterOrder = PARAMETER_ORDER if parameterOrder is None else parameterOrder
+        self.integerParameters = set(INTEGER_PARAMETERS if integerParameters is None else integerParameters)
+        self.rawParameters = set([] if rawParameters is None else rawParameters)
+        self.unscaledParameters = set([] if unscaledParameters is None else unscaledParameters)
+        self.modal = modal
+        self.outputDoubles = outputDoubles
+        self.outputComments = outputComments
+        self.outputLineNumbers = outputLineNumbers
+        self.lineNumber = lineNumber
+        self.lineNumberStep = lineNumberStep
+        self.commandSpace = commandSpace
+        self.stripLines = stripLines
+        self.rapidFeed = rapidFeed
+        self.firstLocation = {'X': -1, 'Y': -1, 'Z': -1, 'F': 0.0} if firstLocation is None else firstLocation
+        self.commandHooks = {} if commandHooks is None else commandHooks
+
+        self.valueFormat = '.' + str(self.precision) + 'f'
+        self.lines = []
+        self.stream = None
+        self.lastCommand = None
+        self.location = {}
+
+    def lineNumberPrefix(self):
+        '''lineNumberPrefix() ... returns the next line number word, or an empty string without line numbers.'''
+        if self.outputLineNumbers:
+            self.lineNumber += self.lineNumberStep
+            return "N" + str(self.lineNumber) + " "
+        return ""
+
+    def write(self, text):
+        '''write(text) ... writes text as it is, without a line number.'''
+        self.lines.append(text)
+        if len(self.lines) >= WRITE_CHUNK_SIZE:
+            self.flush()
+
+    def writeLine(self, line):
+        '''writeLine(line) ... writes line, which must end with a newline, with a line number.'''
+        self.write(self.lineNumberPrefix() + line)
+
+    def writeLines(self, text):
+        '''writeLines(text) ... writes all lines of text, each with a line number.'''
+        for line in text.splitlines(True):
+            self.writeLine(line)
+
+    def flush(self):
+        if self.lines:
+            self.stream.write("".join(self.lines))
+            self.lines = []
+
+    def emit(self, pathobj, stream):
+        '''emit(pathobj, stream) ... writes the G-code of pathobj and of all its children to stream.'''
+        self.stream = stream
+        self.emitPath(pathobj)
+        self.flush()
+
+    def emitPath(self, pathobj):
+        if hasattr(pathobj, "Group"):  # We have a compound or project.
+            for p in pathobj.Group:
+                self.emitPath(p)
+            return
+
+        # groups might contain non-path things like stock.
+        if not hasattr(pathobj, "Path"):
+            return
+
+        self.startPath(pathobj)
+        for c in pathobj.Path.Commands:
+            self.emitCommand(c.Name, c.Parameters)
+
+    def startPath(self, pathobj):
+        '''startPath(pathobj) ... resets the modal state at the beginning of every path.
+        Can be overwritten to collect settings of pathobj.'''
+        self.lastCommand = None
+        self.location = dict(self.firstLocation)
+
+    def startCommand(self, name, params):
+        '''startCommand(name, params) ... returns the command to write for the Path command name
+        and the list of its first words. Can be overwritten.'''
+        return (name, [name])
+
+    def endCommand(self, command, name, params, words):
+        '''endCommand(command, name, params, words) ... called after the parameters are added to words.
+        Can be overwritten.'''
+        pass
+
+    def emitCommand(self, name, params):
+        (command, words) = self.startCommand(name, params)
+
+        # if modal: suppress the command if it is the same as the last one
+        if self.modal and command == self.lastCommand:
+            words.pop(0)
+
+        if name[0] == '(' and not self.outputComments:  # command is a comment
+            return
+
+        # Now add the remaining parameters in order
+        location = self.location
+        valueFormat = self.valueFormat
+        for param in self.parameterOrder:
+            if param not in params:
+                continue
+            value = params[param]
+            if param == 'F' and (self.outputDoubles or location[param] != value):
+                if self.rapidFeed or name not in RAPID_MOVES:
+                    speed = value / self.speedScale
+                    if speed > 0.0:
+                        words.append(param + format(speed, valueFormat))
+            elif param in self.integerParameters:
+                words.append(param + str(int(value)))
+            elif param in self.rawParameters:
+                words.append(param + str(value))
+            elif param in self.unscaledParameters:
+                if self.outputDoubles or location.get(param) != value:
+                    words.append(param + format(value, valueFormat))
+            elif self.outputDoubles or location.get(param) != value:
+                words.append(param + format(value / self.lengthScale, valueFormat))
+
+        self.endCommand(command, name, params, words)
+
+        # store the latest command
+        self.lastCommand = command
+        location.update(params)
+
+        hook = self.commandHooks.get(command)
+        if hook is not None:
+            hook(self, command, params, words)
+
+        if command == "message":
+            if not self.outputComments:
+                return
+            words.pop(0)  # remove the command
+
+        if words:
+            self.writeWords(words)
+
+    def writeWords(self, words):
+        '''writeWords(words) ... writes the line of a command made of words. Can be overwritten.'''
+        # prepend a line number and append a newline
+        if self.outputLineNumbers:
+            words.insert(0, self.lineNumberPrefix())
+        space = self.commandSpace
+        line = "".join([w + space for w in words])
+        if self.stripLines:
+            line = line.rstrip()
+        self.write(line + "\n")
+
+
+def toolChangeHook(toolChange, useTLO=True):
+    '''toolChangeHook(toolChange, useTLO=True) ... returns a hook for M6 commands.
+    The hook stops the spindle, writes the lines of toolChange before the tool change
+    and adds the height offset G43 of the tool after it if useTLO is set.'''
+    def hook(emitter, command, params, words):
+        emitter.writeLine("M5\n")
+        emitter.writeLines(toolChange)
+        if useTLO:
+            words.append('\nG43 H' + str(int(params['T'])))
+    return hook
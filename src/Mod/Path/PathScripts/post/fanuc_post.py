@@ -27,8 +27,10 @@ from FreeCAD import Units
 import Path
 import argparse
 import datetime
+import io
 import shlex
 import os.path
+from PathScripts import PostEmitter
 from PathScripts import PostUtils
 
 TOOLTIP = '''
@@ -165,11 +167,6 @@ def export(objectslist, filename, argstring):
     # pylint: disable=global-statement
     if not processArguments(argstring):
         return None
-    global UNITS
-    global UNIT_FORMAT
-    global UNIT_SPEED_FORMAT
-    global HORIZRAPID
-    global VERTRAPID
 
     for obj in objectslist:
         if not hasattr(obj, "Path"):
@@ -177,23 +174,56 @@ def export(objectslist, filename, argstring):
             return None
 
     print("postprocessing...")
-    gcode = ""
+    if not filename == '-' and not (FreeCAD.GuiUp and SHOW_EDITOR):
+        # the program is written straight into the file
+        with pythonopen(filename, "w") as gfile:
+            writeProgram(objectslist, filename, gfile)
+        print("done postprocessing.")
+        # the program is not kept in memory, it is only in the file
+        return None
+
+    gcode = io.StringIO()
+    writeProgram(objectslist, filename, gcode)
+    gcode = gcode.getvalue()
 
+    if FreeCAD.GuiUp and SHOW_EDITOR:
+        dia = PostUtils.GCodeEditorDialog()
+        dia.editor.setText(gcode)
+        result = dia.exec_()
+        if result:
+            final = dia.editor.toPlainText()
+        else:
+            final = gcode
+    else:
+        final = gcode
+
+    print("done postprocessing.")
+
+    if not filename == '-':
+        gfile = pythonopen(filename, "w")
+        gfile.write(final)
+        gfile.close()
+
+    return final
+
+
+def writeProgram(objectslist, filename, gcode):
+    '''writeProgram(objectslist, filename, gcode) ... writes the whole program for filename to the stream gcode.'''
     # write header
     if OUTPUT_HEADER:
-        gcode += "%\n"
-        gcode += ";\n"
-        gcode += os.path.split(filename)[-1]+" ("+"FREECAD-FILENAME-GOES-HERE" + ", " + "JOB-NAME-GOES-HERE"+")\n"
-        gcode += linenumber() + "("+filename.upper()+",EXPORTED BY FREECAD!)\n"
-        gcode += linenumber() + "(POST PROCESSOR: " + __name__.upper() + ")\n"
-        gcode += linenumber() + "(OUTPUT TIME:" + str(now).upper() + ")\n"
+        gcode.write("%\n")
+        gcode.write(";\n")
+        gcode.write(os.path.split(filename)[-1]+" ("+"FREECAD-FILENAME-GOES-HERE" + ", " + "JOB-NAME-GOES-HERE"+")\n")
+        gcode.write(linenumber() + "("+filename.upper()+",EXPORTED BY FREECAD!)\n")
+        gcode.write(linenumber() + "(POST PROCESSOR: " + __name__.upper() + ")\n")
+        gcode.write(linenumber() + "(OUTPUT TIME:" + str(now).upper() + ")\n")
 
     # Write the preamble
     if OUTPUT_COMMENTS:
-        gcode += linenumber() + "(BEGIN PREAMBLE)\n"
+        gcode.write(linenumber() + "(BEGIN PREAMBLE)\n")
     for line in PREAMBLE.splitlines(False):
-        gcode += linenumber() + line + "\n"
-    gcode += linenumber() + UNITS + "\n"
+        gcode.write(linenumber() + line + "\n")
+    gcode.write(linenumber() + UNITS + "\n")
 
     for obj in objectslist:
 
@@ -207,10 +237,10 @@ def export(objectslist, filename, argstring):
 
         # do the pre_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(BEGIN OPERATION: %s)\n" % obj.Label.upper()
-            gcode += linenumber() + "(MACHINE UNITS: %s)\n" % (UNIT_SPEED_FORMAT.upper())
+            gcode.write(linenumber() + "(BEGIN OPERATION: %s)\n" % obj.Label.upper())
+            gcode.write(linenumber() + "(MACHINE UNITS: %s)\n" % (UNIT_SPEED_FORMAT.upper()))
         for line in PRE_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            gcode.write(linenumber() + line)
 
         # get coolant mode
         coolantMode = 'None'
@@ -223,53 +253,33 @@ def export(objectslist, filename, argstring):
         # turn coolant on if required
         if OUTPUT_COMMENTS:
             if not coolantMode == 'None':
-                gcode += linenumber() + '(COOLANT ON:' + coolantMode.upper() + ')\n'
+                gcode.write(linenumber() + '(COOLANT ON:' + coolantMode.upper() + ')\n')
         if coolantMode == 'Flood':
-            gcode  += linenumber() + 'M8' + '\n'
+            gcode.write(linenumber() + 'M8' + '\n')
         if coolantMode == 'Mist':
-            gcode += linenumber() + 'M7' + '\n'
+            gcode.write(linenumber() + 'M7' + '\n')
 
         # process the operation gcode
-        gcode += parse(obj)
+        writeGCode(obj, gcode)
 
         # do the post_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(FINISH OPERATION: %s)\n" % obj.Label.upper()
+            gcode.write(linenumber() + "(FINISH OPERATION: %s)\n" % obj.Label.upper())
         for line in POST_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            gcode.write(linenumber() + line)
 
         # turn coolant off if required
         if not coolantMode == 'None':
             if OUTPUT_COMMENTS:
-                gcode += linenumber() + '(COOLANT OFF:' + coolantMode.upper() + ')\n'
-            gcode  += linenumber() +'M9' + '\n'
+                gcode.write(linenumber() + '(COOLANT OFF:' + coolantMode.upper() + ')\n')
+            gcode.write(linenumber() +'M9' + '\n')
 
     # do the post_amble
     if OUTPUT_COMMENTS:
-        gcode += "(BEGIN POSTAMBLE)\n"
+        gcode.write("(BEGIN POSTAMBLE)\n")
     for line in POSTAMBLE.splitlines(True):
-        gcode += linenumber() + line
-    gcode += "%\n"
-
-    if FreeCAD.GuiUp and SHOW_EDITOR:
-        dia = PostUtils.GCodeEditorDialog()
-        dia.editor.setText(gcode)
-        result = dia.exec_()
-        if result:
-            final = dia.editor.toPlainText()
-        else:
-            final = gcode
-    else:
-        final = gcode
-
-    print("done postprocessing.")
-
-    if not filename == '-':
-        gfile = pythonopen(filename, "w")
-        gfile.write(final)
-        gfile.close()
-
-    return final
+        gcode.write(linenumber() + line)
+    gcode.write("%\n")
 
 
 def linenumber():
@@ -281,206 +291,163 @@ def linenumber():
     return ""
 
 
-def parse(pathobj):
-    # pylint: disable=global-statement
-    global PRECISION
-    global MODAL
-    global OUTPUT_DOUBLES
-    global UNIT_FORMAT
-    global UNIT_SPEED_FORMAT
-    global tapSpeed
-
-    out = ""
-    lastcommand = None
-    precision_string = '.' + str(PRECISION) + 'f'
-    currLocation = {}  # keep track for no doubles
-    print("Startup!")
-
-    # the order of parameters
-    # arcs need work.  original code from mach3_4 doesn't want K properties on XY plane.  Not sure
-    # what fanuc does here.
-    params = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
-    firstmove = Path.Command("G0", {"X": -1, "Y": -1, "Z": -1, "F": 0.0})
-    currLocation.update(firstmove.Parameters)  # set First location Parameters
-
-    if hasattr(pathobj, "Group"):  # We have a compound or project.
-        # if OUTPUT_COMMENTS:
-        #     out += linenumber() + "(compound: " + pathobj.Label + ")\n"
-        for p in pathobj.Group:
-            out += parse(p)
-        return out
-    else:  # parsing simple path
-
-        # groups might contain non-path things like stock.
-        if not hasattr(pathobj, "Path"):
-            return out
-
-        # if OUTPUT_COMMENTS:
-        #     out += linenumber() + "(" + pathobj.Label + ")\n"
-
-        adaptiveOp = False
-        opHorizRapid = 0
-        opVertRapid = 0
+class FanucEmitter(PostEmitter.GCodeEmitter):
+    '''FanucEmitter(**settings) ... G-code emitter with the rigid tapping, the rapid moves of
+    adaptive operations and the upper case output of fanuc.'''
+
+    def startPath(self, pathobj):
+        PostEmitter.GCodeEmitter.startPath(self, pathobj)
+        self.pathobj = pathobj
+        self.adaptiveOp = False
+        self.opHorizRapid = 0
+        self.opVertRapid = 0
 
         if 'Adaptive' in pathobj.Name:
-            adaptiveOp = True
+            self.adaptiveOp = True
             if hasattr(pathobj, 'ToolController'):
                 if hasattr(pathobj.ToolController, 'HorizRapid') and pathobj.ToolController.HorizRapid > 0:
-                    opHorizRapid = Units.Quantity(pathobj.ToolController.HorizRapid, FreeCAD.Units.Velocity)
+                    self.opHorizRapid = Units.Quantity(pathobj.ToolController.HorizRapid, FreeCAD.Units.Velocity)
                 else:
                     FreeCAD.Console.PrintWarning('Tool Controller Horizontal Rapid Values are unset'+ '\n')
 
                 if hasattr(pathobj.ToolController, 'VertRapid') and pathobj.ToolController.VertRapid > 0:
-                    opVertRapid = Units.Quantity(pathobj.ToolController.VertRapid, FreeCAD.Units.Velocity)
+                    self.opVertRapid = Units.Quantity(pathobj.ToolController.VertRapid, FreeCAD.Units.Velocity)
                 else:
                     FreeCAD.Console.PrintWarning('Tool Controller Vertical Rapid Values are unset'+ '\n')
 
-        for index,c in enumerate(pathobj.Path.Commands):
-
-            outstring = []
-            command = c.Name
-            if index+1 == len(pathobj.Path.Commands):
-              nextcommand = ""
+    def emitPath(self, pathobj):
+        if hasattr(pathobj, "Group") or not hasattr(pathobj, "Path"):
+            PostEmitter.GCodeEmitter.emitPath(self, pathobj)
+            return
+
+        # the G80 suppression needs the command following every command
+        self.startPath(pathobj)
+        commands = pathobj.Path.Commands
+        for index, c in enumerate(commands):
+            if index+1 == len(commands):
+                self.nextCommand = ""
             else:
-              nextcommand = pathobj.Path.Commands[index+1].Name
-
-            if adaptiveOp and c.Name in ["G0", "G00"]:
-                if opHorizRapid and opVertRapid:
-                    command = 'G1'
+                self.nextCommand = commands[index+1].Name
+            self.emitCommand(c.Name, c.Parameters)
+
+    def rapidAsFeed(self, name):
+        return self.adaptiveOp and name in ["G0", "G00"] and self.opHorizRapid and self.opVertRapid
+
+    def startCommand(self, name, params):
+        words = []
+        command = name
+        if self.adaptiveOp and name in ["G0", "G00"]:
+            if self.opHorizRapid and self.opVertRapid:
+                command = 'G1'
+            else:
+                words.append('(TOOL CONTROLLER RAPID VALUES ARE UNSET)' + '\n')
+        words.append(command)
+        return (command, words)
+
+    def emitCommand(self, name, params):
+        # pylint: disable=global-statement
+        global tapSpeed
+        command = 'G1' if self.rapidAsFeed(name) else name
+
+        # suppress moves in fixture selection
+        if self.pathobj.Label == "Fixture":
+            if command == "G0":
+                return
+
+        # if it's a tap, we rigid tap, so don't start the spindle yet...
+        if command == "M03" or command == "M3":
+            if self.pathobj.Tool.ToolType == "Tap":
+                tapSpeed = int(self.pathobj.SpindleSpeed)
+                return
+
+        # convert drill cycles to tap cycles if tool is a tap
+        if command == "G81" or command == "G83":
+            if hasattr(self.pathobj, 'ToolController') and self.pathobj.ToolController.Tool.ToolType == "Tap":
+                self.emitTapCycle(params)
+                return
+
+        # suppress a G80 between two identical command
+        if command == "G80" and self.lastCommand == self.nextCommand:
+            return
+
+        PostEmitter.GCodeEmitter.emitCommand(self, name, params)
+
+    def emitTapCycle(self, params):
+        # pylint: disable=global-statement
+        global tapSpeed
+        location = self.location
+        self.writeLine("G95\n")
+        paramstring = ""
+        for param in [ "X", "Y" ]:
+            if param in params:
+                if (not self.outputDoubles) and (param in location) and (location[param] == params[param]):
+                    continue
                 else:
-                    outstring.append('(TOOL CONTROLLER RAPID VALUES ARE UNSET)' + '\n')
+                    paramstring += " " + param + format(params[param] / self.lengthScale, self.valueFormat)
+        if paramstring != "":
+            self.writeLine("G00"+paramstring+"\n")
 
-            # suppress moves in fixture selection
-            if pathobj.Label == "Fixture":
-                if command == "G0":
-                    continue
+        if "S" in params:
+            tapSpeed = int(params['S'])
+        self.write("M29 S"+str(tapSpeed)+"\n")
 
-            # if it's a tap, we rigid tap, so don't start the spindle yet...
-            if command == "M03" or command == "M3":
-                if pathobj.Tool.ToolType == "Tap":
-                    tapSpeed = int(pathobj.SpindleSpeed)
+        for param in [ "Z", "R" ]:
+            if param in params:
+                if (not self.outputDoubles) and (param in location) and (location[param] == params[param]):
                     continue
-
-            # convert drill cycles to tap cycles if tool is a tap
-            if command == "G81" or command == "G83":
-                if hasattr(pathobj, 'ToolController') and pathobj.ToolController.Tool.ToolType == "Tap":
-                    command = "G84"
-                    out += linenumber() + "G95\n"
-                    paramstring = ""
-                    for param in [ "X", "Y" ]:
-                        if param in c.Parameters:
-                            if (not OUTPUT_DOUBLES) and (param in currLocation) and (currLocation[param] == c.Parameters[param]):
-                                continue
-                            else:
-                                pos = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-                                paramstring += " " + param + format(float(pos.getValueAs(UNIT_FORMAT)), precision_string)
-                    if paramstring != "":
-                        out += linenumber() + "G00"+paramstring+"\n"
-
-                    if "S" in c.Parameters:
-                        tapSpeed = int(c.Parameters['S'])
-                    out += "M29 S"+str(tapSpeed)+"\n"
-
-                    for param in [ "Z", "R" ]:
-                        if param in c.Parameters:
-                            if (not OUTPUT_DOUBLES) and (param in currLocation) and (currLocation[param] == c.Parameters[param]):
-                                continue
-                            else:
-                                pos = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-                                paramstring += " " + param + format(float(pos.getValueAs(UNIT_FORMAT)), precision_string)
-                    # in this mode, F is the distance per revolution of the thread (pitch)
-                    # P is the dwell time in seconds at the bottom of the thread
-                    # Q is the peck depth of the threading operation
-                    for param in [ "F", "P", "Q" ]:
-                        if param in c.Parameters:
-                            value = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-                            paramstring += " " + param + format(float(value.getValueAs(UNIT_FORMAT)), precision_string) 
-
-                    out += linenumber() + "G84" + paramstring + "\n"
-                    out += linenumber() + "G80\n"
-                    out += linenumber() + "G94\n"
-                    continue
-
-
-            outstring.append(command)
-
-            # if modal: suppress the command if it is the same as the last one
-            if MODAL is True:
-                if command == lastcommand:
-                    outstring.pop(0)
-
-            # suppress a G80 between two identical command
-            if command == "G80" and lastcommand == nextcommand:
-                continue
-
-            if c.Name[0] == '(' and not OUTPUT_COMMENTS: # command is a comment
-                continue
-
-            # Now add the remaining parameters in order
-            for param in params:
-                if param in c.Parameters:
-                    if param == 'F' and (currLocation[param] != c.Parameters[param] or OUTPUT_DOUBLES):
-                        if c.Name not in ["G0", "G00"]:  # fanuc doesn't use rapid speeds
-                            speed = Units.Quantity(c.Parameters['F'], FreeCAD.Units.Velocity)
-                            if speed.getValueAs(UNIT_SPEED_FORMAT) > 0.0:
-                                outstring.append(param + format(float(speed.getValueAs(UNIT_SPEED_FORMAT)), precision_string))
-                            else:
-                                continue
-                    elif param == 'T':
-                        outstring.append(param + str(int(c.Parameters['T'])))
-                    elif param == 'H':
-                        outstring.append(param + str(int(c.Parameters['H'])))
-                    elif param == 'D':
-                        outstring.append(param + str(int(c.Parameters['D'])))
-                    elif param == 'S':
-                        outstring.append(param + str(int(c.Parameters['S'])))
-                    else:
-                        if (not OUTPUT_DOUBLES) and (param in currLocation) and (currLocation[param] == c.Parameters[param]):
-                            continue
-                        else:
-                            pos = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-                            outstring.append(
-                                param + format(float(pos.getValueAs(UNIT_FORMAT)), precision_string))
-
-            if adaptiveOp and c.Name in ["G0", "G00"]:
-                if opHorizRapid and opVertRapid:
-                    if 'Z' not in c.Parameters:
-                        outstring.append('F' + format(float(opHorizRapid.getValueAs(UNIT_SPEED_FORMAT)), precision_string))
-                    else:
-                        outstring.append('F' + format(float(opVertRapid.getValueAs(UNIT_SPEED_FORMAT)), precision_string))
-
-            # store the latest command
-            lastcommand = command
-            currLocation.update(c.Parameters)
-
-            # Check for Tool Change:
-            if command == 'M6':
-                # stop the spindle
-                out += linenumber() + "M5\n"
-                for line in TOOL_CHANGE.splitlines(True):
-                    out += linenumber() + line
-
-                # add height offset
-                if USE_TLO:
-                    tool_height = '\nG43 H' + str(int(c.Parameters['T']))
-                    outstring.append(tool_height)
-
-            if command == "message":
-                if OUTPUT_COMMENTS is False:
-                    out = []
                 else:
-                    outstring.pop(0)  # remove the command
+                    paramstring += " " + param + format(params[param] / self.lengthScale, self.valueFormat)
+        # in this mode, F is the distance per revolution of the thread (pitch)
+        # P is the dwell time in seconds at the bottom of the thread
+        # Q is the peck depth of the threading operation
+        for param in [ "F", "P", "Q" ]:
+            if param in params:
+                paramstring += " " + param + format(params[param] / self.lengthScale, self.valueFormat)
+
+        self.writeLine("G84" + paramstring + "\n")
+        self.writeLine("G80\n")
+        self.writeLine("G94\n")
+
+    def endCommand(self, command, name, params, words):
+        if self.rapidAsFeed(name):
+            if 'Z' not in params:
+                words.append('F' + format(float(self.opHorizRapid.getValueAs(UNIT_SPEED_FORMAT)), self.valueFormat))
+            else:
+                words.append('F' + format(float(self.opVertRapid.getValueAs(UNIT_SPEED_FORMAT)), self.valueFormat))
+
+    def writeWords(self, words):
+        PostEmitter.GCodeEmitter.writeWords(self, [w.upper() for w in words])
+
+
+def gcodeEmitter():
+    '''gcodeEmitter() ... returns the G-code emitter for the current settings.'''
+    return FanucEmitter(
+        precision=PRECISION,
+        lengthUnit=UNIT_FORMAT,
+        speedUnit=UNIT_SPEED_FORMAT,
+        modal=MODAL,
+        outputDoubles=OUTPUT_DOUBLES,
+        outputComments=OUTPUT_COMMENTS,
+        outputLineNumbers=OUTPUT_LINE_NUMBERS,
+        lineNumber=LINENR,
+        commandSpace=COMMAND_SPACE,
+        stripLines=True,
+        commandHooks={'M6': PostEmitter.toolChangeHook(TOOL_CHANGE, USE_TLO)})
+
+
+def writeGCode(pathobj, stream):
+    '''writeGCode(pathobj, stream) ... writes the G-code of pathobj to stream.'''
+    # pylint: disable=global-statement
+    global LINENR
 
-            # prepend a line number and append a newline
-            if len(outstring) >= 1:
-                if OUTPUT_LINE_NUMBERS:
-                    outstring.insert(0, (linenumber()))
+    emitter = gcodeEmitter()
+    emitter.emit(pathobj, stream)
+    LINENR = emitter.lineNumber
 
-                # append the line to the final output
-                for w in outstring:
-                    out += w.upper() + COMMAND_SPACE
-                out = out.strip() + "\n"
 
-        return out
+def parse(pathobj):
+    out = io.StringIO()
+    writeGCode(pathobj, out)
+    return out.getvalue()
 
 # print(__name__ + " gcode postprocessor loaded.")
@@ -33,7 +33,12 @@ preserved. It is up to the user to create and assign appropriate tool
 controllers.
 
 Only gcodes that are supported by Path are imported. Thus things like G43
-are suppressed.
+are suppressed. The modal state of the program is tracked, all coordinates
+are imported as absolute values in mm, arcs given by a radius are converted
+to arcs with center offsets and canned cycles are imported hole by hole.
+
+Use statistics(filename) to get the extents, the rapid and cut lengths and
+the estimated run time of a program without importing it.
 
 Importing gcode is inherently dangerous because context cannot be safely
 assumed. The user should carefully examine the resulting gcode!
@@ -46,7 +51,7 @@ import os
 import FreeCAD
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathLog as PathLog
-import re
+import PathScripts.PathGCodeReader as PathGCodeReader
 import PathScripts.PathCustom as PathCustom
 import PathScripts.PathCustomGui as PathCustomGui
 import PathScripts.PathOpGui as PathOpGui
@@ -82,104 +87,68 @@ def matchToolController(op, toolnumber):
     return toolcontrollers[0]
 
 
+# the commands of the program which are imported
+IMPORTED = PathGCodeReader.CmdMotion + ['G80', 'G17', 'G18', 'G19', 'G98', 'G99']
+
+
 def insert(filename, docname):
     "called when freecad imports a file"
     PathLog.track(filename)
-    gfile = pythonopen(filename)
-    gcode = gfile.read()
-    gfile.close()
-
-    # Regular expression to match tool changes in the format 'M6 Tn'
-    p = re.compile('[mM]+?\s?0?6\s?T\d*\s')
 
-    # split the gcode on tool changes
-    paths = re.split('([mM]+?\s?0?6\s?T\d*\s)', gcode)
-
-    # iterate the gcode sections and add customs for each
+    # the file is read line by line and split into sections at the tool changes
+    reader = PathGCodeReader.GCodeReader()
     toolnumber = 0
+    gcode = []
+    for (name, params) in reader.readFile(filename):
+        if name == 'M6':
+            addCustom(gcode, toolnumber)
+            toolnumber = params['T']
+            # the arc plane stays active after the tool change
+            gcode = [] if reader.plane == 'G17' else [reader.plane]
+        elif name in IMPORTED:
+            gcode.append(PathGCodeReader.commandString(name, params))
+    addCustom(gcode, toolnumber)
 
-    for path in paths:
-
-        # if the section is a tool change, extract the tool number
-        m = p.match(path)
-        if m:
-            toolnumber = int(m.group().split('T')[-1])
-            continue
-
-        # Parse the gcode and throw away any empty lists
-        gcode = parse(path)
-        if len(gcode) == 0:
-            continue
+    FreeCAD.ActiveDocument.recompute()
 
-        # Create a custom and viewobject
-        obj = PathCustom.Create("Custom")
-        res = PathOpGui.CommandResources('Custom', PathCustom.Create,
-                PathCustomGui.TaskPanelOpPage,
-                'Path_Custom',
-                QtCore.QT_TRANSLATE_NOOP('Path_Custom', 'Custom'), '', '')
-        obj.ViewObject.Proxy = PathOpGui.ViewProvider(obj.ViewObject, res)
-        obj.ViewObject.Proxy.setDeleteObjectsOnReject(False)
 
-        # Set the gcode and try to match a tool controller
-        obj.Gcode = gcode
-        obj.ToolController = matchToolController(obj, toolnumber)
+def addCustom(gcode, toolnumber):
+    "adds a custom operation with the commands gcode, if there are any moves"
+    if not any(cmd.split(' ', 1)[0] in PathGCodeReader.CmdMotion for cmd in gcode):
+        return
 
-    FreeCAD.ActiveDocument.recompute()
+    # Create a custom and viewobject
+    obj = PathCustom.Create("Custom")
+    res = PathOpGui.CommandResources('Custom', PathCustom.Create,
+            PathCustomGui.TaskPanelOpPage,
+            'Path_Custom',
+            QtCore.QT_TRANSLATE_NOOP('Path_Custom', 'Custom'), '', '')
+    obj.ViewObject.Proxy = PathOpGui.ViewProvider(obj.ViewObject, res)
+    obj.ViewObject.Proxy.setDeleteObjectsOnReject(False)
 
+    # Set the gcode and try to match a tool controller
+    obj.Gcode = gcode
+    obj.ToolController = matchToolController(obj, toolnumber)
 
 
 def parse(inputstring):
     "parse(inputstring): returns a parsed output string"
-
-    supported = ['G0', 'G00',
-                 'G1', 'G01',
-                 'G2', 'G02',
-                 'G3', 'G03',
-                 'G81', 'G82', 'G83',
-                 'G90', 'G91']
-
-    axis = ["X", "Y", "Z", "A", "B", "C", "U", "V", "W"]
-
     print("preprocessing...")
     PathLog.track(inputstring)
-    # split the input by line
-    lines = inputstring.splitlines()
-    output = []
-    lastcommand = None
-
-    for lin in lines:
-        # remove any leftover trailing and preceding spaces
-        lin = lin.strip()
-
-        # discard empty lines
-        if not lin:
-            continue
-
-        # remove line numbers
-        if lin[0].upper() in ["N"]:
-            lin = lin.split(" ", 1)
-            if len(lin) >= 1:
-                lin = lin[1].strip()
-            else:
-                continue
-
-        # Anything else not a G/M code or an axis move is ignored.
-        if lin[0] not in ["G", "M", "X", "Y", "Z", "A", "B", "C", "U", "V", "W"]:
-            continue
-
-        # if the remaining line is supported, store it
-        currcommand = lin.split()[0]
-
-        if currcommand in supported:
-            output.append(lin)
-            lastcommand = currcommand
-
-        # modal commands have no G or M but have axis moves. append those too.
-        elif currcommand[0] in axis and lastcommand:
-            output.append(lastcommand + " " + lin)
-
+    reader = PathGCodeReader.GCodeReader()
+    output = [PathGCodeReader.commandString(name, params)
+              for (name, params) in reader.read(inputstring.splitlines()) if name in IMPORTED]
     print("done preprocessing.")
     return output
 
 
+def statistics(filename, rapidFeed=5000.):
+    """statistics(filename, rapidFeed=5000.) ... returns extents, rapid and cut lengths and
+    the estimated time in seconds of a G-code file without importing it.
+    The file is read line by line, so this works for programs of any size."""
+    PathLog.track(filename)
+    with pythonopen(filename) as fp:
+        return PathGCodeReader.statistics(fp, rapidFeed)
+
+
 print(__name__ + " gcode preprocessor loaded.")
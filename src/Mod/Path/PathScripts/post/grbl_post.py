@@ -27,8 +27,10 @@
 import FreeCAD
 from FreeCAD import Units
 import PathScripts.PostUtils as PostUtils
+import PathScripts.PostEmitter as PostEmitter
 import argparse
 import datetime
+import io
 import shlex
 import PathScripts.PathUtil as PathUtil
 
@@ -109,6 +111,7 @@ TOOLTIP_ARGS = parser.format_help()
 # ***************************************************************************
 MOTION_COMMANDS = ['G0', 'G00', 'G1', 'G01', 'G2', 'G02', 'G3', 'G03']  # Motion gCode commands definition
 RAPID_MOVES = ['G0', 'G00']                                             # Rapid moves gCode commands definition
+PARAMETER_ORDER = ['X', 'Y', 'Z', 'A', 'B', 'C', 'U', 'V', 'W', 'I', 'J', 'K', 'F', 'S', 'T', 'Q', 'R', 'L', 'P']
 SUPPRESS_COMMANDS = []                                      # These commands are ignored by commenting them out
 COMMAND_SPACE = " "
 # Global variables storing current position
@@ -205,20 +208,55 @@ def export(objectslist, filename, argstring):
   if not processArguments(argstring):
     return None
 
+  for obj in objectslist:
+    if not hasattr(obj, "Path"):
+      print("The object " + obj.Name + " is not a path. Please select only path and Compounds.")
+      return
+
+  print("Post Processor: " + __name__ + " postprocessing...")
+
+  if not (FreeCAD.GuiUp and SHOW_EDITOR):
+    # the program is written straight into the file
+    with pythonopen(filename, "w") as gfile:
+      writeProgram(objectslist, gfile)
+    print("Done postprocessing.")
+    return
+
+  gcode = io.StringIO()
+  writeProgram(objectslist, gcode)
+  gcode = gcode.getvalue()
+
+  # show the gCode result dialog
+  dia = PostUtils.GCodeEditorDialog()
+  dia.editor.setText(gcode)
+  result = dia.exec_()
+  if result:
+    final = dia.editor.toPlainText()
+  else:
+    final = gcode
+
+  print("Done postprocessing.")
+
+  # write the file
+  gfile = pythonopen(filename, "w")
+  gfile.write(final)
+  gfile.close()
+
+
+def writeProgram(objectslist, gcode):
+  '''writeProgram(objectslist, gcode) ... writes the whole program to the stream gcode.'''
+
   global UNITS
   global UNIT_FORMAT
   global UNIT_SPEED_FORMAT
   global MOTION_MODE
   global SUPPRESS_COMMANDS
 
-  print("Post Processor: " + __name__ + " postprocessing...")
-  gcode = ""
-
   # write header
   if OUTPUT_HEADER:
-    gcode += linenumber() + "(Exported by FreeCAD)\n"
-    gcode += linenumber() + "(Post Processor: " + __name__ + ")\n"
-    gcode += linenumber() + "(Output Time:" + str(datetime.datetime.now()) + ")\n"
+    gcode.write(linenumber() + "(Exported by FreeCAD)\n")
+    gcode.write(linenumber() + "(Post Processor: " + __name__ + ")\n")
+    gcode.write(linenumber() + "(Output Time:" + str(datetime.datetime.now()) + ")\n")
 
   # Check canned cycles for drilling
   if TRANSLATE_DRILL_CYCLES:
@@ -229,16 +267,16 @@ def export(objectslist, filename, argstring):
 
   # Write the preamble
   if OUTPUT_COMMENTS:
-    gcode += linenumber() + "(Begin preamble)\n"
+    gcode.write(linenumber() + "(Begin preamble)\n")
   for line in PREAMBLE.splitlines(True):
-    gcode += linenumber() + line
+    gcode.write(linenumber() + line)
   # verify if PREAMBLE have changed MOTION_MODE or UNITS
   if 'G90' in PREAMBLE:
     MOTION_MODE = 'G90'
   elif 'G91' in PREAMBLE:
     MOTION_MODE = 'G91'
   else:
-    gcode += linenumber() + MOTION_MODE + "\n"
+    gcode.write(linenumber() + MOTION_MODE + "\n")
   if 'G21' in PREAMBLE:
     UNITS = 'G21'
     UNIT_FORMAT = 'mm'
@@ -248,16 +286,13 @@ def export(objectslist, filename, argstring):
     UNIT_FORMAT = 'in'
     UNIT_SPEED_FORMAT = 'in/min'
   else:
-    gcode += linenumber() + UNITS + "\n"
+    gcode.write(linenumber() + UNITS + "\n")
 
   for obj in objectslist:
     # Debug...
     # print("\n" + "*"*70)
     # dump(obj)
     # print("*"*70 + "\n")
-    if not hasattr(obj, "Path"):
-      print("The object " + obj.Name + " is not a path. Please select only path and Compounds.")
-      return
 
     # Skip inactive operations
     if PathUtil.opProperty(obj, 'Active') is False:
@@ -265,13 +300,13 @@ def export(objectslist, filename, argstring):
 
     # do the pre_op
     if OUTPUT_BCNC:
-      gcode += linenumber() + "(Block-name: " + obj.Label + ")\n"
-      gcode += linenumber() + "(Block-expand: 0)\n"
-      gcode += linenumber() + "(Block-enable: 1)\n"
+      gcode.write(linenumber() + "(Block-name: " + obj.Label + ")\n")
+      gcode.write(linenumber() + "(Block-expand: 0)\n")
+      gcode.write(linenumber() + "(Block-enable: 1)\n")
     if OUTPUT_COMMENTS:
-      gcode += linenumber() + "(Begin operation: " + obj.Label + ")\n"
+      gcode.write(linenumber() + "(Begin operation: " + obj.Label + ")\n")
     for line in PRE_OPERATION.splitlines(True):
-      gcode += linenumber() + line
+      gcode.write(linenumber() + line)
 
     # get coolant mode
     coolantMode = 'None'
@@ -284,58 +319,39 @@ def export(objectslist, filename, argstring):
     # turn coolant on if required
     if OUTPUT_COMMENTS:
         if not coolantMode == 'None':
-            gcode += linenumber() + '(Coolant On:' + coolantMode + ')\n'
+            gcode.write(linenumber() + '(Coolant On:' + coolantMode + ')\n')
     if coolantMode == 'Flood':
-        gcode  += linenumber() + 'M8' + '\n'
+        gcode.write(linenumber() + 'M8' + '\n')
     if coolantMode == 'Mist':
-        gcode += linenumber() + 'M7' + '\n'
+        gcode.write(linenumber() + 'M7' + '\n')
 
     # Parse the op
-    gcode += parse(obj)
+    writeGCode(obj, gcode)
 
     # do the post_op
     if OUTPUT_COMMENTS:
-      gcode += linenumber() + "(Finish operation: " + obj.Label + ")\n"
+      gcode.write(linenumber() + "(Finish operation: " + obj.Label + ")\n")
     for line in POST_OPERATION.splitlines(True):
-      gcode += linenumber() + line
+      gcode.write(linenumber() + line)
 
     # turn coolant off if required
     if not coolantMode == 'None':
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + '(Coolant Off:' + coolantMode + ')\n'
-        gcode += linenumber() +'M9' + '\n'
+            gcode.write(linenumber() + '(Coolant Off:' + coolantMode + ')\n')
+        gcode.write(linenumber() +'M9' + '\n')
 
   # do the post_amble
   if OUTPUT_BCNC:
-    gcode += linenumber() + "(Block-name: post_amble)\n"
-    gcode += linenumber() + "(Block-expand: 0)\n"
-    gcode += linenumber() + "(Block-enable: 1)\n"
+    gcode.write(linenumber() + "(Block-name: post_amble)\n")
+    gcode.write(linenumber() + "(Block-expand: 0)\n")
+    gcode.write(linenumber() + "(Block-enable: 1)\n")
   if OUTPUT_COMMENTS:
-    gcode += linenumber() + "(Begin postamble)\n"
+    gcode.write(linenumber() + "(Begin postamble)\n")
   for line in POSTAMBLE.splitlines(True):
-    gcode += linenumber() + line
+    gcode.write(linenumber() + line)
 
   if RETURN_TO:
-    gcode += linenumber() + "G0 X%s Y%s" % tuple(RETURN_TO)
-
-  # show the gCode result dialog
-  if FreeCAD.GuiUp and SHOW_EDITOR:
-    dia = PostUtils.GCodeEditorDialog()
-    dia.editor.setText(gcode)
-    result = dia.exec_()
-    if result:
-      final = dia.editor.toPlainText()
-    else:
-      final = gcode
-  else:
-    final = gcode
-
-  print("Done postprocessing.")
-
-  # write the file
-  gfile = pythonopen(filename, "w")
-  gfile.write(final)
-  gfile.close()
+    gcode.write(linenumber() + "G0 X%s Y%s" % tuple(RETURN_TO))
 
 
 def linenumber():
@@ -358,121 +374,107 @@ def format_outstring(strTable):
   return s
 
 
-def parse(pathobj):
+class GrblEmitter(PostEmitter.GCodeEmitter):
+  '''GrblEmitter(**settings) ... G-code emitter with the path comments, the drill cycle translation,
+  the spindle wait and the tool change handling of grbl.'''
 
-  global DRILL_RETRACT_MODE
-  global MOTION_MODE
-  global CURRENT_X
-  global CURRENT_Y
-  global CURRENT_Z
-
-  out = ""
-  lastcommand = None
-  precision_string = '.' + str(PRECISION) + 'f'
+  def emitPath(self, pathobj):
+    if hasattr(pathobj, "Group") and OUTPUT_COMMENTS:  # We have a compound or project.
+      self.writeLine("(Compound: " + pathobj.Label + ")\n")
+    PostEmitter.GCodeEmitter.emitPath(self, pathobj)
 
-  params = ['X', 'Y', 'Z', 'A', 'B', 'C', 'U', 'V', 'W', 'I', 'J', 'K', 'F', 'S', 'T', 'Q', 'R', 'L', 'P']
-
-  if hasattr(pathobj, "Group"):  # We have a compound or project.
+  def startPath(self, pathobj):
+    PostEmitter.GCodeEmitter.startPath(self, pathobj)
     if OUTPUT_COMMENTS:
-      out += linenumber() + "(Compound: " + pathobj.Label + ")\n"
-    for p in pathobj.Group:
-      out += parse(p)
-    return out
-
-  else:  # parsing simple path
-    if not hasattr(pathobj, "Path"):  # groups might contain non-path things like stock.
-      return out
-
-    if OUTPUT_COMMENTS:
-      out += linenumber() + "(Path: " + pathobj.Label + ")\n"
-
-    for c in pathobj.Path.Commands:
-      outstring = []
-      command = c.Name
-
-      outstring.append(command)
-
-      # if modal: only print the command if it is not the same as the last one
-      if MODAL:
-        if command == lastcommand:
-          outstring.pop(0)
-
-      # Now add the remaining parameters in order
-      for param in params:
-        if param in c.Parameters:
-          if param == 'F':
-            if command not in RAPID_MOVES:
-              speed = Units.Quantity(c.Parameters['F'], FreeCAD.Units.Velocity)
-              if speed.getValueAs(UNIT_SPEED_FORMAT) > 0.0:
-                outstring.append(param + format(float(speed.getValueAs(UNIT_SPEED_FORMAT)), precision_string))
-          elif param in ['T', 'H', 'D', 'S', 'P', 'L']:
-            outstring.append(param + str(c.Parameters[param]))
-          elif param in ['A', 'B', 'C']:
-            outstring.append(param + format(c.Parameters[param], precision_string))
-          else:  # [X, Y, Z, U, V, W, I, J, K, R, Q] (Conversion eventuelle mm/inches)
-            pos = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-            outstring.append(param + format(float(pos.getValueAs(UNIT_FORMAT)), precision_string))
-
-      # store the latest command
-      lastcommand = command
-
-      # Memorizes the current position for calculating the related movements and the withdrawal plan
-      if command in MOTION_COMMANDS:
-        if 'X' in c.Parameters:
-          CURRENT_X = Units.Quantity(c.Parameters['X'], FreeCAD.Units.Length)
-        if 'Y' in c.Parameters:
-          CURRENT_Y = Units.Quantity(c.Parameters['Y'], FreeCAD.Units.Length)
-        if 'Z' in c.Parameters:
-          CURRENT_Z = Units.Quantity(c.Parameters['Z'], FreeCAD.Units.Length)
-
-      if command in ('G98', 'G99'):
-        DRILL_RETRACT_MODE = command
-
-      if command in ('G90', 'G91'):
-        MOTION_MODE = command
-
-
-      if TRANSLATE_DRILL_CYCLES:
-        if command in ('G81', 'G82', 'G83'):
-          out += drill_translate(outstring, command, c.Parameters)
-          # Erase the line we just translated
-          outstring = []
-
-      if SPINDLE_WAIT > 0:
-        if command in ('M3', 'M03', 'M4', 'M04'):
-          out += linenumber() + format_outstring(outstring) + "\n"
-          out += linenumber() + format_outstring(['G4', 'P%s' % SPINDLE_WAIT]) + "\n"
-          outstring = []
-
-      # Check for Tool Change:
-      if command in ('M6', 'M06'):
-        if OUTPUT_COMMENTS:
-          out += linenumber() + "(Begin toolchange)\n"
-        if not OUTPUT_TOOL_CHANGE:
-          outstring.insert(0, "(" )
-          outstring.append( ")" )
-        else:
-          for line in TOOL_CHANGE.splitlines(True):
-            out += linenumber() + line
-
-      if command == "message":
-        if OUTPUT_COMMENTS is False:
-          out = []
-        else:
-          outstring.pop(0)  # remove the command
+      self.writeLine("(Path: " + pathobj.Label + ")\n")
+
+  def endCommand(self, command, name, params, words):
+    global DRILL_RETRACT_MODE
+    global MOTION_MODE
+    global CURRENT_X
+    global CURRENT_Y
+    global CURRENT_Z
+
+    # Memorizes the current position for calculating the related movements and the withdrawal plan
+    if command in MOTION_COMMANDS:
+      if 'X' in params:
+        CURRENT_X = Units.Quantity(params['X'], FreeCAD.Units.Length)
+      if 'Y' in params:
+        CURRENT_Y = Units.Quantity(params['Y'], FreeCAD.Units.Length)
+      if 'Z' in params:
+        CURRENT_Z = Units.Quantity(params['Z'], FreeCAD.Units.Length)
+
+    if command in ('G98', 'G99'):
+      DRILL_RETRACT_MODE = command
+
+    if command in ('G90', 'G91'):
+      MOTION_MODE = command
+
+    if TRANSLATE_DRILL_CYCLES:
+      if command in ('G81', 'G82', 'G83'):
+        drill_translate(self, words, command, params)
+        # Erase the line we just translated
+        del words[:]
+
+    if SPINDLE_WAIT > 0:
+      if command in ('M3', 'M03', 'M4', 'M04'):
+        self.writeWords(words)
+        self.writeWords(['G4', 'P%s' % SPINDLE_WAIT])
+        del words[:]
+
+    # Check for Tool Change:
+    if command in ('M6', 'M06'):
+      if OUTPUT_COMMENTS:
+        self.writeLine("(Begin toolchange)\n")
+      if not OUTPUT_TOOL_CHANGE:
+        words.insert(0, "(" )
+        words.append( ")" )
+      else:
+        self.writeLines(TOOL_CHANGE)
+
+    if command in SUPPRESS_COMMANDS:
+      words.insert(0, "(" )
+      words.append( ")" )
+
+  def writeWords(self, words):
+    self.writeLine(format_outstring(words) + "\n")
+
+
+def gcodeEmitter():
+  '''gcodeEmitter() ... returns the G-code emitter for the current settings.'''
+  return GrblEmitter(
+      precision=PRECISION,
+      lengthUnit=UNIT_FORMAT,
+      speedUnit=UNIT_SPEED_FORMAT,
+      parameterOrder=PARAMETER_ORDER,
+      integerParameters=[],
+      rawParameters=['T', 'H', 'D', 'S', 'P', 'L'],
+      unscaledParameters=['A', 'B', 'C'],
+      modal=MODAL,
+      # comments of the paths are kept, OUTPUT_COMMENTS only suppresses the ones of the post processor
+      outputComments=True,
+      outputLineNumbers=OUTPUT_LINE_NUMBERS,
+      lineNumber=LINENR - LINEINCR,
+      lineNumberStep=LINEINCR,
+      commandSpace=COMMAND_SPACE)
+
+
+def writeGCode(pathobj, stream):
+  '''writeGCode(pathobj, stream) ... writes the G-code of pathobj to stream.'''
+  global LINENR
 
-      if command in SUPPRESS_COMMANDS:
-        outstring.insert(0, "(" )
-        outstring.append( ")" )
+  emitter = gcodeEmitter()
+  emitter.emit(pathobj, stream)
+  LINENR = emitter.lineNumber + LINEINCR
 
-      # prepend a line number and append a newline
-      if len(outstring) >= 1:
-          out += linenumber() + format_outstring(outstring) + "\n"
 
-  return out
+def parse(pathobj):
+  out = io.StringIO()
+  writeGCode(pathobj, out)
+  return out.getvalue()
 
 
-def drill_translate(outstring, cmd, params):
+def drill_translate(emitter, outstring, cmd, params):
   global DRILL_RETRACT_MODE
   global MOTION_MODE
   global CURRENT_X
@@ -484,12 +486,10 @@ def drill_translate(outstring, cmd, params):
 
   strFormat = '.' + str(PRECISION) + 'f'
 
-  trBuff = ""
-
   if OUTPUT_COMMENTS:  # Comment the original command
     outstring[0] = "(" + outstring[0]
     outstring[-1] = outstring[-1] + ")"
-    trBuff += linenumber() + format_outstring(outstring) + "\n"
+    emitter.writeWords(outstring)
 
   # cycle conversion
   # currently only cycles in XY are provided (G17)
@@ -500,8 +500,8 @@ def drill_translate(outstring, cmd, params):
   RETRACT_Z = Units.Quantity(params['R'], FreeCAD.Units.Length)
   # R less than Z is error
   if RETRACT_Z < drill_Z :
-    trBuff += linenumber() + "(drill cycle error: R less than Z )\n"
-    return trBuff
+    emitter.writeLine("(drill cycle error: R less than Z )\n")
+    return
 
   if MOTION_MODE == 'G91':   # G91 relative movements
     drill_X += CURRENT_X
@@ -523,7 +523,7 @@ def drill_translate(outstring, cmd, params):
   # wrap this block to ensure machine MOTION_MODE is restored in case of error
   try:
     if MOTION_MODE == 'G91':
-      trBuff += linenumber() + "G90\n"  # force absolute coordinates during cycles
+      emitter.writeLine("G90\n")  # force absolute coordinates during cycles
 
     strG0_RETRACT_Z = 'G0 Z' + format(float(RETRACT_Z.getValueAs(UNIT_FORMAT)), strFormat) + "\n"
     strF_Feedrate = ' F' + format(float(drill_feedrate.getValueAs(UNIT_SPEED_FORMAT)), '.2f') + "\n"
@@ -531,43 +531,41 @@ def drill_translate(outstring, cmd, params):
 
     # preliminary mouvement(s)
     if CURRENT_Z < RETRACT_Z:
-      trBuff += linenumber() + strG0_RETRACT_Z
-    trBuff += linenumber() + 'G0 X' + format(float(drill_X.getValueAs(UNIT_FORMAT)), strFormat) + ' Y' + format(float(drill_Y.getValueAs(UNIT_FORMAT)), strFormat) + "\n"
+      emitter.writeLine(strG0_RETRACT_Z)
+    emitter.writeLine('G0 X' + format(float(drill_X.getValueAs(UNIT_FORMAT)), strFormat) + ' Y' + format(float(drill_Y.getValueAs(UNIT_FORMAT)), strFormat) + "\n")
     if CURRENT_Z > RETRACT_Z:
       # NIST GCODE 3.5.16.1 Preliminary and In-Between Motion says G0 to RETRACT_Z. Here use G1 since retract height may be below surface !
-      trBuff += linenumber() + 'G1 Z' + format(float(RETRACT_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate
+      emitter.writeLine('G1 Z' + format(float(RETRACT_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate)
     last_Stop_Z = RETRACT_Z
 
     # drill moves
     if cmd in ('G81', 'G82'):
-      trBuff += linenumber() + 'G1 Z' + format(float(drill_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate
+      emitter.writeLine('G1 Z' + format(float(drill_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate)
       # pause where applicable
       if cmd == 'G82':
-        trBuff += linenumber() + 'G4 P' + str(drill_DwellTime) + "\n"
-      trBuff += linenumber() + strG0_RETRACT_Z
+        emitter.writeLine('G4 P' + str(drill_DwellTime) + "\n")
+      emitter.writeLine(strG0_RETRACT_Z)
     else:  # 'G83'
       if params['Q'] != 0 :
         while 1:
           if last_Stop_Z != RETRACT_Z :
             clearance_depth = last_Stop_Z + a_bit  # rapid move to just short of last drilling depth
-            trBuff += linenumber() + 'G0 Z' + format(float(clearance_depth.getValueAs(UNIT_FORMAT)) , strFormat) + "\n"
+            emitter.writeLine('G0 Z' + format(float(clearance_depth.getValueAs(UNIT_FORMAT)) , strFormat) + "\n")
           next_Stop_Z = last_Stop_Z - drill_Step
           if next_Stop_Z > drill_Z:
-            trBuff += linenumber() + 'G1 Z' + format(float(next_Stop_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate
-            trBuff += linenumber() + strG0_RETRACT_Z
+            emitter.writeLine('G1 Z' + format(float(next_Stop_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate)
+            emitter.writeLine(strG0_RETRACT_Z)
             last_Stop_Z = next_Stop_Z
           else:
-            trBuff += linenumber() + 'G1 Z' + format(float(drill_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate
-            trBuff += linenumber() + strG0_RETRACT_Z
+            emitter.writeLine('G1 Z' + format(float(drill_Z.getValueAs(UNIT_FORMAT)), strFormat) + strF_Feedrate)
+            emitter.writeLine(strG0_RETRACT_Z)
             break
 
   except Exception as e:
     pass
 
   if MOTION_MODE == 'G91':
-    trBuff += linenumber() + 'G91'  # Restore if changed
-
-  return trBuff
+    emitter.writeLine('G91\n')  # Restore if changed
 
 
 # print(__name__ + ": GCode postprocessor loaded.")
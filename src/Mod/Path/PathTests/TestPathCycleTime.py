@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Path
+import PathScripts.PathCycleTime as PathCycleTime
+import PathTests.PathTestUtils as PathTestUtils
+import math
+
+Rates = (100., 100., 50.)
+
+
+class TestPathCycleTime(PathTestUtils.PathTestBase):
+    '''Unit tests for the cycle time estimation of PathCycleTime.'''
+
+    def estimate(self, gcode, profile=None, hFeed=10., vFeed=5.):
+        if profile is None:
+            profile = PathCycleTime.MachineProfile()
+        commands = [Path.Command(line) for line in gcode.splitlines()]
+        return PathCycleTime.estimateCommands(commands, profile, hFeed, vFeed, Rates)
+
+    def test00(self):
+        '''Verify moves at constant speed.'''
+        (t, end) = self.estimate("G0 Z10\nG0 X10\nG1 Z0 F5\nG1 X20 F10\nG1 Y10")
+        self.assertRoughly(t.rapidTime, 10 / 50. + 10 / 100.)
+        self.assertRoughly(t.feedTime, 2 + 1 + 1)
+        self.assertRoughly(t.rapidLength, 20)
+        self.assertRoughly(t.feedLength, 30)
+        self.assertEqual(end, (20, 10, 0))
+
+    def test01(self):
+        '''Verify rapid moves are limited by each axis and feed moves without F use the tool controller's feeds.'''
+        (t, _) = self.estimate("G0 X30 Y40\nG1 X0 Y0\nG1 Z-5")
+        # Y is the limiting axis of the diagonal rapid
+        self.assertRoughly(t.rapidTime, 40 / 100.)
+        self.assertRoughly(t.feedTime, 50 / 10. + 5 / 5.)
+
+    def test02(self):
+        '''Verify arcs, full circles and helices have their full length.'''
+        (t, _) = self.estimate("G0 X10\nG2 X0 Y10 I-10 J0 F10")
+        self.assertRoughly(t.feedLength, 1.5 * math.pi * 10)
+        (t, _) = self.estimate("G0 X10\nG3 X10 Y0 I-10 J0 F10")
+        self.assertRoughly(t.feedLength, 2 * math.pi * 10)
+        (t, _) = self.estimate("G0 X10\nG3 X10 Y0 Z-3 I-10 J0 F10")
+        self.assertRoughly(t.feedLength, math.hypot(2 * math.pi * 10, 3))
+
+    def test03(self):
+        '''Verify dwells, tool changes and canned cycles.'''
+        profile = PathCycleTime.MachineProfile(toolChangeTime=7.)
+        (t, _) = self.estimate("M6 T1\nG4 P2", profile)
+        self.assertRoughly(t.dwellTime, 9)
+        self.assertEqual(t.toolChanges, 1)
+
+        (t, end) = self.estimate("G0 Z5\nG98\nG81 X10 Y0 Z-2 R1 F10\nG82 X20 Z-2 R1 P0.5\nG80")
+        # rapid to the hole, down to R, back up to the initial level after each hole
+        self.assertRoughly(t.rapidLength, 5 + 10 + 4 + 7 + 10 + 4 + 7)
+        self.assertRoughly(t.feedLength, 3 + 3)
+        self.assertRoughly(t.dwellTime, 0.5)
+        self.assertEqual(end, (20, 0, 5))
+
+        (t, end) = self.estimate("G0 Z5\nG99\nG83 X10 Z-2 R1 Q1 F10\nG80")
+        self.assertRoughly(t.feedLength, 3)
+        self.assertEqual(end, (10, 0, 1))
+
+    def test10(self):
+        '''Verify acceleration limits.'''
+        profile = PathCycleTime.MachineProfile(accelerations=(1., 1., 1.))
+        # accelerate to 10mm/s in 10s and decelerate again, that's 100mm in 20s
+        (t, _) = self.estimate("G1 X100 F10", profile)
+        self.assertRoughly(t.time, 20)
+        # the move is too short to reach the feed rate
+        (t, _) = self.estimate("G1 X1 F10", profile)
+        self.assertRoughly(t.time, 2)
+        # collinear moves don't slow down
+        (t, _) = self.estimate("\n".join("G1 X%d F10" % (i + 1) for i in range(100)), profile)
+        self.assertRoughly(t.time, 20)
+        # but they stop in corners and at dwells
+        (t, _) = self.estimate("G1 X100 F10\nG1 Y100\nG4 P0\nG1 Y200", profile)
+        self.assertTrue(t.time > 59)
+
+    def test11(self):
+        '''Verify the jerk limit makes moves slower.'''
+        gcode = "G1 X100 F10\nG1 Y100\nG1 X0"
+        (t0, _) = self.estimate(gcode, PathCycleTime.MachineProfile(accelerations=(1., 1., 1.)))
+        (t1, _) = self.estimate(gcode, PathCycleTime.MachineProfile(accelerations=(1., 1., 1.), jerk=1.))
+        self.assertTrue(t1.time > t0.time)
+
+    def test20(self):
+        '''Verify operations of tool controllers without feed rates are not estimated.'''
+        class Obj(object):
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+
+        def toolController(label, number, feed):
+            rate = FreeCAD.Units.Quantity(feed, FreeCAD.Units.Velocity)
+            return Obj(Label=label, ToolNumber=number, HorizFeed=rate, VertFeed=rate, HorizRapid=rate, VertRapid=rate)
+
+        path = Path.Path([Path.Command('G1', {'X': 10.})])
+        ops = [Obj(Name='Op1', Label='Op1', ToolController=toolController('TC1', 1, 10.), Path=path),
+               Obj(Name='Op2', Label='Op2', ToolController=toolController('TC2', 2, 0.), Path=path)]
+        job = Obj(Label='Job', Operations=Obj(Group=ops))
+        for profile in [None, PathCycleTime.MachineProfile(accelerations=(1., 1., 1.))]:
+            result = PathCycleTime.estimateJob(job, profile)
+            self.assertEqual(result['skipped'], ['Op2'])
+            self.assertEqual([op['name'] for op in result['operations']], ['Op1'])
+            self.assertEqual(list(result['tools']), [1])
+            self.assertEqual(len(result['toolChanges']), 1)
+            self.assertRoughly(result['time'], result['tools'][1])
+        self.assertRoughly(PathCycleTime.estimateJob(job)['time'], 1)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathGCodeReader as PathGCodeReader
+import PathTests.PathTestUtils as PathTestUtils
+
+
+class TestPathGCodeReader(PathTestUtils.PathTestBase):
+    '''Unit tests for the streaming G-code reader of the importer.'''
+
+    def read(self, program):
+        reader = PathGCodeReader.GCodeReader()
+        return [PathGCodeReader.commandString(name, params) for (name, params) in reader.read(program.splitlines())]
+
+    def test00(self):
+        '''Verify tokenizing of line numbers, comments and lower case words.'''
+        (words, comments) = PathGCodeReader.tokenize("N10 g01 x1.5 Y-.5 (cut) F100 ; end")
+        self.assertEqual(words, [('G', 1.0), ('X', 1.5), ('Y', -0.5), ('F', 100.0)])
+        self.assertEqual(comments, ['cut', 'end'])
+
+    def test01(self):
+        '''Verify modal moves, incremental distances and inches.'''
+        self.assertEqual(self.read("G0 X1 Y2\nX3\nG91 G1 X1 F100\nG20 Y1"),
+                         ["G0 X1 Y2", "G0 X3", "G1 X4 F100", "G1 Y27.4 F100"])
+
+    def test02(self):
+        '''Verify arcs given by radius and by absolute centers.'''
+        self.assertEqual(self.read("G0 X10 Y10\nG2 X20 Y0 R10\nG90.1 G3 X10 Y-10 I10 J0"),
+                         ["G0 X10 Y10", "G2 X20 Y0 I0 J-10", "G3 X10 Y-10 I-10 J0"])
+
+    def test03(self):
+        '''Verify canned cycles are returned hole by hole with absolute values.'''
+        self.assertEqual(self.read("G0 X0 Y0 Z5\nG99 G81 X1 Y1 Z-2 R1 F100\nX2\nG91 X1 L2\nG80"),
+                         ["G0 X0 Y0 Z5", "G99",
+                          "G81 X1 Y1 Z-2 R1 F100", "G81 X2 Y1 Z-2 R1 F100",
+                          "G81 X3 Y1 Z-2 R1 F100", "G81 X4 Y1 Z-2 R1 F100", "G80"])
+
+    def test04(self):
+        '''Verify tool changes and statistics.'''
+        program = "T3 M6\nG0 X0 Y0 Z0\nG1 X30 F600\nG0 X0\n"
+        reader = PathGCodeReader.GCodeReader()
+        self.assertEqual(list(reader.read(program.splitlines()))[0], ('M6', {'T': 3}))
+
+        stats = PathGCodeReader.statistics(program.splitlines(), rapidFeed=1200)
+        self.assertEqual(stats['lines'], 4)
+        self.assertEqual(stats['tools'], [3])
+        self.assertRoughly(stats['cutLength'], 30)
+        self.assertRoughly(stats['rapidLength'], 30)
+        self.assertRoughly(stats['time'], 3 + 1.5)
+        self.assertEqual(stats['boundMax']['X'], 30)
+
+    def test05(self):
+        '''Verify moves in machine coordinates and other non modal axis words are no moves.'''
+        self.assertEqual(self.read("G0 X1 Y2 Z5\nG53 G0 Z0.\nG28 X0 Y0\nG92 X0\nZ3"),
+                         ["G0 X1 Y2 Z5", "G0 Z3"])
+
+    def test06(self):
+        '''Verify the modal feed of a line without moves is used by the following moves.'''
+        program = "G21 G90\nG0 X0 Y0 Z5\nG1 F600\nG1 Z0\nX60\nG1 X120 F1200"
+        self.assertEqual(self.read(program),
+                         ["G0 X0 Y0 Z5", "G1 Z0 F600", "G1 X60 F600", "G1 X120 F1200"])
+
+        stats = PathGCodeReader.statistics(program.splitlines(), rapidFeed=1200)
+        self.assertRoughly(stats['cutLength'], 125)
+        self.assertRoughly(stats['time'], 0.5 + 6 + 3)
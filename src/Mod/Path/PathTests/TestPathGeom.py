@@ -341,6 +341,32 @@ class TestPathGeom(PathTestBase):
         self.assertEqual(len(wires[1].Edges), 1)
         self.assertLine(wires[1].Edges[0], Vector(0,1,0), Vector(0,0,0))
 
+    def test51(self):
+        '''Verify PathSegments matches the edges of wireForPath without creating them.'''
+        commands = []
+        commands.append(Path.Command('G0', {'Z': 5}))
+        commands.append(Path.Command('G1', {'X': 10, 'Z': 0}))
+        commands.append(Path.Command('G1', {'X': 10}))
+        commands.append(Path.Command('G2', {'X': 20, 'I': 5, 'J': 0}))
+        commands.append(Path.Command('G3', {'X': 20, 'Y': 10, 'Z': -2, 'I': 0, 'J': 5}))
+        path = Path.Path(commands)
+
+        segments = PathGeom.PathSegments(path)
+        self.assertEqual(len(segments), 4)
+        self.assertEqual(segments.edges, {})
+        self.assertTrue(segments.isRapid(0))
+        self.assertEqual(segments.zLimits(), (-2, 5))
+        self.assertEqual(list(segments.horizontalAt(0)), [2])
+
+        wire, rapid = PathGeom.wireForPath(path)
+        lengths = segments.lengths()
+        for i, edge in enumerate(wire.Edges):
+            self.assertRoughly(lengths[i], edge.Length, 0.001)
+            self.assertTrue(PathGeom.edgesMatch(edge, segments[i]))
+        self.assertEqual(len(segments.edges), 4)
+
+        self.assertCommandEqual(segments.commandsFor(2)[0], PathGeom.cmdsForEdge(wire.Edges[2])[0])
+
 
     def test60(self):
         '''Verify arcToHelix returns proper helix.'''
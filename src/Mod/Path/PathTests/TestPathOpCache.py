@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Part
+import PathScripts.PathHelix as PathHelix
+import PathScripts.PathJob as PathJob
+import PathScripts.PathOpCache as PathOpCache
+import PathTests.PathTestUtils as PathTestUtils
+
+
+class TestPathOpCache(PathTestUtils.PathTestBase):
+    '''Unit tests for the caching of the Path of operations.'''
+
+    def setUp(self):
+        self.doc = FreeCAD.open(FreeCAD.getHomePath() + 'Mod/Path/PathTests/test_holes00.fcstd')
+        self.job = PathJob.Create('Job', [self.doc.Body])
+
+    def tearDown(self):
+        FreeCAD.closeDocument(self.doc.Name)
+
+    def countExecutions(self, op):
+        self.executions = 0
+        opExecute = op.Proxy.opExecute
+
+        def counting(obj):
+            self.executions += 1
+            return opExecute(obj)
+        op.Proxy.opExecute = counting
+
+    def test00(self):
+        '''Verify shape fingerprints only depend on the geometry.'''
+        box = Part.makeBox(10, 20, 30)
+        self.assertEqual(PathOpCache.shapeKey(box), PathOpCache.shapeKey(Part.makeBox(10, 20, 30)))
+        self.assertNotEqual(PathOpCache.shapeKey(box), PathOpCache.shapeKey(Part.makeBox(10, 20, 31)))
+        moved = box.copy()
+        moved.translate(FreeCAD.Vector(1, 0, 0))
+        self.assertNotEqual(PathOpCache.shapeKey(box), PathOpCache.shapeKey(moved))
+        self.assertIsNone(PathOpCache.shapeKey(Part.Shape()))
+
+    def test01(self):
+        '''Verify property values are converted into comparable keys.'''
+        visited = set()
+        self.assertEqual(PathOpCache.valueKey(FreeCAD.Units.Quantity('2 mm'), visited), 2.0)
+        self.assertEqual(PathOpCache.valueKey(FreeCAD.Vector(1, 2, 3), visited), (1.0, 2.0, 3.0))
+        self.assertEqual(PathOpCache.valueKey([1, 'a', (2.5, None)], visited), (1, 'a', (2.5, None)))
+        self.assertEqual(PathOpCache.valueKey({'b': 1, 'a': 2}, visited), (('a', 2), ('b', 1)))
+
+    def test10(self):
+        '''Verify an operation is only executed again if its inputs changed.'''
+        op = PathHelix.Create('Helix')
+        self.doc.recompute()
+        self.countExecutions(op)
+        key = PathOpCache.opInputKey(op, self.job)
+        path = op.Path.toGCode()
+
+        op.Proxy.execute(op)
+        self.assertEqual(self.executions, 0)
+        self.assertEqual(op.Path.toGCode(), path)
+        self.assertEqual(PathOpCache.opInputKey(op, self.job), key)
+
+        op.StepOver = 50
+        op.Proxy.execute(op)
+        self.assertEqual(self.executions, 1)
+        self.assertNotEqual(PathOpCache.opInputKey(op, self.job), key)
+
+    def test11(self):
+        '''Verify changing the tool controller invalidates the cached path.'''
+        op = PathHelix.Create('Helix')
+        self.doc.recompute()
+        self.countExecutions(op)
+
+        op.ToolController.Label = 'Renamed'
+        op.Proxy.execute(op)
+        self.assertEqual(self.executions, 0)
+
+        op.ToolController.HorizFeed = op.ToolController.HorizFeed.Value + 100
+        op.Proxy.execute(op)
+        self.assertEqual(self.executions, 1)
+
+    def test20(self):
+        '''Verify the job's cycle time is the numeric sum of its operations.'''
+        op1 = PathHelix.Create('Helix')
+        op2 = PathHelix.Create('Helix')
+        self.doc.recompute()
+        seconds = PathJob.opCycleTime(op1) + PathJob.opCycleTime(op2)
+        self.assertEqual(self.job.CycleTime, PathJob.formatCycleTime(seconds))
+        self.assertEqual(self.job.Proxy.cycleTimeTotal, seconds)
+
+        op2.Active = False
+        self.doc.recompute()
+        self.assertEqual(self.job.CycleTime, PathJob.formatCycleTime(PathJob.opCycleTime(op1)))
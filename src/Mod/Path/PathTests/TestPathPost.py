@@ -55,7 +55,10 @@ class PathPostTestCases(unittest.TestCase):
     def testLinuxCNC(self):
         from PathScripts.post import linuxcnc_post as postprocessor
         args = '--no-header --no-line-numbers --no-comments --no-show-editor --precision=2'
-        gcode = postprocessor.export(self.postlist, 'gcode.tmp', args)
+        postprocessor.export(self.postlist, 'gcode.tmp', args)
+        # the program is streamed into the file
+        with open('gcode.tmp', 'r') as fp:
+            gcode = fp.read()
 
         referenceFile = FreeCAD.getHomePath() + 'Mod/Path/PathTests/test_linuxcnc_00.ngc'
         with open(referenceFile, 'r') as fp:
@@ -73,7 +76,10 @@ class PathPostTestCases(unittest.TestCase):
     def testLinuxCNCImperial(self):
         from PathScripts.post import linuxcnc_post as postprocessor
         args = '--no-header --no-line-numbers --no-comments --no-show-editor --precision=2 --inches'
-        gcode = postprocessor.export(self.postlist, 'gcode.tmp', args)
+        postprocessor.export(self.postlist, 'gcode.tmp', args)
+        # the program is streamed into the file
+        with open('gcode.tmp', 'r') as fp:
+            gcode = fp.read()
 
         referenceFile = FreeCAD.getHomePath() + 'Mod/Path/PathTests/test_linuxcnc_10.ngc'
         with open(referenceFile, 'r') as fp:
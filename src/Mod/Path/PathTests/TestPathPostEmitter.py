@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PostEmitter as PostEmitter
+import io
+import unittest
+
+
+class PathStub(object):
+    '''Simple object with a Path, like a Path operation.'''
+
+    def __init__(self, commands):
+        self.Path = Path.Path(commands)
+
+
+class TestPathPostEmitter(unittest.TestCase):
+    '''Unit tests for the G-code emitter of the post processors.'''
+
+    def commands(self):
+        return [
+            Path.Command('G0', {'X': 1, 'Y': 2, 'Z': 5, 'F': 100}),
+            Path.Command('G1', {'X': 1, 'Y': 3, 'Z': 5, 'F': 600}),
+            Path.Command('G1', {'X': 2, 'Y': 3, 'F': 600}),
+            Path.Command('(comment)'),
+            Path.Command('M6', {'T': 2}),
+        ]
+
+    def emit(self, emitter, commands):
+        out = io.StringIO()
+        emitter.emit(PathStub(commands), out)
+        return out.getvalue()
+
+    def test00(self):
+        '''Verify the default output.'''
+        emitter = PostEmitter.GCodeEmitter()
+        self.assertEqual(self.emit(emitter, self.commands()),
+                         "G0 X1.000 Y2.000 Z5.000 \n"
+                         "G1 X1.000 Y3.000 Z5.000 F36000.000 \n"
+                         "G1 X2.000 Y3.000 F36000.000 \n"
+                         "(comment) \n"
+                         "M6 T2 \n")
+
+    def test01(self):
+        '''Verify modal commands, suppressed duplicate values and comments.'''
+        emitter = PostEmitter.GCodeEmitter(precision=2, modal=True, outputDoubles=False,
+                                           outputComments=False, stripLines=True)
+        self.assertEqual(self.emit(emitter, self.commands()),
+                         "G0 X1.00 Y2.00 Z5.00\n"
+                         "G1 Y3.00 F36000.00\n"
+                         "X2.00\n"
+                         "M6 T2\n")
+
+    def test02(self):
+        '''Verify inches, line numbers and the tool change hook.'''
+        emitter = PostEmitter.GCodeEmitter(precision=4, lengthUnit='in', speedUnit='in/min',
+                                           outputLineNumbers=True,
+                                           commandHooks={'M6': PostEmitter.toolChangeHook('M0\n')})
+        commands = [Path.Command('G1', {'X': 25.4, 'F': 254}), Path.Command('M6', {'T': 3})]
+        self.assertEqual(self.emit(emitter, commands),
+                         "N110  G1 X1.0000 F600.0000 \n"
+                         "N120 M5\n"
+                         "N130 M0\n"
+                         "N140  M6 T3 \nG43 H3 \n")
+        self.assertEqual(emitter.lineNumber, 140)
+
+    def test03(self):
+        '''Verify the modal state is reset for every path of a group.'''
+        class Group(object):
+            Group = [PathStub([Path.Command('G1', {'X': 1})]), object(), PathStub([Path.Command('G1', {'X': 1})])]
+
+        emitter = PostEmitter.GCodeEmitter(modal=True, outputDoubles=False)
+        out = io.StringIO()
+        emitter.emit(Group(), out)
+        self.assertEqual(out.getvalue(), "G1 X1.000 \nG1 X1.000 \n")
+
+    def test04(self):
+        '''Verify raw and unscaled parameters and an overwritten writeWords.'''
+        class Emitter(PostEmitter.GCodeEmitter):
+            def writeWords(self, words):
+                self.writeLine(" ".join(words) + "\n")
+
+        emitter = Emitter(lengthUnit='in', integerParameters=[], rawParameters=['S', 'T'],
+                          unscaledParameters=['A'], outputLineNumbers=True)
+        commands = [Path.Command('G1', {'X': 25.4, 'A': 90}), Path.Command('M3', {'S': 1000.0})]
+        self.assertEqual(self.emit(emitter, commands),
+                         "N110 G1 X1.000 A90.000\n"
+                         "N120 M3 S1000.0\n")
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathUtils as PathUtils
+import unittest
+
+
+class TestPathSortJobs(unittest.TestCase):
+    '''Unit tests for the hole ordering of PathUtils.sort_jobs.'''
+
+    def locations(self):
+        # a 20x10 grid of holes in random order
+        locations = []
+        for i in range(200):
+            j = (i * 37) % 200
+            locations.append({'x': 5.0 * (j % 20), 'y': 7.0 * (j // 20), 'id': j})
+        return locations
+
+    def nearestNeighbourOrder(self, locations):
+        # reference implementation, sqdist plus the abs(x) attractor
+        out = []
+        remaining = list(locations)
+        (x, y) = (0.0, 0.0)
+        while remaining:
+            costs = [((l['x'] - x) ** 2 + (l['y'] - y) ** 2 + abs(l['x']), i) for (i, l) in enumerate(remaining)]
+            closest = remaining.pop(min(costs)[1])
+            out.append(closest)
+            (x, y) = (closest['x'], closest['y'])
+        return out
+
+    def test00(self):
+        '''Verify sort_jobs returns the nearest neighbour order.'''
+        locations = self.locations()
+        expected = [l['id'] for l in self.nearestNeighbourOrder(locations)]
+        self.assertEqual([l['id'] for l in PathUtils.sort_jobs(locations, ['x', 'y'])], expected)
+
+    def test01(self):
+        '''Verify sort_jobs of no and of a single location.'''
+        self.assertEqual(PathUtils.sort_jobs([], ['x', 'y']), [])
+        loc = {'x': 3.0, 'y': 4.0}
+        self.assertEqual(PathUtils.sort_jobs([loc], ['x', 'y']), [loc])
+
+    def test02(self):
+        '''Verify the 2-opt improvement keeps all locations and does not increase the rapid distance.'''
+        locations = self.locations()
+        start = {'x': 0.0, 'y': 0.0}
+        nearest = PathUtils.sort_jobs(locations, ['x', 'y'])
+        optimized = PathUtils.sort_jobs(locations, ['x', 'y'], optimize=True)
+        self.assertEqual(sorted(l['id'] for l in optimized), list(range(200)))
+        self.assertLessEqual(PathUtils.rapid_distance(optimized, ['x', 'y'], start),
+                PathUtils.rapid_distance(nearest, ['x', 'y'], start) + 1e-9)
+
+    def test03(self):
+        '''Verify rapid_distance.'''
+        locations = [{'x': 3.0, 'y': 4.0}, {'x': 3.0, 'y': 10.0}, {'x': 0.0, 'y': 6.0}]
+        self.assertAlmostEqual(PathUtils.rapid_distance(locations, ['x', 'y']), 11.0)
+        self.assertAlmostEqual(PathUtils.rapid_distance(locations, ['x', 'y'], {'x': 0.0, 'y': 0.0}), 16.0)
+
+    def test04(self):
+        '''Verify sort_jobs of two distant clusters of holes.'''
+        locations = []
+        for (k, l) in enumerate(self.locations()):
+            cx = 100000.0 if k % 2 else 0.0
+            locations.append({'x': cx + 0.01 * l['x'], 'y': 0.01 * l['y'], 'id': l['id']})
+        expected = [l['id'] for l in self.nearestNeighbourOrder(locations)]
+        self.assertEqual([l['id'] for l in PathUtils.sort_jobs(locations, ['x', 'y'])], expected)
+
+        # the leaves of the index adapt to the clusters
+        tree = PathUtils.LocationTree(locations, ['x', 'y'])
+        for (node, items) in enumerate(tree.items):
+            if items is not None:
+                self.assertLessEqual(len(items), PathUtils.LocationTree.LeafSize)
+                (xmin, ymin, xmax, ymax) = tree.boxes[node]
+                self.assertLess(xmax - xmin, 1.0)
+                self.assertLess(ymax - ymin, 1.0)
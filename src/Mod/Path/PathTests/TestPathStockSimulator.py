@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Part
+import Path
+import PathScripts.PathStockSimulator as PathStockSimulator
+import PathTests.PathTestUtils as PathTestUtils
+import math
+
+Rates = (100., 100., 50.)
+
+
+class TestPathStockSimulator(PathTestUtils.PathTestBase):
+    '''Unit tests for the heightmap simulation of PathStockSimulator.'''
+
+    def simulate(self, gcode, model=None, radius=3., hFeed=10., vFeed=5.):
+        stock = Part.makeBox(100, 50, 10)
+        simulator = PathStockSimulator.StockSimulator(stock, model, resolution=0.25)
+        commands = [Path.Command(line) for line in gcode.splitlines()]
+        tool = PathStockSimulator.ToolProfile(radius, [0., 0.])
+        (result, _) = simulator.simulateCommands(commands, tool, hFeed, vFeed, Rates)
+        return (result, simulator)
+
+    def test00(self):
+        '''Verify the heightmap of the stock.'''
+        (result, simulator) = self.simulate("G0 Z20")
+        self.assertRoughly(simulator.volume(), 100 * 50 * 10)
+        self.assertRoughly(result['removedVolume'], 0)
+        self.assertEqual(simulator.stock.heights.shape, (200, 400))
+
+    def test01(self):
+        '''Verify the volume removed by a slot.'''
+        (result, simulator) = self.simulate("G0 Z20\nG0 X10 Y25\nG1 Z5\nG1 X90\nG0 Z20")
+        expected = (80 * 6 + math.pi * 9) * 5
+        self.assertTrue(abs(result['removedVolume'] - expected) < 0.02 * expected)
+        self.assertRoughly(simulator.volume() + result['removedVolume'], 100 * 50 * 10)
+        self.assertEqual(result['collisions'], [])
+        self.assertEqual(result['gouges'], [])
+        self.assertRoughly(result['cutTime'], 15 / 5. + 80 / 10.)
+
+    def test02(self):
+        '''Verify air cuts, collisions and gouges.'''
+        model = Part.makeBox(100, 50, 7)
+        (result, _) = self.simulate("G0 Z20\nG1 X50 Y10\nG0 Z9\nG0 X20\nG1 Z6", model)
+        self.assertRoughly(result['airCutTime'], math.hypot(50, 10) / 10.)
+        self.assertEqual(len(result['collisions']), 2)
+        self.assertEqual(len(result['gouges']), 1)
+        self.assertRoughly(result['gouges'][0]['depth'], 1)
+
+        # cutting above the model does not report the earlier plunge below it again
+        model = Part.makeBox(100, 50, 5)
+        (result, _) = self.simulate("G0 Z20\nG0 X50 Y25\nG1 Z3\nG0 Z20\nG0 X40\nG1 Z8\nG1 X60\nG0 Z20", model)
+        self.assertEqual(len(result['gouges']), 1)
+        self.assertRoughly(result['gouges'][0]['depth'], 2)
+        self.assertTrue(abs(result['gouges'][0]['position'][0] - 50) <= 3)
+
+    def test03(self):
+        '''Verify the mesh of the stock is closed and holds its volume.'''
+        (_, simulator) = self.simulate("G0 Z20\nG0 X10 Y25\nG1 Z5\nG1 X90\nG0 Z20")
+        mesh = simulator.mesh()
+        self.assertTrue(mesh.isSolid())
+        self.assertTrue(abs(mesh.Volume - simulator.volume()) < 0.01 * simulator.volume())
+
+    def test04(self):
+        '''Verify moves without feed rates are cut but have no times.'''
+        (result, _) = self.simulate("G0 Z20\nG0 X10 Y25\nG1 Z5\nG1 X90\nG0 Z20", hFeed=0., vFeed=0.)
+        self.assertFalse(result['timed'])
+        self.assertTrue(result['removedVolume'] > 0)
+        self.assertEqual(result['cutTime'], 0)
+        self.assertEqual(result['airCutTime'], 0)
+
+    def test10(self):
+        '''Verify the profiles of tools.'''
+        class Tool(object):
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+
+        ball = PathStockSimulator.toolProfile(Tool(Diameter=6., ToolType='BallEndMill'))
+        self.assertRoughly(ball.at(0.), 0)
+        self.assertTrue(abs(ball.at(2.) - (3 - math.sqrt(5))) < 0.01)
+        self.assertEqual(ball.at(3.), float('inf'))
+
+        vbit = PathStockSimulator.toolProfile(Tool(Diameter=6., ShapeName='v_bit', CuttingEdgeAngle=90., TipDiameter=0.))
+        self.assertRoughly(vbit.at(2.), 2)
+
+        mill = PathStockSimulator.toolProfile(Tool(Diameter=6., ShapeName='endmill'))
+        self.assertRoughly(mill.at(2.9), 0)
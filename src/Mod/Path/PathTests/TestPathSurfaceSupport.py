@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Mesh
+import PathScripts.PathSurfaceSupport as PathSurfaceSupport
+import PathTests.PathTestUtils as PathTestUtils
+import unittest
+
+try:
+    import ocl
+except ImportError:
+    ocl = None
+
+
+class FakeOp(object):
+    '''Provides the operation properties the STL keys depend on.'''
+
+    def __init__(self):
+        self.LinearDeflection = FreeCAD.Units.Quantity('0.01 mm')
+
+
+class TestPathSurfaceSupport(PathTestUtils.PathTestBase):
+    '''Unit tests for the OCL support of 3D Surface and Waterline.'''
+
+    def setUp(self):
+        self.doc = FreeCAD.newDocument('TestPathSurfaceSupport')
+        self.mesh = self.doc.addObject('Mesh::Feature', 'Mesh')
+        self.mesh.Mesh = Mesh.createSphere(10.0, 20)
+        self.op = FakeOp()
+        self.builds = 0
+        PathSurfaceSupport.clearSTLCache()
+
+    def tearDown(self):
+        PathSurfaceSupport.clearSTLCache()
+        FreeCAD.closeDocument(self.doc.Name)
+
+    def makeSTL(self):
+        self.builds += 1
+        return object()
+
+    def getSTL(self, model=None):
+        model = model if model is not None else self.mesh
+        key = ('model',) + PathSurfaceSupport._getModelSTLKey(model, self.op, 'M')
+        return PathSurfaceSupport._getCachedSTL(key, self.makeSTL)
+
+    def test00(self):
+        '''Verify an unchanged model takes its STL from the cache.'''
+        stl = self.getSTL()
+        self.assertTrue(self.getSTL() is stl)
+        self.assertEqual(self.builds, 1)
+
+    def test01(self):
+        '''Verify an in place edit of a mesh model invalidates its STL.'''
+        stl = self.getSTL()
+
+        # move a point inwards which is not on the bound box
+        mesh = self.mesh.Mesh.copy()
+        bb = mesh.BoundBox
+        for index, pt in enumerate(mesh.Points):
+            v = pt.Vector
+            if bb.XMin < v.x < bb.XMax and bb.YMin < v.y < bb.YMax and bb.ZMin < v.z < bb.ZMax:
+                break
+        mesh.movePoint(index, mesh.Points[index].Vector * -0.1)
+        self.mesh.Mesh = mesh
+        self.assertEqual(self.mesh.Mesh.CountPoints, mesh.CountPoints)
+        self.assertEqual(str(self.mesh.Mesh.BoundBox), str(bb))
+
+        self.assertFalse(self.getSTL() is stl)
+        self.assertEqual(self.builds, 2)
+
+    def test02(self):
+        '''Verify the STLs of a document are released.'''
+        stl = self.getSTL()
+        other = FreeCAD.newDocument('TestPathSurfaceSupportOther')
+        otherMesh = other.addObject('Mesh::Feature', 'Mesh')
+        otherMesh.Mesh = self.mesh.Mesh
+        self.getSTL(otherMesh)
+        self.assertEqual(len(PathSurfaceSupport._stlCache), 2)
+
+        # closing a document releases its STLs only
+        FreeCAD.closeDocument(other.Name)
+        self.assertEqual(len(PathSurfaceSupport._stlCache), 1)
+        self.assertTrue(self.getSTL() is stl)
+
+        PathSurfaceSupport.clearSTLCache(self.doc)
+        self.assertEqual(len(PathSurfaceSupport._stlCache), 0)
+        self.assertFalse(self.getSTL() is stl)
+        self.assertEqual(self.builds, 3)
+
+    @unittest.skipIf(ocl is None, 'OpenCamLib is not installed')
+    def test10(self):
+        '''Verify batch scans of lines match the scans of ocl.PathDropCutter.'''
+        stl = PathSurfaceSupport._makeSTL(self.mesh, self.op, ocl, 'M')
+        cutter = ocl.CylCutter(3.0, 20.0)
+        finalDep = -2.0
+        sampleInterval = 0.7
+        lines = [((-15.0, -4.0), (15.0, -4.0)), ((-15.0, 0.0), (12.0, 3.0)), ((0.0, -15.0), (0.0, 15.0))]
+
+        expected = list()
+        for ((x1, y1), (x2, y2)) in lines:
+            pdc = ocl.PathDropCutter()
+            pdc.setSTL(stl)
+            pdc.setCutter(cutter)
+            pdc.setZ(finalDep)
+            pdc.setSampling(sampleInterval)
+            path = ocl.Path()
+            path.append(ocl.Line(ocl.Point(x1, y1, 0), ocl.Point(x2, y2, 0)))
+            pdc.setPath(path)
+            pdc.run()
+            expected.append(pdc.getCLPoints())
+
+        for threads in (0, 2):
+            scans = PathSurfaceSupport.dropCutScanLines(ocl, stl, cutter, finalDep, sampleInterval, lines, threads)
+            self.assertEqual(len(scans), len(lines))
+            for scan, points in zip(scans, expected):
+                self.assertEqual(len(scan), len(points))
+                for pt, p in zip(scan, points):
+                    self.assertCoincide(pt, FreeCAD.Vector(p.x, p.y, p.z))
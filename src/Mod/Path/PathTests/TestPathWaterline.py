@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *   Copyright (c) 2021 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathTests.PathTestUtils as PathTestUtils
+import numpy
+import unittest
+
+try:
+    import PathScripts.PathWaterline as PathWaterline
+except ImportError:
+    PathWaterline = None
+
+
+@unittest.skipIf(PathWaterline is None, "Waterline requires OpenCamLib")
+class TestPathWaterline(PathTestUtils.PathTestBase):
+    '''Unit tests for the waterline loops traced from the topo map of an OCL scan.'''
+
+    def loops(self, zMap, climb=False):
+        '''Returns the loops at depth 0.5 as lists of the (line, point) indices of the scan.'''
+        op = PathWaterline.ObjectWaterline.__new__(PathWaterline.ObjectWaterline)
+        op.CutClimb = climb
+        scan = [[(line, point) for point in range(zMap.shape[1])] for line in range(zMap.shape[0])]
+        op.topoMap = op._createTopoMap(zMap, 0.5)
+        op._bufferTopoMap()
+        op._highlightWaterline(4, 9)
+        return op._extractWaterlines(None, scan, 0, 0.5)
+
+    def test00(self):
+        '''Verify the loop around a block in both directions.'''
+        zMap = numpy.zeros((7, 7))
+        zMap[2:5, 2:5] = 2
+        loop = [(1, 1), (2, 1), (3, 1), (4, 1), (5, 1), (5, 2), (5, 3), (5, 4),
+                (4, 5), (3, 5), (2, 5), (1, 4), (1, 3), (1, 2), (1, 1)]
+        self.assertEqual(self.loops(zMap), [loop])
+        self.assertEqual(self.loops(zMap, True), [loop[::-1]])
+
+    def test01(self):
+        '''Verify the loops around a block with a hole.'''
+        zMap = numpy.zeros((9, 9))
+        zMap[1:8, 1:8] = 2
+        zMap[3:6, 3:6] = 0
+        outer = [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0), (8, 0),
+                 (8, 1), (8, 2), (8, 3), (8, 4), (8, 5), (8, 6), (8, 7),
+                 (7, 8), (6, 8), (5, 8), (4, 8), (3, 8), (2, 8), (1, 8),
+                 (0, 7), (0, 6), (0, 5), (0, 4), (0, 3), (0, 2), (0, 1), (0, 0)]
+        inner = [(3, 3), (4, 3), (5, 3), (5, 4), (4, 5), (3, 4), (3, 3)]
+        self.assertEqual(self.loops(zMap), [outer, inner])
+        self.assertEqual(self.loops(zMap, True), [outer[::-1], inner[::-1]])
+
+    def test02(self):
+        '''Verify a loop touching the border of the scan stays open.'''
+        zMap = numpy.zeros((6, 6))
+        zMap[1:5, 0:3] = 2
+        loop = [(0, 0), (0, 1), (0, 2), (1, 3), (2, 3), (3, 3), (4, 3), (5, 2), (5, 1), (5, 0), (5, 0)]
+        self.assertEqual(self.loops(zMap), [loop])
+        self.assertEqual(self.loops(zMap, True), [loop])
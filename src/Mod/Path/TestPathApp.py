@@ -23,17 +23,24 @@
 import TestApp
 
 from PathTests.TestPathLog   import TestPathLog
+from PathTests.TestPathPostEmitter import TestPathPostEmitter
 from PathTests.TestPathPreferences  import TestPathPreferences
 from PathTests.TestPathPropertyBag  import TestPathPropertyBag
 from PathTests.TestPathCore  import TestPathCore
 #from PathTests.TestPathPost  import PathPostTestCases
+from PathTests.TestPathCycleTime import TestPathCycleTime
+from PathTests.TestPathGCodeReader import TestPathGCodeReader
 from PathTests.TestPathGeom  import TestPathGeom
 from PathTests.TestPathOpTools  import TestPathOpTools
+from PathTests.TestPathOpCache import TestPathOpCache
 from PathTests.TestPathUtil  import TestPathUtil
 from PathTests.TestPathDepthParams import depthTestCases
+from PathTests.TestPathSortJobs import TestPathSortJobs
 from PathTests.TestPathDressupHoldingTags import TestHoldingTags
 from PathTests.TestPathDressupDogbone import TestDressupDogbone
 from PathTests.TestPathStock import TestPathStock
+from PathTests.TestPathStockSimulator import TestPathStockSimulator
+from PathTests.TestPathSurfaceSupport import TestPathSurfaceSupport
 from PathTests.TestPathTool import TestPathTool
 from PathTests.TestPathToolBit  import TestPathToolBit
 from PathTests.TestPathTooltable import TestPathTooltable
@@ -44,18 +51,25 @@ from PathTests.TestPathHelix  import TestPathHelix
 from PathTests.TestPathVoronoi  import TestPathVoronoi
 from PathTests.TestPathThreadMilling  import TestPathThreadMilling
 from PathTests.TestPathVcarve  import TestPathVcarve
+from PathTests.TestPathWaterline import TestPathWaterline
 
 # dummy usage to get flake8 and lgtm quiet
 False if TestApp.__name__ else True
 False if TestPathLog.__name__ else True
 False if TestPathCore.__name__ else True
 False if TestPathGeom.__name__ else True
+False if TestPathCycleTime.__name__ else True
+False if TestPathGCodeReader.__name__ else True
 False if TestPathOpTools.__name__ else True
+False if TestPathOpCache.__name__ else True
 False if TestPathUtil.__name__ else True
 False if depthTestCases.__name__ else True
+False if TestPathSortJobs.__name__ else True
 False if TestHoldingTags.__name__ else True
 False if TestDressupDogbone.__name__ else True
 False if TestPathStock.__name__ else True
+False if TestPathStockSimulator.__name__ else True
+False if TestPathSurfaceSupport.__name__ else True
 False if TestPathTool.__name__ else True
 False if TestPathTooltable.__name__ else True
 False if TestPathToolController.__name__ else True
@@ -63,9 +77,11 @@ False if TestPathSetupSheet.__name__ else True
 False if TestPathDeburr.__name__ else True
 False if TestPathHelix.__name__ else True
 False if TestPathPreferences.__name__ else True
+False if TestPathPostEmitter.__name__ else True
 False if TestPathToolBit.__name__ else True
 False if TestPathVoronoi.__name__ else True
 False if TestPathThreadMilling.__name__ else True
 False if TestPathVcarve.__name__ else True
 False if TestPathPropertyBag.__name__ else True
 
+False if TestPathWaterline.__name__ else True